@@ -61,6 +61,18 @@ KUCOIN_API_SECRET = os.getenv("KUCOIN_API_SECRET")
 KUCOIN_API_PASSPHRASE = os.getenv("KUCOIN_API_PASSPHRASE")
 KUCOIN_TESTNET = False
 
+# Futures REST endpoint overrides, e.g. the local mocks of the replay benchmark
+BINANCE_FUTURES_ENDPOINT = os.getenv("BINANCE_FUTURES_ENDPOINT") or None
+KUCOIN_FUTURES_ENDPOINT = os.getenv("KUCOIN_FUTURES_ENDPOINT") or None
+
+# Seconds between batch refreshes of recently requested KuCoin mark prices (0 disables)
+KUCOIN_MARK_PRICE_REFRESH_INTERVAL = float(os.getenv("KUCOIN_MARK_PRICE_REFRESH_INTERVAL", "5"))
+
+# Local order book streamed for symbols with pending/open trades (maker pricing, depth checks)
+ORDER_BOOK_STREAM_ENABLED = os.getenv("ORDER_BOOK_STREAM_ENABLED", "True").lower() == "true"
+# Seconds a streamed book is used before falling back to a REST depth request
+ORDER_BOOK_MAX_AGE = float(os.getenv("ORDER_BOOK_MAX_AGE", "2"))
+
 # Supabase
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY")
@@ -96,6 +108,26 @@ BINANCE_MAKER_TICK_OFFSET=os.getenv("BINANCE_MAKER_TICK_OFFSET", "3")
 TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN", "YOUR_TELEGRAM_BOT_TOKEN")
 TELEGRAM_NOTIFICATION_CHAT_ID = os.getenv("TELEGRAM_NOTIFICATION_CHAT_ID", "")
 
+# Undelivered Telegram notifications are kept here between retries and across restarts
+NOTIFICATION_OUTBOX_DB_PATH = os.getenv("NOTIFICATION_OUTBOX_DB_PATH", "logs/notification_outbox.db")
+TELEGRAM_MIN_SEND_INTERVAL = float(os.getenv("TELEGRAM_MIN_SEND_INTERVAL", "1.0"))
+
+# Exchange history warehouse (local SQLite store shared by backfill/reconciliation jobs)
+EXCHANGE_HISTORY_DB_PATH = os.getenv("EXCHANGE_HISTORY_DB_PATH", "logs/exchange_history.db")
+# Resume points of the transaction history syncs
+TRANSACTION_SYNC_CHECKPOINT_PATH = os.getenv("TRANSACTION_SYNC_CHECKPOINT_PATH", "logs/transaction_sync_checkpoints.json")
+# Binance income ingestion: scopes fetched concurrently and request weight they may spend per minute
+TRANSACTION_SYNC_WORKERS = int(os.getenv("TRANSACTION_SYNC_WORKERS", "4"))
+BINANCE_HISTORY_WEIGHT_PER_MINUTE = int(os.getenv("BINANCE_HISTORY_WEIGHT_PER_MINUTE", "1200"))
+
+# Realtime change feed of the trades/alerts/trader_exchange_config tables
+CHANGE_FEED_ENABLED = os.getenv("CHANGE_FEED_ENABLED", "True").lower() == "true"
+# Seconds between catch-up queries (also the trader config refresh interval while the feed runs)
+CHANGE_FEED_CATCHUP_INTERVAL = float(os.getenv("CHANGE_FEED_CATCHUP_INTERVAL", "600"))
+# Re-process pending/cooldown/empty-response/margin-insufficient trades as they are written
+CHANGE_FEED_TRADE_RETRIES = os.getenv("CHANGE_FEED_TRADE_RETRIES", "False").lower() == "true"
+CHANGE_FEED_RETRY_DELAY = float(os.getenv("CHANGE_FEED_RETRY_DELAY", "60"))
+
 # Fee Calculator Configuration
 USE_FIXED_FEE_CALCULATOR = os.getenv("USE_FIXED_FEE_CALCULATOR", "True").lower() == "true"
 FIXED_FEE_RATE = float(os.getenv("FIXED_FEE_RATE", "0.0002"))
@@ -5,10 +5,15 @@ This module contains the core components for the Discord bot:
 - BotConfig: Configuration management
 - BotInitializer: Component initialization
 - DiscordBotCore: Main orchestrator
+- ServiceContainer: Process-wide shared services
 """
 
 from .bot_config import BotConfig
 from .bot_initializer import BotInitializer
 from .discord_bot_core import DiscordBotCore
+from .service_container import ServiceContainer, get_service_container, set_service_container
 
-__all__ = ['BotConfig', 'BotInitializer', 'DiscordBotCore']
+__all__ = [
+    'BotConfig', 'BotInitializer', 'DiscordBotCore',
+    'ServiceContainer', 'get_service_container', 'set_service_container'
+]
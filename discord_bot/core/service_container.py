@@ -0,0 +1,177 @@
+"""
+Service Container
+
+Process-wide owner of the long-lived clients: the DiscordBot (and through it
+the Binance/KuCoin exchanges, price service, trading engines and websocket
+manager), the Supabase client, the trader config cache and the realtime
+change feed of the trades tables. Everything that
+needs one of these (scheduler, routes, services) gets it from here instead
+of constructing its own, so caches and connections are shared.
+"""
+
+import asyncio
+import logging
+from typing import Any, Optional
+
+from config import settings
+from src.core.metrics import instrument_supabase, monitor_event_loop_lag
+
+logger = logging.getLogger(__name__)
+
+
+class ServiceContainer:
+    """
+    Holds exactly one instance of each shared service.
+
+    The container is created once per process (in the FastAPI lifespan, or
+    lazily by ``get_service_container()``) and wraps the
+    DiscordBot returned by ``get_discord_bot()``, which the API routes also use.
+    """
+
+    def __init__(self, bot: Any):
+        """
+        Initialize the container around an existing bot.
+
+        Args:
+            bot: DiscordBot instance owning the exchange, DB and price clients
+        """
+        self.bot = bot
+        self.supabase = bot.supabase
+        self._started = False
+        self._loop_lag_task: Optional[asyncio.Task] = None
+        self.change_feed: Optional[Any] = None
+        self.trade_change_router: Optional[Any] = None
+
+        # Time every Supabase call made through the shared client
+        instrument_supabase(self.supabase)
+
+        # Route the runtime/trader config queries through the same Supabase client
+        from src.config import runtime_config as runtime_config_module
+        if runtime_config_module.runtime_config is not None:
+            runtime_config_module.runtime_config.supabase = self.supabase
+
+    @property
+    def db_manager(self) -> Any:
+        return self.bot.db_manager
+
+    @property
+    def binance_exchange(self) -> Any:
+        return self.bot.binance_exchange
+
+    @property
+    def kucoin_exchange(self) -> Any:
+        return self.bot.kucoin_exchange
+
+    @property
+    def price_service(self) -> Any:
+        return self.bot.price_service
+
+    @property
+    def trader_config(self) -> Any:
+        from src.services.trader_config_service import trader_config_service
+        return trader_config_service
+
+    async def start(self) -> None:
+        """Run the one-time startup work: websocket sync, change feed, trader config refresh and loop lag monitoring."""
+        if self._started:
+            return
+        self._started = True
+        self._loop_lag_task = asyncio.create_task(monitor_event_loop_lag())
+
+        try:
+            await self.bot.start_websocket_sync()
+            logger.info("✅ WebSocket sync started")
+        except Exception as e:
+            logger.error(f"❌ Failed to start WebSocket sync: {e}")
+
+        feed_started = self._start_change_feed()
+
+        # Load trader configs once and keep the snapshot current; with the
+        # change feed running the poll is only a low-frequency safety net
+        try:
+            if feed_started:
+                self.trader_config.start_snapshot_refresh(settings.CHANGE_FEED_CATCHUP_INTERVAL)
+            else:
+                self.trader_config.start_snapshot_refresh()
+            logger.info("✅ Trader config snapshot refresh started")
+        except Exception as e:
+            logger.error(f"❌ Failed to start trader config snapshot refresh: {e}")
+
+    def _start_change_feed(self) -> bool:
+        """Subscribe to trades/alerts/trader config changes; returns False if the feed is disabled."""
+        if not settings.CHANGE_FEED_ENABLED or not settings.SUPABASE_URL or not settings.SUPABASE_KEY:
+            return False
+        try:
+            from src.services.change_feed import ChangeFeed
+            from discord_bot.core.trade_change_router import TradeChangeRouter
+
+            feed = ChangeFeed(settings.SUPABASE_URL, settings.SUPABASE_KEY,
+                              catchup_interval=settings.CHANGE_FEED_CATCHUP_INTERVAL)
+            router = TradeChangeRouter(self.bot, self.supabase,
+                                       retry_trades=settings.CHANGE_FEED_TRADE_RETRIES,
+                                       retry_delay=settings.CHANGE_FEED_RETRY_DELAY)
+            router.register(feed)
+            router.start()
+            feed.start()
+            self.change_feed, self.trade_change_router = feed, router
+            logger.info("✅ Change feed started")
+            return True
+        except Exception as e:
+            logger.error(f"❌ Failed to start change feed: {e}")
+            return False
+
+    @property
+    def change_feed_live(self) -> bool:
+        """True while the change feed delivers trades changes, so polling fallbacks can be skipped."""
+        return self.trade_change_router is not None and self.trade_change_router.is_live
+
+    async def close(self) -> None:
+        """Stop background work and close the shared clients."""
+        if self._loop_lag_task is not None:
+            self._loop_lag_task.cancel()
+            self._loop_lag_task = None
+
+        if self.change_feed is not None:
+            try:
+                await self.change_feed.stop()
+                await self.trade_change_router.stop()
+            except Exception as e:
+                logger.warning(f"Failed to stop change feed: {e}")
+            self.change_feed = self.trade_change_router = None
+
+        try:
+            await self.trader_config.stop_snapshot_refresh()
+        except Exception as e:
+            logger.warning(f"Failed to stop trader config snapshot refresh: {e}")
+
+        try:
+            await self.bot.close()
+            logger.info("✅ Bot closed successfully")
+        except Exception as e:
+            logger.error(f"❌ Error closing bot: {e}")
+
+        self._started = False
+
+
+_container: Optional[ServiceContainer] = None
+
+
+def get_service_container() -> ServiceContainer:
+    """
+    Get the process-wide service container, creating it on first use.
+
+    Returns:
+        ServiceContainer wrapping the shared DiscordBot
+    """
+    global _container
+    if _container is None:
+        from discord_bot.discord_bot import get_discord_bot
+        _container = ServiceContainer(get_discord_bot())
+        logger.info("Service container initialized")
+    return _container
+
+
+def set_service_container(container: Optional[ServiceContainer]) -> None:
+    """Replace the process-wide container (None resets it)."""
+    global _container
+    _container = container
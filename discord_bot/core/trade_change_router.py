@@ -0,0 +1,281 @@
+"""
+Trade Change Router
+
+Turns change-feed events of the trades, alerts and trader_exchange_config
+tables into in-process work, replacing the queries the scheduler used to
+run on timers to discover it:
+
+- every trade change evicts the row from the trade cache and updates the
+  set of active KuCoin trades the 10-minute KuCoin sync checks for;
+- PENDING/OPEN trades with an exchange order are queued for an order
+  status check (OrderMonitor), and re-checked until the order settles or is
+  older than the monitoring window;
+- trades whose last attempt failed in a retryable way (pending, cooldown,
+  empty response, insufficient margin) are queued for a delayed retry when
+  CHANGE_FEED_TRADE_RETRIES is enabled;
+- trader_exchange_config changes are applied to the trader config snapshot;
+- the symbols of PENDING/ACTIVE/OPEN trades are watched by the local order
+  book, so their depth is streamed while the trade is active.
+"""
+
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Set
+
+from src.database.core.trade_cache import get_trade_cache
+from src.database.models.trade_projections import TradeProjection, trade_columns
+from src.exchange.core.order_book import get_order_book_service
+from src.exchange.core.symbol_registry import get_symbol_registry
+from src.exchange.kucoin.kucoin_mark_price import normalize_futures_symbol
+from src.services.change_feed import ChangeEvent, ChangeFeed, WorkQueue
+from src.services.trader_config_service import trader_config_service
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_STATUSES = ('PENDING', 'ACTIVE', 'OPEN')
+ORDER_CHECK_STATUSES = ('PENDING', 'OPEN')
+# Order states OrderMonitor has already recorded; their trades need no further checks
+SETTLED_ORDER_STATUSES = ('FILLED', 'CANCELED', 'CANCELLED', 'REJECTED', 'EXPIRED')
+# Columns the handlers read (order checks, retries, active KuCoin trades and book watches)
+CATCHUP_TRADE_COLUMNS = trade_columns(TradeProjection.STATUS_CHECK, 'binance_response', 'timestamp')
+# How far back the catch-up looks on its first run
+INITIAL_CATCHUP_WINDOW = timedelta(hours=24)
+
+
+def _parse_time(value: Any) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def book_symbol(trade: Dict[str, Any]) -> Optional[str]:
+    """Futures symbol of a trade's coin on its exchange (BTCUSDT, XBTUSDTM), or None."""
+    coin = str(trade.get('coin_symbol') or '').upper()
+    if not coin:
+        return None
+    registry = get_symbol_registry()
+    if str(trade.get('exchange') or '').lower() == 'kucoin':
+        return registry.kucoin_symbol(coin) or normalize_futures_symbol(f"{coin}USDTM")
+    return registry.binance_symbol(coin) or f"{coin}USDT"
+
+
+def retry_reason(trade: Dict[str, Any]) -> Optional[str]:
+    """
+    Why a trade should be re-processed, or None.
+
+    Mirrors the selections of process_pending_trades, process_cooldown_trades,
+    process_empty_binance_response_trades and process_margin_insufficient_trades.
+    """
+    if str(trade.get('status') or '') == 'pending':
+        return 'pending'
+    response = trade.get('binance_response')
+    if response is None:
+        return None
+    response = str(response)
+    if response == '':
+        return 'empty_response'
+    if response.startswith('Trade cooldown active for'):
+        return 'cooldown'
+    if 'APIError(code=-2019)' in response:
+        return 'margin_insufficient'
+    return None
+
+
+class TradeChangeRouter:
+    """Routes trades/alerts/trader config changes to caches and work queues."""
+
+    def __init__(self, bot: Any, supabase: Any, retry_trades: bool = False, retry_delay: float = 60.0,
+                 max_retries: int = 3, order_recheck_interval: float = 60.0,
+                 order_max_age: float = 30 * 60):
+        """
+        Initialize the router.
+
+        Args:
+            bot: DiscordBot with the exchanges and db_manager
+            supabase: Supabase client
+            retry_trades: Re-process retryable trades (see retry_reason)
+            retry_delay: Seconds a retryable trade waits before it is re-processed
+            max_retries: Retries per trade for the life of the process
+            order_recheck_interval: Seconds between checks of a still-open order
+            order_max_age: Orders older than this (seconds) are no longer checked
+        """
+        self.bot = bot
+        self.supabase = supabase
+        self.retry_trades = retry_trades
+        self.retry_delay = retry_delay
+        self.max_retries = max_retries
+        self.order_recheck_interval = order_recheck_interval
+        self.order_max_age = order_max_age
+        self.order_queue = WorkQueue('order-check', self._check_order, workers=2)
+        self.retry_queue = WorkQueue('trade-retry', self._retry_trade)
+        self._active_kucoin: Set[str] = set()
+        self._watched_orders: Dict[str, str] = {}
+        self._retries: Dict[str, int] = {}
+        self.feed: Optional[ChangeFeed] = None
+
+    def register(self, feed: ChangeFeed) -> None:
+        """Subscribe the router's handlers and catch-up queries to a feed."""
+        self.feed = feed
+        feed.on('trades', self.on_trade)
+        feed.on('alerts', self.on_alert)
+        feed.on('trader_exchange_config', self.on_trader_config)
+        feed.add_catchup('trades', self.catch_up_trades)
+        if self.retry_trades:
+            feed.add_catchup('alerts', self.catch_up_alerts)
+
+    def start(self) -> None:
+        self.order_queue.start()
+        self.retry_queue.start()
+
+    async def stop(self) -> None:
+        await self.order_queue.stop()
+        await self.retry_queue.stop()
+
+    @property
+    def is_live(self) -> bool:
+        """True while the feed delivers changes, so polling fallbacks can be skipped."""
+        return self.feed is not None and self.feed.is_live
+
+    def has_active_kucoin_trades(self) -> bool:
+        """True if a KuCoin trade is PENDING, ACTIVE or OPEN."""
+        return bool(self._active_kucoin)
+
+    # Handlers
+
+    def on_trade(self, event: ChangeEvent) -> None:
+        """Handle a trades change."""
+        if not event.catchup:
+            get_trade_cache().apply_change_event(event.as_payload())
+
+        trade = event.row
+        trade_id = trade.get('id')
+        if trade_id is None:
+            return
+        key = str(trade_id)
+        deleted = event.type == 'DELETE'
+        status = str(trade.get('status') or '').upper()
+
+        if not deleted and status in ACTIVE_STATUSES and str(trade.get('exchange') or '').lower() == 'kucoin':
+            self._active_kucoin.add(key)
+        else:
+            self._active_kucoin.discard(key)
+
+        symbol = book_symbol(trade)
+        if not deleted and status in ACTIVE_STATUSES and symbol:
+            exchange = 'kucoin' if str(trade.get('exchange') or '').lower() == 'kucoin' else 'binance'
+            get_order_book_service().watch(exchange, symbol, owner=f"trade:{key}")
+        else:
+            get_order_book_service().unwatch(f"trade:{key}")
+
+        if not deleted and self._needs_order_check(trade):
+            if trade.get('discord_id'):
+                self._watched_orders[str(trade['discord_id'])] = key
+            self.order_queue.put(key, trade)
+
+        if self.retry_trades and not deleted and trade.get('discord_id') and retry_reason(trade):
+            self._queue_retry(str(trade['discord_id']))
+
+    def on_alert(self, event: ChangeEvent) -> None:
+        """Handle an alerts change: re-check the parent trade's order, retry it if the alert failed."""
+        alert = event.row
+        parent = alert.get('trade')
+        if not parent or event.type == 'DELETE':
+            return
+        trade_id = self._watched_orders.get(str(parent))
+        if trade_id is not None:
+            self.order_queue.put(trade_id, None)
+        if self.retry_trades and retry_reason(alert):
+            self._queue_retry(str(parent))
+
+    def on_trader_config(self, event: ChangeEvent) -> None:
+        """Apply a trader_exchange_config change to the trader config snapshot."""
+        trader_config_service.apply_change_event(event.as_payload())
+
+    # Catch-up queries
+
+    def _since(self, since: Optional[str]) -> str:
+        return since or (datetime.now(timezone.utc) - INITIAL_CATCHUP_WINDOW).isoformat()
+
+    async def catch_up_trades(self, since: Optional[str]) -> List[Dict[str, Any]]:
+        """Trades created or updated since `since` (the last 24 hours on the first run)."""
+        since = self._since(since)
+        query = self.supabase.from_("trades").select(CATCHUP_TRADE_COLUMNS).or_(
+            f"created_at.gte.{since},updated_at.gte.{since}")
+        response = await asyncio.to_thread(query.execute)
+        return response.data or []
+
+    async def catch_up_alerts(self, since: Optional[str]) -> List[Dict[str, Any]]:
+        """Alerts created since `since` (the last 24 hours on the first run)."""
+        query = self.supabase.from_("alerts").select("*").gte("created_at", self._since(since))
+        response = await asyncio.to_thread(query.execute)
+        return response.data or []
+
+    # Order checks
+
+    def _needs_order_check(self, trade: Dict[str, Any]) -> bool:
+        if str(trade.get('status') or '').upper() not in ORDER_CHECK_STATUSES or not trade.get('exchange_order_id'):
+            return False
+        if str(trade.get('order_status') or '').upper() in SETTLED_ORDER_STATUSES:
+            return False
+        created = _parse_time(trade.get('created_at'))
+        return created is None or datetime.now(timezone.utc) - created <= timedelta(seconds=self.order_max_age)
+
+    def _exchange_for(self, trade: Dict[str, Any]) -> Any:
+        if str(trade.get('exchange') or '').lower() == 'kucoin':
+            return getattr(self.bot, 'kucoin_exchange', None)
+        return self.bot.binance_exchange
+
+    async def _check_order(self, trade_id: str, trade: Optional[Dict[str, Any]]) -> None:
+        from src.bot.order_management.order_monitor import OrderMonitor
+
+        if trade is None:
+            response = self.supabase.from_("trades").select("*").eq("id", trade_id).limit(1).execute()
+            trade = (response.data or [None])[0]
+            if not trade:
+                return
+        exchange = self._exchange_for(trade)
+        if exchange is None or not self._needs_order_check(trade):
+            self._watched_orders.pop(str(trade.get('discord_id')), None)
+            return
+
+        outcome = await OrderMonitor(self.bot.db_manager, exchange).check_trade_order(trade)
+        if outcome in ('still_pending', 'unknown') and self._needs_order_check(trade):
+            self.order_queue.put(trade_id, trade, delay=self.order_recheck_interval)
+        else:
+            self._watched_orders.pop(str(trade.get('discord_id')), None)
+        logger.debug(f"Order check for trade {trade_id}: {outcome}")
+
+    # Retries
+
+    def _queue_retry(self, discord_id: str) -> None:
+        if self._retries.get(discord_id, 0) >= self.max_retries:
+            return
+        # The grace period lets the writer finish with the row before it is retried
+        self.retry_queue.put(discord_id, None, delay=self.retry_delay)
+
+    async def _retry_trade(self, discord_id: str, _item: Any) -> None:
+        from discord_bot.utils.trade_retry_utils import process_single_trade
+
+        response = self.supabase.from_("trades").select("*").eq("discord_id", discord_id).limit(1).execute()
+        trade = (response.data or [None])[0]
+        if not trade:
+            return
+        reason = retry_reason(trade)
+        if reason is None:
+            # Alerts of the trade failed, the trade itself did not
+            alerts = self.supabase.from_("alerts").select("*").eq("trade", discord_id).execute().data or []
+            reason = next((r for r in map(retry_reason, alerts) if r), None)
+        signalled_at = _parse_time(trade.get('timestamp'))
+        if reason is None or not signalled_at or datetime.now(timezone.utc) - signalled_at > timedelta(hours=24):
+            return
+        if trade.get('trader') not in await trader_config_service.get_supported_traders():
+            return
+
+        self._retries[discord_id] = self._retries.get(discord_id, 0) + 1
+        logger.info(f"Retrying trade {discord_id} ({reason}, attempt {self._retries[discord_id]})")
+        await process_single_trade(self.bot, self.supabase, discord_id)
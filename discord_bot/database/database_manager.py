@@ -12,6 +12,7 @@ from supabase import Client
 from .operations.trade_operations import TradeOperations
 from .operations.alert_operations import AlertOperations
 from .utils.database_utils import DatabaseUtils
+from src.database.models.trade_projections import TradeProjection
 
 logger = logging.getLogger(__name__)
 
@@ -30,9 +31,10 @@ class DatabaseManager:
 
     # Trade Operations (delegated to TradeOperations)
 
-    async def find_trade_by_discord_id(self, discord_id: str) -> Optional[Dict[str, Any]]:
+    async def find_trade_by_discord_id(self, discord_id: str,
+                                       projection: TradeProjection = TradeProjection.FULL) -> Optional[Dict[str, Any]]:
         """Find a trade by Discord ID."""
-        return await self.trade_ops.find_trade_by_discord_id(discord_id)
+        return await self.trade_ops.find_trade_by_discord_id(discord_id, projection)
 
     async def save_signal_to_db(self, trade_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Save a new trade signal to the database."""
@@ -45,19 +47,21 @@ class DatabaseManager:
         sanitized_data = self.utils.sanitize_data(trade_data)
         return await self.trade_ops.save_signal_to_db(sanitized_data)
 
-    async def update_existing_trade(self, trade_id: int, updates: Dict[str, Any], binance_execution_time: Optional[str] = None) -> bool:
-        """Update an existing trade record."""
+    async def update_existing_trade(self, trade_id: int, updates: Dict[str, Any], binance_execution_time: Optional[str] = None,
+                                    current_trade: Optional[Dict[str, Any]] = None) -> bool:
+        """Update an existing trade record, validating against current_trade when it is already loaded."""
         # Sanitize updates for storage
         sanitized_updates = self.utils.sanitize_data(updates)
-        return await self.trade_ops.update_existing_trade(trade_id, sanitized_updates, binance_execution_time)
+        return await self.trade_ops.update_existing_trade(trade_id, sanitized_updates, binance_execution_time, current_trade)
 
     async def update_trade_with_original_response(self, trade_id: int, original_response: Dict[str, Any]) -> bool:
         """Update trade with original Binance response."""
         return await self.trade_ops.update_trade_with_original_response(trade_id, original_response)
 
-    async def get_trade_by_id(self, trade_id: int) -> Optional[Dict[str, Any]]:
+    async def get_trade_by_id(self, trade_id: int,
+                              projection: TradeProjection = TradeProjection.FULL) -> Optional[Dict[str, Any]]:
         """Get a trade by ID."""
-        trade_data = await self.trade_ops.get_trade_by_id(trade_id)
+        trade_data = await self.trade_ops.get_trade_by_id(trade_id, projection)
         if trade_data:
             return self.utils.desanitize_data(trade_data)
         return None
@@ -66,19 +70,21 @@ class DatabaseManager:
         """Find a trade by Binance order ID."""
         return await self.trade_ops.find_trade_by_order_id(order_id)
 
-    async def get_open_trades(self) -> List[Dict[str, Any]]:
+    async def get_open_trades(self, projection: TradeProjection = TradeProjection.SYNC) -> List[Dict[str, Any]]:
         """Get all open trades."""
-        trades = await self.trade_ops.get_open_trades()
+        trades = await self.trade_ops.get_open_trades(projection)
         return [self.utils.desanitize_data(trade) for trade in trades]
 
-    async def get_trades_by_trader(self, trader: str) -> List[Dict[str, Any]]:
+    async def get_trades_by_trader(self, trader: str,
+                                   projection: TradeProjection = TradeProjection.FULL) -> List[Dict[str, Any]]:
         """Get all trades by a specific trader."""
-        trades = await self.trade_ops.get_trades_by_trader(trader)
+        trades = await self.trade_ops.get_trades_by_trader(trader, projection)
         return [self.utils.desanitize_data(trade) for trade in trades]
 
-    async def get_trades_by_coin_symbol(self, coin_symbol: str) -> List[Dict[str, Any]]:
+    async def get_trades_by_coin_symbol(self, coin_symbol: str,
+                                        projection: TradeProjection = TradeProjection.FULL) -> List[Dict[str, Any]]:
         """Get all trades for a specific coin symbol."""
-        trades = await self.trade_ops.get_trades_by_coin_symbol(coin_symbol)
+        trades = await self.trade_ops.get_trades_by_coin_symbol(coin_symbol, projection)
         return [self.utils.desanitize_data(trade) for trade in trades]
 
     async def delete_trade(self, trade_id: int) -> bool:
@@ -311,6 +317,38 @@ class DatabaseManager:
             logger.error(f"Error inserting transaction batch: {e}")
             return False
 
+    async def get_transactions_in_range(self, exchange: str, start_time: str, end_time: str,
+                                        columns: str = "time,type,amount,asset,symbol",
+                                        page_size: int = 1000) -> List[Dict[str, Any]]:
+        """
+        Get all transactions of an exchange in a time range, paging past the row limit.
+
+        Args:
+            exchange: Exchange name
+            start_time: Range start (ISO timestamp, inclusive)
+            end_time: Range end (ISO timestamp, inclusive)
+            columns: Columns to select
+            page_size: Rows per request
+
+        Raises:
+            Exception: On query errors, so an error is never mistaken for an empty range
+        """
+        try:
+            rows: List[Dict[str, Any]] = []
+            offset = 0
+            while True:
+                response = self.supabase.table("transaction_history").select(columns).eq("exchange", exchange) \
+                    .gte("time", start_time).lte("time", end_time).order("time") \
+                    .range(offset, offset + page_size - 1).execute()
+                page = response.data or []
+                rows.extend(page)
+                if len(page) < page_size:
+                    return rows
+                offset += page_size
+        except Exception as e:
+            logger.error(f"Error getting {exchange} transactions between {start_time} and {end_time}: {e}")
+            raise
+
     async def check_transaction_exists(self, time: str, type: str, amount: float, asset: str, symbol: str) -> bool:
         """Check if a transaction record already exists to avoid duplicates."""
         try:
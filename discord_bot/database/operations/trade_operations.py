@@ -10,6 +10,9 @@ from datetime import datetime, timezone
 from supabase import Client
 
 from ..models.trade_models import TradeModel
+from src.database.models.trade_projections import TradeProjection, TradeRow, trade_columns, to_trade_rows
+from src.database.core.trade_cache import TradeCache, get_trade_cache
+from src.services.analytics.rollups import record_trade_writes
 
 logger = logging.getLogger(__name__)
 
@@ -17,16 +20,33 @@ logger = logging.getLogger(__name__)
 class TradeOperations:
     """Handles trade-related database operations."""
 
-    def __init__(self, supabase_client: Client):
-        """Initialize with Supabase client."""
+    def __init__(self, supabase_client: Client, trade_cache: Optional[TradeCache] = None):
+        """
+        Initialize with Supabase client.
+
+        Args:
+            supabase_client: Supabase client
+            trade_cache: Cache of full trade rows (defaults to the process-wide cache)
+        """
         self.supabase = supabase_client
+        self.cache = trade_cache if trade_cache is not None else get_trade_cache()
 
-    async def find_trade_by_discord_id(self, discord_id: str) -> Optional[Dict[str, Any]]:
-        """Find a trade by Discord ID."""
+    def _cached_row(self, row: Dict[str, Any], projection: TradeProjection) -> Dict[str, Any]:
+        """Remember a row read from the database; only full rows are cached."""
+        if projection == TradeProjection.FULL:
+            self.cache.put(row)
+        return TradeRow(row, projection)
+
+    async def find_trade_by_discord_id(self, discord_id: str,
+                                       projection: TradeProjection = TradeProjection.FULL) -> Optional[Dict[str, Any]]:
+        """Find a trade by Discord ID, selecting only the projection's columns."""
         try:
-            response = self.supabase.table("trades").select("*").eq("discord_id", discord_id).limit(1).execute()
+            cached = self.cache.get_by('discord_id', discord_id)
+            if cached is not None:
+                return TradeRow(cached, projection)
+            response = self.supabase.table("trades").select(trade_columns(projection)).eq("discord_id", discord_id).limit(1).execute()
             if response.data and len(response.data) > 0:
-                return response.data[0]
+                return self._cached_row(response.data[0], projection)
             return None
         except Exception as e:
             logger.error(f"Error finding trade by discord_id {discord_id}: {e}")
@@ -37,6 +57,7 @@ class TradeOperations:
         try:
             response = self.supabase.table("trades").insert(trade_data).execute()
             if response.data and len(response.data) > 0:
+                self.cache.put(response.data[0])
                 logger.info(f"Saved trade signal to database: {response.data[0]['id']}")
                 return response.data[0]
             return None
@@ -44,8 +65,18 @@ class TradeOperations:
             logger.error(f"Error saving trade signal to database: {e}")
             return None
 
-    async def update_existing_trade(self, trade_id: int, updates: Dict[str, Any], binance_execution_time: Optional[str] = None) -> bool:
-        """Update an existing trade record."""
+    async def update_existing_trade(self, trade_id: int, updates: Dict[str, Any], binance_execution_time: Optional[str] = None,
+                                    current_trade: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        Update an existing trade record.
+
+        Args:
+            trade_id: Trade ID
+            updates: Columns to update
+            binance_execution_time: Exchange execution time to use as updated_at
+            current_trade: Already-loaded trade row used for status validation; the row
+                is only fetched when it is missing and status fields are being changed
+        """
         try:
             # Use Binance execution time if provided, otherwise use current time
             if binance_execution_time:
@@ -55,7 +86,8 @@ class TradeOperations:
 
             # Validate status consistency before updating
             from src.database.validators.status_validator import StatusValidator
-            current_trade = await self.get_trade_by_id(trade_id)
+            if current_trade is None and ('status' in updates or 'order_status' in updates):
+                current_trade = await self.get_trade_by_id(trade_id)
             is_valid, error_msg, corrected_updates = StatusValidator.validate_trade_update(updates, current_trade)
 
             if not is_valid:
@@ -69,8 +101,12 @@ class TradeOperations:
 
             response = self.supabase.table("trades").update(updates).eq("id", trade_id).execute()
             if response.data and len(response.data) > 0:
+                # The response carries the full updated row
+                self.cache.put(response.data[0])
+                await record_trade_writes(self.supabase, response.data)
                 logger.info(f"Updated trade {trade_id} successfully")
                 return True
+            self.cache.invalidate(trade_id)
             return False
         except Exception as e:
             logger.error(f"Error updating trade {trade_id}: {e}")
@@ -316,54 +352,61 @@ class TradeOperations:
                 updates['sync_order_response'] = json.dumps(normalized)
                 logger.debug(f"Stored normalized response in sync_order_response for trade {trade_id}")
 
-            return await self.update_existing_trade(trade_id, updates)
+            return await self.update_existing_trade(trade_id, updates, current_trade=current_trade)
         except Exception as e:
             logger.error(f"Error updating trade {trade_id} with original response: {e}")
             return False
 
-    async def get_trade_by_id(self, trade_id: int) -> Optional[Dict[str, Any]]:
-        """Get a trade by ID."""
+    async def get_trade_by_id(self, trade_id: int,
+                              projection: TradeProjection = TradeProjection.FULL) -> Optional[Dict[str, Any]]:
+        """Get a trade by ID, selecting only the projection's columns."""
         try:
-            response = self.supabase.table("trades").select("*").eq("id", trade_id).limit(1).execute()
+            cached = self.cache.get(trade_id)
+            if cached is not None:
+                return TradeRow(cached, projection)
+            response = self.supabase.table("trades").select(trade_columns(projection)).eq("id", trade_id).limit(1).execute()
             if response.data and len(response.data) > 0:
-                return response.data[0]
+                return self._cached_row(response.data[0], projection)
             return None
         except Exception as e:
             logger.error(f"Error getting trade {trade_id}: {e}")
             return None
 
-    async def get_open_trades(self) -> List[Dict[str, Any]]:
-        """Get all open trades."""
+    async def get_open_trades(self, projection: TradeProjection = TradeProjection.SYNC) -> List[Dict[str, Any]]:
+        """Get all open trades, selecting only the projection's columns."""
         try:
-            response = self.supabase.table("trades").select("*").in_("status", ["OPEN", "PARTIALLY_CLOSED"]).execute()
-            return response.data or []
+            response = self.supabase.table("trades").select(trade_columns(projection)).in_("status", ["OPEN", "PARTIALLY_CLOSED"]).execute()
+            return to_trade_rows(response.data, projection)
         except Exception as e:
             logger.error(f"Error getting open trades: {e}")
             return []
 
-    async def get_trades_by_trader(self, trader: str) -> List[Dict[str, Any]]:
-        """Get all trades by a specific trader."""
+    async def get_trades_by_trader(self, trader: str,
+                                   projection: TradeProjection = TradeProjection.FULL) -> List[Dict[str, Any]]:
+        """Get all trades by a specific trader, selecting only the projection's columns."""
         try:
-            response = self.supabase.table("trades").select("*").eq("trader", trader).order("created_at", desc=True).execute()
-            return response.data or []
+            response = self.supabase.table("trades").select(trade_columns(projection)).eq("trader", trader).order("created_at", desc=True).execute()
+            return to_trade_rows(response.data, projection)
         except Exception as e:
             logger.error(f"Error getting trades for trader {trader}: {e}")
             return []
 
-    async def get_trades_by_coin_symbol(self, coin_symbol: str) -> List[Dict[str, Any]]:
-        """Get all trades for a specific coin symbol."""
+    async def get_trades_by_coin_symbol(self, coin_symbol: str,
+                                        projection: TradeProjection = TradeProjection.FULL) -> List[Dict[str, Any]]:
+        """Get all trades for a specific coin symbol, selecting only the projection's columns."""
         try:
-            response = self.supabase.table("trades").select("*").eq("coin_symbol", coin_symbol).order("created_at", desc=True).execute()
-            return response.data or []
+            response = self.supabase.table("trades").select(trade_columns(projection)).eq("coin_symbol", coin_symbol).order("created_at", desc=True).execute()
+            return to_trade_rows(response.data, projection)
         except Exception as e:
             logger.error(f"Error getting trades for coin {coin_symbol}: {e}")
             return []
 
-    async def get_trades_by_status(self, status: str, limit: int = 100) -> List[Dict[str, Any]]:
-        """Get all trades with a specific status."""
+    async def get_trades_by_status(self, status: str, limit: int = 100,
+                                   projection: TradeProjection = TradeProjection.FULL) -> List[Dict[str, Any]]:
+        """Get all trades with a specific status, selecting only the projection's columns."""
         try:
-            response = self.supabase.table("trades").select("*").eq("status", status).order("created_at", desc=True).limit(limit).execute()
-            return response.data or []
+            response = self.supabase.table("trades").select(trade_columns(projection)).eq("status", status).order("created_at", desc=True).limit(limit).execute()
+            return to_trade_rows(response.data, projection)
         except Exception as e:
             logger.error(f"Error getting trades with status {status}: {e}")
             return []
@@ -375,29 +418,34 @@ class TradeOperations:
             try:
                 response = self.supabase.table("trades").select("*").eq("stop_loss_order_id", order_id).limit(1).execute()
                 if response.data and len(response.data) > 0:
+                    self.cache.put(response.data[0])
                     return response.data[0]
             except Exception:
                 pass
 
             # 2) Match main exchange_order_id
+            cached = self.cache.get_by('exchange_order_id', order_id)
+            if cached is not None:
+                return cached
             try:
                 response = self.supabase.table("trades").select("*").eq("exchange_order_id", order_id).limit(1).execute()
                 if response.data and len(response.data) > 0:
+                    self.cache.put(response.data[0])
                     return response.data[0]
             except Exception:
                 pass
 
-            # 3) Fallback: scan recent trades for embedded references (sync/exchange responses)
-            response = self.supabase.table("trades").select("*").order("created_at", desc=True).limit(100).execute()
+            # 3) Fallback: scan recent trades for embedded references (sync/exchange responses);
+            #    only the response columns are scanned, the full row is loaded for the match
+            response = self.supabase.table("trades").select(
+                "id,sync_order_response,exchange_response"
+            ).order("created_at", desc=True).limit(100).execute()
 
             for trade in response.data or []:
                 sync_response = trade.get('sync_order_response', '')
-                if sync_response and order_id in str(sync_response):
-                    return trade
-
-                ex_resp = trade.get('exchange_response') or trade.get('binance_response', '')
-                if ex_resp and order_id in str(ex_resp):
-                    return trade
+                ex_resp = trade.get('exchange_response', '')
+                if (sync_response and order_id in str(sync_response)) or (ex_resp and order_id in str(ex_resp)):
+                    return await self.get_trade_by_id(trade['id'])
 
             return None
 
@@ -409,6 +457,7 @@ class TradeOperations:
         """Delete a trade record."""
         try:
             response = self.supabase.table("trades").delete().eq("id", trade_id).execute()
+            self.cache.invalidate(trade_id)
             if response.data:
                 logger.info(f"Deleted trade {trade_id}")
                 return True
@@ -490,7 +539,7 @@ class TradeOperations:
 
             if updates:
                 updates['updated_at'] = datetime.now(timezone.utc).isoformat()
-                return await self.update_existing_trade(trade_id, updates)
+                return await self.update_existing_trade(trade_id, updates, current_trade=trade)
 
             return True
         except Exception as e:
@@ -637,7 +686,7 @@ class TradeOperations:
                 await exchange.initialize()
 
                 trading_pair = exchange.get_futures_trading_pair(coin_symbol) if hasattr(exchange, 'get_futures_trading_pair') else f"{coin_symbol.upper()}USDT"
-                positions = await exchange.get_futures_position_information()
+                positions = await exchange.get_futures_position_information(include_risk=True)
 
                 for position in positions:
                     if position.get('symbol') == trading_pair:
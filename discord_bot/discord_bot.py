@@ -22,6 +22,9 @@ from discord_bot.signal_processing import DiscordSignalParser
 from discord_bot.signal_processing.signal_parser import client
 from discord_bot.models import InitialDiscordSignal, DiscordUpdateSignal
 from discord_bot.database import DatabaseManager
+from src.database.models.trade_projections import TradeProjection
+from src.database.core.trade_cache import get_trade_cache
+from src.core.metrics import time_stage
 from config import settings as config
 from supabase import create_client, Client
 from src.services.pricing.price_service import PriceService
@@ -163,7 +166,8 @@ class DiscordBot:
                 payload['exchange'] = exchange_type.value
                 # Hint downstream to force notify for KuCoin if configured
                 payload['force_notify'] = True if exchange_type.value == 'kucoin' else False
-                await self.notification_manager.notify_entry_signal(payload)
+                with time_stage('entry_notification'):
+                    await self.notification_manager.notify_entry_signal(payload)
                 logger.info("Entry signal notification attempted (may be filtered by trader config)")
             except Exception as notify_error:
                 logger.error(f"❌ Failed to send entry signal notification: {notify_error}")
@@ -181,7 +185,8 @@ class DiscordBot:
                 logger.error(f"Missing required fields in signal: discord_id={signal.discord_id}, trader={signal.trader}, content_length={len(signal.content) if signal.content else 0}")
                 return {"status": "error", "message": "Missing required fields in signal"}
 
-            trade_row = await self.db_manager.find_trade_by_discord_id(signal.discord_id)
+            with time_stage('db_lookup'):
+                trade_row = await self.db_manager.find_trade_by_discord_id(signal.discord_id, TradeProjection.STATUS_CHECK)
             if not trade_row:
                 logger.info(f"No trade found for discord_id {signal.discord_id}, creating new trade record")
 
@@ -197,7 +202,8 @@ class DiscordBot:
                     'updated_at': datetime.now(timezone.utc).isoformat()
                 }
 
-                trade_row = await self.db_manager.save_signal_to_db(trade_data)
+                with time_stage('db_write'):
+                    trade_row = await self.db_manager.save_signal_to_db(trade_data)
                 if not trade_row:
                     logger.error(f"Failed to create trade record for discord_id {signal.discord_id}")
                     return {"status": "error", "message": "Failed to create trade record"}
@@ -219,7 +225,8 @@ class DiscordBot:
 
             # Parse signal with AI
             try:
-                parsed_signal = await self.signal_parser.parse_new_trade_signal(signal.structured)
+                with time_stage('openai_parse'):
+                    parsed_signal = await self.signal_parser.parse_new_trade_signal(signal.structured)
                 if not parsed_signal or not parsed_signal.get('coin_symbol'):
                     logger.error(f"Failed to parse signal or extract coin_symbol for trade {trade_row['id']}")
                     # Update trade with error status using existing columns
@@ -266,7 +273,8 @@ class DiscordBot:
                     'exchange': exchange_type.value
                 }
 
-                await self.db_manager.update_existing_trade(trade_id=trade_row['id'], updates=trade_updates)
+                with time_stage('db_write'):
+                    await self.db_manager.update_existing_trade(trade_id=trade_row['id'], updates=trade_updates)
                 logger.info(f"Updated trade {trade_row['id']} with parsed signal data")
 
                 # Execute the trade on Binance
@@ -288,18 +296,19 @@ class DiscordBot:
                         return {"status": "error", "message": "No entry price found"}
 
                     # Route the trade to the appropriate exchange based on trader
-                    success, exchange_response = await self.signal_router.route_initial_signal(
-                        coin_symbol=coin_symbol,
-                        signal_price=signal_price,
-                        position_type=position_type,
-                        trader=signal.trader,
-                        order_type=order_type,
-                        stop_loss=stop_loss,
-                        take_profits=take_profits,
-                        entry_prices=entry_prices,
-                        client_order_id=signal.discord_id,
-                        discord_id=signal.discord_id
-                    )
+                    with time_stage('route'):
+                        success, exchange_response = await self.signal_router.route_initial_signal(
+                            coin_symbol=coin_symbol,
+                            signal_price=signal_price,
+                            position_type=position_type,
+                            trader=signal.trader,
+                            order_type=order_type,
+                            stop_loss=stop_loss,
+                            take_profits=take_profits,
+                            entry_prices=entry_prices,
+                            client_order_id=signal.discord_id,
+                            discord_id=signal.discord_id
+                        )
 
                     if success:
                         logger.info(f"✅ Trade executed successfully on {exchange_type.value} for {coin_symbol}")
@@ -390,7 +399,7 @@ class DiscordBot:
                                         timestamp=datetime.now(timezone.utc)
                                     )
 
-                                    asyncio.create_task(trade_notification_service.notify_trade_execution_success(notification_data))
+                                    await trade_notification_service.notify_trade_execution_success(notification_data)
                                     logger.info(f"Sent trade execution notification for Kucoin trade {trade_row['id']}")
                                 except Exception as e:
                                     logger.error(f"Failed to send trade execution notification for Kucoin: {e}")
@@ -514,6 +523,7 @@ class DiscordBot:
                                     'updated_at': 'now()'
                                 }
                                 response = supabase_client.table("trades").update(fallback_updates).eq("id", trade_row['id']).execute()
+                                get_trade_cache().invalidate(trade_row['id'])
                                 if response.data:
                                     logger.info("✅ Database updated using direct Supabase fallback")
                                     db_update_success = True
@@ -646,6 +656,7 @@ class DiscordBot:
                                 'updated_at': 'now()'
                             }
                             response = supabase_client.table("trades").update(fallback_updates).eq("id", trade_row['id']).execute()
+                            get_trade_cache().invalidate(trade_row['id'])
                             if response.data:
                                 logger.info("✅ Database updated using direct Supabase fallback for execution error")
                                 db_update_success = True
@@ -752,7 +763,7 @@ class DiscordBot:
                             trade_id = None
                 else:
                     # best-effort lookup by discord_id
-                    trade_row = await self.db_manager.find_trade_by_discord_id(signal.discord_id)
+                    trade_row = await self.db_manager.find_trade_by_discord_id(signal.discord_id, TradeProjection.STATUS_CHECK)
                     if trade_row and trade_row.get('id') is not None:
                         try:
                             trade_id = int(trade_row['id'])
@@ -906,10 +917,13 @@ class DiscordBot:
             return False
 
     async def close(self):
-        """Gracefully shutdown the trading engine and WebSocket manager."""
+        """Gracefully shutdown the WebSocket manager and the exchange clients."""
         try:
             if hasattr(self, 'websocket_manager') and self.websocket_manager:
                 await self.websocket_manager.stop()
+            for exchange in (self.binance_exchange, self.kucoin_exchange):
+                if exchange is not None:
+                    await exchange.close()
             logger.info("DiscordBot closed successfully")
         except Exception as e:
             logger.error(f"Error closing DiscordBot: {e}")
@@ -1035,5 +1049,28 @@ class DiscordBot:
             logger.error(f"Error executing action {action.get('action_type', 'unknown')}: {e}")
             return False, {"error": str(e)}
 
-# Global bot instance
-discord_bot = DiscordBot()
+# Global bot instance, created on first use
+_discord_bot: Optional[DiscordBot] = None
+
+
+def get_discord_bot() -> DiscordBot:
+    """
+    Get the process-wide DiscordBot, creating it on first use.
+
+    Importing this module no longer builds the bot (exchange, Supabase and
+    websocket clients); callers that need it ask for it explicitly.
+
+    Returns:
+        The shared DiscordBot instance
+    """
+    global _discord_bot
+    if _discord_bot is None:
+        _discord_bot = DiscordBot()
+    return _discord_bot
+
+
+def __getattr__(name: str) -> Any:
+    # Backward compatibility for `from discord_bot.discord_bot import discord_bot`
+    if name == "discord_bot":
+        return get_discord_bot()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -6,10 +6,12 @@ This module contains the Discord API endpoint for backward compatibility.
 from fastapi import APIRouter, HTTPException, BackgroundTasks
 from pydantic import BaseModel, Field
 from typing import Optional
-from discord_bot.discord_bot import discord_bot
+import time
+from discord_bot.discord_bot import get_discord_bot
 from discord_bot.models import InitialDiscordSignal
 from config.logging_config import get_endpoint_logger, get_trade_logger
 from discord_bot.utils.activity_monitor import ActivityMonitor
+from src.core.metrics import correlation_context, observe_stage, time_stage
 
 logger = get_endpoint_logger()
 trade_logger = get_trade_logger()
@@ -22,11 +24,15 @@ class DiscordUpdateSignal(BaseModel):
     trader: Optional[str] = None
     structured: Optional[str] = None # Not always present in updates
 
-async def process_initial_signal_background(signal: InitialDiscordSignal):
+async def process_initial_signal_background(signal: InitialDiscordSignal, received_at: Optional[float] = None):
     """Process an initial signal in the background ."""
     try:
         logger.info(f"[ENDPOINT] Processing initial signal from {signal.trader} (ID: {signal.discord_id})")
-        result = await discord_bot.process_initial_signal(signal)
+        with correlation_context(signal.discord_id):
+            if received_at is not None:
+                observe_stage('queue_wait', time.perf_counter() - received_at)
+            with time_stage('initial_signal_total'):
+                result = await get_discord_bot().process_initial_signal(signal)
         if result.get("status") != "success":
             logger.error(f"[ENDPOINT] Failed to process initial signal: {result.get('message')}")
 
@@ -42,7 +48,8 @@ async def process_update_signal_background(signal: DiscordUpdateSignal):
     """Process an update signal in the background."""
     try:
         logger.info(f"[ENDPOINT] Processing update signal for trade {signal.trade} from {signal.trader}")
-        result = await discord_bot.process_update_signal(signal.model_dump())
+        with correlation_context(signal.discord_id), time_stage('update_signal_total'):
+            result = await get_discord_bot().process_update_signal(signal.model_dump())
         if result.get("status") != "success":
             logger.error(f"[ENDPOINT] Failed to process update signal: {result.get('message')}")
         else:
@@ -59,8 +66,8 @@ async def receive_initial_signal(signal: InitialDiscordSignal, background_tasks:
     trade row in the database by its timestamp, parses the content using AI to determine
     trade parameters, and executes the trade via the trading engine.
     """
-    import time
     start_time = time.time()
+    received_at = time.perf_counter()
 
     logger.info("[ENDPOINT] Entry signal notification will be handled by bot processing")
 
@@ -69,9 +76,11 @@ async def receive_initial_signal(signal: InitialDiscordSignal, background_tasks:
         ActivityMonitor.mark_activity("entry")
 
         # Process signal in background
-        background_tasks.add_task(process_initial_signal_background, signal)
+        background_tasks.add_task(process_initial_signal_background, signal, received_at)
 
         duration = time.time() - start_time
+        with correlation_context(signal.discord_id):
+            observe_stage('receive', duration)
         logger.info(f"[ENDPOINT] Initial signal queued for processing in {duration:.3f}s")
 
         return {
@@ -128,7 +137,7 @@ async def receive_update_signal_test(signal: DiscordUpdateSignal):
     `trade` (signal_id) field and updates its status in the database.
     """
     try:
-        result = discord_bot.parse_alert_content(signal.content)
+        result = get_discord_bot().parse_alert_content(signal.content)
         return {
             "status": "success",
             "data": result,
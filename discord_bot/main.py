@@ -1,5 +1,5 @@
 import uvicorn
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 import logging
 import sys
 import os
@@ -7,6 +7,7 @@ import asyncio
 import time
 from contextlib import asynccontextmanager
 from datetime import datetime, timezone, timedelta
+from typing import Optional
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
@@ -20,6 +21,9 @@ from discord_bot.utils.trade_retry_utils import (
 )
 
 from discord_bot.utils.activity_monitor import ActivityMonitor
+from discord_bot.core.service_container import ServiceContainer, get_service_container
+from src.core.metrics import registry as metrics_registry, CONTENT_TYPE_LATEST
+from src.exchange.core.symbol_registry import get_symbol_registry
 from config import settings as _settings
 from scripts.maintenance.cleanup_scripts.backfill_pnl_and_exit_prices import BinancePnLBackfiller
 from scripts.maintenance.cleanup_scripts.backfill_coin_symbols import backfill_coin_symbols
@@ -38,29 +42,24 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("🚀 Starting Discord Bot Service...")
 
-    bot = None
+    container = None
     try:
-        bot, supabase = initialize_clients()
+        container = get_service_container()
+        app.state.services = container
+        bot, supabase = container.bot, container.supabase
         if bot and supabase:
             logger.info("✅ Clients initialized successfully")
             ActivityMonitor.mark_activity("entry")
-            # Start WebSocket real-time sync
-            try:
-                await bot.start_websocket_sync()
-                logger.info("✅ WebSocket sync started")
-            except Exception as e:
-                logger.error(f"❌ Failed to start WebSocket sync: {e}")
+            # Start WebSocket real-time sync and the trader config snapshot refresh
+            await container.start()
 
             # Run initial price backfill on startup
             try:
                 logger.info("🔄 Running initial price backfill on startup...")
                 # Use the advanced backfill that can correct existing prices
-                backfill_manager = HistoricalTradeBackfillManager()
-                # Set attributes directly if they exist
-                if hasattr(backfill_manager, 'binance_exchange'):
-                    backfill_manager.binance_exchange = bot.binance_exchange
-                if hasattr(backfill_manager, 'db_manager'):
-                    backfill_manager.db_manager = bot.db_manager
+                backfill_manager = HistoricalTradeBackfillManager(
+                    supabase=supabase, db_manager=bot.db_manager, binance_exchange=bot.binance_exchange
+                )
 
                 # Fill missing prices and correct existing ones for better accuracy
                 await backfill_manager.backfill_from_historical_data(days=1, update_existing=True)
@@ -70,7 +69,7 @@ async def lifespan(app: FastAPI):
 
             # Start traditional sync scheduler (reduced frequency)
             try:
-                scheduler_task = asyncio.create_task(trade_retry_scheduler())
+                scheduler_task = asyncio.create_task(trade_retry_scheduler(container))
                 logger.info("✅ Scheduler task created")
             except Exception as e:
                 logger.error(f"❌ Failed to create scheduler task: {e}")
@@ -86,9 +85,14 @@ async def lifespan(app: FastAPI):
     # Shutdown
     logger.info("🛑 Shutting down Discord Bot Service...")
     try:
-        if bot:
-            await bot.close()
-            logger.info("✅ Bot closed successfully")
+        if container:
+            await container.close()
+        # Flush queued notifications (undelivered ones are persisted for the next start)
+        try:
+            from src.services.notifications.notification_outbox import get_notification_outbox
+            await get_notification_outbox().stop()
+        except Exception as e:
+            logger.warning(f"Failed to stop notification outbox: {e}")
         # Close shared Telegram session cleanly
         try:
             from src.services.notifications.telegram_service import TelegramService
@@ -131,6 +135,11 @@ def create_app() -> FastAPI:
                 "timestamp": datetime.now().isoformat()
             }
 
+    @app.get("/metrics")
+    async def metrics():
+        """Prometheus scrape endpoint for the latency histograms."""
+        return Response(metrics_registry.render(), media_type=CONTENT_TYPE_LATEST)
+
     @app.get("/websocket/status")
     async def websocket_status():
         """Get WebSocket real-time sync status."""
@@ -306,12 +315,13 @@ async def cleanup_orphaned_orders_automatic(bot):
             'message': f'Cleanup failed: {e}'
         }
 
-async def trade_retry_scheduler():
+async def trade_retry_scheduler(container: Optional[ServiceContainer] = None):
     """Centralized scheduler for all maintenance tasks and auto-scripts."""
     logger.info("[Scheduler] Initializing trade retry scheduler...")
 
     try:
-        bot, supabase = initialize_clients()
+        container = container or get_service_container()
+        bot, supabase = container.bot, container.supabase
         if not bot or not supabase:
             logger.error("Failed to initialize clients for trade retry scheduler.")
             return
@@ -319,6 +329,9 @@ async def trade_retry_scheduler():
         logger.error(f"Failed to initialize clients for scheduler: {e}")
         return
 
+    # Cross-exchange symbol tables; kept current afterwards by the exchanges' own symbol loads
+    await get_symbol_registry().refresh(bot.binance_exchange, bot.kucoin_exchange)
+
     # Initialize task timers
     last_daily_sync = 0
     last_kucoin_sync = 0
@@ -384,13 +397,17 @@ async def trade_retry_scheduler():
                 logger.info("[Scheduler] Running enhanced KuCoin sync (10min interval)...")
                 try:
                     # Only sync active/pending KuCoin trades for faster processing
-                    cutoff = datetime.now(timezone.utc) - timedelta(days=1)
-                    cutoff_iso = cutoff.isoformat()
-                    response = supabase.from_("trades").select("*").gte("created_at", cutoff_iso).eq("exchange", "kucoin").in_("status", ["PENDING", "ACTIVE", "OPEN"]).execute()
-                    active_kucoin_trades = response.data or []
+                    if container.change_feed_live:
+                        # The change feed tracks active KuCoin trades as they are written
+                        has_active_kucoin_trades = container.trade_change_router.has_active_kucoin_trades()
+                    else:
+                        cutoff = datetime.now(timezone.utc) - timedelta(days=1)
+                        cutoff_iso = cutoff.isoformat()
+                        response = supabase.from_("trades").select("id").gte("created_at", cutoff_iso).eq("exchange", "kucoin").in_("status", ["PENDING", "ACTIVE", "OPEN"]).limit(1).execute()
+                        has_active_kucoin_trades = bool(response.data)
 
-                    if active_kucoin_trades:
-                        logger.info(f"[Scheduler] Found {len(active_kucoin_trades)} active KuCoin trades to sync")
+                    if has_active_kucoin_trades:
+                        logger.info("[Scheduler] Found active KuCoin trades to sync")
                         await sync_trade_statuses_with_kucoin(bot, supabase)
                     else:
                         logger.debug("[Scheduler] No active KuCoin trades to sync")
@@ -427,12 +444,9 @@ async def trade_retry_scheduler():
                 logger.info("[Scheduler] Running price backfill...")
                 try:
                     # Use the advanced backfill that can correct existing prices
-                    backfill_manager = HistoricalTradeBackfillManager()
-                    # Set attributes directly if they exist
-                    if hasattr(backfill_manager, 'binance_exchange'):
-                        backfill_manager.binance_exchange = bot.binance_exchange
-                    if hasattr(backfill_manager, 'db_manager'):
-                        backfill_manager.db_manager = bot.db_manager
+                    backfill_manager = HistoricalTradeBackfillManager(
+                        supabase=supabase, db_manager=bot.db_manager, binance_exchange=bot.binance_exchange
+                    )
 
                     # First fill missing prices, then correct existing ones
                     await backfill_manager.backfill_from_historical_data(days=1, update_existing=True)
@@ -448,12 +462,9 @@ async def trade_retry_scheduler():
                 logger.info("[Scheduler] Running weekly historical backfill...")
                 try:
                     # Use the advanced backfill that can correct existing prices
-                    backfill_manager = HistoricalTradeBackfillManager()
-                    # Set attributes directly if they exist
-                    if hasattr(backfill_manager, 'binance_exchange'):
-                        backfill_manager.binance_exchange = bot.binance_exchange
-                    if hasattr(backfill_manager, 'db_manager'):
-                        backfill_manager.db_manager = bot.db_manager
+                    backfill_manager = HistoricalTradeBackfillManager(
+                        supabase=supabase, db_manager=bot.db_manager, binance_exchange=bot.binance_exchange
+                    )
 
                     # Fill missing prices first, then correct existing ones for better accuracy
                     await backfill_manager.backfill_from_historical_data(days=7, update_existing=True)
@@ -533,8 +544,11 @@ async def trade_retry_scheduler():
                 except Exception as e:
                     logger.error(f"[Scheduler] Error in active futures sync: {e}")
 
-            # Comprehensive order status monitoring (every 5 minutes)
-            if current_time - last_order_monitor >= ORDER_MONITOR_INTERVAL:
+            # Comprehensive order status monitoring (every 5 minutes); while the
+            # change feed is live, orders are checked as their trades change
+            if current_time - last_order_monitor >= ORDER_MONITOR_INTERVAL and container.change_feed_live:
+                last_order_monitor = current_time
+            elif current_time - last_order_monitor >= ORDER_MONITOR_INTERVAL:
                 logger.info("[Scheduler] Running comprehensive order status monitoring...")
                 try:
                     from src.bot.order_management.order_monitor import OrderMonitor
@@ -691,12 +705,8 @@ async def _process_binance_transactions(bot, db_manager):
 
         logger.info("[Scheduler] Processing Binance transaction history...")
 
-        autofiller = AutoTransactionHistoryFiller()
-        # Set attributes directly if they exist
-        if hasattr(autofiller, 'binance_exchange'):
-            autofiller.binance_exchange = bot.binance_exchange
-        if hasattr(autofiller, 'db_manager'):
-            autofiller.db_manager = db_manager
+        # Reuse the running bot's clients instead of building a second DiscordBot every run
+        autofiller = AutoTransactionHistoryFiller(bot=bot, db_manager=db_manager)
 
         # Use the working autofill approach for Binance
         binance_result = await autofiller.auto_fill_transaction_history(
@@ -727,6 +737,7 @@ async def _process_kucoin_transactions(bot, db_manager):
     """Process KuCoin transaction history."""
     try:
         from src.exchange.kucoin.kucoin_transaction_fetcher import KucoinTransactionFetcher
+        from src.exchange.history import get_sync_checkpoints
 
         logger.info("[Scheduler] Processing KuCoin transaction history...")
 
@@ -737,56 +748,19 @@ async def _process_kucoin_transactions(bot, db_manager):
         end_time = int(datetime.now(timezone.utc).timestamp() * 1000)
         start_time = int((datetime.now(timezone.utc) - timedelta(days=7)).timestamp() * 1000)
 
-        # Fetch KuCoin transactions using the enhanced fetcher
-        kucoin_transactions = await kucoin_fetcher.fetch_transaction_history(
+        # Stream windows into the table; later runs resume from the saved checkpoint
+        result = await kucoin_fetcher.sync_to_database(
+            db_manager,
             symbol="",  # All symbols
             start_time=start_time,
             end_time=end_time,
-            limit=1000
+            checkpoints=get_sync_checkpoints()
         )
+        if not result.get('success'):
+            raise Exception(f"KuCoin transaction sync stopped after {result.get('chunks', 0)} windows")
 
-        if not kucoin_transactions:
-            return "No transactions found"
-
-        transformed_transactions = []
-        for transaction in kucoin_transactions:
-            # Ensure exchange is set
-            transaction['exchange'] = 'kucoin'
-            transformed_transactions.append(transaction)
-
-        # Insert in batches to avoid database locks
-        batch_size = 100
-        total_inserted = 0
-        total_skipped = 0
-
-        for i in range(0, len(transformed_transactions), batch_size):
-            batch = transformed_transactions[i:i + batch_size]
-
-            # Check for duplicates before inserting
-            filtered_batch = []
-            for transaction in batch:
-                exists = await db_manager.check_transaction_exists(
-                    time=transaction.get('time', ''),
-                    type=transaction.get('type', ''),
-                    amount=transaction.get('amount', 0),
-                    asset=transaction.get('asset', ''),
-                    symbol=transaction.get('symbol', '')
-                )
-                if not exists:
-                    filtered_batch.append(transaction)
-                else:
-                    total_skipped += 1
-
-            if filtered_batch:
-                success = await db_manager.insert_transaction_history_batch(filtered_batch)
-                if success:
-                    total_inserted += len(filtered_batch)
-                    logger.info(f"[Scheduler] KuCoin batch {i//batch_size + 1}: {len(filtered_batch)} transactions inserted")
-                else:
-                    logger.error(f"[Scheduler] KuCoin batch {i//batch_size + 1}: Failed to insert")
-
-            await asyncio.sleep(0.5)
-
+        total_inserted = result.get('inserted', 0)
+        total_skipped = result.get('skipped', 0)
         return f"{total_inserted} inserted, {total_skipped} skipped"
 
     except Exception as e:
@@ -860,10 +834,12 @@ async def backfill_missing_prices(bot, supabase):
         logger.info("[Scheduler] Starting price backfill for recent trades...")
 
         # Create backfill manager with existing clients
-        backfill_manager = HistoricalTradeBackfillManager()
-        backfill_manager.binance_exchange = bot.binance_exchange  # Use existing exchange instance
-        backfill_manager.kucoin_exchange = bot.kucoin_exchange  # Use existing KuCoin exchange instance
-        backfill_manager.db_manager = bot.db_manager  # Use existing database manager
+        backfill_manager = HistoricalTradeBackfillManager(
+            supabase=supabase,
+            db_manager=bot.db_manager,
+            binance_exchange=bot.binance_exchange,
+            kucoin_exchange=bot.kucoin_exchange
+        )
 
         # Backfill prices for last 7 days (recent trades that might have missed WebSocket updates)
         # Phase 1: Fill missing prices only
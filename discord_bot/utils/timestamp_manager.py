@@ -12,6 +12,8 @@ from typing import Dict, Optional, Any
 import logging
 from supabase import Client
 
+from src.database.models.trade_projections import TradeProjection, trade_columns
+
 logger = logging.getLogger(__name__)
 
 
@@ -81,7 +83,7 @@ class TimestampManager:
         """
         try:
             # Get current trade data
-            response = self.supabase.from_("trades").select("*").eq("id", trade_id).execute()
+            response = self.supabase.from_("trades").select(trade_columns(TradeProjection.STATUS_CHECK)).eq("id", trade_id).execute()
             trade = response.data[0] if response.data else None
 
             if not trade:
@@ -129,7 +131,7 @@ class TimestampManager:
         """
         try:
             # Get current trade data
-            response = self.supabase.from_("trades").select("*").eq("id", trade_id).execute()
+            response = self.supabase.from_("trades").select(trade_columns(TradeProjection.STATUS_CHECK)).eq("id", trade_id).execute()
             trade = response.data[0] if response.data else None
 
             if not trade:
@@ -184,7 +186,7 @@ class TimestampManager:
         """
         try:
             # Get trade data
-            response = self.supabase.from_("trades").select("*").eq("id", trade_id).execute()
+            response = self.supabase.from_("trades").select(trade_columns(TradeProjection.STATUS_CHECK)).eq("id", trade_id).execute()
             trade = response.data[0] if response.data else None
 
             if not trade:
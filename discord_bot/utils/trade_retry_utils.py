@@ -12,11 +12,18 @@ import json
 from datetime import datetime, timedelta, timezone
 from typing import Optional, Dict, List, Tuple
 from dotenv import load_dotenv
-from supabase import create_client, Client
+from supabase import Client
 from config import settings
 from discord_bot.discord_bot import DiscordBot
+from discord_bot.core.service_container import get_service_container
 from src.services.trader_config_service import trader_config_service
 from src.exchange.kucoin.kucoin_symbol_converter import KucoinSymbolConverter
+from src.exchange.history import get_history_warehouse
+from src.exchange.core.symbol_registry import get_symbol_registry
+from src.database.core.trade_batch_writer import TradeBatchWriter
+from src.database.core.trade_cache import get_trade_cache
+from src.database.models.trade_projections import TradeProjection, trade_columns, to_trade_rows
+from src.services.analytics.rollups import record_trade_writes
 
 # --- Setup ---
 load_dotenv()
@@ -25,6 +32,11 @@ logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(
 # Initialize symbol converter for KuCoin
 _symbol_converter = KucoinSymbolConverter()
 
+# Trade columns read by the retry and sync jobs
+RETRY_CANDIDATE_COLUMNS = trade_columns(TradeProjection.STATUS_CHECK)
+SIGNAL_REPLAY_COLUMNS = trade_columns(TradeProjection.STATUS_CHECK, 'timestamp', 'content', 'structured')
+SYNC_TRADE_COLUMNS = trade_columns(TradeProjection.SYNC, 'binance_response', 'kucoin_order_id')
+
 def get_trader_filter(trader: Optional[str] = None) -> Dict[str, str]:
     """Get the trader filter for database queries."""
     if trader:
@@ -43,9 +55,13 @@ def initialize_clients() -> tuple[Optional[DiscordBot], Optional[Client]]:
     if not url or not key:
         logging.error("Supabase URL or key not found in .env file.")
         return None, None
-    supabase: Client = create_client(url, key)
-    bot = DiscordBot()
-    return bot, supabase
+    # Shared instances: one bot (exchanges, price service) and one Supabase client per process
+    try:
+        container = get_service_container()
+    except Exception as e:
+        logging.error(f"Failed to initialize service container: {e}")
+        return None, None
+    return container.bot, container.supabase
 
 def safe_parse_exchange_response(exchange_response: str) -> dict:
     """Safely parse exchange_response field (JSON or plain text)."""
@@ -90,7 +106,7 @@ async def process_pending_trades(bot: DiscordBot, supabase: Client):
         all_trades = []
 
         for trader in supported_traders:
-            response = supabase.from_("trades").select("*").eq("status", "pending").eq("trader", trader).gte("timestamp", cutoff).execute()
+            response = supabase.from_("trades").select(RETRY_CANDIDATE_COLUMNS).eq("status", "pending").eq("trader", trader).gte("timestamp", cutoff).execute()
             trader_trades = response.data or []
             all_trades.extend(trader_trades)
             logging.info(f"Found {len(trader_trades)} pending trades from {trader}.")
@@ -119,7 +135,7 @@ async def process_cooldown_trades(bot: DiscordBot, supabase: Client):
         all_trades = []
 
         for trader in supported_traders:
-            response = supabase.from_("trades").select("*").like("binance_response", cooldown_pattern).eq("trader", trader).gte("timestamp", cutoff).execute()
+            response = supabase.from_("trades").select(RETRY_CANDIDATE_COLUMNS).like("binance_response", cooldown_pattern).eq("trader", trader).gte("timestamp", cutoff).execute()
             trader_trades = response.data or []
             all_trades.extend(trader_trades)
             logging.info(f"Found {len(trader_trades)} cooldown trades from {trader}.")
@@ -148,7 +164,7 @@ async def process_empty_binance_response_trades(bot: DiscordBot, supabase: Clien
         all_trades = []
 
         for trader in supported_traders:
-            response = supabase.from_("trades").select("*").filter("binance_response", "eq", "").eq("trader", trader).gte("timestamp", cutoff).execute()
+            response = supabase.from_("trades").select(RETRY_CANDIDATE_COLUMNS).filter("binance_response", "eq", "").eq("trader", trader).gte("timestamp", cutoff).execute()
             trader_trades = response.data or []
             all_trades.extend(trader_trades)
             logging.info(f"Found {len(trader_trades)} trades with empty binance_response from {trader}.")
@@ -180,7 +196,7 @@ async def process_margin_insufficient_trades(bot: DiscordBot, supabase: Client):
         all_trades = []
 
         for trader in supported_traders:
-            response = supabase.from_("trades").select("*").like("binance_response", pattern).eq("trader", trader).gte("timestamp", cutoff_iso).execute()
+            response = supabase.from_("trades").select(RETRY_CANDIDATE_COLUMNS).like("binance_response", pattern).eq("trader", trader).gte("timestamp", cutoff_iso).execute()
             trader_trades = response.data or []
             all_trades.extend(trader_trades)
             logging.info(f"Found {len(trader_trades)} margin insufficient trades from {trader}.")
@@ -203,7 +219,7 @@ async def process_single_trade(bot: DiscordBot, supabase: Client, discord_id: st
     """
     logging.info(f"--- Processing Discord ID: {discord_id} ---")
     try:
-        response = supabase.from_("trades").select("*").eq("discord_id", discord_id).single().execute()
+        response = supabase.from_("trades").select(SIGNAL_REPLAY_COLUMNS).eq("discord_id", discord_id).single().execute()
         trade = response.data
         if not trade:
             logging.error(f"No trade found with discord_id: {discord_id}")
@@ -283,13 +299,13 @@ async def sync_trade_statuses_with_binance(bot: DiscordBot, supabase: Client):
 
         # Get Binance data
         binance_orders = await bot.binance_exchange.get_all_open_futures_orders()
-        binance_positions = await bot.binance_exchange.get_futures_position_information()
+        binance_positions = await bot.binance_exchange.get_futures_position_information(include_risk=True)
 
         # Get database trades from last 7 days (optimized for performance)
         cutoff = datetime.now(timezone.utc) - timedelta(days=7)
         cutoff_iso = cutoff.isoformat()
-        response = supabase.from_("trades").select("*").gte("created_at", cutoff_iso).execute()
-        db_trades = response.data or []
+        response = supabase.from_("trades").select(SYNC_TRADE_COLUMNS).gte("created_at", cutoff_iso).execute()
+        db_trades = to_trade_rows(response.data, TradeProjection.SYNC)
 
         logging.info(f"Found {len(binance_orders)} open orders on Binance")
         logging.info(f"Found {len(binance_positions)} active positions on Binance")
@@ -361,8 +377,8 @@ async def sync_trade_statuses_with_kucoin(bot: DiscordBot, supabase: Client):
         # Get database trades from last 7 days (optimized for performance)
         cutoff = datetime.now(timezone.utc) - timedelta(days=7)
         cutoff_iso = cutoff.isoformat()
-        response = supabase.from_("trades").select("*").gte("created_at", cutoff_iso).eq("exchange", "kucoin").execute()
-        db_trades = response.data or []
+        response = supabase.from_("trades").select(SYNC_TRADE_COLUMNS).gte("created_at", cutoff_iso).eq("exchange", "kucoin").execute()
+        db_trades = to_trade_rows(response.data, TradeProjection.SYNC)
 
         logging.info(f"Found {len(kucoin_orders)} open orders on KuCoin")
         logging.info(f"Found {len(kucoin_positions)} active positions on KuCoin")
@@ -413,7 +429,10 @@ def extract_symbol_from_trade(trade: dict) -> Optional[str]:
                     raw = str(raw)
             order_details = extract_order_details_from_response(raw)
             symbol = order_details.get('symbol')
-            if symbol and symbol.endswith('USDT'):
+            coin = get_symbol_registry().coin(symbol) if symbol else None
+            if coin:
+                symbol = coin
+            elif symbol and symbol.endswith('USDT'):
                 symbol = symbol[:-4]  # Remove USDT suffix
         except Exception:
             pass
@@ -551,7 +570,7 @@ async def sync_orders_to_database_enhanced(bot: DiscordBot, supabase: Client, bi
                     'sync_order_response': json.dumps(order)
                 }
 
-                supabase.table("trades").update(update_data).eq("id", db_trade['id']).execute()
+                await write_trade_update(supabase, db_trade['id'], update_data)
                 updates_made += 1
                 logging.info(f"Updated order for trade {db_trade['id']} ({order.get('symbol')})")
 
@@ -712,7 +731,7 @@ async def sync_kucoin_orders_to_database_enhanced(bot: DiscordBot, supabase: Cli
                 if not update_data.get('exchange_response'):
                     update_data['exchange_response'] = json.dumps(order)
 
-                supabase.table("trades").update(update_data).eq("id", db_trade['id']).execute()
+                await write_trade_update(supabase, db_trade['id'], update_data)
                 updates_made += 1
                 logging.info(f"Updated KuCoin order for trade {db_trade['id']} ({order.get('symbol')}) - Status: {kucoin_status} -> {mapped_order_status}/{mapped_position_status}, Size: {filled_size}, Price: {avg_price}")
 
@@ -781,7 +800,7 @@ async def sync_kucoin_orders_to_database_enhanced(bot: DiscordBot, supabase: Cli
                             update_data['entry_price'] = f"{avg_price:.8f}"
                             update_data['entry_price'] = f"{avg_price:.8f}"
 
-                        supabase.table("trades").update(update_data).eq("id", matching_trade['id']).execute()
+                        await write_trade_update(supabase, matching_trade['id'], update_data)
                         updates_made += 1
                         logging.info(f"✅ Matched and updated KuCoin trade {matching_trade['id']} by symbol+time for order {order_id}")
                     except Exception as e:
@@ -873,7 +892,7 @@ async def sync_kucoin_positions_to_database_enhanced(bot: DiscordBot, supabase:
                         # Position exists but trade is marked closed - this shouldn't happen, log warning
                         logging.warning(f"Trade {trade['id']} has closed_at={closed_at} but position still exists on exchange. Not changing status.")
 
-                    supabase.table("trades").update(update_data).eq("id", trade['id']).execute()
+                    await write_trade_update(supabase, trade['id'], update_data)
                     updates_made += 1
                     logging.info(f"Updated KuCoin position for trade {trade['id']} ({symbol}) - Size: {position.get('size')}, Mark: {position.get('markPrice')}")
 
@@ -921,7 +940,7 @@ async def sync_kucoin_positions_to_database_enhanced(bot: DiscordBot, supabase:
                             'is_active': False,
                             'updated_at': datetime.now(timezone.utc).isoformat()
                         }
-                        supabase.table("trades").update(update_data).eq("id", trade['id']).execute()
+                        await write_trade_update(supabase, trade['id'], update_data)
                         updates_made += 1
                         logging.info(f"Marked KuCoin trade {trade['id']} ({symbol}) as FAILED (never executed)")
                     else:
@@ -969,7 +988,7 @@ async def sync_kucoin_positions_to_database_enhanced(bot: DiscordBot, supabase:
                         except Exception as e:
                             logging.warning(f"Could not set closed_at timestamp for KuCoin trade {trade['id']}: {e}")
 
-                        supabase.table("trades").update(close_update).eq("id", trade['id']).execute()
+                        await write_trade_update(supabase, trade['id'], close_update)
                         updates_made += 1
                         logging.info(f"Marked KuCoin trade {trade['id']} ({symbol}) as CLOSED with enriched data")
                 except Exception as e:
@@ -993,22 +1012,21 @@ async def sync_positions_to_database_enhanced(bot: DiscordBot, supabase: Client,
                 db_trades_by_symbol[symbol] = []
             db_trades_by_symbol[symbol].append(trade)
 
-    updates_made = 0
     current_time = datetime.now(timezone.utc).isoformat()
 
-    for position in binance_positions:
-        symbol = position.get('symbol', '')
-        position_amt = float(position.get('positionAmt', 0))
-        mark_price = float(position.get('markPrice', 0))
-        unrealized_pnl = float(position.get('unRealizedProfit', 0))
+    # Trades of one symbol receive identical changes, so each symbol flushes as a single request
+    async with TradeBatchWriter(supabase) as writer:
+        for position in binance_positions:
+            symbol = position.get('symbol', '')
+            position_amt = float(position.get('positionAmt', 0))
+            mark_price = float(position.get('markPrice', 0))
 
-        if not symbol or position_amt == 0:
-            continue
+            if not symbol or position_amt == 0:
+                continue
 
-        # Find corresponding trades in database
-        if symbol in db_trades_by_symbol:
-            for db_trade in db_trades_by_symbol[symbol]:
-                try:
+            # Find corresponding trades in database
+            if symbol in db_trades_by_symbol:
+                for db_trade in db_trades_by_symbol[symbol]:
                     # Update position information
                     update_data = {
                         'position_size': abs(position_amt),
@@ -1018,17 +1036,11 @@ async def sync_positions_to_database_enhanced(bot: DiscordBot, supabase: Client,
                         # Do not write unrealized_pnl to trades (column not in schema, and we avoid PnL for unfilled)
                         'updated_at': current_time
                     }
+                    await writer.stage(db_trade, update_data, validate=False)
+            else:
+                logging.warning(f"Position for {symbol} not found in database")
 
-                    supabase.table("trades").update(update_data).eq("id", db_trade['id']).execute()
-                    updates_made += 1
-                    logging.info(f"Updated position for trade {db_trade['id']} ({symbol})")
-
-                except Exception as e:
-                    logging.error(f"Error updating position for trade {db_trade['id']}: {e}")
-        else:
-            logging.warning(f"Position for {symbol} not found in database")
-
-    logging.info(f"Position sync completed: {updates_made} updates made")
+    logging.info(f"Position sync completed: {writer.stats['written']} updates made in {writer.stats['requests']} requests")
 
 
 async def cleanup_closed_positions_enhanced(bot: DiscordBot, supabase: Client, binance_positions: list, db_trades: list):
@@ -1117,7 +1129,7 @@ async def cleanup_closed_positions_enhanced(bot: DiscordBot, supabase: Client, b
             except Exception as e:
                 logging.warning(f"Could not set closed_at timestamp for trade {trade['id']}: {e}")
 
-            supabase.table("trades").update(update_data).eq("id", trade['id']).execute()
+            await write_trade_update(supabase, trade['id'], update_data)
             updates_made += 1
             logging.info(f"Marked trade {trade['id']} ({extract_symbol_from_trade(trade)}) as CLOSED with enriched data")
 
@@ -1237,7 +1249,7 @@ async def sync_closed_trades_from_history_enhanced(bot: DiscordBot, supabase: Cl
                         continue
 
                     # Update the trade
-                    supabase.table("trades").update(update_data).eq("id", trade['id']).execute()
+                    await write_trade_update(supabase, trade['id'], update_data)
                     updates_made += 1
                     logging.info(f"Updated trade {trade['id']} status to {update_data.get('status')}")
 
@@ -1284,10 +1296,27 @@ async def update_trade_as_closed(supabase: Client, trade_id: int, reason: str):
     }
     await update_trade_status(supabase, trade_id, updates)
 
+async def write_trade_update(supabase: Client, trade_id: int, updates: dict):
+    """
+    Write changes to a trade and keep the trade cache and analytics rollups in line.
+
+    Args:
+        supabase: Supabase client
+        trade_id: Trade ID to update
+        updates: Columns to change
+
+    Returns:
+        The Supabase response of the update
+    """
+    response = supabase.from_("trades").update(updates).eq("id", trade_id).execute()
+    get_trade_cache().invalidate(trade_id)
+    await record_trade_writes(supabase, response.data)
+    return response
+
 async def update_trade_status(supabase: Client, trade_id: int, updates: dict):
     """Helper function to update trade status"""
     try:
-        supabase.from_("trades").update(updates).eq("id", trade_id).execute()
+        await write_trade_update(supabase, trade_id, updates)
     except Exception as e:
         logging.error(f"Error updating trade {trade_id}: {e}")
 
@@ -1323,15 +1352,15 @@ async def update_trade_with_exit_data(supabase: Client, trade_id: int, exit_pric
     """
     try:
         # Get the trade data
-        response = supabase.from_("trades").select("*").eq("id", trade_id).single().execute()
-        trade = response.data
-
-        if not trade:
+        response = supabase.from_("trades").select(
+            trade_columns(TradeProjection.PNL, 'parsed_signal')).eq("id", trade_id).single().execute()
+        if not response.data:
             logging.error(f"Trade {trade_id} not found")
             return
+        trade = to_trade_rows([response.data], TradeProjection.PNL)[0]
 
         # Extract required data
-        parsed_signal = trade.get('parsed_signal', {})
+        parsed_signal = trade.json('parsed_signal', {}) or {}
         entry_prices = parsed_signal.get('entry_prices', [])
         position_type = parsed_signal.get('position_type', 'LONG')
         position_size = trade.get('position_size', 0)
@@ -1495,7 +1524,7 @@ async def sync_pnl_data_with_binance(bot, supabase):
                                 'last_pnl_sync': datetime.now(timezone.utc).isoformat()
                             }
 
-                            if update_trade_pnl(supabase, trade['id'], pnl_data):
+                            if await update_trade_pnl(supabase, trade['id'], pnl_data):
                                 logging.info(f"Updated P&L data for trade {trade['id']} (orderId: {order_id}): Entry={entry_price}, Realized={realized_pnl}, Unrealized={unrealized_pnl}")
                             else:
                                 logging.error(f"Failed to update P&L data for trade {trade['id']}")
@@ -1533,13 +1562,13 @@ async def backfill_trades_from_binance_history(bot, supabase, days: int = 30, sy
         response = (
             supabase
             .from_("trades")
-            .select("*")
+            .select(SYNC_TRADE_COLUMNS)
             .eq("status", "CLOSED")
             .eq("exchange", "binance")
             .gte("created_at", cutoff_iso)
             .execute()
         )
-        trades = response.data or []
+        trades = to_trade_rows(response.data, TradeProjection.SYNC)
 
         # Filter for trades missing PnL or exit price, or missing coin_symbol
         trades_needing_backfill = []
@@ -1571,7 +1600,6 @@ async def backfill_trades_from_binance_history(bot, supabase, days: int = 30, sy
                 success = await backfill_single_trade_with_lifecycle(bot, supabase, trade)
                 if success:
                     trades_updated += 1
-                await asyncio.sleep(0.1)  # Rate limiting
             except Exception as e:
                 logging.error(f"Error backfilling trade {trade.get('id')}: {e}")
 
@@ -1657,41 +1685,24 @@ async def get_income_for_trade_period(
             logging.warning(f"Symbol '{symbol}' contains invalid characters - skipping income fetch")
             return []
 
-        # Common invalid symbols that appear in the database
-        invalid_symbols = {
-            'APE', 'BT', 'ARC', 'AUCTION', 'AEVO', 'AERO', 'BANANAS31', 'APT', 'AAVE',
-            'ARKM', 'ARB', 'ALT', 'BNX', 'BILLY', 'AI16Z', 'BLAST', 'BSW', 'B2', 'API3',
-            'BON', 'AIXBT', 'AI', '1000BONK', 'ANIME', 'ARK', 'BOND', 'ANYONE', 'ADA',
-            'ALCH', 'BERA', 'ALU', 'ALGO', 'BONK', 'AGT', 'AVAX', 'AIN', 'ATOM',
-            '1000RATS', 'BMT', 'BB', 'AR', 'BENDOG', 'AVA', '0X0', 'BRETT', 'BANANA',
-            '1000TURBO', 'M', 'PUMPFUN', 'SPX', 'MYX', 'MOG', 'PENGU', 'SPK', 'CRV',
-            'HYPE', 'MAGIC', 'ZRC', 'FARTCOIN', 'IP', 'SYN', 'SKATE', 'SOON', 'PUMP'
-        }
-
-        if symbol.upper() in invalid_symbols:
-            logging.warning(f"Symbol '{symbol}' is in invalid symbols list - skipping income fetch")
-            return []
+        # Resolve the Binance pair (e.g. PEPE -> 1000PEPEUSDT) and skip coins Binance does not list
+        registry = get_symbol_registry()
+        if not registry.is_loaded('binance'):
+            await registry.refresh(binance_exchange=bot.binance_exchange)
+        if registry.is_loaded('binance'):
+            binance_symbol = registry.binance_symbol(symbol)
+            if not binance_symbol:
+                logging.warning(f"Symbol '{symbol}' is not listed on Binance futures - skipping income fetch")
+                return []
+        else:
+            binance_symbol = f"{symbol}USDT"
 
-        logging.info(f"Fetching {symbol}USDT income from {start_time} to {end_time}")
+        logging.info(f"Fetching {binance_symbol} income from {start_time} to {end_time}")
 
         async def fetch_window(window_start: int, window_end: int) -> List[Dict]:
-            all_incomes_local: List[Dict] = []
-            chunk_start_local = window_start
-            while chunk_start_local < window_end:
-                chunk_end_local = min(chunk_start_local + (7 * 24 * 60 * 60 * 1000), window_end)
-                try:
-                    chunk_incomes_local = await bot.binance_exchange.get_income_history(
-                        symbol=f"{symbol}USDT",
-                        start_time=chunk_start_local,
-                        end_time=chunk_end_local,
-                        limit=1000,
-                    )
-                    all_incomes_local.extend(chunk_incomes_local)
-                    await asyncio.sleep(0.5)  # Rate limiting
-                except Exception as e:
-                    logging.error(f"Error fetching chunk income: {e}")
-                chunk_start_local = chunk_end_local
-            return all_incomes_local
+            # Served from the local history warehouse; only uncovered ranges hit Binance
+            warehouse = get_history_warehouse(binance_exchange=bot.binance_exchange)
+            return await warehouse.get_income('binance', binance_symbol, window_start, window_end)
 
         # Strict window by default; optional minimal buffer can be provided by caller
         search_start = start_time - max(0, int(buffer_before_ms))
@@ -1777,7 +1788,8 @@ async def backfill_single_trade_with_lifecycle(bot, supabase, trade: Dict) -> Op
                 if exit_price_val <= 0 and hasattr(bot, 'binance_exchange') and bot.binance_exchange:
                     try:
                         # Use account trades endpoint for symbol & window
-                        trades_hist = await bot.binance_exchange.get_user_trades(symbol=f"{symbol}USDT", start_time=start_time, end_time=end_time)
+                        warehouse = get_history_warehouse(binance_exchange=bot.binance_exchange)
+                        trades_hist = await warehouse.get_user_trades('binance', f"{symbol}USDT", start_time, end_time)
                         if trades_hist:
                             last_trade = trades_hist[-1]
                             price_candidate = last_trade.get('price') or last_trade.get('p')
@@ -1820,7 +1832,7 @@ async def backfill_single_trade_with_lifecycle(bot, supabase, trade: Dict) -> Op
 
                 # Update if we prepared any fields
                 if len(fallback_update) > 1:
-                    response = supabase.from_("trades").update(fallback_update).eq("id", trade_id).execute()
+                    response = await write_trade_update(supabase, trade_id, fallback_update)
                     if response.data:
                         logging.info(f"✅ Fallback backfill updated trade {trade_id}: exit={fallback_update.get('exit_price')} pnl={fallback_update.get('pnl_usd')}")
                         return True
@@ -1902,7 +1914,7 @@ async def backfill_single_trade_with_lifecycle(bot, supabase, trade: Dict) -> Op
 
         # Update database
         if len(update_data) > 1:  # More than just updated_at
-            response = supabase.from_("trades").update(update_data).eq("id", trade_id).execute()
+            response = await write_trade_update(supabase, trade_id, update_data)
             if response.data:
                 logging.info(f"✅ Successfully updated trade {trade_id}")
             return True
@@ -1914,11 +1926,11 @@ async def backfill_single_trade_with_lifecycle(bot, supabase, trade: Dict) -> Op
         return False
 
 
-def update_trade_pnl(supabase, trade_id: int, pnl_data: dict) -> bool:
+async def update_trade_pnl(supabase, trade_id: int, pnl_data: dict) -> bool:
     """Update trade record with P&L data"""
     try:
         pnl_data['updated_at'] = datetime.now(timezone.utc).isoformat()
-        supabase.table("trades").update(pnl_data).eq("id", trade_id).execute()
+        await write_trade_update(supabase, trade_id, pnl_data)
         return True
     except Exception as e:
         logging.error(f"Failed to update trade P&L: {e}")
@@ -1929,10 +1941,10 @@ def get_trades_needing_pnl_sync(supabase) -> list:
     """Get trades that need P&L data sync"""
     try:
         # Get trades without P&L data or with old sync timestamp
-        result = supabase.table("trades").select("*").or_(
+        result = supabase.table("trades").select(SYNC_TRADE_COLUMNS).or_(
             "entry_price.is.null,last_pnl_sync.is.null"
         ).execute()
-        return result.data or []
+        return to_trade_rows(result.data, TradeProjection.SYNC)
     except Exception as e:
         logging.error(f"Failed to get trades needing P&L sync: {e}")
         return []
@@ -2045,7 +2057,7 @@ async def cleanup_closed_kucoin_positions_enhanced(bot, supabase: Client, kucoin
             except Exception as e:
                 logging.warning(f"Could not set closed_at timestamp for KuCoin trade {trade['id']}: {e}")
 
-            supabase.table("trades").update(update_data).eq("id", trade['id']).execute()
+            await write_trade_update(supabase, trade['id'], update_data)
             updates_made += 1
             logging.info(f"Marked KuCoin trade {trade['id']} ({extract_symbol_from_trade(trade)}) as CLOSED with enriched data")
 
@@ -2181,14 +2193,10 @@ async def _get_kucoin_exit_info_from_trades(
         if not kucoin_symbol:
             kucoin_symbol = _convert_to_kucoin_futures_symbol(symbol)
 
-        # Get trade history for the symbol within time window
+        # Get trade history for the symbol within time window (local warehouse, gaps fetched once)
         try:
-            trade_history = await bot.kucoin_exchange.get_user_trades(
-                symbol=kucoin_symbol,
-                start_time=start_time_ms,
-                end_time=end_time_ms,
-                limit=1000
-            )
+            warehouse = get_history_warehouse(kucoin_exchange=bot.kucoin_exchange)
+            trade_history = await warehouse.get_user_trades('kucoin', kucoin_symbol, start_time_ms, end_time_ms)
         except Exception as e:
             error_msg = str(e).lower()
             if 'timerangeinvalid' in error_msg or 'timerange' in error_msg:
@@ -2548,7 +2556,7 @@ async def backfill_kucoin_trades_from_history_enhanced(bot, supabase: Client, db
 
                         # Update database if we have changes
                         if len(update_data) > 1:  # More than just updated_at
-                            supabase.table("trades").update(update_data).eq("id", trade_id).execute()
+                            await write_trade_update(supabase, trade_id, update_data)
                             updates_made += 1
                             logging.info(f"✅ Fallback backfilled KuCoin trade {trade_id}: {list(update_data.keys())}")
 
@@ -2620,7 +2628,7 @@ async def backfill_kucoin_trades_from_history_enhanced(bot, supabase: Client, db
 
                 # Update database if we have changes
                 if len(update_data) > 1:  # More than just updated_at
-                    supabase.table("trades").update(update_data).eq("id", trade_id).execute()
+                    await write_trade_update(supabase, trade_id, update_data)
                     updates_made += 1
                     logging.info(f"✅ Backfilled KuCoin trade {trade_id}: {list(update_data.keys())}")
 
@@ -2652,12 +2660,11 @@ async def sync_missing_trade_data_comprehensive(bot: DiscordBot, supabase: Clien
         cutoff_iso = cutoff.isoformat()
 
         # Get all trades from the period
-        response = supabase.from_("trades").select("*").gte("created_at", cutoff_iso).execute()
-        all_trades = response.data or []
+        response = supabase.from_("trades").select(SYNC_TRADE_COLUMNS).gte("created_at", cutoff_iso).execute()
+        all_trades = to_trade_rows(response.data, TradeProjection.SYNC)
 
         logging.info(f"Found {len(all_trades)} trades to check for missing data")
 
-        trades_updated = 0
         updates_by_field = {
             'entry_price': 0,
             'exit_price': 0,
@@ -2665,6 +2672,7 @@ async def sync_missing_trade_data_comprehensive(bot: DiscordBot, supabase: Clien
             'pnl_usd': 0
         }
 
+        writer = TradeBatchWriter(supabase)
         for trade in all_trades:
             try:
                 trade_id = trade.get('id')
@@ -2722,17 +2730,18 @@ async def sync_missing_trade_data_comprehensive(bot: DiscordBot, supabase: Clien
                     if enriched:
                         update_data.update(enriched)
 
-                # Update database if we have data
+                # Stage the update; the writer flushes in chunks
                 if update_data:
-                    update_data['updated_at'] = datetime.now(timezone.utc).isoformat()
-                    supabase.table("trades").update(update_data).eq("id", trade_id).execute()
-                    trades_updated += 1
-                    logging.info(f"✅ Updated trade {trade_id} ({trade.get('coin_symbol')}): {list(update_data.keys())}")
+                    await writer.stage(trade, update_data, validate=False)
+                    logging.info(f"✅ Staged update for trade {trade_id} ({trade.get('coin_symbol')}): {list(update_data.keys())}")
 
             except Exception as e:
                 logging.error(f"Error syncing trade {trade.get('id')}: {e}")
                 continue
 
+        await writer.flush()
+        trades_updated = writer.stats['written']
+
         logging.info(f"✅ Comprehensive sync completed: {trades_updated} trades updated")
         logging.info(f"   - entry_price: {updates_by_field['entry_price']}")
         logging.info(f"   - exit_price: {updates_by_field['exit_price']}")
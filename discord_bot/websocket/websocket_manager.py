@@ -11,6 +11,7 @@ import sys
 import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'websocket'))
 
+from config import settings as cfg
 from src.websocket import WebSocketManager, SyncManager
 from discord_bot.database import DatabaseManager
 
@@ -223,6 +224,16 @@ class DiscordBotWebSocketManager:
             self.ws_manager.register_handler('disconnection', handle_disconnection)
             self.ws_manager.register_handler('error', handle_error)
 
+            # Keep the exchange's account state mirror current from the same stream
+            account_state = getattr(self.bot.binance_exchange, 'account_state', None)
+            if account_state is not None:
+                account_state.register_with(self.ws_manager)
+
+            # Maker pricing and depth checks read the order book streamed on the market data connection
+            book_stream = getattr(self.bot.binance_exchange, 'book_stream', None)
+            if book_stream is not None:
+                book_stream.register_with(self.ws_manager)
+
     async def start(self):
         """Start the WebSocket manager."""
         try:
@@ -233,6 +244,10 @@ class DiscordBotWebSocketManager:
             logger.info("Starting WebSocket manager for DiscordBot...")
             await self.ws_manager.start()
             self.is_running = True
+
+            book_stream = getattr(self.bot.binance_exchange, 'book_stream', None)
+            if book_stream is not None and cfg.ORDER_BOOK_STREAM_ENABLED:
+                book_stream.start()
             self.last_sync_time = datetime.now(timezone.utc)
 
             logger.info("WebSocket manager started successfully")
@@ -247,6 +262,9 @@ class DiscordBotWebSocketManager:
         try:
             if self.ws_manager:
                 logger.info("Stopping WebSocket manager...")
+                book_stream = getattr(self.bot.binance_exchange, 'book_stream', None)
+                if book_stream is not None:
+                    await book_stream.stop()
                 await self.ws_manager.stop()
                 self.is_running = False
                 logger.info("WebSocket manager stopped successfully")
@@ -25,6 +25,7 @@ sys.path.append(str(Path(__file__).parent.parent))
 
 from src.exchange.core.exchange_factory import ExchangeFactory
 from src.exchange.core.exchange_config import ExchangeConfig
+from src.exchange.history import get_history_warehouse
 from discord_bot.utils.trade_retry_utils import initialize_clients, safe_parse_binance_response
 # Setup logging
 logging.basicConfig(
@@ -120,28 +121,10 @@ class BinanceHistoryBackfiller:
 
             all_trades = []
 
-            # If we have a time range, fetch in 7-day chunks
-            if start_time > 0 and end_time > start_time:
-                chunk_start = start_time
-                while chunk_start < end_time:
-                    chunk_end = min(chunk_start + (7 * 24 * 60 * 60 * 1000), end_time)  # 7 days in milliseconds
-
-                    logger.info(f"Fetching trades from {datetime.fromtimestamp(chunk_start/1000, tz=timezone.utc)} to {datetime.fromtimestamp(chunk_end/1000, tz=timezone.utc)}")
-
-                    try:
-                        chunk_trades = await self.exchange.get_user_trades(
-                            symbol=symbol,
-                            limit=limit,
-                            from_id=from_id,
-                            start_time=chunk_start,
-                            end_time=chunk_end
-                        )
-                        all_trades.extend(chunk_trades)
-                        await asyncio.sleep(0.5)  # Rate limiting between chunks
-                    except Exception as e:
-                        logger.error(f"Error fetching chunk trades: {e}")
-
-                    chunk_start = chunk_end
+            # With a time range, read from the local history warehouse (only gaps hit Binance)
+            if start_time > 0 and end_time > start_time and not from_id:
+                warehouse = get_history_warehouse(binance_exchange=self.exchange)
+                all_trades = await warehouse.get_user_trades('binance', symbol, start_time, end_time)
             else:
                 # Single request without time range
                 all_trades = await self.exchange.get_user_trades(
@@ -104,7 +104,7 @@ class BinanceStatusChecker:
                 logger.error("Binance exchange not initialized")
                 return []
 
-            positions = await self.binance_exchange.get_futures_position_information()
+            positions = await self.binance_exchange.get_futures_position_information(include_risk=True)
 
             # Filter out positions with zero size
             active_positions = [
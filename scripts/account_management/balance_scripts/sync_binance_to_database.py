@@ -77,7 +77,7 @@ class BinanceDatabaseSync:
     async def get_binance_positions(self) -> List[Dict]:
         """Get all positions from Binance"""
         try:
-            positions = await self.binance_exchange.get_futures_position_information()
+            positions = await self.binance_exchange.get_futures_position_information(include_risk=True)
 
             # Filter active positions (non-zero size)
             active_positions = [
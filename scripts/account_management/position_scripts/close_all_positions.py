@@ -367,7 +367,7 @@ class BinanceEmergencyClose:
     async def get_all_open_futures_positions(self) -> List[Dict]:
         """Get all open futures positions"""
         try:
-            positions = await self.exchange.get_futures_position_information()
+            positions = await self.exchange.get_futures_position_information(include_risk=True)
             # Filter out positions with zero quantity
             open_positions = [
                 pos for pos in positions
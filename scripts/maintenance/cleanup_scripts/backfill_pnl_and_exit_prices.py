@@ -25,6 +25,7 @@ from discord_bot.utils.trade_retry_utils import (
 )
 from src.exchange.kucoin.kucoin_exchange import KucoinExchange
 from src.exchange.kucoin.kucoin_symbol_converter import KucoinSymbolConverter
+from src.exchange.history import get_history_warehouse
 
 # --- Setup ---
 load_dotenv()
@@ -39,6 +40,7 @@ class BinancePnLBackfiller:
         self.bot = bot
         self.supabase = supabase
         self.binance_exchange = bot.binance_exchange
+        self.history = get_history_warehouse(binance_exchange=self.binance_exchange)
 
     def parse_timestamp(self, timestamp_str: str) -> Optional[int]:
         """Parse timestamp string to milliseconds."""
@@ -121,25 +123,7 @@ class BinancePnLBackfiller:
             search_start = start_time - buffer_time
             search_end = end_time + buffer_time
 
-            all_incomes = []
-            chunk_start = search_start
-
-            while chunk_start < search_end:
-                chunk_end = min(chunk_start + (7 * 24 * 60 * 60 * 1000), search_end)
-
-                try:
-                    chunk_incomes = await self.binance_exchange.get_income_history(
-                        symbol=f"{symbol}USDT",
-                        start_time=chunk_start,
-                        end_time=chunk_end,
-                        limit=1000,
-                    )
-                    all_incomes.extend(chunk_incomes)
-                    await asyncio.sleep(0.5)  # Rate limiting
-                except Exception as e:
-                    logger.error(f"Error fetching chunk income: {e}")
-
-                chunk_start = chunk_end
+            all_incomes = await self.history.get_income('binance', f"{symbol}USDT", search_start, search_end)
 
             # Filter to exact trade period
             filtered_incomes = []
@@ -460,9 +444,6 @@ class BinancePnLBackfiller:
 
                     total_processed += 1
 
-                    # Rate limiting
-                    await asyncio.sleep(0.5)
-
                 except Exception as e:
                     logger.error(f"Error processing trade {trade_id}: {e}")
                     total_errors += 1
@@ -531,6 +512,7 @@ class KucoinPnLBackfiller:
         self.supabase = supabase
         self.symbol_converter = KucoinSymbolConverter()
         self.used_close_ids: Set[str] = set()
+        self.history = get_history_warehouse(kucoin_exchange=kucoin_exchange)
 
     def parse_timestamp(self, timestamp_str: str) -> Optional[int]:
         """Parse timestamp string to milliseconds."""
@@ -607,29 +589,9 @@ class KucoinPnLBackfiller:
             return kucoin_symbol
 
     async def fetch_position_history(self, kucoin_symbol: str, start_ms: int, end_ms: int) -> List[Dict]:
-        """Fetch position history from KuCoin API with fallback logic."""
+        """Fetch position history for a symbol from the local history warehouse."""
         try:
-            params = {"symbol": kucoin_symbol, "startAt": start_ms, "endAt": end_ms}
-            pos_resp = await self.kucoin_exchange._make_direct_api_call('GET', '/api/v1/history-positions', params)
-
-            records: List[Dict] = []
-            if isinstance(pos_resp, list):
-                records = pos_resp
-            elif isinstance(pos_resp, dict):
-                items = pos_resp.get('items') or pos_resp.get('data') or []
-                if isinstance(items, list):
-                    records = items
-
-            if not records:
-                params_no_symbol = {"startAt": start_ms, "endAt": end_ms}
-                pos_resp2 = await self.kucoin_exchange._make_direct_api_call('GET', '/api/v1/history-positions', params_no_symbol)
-                if isinstance(pos_resp2, list):
-                    records = pos_resp2
-                elif isinstance(pos_resp2, dict):
-                    items2 = pos_resp2.get('items') or pos_resp2.get('data') or []
-                    if isinstance(items2, list):
-                        records = items2
-
+            records = await self.history.get_position_history('kucoin', kucoin_symbol, start_ms, end_ms)
             return [r for r in records if str(r.get('symbol') or '') == kucoin_symbol]
         except Exception as e:
             logger.error(f"Error fetching position history: {e}")
@@ -899,7 +861,6 @@ class KucoinPnLBackfiller:
                             logger.info(f"⚠️ Trade {trade_id} processed but no P&L found")
 
                     total_processed += 1
-                    await asyncio.sleep(0.5)
 
                 except Exception as e:
                     logger.error(f"Error processing trade {trade_id}: {e}")
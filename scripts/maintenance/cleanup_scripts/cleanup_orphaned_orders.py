@@ -85,7 +85,7 @@ class OrphanedOrdersCleanup:
                 logger.error("Binance exchange not initialized")
                 return []
 
-            positions = await self.binance_exchange.get_futures_position_information()
+            positions = await self.binance_exchange.get_futures_position_information(include_risk=True)
 
             # Filter out positions with zero size
             active_positions = [
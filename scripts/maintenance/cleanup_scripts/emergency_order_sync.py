@@ -72,7 +72,7 @@ async def emergency_order_sync():
 
         # Step 3: Get all positions from Binance
         logger.info("📊 Step 3: Fetching positions from Binance...")
-        binance_positions = await exchange.get_futures_position_information()
+        binance_positions = await exchange.get_futures_position_information(include_risk=True)
         active_positions = [p for p in binance_positions if float(p.get('positionAmt', '0')) != 0]
         logger.info(f"Found {len(active_positions)} active positions on Binance")
 
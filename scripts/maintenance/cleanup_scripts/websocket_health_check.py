@@ -56,7 +56,7 @@ async def websocket_health_check():
             logger.info("🧪 Testing order status updates...")
 
             # Get current positions
-            positions = await bot.binance_exchange.get_futures_position_information()
+            positions = await bot.binance_exchange.get_futures_position_information(include_risk=True)
             logger.info(f"💰 Current positions: {len(positions)}")
 
             for position in positions:
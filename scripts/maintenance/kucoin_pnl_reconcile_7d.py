@@ -26,6 +26,14 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..",
 from config import settings
 from supabase import create_client, Client
 from src.exchange.kucoin.kucoin_exchange import KucoinExchange
+from src.exchange.history import get_history_warehouse
+from src.database.core.trade_batch_writer import TradeBatchWriter
+from src.services.analytics.fill_aggregator import (
+    FillFrame,
+    TradeWindow,
+    aggregate_fills,
+    select_position_record,
+)
 
 sup_url = settings.SUPABASE_URL or ""
 sup_key = settings.SUPABASE_KEY or ""
@@ -89,7 +97,10 @@ async def fetch_all_position_history(
     end_ms: int
 ) -> List[Dict[str, Any]]:
     """
-    Fetch all position history records with pagination support.
+    Fetch all position history records for a symbol from the local history warehouse.
+
+    Only time ranges not yet downloaded are requested from KuCoin; paging and
+    the symbol-less fallback are handled by the warehouse fetcher.
 
     Args:
         ex: KuCoin exchange instance
@@ -100,110 +111,15 @@ async def fetch_all_position_history(
     Returns:
         List of position history records
     """
-    all_records: List[Dict[str, Any]] = []
-    current_page = 1
-    page_size = 50
-    max_pages = 100  # Safety limit
-
     logger.info(
         f"Fetching position history for {kucoin_symbol} "
         f"from {datetime.fromtimestamp(start_ms/1000, tz=timezone.utc).isoformat()} "
         f"to {datetime.fromtimestamp(end_ms/1000, tz=timezone.utc).isoformat()}"
     )
-
-    while current_page <= max_pages:
-        params = {
-            "symbol": kucoin_symbol,
-            "startAt": start_ms,
-            "endAt": end_ms,
-            "currentPage": current_page,
-            "pageSize": page_size
-        }
-
-        try:
-            logger.debug(
-                f"Fetching page {current_page} of position history for {kucoin_symbol} "
-                f"(params: {json.dumps(params, default=str)})"
-            )
-            pos_resp = await ex._make_direct_api_call('GET', '/api/v1/history-positions', params)
-
-            # Log raw response structure for debugging
-            if current_page == 1:
-                logger.debug(f"Raw API response type: {type(pos_resp)}, structure: {str(pos_resp)[:200] if pos_resp else 'None'}")
-
-            # Handle different response formats
-            page_records: List[Dict[str, Any]] = []
-
-            if isinstance(pos_resp, list):
-                page_records = pos_resp
-            elif isinstance(pos_resp, dict):
-                # Check for paginated response structure
-                if 'items' in pos_resp:
-                    page_records = pos_resp.get('items', [])
-                elif 'data' in pos_resp:
-                    data = pos_resp.get('data')
-                    if isinstance(data, list):
-                        page_records = data
-                    elif isinstance(data, dict) and 'items' in data:
-                        page_records = data.get('items', [])
-                else:
-                    # Try to extract from root level
-                    items = pos_resp.get('items') or pos_resp.get('data') or []
-                    if isinstance(items, list):
-                        page_records = items
-
-            if not page_records:
-                # Try fallback without symbol filter
-                if current_page == 1:
-                    logger.debug(f"No records with symbol filter, trying without symbol for page {current_page}")
-                    params_no_symbol = {
-                        "startAt": start_ms,
-                        "endAt": end_ms,
-                        "currentPage": current_page,
-                        "pageSize": page_size
-                    }
-                    pos_resp2 = await ex._make_direct_api_call('GET', '/api/v1/history-positions', params_no_symbol)
-
-                    if isinstance(pos_resp2, list):
-                        page_records = pos_resp2
-                    elif isinstance(pos_resp2, dict):
-                        if 'items' in pos_resp2:
-                            page_records = pos_resp2.get('items', [])
-                        elif 'data' in pos_resp2:
-                            data2 = pos_resp2.get('data')
-                            if isinstance(data2, list):
-                                page_records = data2
-                            elif isinstance(data2, dict) and 'items' in data2:
-                                page_records = data2.get('items', [])
-
-                # Filter to symbol if we got mixed results
-                if page_records:
-                    page_records = [r for r in page_records if str(r.get('symbol') or '') == kucoin_symbol]
-
-            if not page_records:
-                logger.debug(f"No more records found at page {current_page}")
-                break
-
-            all_records.extend(page_records)
-            logger.debug(f"Page {current_page}: Found {len(page_records)} records (total: {len(all_records)})")
-
-            # Check if there are more pages
-            # KuCoin API typically returns fewer records than pageSize when on last page
-            if len(page_records) < page_size:
-                logger.debug(f"Last page reached (got {len(page_records)} < {page_size} records)")
-                break
-
-            current_page += 1
-
-        except Exception as e:
-            logger.error(
-                f"Error fetching position history page {current_page} for {kucoin_symbol}: {e}",
-                exc_info=True
-            )
-            break
-
-    logger.info(f"Fetched {len(all_records)} total position history records across {current_page} page(s)")
-    return all_records
+    warehouse = get_history_warehouse(kucoin_exchange=ex)
+    records = await warehouse.get_position_history('kucoin', kucoin_symbol, start_ms, end_ms)
+    logger.info(f"Fetched {len(records)} total position history records")
+    return records
 
 
 async def calculate_pnl_from_fills(
@@ -238,11 +154,8 @@ async def calculate_pnl_from_fills(
 
     try:
         # Fetch all fills in the time window
-        fills = await ex.get_user_trades(
-            symbol=kucoin_symbol,
-            start_time=start_ms,
-            end_time=end_ms,
-            limit=1000
+        fills = await get_history_warehouse(kucoin_exchange=ex).get_user_trades(
+            'kucoin', kucoin_symbol, start_ms, end_ms
         )
 
         if not fills:
@@ -251,115 +164,23 @@ async def calculate_pnl_from_fills(
 
         logger.info(f"Trade {trade.get('id')} ({symbol}): Found {len(fills)} fills")
 
-        # Determine expected entry and exit sides
-        if position_type == 'LONG':
-            entry_side = 'BUY'
-            exit_side = 'SELL'
-        elif position_type == 'SHORT':
-            entry_side = 'SELL'
-            exit_side = 'BUY'
-        else:
+        if position_type not in ('LONG', 'SHORT'):
             logger.warning(f"Trade {trade.get('id')} ({symbol}): Unknown position type: {position_type}")
             return None
 
-        # Filter fills by side and check if already used
-        entry_fills: List[Dict[str, Any]] = []
-        exit_fills: List[Dict[str, Any]] = []
-
-        # Get exchange order ID to match fills
-        exchange_order_id = str(trade.get('exchange_order_id') or trade.get('kucoin_order_id') or '')
-
-        for fill in fills:
-            fill_id = str(fill.get('tradeId') or fill.get('id') or fill.get('orderId') or '')
-            if fill_id and fill_id in used_fill_ids:
-                continue
+        # Aggregate unused fills in the window (entry/exit by side, VWAPs, fees, realized PnL)
+        window = TradeWindow(trade.get('id'), position_type, start_ms, end_ms)
+        agg = aggregate_fills([window], FillFrame(fills, exclude_ids=used_fill_ids))[window.trade_id]
 
-            # Check side - handle various field names and formats
-            fill_side = str(fill.get('side') or fill.get('liquidity') or '').upper()
-            fill_order_id = str(fill.get('orderId') or fill.get('order_id') or '')
-
-            # If we have an order ID, prefer matching by order ID first
-            if exchange_order_id and fill_order_id:
-                if fill_order_id == exchange_order_id:
-                    # This fill belongs to our trade
-                    if fill_side in (entry_side, 'MAKER', 'TAKER'):
-                        entry_fills.append(fill)
-                    elif fill_side in (exit_side, 'MAKER', 'TAKER'):
-                        exit_fills.append(fill)
-                    continue
-
-            # Fallback to side matching
-            if fill_side == entry_side:
-                entry_fills.append(fill)
-            elif fill_side == exit_side:
-                exit_fills.append(fill)
-            # Also check for reduce-only orders (exits)
-            elif fill.get('reduceOnly') or fill.get('reduce_only'):
-                exit_fills.append(fill)
-
-        if not entry_fills and not exit_fills:
-            logger.warning(f"Trade {trade.get('id')} ({symbol}): No matching fills found (entry: {len(entry_fills)}, exit: {len(exit_fills)})")
+        if not agg.has_fills:
+            logger.warning(f"Trade {trade.get('id')} ({symbol}): No matching fills found (entry: 0, exit: 0)")
             return None
 
-        # Calculate realized PnL from exit fills
-        # KuCoin fills include realizedPnl field for exit trades
-        total_realized_pnl = 0.0
-        total_commission = 0.0
-        total_entry_value = 0.0
-        total_exit_value = 0.0
-        entry_qty = 0.0
-        exit_qty = 0.0
-
-        # Process entry fills
-        for fill in entry_fills:
-            try:
-                qty = float(fill.get('size') or fill.get('qty') or 0)
-                price = float(fill.get('price') or 0)
-                commission = float(fill.get('fee') or fill.get('commission') or 0)
-
-                entry_qty += qty
-                total_entry_value += qty * price
-                total_commission += commission
-            except (ValueError, TypeError) as e:
-                logger.warning(f"Error processing entry fill: {e}")
-
-        # Process exit fills (these contain realized PnL)
-        exit_fill_ids: List[str] = []
-        for fill in exit_fills:
-            try:
-                fill_id = str(fill.get('tradeId') or fill.get('id') or '')
-                if fill_id:
-                    exit_fill_ids.append(fill_id)
-
-                # Try to get realized PnL directly from fill
-                realized_pnl = fill.get('realizedPnl') or fill.get('realisedPnl') or fill.get('pnl')
-                if realized_pnl is not None:
-                    total_realized_pnl += float(realized_pnl)
-                else:
-                    # Calculate from price difference if PnL not directly available
-                    qty = float(fill.get('size') or fill.get('qty') or 0)
-                    price = float(fill.get('price') or 0)
-                    exit_qty += qty
-                    total_exit_value += qty * price
-
-                commission = float(fill.get('fee') or fill.get('commission') or 0)
-                total_commission += commission
-            except (ValueError, TypeError) as e:
-                logger.warning(f"Error processing exit fill: {e}")
-
-        # If we didn't get realized PnL directly, calculate it
-        if total_realized_pnl == 0.0 and total_entry_value > 0 and total_exit_value > 0:
-            if position_type == 'LONG':
-                total_realized_pnl = total_exit_value - total_entry_value
-            else:  # SHORT
-                total_realized_pnl = total_entry_value - total_exit_value
-
-        # Net PnL = realized PnL - commissions
-        net_pnl = total_realized_pnl - total_commission
-
-        # Calculate average entry and exit prices
-        avg_entry_price = total_entry_value / entry_qty if entry_qty > 0 else None
-        avg_exit_price = total_exit_value / exit_qty if exit_qty > 0 else None
+        total_realized_pnl = agg.realized_pnl
+        total_commission = agg.fees
+        net_pnl = agg.net_pnl
+        avg_entry_price = agg.entry_price
+        avg_exit_price = agg.exit_price
 
         # If we don't have exit price from fills, try to get it from trade data
         if not avg_exit_price:
@@ -373,13 +194,11 @@ async def calculate_pnl_from_fills(
         logger.info(
             f"Trade {trade.get('id')} ({symbol}): Fills-based PnL calculation - "
             f"Realized: {total_realized_pnl:.8f}, Commission: {total_commission:.8f}, "
-            f"Net: {net_pnl:.8f}, Entry Qty: {entry_qty}, Exit Qty: {exit_qty}"
+            f"Net: {net_pnl:.8f}, Entry Qty: {agg.entry_qty}, Exit Qty: {agg.exit_qty}"
         )
 
         # Mark fill IDs as used
-        for fill_id in exit_fill_ids:
-            if fill_id:
-                used_fill_ids.add(fill_id)
+        used_fill_ids.update(agg.exit_fill_ids)
 
         # Compare with existing PnL - don't overwrite correct values
         db_pnl = float(trade.get('pnl_usd') or trade.get('net_pnl') or 0)
@@ -408,8 +227,8 @@ async def calculate_pnl_from_fills(
             "symbol": kucoin_symbol,
             "realized_pnl": total_realized_pnl,
             "commission": total_commission,
-            "entry_fills": len(entry_fills),
-            "exit_fills": len(exit_fills),
+            "entry_fills": agg.entry_fills,
+            "exit_fills": agg.exit_fills,
             "avg_entry_price": avg_entry_price,
             "avg_exit_price": avg_exit_price
         }
@@ -500,10 +319,8 @@ async def reconcile_trade(
             return 0
 
     position_type = str(trade.get('signal_type') or '').upper()
-    expected_close_type = 'CLOSE_LONG' if position_type == 'LONG' else ('CLOSE_SHORT' if position_type == 'SHORT' else None)
-    expected_side = 'LONG' if position_type == 'LONG' else ('SHORT' if position_type == 'SHORT' else None)
 
-    # Get position size and order ID from trade for better matching
+    # Get position size from trade for better matching
     position_size = None
     try:
         pos_size_str = trade.get('position_size')
@@ -512,141 +329,33 @@ async def reconcile_trade(
     except (ValueError, TypeError):
         pass
 
-    # Get exchange order ID to distinguish trades
-    exchange_order_id = str(trade.get('exchange_order_id') or trade.get('kucoin_order_id') or '')
-
-    strict_candidates: List[Dict[str, Any]] = []
-    filtered_reasons = {
-        'used_closeId': 0,
-        'openTime_too_far': 0,
-        'closeTime_too_far': 0,
-        'type_mismatch': 0,
-        'side_mismatch': 0,
-        'size_mismatch': 0
-    }
-
-    for r in records:
-        # Exclude already used closeIds to prevent double-counting
-        cid = str(r.get('closeId') or '')
-        if cid and cid in used_close_ids:
-            filtered_reasons['used_closeId'] += 1
-            continue
-
-        o_ms = get_ms(r.get('openTime'))
-        c_ms = get_ms(r.get('closeTime'))
-
-        # Time window matching with wider tolerance
-        # openTime should be reasonably close to created_at (accounting for order processing)
-        if o_ms:
-            open_time_diff = abs(o_ms - created_ms)
-            if open_time_diff > created_pad_ms:
-                filtered_reasons['openTime_too_far'] += 1
-                continue
-
-        # closeTime should be reasonably close to closed_at
-        if c_ms:
-            close_time_diff = abs(c_ms - closed_ms)
-            if close_time_diff > close_pad_ms:
-                filtered_reasons['closeTime_too_far'] += 1
-                continue
-
-        # Position size matching (if available) - helps distinguish consecutive similar trades
-        if position_size is not None:
-            try:
-                rec_size = float(r.get('size', 0))
-                if rec_size > 0:
-                    size_diff_pct = abs(position_size - rec_size) / position_size if position_size > 0 else 1.0
-                    # Allow up to 20% size difference (for partial fills, adjustments, etc.)
-                    if size_diff_pct > 0.20:
-                        filtered_reasons['size_mismatch'] += 1
-                        continue
-            except (ValueError, TypeError):
-                pass
-
-        # Side/type matching when provided
-        r_type = str(r.get('type') or '').upper()
-        r_side = str(r.get('side') or '').upper()
-        if expected_close_type and r_type not in (expected_close_type, ''):
-            # Allow empty type but prefer matching types
-            if expected_close_type not in r_type:
-                filtered_reasons['type_mismatch'] += 1
-                continue
-        if expected_side and r_side not in (expected_side, ''):
-            filtered_reasons['side_mismatch'] += 1
-            continue
-
-        strict_candidates.append(r)
-
-    if not strict_candidates:
+    # Filter (time pads, size, close type, side, unused closeId) and rank by
+    # close time, open time and size match in one vectorized pass
+    match = select_position_record(
+        records, created_ms, closed_ms, position_type, position_size, used_close_ids,
+        created_pad_ms=created_pad_ms, close_pad_ms=close_pad_ms
+    )
+    if match.used_fallback:
         logger.info(
             f"Trade {trade.get('id')} ({symbol}): No strict candidates. "
-            f"Filtered: {filtered_reasons}, total records: {len(records)}"
+            f"Filtered: {match.filtered_reasons}, total records: {len(records)}"
         )
-        # fall back to closest by time, still respecting used_close_ids and time windows
-        fallback_candidates = []
-        for r in records:
-            cid = str(r.get('closeId') or '')
-            if cid and cid in used_close_ids:
-                continue
-            o_ms = get_ms(r.get('openTime'))
-            c_ms = get_ms(r.get('closeTime'))
-            # Still require reasonable time windows even in fallback (wider tolerance)
-            if o_ms and abs(o_ms - created_ms) > created_pad_ms * 2:  # Allow 20 minutes in fallback
-                continue
-            if c_ms and abs(c_ms - closed_ms) > close_pad_ms * 2:  # Allow 60 minutes in fallback
-                continue
-            fallback_candidates.append(r)
-        strict_candidates = fallback_candidates
-        if not strict_candidates:
-            logger.warning(
-                f"Trade {trade.get('id')} ({symbol}): No position history candidates found after filtering. "
-                f"Created: {datetime.fromtimestamp(created_ms/1000, tz=timezone.utc).isoformat()}, "
-                f"Closed: {datetime.fromtimestamp(closed_ms/1000, tz=timezone.utc).isoformat()}, "
-                f"Filter reasons: {filtered_reasons}, Total records: {len(records)}. "
-                f"Will try fills-based PnL calculation as fallback."
-            )
-            # Fallback to fills-based calculation
-            if used_fill_ids is None:
-                used_fill_ids = set()
-            return await calculate_pnl_from_fills(ex, trade, kucoin_symbol, start_ms, end_ms, used_fill_ids)
-        logger.info(f"Trade {trade.get('id')} ({symbol}): Using {len(fallback_candidates)} fallback candidates")
-
-    # Enhanced scoring function: considers close time, open time, and position size match
-    def score(r: Dict[str, Any]) -> Tuple[int, int, int]:
-        c_ms = get_ms(r.get('closeTime'))
-        o_ms = get_ms(r.get('openTime'))
-        # Primary: close time proximity
-        close_score = abs(c_ms - closed_ms) if c_ms else 1_000_000_000
-        # Secondary: open time proximity
-        open_score = abs(o_ms - created_ms) if o_ms else 1_000_000_000
-        # Tertiary: position size match penalty (if both available)
-        size_penalty = 0
-        if position_size is not None:
-            try:
-                rec_size = float(r.get('size', 0))
-                if rec_size > 0:
-                    size_diff = abs(position_size - rec_size)
-                    # Penalize if size difference is more than 1% of trade size
-                    if size_diff > max(0.01, position_size * 0.01):
-                        size_penalty = 1_000_000
-            except (ValueError, TypeError):
-                pass
-        return (close_score, open_score, size_penalty)
-
-    if not strict_candidates:
-        logger.warning(f"Trade {trade.get('id')}: No candidates available for scoring")
-        # Fallback to fills-based calculation
-        if used_fill_ids is None:
-            used_fill_ids = set()
-        return await calculate_pnl_from_fills(ex, trade, kucoin_symbol, start_ms, end_ms, used_fill_ids)
 
-    rec = min(strict_candidates, key=score)
+    rec = match.record
     if not rec:
-        logger.warning(f"Trade {trade.get('id')}: No record selected after scoring")
+        logger.warning(
+            f"Trade {trade.get('id')} ({symbol}): No position history candidates found after filtering. "
+            f"Created: {datetime.fromtimestamp(created_ms/1000, tz=timezone.utc).isoformat()}, "
+            f"Closed: {datetime.fromtimestamp(closed_ms/1000, tz=timezone.utc).isoformat()}, "
+            f"Filter reasons: {match.filtered_reasons}, Total records: {len(records)}. "
+            f"Will try fills-based PnL calculation as fallback."
+        )
         # Fallback to fills-based calculation
         if used_fill_ids is None:
             used_fill_ids = set()
         return await calculate_pnl_from_fills(ex, trade, kucoin_symbol, start_ms, end_ms, used_fill_ids)
+    if match.used_fallback:
+        logger.info(f"Trade {trade.get('id')} ({symbol}): Using {match.candidates} fallback candidates")
 
     # Log matching details for debugging
     c_ms = get_ms(rec.get('closeTime'))
@@ -666,7 +375,7 @@ async def reconcile_trade(
         f"Trade {trade.get('id')} ({symbol}): Matched position record "
         f"(closeId={rec.get('closeId')}, closeTime_diff={close_diff_min:.2f}min, "
         f"openTime_diff={open_diff_min:.2f}min, size_match={size_match}, "
-        f"candidates={len(strict_candidates)})"
+        f"candidates={match.candidates})"
     )
 
     # Extract realized PnL and fees robustly
@@ -849,23 +558,23 @@ async def main(days: Optional[int] = None, missing_pnl_only: bool = False):
 
     logger.info(f"Loaded {len(trades)} KuCoin CLOSED trades for processing")
 
-    fixes = 0
     used_close_ids: Set[str] = set()
     used_fill_ids: Set[str] = set()
+    writer = TradeBatchWriter(supabase)
 
     for tr in trades:
         try:
             update = await reconcile_trade(ex, supabase, tr, used_close_ids, used_fill_ids)
             if not update:
                 continue
-            # Update only fields we computed
-            supabase.table("trades").update(update).eq("id", tr['id']).execute()
-            fixes += 1
-            logger.info(f"Updated trade {tr['id']} with corrected PnL: {update['pnl_usd']}")
+            # Written in chunks by the batch writer
+            await writer.stage(tr, update, validate=False)
+            logger.info(f"Staged trade {tr['id']} with corrected PnL: {update['pnl_usd']}")
         except Exception as e:
             logger.warning(f"Failed to reconcile trade {tr.get('id')}: {e}")
 
-    logger.info(f"Completed. Corrected {fixes} trades.")
+    await writer.flush()
+    logger.info(f"Completed. Corrected {writer.stats['written']} trades in {writer.stats['requests']} requests.")
 
     # Cleanly close client
     try:
@@ -31,6 +31,7 @@ from discord_bot.utils.trade_retry_utils import (
     sync_kucoin_positions_to_database_enhanced,
     cleanup_closed_kucoin_positions_enhanced,
     extract_symbol_from_trade,
+    write_trade_update,
 )
 from src.exchange.kucoin.kucoin_symbol_converter import KucoinSymbolConverter
 from src.core.unified_status_updater import update_trade_status_safely
@@ -199,7 +200,7 @@ async def ensure_closed_trades_stay_closed(
                     if not update_data.get('order_status'):
                         update_data['order_status'] = 'FILLED'
 
-                    supabase.table("trades").update(update_data).eq("id", trade_id).execute()
+                    await write_trade_update(supabase, trade_id, update_data)
                     updates_made += 1
                     logger.info(f"✅ Fixed trade {trade_id} status to CLOSED")
                 else:
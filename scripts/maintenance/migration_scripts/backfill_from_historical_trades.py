@@ -32,25 +32,45 @@ if project_root not in sys.path:
 from discord_bot.database import DatabaseManager
 from config import settings
 from src.exchange.kucoin.kucoin_exchange import KucoinExchange
+from src.exchange.history import get_history_warehouse
+from src.database.core.trade_batch_writer import TradeBatchWriter
+from src.services.analytics.fill_aggregator import (
+    FillAggregate, FillFrame, TradeWindow, aggregate_fills, select_position_record
+)
 from supabase import create_client
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Executions up to an hour either side of a trade's lifecycle belong to it
+EXECUTION_WINDOW_BUFFER_MS = 60 * 60 * 1000
+
 
 class HistoricalTradeBackfillManager:
     """Manages backfilling of missing Binance prices using timestamp windows."""
 
-    def __init__(self):
-        supabase_url = settings.SUPABASE_URL
-        supabase_key = settings.SUPABASE_KEY
-        if not supabase_url or not supabase_key:
-            raise ValueError("SUPABASE_URL and SUPABASE_KEY must be set")
-        self.supabase = create_client(supabase_url, supabase_key)
-        self.db_manager: Any = DatabaseManager(self.supabase)
-        self.binance_exchange: Any = None  # Optionally set by caller
-        self.kucoin_exchange: Optional[KucoinExchange] = None  # Optionally set by caller
+    def __init__(self, supabase: Any = None, db_manager: Any = None,
+                 binance_exchange: Any = None, kucoin_exchange: Optional[KucoinExchange] = None):
+        """
+        Initialize the backfill manager.
+
+        Args:
+            supabase: Shared Supabase client (a new one is created when omitted)
+            db_manager: Shared database manager
+            binance_exchange: Shared Binance exchange instance
+            kucoin_exchange: Shared KuCoin exchange instance
+        """
+        if supabase is None:
+            supabase_url = settings.SUPABASE_URL
+            supabase_key = settings.SUPABASE_KEY
+            if not supabase_url or not supabase_key:
+                raise ValueError("SUPABASE_URL and SUPABASE_KEY must be set")
+            supabase = create_client(supabase_url, supabase_key)
+        self.supabase = supabase
+        self.db_manager: Any = db_manager or DatabaseManager(self.supabase)
+        self.binance_exchange: Any = binance_exchange
+        self.kucoin_exchange: Optional[KucoinExchange] = kucoin_exchange
 
     # ------------------------
     # KuCoin helpers
@@ -82,47 +102,13 @@ class HistoricalTradeBackfillManager:
         return created_ms, closed_ms
 
     def _pick_kucoin_position(self, records: List[Dict[str, Any]], symbol: str, created_ms: int, closed_ms: int, position_type: str, used_close_ids: Set[str]) -> Optional[Dict[str, Any]]:
-        if not records:
-            return None
         futures_symbol = str(symbol)
-        # strict filter
-        created_pad = 5 * 60 * 1000
-        end_pad = 15 * 60 * 1000
-        end_ms = (closed_ms or 0) + end_pad
-        expected_close_type = 'CLOSE_LONG' if position_type == 'LONG' else ('CLOSE_SHORT' if position_type == 'SHORT' else None)
-        expected_side = 'LONG' if position_type == 'LONG' else ('SHORT' if position_type == 'SHORT' else None)
-
-        def ok(r: Dict[str, Any]) -> bool:
-            if str(r.get('symbol') or '') != futures_symbol:
-                return False
-            if str(r.get('closeId') or '') in used_close_ids:
-                return False
-            o_ms = self._ms(r.get('openTime'))
-            c_ms = self._ms(r.get('closeTime'))
-            if created_ms and o_ms and o_ms < max(0, created_ms - created_pad):
-                return False
-            if c_ms and c_ms > end_ms:
-                return False
-            r_type = str(r.get('type') or '').upper()
-            r_side = str(r.get('side') or '').upper()
-            if expected_close_type and r_type not in (expected_close_type, '') and expected_close_type not in r_type:
-                return False
-            if expected_side and r_side not in (expected_side, ''):
-                return False
-            return True
-
-        candidates = [r for r in records if ok(r)]
-        if not candidates:
-            candidates = [r for r in records if str(r.get('symbol') or '') == futures_symbol and str(r.get('closeId') or '') not in used_close_ids]
-            if not candidates:
-                return None
-
-        def score(r: Dict[str, Any]) -> Tuple[int, int]:
-            c_ms = self._ms(r.get('closeTime'))
-            o_ms = self._ms(r.get('openTime'))
-            return (abs((closed_ms or 0) - (c_ms or 0)), abs((created_ms or 0) - (o_ms or 0)))
-
-        return min(candidates, key=score)
+        records = [r for r in records if str(r.get('symbol') or '') == futures_symbol]
+        match = select_position_record(
+            records, created_ms or 0, closed_ms or 0, position_type, None, used_close_ids,
+            created_pad_ms=5 * 60 * 1000, close_pad_ms=15 * 60 * 1000
+        )
+        return match.record
 
     def get_order_lifecycle(self, db_trade: Dict) -> Tuple[Optional[int], Optional[int], Optional[int]]:
         """Get order start, end, and duration in milliseconds using created_at to updated_at range."""
@@ -279,119 +265,31 @@ class HistoricalTradeBackfillManager:
             logger.error(f"Error getting position type from trade {trade.get('id')}: {e}")
             return 'LONG'
 
-    async def get_executions_in_trade_window(self, symbol: str, start_time: int, end_time: int) -> Dict[str, List[Dict[str, Any]]]:
-        """Get all executions that occurred within the trade's timestamp window."""
-        try:
-            logger.debug(f"Fetching executions for {symbol}")
-
-            # Convert timestamps to datetime for API calls
-            start_dt = datetime.fromtimestamp(start_time / 1000, tz=timezone.utc)
-            end_dt = datetime.fromtimestamp(end_time / 1000, tz=timezone.utc)
-
-            # Add buffer to ensure we capture all related executions
-            buffer_before = timedelta(hours=1)  # 1 hour before trade start
-            buffer_after = timedelta(hours=1)   # 1 hour after trade end
-
-            search_start = start_dt - buffer_before
-            search_end = end_dt + buffer_after
-
-            logger.debug(f"Searching executions from {search_start} to {search_end}")
-
-            # Get all user trades for the symbol
-            all_trades = []
-
-            # First batch - get most recent trades
-            trades = await self.binance_exchange.get_user_trades(symbol=symbol, limit=1000)
-            all_trades.extend(trades)
-
-            # If we got 1000 trades, there might be more
-            if len(trades) == 1000:
-                oldest_id = min(trade['id'] for trade in trades)
-                older_trades = await self.binance_exchange.get_user_trades(
-                    symbol=symbol, limit=1000, fromId=oldest_id - 1000
-                )
-                all_trades.extend(older_trades)
-
-            logger.info(f"Fetched {len(all_trades)} total trades for {symbol}")
-
-            # Filter trades within our search window
-            buy_executions = []
-            sell_executions = []
-
-            for trade_exec in all_trades:
-                # Convert trade time to datetime
-                trade_time = datetime.fromtimestamp(trade_exec['time'] / 1000, tz=timezone.utc)
+    async def aggregate_trade_windows(self, symbol: str, windows: List[TradeWindow]) -> Dict[Any, FillAggregate]:
+        """
+        Fetch the symbol's fills once for all trade windows and aggregate them per trade.
 
-                # Check if trade is within our search window
-                if search_start <= trade_time <= search_end:
-                    side = trade_exec.get('side', '').upper()
-                    price = float(trade_exec.get('price', 0))
-                    qty = float(trade_exec.get('qty', 0))
+        Args:
+            symbol: Binance futures symbol
+            windows: Trade lifecycles (already padded) for this symbol
 
-                    if side == 'BUY':
-                        buy_executions.append(trade_exec)
-                        logger.debug(f"  Buy Fill: price={price}, qty={qty}, time={trade_time}")
-                    elif side == 'SELL':
-                        sell_executions.append(trade_exec)
-                        logger.debug(f"  Sell Fill: price={price}, qty={qty}, time={trade_time}")
+        Returns:
+            Dict mapping trade id to its FillAggregate (VWAP entry/exit, quantities, fees)
+        """
+        try:
+            start_ms = min(w.start_ms for w in windows)
+            end_ms = max(w.end_ms for w in windows)
 
-            logger.info(f"Found {len(buy_executions)} buy and {len(sell_executions)} sell execution(s) in trade window")
+            # Get user trades for the combined window from the local history warehouse
+            warehouse = get_history_warehouse(binance_exchange=self.binance_exchange)
+            fills = await warehouse.get_user_trades('binance', symbol, start_ms, end_ms)
+            logger.info(f"Fetched {len(fills)} fills for {symbol} covering {len(windows)} trade(s)")
 
-            return {
-                'buys': buy_executions,
-                'sells': sell_executions
-            }
+            return aggregate_fills(windows, FillFrame(fills))
 
         except Exception as e:
-            logger.error(f"Error getting executions in trade window: {e}")
-            return {'buys': [], 'sells': []}
-
-    def calculate_weighted_average_price(self, executions: List[Dict[str, Any]]) -> float:
-        """Calculate weighted average price from multiple executions."""
-        if not executions:
-            return 0.0
-
-        total_value = 0.0
-        total_qty = 0.0
-
-        for execution in executions:
-            price = float(execution.get('price', 0))
-            qty = float(execution.get('qty', 0))
-
-            if price > 0 and qty > 0:
-                total_value += price * qty
-                total_qty += qty
-
-        if total_qty > 0:
-            return total_value / total_qty
-        else:
-            return 0.0
-
-    def calculate_entry_exit_prices(self, position_type: str, buy_executions: List[Dict], sell_executions: List[Dict]) -> Tuple[float, float]:
-        """Calculate entry and exit prices based on position type and executions."""
-        buy_avg_price = self.calculate_weighted_average_price(buy_executions)
-        sell_avg_price = self.calculate_weighted_average_price(sell_executions)
-
-        # Calculate total quantities
-        total_buy_qty = sum(float(execution.get('qty', 0)) for execution in buy_executions)
-        total_sell_qty = sum(float(execution.get('qty', 0)) for execution in sell_executions)
-
-        logger.info(f"Position type: {position_type}, buy_qty={total_buy_qty}, sell_qty={total_sell_qty}")
-        logger.info(f"Buy avg price: {buy_avg_price}, Sell avg price: {sell_avg_price}")
-
-        # Determine entry and exit prices based on position type
-        if position_type.upper() == 'LONG':
-            # Long position: BUY is entry, SELL is exit
-            entry_price = buy_avg_price
-            exit_price = sell_avg_price if total_sell_qty > 0 else 0.0
-            logger.info(f"LONG position: entry={entry_price} (from buys), exit={exit_price} (from sells)")
-        else:  # SHORT
-            # Short position: SELL is entry, BUY is exit
-            entry_price = sell_avg_price
-            exit_price = buy_avg_price if total_buy_qty > 0 else 0.0
-            logger.info(f"SHORT position: entry={entry_price} (from sells), exit={exit_price} (from buys)")
-
-        return entry_price, exit_price
+            logger.error(f"Error aggregating executions for {symbol}: {e}")
+            return {}
 
     def compare_prices(self, trade: Dict, new_entry_price: float, new_exit_price: float) -> Dict[str, Any]:
         """Compare existing prices with newly calculated prices."""
@@ -428,8 +326,10 @@ class HistoricalTradeBackfillManager:
             logger.error(f"Error comparing prices: {e}")
             return {'entry_changed': False, 'exit_changed': False, 'entry_diff': 0.0, 'exit_diff': 0.0, 'entry_pct_diff': 0.0, 'exit_pct_diff': 0.0}
 
-    async def update_trade_prices(self, trade_id: int, entry_price: float, exit_price: float) -> bool:
-        """Update trade with calculated entry and exit prices."""
+    async def update_trade_prices(self, trade: Dict[str, Any], entry_price: float, exit_price: float,
+                                  writer: TradeBatchWriter) -> bool:
+        """Stage calculated entry and exit prices for a trade on the run's batch writer."""
+        trade_id = trade.get('id')
         try:
             updates = {}
 
@@ -442,14 +342,12 @@ class HistoricalTradeBackfillManager:
                 logger.info(f"Setting exit price: {exit_price}")
 
             if updates:
-                updates['updated_at'] = datetime.now(timezone.utc).isoformat()
-                success = await self.db_manager.update_existing_trade(trade_id=trade_id, updates=updates)
-                if success:
-                    logger.info(f"Successfully updated trade {trade_id}")
+                # Written in chunks by the batch writer
+                if await writer.stage(trade, updates, validate=False):
+                    logger.info(f"Staged price update for trade {trade_id}")
                     return True
-                else:
-                    logger.error(f"Failed to update trade {trade_id}")
-                    return False
+                logger.error(f"Failed to stage price update for trade {trade_id}")
+                return False
             else:
                 logger.warning(f"No prices to update for trade {trade_id}")
                 return False
@@ -533,9 +431,10 @@ class HistoricalTradeBackfillManager:
                 'trades_with_changes': 0
             }
 
+            # Resolve symbol, lifecycle window and position type, grouped by symbol
+            by_symbol: Dict[str, List[Tuple[Dict[str, Any], TradeWindow]]] = {}
             for trade in trades:
                 trade_id = trade.get('id')
-                discord_id = trade.get('discord_id', '')
 
                 logger.debug(f"Processing trade {trade_id}")
 
@@ -548,66 +447,81 @@ class HistoricalTradeBackfillManager:
 
                 # Get trade lifecycle window
                 start_time, end_time, duration = self.get_order_lifecycle(trade)
-                if not start_time:
+                if not start_time or trade_id is None:
                     logger.warning(f"Could not get lifecycle for trade {trade_id}")
                     stats['trades_failed'] += 1
                     continue
 
                 logger.debug(f"Trade {trade_id} lifecycle: {start_time} to {end_time} (duration: {duration}ms)")
 
-                # Get all executions within the trade window
-                safe_end = end_time if end_time is not None else start_time
-                executions = await self.get_executions_in_trade_window(symbol, int(start_time), int(safe_end))
-                buy_executions = executions['buys']
-                sell_executions = executions['sells']
-
-                if not buy_executions and not sell_executions:
-                    logger.warning(f"No executions found in trade window for trade {trade_id}")
-                    stats['trades_failed'] += 1
-                    continue
-
                 # Get position type from database (most reliable method)
                 position_type = self.get_position_type_from_trade(trade)
                 logger.info(f"Trade {trade_id} position type: {position_type}")
 
-                # Calculate entry and exit prices based on position type
-                entry_price, exit_price = self.calculate_entry_exit_prices(
-                    position_type, buy_executions, sell_executions
+                # Pad the window to capture all related executions
+                safe_end = end_time if end_time is not None else start_time
+                window = TradeWindow(
+                    trade_id, position_type,
+                    int(start_time) - EXECUTION_WINDOW_BUFFER_MS,
+                    int(safe_end) + EXECUTION_WINDOW_BUFFER_MS
                 )
+                by_symbol.setdefault(symbol, []).append((trade, window))
+
+            writer = TradeBatchWriter(self.db_manager.supabase)
+            for symbol, items in by_symbol.items():
+                # One fetch and one aggregation pass per symbol
+                aggregates = await self.aggregate_trade_windows(symbol, [window for _, window in items])
+
+                for trade, window in items:
+                    trade_id = window.trade_id
+                    agg = aggregates.get(trade_id)
+                    if not agg or not agg.has_fills:
+                        logger.warning(f"No executions found in trade window for trade {trade_id}")
+                        stats['trades_failed'] += 1
+                        continue
+
+                    # LONG: BUY fills are entry, SELL fills exit; SHORT: the reverse
+                    entry_price = agg.entry_price or 0.0
+                    exit_price = agg.exit_price or 0.0
+                    logger.info(
+                        f"Trade {trade_id} ({window.position_type}): entry={entry_price} (qty={agg.entry_qty}), "
+                        f"exit={exit_price} (qty={agg.exit_qty})"
+                    )
+
+                    # Compare with existing prices if updating existing records
+                    price_comparison = self.compare_prices(trade, entry_price, exit_price)
+
+                    # Update trade with calculated prices
+                    success = await self.update_trade_prices(trade, entry_price, exit_price, writer)
+                    if success:
+                        if entry_price > 0:
+                            stats['entry_prices_filled'] += 1
+                            if price_comparison['entry_changed']:
+                                stats['entry_prices_corrected'] += 1
+                                logger.info(f"Trade {trade_id}: Entry price corrected by {price_comparison['entry_diff']:.4f} ({price_comparison['entry_pct_diff']:.2f}%)")
+
+                        if exit_price > 0:
+                            stats['exit_prices_filled'] += 1
+                            if price_comparison['exit_changed']:
+                                stats['exit_prices_corrected'] += 1
+                                logger.info(f"Trade {trade_id}: Exit price corrected by {price_comparison['exit_diff']:.4f} ({price_comparison['exit_pct_diff']:.2f}%)")
+
+                        if price_comparison['entry_changed'] or price_comparison['exit_changed']:
+                            stats['trades_with_changes'] += 1
+
+                        stats['trades_updated'] += 1
+                    else:
+                        stats['trades_failed'] += 1
 
-                # Compare with existing prices if updating existing records
-                price_comparison = self.compare_prices(trade, entry_price, exit_price)
-
-                # Update trade with calculated prices
-                if trade_id is None:
-                    stats['trades_failed'] += 1
-                    continue
-                success = await self.update_trade_prices(int(trade_id), entry_price, exit_price)
-                if success:
-                    if entry_price > 0:
-                        stats['entry_prices_filled'] += 1
-                        if price_comparison['entry_changed']:
-                            stats['entry_prices_corrected'] += 1
-                            logger.info(f"Trade {trade_id}: Entry price corrected by {price_comparison['entry_diff']:.4f} ({price_comparison['entry_pct_diff']:.2f}%)")
-
-                    if exit_price > 0:
-                        stats['exit_prices_filled'] += 1
-                        if price_comparison['exit_changed']:
-                            stats['exit_prices_corrected'] += 1
-                            logger.info(f"Trade {trade_id}: Exit price corrected by {price_comparison['exit_diff']:.4f} ({price_comparison['exit_pct_diff']:.2f}%)")
-
-                    if price_comparison['entry_changed'] or price_comparison['exit_changed']:
-                        stats['trades_with_changes'] += 1
-
-                    stats['trades_updated'] += 1
-                else:
-                    stats['trades_failed'] += 1
+            await writer.flush()
+            stats['write_requests'] = writer.stats['requests']
 
             # Print summary
             logger.info("=== Fixed Backfill Summary ===")
             logger.info(f"Total trades processed: {stats['total_trades']}")
             logger.info(f"Trades updated: {stats['trades_updated']}")
             logger.info(f"Trades failed: {stats['trades_failed']}")
+            logger.info(f"Write requests: {stats['write_requests']}")
             logger.info(f"Entry prices filled: {stats['entry_prices_filled']}")
             logger.info(f"Exit prices filled: {stats['exit_prices_filled']}")
             if update_existing:
@@ -646,7 +560,7 @@ class HistoricalTradeBackfillManager:
                 return
 
             used_close_ids: Set[str] = set()
-            updated = 0
+            writer = TradeBatchWriter(self.db_manager.supabase)
             for tr in trades:
                 tid = tr.get('id')
                 # Skip if complete and not updating existing
@@ -664,24 +578,15 @@ class HistoricalTradeBackfillManager:
                 if not created_ms or not closed_ms:
                     continue
 
-                # fetch position history with fallback (with/without symbol)
-                params = {"symbol": fut_symbol, "startAt": created_ms - 15*60*1000, "endAt": closed_ms + 15*60*1000}
-                pos = await self.kucoin_exchange._make_direct_api_call('GET', '/api/v1/history-positions', params)
-                records: List[Dict[str, Any]] = []
-                if isinstance(pos, list):
-                    records = pos
-                elif isinstance(pos, dict):
-                    items = pos.get('items') or pos.get('data') or []
-                    if isinstance(items, list):
-                        records = items
-                if not records:
-                    pos2 = await self.kucoin_exchange._make_direct_api_call('GET', '/api/v1/history-positions', {"startAt": created_ms - 15*60*1000, "endAt": closed_ms + 15*60*1000})
-                    if isinstance(pos2, list):
-                        records = pos2
-                    elif isinstance(pos2, dict):
-                        items2 = pos2.get('items') or pos2.get('data') or []
-                        if isinstance(items2, list):
-                            records = items2
+                # position history from the local warehouse (gaps fetched once per run)
+                warehouse = get_history_warehouse(kucoin_exchange=self.kucoin_exchange)
+                try:
+                    records = await warehouse.get_position_history(
+                        'kucoin', fut_symbol, created_ms - 15*60*1000, closed_ms + 15*60*1000
+                    )
+                except Exception as e:
+                    logger.warning(f"Skipping trade {tr.get('id')}: position history for {fut_symbol} unavailable: {e}")
+                    continue
                 if not records:
                     continue
 
@@ -714,8 +619,7 @@ class HistoricalTradeBackfillManager:
                         except Exception:
                             pass
                     if len(updates) > 1:
-                        self.db_manager.supabase.table("trades").update(updates).eq("id", tid).execute()
-                        updated += 1
+                        await writer.stage(tr, updates, validate=False)
                         cid = rec.get('closeId')
                         if cid:
                             used_close_ids.add(str(cid))
@@ -723,7 +627,8 @@ class HistoricalTradeBackfillManager:
                 except Exception:
                     continue
 
-            logger.info(f"KuCoin price backfill completed: {updated} trades updated")
+            await writer.flush()
+            logger.info(f"KuCoin price backfill completed: {writer.stats['written']} trades updated")
         except Exception as e:
             logger.error(f"Error during KuCoin price backfill: {e}")
 
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Rebuild Analytics Rollups Script
+
+Scans the CLOSED trades once and rewrites the daily analytics rollup
+buckets in analytics_records. Run it after deploying the rollups or after
+bulk edits to historical trades; day-to-day the buckets are updated as
+trades close.
+"""
+
+import os
+import sys
+import asyncio
+import logging
+from typing import List, Dict, Any
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from supabase import create_client, Client
+from config import settings
+from src.services.analytics.rollups import get_analytics_rollups
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+TRADE_COLUMNS = 'id,trader,coin_symbol,status,pnl_usd,net_pnl,closed_at,updated_at'
+PAGE_SIZE = 1000
+
+
+def get_supabase_client() -> Client:
+    """Get Supabase client."""
+    url = settings.SUPABASE_URL
+    key = settings.SUPABASE_KEY
+
+    if not url or not key:
+        raise ValueError("SUPABASE_URL and SUPABASE_KEY environment variables are required")
+
+    return create_client(url, key)
+
+
+def load_closed_trades(supabase: Client) -> List[Dict[str, Any]]:
+    """Load all CLOSED trades page by page."""
+    trades: List[Dict[str, Any]] = []
+    start = 0
+    while True:
+        response = (supabase.table('trades').select(TRADE_COLUMNS)
+                    .eq('status', 'CLOSED').order('id').range(start, start + PAGE_SIZE - 1).execute())
+        page = response.data or []
+        trades.extend(page)
+        if len(page) < PAGE_SIZE:
+            return trades
+        start += PAGE_SIZE
+
+
+async def rebuild() -> int:
+    supabase = get_supabase_client()
+    trades = load_closed_trades(supabase)
+    logger.info(f"Loaded {len(trades)} closed trades")
+    return await get_analytics_rollups(supabase).rebuild(trades)
+
+
+def main():
+    try:
+        counted = asyncio.run(rebuild())
+        logger.info(f"Analytics rollups rebuilt from {counted} trades")
+    except Exception as e:
+        logger.error(f"Error rebuilding analytics rollups: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
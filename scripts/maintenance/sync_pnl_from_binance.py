@@ -25,7 +25,8 @@ from discord_bot.discord_bot import DiscordBot
 from discord_bot.utils.trade_retry_utils import (
     get_order_lifecycle,
     get_income_for_trade_period,
-    extract_symbol_from_trade
+    extract_symbol_from_trade,
+    write_trade_update
 )
 import config.settings as settings
 
@@ -193,7 +194,7 @@ class BinancePnLSyncer:
                 from discord_bot.utils.timestamp_manager import fix_historical_timestamps
                 await fix_historical_timestamps(self.supabase, trade_id)
 
-            response = self.supabase.from_("trades").update(update_data).eq("id", trade_id).execute()
+            response = await write_trade_update(self.supabase, trade_id, update_data)
 
             if response.data:
                 logger.info(
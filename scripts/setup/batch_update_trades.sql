@@ -0,0 +1,31 @@
+-- Batched partial updates of the trades table, used by TradeBatchWriter.
+--
+-- `updates` is a JSON array of objects that all carry `id` plus the same
+-- set of changed columns, e.g. [{"id": 1, "exit_price": 2.5}, {"id": 2, "exit_price": 3.1}].
+-- Only those columns are written; the updated rows are returned.
+
+create or replace function public.batch_update_trades(updates jsonb)
+returns setof public.trades
+language plpgsql
+as $$
+declare
+    assignments text;
+begin
+    select string_agg(format('%I = r.%I', key, key), ', ')
+      into assignments
+      from jsonb_object_keys(updates -> 0) as key
+     where key <> 'id';
+
+    if assignments is null then
+        return;
+    end if;
+
+    return query execute format(
+        'update public.trades t set %s
+           from jsonb_populate_recordset(null::public.trades, $1) r
+          where t.id = r.id
+         returning t.*',
+        assignments
+    ) using updates;
+end;
+$$;
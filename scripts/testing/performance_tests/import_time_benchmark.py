@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Import-time budget benchmark.
+
+Imports each tracked module in a fresh interpreter with ``python -X importtime``
+and compares the cumulative import time against import_time_budget.json.
+Exits non-zero when any module is over budget, so a regression (e.g. an SDK
+pulled back into a package ``__init__``) fails the check.
+
+Usage:
+    python scripts/testing/performance_tests/import_time_benchmark.py [--runs N] [module ...]
+"""
+
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+from typing import Dict, List, Optional
+
+# Modules are imported from the project root
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(script_dir)))
+
+BUDGET_FILE = os.path.join(script_dir, 'import_time_budget.json')
+
+
+def load_budgets(path: str = BUDGET_FILE) -> Dict[str, float]:
+    """Load module -> budget (ms) from the budget file, skipping comment keys."""
+    with open(path) as f:
+        data = json.load(f)
+    return {module: float(ms) for module, ms in data.items() if not module.startswith('_')}
+
+
+def parse_importtime(stderr: str, module: str) -> Optional[float]:
+    """
+    Get the cumulative import time of a module from ``-X importtime`` output.
+
+    Args:
+        stderr: Captured stderr of the interpreter
+        module: Fully qualified module name
+
+    Returns:
+        Cumulative import time in milliseconds, or None if the module line is missing
+    """
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        parts = line[len('import time:'):].split('|')
+        if len(parts) != 3 or parts[2].strip() != module:
+            continue
+        try:
+            return int(parts[1].strip()) / 1000.0
+        except ValueError:
+            return None
+    return None
+
+
+def measure_import_time(module: str, runs: int = 3) -> Optional[float]:
+    """
+    Measure the median cumulative import time of a module in a fresh interpreter.
+
+    Args:
+        module: Fully qualified module name
+        runs: Number of interpreter launches
+
+    Returns:
+        Median import time in milliseconds, or None if the import failed
+    """
+    samples: List[float] = []
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+            cwd=project_root, capture_output=True, text=True
+        )
+        if result.returncode != 0:
+            print(f"  {module}: import failed\n{result.stderr.strip().splitlines()[-1:]}")
+            return None
+        elapsed = parse_importtime(result.stderr, module)
+        if elapsed is not None:
+            samples.append(elapsed)
+    return statistics.median(samples) if samples else None
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Check module import times against the budget')
+    parser.add_argument('modules', nargs='*', help='Modules to check (default: all in the budget file)')
+    parser.add_argument('--runs', type=int, default=3, help='Interpreter launches per module')
+    args = parser.parse_args()
+
+    budgets = load_budgets()
+    modules = args.modules or list(budgets)
+
+    failures = 0
+    print(f"{'module':45} {'ms':>10} {'budget':>10}")
+    for module in modules:
+        elapsed = measure_import_time(module, args.runs)
+        budget = budgets.get(module)
+        if elapsed is None:
+            failures += 1
+            continue
+        over = budget is not None and elapsed > budget
+        failures += int(over)
+        budget_text = f"{budget:.0f}" if budget is not None else '-'
+        print(f"{module:45} {elapsed:10.1f} {budget_text:>10}{'  OVER BUDGET' if over else ''}")
+
+    if failures:
+        print(f"\n❌ {failures} module(s) over budget or failed to import")
+        return 1
+    print("\n✅ All modules within import-time budget")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
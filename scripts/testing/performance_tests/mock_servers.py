@@ -0,0 +1,1146 @@
+"""
+Local stand-ins for the services the bot talks to.
+
+Each stand-in is a small aiohttp app holding in-memory state:
+
+- MockBinanceFutures: Binance USD-M futures REST (orders, batch orders,
+  account, positions, exchange info, prices, listenKey) and the user data
+  websocket, which pushes ORDER_TRADE_UPDATE / ACCOUNT_UPDATE for fills
+- MockKucoinFutures: KuCoin futures REST in the {"code": "200000", "data": ...}
+  envelope used by the universal SDK and the direct aiohttp calls
+- MockPostgrest: the Supabase PostgREST API over in-memory tables
+  (trades, alerts, trader_exchange_config, ...)
+- MockOpenAI: chat completions answered from recorded parses
+
+Every service counts its calls and can inject latency and errors through a
+FaultProfile. The Supabase and KuCoin SDK clients are synchronous, so the
+servers run on their own event loop in a background thread (MockServerThread);
+serving them from the bot's loop would deadlock.
+"""
+
+import asyncio
+import itertools
+import json
+import logging
+import random
+import re
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from aiohttp import web, WSMsgType
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class FaultProfile:
+    """
+    Latency and error injection for one mock service.
+
+    Attributes:
+        latency_ms: Fixed delay added to every request
+        jitter_ms: Extra uniformly distributed delay (0..jitter_ms)
+        error_rate: Fraction of requests answered with ``error_status``
+        error_status: HTTP status of injected errors
+        seed: Seed for reproducible runs
+    """
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    error_status: int = 503
+    seed: Optional[int] = None
+    _random: random.Random = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self._random = random.Random(self.seed)
+
+    @classmethod
+    def parse(cls, spec: str, seed: Optional[int] = None) -> 'FaultProfile':
+        """
+        Build a profile from ``latency_ms[:jitter_ms[:error_rate]]``, e.g. ``"20:5:0.01"``.
+
+        Args:
+            spec: Profile spec
+            seed: Random seed
+
+        Returns:
+            FaultProfile
+        """
+        parts = [p for p in (spec or '').split(':')]
+        values = [float(p) if p else 0.0 for p in parts] + [0.0] * (3 - len(parts))
+        return cls(latency_ms=values[0], jitter_ms=values[1], error_rate=values[2], seed=seed)
+
+    def delay(self) -> float:
+        """Delay for the next request, in seconds."""
+        jitter = self._random.uniform(0, self.jitter_ms) if self.jitter_ms else 0.0
+        return (self.latency_ms + jitter) / 1000.0
+
+    def should_fail(self) -> bool:
+        return self.error_rate > 0 and self._random.random() < self.error_rate
+
+
+class MockService:
+    """Base class: an aiohttp app with call counting and fault injection."""
+
+    name = 'mock'
+
+    def __init__(self, fault: Optional[FaultProfile] = None):
+        self.fault = fault or FaultProfile()
+        self.calls: Counter = Counter()
+        self.errors_injected = 0
+        self.unhandled: Counter = Counter()
+        self.url = ''
+        self._runner: Optional[web.AppRunner] = None
+        self.app = web.Application(middlewares=[self._middleware])
+        self.setup_routes(self.app.router)
+
+    def setup_routes(self, router: web.UrlDispatcher) -> None:
+        raise NotImplementedError
+
+    def call_key(self, request: web.Request) -> Tuple[str, ...]:
+        """Key under which a request is counted."""
+        return (request.method, request.path)
+
+    def error_body(self, status: int, message: str) -> Dict[str, Any]:
+        return {'error': message}
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler: Callable) -> web.StreamResponse:
+        if request.headers.get('Upgrade', '').lower() != 'websocket':
+            self.calls[self.call_key(request)] += 1
+            delay = self.fault.delay()
+            if delay:
+                await asyncio.sleep(delay)
+            if self.fault.should_fail():
+                self.errors_injected += 1
+                return web.json_response(self.error_body(self.fault.error_status, 'injected error'),
+                                         status=self.fault.error_status)
+        try:
+            return await handler(request)
+        except web.HTTPNotFound:
+            self.unhandled[(request.method, request.path)] += 1
+            return web.json_response(self.error_body(404, f'no mock route for {request.path}'), status=404)
+
+    async def start(self, host: str = '127.0.0.1', port: int = 0) -> str:
+        """Start serving; returns the base URL."""
+        self._runner = web.AppRunner(self.app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        bound_host, bound_port = self._runner.addresses[0][:2]
+        self.url = f"http://{bound_host}:{bound_port}"
+        return self.url
+
+    async def stop(self) -> None:
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def total_calls(self) -> int:
+        return sum(self.calls.values())
+
+
+async def _params(request: web.Request) -> Dict[str, str]:
+    """Query string merged with a form or JSON body."""
+    params = dict(request.query)
+    if request.can_read_body:
+        if request.content_type == 'application/json':
+            body = await request.json()
+            if isinstance(body, dict):
+                params.update({k: v for k, v in body.items()})
+        else:
+            params.update(dict(await request.post()))
+    return params
+
+
+# Binance
+
+DEFAULT_SYMBOL_SPEC = {'tick_size': 0.0001, 'step_size': 0.001, 'min_qty': 0.001, 'min_notional': 5.0}
+
+
+class MockBinanceFutures(MockService):
+    """
+    Binance USD-M futures stand-in.
+
+    MARKET orders fill immediately at the current price; LIMIT orders fill
+    when a price update crosses them; stop/take-profit orders rest as NEW.
+    Fills update positions and are pushed to user data stream clients.
+    """
+
+    name = 'binance'
+
+    def __init__(self, fault: Optional[FaultProfile] = None, wallet_balance: float = 10000.0):
+        self.prices: Dict[str, float] = {}
+        self.symbol_specs: Dict[str, Dict[str, float]] = {}
+        self.orders: Dict[int, Dict[str, Any]] = {}
+        self.positions: Dict[str, Dict[str, Any]] = {}
+        self.leverage: Dict[str, int] = {}
+        self.wallet_balance = wallet_balance
+        self.order_arrivals: List[Dict[str, Any]] = []
+        self._order_ids = itertools.count(1000001)
+        self._streams: List[web.WebSocketResponse] = []
+        super().__init__(fault)
+
+    async def stop(self) -> None:
+        # Runner cleanup waits for open handlers, so end the user data streams first
+        for ws in list(self._streams):
+            await ws.close()
+        await super().stop()
+
+    def call_key(self, request: web.Request) -> Tuple[str, ...]:
+        # Version-agnostic endpoint name, e.g. ('POST', 'order')
+        return (request.method, re.sub(r'^/(fapi|api)/v\d+/', '', request.path))
+
+    def error_body(self, status: int, message: str) -> Dict[str, Any]:
+        return {'code': -1000 if status >= 500 else -1, 'msg': message}
+
+    def setup_routes(self, router: web.UrlDispatcher) -> None:
+        for prefix in ('/api/v3', '/fapi/v1'):
+            router.add_get(f'{prefix}/ping', self._ping)
+            router.add_get(f'{prefix}/time', self._time)
+        router.add_get('/fapi/v1/exchangeInfo', self._exchange_info)
+        router.add_get('/fapi/v1/ticker/price', self._ticker_price)
+        router.add_get('/fapi/v2/ticker/price', self._ticker_price)
+        router.add_get('/fapi/v1/premiumIndex', self._premium_index)
+        router.add_get('/fapi/v1/ticker/bookTicker', self._book_ticker)
+        router.add_get('/fapi/v1/depth', self._depth)
+        router.add_post('/fapi/v1/order', self._create_order)
+        router.add_get('/fapi/v1/order', self._get_order)
+        router.add_delete('/fapi/v1/order', self._cancel_order)
+        router.add_post('/fapi/v1/batchOrders', self._batch_orders)
+        router.add_post('/fapi/v1/algoOrder', self._create_order)
+        router.add_get('/fapi/v1/openOrders', self._open_orders)
+        router.add_delete('/fapi/v1/allOpenOrders', self._cancel_all)
+        router.add_get('/fapi/v1/allOrders', self._all_orders)
+        for version in ('v2', 'v3'):
+            router.add_get(f'/fapi/{version}/account', self._account)
+            router.add_get(f'/fapi/{version}/balance', self._balance)
+            router.add_get(f'/fapi/{version}/positionRisk', self._position_risk)
+        router.add_post('/fapi/v1/leverage', self._change_leverage)
+        router.add_post('/fapi/v1/marginType', self._ok)
+        router.add_get('/fapi/v1/userTrades', self._empty_list)
+        router.add_get('/fapi/v1/income', self._empty_list)
+        router.add_post('/fapi/v1/listenKey', self._listen_key)
+        router.add_put('/fapi/v1/listenKey', self._ok)
+        router.add_delete('/fapi/v1/listenKey', self._ok)
+        router.add_get('/ws/{listen_key}', self._user_stream)
+
+    # Market state
+
+    def spec(self, symbol: str) -> Dict[str, float]:
+        return self.symbol_specs.get(symbol, DEFAULT_SYMBOL_SPEC)
+
+    def set_prices(self, prices: Dict[str, float]) -> None:
+        """Update prices and fill resting LIMIT orders they cross."""
+        for symbol, price in prices.items():
+            self.prices[symbol] = float(price)
+        for order in list(self.orders.values()):
+            if order['status'] != 'NEW' or order['type'] != 'LIMIT' or order['symbol'] not in prices:
+                continue
+            price = self.prices[order['symbol']]
+            limit = float(order['price'])
+            if (order['side'] == 'BUY' and price <= limit) or (order['side'] == 'SELL' and price >= limit):
+                self._fill(order, limit)
+
+    # Handlers
+
+    async def _ping(self, request: web.Request) -> web.Response:
+        return web.json_response({})
+
+    async def _time(self, request: web.Request) -> web.Response:
+        return web.json_response({'serverTime': int(time.time() * 1000)})
+
+    async def _ok(self, request: web.Request) -> web.Response:
+        return web.json_response({'code': 200, 'msg': 'success'})
+
+    async def _empty_list(self, request: web.Request) -> web.Response:
+        return web.json_response([])
+
+    async def _exchange_info(self, request: web.Request) -> web.Response:
+        symbols = []
+        for symbol in sorted(set(self.prices) | set(self.symbol_specs)):
+            spec = self.spec(symbol)
+            symbols.append({
+                'symbol': symbol,
+                'pair': symbol,
+                'status': 'TRADING',
+                'contractType': 'PERPETUAL',
+                'baseAsset': symbol[:-4] if symbol.endswith('USDT') else symbol,
+                'quoteAsset': 'USDT',
+                'marginAsset': 'USDT',
+                'pricePrecision': _decimals(spec['tick_size']),
+                'quantityPrecision': _decimals(spec['step_size']),
+                'filters': [
+                    {'filterType': 'PRICE_FILTER', 'tickSize': str(spec['tick_size']),
+                     'minPrice': str(spec['tick_size']), 'maxPrice': '10000000'},
+                    {'filterType': 'LOT_SIZE', 'stepSize': str(spec['step_size']),
+                     'minQty': str(spec['min_qty']), 'maxQty': '100000000'},
+                    {'filterType': 'MARKET_LOT_SIZE', 'stepSize': str(spec['step_size']),
+                     'minQty': str(spec['min_qty']), 'maxQty': '100000000'},
+                    {'filterType': 'MIN_NOTIONAL', 'notional': str(spec['min_notional'])},
+                    {'filterType': 'PERCENT_PRICE', 'multiplierUp': '1.05', 'multiplierDown': '0.95'},
+                ],
+            })
+        return web.json_response({'timezone': 'UTC', 'serverTime': int(time.time() * 1000), 'symbols': symbols})
+
+    async def _ticker_price(self, request: web.Request) -> web.Response:
+        symbol = request.query.get('symbol')
+        if symbol:
+            if symbol not in self.prices:
+                return web.json_response({'code': -1121, 'msg': 'Invalid symbol.'}, status=400)
+            return web.json_response({'symbol': symbol, 'price': str(self.prices[symbol]),
+                                      'time': int(time.time() * 1000)})
+        return web.json_response([{'symbol': s, 'price': str(p)} for s, p in self.prices.items()])
+
+    async def _premium_index(self, request: web.Request) -> web.Response:
+        def entry(symbol: str) -> Dict[str, Any]:
+            price = str(self.prices[symbol])
+            return {'symbol': symbol, 'markPrice': price, 'indexPrice': price, 'lastFundingRate': '0.0001',
+                    'nextFundingTime': 0, 'time': int(time.time() * 1000)}
+        symbol = request.query.get('symbol')
+        if symbol:
+            if symbol not in self.prices:
+                return web.json_response({'code': -1121, 'msg': 'Invalid symbol.'}, status=400)
+            return web.json_response(entry(symbol))
+        return web.json_response([entry(s) for s in self.prices])
+
+    async def _book_ticker(self, request: web.Request) -> web.Response:
+        symbol = request.query.get('symbol', '')
+        price = self.prices.get(symbol)
+        if price is None:
+            return web.json_response({'code': -1121, 'msg': 'Invalid symbol.'}, status=400)
+        tick = self.spec(symbol)['tick_size']
+        return web.json_response({'symbol': symbol, 'bidPrice': str(price - tick), 'bidQty': '100',
+                                  'askPrice': str(price + tick), 'askQty': '100'})
+
+    async def _depth(self, request: web.Request) -> web.Response:
+        symbol = request.query.get('symbol', '')
+        price = self.prices.get(symbol)
+        if price is None:
+            return web.json_response({'code': -1121, 'msg': 'Invalid symbol.'}, status=400)
+        tick = self.spec(symbol)['tick_size']
+        levels = int(request.query.get('limit', 5))
+        return web.json_response({
+            'lastUpdateId': int(time.time() * 1000), 'E': int(time.time() * 1000), 'T': int(time.time() * 1000),
+            'bids': [[str(round(price - tick * (i + 1), 10)), '100'] for i in range(levels)],
+            'asks': [[str(round(price + tick * (i + 1), 10)), '100'] for i in range(levels)],
+        })
+
+    async def _create_order(self, request: web.Request) -> web.Response:
+        order = self._place(await _params(request))
+        status = 400 if 'code' in order else 200
+        return web.json_response(order, status=status)
+
+    async def _batch_orders(self, request: web.Request) -> web.Response:
+        params = await _params(request)
+        try:
+            batch = json.loads(params.get('batchOrders', '[]'))
+        except json.JSONDecodeError:
+            return web.json_response({'code': -1130, 'msg': 'Invalid batchOrders.'}, status=400)
+        return web.json_response([self._place(order) for order in batch])
+
+    async def _get_order(self, request: web.Request) -> web.Response:
+        order = self._find(await _params(request))
+        if order is None:
+            return web.json_response({'code': -2013, 'msg': 'Order does not exist.'}, status=400)
+        return web.json_response(order)
+
+    async def _cancel_order(self, request: web.Request) -> web.Response:
+        order = self._find(await _params(request))
+        if order is None or order['status'] != 'NEW':
+            return web.json_response({'code': -2011, 'msg': 'Unknown order sent.'}, status=400)
+        order['status'] = 'CANCELED'
+        self._push_order_update(order, 'CANCELED')
+        return web.json_response(order)
+
+    async def _cancel_all(self, request: web.Request) -> web.Response:
+        symbol = (await _params(request)).get('symbol')
+        for order in self.orders.values():
+            if order['symbol'] == symbol and order['status'] == 'NEW':
+                order['status'] = 'CANCELED'
+                self._push_order_update(order, 'CANCELED')
+        return web.json_response({'code': 200, 'msg': 'The operation of cancel all open order is done.'})
+
+    async def _open_orders(self, request: web.Request) -> web.Response:
+        symbol = request.query.get('symbol')
+        return web.json_response([o for o in self.orders.values()
+                                  if o['status'] == 'NEW' and (not symbol or o['symbol'] == symbol)])
+
+    async def _all_orders(self, request: web.Request) -> web.Response:
+        symbol = request.query.get('symbol')
+        return web.json_response([o for o in self.orders.values() if o['symbol'] == symbol])
+
+    async def _account(self, request: web.Request) -> web.Response:
+        unrealized = sum(float(p['unRealizedProfit']) for p in self._position_list())
+        return web.json_response({
+            'totalWalletBalance': str(self.wallet_balance),
+            'totalUnrealizedProfit': str(unrealized),
+            'totalMarginBalance': str(self.wallet_balance + unrealized),
+            'availableBalance': str(self.wallet_balance),
+            'maxWithdrawAmount': str(self.wallet_balance),
+            'assets': [{'asset': 'USDT', 'walletBalance': str(self.wallet_balance),
+                        'availableBalance': str(self.wallet_balance), 'unrealizedProfit': str(unrealized),
+                        'marginBalance': str(self.wallet_balance + unrealized)}],
+            'positions': self._position_list(),
+        })
+
+    async def _balance(self, request: web.Request) -> web.Response:
+        return web.json_response([{'asset': 'USDT', 'balance': str(self.wallet_balance),
+                                   'availableBalance': str(self.wallet_balance), 'crossUnPnl': '0'}])
+
+    async def _position_risk(self, request: web.Request) -> web.Response:
+        symbol = request.query.get('symbol')
+        return web.json_response([p for p in self._position_list() if not symbol or p['symbol'] == symbol])
+
+    async def _change_leverage(self, request: web.Request) -> web.Response:
+        params = await _params(request)
+        symbol = params.get('symbol', '')
+        self.leverage[symbol] = int(params.get('leverage', 1))
+        return web.json_response({'symbol': symbol, 'leverage': self.leverage[symbol],
+                                  'maxNotionalValue': '1000000'})
+
+    async def _listen_key(self, request: web.Request) -> web.Response:
+        return web.json_response({'listenKey': 'mock-listen-key'})
+
+    async def _user_stream(self, request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse(heartbeat=30)
+        await ws.prepare(request)
+        self._streams.append(ws)
+        try:
+            async for msg in ws:
+                if msg.type == WSMsgType.ERROR:
+                    break
+        finally:
+            if ws in self._streams:
+                self._streams.remove(ws)
+        return ws
+
+    # Order matching
+
+    def _place(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        symbol = str(params.get('symbol', ''))
+        if symbol not in self.prices:
+            return {'code': -1121, 'msg': 'Invalid symbol.'}
+
+        order_type = str(params.get('type', 'MARKET'))
+        quantity = float(params.get('quantity') or 0)
+        close_position = str(params.get('closePosition', 'false')).lower() == 'true'
+        if quantity <= 0 and not close_position:
+            return {'code': -4003, 'msg': 'Quantity less than or equal to zero.'}
+
+        now = int(time.time() * 1000)
+        order = {
+            'orderId': next(self._order_ids),
+            'symbol': symbol,
+            'status': 'NEW',
+            'clientOrderId': str(params.get('newClientOrderId') or f"mock_{now}"),
+            'price': str(params.get('price', '0')),
+            'avgPrice': '0',
+            'origQty': str(quantity),
+            'executedQty': '0',
+            'cumQuote': '0',
+            'timeInForce': str(params.get('timeInForce', 'GTC')),
+            'type': order_type,
+            'origType': order_type,
+            'reduceOnly': str(params.get('reduceOnly', 'false')).lower() == 'true',
+            'closePosition': close_position,
+            'side': str(params.get('side', 'BUY')),
+            'positionSide': str(params.get('positionSide', 'BOTH')),
+            'stopPrice': str(params.get('stopPrice', params.get('triggerPrice', '0'))),
+            'workingType': str(params.get('workingType', 'CONTRACT_PRICE')),
+            'updateTime': now,
+        }
+        self.orders[order['orderId']] = order
+        self.order_arrivals.append({
+            'time': time.perf_counter(), 'exchange': self.name, 'symbol': symbol, 'type': order_type,
+            'reduce_only': order['reduceOnly'] or close_position, 'order_id': order['orderId'],
+            'client_order_id': order['clientOrderId'],
+        })
+        self._push_order_update(order, 'NEW')
+
+        if order_type == 'MARKET':
+            self._fill(order, self.prices[symbol])
+        elif order_type == 'LIMIT':
+            price = self.prices[symbol]
+            limit = float(order['price'])
+            if (order['side'] == 'BUY' and price <= limit) or (order['side'] == 'SELL' and price >= limit):
+                self._fill(order, limit)
+        return dict(order)
+
+    def _find(self, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        if params.get('orderId'):
+            return self.orders.get(int(params['orderId']))
+        client_id = params.get('origClientOrderId')
+        return next((o for o in self.orders.values() if o['clientOrderId'] == client_id), None)
+
+    def _fill(self, order: Dict[str, Any], price: float) -> None:
+        symbol = order['symbol']
+        quantity = float(order['origQty'])
+        signed_qty = quantity if order['side'] == 'BUY' else -quantity
+
+        position = self.positions.setdefault(symbol, {'amount': 0.0, 'entry': 0.0})
+        new_amount = position['amount'] + signed_qty
+        if position['amount'] == 0 or (position['amount'] > 0) == (signed_qty > 0):
+            total = abs(position['amount']) + abs(signed_qty)
+            position['entry'] = (abs(position['amount']) * position['entry'] + abs(signed_qty) * price) / total
+        realized = 0.0
+        if position['amount'] and (position['amount'] > 0) != (signed_qty > 0):
+            closed = min(abs(position['amount']), abs(signed_qty))
+            direction = 1 if position['amount'] > 0 else -1
+            realized = closed * (price - position['entry']) * direction
+            self.wallet_balance += realized
+        position['amount'] = round(new_amount, 12)
+        if position['amount'] == 0:
+            position['entry'] = 0.0
+
+        order.update({'status': 'FILLED', 'avgPrice': str(price), 'executedQty': str(quantity),
+                      'cumQuote': str(quantity * price), 'updateTime': int(time.time() * 1000)})
+        self._push_order_update(order, 'TRADE', last_price=price, realized=realized)
+        self._push_account_update(symbol)
+
+    def _position_list(self) -> List[Dict[str, Any]]:
+        positions = []
+        for symbol, position in self.positions.items():
+            if position['amount'] == 0:
+                continue
+            mark = self.prices.get(symbol, position['entry'])
+            positions.append({
+                'symbol': symbol, 'positionAmt': str(position['amount']), 'entryPrice': str(position['entry']),
+                'markPrice': str(mark), 'unRealizedProfit': str((mark - position['entry']) * position['amount']),
+                'liquidationPrice': '0', 'leverage': str(self.leverage.get(symbol, 1)), 'marginType': 'cross',
+                'isolatedMargin': '0', 'isAutoAddMargin': 'false', 'positionSide': 'BOTH',
+                'notional': str(mark * position['amount']), 'isolatedWallet': '0',
+                'updateTime': int(time.time() * 1000),
+            })
+        return positions
+
+    # User data stream
+
+    def _push_order_update(self, order: Dict[str, Any], execution_type: str,
+                           last_price: float = 0.0, realized: float = 0.0) -> None:
+        now = int(time.time() * 1000)
+        self.push_event({
+            'e': 'ORDER_TRADE_UPDATE', 'E': now, 'T': now,
+            'o': {
+                's': order['symbol'], 'c': order['clientOrderId'], 'S': order['side'], 'o': order['type'],
+                'f': order['timeInForce'], 'q': order['origQty'], 'p': order['price'], 'ap': order['avgPrice'],
+                'sp': order['stopPrice'], 'x': execution_type, 'X': order['status'], 'i': order['orderId'],
+                'l': order['executedQty'] if execution_type == 'TRADE' else '0', 'z': order['executedQty'],
+                'L': str(last_price), 'n': '0', 'N': 'USDT', 'T': now, 't': 0, 'R': order['reduceOnly'],
+                'wt': order['workingType'], 'ot': order['origType'], 'ps': order['positionSide'],
+                'cp': order['closePosition'], 'rp': str(realized),
+            },
+        })
+
+    def _push_account_update(self, symbol: str) -> None:
+        position = self.positions.get(symbol, {'amount': 0.0, 'entry': 0.0})
+        now = int(time.time() * 1000)
+        self.push_event({
+            'e': 'ACCOUNT_UPDATE', 'E': now, 'T': now,
+            'a': {
+                'm': 'ORDER',
+                'B': [{'a': 'USDT', 'wb': str(self.wallet_balance), 'cw': str(self.wallet_balance), 'bc': '0'}],
+                'P': [{'s': symbol, 'pa': str(position['amount']), 'ep': str(position['entry']), 'cr': '0',
+                       'up': '0', 'mt': 'cross', 'iw': '0', 'ps': 'BOTH'}],
+            },
+        })
+
+    def push_event(self, event: Dict[str, Any]) -> None:
+        """Send an event to every connected user data stream client."""
+        message = json.dumps(event)
+        for ws in list(self._streams):
+            if not ws.closed:
+                asyncio.ensure_future(ws.send_str(message))
+
+    @property
+    def stream_clients(self) -> int:
+        return len(self._streams)
+
+
+# KuCoin
+
+class MockKucoinFutures(MockService):
+    """
+    KuCoin futures stand-in.
+
+    Symbols use the KuCoin contract names (XBTUSDTM, ETHUSDTM, ...); MARKET
+    orders fill immediately.
+    """
+
+    name = 'kucoin'
+
+    def __init__(self, fault: Optional[FaultProfile] = None, account_equity: float = 10000.0):
+        self.prices: Dict[str, float] = {}
+        self.orders: Dict[str, Dict[str, Any]] = {}
+        self.positions: Dict[str, Dict[str, Any]] = {}
+        self.account_equity = account_equity
+        self.order_arrivals: List[Dict[str, Any]] = []
+        self._order_ids = itertools.count(1)
+        super().__init__(fault)
+
+    def call_key(self, request: web.Request) -> Tuple[str, ...]:
+        path = re.sub(r'^/api/v\d+/', '', request.path)
+        # Collapse per-symbol / per-order path segments
+        path = re.sub(r'^(contracts|mark-price|orders)/[^/]+', r'\1/{id}', path)
+        return (request.method, path)
+
+    def error_body(self, status: int, message: str) -> Dict[str, Any]:
+        return {'code': str(status * 1000), 'msg': message}
+
+    def setup_routes(self, router: web.UrlDispatcher) -> None:
+        router.add_get('/api/v1/timestamp', self._timestamp)
+        router.add_get('/api/v1/contracts/active', self._contracts)
+        router.add_get('/api/v1/contracts/{symbol}', self._contract)
+        router.add_get('/api/v1/ticker', self._ticker)
+        router.add_get('/api/v1/mark-price/{symbol}/current', self._mark_price)
+        router.add_get('/api/v1/index/query', self._index)
+        router.add_post('/api/v1/orders', self._create_order)
+        router.add_post('/api/v1/st-orders', self._create_order)
+        router.add_get('/api/v1/orders', self._list_orders)
+        router.add_get('/api/v1/orders/{order_id}', self._get_order)
+        router.add_delete('/api/v1/orders/{order_id}', self._cancel_order)
+        router.add_get('/api/v1/stopOrders', self._list_orders)
+        router.add_get('/api/v1/positions', self._positions)
+        router.add_get('/api/v1/position', self._position)
+        router.add_post('/api/v2/changeCrossUserLeverage', self._true)
+        router.add_post('/api/v2/position/changeMarginMode', self._true)
+        router.add_get('/api/v1/account-overview', self._account_overview)
+        router.add_get('/api/v1/fills', self._empty_page)
+        router.add_get('/api/v1/recentFills', self._empty_list)
+        router.add_get('/api/v1/funding-history', self._empty_page)
+
+    @staticmethod
+    def _ok(data: Any) -> web.Response:
+        return web.json_response({'code': '200000', 'data': data})
+
+    def set_prices(self, prices: Dict[str, float]) -> None:
+        for symbol, price in prices.items():
+            self.prices[symbol] = float(price)
+
+    def _contract_info(self, symbol: str) -> Dict[str, Any]:
+        base = symbol[:-5] if symbol.endswith('USDTM') else symbol
+        return {
+            'symbol': symbol, 'rootSymbol': 'USDT', 'type': 'FFWCSX', 'status': 'Open',
+            'baseCurrency': 'XBT' if base == 'XBT' else base, 'quoteCurrency': 'USDT', 'settleCurrency': 'USDT',
+            'multiplier': 0.001 if base == 'XBT' else 0.01, 'lotSize': 1, 'tickSize': 0.1 if base == 'XBT' else 0.001,
+            'maxOrderQty': 1000000, 'maxLeverage': 100, 'markPrice': self.prices.get(symbol, 0),
+            'indexPrice': self.prices.get(symbol, 0), 'lastTradePrice': self.prices.get(symbol, 0),
+            'isInverse': False, 'isQuanto': False,
+        }
+
+    async def _timestamp(self, request: web.Request) -> web.Response:
+        return self._ok(int(time.time() * 1000))
+
+    async def _true(self, request: web.Request) -> web.Response:
+        return self._ok(True)
+
+    async def _empty_list(self, request: web.Request) -> web.Response:
+        return self._ok([])
+
+    async def _empty_page(self, request: web.Request) -> web.Response:
+        return self._ok({'currentPage': 1, 'pageSize': 50, 'totalNum': 0, 'totalPage': 0, 'items': []})
+
+    async def _contracts(self, request: web.Request) -> web.Response:
+        return self._ok([self._contract_info(symbol) for symbol in self.prices])
+
+    async def _contract(self, request: web.Request) -> web.Response:
+        symbol = request.match_info['symbol']
+        if symbol not in self.prices:
+            return web.json_response({'code': '100001', 'msg': 'Contract not found'})
+        return self._ok(self._contract_info(symbol))
+
+    async def _ticker(self, request: web.Request) -> web.Response:
+        symbol = request.query.get('symbol', '')
+        if symbol not in self.prices:
+            return web.json_response({'code': '100001', 'msg': 'Contract not found'})
+        price = self.prices[symbol]
+        return self._ok({'symbol': symbol, 'price': str(price), 'bestBidPrice': str(price),
+                         'bestAskPrice': str(price), 'size': 1, 'ts': time.time_ns()})
+
+    async def _mark_price(self, request: web.Request) -> web.Response:
+        symbol = request.match_info['symbol']
+        price = self.prices.get(symbol)
+        if price is None:
+            return web.json_response({'code': '100001', 'msg': 'Contract not found'})
+        return self._ok({'symbol': symbol, 'value': price, 'indexPrice': price,
+                         'timePoint': int(time.time() * 1000), 'granularity': 1000})
+
+    async def _index(self, request: web.Request) -> web.Response:
+        symbol = request.query.get('symbol', '').lstrip('.')
+        return self._ok({'hasMore': False, 'dataList': [
+            {'symbol': symbol, 'value': self.prices.get(symbol, 0), 'timePoint': int(time.time() * 1000)}]})
+
+    async def _create_order(self, request: web.Request) -> web.Response:
+        params = await _params(request)
+        symbol = str(params.get('symbol', ''))
+        if symbol not in self.prices:
+            return web.json_response({'code': '100001', 'msg': 'Contract not found'})
+
+        order_id = f"mock{next(self._order_ids):012d}"
+        order_type = str(params.get('type', 'market')).lower()
+        order = {
+            'id': order_id, 'symbol': symbol, 'type': order_type, 'side': str(params.get('side', 'buy')).lower(),
+            'price': str(params.get('price') or '0'), 'size': int(float(params.get('size') or 0)),
+            'value': '0', 'dealValue': '0', 'dealSize': 0, 'stop': str(params.get('stop', '')),
+            'stopPrice': params.get('stopPrice'), 'leverage': str(params.get('leverage', '1')),
+            'reduceOnly': bool(params.get('reduceOnly', False)), 'closeOrder': bool(params.get('closeOrder', False)),
+            'clientOid': str(params.get('clientOid', '')), 'isActive': True, 'cancelExist': False,
+            'status': 'open', 'createdAt': int(time.time() * 1000), 'marginMode': 'ISOLATED',
+        }
+        self.orders[order_id] = order
+        self.order_arrivals.append({
+            'time': time.perf_counter(), 'exchange': self.name, 'symbol': symbol, 'type': order_type.upper(),
+            'reduce_only': order['reduceOnly'] or order['closeOrder'], 'order_id': order_id,
+            'client_order_id': order['clientOid'],
+        })
+        if order_type == 'market' and not order['stop']:
+            price = self.prices[symbol]
+            order.update({'status': 'done', 'isActive': False, 'dealSize': order['size'], 'avgDealPrice': str(price),
+                          'dealValue': str(order['size'] * price * self._contract_info(symbol)['multiplier'])})
+            signed = order['size'] if order['side'] == 'buy' else -order['size']
+            position = self.positions.setdefault(symbol, {'currentQty': 0, 'avgEntryPrice': price})
+            position['currentQty'] += signed
+            position['avgEntryPrice'] = price
+        return self._ok({'orderId': order_id, 'clientOid': order['clientOid']})
+
+    async def _list_orders(self, request: web.Request) -> web.Response:
+        status = request.query.get('status')
+        items = [o for o in self.orders.values()
+                 if (not status or o['status'] == status)
+                 and (not request.query.get('symbol') or o['symbol'] == request.query['symbol'])]
+        return self._ok({'currentPage': 1, 'pageSize': 50, 'totalNum': len(items), 'totalPage': 1, 'items': items})
+
+    async def _get_order(self, request: web.Request) -> web.Response:
+        order_id = request.match_info['order_id']
+        order = self.orders.get(order_id)
+        if order is None:
+            order = next((o for o in self.orders.values() if o['clientOid'] == order_id), None)
+        if order is None:
+            return web.json_response({'code': '100001', 'msg': 'error.getOrder.orderNotExist'})
+        return self._ok(order)
+
+    async def _cancel_order(self, request: web.Request) -> web.Response:
+        order = self.orders.get(request.match_info['order_id'])
+        if order is None or order['status'] != 'open':
+            return web.json_response({'code': '100004', 'msg': 'order cannot be canceled'})
+        order.update({'status': 'done', 'isActive': False, 'cancelExist': True})
+        return self._ok({'cancelledOrderIds': [order['id']]})
+
+    def _position_entry(self, symbol: str, position: Dict[str, Any]) -> Dict[str, Any]:
+        mark = self.prices.get(symbol, position['avgEntryPrice'])
+        return {'symbol': symbol, 'currentQty': position['currentQty'], 'avgEntryPrice': position['avgEntryPrice'],
+                'markPrice': mark, 'isOpen': position['currentQty'] != 0, 'realLeverage': 1,
+                'unrealisedPnl': 0, 'realisedPnl': 0, 'marginMode': 'ISOLATED', 'settleCurrency': 'USDT'}
+
+    async def _positions(self, request: web.Request) -> web.Response:
+        return self._ok([self._position_entry(s, p) for s, p in self.positions.items() if p['currentQty']])
+
+    async def _position(self, request: web.Request) -> web.Response:
+        symbol = request.query.get('symbol', '')
+        position = self.positions.get(symbol, {'currentQty': 0, 'avgEntryPrice': 0})
+        return self._ok(self._position_entry(symbol, position))
+
+    async def _account_overview(self, request: web.Request) -> web.Response:
+        equity = self.account_equity
+        return self._ok({'accountEquity': equity, 'unrealisedPNL': 0, 'marginBalance': equity,
+                         'positionMargin': 0, 'orderMargin': 0, 'frozenFunds': 0,
+                         'availableBalance': equity, 'currency': 'USDT'})
+
+
+# Supabase PostgREST
+
+_FILTER_OPS = {'eq', 'neq', 'gt', 'gte', 'lt', 'lte', 'like', 'ilike', 'is', 'in', 'cs', 'cd'}
+_RESERVED_PARAMS = {'select', 'order', 'limit', 'offset', 'on_conflict', 'columns', 'or', 'and'}
+
+
+def _split_top_level(text: str) -> List[str]:
+    """Split on commas that are not inside parentheses or quotes."""
+    parts, depth, quoted, current = [], 0, False, []
+    for char in text:
+        if char == '"':
+            quoted = not quoted
+        elif not quoted and char == '(':
+            depth += 1
+        elif not quoted and char == ')':
+            depth -= 1
+        if char == ',' and depth == 0 and not quoted:
+            parts.append(''.join(current))
+            current = []
+        else:
+            current.append(char)
+    if current:
+        parts.append(''.join(current))
+    return [p.strip() for p in parts if p.strip()]
+
+
+def _column_value(row: Dict[str, Any], column: str) -> Any:
+    """Row value for a column, following ``->`` / ``->>`` JSON paths."""
+    parts = re.split(r'->>?', column)
+    value: Any = row.get(parts[0])
+    for key in parts[1:]:
+        if isinstance(value, str):
+            try:
+                value = json.loads(value)
+            except json.JSONDecodeError:
+                return None
+        value = value.get(key.strip("'")) if isinstance(value, dict) else None
+    return value
+
+
+def _compare(left: Any, right: str) -> Optional[int]:
+    if left is None:
+        return None
+    a: Any
+    b: Any
+    # Integers first: Discord snowflake ids do not survive a float conversion
+    for convert in (int, float):
+        try:
+            a, b = convert(left), convert(right)
+            break
+        except (TypeError, ValueError):
+            continue
+    else:
+        a, b = str(left), right
+    return (a > b) - (a < b)
+
+
+def _like(value: Any, pattern: str, case_insensitive: bool) -> bool:
+    if value is None:
+        return False
+    regex = '^' + re.escape(pattern).replace(r'\*', '.*').replace('%', '.*') + '$'
+    return re.match(regex, str(value), re.IGNORECASE if case_insensitive else 0) is not None
+
+
+def _matches(row: Dict[str, Any], column: str, expression: str) -> bool:
+    """Evaluate one PostgREST filter (``op.value``, optionally ``not.op.value``)."""
+    negate = expression.startswith('not.')
+    if negate:
+        expression = expression[4:]
+    op, _, value = expression.partition('.')
+    if op not in _FILTER_OPS:
+        return True
+    actual = _column_value(row, column)
+
+    if op == 'is':
+        lowered = value.lower()
+        result = actual is None if lowered == 'null' else actual is (lowered == 'true')
+    elif op == 'in':
+        options = [v.strip('"') for v in _split_top_level(value.strip('()'))]
+        result = actual is not None and any(_compare(actual, option) == 0 for option in options)
+    elif op in ('like', 'ilike'):
+        result = _like(actual, value, op == 'ilike')
+    elif op in ('cs', 'cd'):
+        result = False
+    else:
+        cmp = _compare(actual, value.strip('"'))
+        result = cmp is not None and {
+            'eq': cmp == 0, 'neq': cmp != 0, 'gt': cmp > 0, 'gte': cmp >= 0, 'lt': cmp < 0, 'lte': cmp <= 0,
+        }[op]
+    return not result if negate else result
+
+
+def _matches_logic(row: Dict[str, Any], expression: str, conjunction: bool) -> bool:
+    """Evaluate an ``or=(a.eq.1,b.gt.2)`` / ``and=(...)`` group."""
+    results = []
+    for condition in _split_top_level(expression.strip()[1:-1]):
+        if condition.startswith(('or(', 'and(')):
+            name, _, rest = condition.partition('(')
+            results.append(_matches_logic(row, '(' + rest, name == 'and'))
+            continue
+        column, _, filter_expression = condition.partition('.')
+        results.append(_matches(row, column, filter_expression))
+    return all(results) if conjunction else any(results)
+
+
+class MockPostgrest(MockService):
+    """
+    Supabase PostgREST stand-in over in-memory tables.
+
+    Supports the filters, ordering, paging, counting, single-row responses,
+    insert/upsert/update/delete and RPC calls the supabase-py client issues.
+    Calls are counted per (table, operation).
+    """
+
+    name = 'supabase'
+
+    def __init__(self, fault: Optional[FaultProfile] = None):
+        self.tables: Dict[str, List[Dict[str, Any]]] = {}
+        self._ids: Dict[str, itertools.count] = {}
+        self._lock = threading.Lock()
+        super().__init__(fault)
+
+    def call_key(self, request: web.Request) -> Tuple[str, ...]:
+        table = request.match_info.get('table') or request.path.rsplit('/', 1)[-1]
+        op = {'GET': 'select', 'HEAD': 'count', 'POST': 'insert', 'PATCH': 'update', 'DELETE': 'delete'}.get(
+            request.method, request.method.lower())
+        if '/rpc/' in request.path:
+            op = 'rpc'
+        elif op == 'insert' and 'merge-duplicates' in request.headers.get('Prefer', ''):
+            op = 'upsert'
+        return (table, op)
+
+    def error_body(self, status: int, message: str) -> Dict[str, Any]:
+        return {'code': 'PGRST000', 'message': message, 'details': None, 'hint': None}
+
+    def setup_routes(self, router: web.UrlDispatcher) -> None:
+        router.add_post('/rest/v1/rpc/{function}', self._rpc)
+        router.add_route('*', '/rest/v1/{table}', self._table)
+        router.add_get('/auth/v1/health', self._health)
+
+    def seed(self, tables: Dict[str, List[Dict[str, Any]]]) -> None:
+        """Load fixture rows, assigning ids to rows without one."""
+        for table, rows in tables.items():
+            for row in rows:
+                self._insert(table, dict(row))
+
+    def rows(self, table: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [dict(row) for row in self.tables.get(table, [])]
+
+    def _next_id(self, table: str) -> int:
+        existing = max((int(r['id']) for r in self.tables.get(table, []) if isinstance(r.get('id'), int)), default=0)
+        counter = self._ids.get(table)
+        if counter is None:
+            counter = self._ids[table] = itertools.count(existing + 1)
+        return next(counter)
+
+    def _insert(self, table: str, row: Dict[str, Any], conflict_columns: Optional[List[str]] = None) -> Dict[str, Any]:
+        with self._lock:
+            rows = self.tables.setdefault(table, [])
+            if conflict_columns:
+                for existing in rows:
+                    if all(c in row and existing.get(c) == row.get(c) for c in conflict_columns):
+                        existing.update(row)
+                        return dict(existing)
+            if 'id' not in row or row['id'] is None:
+                row['id'] = self._next_id(table)
+            rows.append(row)
+            return dict(row)
+
+    def _filter(self, table: str, query: Dict[str, List[str]]) -> List[Dict[str, Any]]:
+        rows = self.tables.get(table, [])
+        result = []
+        for row in rows:
+            keep = True
+            for column, expressions in query.items():
+                for expression in expressions:
+                    if column in ('or', 'and'):
+                        keep = _matches_logic(row, expression, column == 'and')
+                    elif column not in _RESERVED_PARAMS:
+                        keep = _matches(row, column, expression)
+                    if not keep:
+                        break
+                if not keep:
+                    break
+            if keep:
+                result.append(row)
+        return result
+
+    @staticmethod
+    def _project(rows: List[Dict[str, Any]], select: Optional[str]) -> List[Dict[str, Any]]:
+        if not select or select == '*':
+            return [dict(r) for r in rows]
+        columns = []
+        for column in _split_top_level(select):
+            if column == '*':
+                return [dict(r) for r in rows]
+            if '(' in column:
+                continue  # embedded resources are not modelled
+            alias, _, source = column.partition(':')
+            columns.append((alias, source or alias))
+        return [{alias: _column_value(row, source.split('::')[0]) for alias, source in columns} for row in rows]
+
+    @staticmethod
+    def _order(rows: List[Dict[str, Any]], order: Optional[str]) -> List[Dict[str, Any]]:
+        if not order:
+            return rows
+        for term in reversed(_split_top_level(order)):
+            column, *modifiers = term.split('.')
+            descending = 'desc' in modifiers
+            present = [r for r in rows if _column_value(r, column) is not None]
+            missing = [r for r in rows if _column_value(r, column) is None]
+            present.sort(key=lambda r: _sort_key(_column_value(r, column)), reverse=descending)
+            rows = present + missing if 'nullsfirst' not in modifiers else missing + present
+        return rows
+
+    def _respond(self, request: web.Request, rows: List[Dict[str, Any]], total: Optional[int] = None,
+                 status: int = 200) -> web.Response:
+        headers = {}
+        prefer = request.headers.get('Prefer', '')
+        if 'count=' in prefer:
+            count = total if total is not None else len(rows)
+            end = max(len(rows) - 1, 0)
+            headers['Content-Range'] = f"0-{end}/{count}" if rows else f"*/{count}"
+        if request.method == 'HEAD':
+            return web.Response(status=status, headers=headers)
+        if 'application/vnd.pgrst.object+json' in request.headers.get('Accept', ''):
+            if len(rows) != 1:
+                return web.json_response({'code': 'PGRST116', 'message': 'JSON object requested, multiple (or no) rows returned',
+                                          'details': f'The result contains {len(rows)} rows', 'hint': None},
+                                         status=406, headers=headers)
+            return web.json_response(rows[0], status=status, headers=headers)
+        if request.method != 'GET' and 'return=minimal' in prefer:
+            return web.Response(status=204 if status == 200 else status, headers=headers)
+        return web.json_response(rows, status=status, headers=headers, dumps=_dumps)
+
+    async def _table(self, request: web.Request) -> web.Response:
+        table = request.match_info['table']
+        query: Dict[str, List[str]] = {}
+        for key, value in request.query.items():
+            query.setdefault(key, []).append(value)
+
+        if request.method in ('GET', 'HEAD'):
+            with self._lock:
+                matched = self._order(self._filter(table, query), request.query.get('order'))
+            total = len(matched)
+            offset = int(request.query.get('offset', 0))
+            limit = request.query.get('limit')
+            range_header = request.headers.get('Range')
+            if range_header and '-' in range_header:
+                start, _, end = range_header.partition('-')
+                offset, limit = int(start), str(int(end) - int(start) + 1)
+            matched = matched[offset:offset + int(limit)] if limit is not None else matched[offset:]
+            return self._respond(request, self._project(matched, request.query.get('select')), total)
+
+        if request.method == 'POST':
+            body = await request.json() if request.can_read_body else {}
+            records = body if isinstance(body, list) else [body]
+            conflict = None
+            if 'merge-duplicates' in request.headers.get('Prefer', ''):
+                conflict = (request.query.get('on_conflict') or 'id').split(',')
+            inserted = [self._insert(table, dict(record), conflict) for record in records]
+            return self._respond(request, self._project(inserted, request.query.get('select')), status=201)
+
+        if request.method == 'PATCH':
+            updates = await request.json() if request.can_read_body else {}
+            with self._lock:
+                matched = self._filter(table, query)
+                for row in matched:
+                    row.update(updates)
+                updated = [dict(row) for row in matched]
+            return self._respond(request, self._project(updated, request.query.get('select')))
+
+        if request.method == 'DELETE':
+            with self._lock:
+                matched = self._filter(table, query)
+                self.tables[table] = [row for row in self.tables.get(table, []) if row not in matched]
+            return self._respond(request, self._project(matched, request.query.get('select')))
+
+        raise web.HTTPNotFound()
+
+    async def _rpc(self, request: web.Request) -> web.Response:
+        return web.json_response([])
+
+    async def _health(self, request: web.Request) -> web.Response:
+        return web.json_response({'status': 'ok'})
+
+    def counts_by_table(self) -> Dict[str, Dict[str, int]]:
+        counts: Dict[str, Dict[str, int]] = {}
+        for (table, op), count in self.calls.items():
+            counts.setdefault(table, {})[op] = count
+        return counts
+
+
+def _sort_key(value: Any) -> Tuple[int, Any]:
+    try:
+        return (0, float(value))
+    except (TypeError, ValueError):
+        return (1, str(value))
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, default=str)
+
+
+def _decimals(step: float) -> int:
+    text = f"{step:.10f}".rstrip('0')
+    return len(text.split('.')[1]) if '.' in text else 0
+
+
+# OpenAI
+
+class MockOpenAI(MockService):
+    """
+    OpenAI chat completions stand-in.
+
+    Answers with the recorded parse whose signal text appears in the prompt,
+    so signal parsing costs only the configured latency.
+    """
+
+    name = 'openai'
+
+    def __init__(self, fault: Optional[FaultProfile] = None):
+        self.responses: Dict[str, Dict[str, Any]] = {}
+        super().__init__(fault)
+
+    def setup_routes(self, router: web.UrlDispatcher) -> None:
+        router.add_post('/v1/chat/completions', self._completions)
+
+    def add_response(self, signal_content: str, parsed: Dict[str, Any]) -> None:
+        self.responses[signal_content.strip()] = parsed
+
+    def _lookup(self, prompt: str) -> Optional[Dict[str, Any]]:
+        best = None
+        for content, parsed in self.responses.items():
+            if content and content in prompt and (best is None or len(content) > len(best[0])):
+                best = (content, parsed)
+        return best[1] if best else None
+
+    async def _completions(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        prompt = '\n'.join(str(m.get('content', '')) for m in body.get('messages', []) if m.get('role') == 'user')
+        parsed = self._lookup(prompt)
+        if body.get('response_format', {}).get('type') == 'json_object':
+            content = json.dumps(parsed or {})
+        else:
+            content = (parsed or {}).get('coin_symbol', '')
+        return web.json_response({
+            'id': 'chatcmpl-mock', 'object': 'chat.completion', 'created': int(time.time()),
+            'model': body.get('model', 'mock'),
+            'choices': [{'index': 0, 'finish_reason': 'stop',
+                         'message': {'role': 'assistant', 'content': content}}],
+            'usage': {'prompt_tokens': 0, 'completion_tokens': 0, 'total_tokens': 0},
+        })
+
+
+class MockServerThread:
+    """
+    Runs a set of mock services on an event loop in a background thread.
+
+    Usage:
+        servers = MockServerThread([binance, postgrest])
+        servers.start()
+        ...
+        servers.call(binance.set_prices, {'BTCUSDT': 65000})
+        servers.stop()
+    """
+
+    def __init__(self, services: List[MockService]):
+        self.services = services
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run, name='mock-servers', daemon=True)
+
+    def _run(self) -> None:
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def start(self, timeout: float = 10.0) -> None:
+        self._thread.start()
+        for service in self.services:
+            asyncio.run_coroutine_threadsafe(service.start(), self.loop).result(timeout)
+
+    def call(self, func: Callable, *args: Any) -> None:
+        """Run a state-changing call on the server loop (thread-safe)."""
+        self.loop.call_soon_threadsafe(func, *args)
+
+    def stop(self, timeout: float = 10.0) -> None:
+        for service in self.services:
+            try:
+                asyncio.run_coroutine_threadsafe(service.stop(), self.loop).result(timeout)
+            except Exception as e:
+                logger.warning(f"Error stopping mock {service.name}: {e}")
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout)
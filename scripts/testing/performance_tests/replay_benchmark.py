@@ -0,0 +1,455 @@
+#!/usr/bin/env python3
+"""
+Offline replay benchmark.
+
+Replays recorded Discord signal streams and Binance user data events through
+the real DiscordBot (process_initial_signal / process_update_signal, the
+websocket manager and SyncManager) against local stand-ins for Binance,
+KuCoin, Supabase PostgREST and OpenAI (see mock_servers.py), then reports
+throughput, signal-to-order latency percentiles and DB/exchange call counts.
+
+A saved report can be used as a baseline: the run fails when throughput,
+p99 latency or DB calls per signal regress by more than the tolerance.
+
+Recordings (JSON lines, ``offset_ms`` relative to the start of the replay):
+    signals:  {"offset_ms": 0, "kind": "prices", "prices": {"BTC": 65000}}
+              {"offset_ms": 100, "kind": "initial", "signal": {...InitialDiscordSignal}, "parsed": {...}}
+              {"offset_ms": 900, "kind": "update", "signal": {...DiscordUpdateSignal}, "parsed": {...}}
+    events:   {"offset_ms": 500, "exchange": "binance", "event": {"e": "ORDER_TRADE_UPDATE", ...}}
+
+Usage:
+    python scripts/testing/performance_tests/replay_benchmark.py [--speed 10] \\
+        [--binance-fault 20:5:0.01] [--supabase-fault 30:10] [--openai-fault 800:300] \\
+        [--output report.json] [--baseline report.json --tolerance 0.2]
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+# Modules are imported from the project root
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(script_dir)))
+sys.path.insert(0, project_root)
+
+from scripts.testing.performance_tests.mock_servers import (  # noqa: E402
+    FaultProfile, MockBinanceFutures, MockKucoinFutures, MockOpenAI, MockPostgrest, MockServerThread
+)
+
+logger = logging.getLogger(__name__)
+
+RECORDINGS_DIR = os.path.join(script_dir, 'recordings')
+DEFAULT_SIGNALS = os.path.join(RECORDINGS_DIR, 'signals_sample.jsonl')
+DEFAULT_EVENTS = os.path.join(RECORDINGS_DIR, 'exchange_events_sample.jsonl')
+DEFAULT_FIXTURES = os.path.join(RECORDINGS_DIR, 'fixtures.json')
+
+# A syntactically valid JWT; supabase-py rejects keys that do not look like one
+MOCK_SUPABASE_KEY = 'eyJhbGciOiJIUzI1NiJ9.eyJyb2xlIjoic2VydmljZV9yb2xlIn0.cmVwbGF5'
+
+ENTRY_ORDER_TYPES = ('MARKET', 'LIMIT')
+
+
+@dataclass
+class ReplayConfig:
+    """Settings for one replay run."""
+    signals_path: str = DEFAULT_SIGNALS
+    events_path: Optional[str] = DEFAULT_EVENTS
+    fixtures_path: Optional[str] = DEFAULT_FIXTURES
+    speed: float = 1.0
+    drain_seconds: float = 2.0
+    binance_fault: FaultProfile = field(default_factory=FaultProfile)
+    kucoin_fault: FaultProfile = field(default_factory=FaultProfile)
+    supabase_fault: FaultProfile = field(default_factory=FaultProfile)
+    openai_fault: FaultProfile = field(default_factory=FaultProfile)
+
+
+@dataclass
+class SignalResult:
+    """Outcome of one replayed signal."""
+    kind: str
+    discord_id: str
+    coin_symbol: Optional[str]
+    dispatched_at: float
+    completed_at: float = 0.0
+    status: str = 'pending'
+
+
+def load_jsonl(path: Optional[str]) -> List[Dict[str, Any]]:
+    """Load a JSON lines recording sorted by offset (blank lines and # comments are skipped)."""
+    if not path:
+        return []
+    records = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                records.append(json.loads(line))
+    return sorted(records, key=lambda r: r.get('offset_ms', 0))
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """Linear-interpolated percentile (pct in 0..100) of a list of values."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100.0
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def latency_summary(seconds: List[float]) -> Dict[str, Any]:
+    """p50/p90/p99/max in milliseconds."""
+    summary: Dict[str, Any] = {'count': len(seconds)}
+    for name, pct in (('p50_ms', 50), ('p90_ms', 90), ('p99_ms', 99), ('max_ms', 100)):
+        value = percentile(seconds, pct)
+        summary[name] = round(value * 1000, 2) if value is not None else None
+    return summary
+
+
+def exchange_symbols(coin: str) -> Dict[str, str]:
+    """Binance and KuCoin futures symbols for a coin."""
+    coin = coin.upper()
+    return {'binance': f"{coin}USDT", 'kucoin': f"{'XBT' if coin == 'BTC' else coin}USDTM"}
+
+
+def match_signal_orders(results: List[SignalResult], arrivals: List[Dict[str, Any]]) -> List[float]:
+    """
+    Pair each initial signal with the first entry order for its coin that
+    reached a mock exchange after the signal was dispatched.
+
+    Returns:
+        Signal-to-order latencies in seconds
+    """
+    latencies = []
+    claimed = set()
+    entries = sorted((a for a in arrivals if not a['reduce_only'] and a['type'] in ENTRY_ORDER_TYPES),
+                     key=lambda a: a['time'])
+    for result in sorted(results, key=lambda r: r.dispatched_at):
+        if result.kind != 'initial' or not result.coin_symbol:
+            continue
+        symbols = set(exchange_symbols(result.coin_symbol).values())
+        for arrival in entries:
+            key = (arrival['exchange'], arrival['order_id'])
+            if key in claimed or arrival['symbol'] not in symbols or arrival['time'] < result.dispatched_at:
+                continue
+            claimed.add(key)
+            latencies.append(arrival['time'] - result.dispatched_at)
+            break
+    return latencies
+
+
+class ReplayBenchmark:
+    """Runs one replay against the mock services and builds the report."""
+
+    def __init__(self, config: ReplayConfig):
+        self.config = config
+        self.signals = load_jsonl(config.signals_path)
+        self.events = load_jsonl(config.events_path)
+        self.fixtures: Dict[str, Any] = {}
+        if config.fixtures_path:
+            with open(config.fixtures_path) as f:
+                self.fixtures = json.load(f)
+
+        self.binance = MockBinanceFutures(config.binance_fault,
+                                          wallet_balance=self.fixtures.get('binance', {}).get('wallet_balance', 10000.0))
+        self.kucoin = MockKucoinFutures(config.kucoin_fault,
+                                        account_equity=self.fixtures.get('kucoin', {}).get('account_equity', 10000.0))
+        self.postgrest = MockPostgrest(config.supabase_fault)
+        self.openai = MockOpenAI(config.openai_fault)
+        self.servers = MockServerThread([self.binance, self.kucoin, self.postgrest, self.openai])
+
+        self.results: List[SignalResult] = []
+        self.bot: Any = None
+        self.skipped_events = 0
+
+    def _prepare_services(self) -> None:
+        self.postgrest.seed(self.fixtures.get('tables', {}))
+        self.binance.symbol_specs.update(self.fixtures.get('binance', {}).get('symbols', {}))
+        for record in self.signals:
+            if record.get('kind') in ('initial', 'update') and record.get('parsed'):
+                signal = record['signal']
+                for text in (signal.get('structured'), signal.get('content')):
+                    if text:
+                        self.openai.add_response(text, record['parsed'])
+        # Prices at offset 0 must be in place before the bot loads exchange info
+        for record in self.signals:
+            if record.get('kind') == 'prices' and record.get('offset_ms', 0) == 0:
+                self._apply_prices(record['prices'])
+
+    def _apply_prices(self, prices: Dict[str, float]) -> None:
+        binance_prices = {exchange_symbols(coin)['binance']: price for coin, price in prices.items()}
+        kucoin_prices = {exchange_symbols(coin)['kucoin']: price for coin, price in prices.items()}
+        if self.servers.loop.is_running():
+            self.servers.call(self.binance.set_prices, binance_prices)
+            self.servers.call(self.kucoin.set_prices, kucoin_prices)
+        else:
+            self.binance.set_prices(binance_prices)
+            self.kucoin.set_prices(kucoin_prices)
+
+    def _configure_environment(self) -> None:
+        """Point settings at the mocks; must run before the bot modules are imported."""
+        os.environ.update({
+            'SUPABASE_URL': self.postgrest.url,
+            'SUPABASE_KEY': MOCK_SUPABASE_KEY,
+            'BINANCE_API_KEY': 'replay-api-key', 'BINANCE_API_SECRET': 'replay-api-secret', 'BINANCE_TESTNET': 'False',
+            'KUCOIN_API_KEY': 'replay-api-key', 'KUCOIN_API_SECRET': 'replay-api-secret',
+            'KUCOIN_API_PASSPHRASE': 'replay-passphrase', 'KUCOIN_TESTNET': 'False',
+            'BINANCE_FUTURES_ENDPOINT': self.binance.url, 'KUCOIN_FUTURES_ENDPOINT': self.kucoin.url,
+            'OPENAI_API_KEY': 'replay', 'OPENAI_BASE_URL': f"{self.openai.url}/v1",
+            'TELEGRAM_NOTIFICATION_CHAT_ID': '',
+        })
+        # Replays send many signals per coin in a short time
+        os.environ.setdefault('TRADE_COOLDOWN', '0')
+
+    async def _start_bot(self) -> None:
+        from discord_bot.discord_bot import DiscordBot
+
+        bot = DiscordBot()
+        ws_manager = bot.websocket_manager.ws_manager
+        if ws_manager is not None:
+            ws_manager.config.ws_base_url = self.binance.url.replace('http://', 'ws://')
+            ws_manager.config.rest_base_url = self.binance.url
+            await bot.websocket_manager.start()
+            deadline = time.monotonic() + 5
+            while self.binance.stream_clients == 0 and time.monotonic() < deadline:
+                await asyncio.sleep(0.05)
+            if self.binance.stream_clients == 0:
+                logger.warning("User data stream did not connect to the mock; fills will not be synced")
+        self.bot = bot
+
+    async def _replay_signal(self, record: Dict[str, Any]) -> None:
+        from discord_bot.models import InitialDiscordSignal
+
+        signal = record['signal']
+        result = SignalResult(kind=record['kind'], discord_id=str(signal.get('discord_id')),
+                              coin_symbol=(record.get('parsed') or {}).get('coin_symbol'),
+                              dispatched_at=time.perf_counter())
+        self.results.append(result)
+        try:
+            if record['kind'] == 'initial':
+                response = await self.bot.process_initial_signal(InitialDiscordSignal(**signal))
+            else:
+                response = await self.bot.process_update_signal(dict(signal))
+            result.status = str((response or {}).get('status', 'unknown'))
+        except Exception as e:
+            logger.error(f"Replay of {result.discord_id} raised: {e}")
+            result.status = 'exception'
+        finally:
+            result.completed_at = time.perf_counter()
+
+    async def _replay(self) -> float:
+        """Dispatch every record at its (speed-scaled) offset; returns the wall time."""
+        timeline = [('signal', r) for r in self.signals] + [('event', r) for r in self.events]
+        timeline.sort(key=lambda item: item[1].get('offset_ms', 0))
+
+        tasks = []
+        started = time.perf_counter()
+        for source, record in timeline:
+            due = started + record.get('offset_ms', 0) / 1000.0 / self.config.speed
+            delay = due - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            if source == 'event':
+                if record.get('exchange', 'binance') == 'binance':
+                    self.servers.call(self.binance.push_event, record['event'])
+                else:
+                    # Only the Binance user data stream has a consumer in the bot
+                    self.skipped_events += 1
+            elif record.get('kind') == 'prices':
+                self._apply_prices(record['prices'])
+            elif record.get('kind') in ('initial', 'update'):
+                # Like the Discord endpoint, signals are processed as background tasks
+                tasks.append(asyncio.create_task(self._replay_signal(record)))
+
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - started
+        await asyncio.sleep(self.config.drain_seconds)
+        return elapsed
+
+    async def _stop_bot(self) -> None:
+        if self.bot is None:
+            return
+        try:
+            await self.bot.websocket_manager.stop()
+        except Exception as e:
+            logger.warning(f"Error stopping websocket manager: {e}")
+        await self.bot.close()
+
+    async def run(self) -> Dict[str, Any]:
+        """Run the replay and return the report."""
+        self._prepare_services()
+        self.servers.start()
+        try:
+            self._configure_environment()
+            await self._start_bot()
+            elapsed = await self._replay()
+            return self.build_report(elapsed)
+        finally:
+            await self._stop_bot()
+            self.servers.stop()
+
+    def build_report(self, elapsed: float) -> Dict[str, Any]:
+        initial = [r for r in self.results if r.kind == 'initial']
+        statuses: Dict[str, int] = {}
+        for result in self.results:
+            statuses[result.status] = statuses.get(result.status, 0) + 1
+
+        arrivals = self.binance.order_arrivals + self.kucoin.order_arrivals
+        db_calls = self.postgrest.total_calls()
+        signal_count = len(self.results)
+
+        report = {
+            'signals': {
+                'total': signal_count,
+                'initial': len(initial),
+                'updates': signal_count - len(initial),
+                'statuses': statuses,
+                'replay_seconds': round(elapsed, 3),
+                'throughput_per_second': round(signal_count / elapsed, 3) if elapsed > 0 else None,
+            },
+            'signal_to_order_latency': latency_summary(match_signal_orders(self.results, arrivals)),
+            'signal_processing_latency': latency_summary([r.completed_at - r.dispatched_at for r in initial]),
+            'db': {
+                'total_calls': db_calls,
+                'calls_per_signal': round(db_calls / signal_count, 2) if signal_count else None,
+                'by_table': self.postgrest.counts_by_table(),
+            },
+            'exchanges': {
+                service.name: {
+                    'total_calls': service.total_calls(),
+                    'errors_injected': service.errors_injected,
+                    'by_endpoint': {' '.join(key): count for key, count in sorted(service.calls.items())},
+                    'unhandled_routes': {' '.join(key): count for key, count in service.unhandled.items()},
+                }
+                for service in (self.binance, self.kucoin, self.openai)
+            },
+            'orders_placed': len(arrivals),
+            'exchange_events_skipped': self.skipped_events,
+            'stages': stage_summary(),
+        }
+        return report
+
+
+def stage_summary() -> Dict[str, Dict[str, float]]:
+    """Count and mean of each signal pipeline stage recorded in src.core.metrics."""
+    from src.core.metrics import SIGNAL_STAGE_SECONDS
+
+    summary = {}
+    for (stage,), (count, total) in sorted(SIGNAL_STAGE_SECONDS.totals().items()):
+        if count:
+            summary[stage] = {'count': count, 'mean_ms': round(total / count * 1000, 2)}
+    return summary
+
+
+def compare_with_baseline(report: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """
+    List the regressions of a report against a baseline report.
+
+    Args:
+        report: Current report
+        baseline: Earlier report
+        tolerance: Allowed relative regression (0.2 = 20%)
+
+    Returns:
+        Human-readable regression messages (empty if none)
+    """
+    regressions = []
+
+    def check(label: str, current: Optional[float], previous: Optional[float], higher_is_better: bool) -> None:
+        if current is None or not previous:
+            return
+        change = (current - previous) / previous
+        if (higher_is_better and change < -tolerance) or (not higher_is_better and change > tolerance):
+            regressions.append(f"{label}: {previous} -> {current} ({change:+.0%})")
+
+    check('throughput_per_second', report['signals']['throughput_per_second'],
+          baseline.get('signals', {}).get('throughput_per_second'), True)
+    check('signal_to_order p99_ms', report['signal_to_order_latency']['p99_ms'],
+          baseline.get('signal_to_order_latency', {}).get('p99_ms'), False)
+    check('db calls_per_signal', report['db']['calls_per_signal'],
+          baseline.get('db', {}).get('calls_per_signal'), False)
+    return regressions
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    signals = report['signals']
+    print(f"\nSignals: {signals['total']} ({signals['initial']} initial, {signals['updates']} updates) "
+          f"in {signals['replay_seconds']}s -> {signals['throughput_per_second']}/s")
+    print(f"Statuses: {signals['statuses']}")
+    for name in ('signal_to_order_latency', 'signal_processing_latency'):
+        latency = report[name]
+        print(f"{name:28} n={latency['count']:<4} p50={latency['p50_ms']}ms p90={latency['p90_ms']}ms "
+              f"p99={latency['p99_ms']}ms max={latency['max_ms']}ms")
+    print(f"DB calls: {report['db']['total_calls']} ({report['db']['calls_per_signal']} per signal)")
+    for table, ops in sorted(report['db']['by_table'].items()):
+        print(f"  {table:28} {ops}")
+    for name, stats in report['exchanges'].items():
+        print(f"{name} calls: {stats['total_calls']} (injected errors: {stats['errors_injected']})")
+        if stats['unhandled_routes']:
+            print(f"  unhandled: {stats['unhandled_routes']}")
+    if report['stages']:
+        print("Stages (mean ms):")
+        for stage, stats in report['stages'].items():
+            print(f"  {stage:28} n={stats['count']:<4} {stats['mean_ms']}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Replay recorded signals against local exchange/DB stand-ins')
+    parser.add_argument('--signals', default=DEFAULT_SIGNALS, help='Signal stream recording (JSONL)')
+    parser.add_argument('--events', default=DEFAULT_EVENTS, help='Exchange event recording (JSONL), "" for none')
+    parser.add_argument('--fixtures', default=DEFAULT_FIXTURES, help='Table rows and exchange setup (JSON)')
+    parser.add_argument('--speed', type=float, default=1.0, help='Replay speed multiplier')
+    parser.add_argument('--drain', type=float, default=2.0, help='Seconds to wait for trailing events')
+    parser.add_argument('--seed', type=int, default=None, help='Seed for latency jitter and error injection')
+    for service in ('binance', 'kucoin', 'supabase', 'openai'):
+        parser.add_argument(f'--{service}-fault', default='',
+                            help=f'{service} latency_ms[:jitter_ms[:error_rate]], e.g. 20:5:0.01')
+    parser.add_argument('--output', help='Write the JSON report to this file')
+    parser.add_argument('--baseline', help='Fail if the run regresses against this report')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='Allowed relative regression')
+    parser.add_argument('--log-level', default='WARNING')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=getattr(logging, args.log_level.upper(), logging.WARNING))
+
+    config = ReplayConfig(
+        signals_path=args.signals,
+        events_path=args.events or None,
+        fixtures_path=args.fixtures or None,
+        speed=args.speed,
+        drain_seconds=args.drain,
+        binance_fault=FaultProfile.parse(args.binance_fault, args.seed),
+        kucoin_fault=FaultProfile.parse(args.kucoin_fault, args.seed),
+        supabase_fault=FaultProfile.parse(args.supabase_fault, args.seed),
+        openai_fault=FaultProfile.parse(args.openai_fault, args.seed),
+    )
+    report = asyncio.run(ReplayBenchmark(config).run())
+    print_report(report)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare_with_baseline(report, json.load(f), args.tolerance)
+        if regressions:
+            print("\n❌ Regressions against baseline:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+        print("\n✅ No regressions against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
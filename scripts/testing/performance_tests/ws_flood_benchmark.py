@@ -0,0 +1,604 @@
+#!/usr/bin/env python3
+"""
+Websocket event-flood stress test.
+
+Pushes thousands of synthetic Binance websocket events per second
+(ORDER_TRADE_UPDATE / ACCOUNT_UPDATE, optionally error and depthUpdate
+frames) through the production path -- WebSocketManager._handle_user_data_message ->
+EventDispatcher.dispatch_raw_message -> the DiscordBot handlers ->
+SyncManager / DatabaseSync -- against an in-memory trade store, with
+UserDataHandler and ErrorHandler registered alongside.
+
+The producer is open-loop (events are enqueued on schedule whether or not
+the consumer keeps up) and the consumer processes one message at a time like
+ConnectionManager's receive loop, so queueing delay shows when the handlers
+fall behind the target rate.
+
+Reported: achieved events/s, queueing delay and per-message handling
+percentiles, CPU time per event and per handler, tracemalloc memory growth
+and top allocation sites, and the size of the in-process event histories.
+``--profile`` adds a cProfile listing; ``--baseline`` fails the run on
+regressions.
+
+Usage:
+    python scripts/testing/performance_tests/ws_flood_benchmark.py [--rate 5000] [--duration 5] \\
+        [--orders 200] [--db-latency-ms 0] [--error-rate 0.01] [--profile] \\
+        [--output report.json] [--baseline report.json --tolerance 0.2]
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+import cProfile
+import io
+import logging
+import pstats
+import tracemalloc
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Modules are imported from the project root
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(script_dir)))
+sys.path.insert(0, project_root)
+
+from scripts.testing.performance_tests.replay_benchmark import latency_summary
+
+logger = logging.getLogger(__name__)
+
+SYMBOLS = ('BTCUSDT', 'ETHUSDT', 'SOLUSDT', 'XRPUSDT', 'DOGEUSDT', 'LINKUSDT')
+ORDER_STATUSES = ('NEW', 'PARTIALLY_FILLED', 'FILLED')
+# Stands in for event timestamps in pre-encoded messages; filled in when sent
+EVENT_TIME_SENTINEL = -424242
+
+
+@dataclass
+class FloodConfig:
+    """Settings for one flood run."""
+    rate: float = 5000.0
+    duration: float = 5.0
+    orders: int = 200
+    account_update_ratio: float = 0.2
+    market_ratio: float = 0.0
+    unknown_order_ratio: float = 0.1
+    error_rate: float = 0.0
+    db_latency_ms: float = 0.0
+    drain_seconds: float = 30.0
+    seed: Optional[int] = 1
+    profile: bool = False
+    trace_memory: bool = True
+    top_allocations: int = 10
+
+
+class _StubQuery:
+    """Fluent ``from_(table).update(...).eq(...).execute()`` chain over the stub store."""
+
+    def __init__(self, store: 'StubTradeStore', table: str):
+        self.store = store
+        self.table = table
+        self.updates: Optional[Dict[str, Any]] = None
+        self.filters: List[Tuple[str, Any]] = []
+
+    def update(self, data: Dict[str, Any]) -> '_StubQuery':
+        self.updates = data
+        return self
+
+    def select(self, *columns: Any, **kwargs: Any) -> '_StubQuery':
+        return self
+
+    def eq(self, column: str, value: Any) -> '_StubQuery':
+        self.filters.append((column, value))
+        return self
+
+    def execute(self) -> SimpleNamespace:
+        op = 'update' if self.updates is not None else 'select'
+        return SimpleNamespace(data=self.store.execute(self.table, op, self.filters, self.updates))
+
+
+class StubTradeStore:
+    """
+    In-memory stand-in for the DatabaseManager surface DatabaseSync uses.
+
+    Calls block for ``latency_ms`` like the synchronous Supabase client does,
+    so a slow database shows up as event loop stall rather than as free
+    concurrency.
+    """
+
+    def __init__(self, trades: List[Dict[str, Any]], latency_ms: float = 0.0):
+        self.trades: Dict[int, Dict[str, Any]] = {int(t['id']): dict(t) for t in trades}
+        self.by_order_id: Dict[str, int] = {str(t['exchange_order_id']): int(t['id']) for t in trades}
+        self.latency = latency_ms / 1000.0
+        self.calls: Counter = Counter()
+        self.supabase = self
+
+    def _block(self) -> None:
+        if self.latency:
+            time.sleep(self.latency)
+
+    def from_(self, table: str) -> _StubQuery:
+        return _StubQuery(self, table)
+
+    table = from_
+
+    def execute(self, table: str, op: str, filters: List[Tuple[str, Any]],
+                updates: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        self.calls[f"{table}.{op}"] += 1
+        self._block()
+        if filters and filters[0][0] == 'id':
+            candidates = [self.trades[int(filters[0][1])]] if int(filters[0][1]) in self.trades else []
+        else:
+            candidates = list(self.trades.values())
+        rows = [row for row in candidates
+                if all(str(row.get(column)) == str(value) for column, value in filters)]
+        if updates is not None:
+            for row in rows:
+                row.update(updates)
+        return [dict(row) for row in rows]
+
+    async def find_trade_by_order_id(self, order_id: str) -> Optional[Dict[str, Any]]:
+        self.calls['trades.find_by_order_id'] += 1
+        self._block()
+        trade_id = self.by_order_id.get(str(order_id))
+        return dict(self.trades[trade_id]) if trade_id is not None else None
+
+
+def build_trades(count: int) -> List[Dict[str, Any]]:
+    """Open trades whose exchange order ids the generated events refer to."""
+    trades = []
+    for i in range(count):
+        trades.append({
+            'id': i + 1,
+            'exchange_order_id': str(10_000_000 + i),
+            'coin_symbol': SYMBOLS[i % len(SYMBOLS)].replace('USDT', ''),
+            'signal_type': 'LONG' if i % 2 == 0 else 'SHORT',
+            'exchange': 'binance',
+            'status': 'PENDING',
+            'order_status': 'NEW',
+            'position_size': 0,
+            'stop_loss_order_id': None,
+        })
+    return trades
+
+
+class EventGenerator:
+    """Synthetic Binance futures user data stream messages."""
+
+    def __init__(self, trades: List[Dict[str, Any]], config: FloodConfig):
+        self.trades = trades
+        self.config = config
+        self.rng = random.Random(config.seed)
+        self.sequence = 0
+
+    def templates(self, count: int) -> List[Tuple[str, int]]:
+        """
+        Pre-encode ``count`` messages so generation does not compete with the handlers.
+
+        Returns:
+            (message with %d in place of each event timestamp, number of timestamps) pairs
+        """
+        sentinel = str(EVENT_TIME_SENTINEL)
+        encoded = []
+        for _ in range(count):
+            message = self.next_message().replace('%', '%%')
+            encoded.append((message.replace(sentinel, '%d'), message.count(sentinel)))
+        return encoded
+
+    def next_message(self) -> str:
+        self.sequence += 1
+        roll = self.rng.random()
+        if roll < self.config.error_rate:
+            payload: Dict[str, Any] = {'e': 'error', 'code': -1003, 'msg': 'Too many requests'}
+        elif roll < self.config.error_rate + self.config.account_update_ratio:
+            payload = self._account_update()
+        elif roll < self.config.error_rate + self.config.account_update_ratio + self.config.market_ratio:
+            payload = self._depth_update()
+        else:
+            payload = self._order_trade_update()
+        return json.dumps(payload)
+
+    def _order_trade_update(self) -> Dict[str, Any]:
+        now_ms = EVENT_TIME_SENTINEL
+        if self.rng.random() < self.config.unknown_order_ratio or not self.trades:
+            order_id, symbol, side = 90_000_000 + self.sequence, self.rng.choice(SYMBOLS), 'BUY'
+        else:
+            trade = self.rng.choice(self.trades)
+            order_id = int(trade['exchange_order_id'])
+            symbol = f"{trade['coin_symbol']}USDT"
+            side = 'BUY' if trade['signal_type'] == 'LONG' else 'SELL'
+        status = self.rng.choice(ORDER_STATUSES)
+        quantity = 0.5
+        filled = {'NEW': 0.0, 'PARTIALLY_FILLED': 0.2, 'FILLED': quantity}[status]
+        price = round(100 + self.rng.random() * 10, 2)
+        return {
+            'e': 'ORDER_TRADE_UPDATE', 'E': now_ms, 'T': now_ms,
+            'o': {
+                's': symbol, 'c': f"flood_{self.sequence}", 'S': side, 'o': 'MARKET', 'f': 'GTC',
+                'q': str(quantity), 'p': '0', 'ap': str(price if filled else 0), 'sp': '0',
+                'x': 'TRADE' if filled else 'NEW', 'X': status, 'i': order_id,
+                'l': str(filled), 'z': str(filled), 'L': str(price), 'T': now_ms, 't': self.sequence,
+                'R': False, 'wt': 'CONTRACT_PRICE', 'ot': 'MARKET', 'ps': 'BOTH', 'cp': False, 'rp': '0',
+            },
+        }
+
+    def _depth_update(self) -> Dict[str, Any]:
+        symbol = self.rng.choice(SYMBOLS)
+        mid = 100 + self.rng.random() * 10
+        levels = range(1, 21)
+        return {
+            'e': 'depthUpdate', 'E': EVENT_TIME_SENTINEL, 'T': EVENT_TIME_SENTINEL, 's': symbol,
+            'U': self.sequence, 'u': self.sequence, 'pu': self.sequence - 1,
+            'b': [[f"{mid - i * 0.01:.2f}", f"{self.rng.random():.3f}"] for i in levels],
+            'a': [[f"{mid + i * 0.01:.2f}", f"{self.rng.random():.3f}"] for i in levels],
+        }
+
+    def _account_update(self) -> Dict[str, Any]:
+        now_ms = EVENT_TIME_SENTINEL
+        symbol = self.rng.choice(SYMBOLS)
+        return {
+            'e': 'ACCOUNT_UPDATE', 'E': now_ms, 'T': now_ms,
+            'a': {
+                'm': 'ORDER',
+                'B': [{'a': 'USDT', 'wb': '1000.0', 'cw': '1000.0', 'bc': '0'}],
+                'P': [{'s': symbol, 'pa': str(round(self.rng.random(), 3)), 'ep': '100.0', 'cr': '0',
+                       'up': '0.5', 'mt': 'cross', 'iw': '0', 'ps': 'BOTH'}],
+            },
+        }
+
+
+def _handler_name(handler: Callable) -> str:
+    name = getattr(handler, '__qualname__', None) or getattr(handler, '__name__', repr(handler))
+    return name.replace('._register_event_handlers.<locals>', '')
+
+
+class FloodBenchmark:
+    """Drives one flood run through the production websocket pipeline."""
+
+    def __init__(self, config: FloodConfig):
+        self.config = config
+        self.trades = build_trades(config.orders)
+        self.store = StubTradeStore(self.trades, config.db_latency_ms)
+        self.generator = EventGenerator(self.trades, config)
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.queue_delays: List[float] = []
+        self.handling_times: List[float] = []
+        self.handler_cpu: Dict[str, float] = defaultdict(float)
+        self.handler_calls: Counter = Counter()
+        self.max_queue_depth = 0
+        self.sent = 0
+        self.processed = 0
+        self.memory_samples: List[Dict[str, float]] = []
+
+    def _build_pipeline(self) -> None:
+        """Wire the DiscordBot websocket manager plus the standalone handlers to the stub store."""
+        from discord_bot.websocket.websocket_manager import DiscordBotWebSocketManager
+        from src.exchange.binance.binance_account_state import BinanceAccountState
+        from src.websocket import ErrorHandler, UserDataHandler
+
+        exchange = SimpleNamespace(api_key='flood-key', api_secret='flood-secret', is_testnet=False,
+                                   account_state=BinanceAccountState())
+        self.bot_ws = DiscordBotWebSocketManager(SimpleNamespace(binance_exchange=exchange), self.store)
+        self.ws_manager = self.bot_ws.ws_manager
+        self.dispatcher = self.ws_manager.event_dispatcher
+        self.account_state = exchange.account_state
+
+        self.user_data_handler = UserDataHandler()
+        self.error_handler = ErrorHandler()
+
+        async def handle_user_data(event):
+            await self.user_data_handler.handle_execution_report(event.data)
+
+        async def handle_error(event):
+            await self.error_handler.handle_error_event(event.data)
+
+        self.dispatcher.register_handler('ORDER_TRADE_UPDATE', handle_user_data)
+        self.dispatcher.register_handler('error', handle_error)
+        self._time_handlers()
+
+    def _time_handlers(self) -> None:
+        """
+        Wrap every registered handler to accumulate its CPU time.
+
+        thread_time() excludes blocking sleeps, so DB latency is not counted
+        as handler CPU. The stub store never yields to the loop, so handlers
+        do not interleave and the per-handler numbers do not overlap.
+        """
+        for event_type, handlers in self.dispatcher.event_handlers.items():
+            for index, handler in enumerate(handlers):
+                name = f"{event_type}:{_handler_name(handler)}"
+
+                async def timed(event, _handler=handler, _name=name):
+                    started = time.thread_time()
+                    try:
+                        result = _handler(event)
+                        if asyncio.iscoroutine(result):
+                            await result
+                    finally:
+                        self.handler_cpu[_name] += time.thread_time() - started
+                        self.handler_calls[_name] += 1
+
+                handlers[index] = timed
+
+    async def _produce(self) -> None:
+        """Enqueue messages on an open-loop schedule of ``rate`` per second."""
+        started = time.perf_counter()
+        total = len(self.messages)
+        while self.sent < total:
+            due = min(total, int((time.perf_counter() - started) * self.config.rate) + 1)
+            now_ms = int(time.time() * 1000)
+            while self.sent < due:
+                template, timestamps = self.messages[self.sent]
+                self.queue.put_nowait((time.perf_counter(), template % ((now_ms,) * timestamps)))
+                self.sent += 1
+            self.max_queue_depth = max(self.max_queue_depth, self.queue.qsize())
+            await asyncio.sleep(0.001)
+
+    async def _consume(self) -> None:
+        """Process messages one at a time like the connection receive loop."""
+        while True:
+            enqueued_at, message = await self.queue.get()
+            dequeued_at = time.perf_counter()
+            try:
+                await self.ws_manager._handle_user_data_message(message, 'user_data')
+            finally:
+                finished_at = time.perf_counter()
+                self.queue_delays.append(dequeued_at - enqueued_at)
+                self.handling_times.append(finished_at - dequeued_at)
+                self.processed += 1
+                self.queue.task_done()
+
+    async def _sample_memory(self) -> None:
+        started = time.perf_counter()
+        while True:
+            current, peak = tracemalloc.get_traced_memory()
+            self.memory_samples.append({'t': round(time.perf_counter() - started, 2),
+                                        'processed': self.processed,
+                                        'current_kb': round(current / 1024, 1)})
+            await asyncio.sleep(0.5)
+
+    def container_sizes(self) -> Dict[str, int]:
+        """Sizes of the per-event histories and caches the pipeline keeps in memory."""
+        sync_manager = self.bot_ws.sync_manager
+        database_sync = sync_manager.database_sync
+        return {
+            'UserDataHandler.execution_history': len(self.user_data_handler.execution_history),
+            'UserDataHandler.account_positions': len(self.user_data_handler.account_positions),
+            'ErrorHandler.error_history': len(self.error_handler.error_history),
+            'ErrorHandler.error_counts': len(self.error_handler.error_counts),
+            'SyncManager.sync_queue': len(sync_manager.sync_queue),
+            'DatabaseSync.order_id_cache': len(database_sync.order_id_cache),
+            'DatabaseSync.processed_notifications': len(database_sync.processed_notifications),
+        }
+
+    async def run(self) -> Dict[str, Any]:
+        self._build_pipeline()
+        self.messages = self.generator.templates(int(self.config.rate * self.config.duration))
+
+        # One frame per trace is enough for per-line statistics and keeps the overhead down
+        snapshot_before = None
+        if self.config.trace_memory:
+            tracemalloc.start(1)
+            snapshot_before = tracemalloc.take_snapshot()
+        memory_before, _ = tracemalloc.get_traced_memory()
+        profiler = cProfile.Profile() if self.config.profile else None
+
+        cpu_started = time.process_time()
+        wall_started = time.perf_counter()
+        if profiler:
+            profiler.enable()
+
+        consumer = asyncio.create_task(self._consume())
+        tasks = [consumer]
+        if self.config.trace_memory:
+            tasks.append(asyncio.create_task(self._sample_memory()))
+        try:
+            await self._produce()
+            try:
+                await asyncio.wait_for(self.queue.join(), timeout=self.config.drain_seconds)
+            except asyncio.TimeoutError:
+                logger.warning(f"Flood did not drain within {self.config.drain_seconds}s "
+                               f"({self.queue.qsize()} messages left)")
+        finally:
+            if profiler:
+                profiler.disable()
+            elapsed = time.perf_counter() - wall_started
+            cpu_seconds = time.process_time() - cpu_started
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        memory_after, memory_peak = tracemalloc.get_traced_memory()
+        snapshot_after = None
+        if self.config.trace_memory:
+            snapshot_after = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+
+        report = self.build_report(elapsed, cpu_seconds, memory_before, memory_after, memory_peak,
+                                   snapshot_before, snapshot_after)
+        if profiler:
+            report['profile'] = profile_listing(profiler)
+        return report
+
+    def build_report(self, elapsed: float, cpu_seconds: float, memory_before: int, memory_after: int,
+                     memory_peak: int, snapshot_before: Optional[tracemalloc.Snapshot],
+                     snapshot_after: Optional[tracemalloc.Snapshot]) -> Dict[str, Any]:
+        processed = max(self.processed, 1)
+        allocation_diff: List[tracemalloc.StatisticDiff] = []
+        if snapshot_before is not None and snapshot_after is not None:
+            snapshot_filters = [tracemalloc.Filter(False, tracemalloc.__file__),
+                                tracemalloc.Filter(False, __file__)]
+            allocation_diff = snapshot_after.filter_traces(snapshot_filters).compare_to(
+                snapshot_before.filter_traces(snapshot_filters), 'lineno')
+        top_allocations = [{
+            'site': f"{os.path.relpath(stat.traceback[0].filename, project_root)}:{stat.traceback[0].lineno}",
+            'size_kb': round(stat.size_diff / 1024, 1),
+            'blocks': stat.count_diff,
+        } for stat in allocation_diff[:self.config.top_allocations]]
+
+        return {
+            'config': {'rate': self.config.rate, 'duration': self.config.duration, 'orders': self.config.orders,
+                       'db_latency_ms': self.config.db_latency_ms, 'error_rate': self.config.error_rate},
+            'events': {
+                'sent': self.sent,
+                'processed': self.processed,
+                'elapsed_seconds': round(elapsed, 3),
+                'events_per_second': round(self.processed / elapsed, 1) if elapsed else None,
+                'max_queue_depth': self.max_queue_depth,
+                'skipped_undecoded': getattr(self.dispatcher, 'skipped_messages', 0),
+            },
+            'queue_delay': latency_summary(self.queue_delays),
+            'handling': latency_summary(self.handling_times),
+            'cpu': {
+                'total_seconds': round(cpu_seconds, 3),
+                'us_per_event': round(cpu_seconds / processed * 1e6, 1),
+                'handlers_us_per_call': {
+                    name: round(self.handler_cpu[name] / calls * 1e6, 1)
+                    for name, calls in sorted(self.handler_calls.items())
+                },
+            },
+            'memory': {} if not self.config.trace_memory else {
+                'growth_kb': round((memory_after - memory_before) / 1024, 1),
+                'growth_bytes_per_event': round((memory_after - memory_before) / processed, 1),
+                'peak_kb': round(memory_peak / 1024, 1),
+                'allocated_blocks': sum(stat.count_diff for stat in allocation_diff),
+                'top_allocations': top_allocations,
+                'samples': self.memory_samples,
+            },
+            'containers': self.container_sizes(),
+            'db_calls': dict(self.store.calls),
+        }
+
+
+def profile_listing(profiler: cProfile.Profile, limit: int = 25) -> List[str]:
+    """Top functions by internal time from a cProfile run."""
+    stream = io.StringIO()
+    stats = pstats.Stats(profiler, stream=stream)
+    stats.sort_stats('tottime').print_stats(limit)
+    return [line for line in stream.getvalue().splitlines() if line.strip()]
+
+
+def compare_with_baseline(report: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """
+    List the regressions of a flood report against a baseline report.
+
+    Args:
+        report: Current report
+        baseline: Earlier report
+        tolerance: Allowed relative regression (0.2 = 20%)
+
+    Returns:
+        Human-readable regression messages (empty if none)
+    """
+    checks = (
+        ('events_per_second', ('events', 'events_per_second'), True),
+        ('queue_delay p99_ms', ('queue_delay', 'p99_ms'), False),
+        ('cpu us_per_event', ('cpu', 'us_per_event'), False),
+        ('memory growth_bytes_per_event', ('memory', 'growth_bytes_per_event'), False),
+    )
+    regressions = []
+    for label, (section, key), higher_is_better in checks:
+        current = report.get(section, {}).get(key)
+        previous = baseline.get(section, {}).get(key)
+        if current is None or not previous:
+            continue
+        change = (current - previous) / abs(previous)
+        if (higher_is_better and change < -tolerance) or (not higher_is_better and change > tolerance):
+            regressions.append(f"{label}: {previous} -> {current} ({change:+.0%})")
+    return regressions
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    events = report['events']
+    print(f"\nEvents: {events['processed']}/{events['sent']} in {events['elapsed_seconds']}s "
+          f"-> {events['events_per_second']}/s (target {report['config']['rate']}/s, "
+          f"max queue depth {events['max_queue_depth']}, {events['skipped_undecoded']} skipped undecoded)")
+    for name in ('queue_delay', 'handling'):
+        latency = report[name]
+        print(f"{name:12} p50={latency['p50_ms']}ms p90={latency['p90_ms']}ms "
+              f"p99={latency['p99_ms']}ms max={latency['max_ms']}ms")
+    cpu = report['cpu']
+    print(f"CPU: {cpu['total_seconds']}s ({cpu['us_per_event']}us per event)")
+    for name, us in cpu['handlers_us_per_call'].items():
+        print(f"  {name:60} {us}us/call")
+    memory = report['memory']
+    if not memory:
+        memory = {'growth_kb': None, 'growth_bytes_per_event': None, 'peak_kb': None,
+                  'allocated_blocks': None, 'top_allocations': []}
+    print(f"Memory: +{memory['growth_kb']}KB ({memory['growth_bytes_per_event']} B/event), "
+          f"peak {memory['peak_kb']}KB, {memory['allocated_blocks']} live blocks added")
+    for site in memory['top_allocations']:
+        print(f"  {site['site']:60} {site['size_kb']:>9}KB {site['blocks']:>8} blocks")
+    print("Containers:")
+    for name, size in report['containers'].items():
+        print(f"  {name:40} {size}")
+    print(f"DB calls: {report['db_calls']}")
+    for line in report.get('profile', []):
+        print(line)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Flood the websocket user data pipeline with synthetic events')
+    parser.add_argument('--rate', type=float, default=5000.0, help='Target events per second')
+    parser.add_argument('--duration', type=float, default=5.0, help='Seconds of events to generate')
+    parser.add_argument('--orders', type=int, default=200, help='Trades the events refer to')
+    parser.add_argument('--account-update-ratio', type=float, default=0.2, help='Share of ACCOUNT_UPDATE events')
+    parser.add_argument('--market-ratio', type=float, default=0.0,
+                        help='Share of depthUpdate market frames (no handler registered)')
+    parser.add_argument('--unknown-order-ratio', type=float, default=0.1,
+                        help='Share of order events with no matching trade')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Share of error frames')
+    parser.add_argument('--db-latency-ms', type=float, default=0.0, help='Blocking latency per DB call')
+    parser.add_argument('--drain', type=float, default=30.0, help='Seconds to wait for the backlog to drain')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--profile', action='store_true', help='Include a cProfile listing')
+    parser.add_argument('--no-trace-memory', action='store_true',
+                        help='Skip tracemalloc (its overhead lowers the achieved rate)')
+    parser.add_argument('--output', help='Write the JSON report to this file')
+    parser.add_argument('--baseline', help='Fail if the run regresses against this report')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='Allowed relative regression')
+    parser.add_argument('--log-level', default='ERROR')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=getattr(logging, args.log_level.upper(), logging.ERROR))
+
+    config = FloodConfig(
+        rate=args.rate,
+        duration=args.duration,
+        orders=args.orders,
+        account_update_ratio=args.account_update_ratio,
+        market_ratio=args.market_ratio,
+        unknown_order_ratio=args.unknown_order_ratio,
+        error_rate=args.error_rate,
+        db_latency_ms=args.db_latency_ms,
+        drain_seconds=args.drain,
+        seed=args.seed,
+        profile=args.profile,
+        trace_memory=not args.no_trace_memory,
+    )
+    report = asyncio.run(FloodBenchmark(config).run())
+    print_report(report)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare_with_baseline(report, json.load(f), args.tolerance)
+        if regressions:
+            print("\n❌ Regressions against baseline:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+        print("\n✅ No regressions against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
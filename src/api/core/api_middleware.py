@@ -13,6 +13,8 @@ from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.middleware.base import RequestResponseEndpoint
 from starlette.types import ASGIApp
 
+from src.core.metrics import HTTP_REQUEST_SECONDS
+
 logger = logging.getLogger(__name__)
 
 class LoggingMiddleware(BaseHTTPMiddleware):
@@ -33,6 +35,13 @@ class LoggingMiddleware(BaseHTTPMiddleware):
         
         # Calculate processing time
         process_time = time.time() - start_time
+        route = request.scope.get("route")
+        HTTP_REQUEST_SECONDS.observe(
+            process_time,
+            method=request.method,
+            route=getattr(route, "path", "unmatched"),
+            status=response.status_code
+        )
         
         # Log response
         logger.info(f"Response: {response.status_code} - {process_time:.4f}s")
@@ -4,12 +4,13 @@ API Server Module
 This module contains the main FastAPI application server.
 """
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 import logging
 
 from src.api.core.api_config import api_config
 from src.api.core.api_middleware import setup_middleware
+from src.core.metrics import registry as metrics_registry, CONTENT_TYPE_LATEST
 from src.api.routes import discord_routes, trade_routes, analytics_routes, account_routes, health_routes
 
 logger = logging.getLogger(__name__)
@@ -69,6 +70,12 @@ def create_app() -> FastAPI:
             "status": "healthy"
         }
     
+    # Prometheus scrape endpoint
+    @app.get("/metrics")
+    async def metrics():
+        """Latency histograms in the Prometheus text format."""
+        return Response(metrics_registry.render(), media_type=CONTENT_TYPE_LATEST)
+    
     # Startup event
     @app.on_event("startup")
     async def startup_event():
@@ -11,8 +11,8 @@ import logging
 from src.api.models.request_models import AccountStatusRequest
 from src.api.models.response_models import PositionResponse, OrderResponse, BalanceResponse, APIResponse
 
-# Import the Discord bot instance
-from discord_bot.discord_bot import discord_bot
+# Shared Discord bot, created on first request
+from discord_bot.discord_bot import get_discord_bot
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -30,15 +30,15 @@ async def get_account_status(
         account_data = {}
         
         if include_positions:
-            positions = await discord_bot.binance_exchange.get_futures_position_information()
+            positions = await get_discord_bot().binance_exchange.get_futures_position_information(include_risk=True)
             account_data["positions"] = positions
         
         if include_orders:
-            orders = await discord_bot.binance_exchange.get_all_open_futures_orders()
+            orders = await get_discord_bot().binance_exchange.get_all_open_futures_orders()
             account_data["orders"] = orders
         
         if include_balance:
-            balance = await discord_bot.binance_exchange.get_futures_account_balance()
+            balance = await get_discord_bot().binance_exchange.get_futures_account_balance()
             account_data["balance"] = balance
 
         return APIResponse(
@@ -57,7 +57,7 @@ async def get_account_positions():
     Get all open positions in the account.
     """
     try:
-        positions = await discord_bot.binance_exchange.get_futures_position_information()
+        positions = await get_discord_bot().binance_exchange.get_futures_position_information(include_risk=True)
         
         # Filter out zero positions
         active_positions = [
@@ -81,7 +81,7 @@ async def get_open_orders():
     Get all open orders in the account.
     """
     try:
-        orders = await discord_bot.binance_exchange.get_all_open_futures_orders()
+        orders = await get_discord_bot().binance_exchange.get_all_open_futures_orders()
 
         return APIResponse(
             status="success",
@@ -99,7 +99,7 @@ async def get_account_balance():
     Get account balance information.
     """
     try:
-        balance = await discord_bot.binance_exchange.get_futures_account_balance()
+        balance = await get_discord_bot().binance_exchange.get_futures_account_balance()
 
         return APIResponse(
             status="success",
@@ -122,7 +122,7 @@ async def get_income_history(
     Get income history for the account.
     """
     try:
-        income = await discord_bot.binance_exchange.get_income_history(
+        income = await get_discord_bot().binance_exchange.get_income_history(
             symbol=symbol,
             start_time=start_time,
             end_time=end_time,
@@ -150,7 +150,7 @@ async def get_trade_history(
     Get trade history for the account.
     """
     try:
-        trades = await discord_bot.binance_exchange.get_user_trades(
+        trades = await get_discord_bot().binance_exchange.get_user_trades(
             symbol=symbol,
             start_time=start_time,
             end_time=end_time,
@@ -174,9 +174,10 @@ async def sync_account_data():
     """
     try:
         # Trigger the sync process
-        await discord_bot.sync_trade_statuses_with_binance(
-            discord_bot, 
-            discord_bot.supabase
+        bot = get_discord_bot()
+        await bot.sync_trade_statuses_with_binance(
+            bot, 
+            bot.supabase
         )
 
         return APIResponse(
@@ -12,8 +12,8 @@ from src.api.models.request_models import AnalyticsRequest
 from src.api.models.response_models import AnalyticsResponse, APIResponse
 from src.api.models.api_models import FilterParams
 
-# Import the Discord bot instance
-from discord_bot.discord_bot import discord_bot
+# Incremental daily rollups maintained as trades close
+from src.services.analytics.rollups import get_analytics_rollups
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -40,8 +40,8 @@ async def get_performance_analytics(
         if coin_symbol:
             filters["coin_symbol"] = coin_symbol
 
-        # Get analytics from database
-        analytics = await discord_bot.db_manager.get_performance_analytics(filters)
+        # Merge the daily rollups for the requested scope
+        analytics = await get_analytics_rollups().get_performance_analytics(filters)
 
         return AnalyticsResponse(**analytics)
 
@@ -71,8 +71,8 @@ async def get_pnl_analytics(
         if coin_symbol:
             filters["coin_symbol"] = coin_symbol
 
-        # Get PnL analytics from database
-        pnl_data = await discord_bot.db_manager.get_pnl_analytics(filters)
+        # Get PnL analytics from rollups
+        pnl_data = await get_analytics_rollups().get_pnl_analytics(filters)
 
         return APIResponse(
             status="success",
@@ -106,8 +106,8 @@ async def get_win_rate_analytics(
         if coin_symbol:
             filters["coin_symbol"] = coin_symbol
 
-        # Get win rate analytics from database
-        win_rate_data = await discord_bot.db_manager.get_win_rate_analytics(filters)
+        # Get win rate analytics from rollups
+        win_rate_data = await get_analytics_rollups().get_win_rate_analytics(filters)
 
         return APIResponse(
             status="success",
@@ -138,8 +138,8 @@ async def get_drawdown_analytics(
         if trader:
             filters["trader"] = trader
 
-        # Get drawdown analytics from database
-        drawdown_data = await discord_bot.db_manager.get_drawdown_analytics(filters)
+        # Get drawdown analytics from rollups
+        drawdown_data = await get_analytics_rollups().get_drawdown_analytics(filters)
 
         return APIResponse(
             status="success",
@@ -167,8 +167,8 @@ async def get_trader_performance(
         if end_date:
             filters["end_date"] = end_date
 
-        # Get trader performance from database
-        trader_performance = await discord_bot.db_manager.get_trader_performance(filters)
+        # Get trader performance from rollups
+        trader_performance = await get_analytics_rollups().get_trader_performance(filters)
 
         return APIResponse(
             status="success",
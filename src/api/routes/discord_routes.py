@@ -11,8 +11,8 @@ from typing import Dict, Any
 from src.api.models.request_models import InitialDiscordSignal, DiscordUpdateSignal
 from src.api.models.response_models import APIResponse
 
-# Import the Discord bot instance
-from discord_bot.discord_bot import discord_bot
+# Shared Discord bot, created on first request
+from discord_bot.discord_bot import get_discord_bot
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -20,7 +20,7 @@ router = APIRouter()
 async def process_initial_signal_background(signal: InitialDiscordSignal):
     """Process an initial signal in the background."""
     try:
-        result = await discord_bot.process_initial_signal(signal)
+        result = await get_discord_bot().process_initial_signal(signal)
         if result.get("status") != "success":
             logger.error(f"Failed to process initial signal: {result.get('message')}")
         else:
@@ -31,7 +31,7 @@ async def process_initial_signal_background(signal: InitialDiscordSignal):
 async def process_update_signal_background(signal: DiscordUpdateSignal):
     """Process an update signal in the background."""
     try:
-        result = await discord_bot.process_update_signal(signal.model_dump())
+        result = await get_discord_bot().process_update_signal(signal.model_dump())
         if result.get("status") != "success":
             logger.error(f"Failed to process update signal: {result.get('message')}")
         else:
@@ -85,7 +85,7 @@ async def receive_update_signal_test(signal: DiscordUpdateSignal):
     This endpoint tests the parsing of update signals without executing any trades.
     """
     try:
-        result = discord_bot.parse_alert_content(signal.content)
+        result = get_discord_bot().parse_alert_content(signal.content)
         return APIResponse(
             status="success",
             message="Update signal parsed successfully",
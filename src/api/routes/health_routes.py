@@ -12,8 +12,8 @@ from typing import Dict, Any
 
 from src.api.models.response_models import HealthResponse, APIResponse
 
-# Import the Discord bot instance
-from discord_bot.discord_bot import discord_bot
+# Shared Discord bot, created on first request
+from discord_bot.discord_bot import get_discord_bot
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -32,7 +32,7 @@ async def health_check():
         # Check database connection
         try:
             # Simple database check
-            await discord_bot.db_manager.supabase.table("trades").select("id").limit(1).execute()
+            await get_discord_bot().db_manager.supabase.table("trades").select("id").limit(1).execute()
             database_status = "healthy"
         except Exception as e:
             logger.error(f"Database health check failed: {str(e)}")
@@ -41,7 +41,7 @@ async def health_check():
         # Check exchange connection
         try:
             # Simple exchange check
-            await discord_bot.binance_exchange.get_futures_exchange_info()
+            await get_discord_bot().binance_exchange.get_futures_exchange_info()
             exchange_status = "healthy"
         except Exception as e:
             logger.error(f"Exchange health check failed: {str(e)}")
@@ -80,7 +80,7 @@ async def detailed_health_check():
         
         # Check database
         try:
-            await discord_bot.db_manager.supabase.table("trades").select("id").limit(1).execute()
+            await get_discord_bot().db_manager.supabase.table("trades").select("id").limit(1).execute()
             health_data["components"]["database"] = {
                 "status": "healthy",
                 "message": "Database connection successful"
@@ -94,7 +94,7 @@ async def detailed_health_check():
         
         # Check exchange
         try:
-            await discord_bot.binance_exchange.get_futures_exchange_info()
+            await get_discord_bot().binance_exchange.get_futures_exchange_info()
             health_data["components"]["exchange"] = {
                 "status": "healthy",
                 "message": "Exchange connection successful"
@@ -108,7 +108,7 @@ async def detailed_health_check():
         
         # Check WebSocket
         try:
-            websocket_status = discord_bot.get_websocket_status()
+            websocket_status = get_discord_bot().get_websocket_status()
             health_data["components"]["websocket"] = {
                 "status": "healthy" if websocket_status.get("running") else "unhealthy",
                 "message": f"WebSocket status: {websocket_status.get('error', 'running')}"
@@ -125,7 +125,7 @@ async def detailed_health_check():
         # Check price service
         try:
             # Simple price check
-            await discord_bot.price_service.get_price("BTC")
+            await get_discord_bot().price_service.get_price("BTC")
             health_data["components"]["price_service"] = {
                 "status": "healthy",
                 "message": "Price service working"
@@ -159,14 +159,14 @@ async def readiness_check():
         
         # Check database
         try:
-            await discord_bot.db_manager.supabase.table("trades").select("id").limit(1).execute()
+            await get_discord_bot().db_manager.supabase.table("trades").select("id").limit(1).execute()
         except Exception as e:
             ready = False
             issues.append(f"Database not ready: {str(e)}")
         
         # Check exchange
         try:
-            await discord_bot.binance_exchange.get_futures_exchange_info()
+            await get_discord_bot().binance_exchange.get_futures_exchange_info()
         except Exception as e:
             ready = False
             issues.append(f"Exchange not ready: {str(e)}")
@@ -12,8 +12,8 @@ from src.api.models.request_models import TradeRequest, PositionUpdateRequest
 from src.api.models.response_models import TradeResponse, APIResponse, PaginatedResponse
 from src.api.models.api_models import FilterParams, SortParams, PaginationParams
 
-# Import the Discord bot instance
-from discord_bot.discord_bot import discord_bot
+# Shared Discord bot, created on first request
+from discord_bot.discord_bot import get_discord_bot
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -46,7 +46,7 @@ async def get_trades(
             filters["end_date"] = end_date
 
         # Get trades from database
-        trades = await discord_bot.db_manager.get_trades(
+        trades = await get_discord_bot().db_manager.get_trades(
             page=page,
             size=size,
             filters=filters
@@ -72,7 +72,7 @@ async def get_trade(trade_id: int):
     Get a specific trade by its ID.
     """
     try:
-        trade = await discord_bot.db_manager.get_trade_by_id(trade_id)
+        trade = await get_discord_bot().db_manager.get_trade_by_id(trade_id)
         if not trade:
             raise HTTPException(status_code=404, detail="Trade not found")
         
@@ -91,7 +91,7 @@ async def create_trade(trade_request: TradeRequest):
     """
     try:
         # Create trade using trading engine
-        success, response = await discord_bot.trading_engine.process_signal(
+        success, response = await get_discord_bot().trading_engine.process_signal(
             coin_symbol=trade_request.coin_symbol,
             signal_price=trade_request.price,
             position_type=trade_request.position_type,
@@ -123,17 +123,17 @@ async def update_trade(trade_id: int, update_request: PositionUpdateRequest):
     """
     try:
         # Get the trade first
-        trade = await discord_bot.db_manager.get_trade_by_id(trade_id)
+        trade = await get_discord_bot().db_manager.get_trade_by_id(trade_id)
         if not trade:
             raise HTTPException(status_code=404, detail="Trade not found")
 
         # Perform the requested action
         if update_request.action == "close":
-            success, response = await discord_bot.trading_engine.close_position_at_market(
+            success, response = await get_discord_bot().trading_engine.close_position_at_market(
                 trade, reason="manual_close"
             )
         elif update_request.action == "update_stop_loss":
-            success, response = await discord_bot.trading_engine.update_stop_loss(
+            success, response = await get_discord_bot().trading_engine.update_stop_loss(
                 trade, update_request.price
             )
         else:
@@ -161,12 +161,12 @@ async def cancel_trade(trade_id: int):
     """
     try:
         # Get the trade first
-        trade = await discord_bot.db_manager.get_trade_by_id(trade_id)
+        trade = await get_discord_bot().db_manager.get_trade_by_id(trade_id)
         if not trade:
             raise HTTPException(status_code=404, detail="Trade not found")
 
         # Cancel the trade
-        success, response = await discord_bot.trading_engine.cancel_order(trade)
+        success, response = await get_discord_bot().trading_engine.cancel_order(trade)
         
         if success:
             return APIResponse(
@@ -5,7 +5,6 @@ This module provides a trading engine specifically for KuCoin exchange operation
 It mirrors the functionality of the main TradingEngine but uses KuCoin-specific implementations.
 """
 
-import asyncio
 import logging
 import time
 from typing import Any, Dict, List, Optional, Tuple, Union
@@ -28,6 +27,7 @@ from src.bot.utils.response_parser import ResponseParser
 from src.core.position_manager import PositionManager
 from src.core.market_data_handler import MarketDataHandler
 from src.core.trade_calculator import TradeCalculator
+from src.core.metrics import observe_stage, time_stage
 
 from src.bot.risk_management.stop_loss_manager import StopLossManager
 from src.bot.risk_management.take_profit_manager import TakeProfitManager
@@ -296,6 +296,7 @@ class KucoinTradingEngine:
         """
         try:
             logger.info(f"Processing KuCoin signal: {coin_symbol} {position_type} at {signal_price}")
+            validation_started = time.perf_counter()
 
             # Check cooldown
             cooldown_key = f"kucoin_{coin_symbol}"
@@ -421,15 +422,17 @@ class KucoinTradingEngine:
 
             # Execute the order using correct parameter names and KuCoin symbol format
             logger.info(f"Executing KuCoin order: {kucoin_symbol} {SIDE_BUY if position_type.upper() == 'LONG' else SIDE_SELL} {order_type.upper()} amount={trade_amount} leverage={leverage_value}x")
-            result = await self.kucoin_exchange.create_futures_order(
-                pair=kucoin_symbol,  # Use the correct KuCoin symbol format
-                side=SIDE_BUY if position_type.upper() == 'LONG' else SIDE_SELL,
-                order_type=order_type.upper(),
-                amount=trade_amount,
-                price=final_price if order_type.upper() == 'LIMIT' else None,
-                client_order_id=client_order_id,
-                leverage=leverage_value
-            )
+            observe_stage('pre_trade_validation', time.perf_counter() - validation_started)
+            with time_stage('order_placement'):
+                result = await self.kucoin_exchange.create_futures_order(
+                    pair=kucoin_symbol,  # Use the correct KuCoin symbol format
+                    side=SIDE_BUY if position_type.upper() == 'LONG' else SIDE_SELL,
+                    order_type=order_type.upper(),
+                    amount=trade_amount,
+                    price=final_price if order_type.upper() == 'LIMIT' else None,
+                    client_order_id=client_order_id,
+                    leverage=leverage_value
+                )
 
             if 'error' in result:
                 logger.error(f"KuCoin order failed: {result['error']}")
@@ -440,10 +443,12 @@ class KucoinTradingEngine:
             if order_id:
                 logger.info(f"Order placed successfully, checking status for order ID: {order_id}")
 
-                await asyncio.sleep(2)  # Wait a bit longer for order processing
-
+                # Returns as soon as the order is done (or resting on the book for a
+                # LIMIT order); otherwise its latest state after at most 2s
+                settled_states = ('done', 'open') if order_type.upper() == 'LIMIT' else ('done',)
                 try:
-                    status_result = await self.kucoin_exchange.get_order_status(kucoin_symbol, str(order_id))
+                    status_result = await self.kucoin_exchange.wait_for_order(
+                        kucoin_symbol, str(order_id), states=settled_states, timeout=2.0)
                 except Exception as status_error:
                     logger.warning(f"Order status check failed for {order_id}: {status_error}")
                     status_result = None
@@ -0,0 +1,139 @@
+"""
+Bracket order placement for the trading bot.
+
+A bracket is the set of reduce-only exit orders attached to a position:
+one or more take-profit levels and a stop loss. The legs are submitted
+together, through the exchange's create_futures_batch_orders when it has
+one (Binance, which places trigger legs on the Algo Order API) and
+concurrently otherwise (KuCoin).
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Dict, Any, Optional, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Constants from binance-python
+SIDE_BUY = 'BUY'
+SIDE_SELL = 'SELL'
+FUTURE_ORDER_TYPE_STOP_MARKET = 'STOP_MARKET'
+FUTURE_ORDER_TYPE_TAKE_PROFIT_MARKET = 'TAKE_PROFIT_MARKET'
+
+
+@dataclass
+class BracketLeg:
+    """One exit order of a bracket."""
+    order_type: str  # 'TAKE_PROFIT' or 'STOP_LOSS'
+    amount: float
+    stop_price: float
+    tp_level: Optional[int] = None
+
+
+class BracketOrderBuilder:
+    """
+    Builds the TP/SL legs for a position and places them in one submission.
+    """
+
+    def __init__(self, exchange, trading_pair: str, position_type: str):
+        """
+        Initialize the bracket builder.
+
+        Args:
+            exchange: The exchange instance (Binance, KuCoin, etc.)
+            trading_pair: The trading pair
+            position_type: The position type ('LONG' or 'SHORT')
+
+        Raises:
+            ValueError: If the position type is unknown
+        """
+        if position_type.upper() == 'LONG':
+            self.side = SIDE_SELL  # Sell to close long position
+        elif position_type.upper() == 'SHORT':
+            self.side = SIDE_BUY   # Buy to close short position
+        else:
+            raise ValueError(f"Unknown position type {position_type} for TP/SL orders")
+
+        self.exchange = exchange
+        self.trading_pair = trading_pair
+        self.legs: List[BracketLeg] = []
+
+    def add_take_profit(self, price: float, amount: float) -> 'BracketOrderBuilder':
+        """Add the next take-profit level."""
+        level = sum(1 for leg in self.legs if leg.order_type == 'TAKE_PROFIT') + 1
+        self.legs.append(BracketLeg('TAKE_PROFIT', float(amount), float(price), tp_level=level))
+        return self
+
+    def add_stop_loss(self, price: float, amount: float) -> 'BracketOrderBuilder':
+        """Add the stop loss."""
+        self.legs.append(BracketLeg('STOP_LOSS', float(amount), float(price)))
+        return self
+
+    def build_orders(self) -> List[Dict[str, Any]]:
+        """
+        Build the exchange order arguments for every leg.
+
+        Returns:
+            Order dicts using the create_futures_order argument names
+        """
+        return [
+            {
+                'pair': self.trading_pair,
+                'side': self.side,
+                'order_type': FUTURE_ORDER_TYPE_TAKE_PROFIT_MARKET if leg.order_type == 'TAKE_PROFIT' else FUTURE_ORDER_TYPE_STOP_MARKET,
+                'amount': leg.amount,
+                'stop_price': leg.stop_price,
+                'reduce_only': True,
+            }
+            for leg in self.legs
+        ]
+
+    async def submit(self) -> Tuple[List[Dict], Optional[str]]:
+        """
+        Place all legs and collect the ones that were accepted.
+
+        Returns:
+            Tuple of (tp_sl_orders, stop_loss_order_id)
+        """
+        tp_sl_orders: List[Dict] = []
+        stop_loss_order_id = None
+        if not self.legs:
+            return tp_sl_orders, stop_loss_order_id
+
+        orders = self.build_orders()
+        results = await self._place(orders)
+
+        for leg, result in zip(self.legs, results):
+            if not (result and 'orderId' in result):
+                logger.error(f"Failed to create {leg.order_type} order at {leg.stop_price} for {self.trading_pair}: {result}")
+                continue
+
+            result['order_type'] = leg.order_type
+            if leg.order_type == 'TAKE_PROFIT':
+                result['tp_level'] = leg.tp_level
+                result['tp_amount'] = leg.amount
+            else:
+                stop_loss_order_id = result['orderId']
+            tp_sl_orders.append(result)
+            logger.info(f"Created {leg.order_type} order at {leg.stop_price} for {self.trading_pair} with amount {leg.amount}")
+
+        return tp_sl_orders, stop_loss_order_id
+
+    async def _place(self, orders: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Submit the orders in one batch if supported, otherwise concurrently."""
+        if hasattr(self.exchange, 'create_futures_batch_orders'):
+            try:
+                return await self.exchange.create_futures_batch_orders(orders)
+            except Exception as e:
+                logger.error(f"Error creating bracket orders for {self.trading_pair}: {e}")
+                return [{'error': str(e), 'code': -1} for _ in orders]
+
+        results = await asyncio.gather(
+            *(self.exchange.create_futures_order(**order) for order in orders),
+            return_exceptions=True
+        )
+        return [
+            {'error': str(result), 'code': -1} if isinstance(result, BaseException) else result
+            for result in results
+        ]
@@ -9,6 +9,8 @@ import logging
 import time
 from typing import Dict, Any, Optional, List, Tuple, Union
 
+from src.bot.order_management.bracket_order import BracketOrderBuilder
+
 logger = logging.getLogger(__name__)
 
 # Constants from binance-python
@@ -41,73 +43,17 @@ class OrderCreator:
         stop_loss: Optional[Union[float, str]] = None
     ) -> Tuple[List[Dict], Optional[str]]:
         """
-        Create Take Profit and Stop Loss orders using Binance's position-based TP/SL API.
-        This will make them appear in the TP/SL column instead of Open Orders.
+        Create Take Profit and Stop Loss orders for a position.
+
+        Position-based TP/SL only supports a single TP level, so the legs are
+        placed as a bracket of reduce-only orders in one submission.
         Returns a tuple of (tp_sl_orders, stop_loss_order_id)
         """
-        tp_sl_orders = []
-        stop_loss_order_id = None
-
         try:
-            # Determine the side for TP/SL orders based on position type
-            if position_type.upper() == 'LONG':
-                tp_sl_side = SIDE_SELL  # Sell to close long position
-            elif position_type.upper() == 'SHORT':
-                tp_sl_side = SIDE_BUY   # Buy to close short position
-            else:
-                logger.warning(f"Unknown position type {position_type} for TP/SL orders")
-                return tp_sl_orders, stop_loss_order_id
-
-            # Use position-based TP/SL instead of separate orders
-            # This will make them appear in the TP/SL column in Binance
-            try:
-                # Get current position to set TP/SL on it
-                positions = await self.exchange.get_futures_position_information()
-                current_position = None
-
-                for position in positions:
-                    if position.get('symbol') == trading_pair:
-                        current_position = position
-                        break
-
-                if not current_position:
-                    logger.warning(f"No position found for {trading_pair}, falling back to separate orders")
-                    return await self.create_separate_tp_sl_orders(trading_pair, position_type, position_size, take_profits, stop_loss)
-
-                # Set position-based TP/SL using Binance API
-                if self.exchange.client:
-                    # Prepare TP/SL parameters
-                    tp_sl_params = {}
-
-                    # Set take profit if provided
-                    if take_profits and isinstance(take_profits, list) and len(take_profits) > 0:
-                        # For position-based TP/SL, we can only set one TP level
-                        # Use the first TP level for now
-                        tp_price = float(take_profits[0])
-                        tp_sl_params['takeProfitPrice'] = f"{tp_price}"
-                        logger.info(f"Setting position-based TP at {tp_price} for {trading_pair}")
-
-                    # Set stop loss if provided
-                    if stop_loss:
-                        sl_price = float(stop_loss)
-                        tp_sl_params['stopLossPrice'] = f"{sl_price}"
-                        logger.info(f"Setting position-based SL at {sl_price} for {trading_pair}")
-
-                    # Fall back to separate orders which work reliably
-                    logger.info(f"Using separate TP/SL orders for {trading_pair} (position-based not available)")
-
-                # Use separate orders instead of position-based TP/SL
-                logger.info(f"Using separate TP/SL orders for {trading_pair}")
-                return await self.create_separate_tp_sl_orders(trading_pair, position_type, position_size, take_profits, stop_loss)
-
-            except Exception as e:
-                logger.error(f"Error setting position-based TP/SL for {trading_pair}: {e}")
-                # Fall back to separate orders
-                return await self.create_separate_tp_sl_orders(trading_pair, position_type, position_size, take_profits, stop_loss)
-
+            return await self.create_separate_tp_sl_orders(trading_pair, position_type, position_size, take_profits, stop_loss)
         except Exception as e:
             logger.error(f"Error in create_tp_sl_orders for {trading_pair}: {e}")
-            return tp_sl_orders, stop_loss_order_id
+            return [], None
 
     async def create_separate_tp_sl_orders(
         self,
@@ -118,47 +64,28 @@ class OrderCreator:
         stop_loss: Optional[Union[float, str]] = None
     ) -> Tuple[List[Dict], Optional[str]]:
         """
-        Fallback method to create separate TP/SL orders (appears in Open Orders).
-        This is the original implementation that creates STOP_MARKET and TAKE_PROFIT_MARKET orders.
+        Create separate TP/SL orders (appears in Open Orders).
+
+        The TAKE_PROFIT_MARKET and STOP_MARKET legs are submitted together
+        through BracketOrderBuilder (concurrent Algo Order API requests on Binance).
         """
         tp_sl_orders = []
         stop_loss_order_id = None
 
         try:
-            # Determine the side for TP/SL orders based on position type
-            if position_type.upper() == 'LONG':
-                tp_sl_side = SIDE_SELL  # Sell to close long position
-            elif position_type.upper() == 'SHORT':
-                tp_sl_side = SIDE_BUY   # Buy to close short position
-            else:
-                logger.warning(f"Unknown position type {position_type} for TP/SL orders")
+            try:
+                bracket = BracketOrderBuilder(self.exchange, trading_pair, position_type)
+            except ValueError as e:
+                logger.warning(str(e))
                 return tp_sl_orders, stop_loss_order_id
 
             # Create Take Profit orders
             if take_profits and isinstance(take_profits, list):
                 # Per platform rule: when signal provides TP, place TP for 50% of the position using first TP only
                 try:
-                    tp_price = float(take_profits[0])
-                    tp_amount = float(position_size) * 0.5
-                    tp_order = await self.exchange.create_futures_order(
-                        pair=trading_pair,
-                        side=tp_sl_side,
-                        order_type='TAKE_PROFIT_MARKET',
-                        amount=tp_amount,
-                        stop_price=tp_price,
-                        reduce_only=True  # Only reduce by the partial amount
-                    )
-
-                    if tp_order and 'orderId' in tp_order:
-                        tp_order['order_type'] = 'TAKE_PROFIT'
-                        tp_order['tp_level'] = 1
-                        tp_order['tp_amount'] = tp_amount
-                        tp_sl_orders.append(tp_order)
-                        logger.info(f"Created TP order at {tp_price} for {trading_pair} with amount {tp_amount} (50% of position)")
-                    else:
-                        logger.error(f"Failed to create TP order: {tp_order}")
-                except Exception as e:
-                    logger.error(f"Error creating TP order at {take_profits[0] if take_profits else 'N/A'}: {e}")
+                    bracket.add_take_profit(float(take_profits[0]), float(position_size) * 0.5)
+                except (ValueError, TypeError) as e:
+                    logger.error(f"Error creating TP order at {take_profits[0]}: {e}")
 
             # Create Stop Loss order (supervisor requirement: default 5% if no SL provided)
             if stop_loss:
@@ -176,29 +103,10 @@ class OrderCreator:
                 # This would need to be calculated based on entry price
                 # For now, we'll skip creating a default SL in this fallback method
                 logger.warning(f"No valid stop loss provided for {trading_pair}, skipping SL creation")
+            else:
+                bracket.add_stop_loss(sl_price_float, position_size)
 
-            if sl_price_float is not None:
-                try:
-                    sl_order = await self.exchange.create_futures_order(
-                        pair=trading_pair,
-                        side=tp_sl_side,
-                        order_type='STOP_MARKET',
-                        amount=position_size,
-                        stop_price=sl_price_float,
-                        reduce_only=True
-                    )
-
-                    if sl_order and 'orderId' in sl_order:
-                        sl_order['order_type'] = 'STOP_LOSS'
-                        tp_sl_orders.append(sl_order)
-                        stop_loss_order_id = sl_order['orderId']
-                        logger.info(f"Created SL order at {sl_price_float} for {trading_pair} with amount {position_size}")
-                    else:
-                        logger.error(f"Failed to create SL order: {sl_order}")
-                except Exception as e:
-                    logger.error(f"Error creating SL order at {sl_price_float}: {e}")
-
-            return tp_sl_orders, stop_loss_order_id
+            return await bracket.submit()
 
         except Exception as e:
             logger.error(f"Error in create_separate_tp_sl_orders for {trading_pair}: {e}")
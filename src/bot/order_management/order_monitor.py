@@ -14,6 +14,8 @@ from typing import Dict, Any, Optional, List
 from datetime import datetime, timezone, timedelta
 from supabase import Client
 
+from src.database.models.trade_projections import TradeProjection, trade_columns
+
 logger = logging.getLogger(__name__)
 
 
@@ -178,6 +180,48 @@ class OrderMonitor:
         except Exception as e:
             logger.error(f"Error handling order cancellation for trade {trade_id}: {e}")
 
+    async def check_trade_order(self, trade: Dict[str, Any]) -> Optional[str]:
+        """
+        Check the entry order of one trade and record a fill or cancellation.
+
+        Args:
+            trade: Trade row with id, exchange_order_id, coin_symbol and exchange
+
+        Returns:
+            'filled', 'cancelled', 'still_pending', 'unknown' if the exchange
+            returned no status, or None if the trade has no order to check
+        """
+        trade_id = trade.get('id')
+        order_id = trade.get('exchange_order_id')
+        coin_symbol = trade.get('coin_symbol')
+        exchange_name = (trade.get('exchange') or '').lower()
+
+        if not order_id or not coin_symbol:
+            return None
+
+        # Get trading pair
+        if exchange_name == 'binance':
+            trading_pair = f"{coin_symbol.upper()}USDT"
+        elif exchange_name == 'kucoin':
+            from src.exchange.kucoin.kucoin_symbol_converter import symbol_converter
+            trading_pair = f"{coin_symbol.upper()}-USDT"
+            trading_pair = symbol_converter.convert_bot_to_kucoin_futures(trading_pair)
+        else:
+            return None
+
+        order_status = await self.exchange.get_order_status(trading_pair, order_id)
+        if not order_status:
+            return 'unknown'
+
+        status = order_status.get('status', '').upper()
+        if status in ['FILLED', 'DONE']:
+            await self._handle_order_filled(trade_id, order_id, order_status)
+            return 'filled'
+        if status in ['CANCELED', 'CANCELLED', 'REJECTED', 'EXPIRED']:
+            await self._handle_order_cancelled(trade_id, order_id, order_status, status)
+            return 'cancelled'
+        return 'still_pending'
+
     async def monitor_pending_orders(self, max_age_minutes: int = 30) -> Dict[str, Any]:
         """
         Monitor all pending orders in the database.
@@ -197,7 +241,7 @@ class OrderMonitor:
                 logger.error("Supabase client not available for order monitoring")
                 return {'error': 'Supabase client not available'}
 
-            response = self.supabase.from_("trades").select("*").in_(
+            response = self.supabase.from_("trades").select(trade_columns(TradeProjection.STATUS_CHECK)).in_(
                 "status", ["PENDING", "OPEN"]
             ).gte("created_at", cutoff_iso).execute()
 
@@ -214,50 +258,17 @@ class OrderMonitor:
 
             for trade in pending_trades:
                 try:
-                    trade_id = trade.get('id')
-                    order_id = trade.get('exchange_order_id')
-                    coin_symbol = trade.get('coin_symbol')
-                    exchange_name = trade.get('exchange', '').lower()
-
-                    if not order_id or not coin_symbol:
-                        continue
-
-                    # Get trading pair
-                    if exchange_name == 'binance':
-                        trading_pair = f"{coin_symbol.upper()}USDT"
-                    elif exchange_name == 'kucoin':
-                        from src.exchange.kucoin.kucoin_symbol_converter import symbol_converter
-                        trading_pair = f"{coin_symbol.upper()}-USDT"
-                        trading_pair = symbol_converter.convert_bot_to_kucoin_futures(trading_pair)
-                    else:
-                        continue
-
-                    # Check order status
-                    try:
-                        order_status = await self.exchange.get_order_status(trading_pair, order_id)
-                        stats['total_checked'] += 1
-
-                        if not order_status:
-                            continue
-
-                        status = order_status.get('status', '').upper()
-
-                        if status in ['FILLED', 'DONE']:
-                            await self._handle_order_filled(trade_id, order_id, order_status)
-                            stats['filled'] += 1
-                        elif status in ['CANCELED', 'CANCELLED', 'REJECTED', 'EXPIRED']:
-                            await self._handle_order_cancelled(trade_id, order_id, order_status, status)
-                            stats['cancelled'] += 1
-                        else:
-                            stats['still_pending'] += 1
-                    except Exception as order_error:
-                        logger.warning(f"Error checking order status for {order_id}: {order_error}")
-                        stats['errors'] += 1
-                        continue
-
+                    outcome = await self.check_trade_order(trade)
                 except Exception as e:
-                    logger.error(f"Error monitoring trade {trade.get('id')}: {e}")
+                    logger.warning(f"Error checking order status for trade {trade.get('id')}: {e}")
                     stats['errors'] += 1
+                    continue
+
+                if outcome is None:
+                    continue
+                stats['total_checked'] += 1
+                if outcome in ('filled', 'cancelled', 'still_pending'):
+                    stats[outcome] += 1
 
             logger.info(f"Order monitoring completed: {stats}")
             return stats
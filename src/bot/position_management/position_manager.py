@@ -23,7 +23,29 @@ class PositionConflictAction(Enum):
     COOLDOWN = "cooldown"  # Apply cooldown and reject
 
 
-@dataclass
+@dataclass(slots=True)
+class PositionLeg:
+    """The fields of an active trade row that a position is built from."""
+    trade_id: int
+    size: float
+    entry_price: float
+    created_at: Any
+
+    @classmethod
+    def from_row(cls, trade: Dict[str, Any]) -> Optional['PositionLeg']:
+        """Read a trade row; returns None if it has no size or entry price."""
+        try:
+            size = float(trade.get('position_size') or 0)
+            entry_price = float(trade.get('entry_price') or 0)
+        except (TypeError, ValueError):
+            return None
+        if size <= 0 or entry_price <= 0:
+            return None
+        return cls(trade_id=trade['id'], size=size, entry_price=entry_price,
+                   created_at=trade.get('created_at'))
+
+
+@dataclass(slots=True)
 class PositionInfo:
     """Information about an active position."""
     symbol: str
@@ -38,7 +60,7 @@ class PositionInfo:
     updated_at: datetime
 
 
-@dataclass
+@dataclass(slots=True)
 class TradeConflict:
     """Information about a trade conflict."""
     new_trade_id: int
@@ -105,14 +127,12 @@ class PositionManager:
                         'total_entry_value': 0.0
                     }
 
-                # Add trade to position
-                trade_size = float(trade.get('position_size', 0))
-                entry_price = float(trade.get('entry_price', 0))
-
-                if trade_size > 0 and entry_price > 0:
-                    positions_by_symbol[position_key]['trades'].append(trade)
-                    positions_by_symbol[position_key]['total_size'] += trade_size
-                    positions_by_symbol[position_key]['total_entry_value'] += trade_size * entry_price
+                # Add trade to position, keeping only the fields the position needs
+                leg = PositionLeg.from_row(trade)
+                if leg is not None:
+                    positions_by_symbol[position_key]['trades'].append(leg)
+                    positions_by_symbol[position_key]['total_size'] += leg.size
+                    positions_by_symbol[position_key]['total_entry_value'] += leg.size * leg.entry_price
 
             # Convert to PositionInfo objects
             self.position_cache = {}
@@ -130,8 +150,7 @@ class PositionManager:
                     weighted_entry = 0.0
 
                 # Get the primary trade (oldest or largest)
-                primary_trade = min(pos_data['trades'],
-                                  key=lambda t: (t.get('created_at', ''), -float(t.get('position_size', 0))))
+                primary_trade = min(pos_data['trades'], key=lambda leg: (leg.created_at or '', -leg.size))
 
                 # Get current mark price from exchange
                 mark_price = await self._get_mark_price(symbol)
@@ -140,7 +159,6 @@ class PositionManager:
                 )
 
                 try:
-                    import asyncio
                     from src.services.notifications.trade_notification_service import trade_notification_service, PnLUpdateData
 
                     if hasattr(self, '_last_pnl_cache'):
@@ -161,7 +179,7 @@ class PositionManager:
                                 timestamp=datetime.now(timezone.utc)
                             )
 
-                            asyncio.create_task(trade_notification_service.notify_pnl_update(notification_data))
+                            await trade_notification_service.notify_pnl_update(notification_data)
 
                     if not hasattr(self, '_last_pnl_cache'):
                         self._last_pnl_cache = {}
@@ -177,9 +195,10 @@ class PositionManager:
                     entry_price=weighted_entry,
                     mark_price=mark_price,
                     unrealized_pnl=unrealized_pnl,
-                    trade_ids=[t['id'] for t in pos_data['trades']],
-                    primary_trade_id=primary_trade['id'],
-                    created_at=min(t.get('created_at', current_time) for t in pos_data['trades']),
+                    trade_ids=[leg.trade_id for leg in pos_data['trades']],
+                    primary_trade_id=primary_trade.trade_id,
+                    created_at=min(leg.created_at if leg.created_at is not None else current_time
+                                   for leg in pos_data['trades']),
                     updated_at=current_time
                 )
 
@@ -8,12 +8,9 @@ creation, cancellation, auditing, and verification of take profit orders.
 import logging
 from typing import Dict, Any, Optional, Tuple
 
-logger = logging.getLogger(__name__)
+from src.bot.order_management.bracket_order import BracketOrderBuilder
 
-# Constants from binance-python
-SIDE_BUY = 'BUY'
-SIDE_SELL = 'SELL'
-FUTURE_ORDER_TYPE_TAKE_PROFIT_MARKET = 'TAKE_PROFIT_MARKET'
+logger = logging.getLogger(__name__)
 
 
 class TakeProfitManager:
@@ -92,24 +89,16 @@ class TakeProfitManager:
             # Cancel any existing take profit orders for this symbol
             await self._cancel_existing_take_profit_orders(trading_pair)
 
-            # Create new take profit order
-            tp_side = SIDE_SELL if position_type.upper() == 'LONG' else SIDE_BUY
-
-            tp_order = await self.exchange.create_futures_order(
-                pair=trading_pair,
-                side=tp_side,
-                order_type=FUTURE_ORDER_TYPE_TAKE_PROFIT_MARKET,
-                amount=tp_quantity,
-                stop_price=tp_price,
-                reduce_only=True
-            )
+            # Create new take profit order through the bracket path (Algo Order API on Binance)
+            bracket = BracketOrderBuilder(self.exchange, trading_pair, position_type)
+            tp_orders, _ = await bracket.add_take_profit(tp_price, tp_quantity).submit()
 
-            if tp_order and 'orderId' in tp_order:
-                take_profit_order_id = str(tp_order['orderId'])
+            if tp_orders:
+                take_profit_order_id = str(tp_orders[0]['orderId'])
                 logger.info(f"Successfully created take profit order: {take_profit_order_id} at {tp_price}")
                 return True, take_profit_order_id
             else:
-                logger.error(f"Failed to create take profit order: {tp_order}")
+                logger.error(f"Failed to create take profit order for {trading_pair} at {tp_price}")
                 return False, None
 
         except Exception as e:
@@ -165,7 +154,7 @@ class TakeProfitManager:
             logger.info("Starting take profit audit for all open positions...")
 
             # Get all open positions
-            positions = await self.exchange.get_position_risk()
+            positions = await self.exchange.get_positions()
 
             audit_results = {
                 'total_positions': 0,
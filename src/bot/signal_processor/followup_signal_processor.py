@@ -50,7 +50,7 @@ class FollowupSignalProcessor:
             }
 
             # Check positions
-            positions = await self.exchange.get_positions(symbol=symbol)
+            positions = await self.exchange.get_positions(symbol=symbol, include_risk=True)
             for pos in positions:
                 position_amt = float(pos.get('positionAmt', 0))
                 if position_amt != 0:
@@ -11,6 +11,10 @@ import asyncio
 from typing import Dict, Any, Optional, List, Tuple, Union
 from datetime import datetime, timezone
 
+from src.database.models.trade_projections import TradeProjection
+from src.core.metrics import observe_stage, timed_stage
+from src.bot.utils.price_range_handler import PriceRangeHandler
+
 logger = logging.getLogger(__name__)
 
 # Constants from binance-python
@@ -70,6 +74,8 @@ class InitialSignalProcessor:
             lock = asyncio.Lock()
 
         async with lock:
+            validation_started = time.perf_counter()
+
             # Check cooldown
             cooldown_key = f"cex_{coin_symbol}"
             if time.time() - self.trade_cooldowns.get(cooldown_key, 0) < self.trading_engine.config.TRADE_COOLDOWN:
@@ -282,27 +288,37 @@ class InitialSignalProcessor:
             except Exception as e:
                 logger.warning(f"Pre-validation check failed, proceeding with normal flow: {e}")
 
+        # --- Order Book Liquidity Check (streamed local book while fresh, else REST) ---
+        order_book = None
+        if hasattr(self.exchange, 'get_order_book'):
+            order_book = await self.exchange.get_order_book(trading_pair)
+        if not order_book or not order_book.get('bids') or not order_book.get('asks'):
+            logger.warning(f"No order book depth for {trading_pair}. Skipping order.")
+            return False, {"error": f"No order book depth for {trading_pair}, order skipped."}
+
         # --- Proximity Check for LIMIT Orders ---
         # Apply platform price-range logic: decide MARKET vs LIMIT and optimal limit price
-        # Use mark_price for proximity checks (not current_price which is signal_price for LIMIT orders)
+        # Use the price a market entry would get (best ask/bid, else mark price) for proximity checks
+        # (not current_price which is signal_price for LIMIT orders)
+        touch_price = PriceRangeHandler.touch_price(position_type, mark_price, order_book)
         try:
             if entry_prices and isinstance(entry_prices, list) and len(entry_prices) > 0:
                 upper_bound = max(entry_prices)
                 lower_bound = min(entry_prices)
                 pos_upper = position_type.upper() == "LONG"
-                # Market execution if mark price within acceptable side bound, else place limit at optimal bound
+                # Market execution if the touch price is within acceptable side bound, else place limit at optimal bound
                 if position_type.upper() == "LONG":
-                    if mark_price <= upper_bound:
+                    if touch_price <= upper_bound:
                         order_type = "MARKET"
-                        current_price = mark_price  # Update current_price for MARKET order
+                        current_price = touch_price  # Update current_price for MARKET order
                     else:
                         order_type = "LIMIT"
                         signal_price = upper_bound
                         current_price = signal_price  # Update current_price for LIMIT order
                 elif position_type.upper() == "SHORT":
-                    if mark_price >= lower_bound:
+                    if touch_price >= lower_bound:
                         order_type = "MARKET"
-                        current_price = mark_price  # Update current_price for MARKET order
+                        current_price = touch_price  # Update current_price for MARKET order
                     else:
                         order_type = "LIMIT"
                         signal_price = lower_bound
@@ -320,14 +336,6 @@ class InitialSignalProcessor:
         except Exception as e:
             logger.warning(f"Price-range decision failed, keeping provided order_type {order_type}: {e}")
 
-        # --- Order Book Liquidity Check ---
-        order_book = None
-        if hasattr(self.exchange, 'get_order_book'):
-            order_book = await self.exchange.get_order_book(trading_pair)
-        if not order_book or not order_book.get('bids') or not order_book.get('asks'):
-            logger.warning(f"No order book depth for {trading_pair}. Skipping order.")
-            return False, {"error": f"No order book depth for {trading_pair}, order skipped."}
-
         # --- Normalize Stop Loss to float (if provided) ---
         normalized_sl: Optional[float] = None
         try:
@@ -401,6 +409,7 @@ class InitialSignalProcessor:
                 return False, position_validation[1] or "Position validation failed"
 
             # --- Execute Trade ---
+            observe_stage('pre_trade_validation', time.perf_counter() - validation_started)
             return await self._execute_trade(
                 trading_pair, coin_symbol, signal_price, position_type, order_type,
                 trade_amount, stop_loss, take_profits, entry_prices, is_futures
@@ -633,7 +642,7 @@ class InitialSignalProcessor:
         """
         try:
             # Get current positions for this symbol
-            positions = await self.exchange.get_position_risk(symbol=trading_pair)
+            positions = await self.exchange.get_positions(symbol=trading_pair)
             current_position_size = 0.0
             actual_leverage = 1.0
             try:
@@ -694,6 +703,7 @@ class InitialSignalProcessor:
             logger.error(f"Error validating position limits: {e}")
             return False, f"Error in position validation: {str(e)}"
 
+    @timed_stage('order_placement')
     async def _execute_trade(
         self,
         trading_pair: str,
@@ -835,7 +845,6 @@ class InitialSignalProcessor:
                             else:
                                 signal_price = signal_price * 1.001  # Higher sell price
                             retry_count += 1
-                            await asyncio.sleep(0.5)  # Brief delay before retry
                         else:
                             break
                     else:
@@ -895,7 +904,7 @@ class InitialSignalProcessor:
                     timestamp=datetime.now(timezone.utc)
                 )
 
-                asyncio.create_task(trade_notification_service.notify_trade_execution_success(notification_data))
+                await trade_notification_service.notify_trade_execution_success(notification_data)
 
             except Exception as e:
                 logger.error(f"Failed to send trade execution notification: {e}")
@@ -1074,7 +1083,7 @@ class InitialSignalProcessor:
             from datetime import datetime, timezone
 
             # Find the trade by discord_id first
-            trade = await self.db_manager.find_trade_by_discord_id(discord_id)
+            trade = await self.db_manager.find_trade_by_discord_id(discord_id, TradeProjection.STATUS_CHECK)
             if not trade:
                 logger.error(f"Could not find trade with discord_id: {discord_id}")
                 return False
@@ -13,9 +13,17 @@ from src.services.trader_config_service import (
     ExchangeType, trader_config_service,
     get_exchange_for_trader, is_trader_supported
 )
+from src.exchange.core.symbol_registry import NON_COIN_WORDS, get_symbol_registry
 
 logger = logging.getLogger(__name__)
 
+# Patterns to match coin symbols like "ETH 🚀|", "BTC |", "SOL stops"
+ALERT_COIN_PATTERNS = [
+    r'\b([A-Z]{2,10})\s*[🚀|]',  # "ETH 🚀|" or "BTC |"
+    r'^([A-Z]{2,10})\s+',         # "ETH stops" or "BTC closed"
+    r'[|🚀]\s*([A-Z]{2,10})\s',   # Symbol after separator
+]
+
 
 class SignalRouter:
     """
@@ -801,19 +809,17 @@ class SignalRouter:
         if not content:
             return None
 
-        # Patterns to match coin symbols like "ETH 🚀|", "BTC |", "SOL stops"
-        patterns = [
-            r'\b([A-Z]{2,10})\s*[🚀|]',  # "ETH 🚀|" or "BTC |"
-            r'^([A-Z]{2,10})\s+',         # "ETH stops" or "BTC closed"
-            r'[|🚀]\s*([A-Z]{2,10})\s',   # Symbol after separator
-        ]
+        # Listed coins only, once the symbol registry has been loaded
+        registry = get_symbol_registry()
+        if registry.is_loaded():
+            return registry.find_coin(content, patterns=ALERT_COIN_PATTERNS, ignore=NON_COIN_WORDS)
 
-        for pattern in patterns:
+        for pattern in ALERT_COIN_PATTERNS:
             match = re.search(pattern, content.upper())
             if match:
                 symbol = match.group(1)
                 # Filter out common false positives
-                if symbol not in ['BE', 'TP', 'SL', 'STOPS', 'MOVED', 'CLOSED', 'IN', 'TO', 'AT', 'ON', 'OF', 'FOR', 'WITH']:
+                if symbol not in NON_COIN_WORDS:
                     return symbol
 
         return None
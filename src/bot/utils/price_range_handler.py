@@ -3,7 +3,7 @@ Price range handling utilities for trading operations.
 """
 
 import logging
-from typing import List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 from src.core.constants import ORDER_TYPE_MARKET, ORDER_TYPE_LIMIT, POSITION_TYPE_LONG, POSITION_TYPE_SHORT
 
@@ -54,6 +54,33 @@ class PriceRangeHandler:
         # Fallback
         return current_price, "Fallback to current market price"
 
+    @staticmethod
+    def touch_price(
+        position_type: str,
+        fallback_price: float,
+        order_book: Optional[Dict[str, Any]]
+    ) -> float:
+        """
+        Price a market entry would execute at: the best ask for LONG, the best bid for SHORT.
+
+        Args:
+            position_type: LONG or SHORT
+            fallback_price: Price used when the book has no level on that side (e.g. the mark price)
+            order_book: Depth with 'bids'/'asks' as [price, qty] levels, best first
+
+        Returns:
+            float: Touch price, or fallback_price
+        """
+        if not order_book or position_type.upper() not in (POSITION_TYPE_LONG, POSITION_TYPE_SHORT):
+            return fallback_price
+        side = 'asks' if position_type.upper() == POSITION_TYPE_LONG else 'bids'
+        try:
+            levels = order_book.get(side) or []
+            price = float(levels[0][0]) if levels else 0.0
+        except (TypeError, ValueError, IndexError):
+            return fallback_price
+        return price if price > 0 else fallback_price
+
     @staticmethod
     def _handle_two_price_range(
         entry_prices: List[float],
@@ -17,6 +17,7 @@ from src.config.dynamic_validation_config import (
     is_offline_mode_enabled,
     get_validation_config
 )
+from src.exchange.core.symbol_registry import get_symbol_registry
 
 logger = logging.getLogger(__name__)
 
@@ -62,6 +63,7 @@ class DynamicSymbolValidator:
         """Fetch all active futures symbols from Binance."""
         try:
             exchange_info = await exchange_client.futures_exchange_info()
+            get_symbol_registry().load_binance(exchange_info.get('symbols', []))
             symbols = set()
 
             for symbol_info in exchange_info.get('symbols', []):
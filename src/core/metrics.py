@@ -0,0 +1,302 @@
+"""
+Latency metrics for the trading bot.
+
+Histograms for the signal pipeline stages, exchange REST calls, Supabase
+calls, websocket event lag and event loop lag, rendered in the Prometheus
+text exposition format for the /metrics endpoints. Stage timings carry a
+correlation id (the discord_id of the signal being processed) in the logs.
+"""
+
+import asyncio
+import functools
+import logging
+import re
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE_LATEST = 'text/plain; version=0.0.4; charset=utf-8'
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STAGE_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0)
+
+# Stages slower than this are logged at INFO with their correlation id
+SLOW_STAGE_SECONDS = 2.0
+
+correlation_id: ContextVar[Optional[str]] = ContextVar('correlation_id', default=None)
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_bound(bound: float) -> str:
+    return '+Inf' if bound == float('inf') else repr(float(bound))
+
+
+class Histogram:
+    """A labelled Prometheus histogram."""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float('inf'),)
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: Any) -> None:
+        """
+        Record one observation.
+
+        Args:
+            value: Observed value (seconds)
+            **labels: A value for every label name
+        """
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                # Per-bucket counts followed by sum and count
+                series = self._series[key] = [0.0] * (len(self.buckets) + 2)
+            series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    @contextmanager
+    def time(self, **labels: Any) -> Iterator[None]:
+        """Observe the duration of the with-block."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels: Any) -> int:
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        series = self._series.get(key)
+        return int(series[-1]) if series else 0
+
+    def totals(self) -> Dict[Tuple[str, ...], Tuple[int, float]]:
+        """(count, sum) of every label set."""
+        with self._lock:
+            return {key: (int(values[-1]), values[-2]) for key, values in self._series.items()}
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series_items = [(key, list(values)) for key, values in self._series.items()]
+
+        for key, values in sorted(series_items):
+            label_text = ','.join(f'{name}="{_escape(value)}"' for name, value in zip(self.labelnames, key))
+            prefix = f"{label_text}," if label_text else ''
+            cumulative = 0.0
+            for bound, bucket_count in zip(self.buckets, values):
+                cumulative += bucket_count
+                lines.append(f'{self.name}_bucket{{{prefix}le="{_format_bound(bound)}"}} {int(cumulative)}')
+            suffix = f"{{{label_text}}}" if label_text else ''
+            lines.append(f"{self.name}_sum{suffix} {values[-2]}")
+            lines.append(f"{self.name}_count{suffix} {int(values[-1])}")
+        return lines
+
+
+class MetricsRegistry:
+    """Holds the process's histograms and renders them for scraping."""
+
+    def __init__(self):
+        self._metrics: Dict[str, Histogram] = {}
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        """Get or create a histogram."""
+        if name not in self._metrics:
+            self._metrics[name] = Histogram(name, documentation, labelnames, buckets)
+        return self._metrics[name]
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text format."""
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+
+SIGNAL_STAGE_SECONDS = registry.histogram(
+    'rubicon_signal_stage_seconds', 'Time spent in each signal pipeline stage', ('stage',), STAGE_BUCKETS)
+EXCHANGE_REQUEST_SECONDS = registry.histogram(
+    'rubicon_exchange_request_seconds', 'Exchange REST call latency', ('exchange', 'method', 'endpoint'))
+SUPABASE_REQUEST_SECONDS = registry.histogram(
+    'rubicon_supabase_request_seconds', 'Supabase REST call latency', ('table', 'op'))
+WEBSOCKET_EVENT_LAG_SECONDS = registry.histogram(
+    'rubicon_websocket_event_lag_seconds', 'Delay between exchange event time and local receipt', ('event',), LAG_BUCKETS)
+EVENT_LOOP_LAG_SECONDS = registry.histogram(
+    'rubicon_event_loop_lag_seconds', 'Extra delay of a scheduled asyncio wakeup', (), LAG_BUCKETS)
+HTTP_REQUEST_SECONDS = registry.histogram(
+    'rubicon_http_request_seconds', 'API request handling time', ('method', 'route', 'status'))
+
+
+# Signal pipeline stages
+
+@contextmanager
+def correlation_context(cid: Optional[str]) -> Iterator[None]:
+    """Tag stage timings inside the with-block with a correlation id (e.g. discord_id)."""
+    token = correlation_id.set(str(cid) if cid is not None else None)
+    try:
+        yield
+    finally:
+        correlation_id.reset(token)
+
+
+def observe_stage(stage: str, seconds: float) -> None:
+    """Record a pipeline stage duration measured by the caller."""
+    SIGNAL_STAGE_SECONDS.observe(seconds, stage=stage)
+    cid = correlation_id.get()
+    if seconds >= SLOW_STAGE_SECONDS:
+        logger.info(f"[trace {cid}] stage {stage} took {seconds * 1000:.0f}ms")
+    else:
+        logger.debug(f"[trace {cid}] stage {stage} took {seconds * 1000:.1f}ms")
+
+
+@contextmanager
+def time_stage(stage: str) -> Iterator[None]:
+    """Time a pipeline stage."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe_stage(stage, time.perf_counter() - start)
+
+
+def timed_stage(stage: str) -> Callable:
+    """Decorator timing an async function as a pipeline stage."""
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            with time_stage(stage):
+                return await func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# Exchange, Supabase and websocket instrumentation
+
+_SYMBOL_SEGMENT = re.compile(r'^[A-Z0-9]{3,}$')
+_ID_SEGMENT = re.compile(r'^(\d+|(?=.*\d)[\w.-]{16,})$')
+
+
+def endpoint_label(url: str) -> str:
+    """
+    Route template of a REST URL for the endpoint label.
+
+    Path segments carrying ids are collapsed so that per-order and per-symbol
+    URLs (e.g. KuCoin ``/api/v1/orders/{orderId}``) share one series:
+    numbers and long tokens containing a digit (order ids, UUIDs, client ids)
+    become ``{id}``, upper-case contract names become ``{symbol}``.
+    """
+    path = urlparse(url).path or url
+    segments = []
+    for segment in path.split('/'):
+        if _SYMBOL_SEGMENT.match(segment) and not segment.isdigit():
+            segments.append('{symbol}')
+        elif _ID_SEGMENT.match(segment):
+            segments.append('{id}')
+        else:
+            segments.append(segment)
+    return '/'.join(segments)
+
+
+def observe_exchange_request(exchange: str, method: str, url: str, seconds: float) -> None:
+    """Record an exchange REST call; the endpoint label is the route template of the URL."""
+    EXCHANGE_REQUEST_SECONDS.observe(seconds, exchange=exchange, method=method.upper(), endpoint=endpoint_label(url))
+
+
+@contextmanager
+def time_exchange_request(exchange: str, method: str, endpoint: str) -> Iterator[None]:
+    """Time an exchange REST call."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe_exchange_request(exchange, method, endpoint, time.perf_counter() - start)
+
+
+_SUPABASE_OPS = {'GET': 'select', 'HEAD': 'count', 'POST': 'insert', 'PATCH': 'update', 'DELETE': 'delete'}
+
+
+def _supabase_labels(request: Any) -> Dict[str, str]:
+    path = request.url.path
+    table = path.split('/rest/v1/', 1)[-1].split('/')[0] or 'unknown'
+    op = _SUPABASE_OPS.get(request.method, request.method.lower())
+    if op == 'insert' and 'merge-duplicates' in request.headers.get('prefer', ''):
+        op = 'upsert'
+    if table == 'rpc':
+        op = 'rpc'
+        table = path.rsplit('/', 1)[-1]
+    return {'table': table, 'op': op}
+
+
+def instrument_supabase(client: Any) -> bool:
+    """
+    Time every Supabase table call made through a client, by table and operation.
+
+    Uses httpx event hooks on the postgrest session, so all existing
+    ``client.table(...)...execute()`` call sites are covered.
+
+    Args:
+        client: Supabase client
+
+    Returns:
+        True if the hooks were installed (or already present)
+    """
+    try:
+        session = client.postgrest.session
+    except Exception as e:
+        logger.warning(f"Supabase client cannot be instrumented: {e}")
+        return False
+
+    if getattr(session, '_rubicon_metrics', False):
+        return True
+
+    def on_request(request):
+        request.extensions['metrics_start'] = time.perf_counter()
+
+    def on_response(response):
+        start = response.request.extensions.get('metrics_start')
+        if start is not None:
+            SUPABASE_REQUEST_SECONDS.observe(time.perf_counter() - start, **_supabase_labels(response.request))
+
+    session.event_hooks['request'].append(on_request)
+    session.event_hooks['response'].append(on_response)
+    session._rubicon_metrics = True
+    return True
+
+
+def observe_event_lag(event_type: str, event_time_ms: Any) -> None:
+    """Record how long after its exchange timestamp ('E', ms) an event was received."""
+    try:
+        lag = time.time() - float(event_time_ms) / 1000.0
+    except (TypeError, ValueError):
+        return
+    WEBSOCKET_EVENT_LAG_SECONDS.observe(max(lag, 0.0), event=event_type)
+
+
+async def monitor_event_loop_lag(interval: float = 0.5) -> None:
+    """Background task measuring how late the event loop wakes up a sleeping task."""
+    while True:
+        start = time.perf_counter()
+        try:
+            await asyncio.sleep(interval)
+        except asyncio.CancelledError:
+            break
+        EVENT_LOOP_LAG_SECONDS.observe(max(time.perf_counter() - start - interval, 0.0))
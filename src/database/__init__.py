@@ -8,6 +8,8 @@ This module provides a comprehensive database abstraction layer for the trading
 from src.database.core.database_config import DatabaseConfig, database_config
 from src.database.core.connection_manager import DatabaseConnectionManager, connection_manager, get_db_connection
 from src.database.core.database_manager import DatabaseManager
+from src.database.core.trade_batch_writer import TradeBatchWriter
+from src.database.core.trade_cache import TradeCache, get_trade_cache
 
 # Models
 from src.database.models.trade_models import (
@@ -39,6 +41,9 @@ __all__ = [
     "connection_manager",
     "get_db_connection",
     "DatabaseManager",
+    "TradeBatchWriter",
+    "TradeCache",
+    "get_trade_cache",
 
     # Models
     "Trade",
@@ -7,6 +7,8 @@ This module contains core database components.
 from src.database.core.database_config import DatabaseConfig, database_config
 from src.database.core.connection_manager import DatabaseConnectionManager, connection_manager, get_db_connection
 from src.database.core.database_manager import DatabaseManager
+from src.database.core.trade_batch_writer import TradeBatchWriter
+from src.database.core.trade_cache import TradeCache, get_trade_cache
 
 __all__ = [
     "DatabaseConfig",
@@ -14,5 +16,8 @@ __all__ = [
     "DatabaseConnectionManager",
     "connection_manager",
     "get_db_connection",
-    "DatabaseManager"
+    "DatabaseManager",
+    "TradeBatchWriter",
+    "TradeCache",
+    "get_trade_cache"
 ]
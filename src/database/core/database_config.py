@@ -33,6 +33,8 @@ class DatabaseConfig:
     enable_cache: bool = True
     cache_ttl: int = 300  # seconds
     max_cache_size: int = 1000
+    trade_cache_size: int = 2000
+    trade_cache_ttl: int = 60  # seconds
     
     # Logging settings
     enable_query_logging: bool = False
@@ -57,6 +59,8 @@ class DatabaseConfig:
         self.enable_cache = os.getenv("DB_ENABLE_CACHE", str(self.enable_cache)).lower() == "true"
         self.cache_ttl = int(os.getenv("DB_CACHE_TTL", str(self.cache_ttl)))
         self.max_cache_size = int(os.getenv("DB_MAX_CACHE_SIZE", str(self.max_cache_size)))
+        self.trade_cache_size = int(os.getenv("DB_TRADE_CACHE_SIZE", str(self.trade_cache_size)))
+        self.trade_cache_ttl = int(os.getenv("DB_TRADE_CACHE_TTL", str(self.trade_cache_ttl)))
         self.enable_query_logging = os.getenv("DB_ENABLE_QUERY_LOGGING", str(self.enable_query_logging)).lower() == "true"
         self.log_slow_queries = os.getenv("DB_LOG_SLOW_QUERIES", str(self.log_slow_queries)).lower() == "true"
         self.slow_query_threshold = float(os.getenv("DB_SLOW_QUERY_THRESHOLD", str(self.slow_query_threshold)))
@@ -6,12 +6,14 @@ This module provides core database operations and utilities.
 
 import logging
 import time
-from typing import Optional, Dict, Any, List, Union
+from collections import OrderedDict
+from typing import Optional, Dict, Any, List, Set, Union
 from datetime import datetime, timezone
 from supabase import Client
 
 from src.database.core.database_config import database_config
 from src.database.core.connection_manager import connection_manager
+from src.database.core.trade_cache import get_trade_cache
 
 logger = logging.getLogger(__name__)
 
@@ -22,8 +24,11 @@ class DatabaseManager:
         """Initialize the database manager."""
         self.client = client
         self.config = database_config
-        self._query_cache: Dict[str, Any] = {}
+        # Kept in recency order: the first entry is the least recently used
+        self._query_cache: "OrderedDict[str, Any]" = OrderedDict()
         self._cache_timestamps: Dict[str, float] = {}
+        # Cache keys per table, dropped when the table is written to
+        self._cache_tables: Dict[str, Set[str]] = {}
 
     async def initialize(self) -> bool:
         """Initialize the database manager."""
@@ -61,37 +66,62 @@ class DatabaseManager:
         cache_age = time.time() - self._cache_timestamps[cache_key]
         return cache_age < self.config.cache_ttl
 
-    def _update_cache(self, cache_key: str, data: Any) -> None:
+    def _update_cache(self, cache_key: str, data: Any, table: Optional[str] = None) -> None:
         """Update cache with new data."""
         if not self.config.enable_cache:
             return
 
-        # Implement LRU cache eviction
-        if len(self._query_cache) >= self.config.max_cache_size:
-            # Remove oldest entry
-            oldest_key = min(self._cache_timestamps.keys(), key=lambda k: self._cache_timestamps[k])
-            del self._query_cache[oldest_key]
-            del self._cache_timestamps[oldest_key]
-
         self._query_cache[cache_key] = data
+        self._query_cache.move_to_end(cache_key)
         self._cache_timestamps[cache_key] = time.time()
+        if table:
+            self._cache_tables.setdefault(table, set()).add(cache_key)
+
+        # Evict least recently used entries
+        while len(self._query_cache) > self.config.max_cache_size:
+            oldest_key, _ = self._query_cache.popitem(last=False)
+            self._cache_timestamps.pop(oldest_key, None)
+            for keys in self._cache_tables.values():
+                keys.discard(oldest_key)
 
     def _get_from_cache(self, cache_key: str) -> Optional[Any]:
         """Get data from cache if valid."""
         if not self.config.enable_cache:
             return None
 
-        if self._is_cache_valid(cache_key):
-            return self._query_cache.get(cache_key)
+        if self._is_cache_valid(cache_key) and cache_key in self._query_cache:
+            self._query_cache.move_to_end(cache_key)
+            return self._query_cache[cache_key]
 
         # Remove invalid cache entry
-        if cache_key in self._query_cache:
-            del self._query_cache[cache_key]
-            del self._cache_timestamps[cache_key]
+        self._query_cache.pop(cache_key, None)
+        self._cache_timestamps.pop(cache_key, None)
 
         return None
 
-    async def execute_query(self, query_builder, cache_key: Optional[str] = None) -> Dict[str, Any]:
+    def _invalidate_table(self, table: str, filters: Optional[Dict[str, Any]] = None,
+                          existing_rows: bool = True) -> None:
+        """
+        Drop cached queries for a table after a write to it.
+
+        Args:
+            table: Table written to
+            filters: Equality filters of the write, used to narrow trade cache eviction
+            existing_rows: Whether existing rows changed (False for inserts)
+        """
+        for cache_key in self._cache_tables.pop(table, set()):
+            self._query_cache.pop(cache_key, None)
+            self._cache_timestamps.pop(cache_key, None)
+
+        if table == "trades" and existing_rows:
+            trade_cache = get_trade_cache()
+            if filters and "id" in filters:
+                trade_cache.invalidate(filters["id"])
+            else:
+                trade_cache.clear()
+
+    async def execute_query(self, query_builder, cache_key: Optional[str] = None,
+                            table: Optional[str] = None) -> Dict[str, Any]:
         """Execute a database query with optional caching."""
         start_time = time.time()
 
@@ -116,7 +146,7 @@ class DatabaseManager:
 
             # Update cache
             if cache_key:
-                self._update_cache(cache_key, result)
+                self._update_cache(cache_key, result, table)
 
             return result
 
@@ -129,7 +159,8 @@ class DatabaseManager:
         try:
             query = self.client.table(table).insert(data)
             result = await self.execute_query(query)
-            logger.info(f"Inserted data into {table}: {result}")
+            self._invalidate_table(table, existing_rows=False)
+            logger.debug(f"Inserted {len(getattr(result, 'data', None) or [])} rows into {table}")
             return result
         except Exception as e:
             logger.error(f"Failed to insert data into {table}: {e}")
@@ -167,7 +198,7 @@ class DatabaseManager:
             if limit:
                 query = query.limit(limit)
 
-            result = await self.execute_query(query, cache_key)
+            result = await self.execute_query(query, cache_key, table)
             return result
 
         except Exception as e:
@@ -186,7 +217,8 @@ class DatabaseManager:
                     query = query.eq(key, value)
 
             result = await self.execute_query(query)
-            logger.info(f"Updated data in {table}: {result}")
+            self._invalidate_table(table, filters)
+            logger.debug(f"Updated {len(getattr(result, 'data', None) or [])} rows in {table} ({filters})")
             return result
 
         except Exception as e:
@@ -204,6 +236,7 @@ class DatabaseManager:
                     query = query.eq(key, value)
 
             result = await self.execute_query(query)
+            self._invalidate_table(table, filters)
             logger.info(f"Deleted data from {table}: {result}")
             return result
 
@@ -232,6 +265,7 @@ class DatabaseManager:
         """Clear the query cache."""
         self._query_cache.clear()
         self._cache_timestamps.clear()
+        self._cache_tables.clear()
         logger.info("Database query cache cleared")
 
     async def health_check(self) -> bool:
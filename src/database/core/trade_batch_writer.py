@@ -0,0 +1,175 @@
+"""
+Trade Batch Writer
+
+Accumulates validated trade mutations and flushes them in a handful of
+requests instead of one UPDATE per trade. Validation runs against the rows
+the caller already loaded, so no extra read is needed per trade.
+"""
+
+import json
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Tuple
+
+from src.database.core.trade_cache import get_trade_cache
+from src.database.validators.status_validator import StatusValidator
+
+logger = logging.getLogger(__name__)
+
+
+class TradeBatchWriter:
+    """
+    Batched writer for the trades table.
+
+    Changes staged for the same trade are merged. On flush, trades are
+    grouped by the set of columns they change and each group is written in
+    chunks through the ``batch_update_trades`` RPC
+    (scripts/setup/batch_update_trades.sql), one request per chunk whatever
+    the values. Only ``id`` and the changed columns are sent: the loaded row
+    is never written back, so updates made by other writers between load and
+    flush are kept. Where the function is not installed the writer falls
+    back to one ``update(...).in_("id", ids)`` per identical change set and
+    one ``update(...).eq("id", id)`` per remaining trade. The rows the writes
+    return refresh the trade cache and the analytics rollups.
+
+    The writer is meant for rows loaded in the same pass (reconciliation and
+    backfill jobs). It flushes automatically every ``chunk_size`` staged
+    trades to keep the window between read and write short.
+    """
+
+    def __init__(self, supabase: Any, chunk_size: int = 200, table: str = "trades"):
+        """
+        Initialize the writer.
+
+        Args:
+            supabase: Supabase client
+            chunk_size: Maximum number of trades per request and auto-flush threshold
+            table: Table to write to
+        """
+        self.supabase = supabase
+        self.chunk_size = max(1, chunk_size)
+        self.table = table
+        self._changes: Dict[Any, Dict[str, Any]] = {}
+        # Cleared when the batch_update_trades function turns out to be missing
+        self.use_rpc = table == "trades"
+        self.stats = {'staged': 0, 'rejected': 0, 'written': 0, 'requests': 0, 'errors': 0}
+
+    @property
+    def pending_count(self) -> int:
+        """Number of trades with staged, unflushed changes."""
+        return len(self._changes)
+
+    async def __aenter__(self) -> "TradeBatchWriter":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.flush()
+
+    async def stage(self, trade: Dict[str, Any], updates: Dict[str, Any], validate: bool = True) -> bool:
+        """
+        Stage changes for a loaded trade row.
+
+        Args:
+            trade: Trade row as loaded from the database (must contain 'id')
+            updates: Columns to change
+            validate: Validate status consistency against the loaded row
+
+        Returns:
+            True if the changes were staged, False if they were rejected
+        """
+        trade_id = trade.get('id')
+        if trade_id is None or not updates:
+            return False
+
+        current = {**trade, **self._changes.get(trade_id, {})}
+
+        if validate:
+            is_valid, error_msg, updates = StatusValidator.validate_trade_update(dict(updates), current)
+            if not is_valid:
+                logger.error(f"Status validation failed for trade {trade_id}: {error_msg}")
+                self.stats['rejected'] += 1
+                return False
+
+        self._changes.setdefault(trade_id, {}).update(updates)
+        self.stats['staged'] += 1
+
+        if len(self._changes) >= self.chunk_size:
+            await self.flush()
+        return True
+
+    async def flush(self) -> int:
+        """
+        Write all staged changes.
+
+        Returns:
+            Number of trades written
+        """
+        if not self._changes:
+            return 0
+
+        changes, self._changes = self._changes, {}
+
+        now = datetime.now(timezone.utc).isoformat()
+        by_columns: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+        for trade_id, change in changes.items():
+            change.setdefault('updated_at', now)
+            by_columns.setdefault(tuple(sorted(change)), []).append({'id': trade_id, **change})
+
+        written = 0
+        rows: List[Dict[str, Any]] = []
+        for patches in by_columns.values():
+            for i in range(0, len(patches), self.chunk_size):
+                written += await self._write_chunk(patches[i:i + self.chunk_size], rows)
+
+        logger.info(f"Trade batch flush: {written}/{len(changes)} trades written in {self.stats['requests']} requests total")
+        if rows and self.table == "trades":
+            from src.services.analytics.rollups import record_trade_writes
+            await record_trade_writes(self.supabase, rows)
+        return written
+
+    async def _write_chunk(self, patches: List[Dict[str, Any]], rows: List[Dict[str, Any]]) -> int:
+        """Write patches ({'id': ..., <changed columns>}) sharing one column set."""
+        if self.use_rpc:
+            self.stats['requests'] += 1
+            try:
+                response = self.supabase.rpc('batch_update_trades', {'updates': patches}).execute()
+                return self._record(response, rows)
+            except Exception as e:
+                self.use_rpc = False
+                logger.warning(f"batch_update_trades unavailable, falling back to per-change updates: {e}")
+
+        groups: Dict[str, Tuple[Dict[str, Any], List[Any]]] = {}
+        for patch in patches:
+            change = {k: v for k, v in patch.items() if k != 'id'}
+            key = json.dumps(change, sort_keys=True, default=str)
+            groups.setdefault(key, (change, []))[1].append(patch['id'])
+
+        written = 0
+        for change, ids in groups.values():
+            if len(ids) == 1:
+                written += self._execute(
+                    lambda ch=change, i=ids[0]: self.supabase.table(self.table).update(ch).eq("id", i).execute(), 1,
+                    rows)
+            else:
+                written += self._execute(
+                    lambda c=ids, ch=change: self.supabase.table(self.table).update(ch).in_("id", c).execute(),
+                    len(ids), rows)
+        return written
+
+    def _execute(self, request, expected: int, rows: List[Dict[str, Any]]) -> int:
+        self.stats['requests'] += 1
+        try:
+            return self._record(request(), rows)
+        except Exception as e:
+            logger.error(f"Error writing batch of {expected} trades: {e}")
+            self.stats['errors'] += 1
+            return 0
+
+    def _record(self, response: Any, rows: List[Dict[str, Any]]) -> int:
+        """Count the rows a write returned and refresh the trade cache from them."""
+        data = response.data if response and isinstance(response.data, list) else []
+        if data and self.table == "trades":
+            get_trade_cache().put_many(data)
+            rows.extend(data)
+        self.stats['written'] += len(data)
+        return len(data)
@@ -0,0 +1,183 @@
+"""
+Trade Cache
+
+In-process cache of full trade rows, looked up by id, discord_id or
+exchange_order_id. A signal's lifecycle reads the same trade several times
+(status validation before each update, response enrichment, follow-ups);
+with the cache those reads are served from memory. Local writes go through
+the cache, writes made by other processes arrive as Supabase realtime
+change events and evict the affected rows.
+"""
+
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from src.database.core.database_config import database_config
+
+logger = logging.getLogger(__name__)
+
+# Secondary lookup columns; each value maps to at most one trade
+INDEXED_COLUMNS: Tuple[str, ...] = ('discord_id', 'exchange_order_id')
+
+
+class TradeCache:
+    """
+    LRU cache of trade rows with secondary indexes.
+
+    Entries are kept in an OrderedDict in recency order, so lookups, inserts
+    and eviction of the least recently used row are all O(1). Entries also
+    expire after ``ttl`` seconds as a safety net for missed change events.
+    """
+
+    def __init__(self, max_size: int = 2000, ttl: float = 60.0, enabled: bool = True):
+        """
+        Initialize the cache.
+
+        Args:
+            max_size: Maximum number of trades kept
+            ttl: Seconds after which an entry is no longer served
+            enabled: When False nothing is stored and every lookup misses
+        """
+        self.max_size = max(1, max_size)
+        self.ttl = ttl
+        self.enabled = enabled
+        self._rows: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._indexes: Dict[str, Dict[str, str]] = {column: {} for column in INDEXED_COLUMNS}
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'invalidations': 0}
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def get(self, trade_id: Any) -> Optional[Dict[str, Any]]:
+        """
+        Get a cached trade by ID.
+
+        Returns:
+            Optional[Dict[str, Any]]: A copy of the cached row, or None on a miss
+        """
+        key = str(trade_id)
+        entry = self._rows.get(key)
+        if entry is None:
+            self.stats['misses'] += 1
+            return None
+        stored_at, row = entry
+        if time.monotonic() - stored_at >= self.ttl:
+            self._remove(key)
+            self.stats['misses'] += 1
+            return None
+        self._rows.move_to_end(key)
+        self.stats['hits'] += 1
+        return dict(row)
+
+    def get_by(self, column: str, value: Any) -> Optional[Dict[str, Any]]:
+        """
+        Get a cached trade by discord_id or exchange_order_id.
+
+        Args:
+            column: One of INDEXED_COLUMNS
+            value: Column value
+        """
+        key = self._indexes[column].get(str(value)) if value is not None else None
+        if key is None:
+            self.stats['misses'] += 1
+            return None
+        return self.get(key)
+
+    def put(self, row: Dict[str, Any]) -> None:
+        """
+        Store a full trade row, replacing any cached version.
+
+        Args:
+            row: Complete trade row (must contain 'id')
+        """
+        if not self.enabled or not row or row.get('id') is None:
+            return
+        key = str(row['id'])
+        if key in self._rows:
+            self._unindex(key, self._rows[key][1])
+        self._rows[key] = (time.monotonic(), dict(row))
+        self._rows.move_to_end(key)
+        self._index(key, row)
+
+        while len(self._rows) > self.max_size:
+            oldest, (_, oldest_row) = self._rows.popitem(last=False)
+            self._unindex(oldest, oldest_row)
+            self.stats['evictions'] += 1
+
+    def put_many(self, rows: Optional[Iterable[Dict[str, Any]]]) -> None:
+        """Store several full trade rows."""
+        for row in rows or []:
+            self.put(row)
+
+    def apply_update(self, trade_id: Any, updates: Dict[str, Any]) -> None:
+        """
+        Apply written columns to a cached trade (no-op if it is not cached).
+
+        Args:
+            trade_id: Trade ID
+            updates: Columns as written to the database
+        """
+        entry = self._rows.get(str(trade_id))
+        if entry is not None:
+            self.put({**entry[1], **updates, 'id': entry[1]['id']})
+
+    def invalidate(self, trade_id: Any) -> None:
+        """Drop a trade from the cache."""
+        if self._remove(str(trade_id)):
+            self.stats['invalidations'] += 1
+
+    def apply_change_event(self, payload: Dict[str, Any]) -> None:
+        """
+        Apply a Supabase realtime change event for the trades table.
+
+        Rows touched by another process are evicted rather than replaced, so
+        the next read loads them in full from the database.
+
+        Args:
+            payload: Realtime payload with the new and/or old record
+        """
+        new_row = payload.get('new') or payload.get('record') or {}
+        old_row = payload.get('old') or payload.get('old_record') or {}
+        for row in (old_row, new_row):
+            if row.get('id') is not None:
+                self.invalidate(row['id'])
+
+    def clear(self) -> None:
+        """Drop all cached trades."""
+        self._rows.clear()
+        for index in self._indexes.values():
+            index.clear()
+
+    def _remove(self, key: str) -> bool:
+        entry = self._rows.pop(key, None)
+        if entry is None:
+            return False
+        self._unindex(key, entry[1])
+        return True
+
+    def _index(self, key: str, row: Dict[str, Any]) -> None:
+        for column, index in self._indexes.items():
+            value = row.get(column)
+            if value not in (None, ''):
+                index[str(value)] = key
+
+    def _unindex(self, key: str, row: Dict[str, Any]) -> None:
+        for column, index in self._indexes.items():
+            value = row.get(column)
+            if value not in (None, '') and index.get(str(value)) == key:
+                del index[str(value)]
+
+
+_trade_cache: Optional[TradeCache] = None
+
+
+def get_trade_cache() -> TradeCache:
+    """Get the process-wide trade cache."""
+    global _trade_cache
+    if _trade_cache is None:
+        _trade_cache = TradeCache(max_size=database_config.trade_cache_size,
+                                  ttl=database_config.trade_cache_ttl,
+                                  enabled=database_config.enable_cache)
+    return _trade_cache
@@ -8,6 +8,9 @@ from src.database.models.trade_models import (
     Trade, Alert, TradeFilter, TradeUpdate, TradeStats, TradeSummary,
     TradeStatus, OrderStatus, PositionType
 )
+from src.database.models.trade_projections import (
+    TradeProjection, TradeRow, trade_columns, to_trade_rows
+)
 from src.database.models.user_models import (
     User, UserProfile, UserSession, UserActivity, UserFilter, UserUpdate, UserStats, UserSummary,
     UserRole, UserStatus
@@ -29,6 +32,10 @@ __all__ = [
     "TradeStatus",
     "OrderStatus",
     "PositionType",
+    "TradeProjection",
+    "TradeRow",
+    "trade_columns",
+    "to_trade_rows",
 
     # User models
     "User",
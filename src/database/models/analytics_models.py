@@ -26,6 +26,7 @@ class MetricType(Enum):
     DRAWDOWN = "DRAWDOWN"
     SHARPE_RATIO = "SHARPE_RATIO"
     MAX_DRAWDOWN = "MAX_DRAWDOWN"
+    ROLLUP = "ROLLUP"
 
 @dataclass
 class AnalyticsRecord:
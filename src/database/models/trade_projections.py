@@ -0,0 +1,118 @@
+"""
+Trade Column Projections
+
+Named column sets for reading the trades table. Most readers only need a
+few scalar columns, so selecting "*" pulls large JSON blobs
+(exchange_response, sync_order_response, parsed_signal, content) over the
+network for nothing. Rows returned through a projection are TradeRow
+objects, which keep blob columns raw and parse them only when asked.
+"""
+
+import json
+from enum import Enum
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+class TradeProjection(str, Enum):
+    """Column sets for common trade read paths."""
+    STATUS_CHECK = "status_check"
+    SYNC = "sync"
+    PNL = "pnl"
+    DISPLAY = "display"
+    FULL = "full"
+
+
+_STATUS_CHECK_COLUMNS: Tuple[str, ...] = (
+    'id', 'discord_id', 'trader', 'exchange', 'coin_symbol', 'signal_type',
+    'status', 'order_status', 'is_active', 'exchange_order_id', 'stop_loss_order_id',
+    'created_at', 'updated_at', 'closed_at',
+)
+
+PROJECTION_COLUMNS: Dict[TradeProjection, Tuple[str, ...]] = {
+    TradeProjection.STATUS_CHECK: _STATUS_CHECK_COLUMNS,
+    TradeProjection.SYNC: _STATUS_CHECK_COLUMNS + (
+        'timestamp', 'position_size', 'entry_price', 'exit_price', 'pnl_usd', 'net_pnl',
+        'exchange_response', 'sync_order_response', 'parsed_signal',
+    ),
+    TradeProjection.PNL: (
+        'id', 'exchange', 'coin_symbol', 'signal_type', 'status', 'exchange_order_id',
+        'position_size', 'entry_price', 'exit_price', 'pnl_usd', 'net_pnl',
+        'pnl_source', 'last_pnl_sync', 'created_at', 'updated_at', 'closed_at',
+    ),
+    TradeProjection.DISPLAY: (
+        'id', 'discord_id', 'trader', 'exchange', 'coin_symbol', 'signal_type',
+        'status', 'order_status', 'position_size', 'entry_price', 'exit_price',
+        'pnl_usd', 'net_pnl', 'created_at', 'closed_at',
+    ),
+}
+
+
+def trade_columns(projection: TradeProjection = TradeProjection.FULL, *extra: str) -> str:
+    """
+    Build the select() column string for a projection.
+
+    Args:
+        projection: Named column set
+        extra: Additional columns needed by a specific caller
+
+    Returns:
+        Comma-separated column list ("*" for FULL)
+    """
+    if projection == TradeProjection.FULL:
+        return "*"
+    columns = list(PROJECTION_COLUMNS[projection])
+    columns.extend(c for c in extra if c not in columns)
+    return ",".join(columns)
+
+
+class TradeRow(dict):
+    """
+    A trade row as returned by the database.
+
+    Behaves like the plain dict rows used everywhere else; JSON blob columns
+    stay as stored and are parsed (once) through ``json()``.
+    """
+
+    __slots__ = ('projection', '_parsed')
+
+    def __init__(self, data: Dict[str, Any], projection: TradeProjection = TradeProjection.FULL):
+        super().__init__(data)
+        self.projection = projection
+        self._parsed: Dict[str, Any] = {}
+
+    def json(self, column: str, default: Any = None) -> Any:
+        """
+        Return a JSON blob column parsed into Python objects.
+
+        Args:
+            column: Column name
+            default: Value returned when the column is empty or not valid JSON
+        """
+        if column in self._parsed:
+            return self._parsed[column]
+        raw = self.get(column)
+        if raw in (None, ''):
+            value = default
+        elif isinstance(raw, (dict, list)):
+            value = raw
+        else:
+            try:
+                value = json.loads(raw)
+            except (TypeError, ValueError):
+                value = default
+        self._parsed[column] = value
+        return value
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._parsed.pop(key, None)
+        super().__setitem__(key, value)
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        self._parsed.clear()
+        super().update(*args, **kwargs)
+
+
+def to_trade_rows(data: Optional[Iterable[Dict[str, Any]]],
+                  projection: TradeProjection = TradeProjection.FULL) -> List[TradeRow]:
+    """Wrap raw response rows as TradeRow objects."""
+    return [TradeRow(row, projection) for row in (data or [])]
@@ -12,7 +12,8 @@ from supabase import Client
 
 from src.database.core.database_manager import DatabaseManager
 from src.database.models.analytics_models import (
-    AnalyticsRecord, AnalyticsFilter, AnalyticsUpdate, ReportConfig, ReportData
+    AnalyticsRecord, AnalyticsFilter, AnalyticsUpdate, ReportConfig, ReportData,
+    AnalyticsType, MetricType
 )
 
 logger = logging.getLogger(__name__)
@@ -108,6 +109,83 @@ class AnalyticsRepository:
             logger.error(f"Failed to get analytics records by filter: {e}")
             raise
 
+    @staticmethod
+    def _rows(result: Any) -> List[Dict[str, Any]]:
+        """Rows of a query result (postgrest response or {"data": ...} dict)."""
+        if result is None:
+            return []
+        data = result.get("data") if isinstance(result, dict) else getattr(result, "data", None)
+        return data or []
+
+    async def get_rollup_records(self, trader: Optional[str] = None,
+                                 symbol: Optional[str] = None,
+                                 start_day: Optional[str] = None,
+                                 end_day: Optional[str] = None,
+                                 exclude_trader: Optional[str] = None,
+                                 columns: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Get daily rollup records for a trader/symbol scope, oldest day first."""
+        try:
+            filters: Dict[str, Any] = {
+                "analytics_type": AnalyticsType.DAILY.value,
+                "metric_type": MetricType.ROLLUP.value,
+            }
+            if trader is not None:
+                filters["trader"] = trader
+            if exclude_trader is not None:
+                filters["trader"] = {"neq": exclude_trader}
+            if symbol is not None:
+                filters["metadata->>symbol"] = symbol
+            period: Dict[str, Any] = {}
+            if start_day:
+                period["gte"] = start_day
+            if end_day:
+                period["lte"] = end_day
+            if period:
+                filters["period_start"] = period
+
+            result = await self.db_manager.select(
+                "analytics_records",
+                columns=columns,
+                filters=filters,
+                order_by="period_start"
+            )
+            return self._rows(result)
+
+        except Exception as e:
+            logger.error(f"Failed to get rollup records: {e}")
+            raise
+
+    async def save_rollup_record(self, record_data: Dict[str, Any],
+                                 record_id: Optional[int] = None,
+                                 expected_updated_at: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Insert a rollup record, or overwrite the one with record_id.
+
+        With expected_updated_at the overwrite only happens if the record was
+        not saved since; None is returned when another writer got there first.
+        """
+        try:
+            now = datetime.now(timezone.utc).isoformat()
+            if record_id is None:
+                result = await self.db_manager.insert("analytics_records", {
+                    **record_data, "created_at": now, "updated_at": now
+                })
+            else:
+                filters: Dict[str, Any] = {"id": record_id}
+                if expected_updated_at is not None:
+                    filters["updated_at"] = expected_updated_at
+                result = await self.db_manager.update(
+                    "analytics_records",
+                    {**record_data, "updated_at": now},
+                    filters=filters
+                )
+            rows = self._rows(result)
+            return rows[0] if rows else None
+
+        except Exception as e:
+            logger.error(f"Failed to save rollup record: {e}")
+            raise
+
     async def update_analytics_record(self, record_id: int, updates: AnalyticsUpdate) -> Optional[AnalyticsRecord]:
         """Update an analytics record."""
         try:
@@ -130,6 +130,25 @@ class TradeRepository:
         except Exception as e:
             logger.error(f"Failed to get trades by filter: {e}")
             raise
+
+    async def get_trades_by_traders_and_status(self, traders: List[str], status: str,
+                                               columns: Optional[List[str]] = None) -> List[Trade]:
+        """Get trades of several traders with a status in a single query."""
+        try:
+            clean_traders = [str(t).strip() for t in traders if str(t).strip()]
+            if not clean_traders:
+                return []
+
+            client = self.db_manager.client
+            query = client.table("trades").select(",".join(columns) if columns else "*")
+            query = query.in_("trader", clean_traders).eq("status", status)
+            result = query.execute()
+
+            return [Trade(**trade_dict) for trade_dict in (result.data or [])]
+
+        except Exception as e:
+            logger.error(f"Failed to get {status} trades for traders {traders}: {e}")
+            raise
     
     async def update_trade(self, trade_id: int, updates: TradeUpdate) -> Optional[Trade]:
         """Update a trade record."""
@@ -4,45 +4,80 @@ Exchange Module
 This module contains all exchange-related functionality.
 """
 
+import importlib
+from typing import Any, Dict, Tuple
+
 # Core exchange components
-from .core import ExchangeBase, ExchangeFactory, ExchangeConfig
-
-# Binance exchange implementation
-from .binance import (
-    BinanceExchange, BinanceOrder, BinancePosition,
-    BinanceBalance, BinanceTrade, BinanceIncome
-)
-
-# KuCoin exchange implementation
-from .kucoin import (
-    KucoinExchange, KucoinOrder, KucoinPosition,
-    KucoinBalance, KucoinTrade, KucoinIncome
-)
-
-# Transaction management
-from .transactions import (
-    Transaction, Order, Position, TransactionType,
-    OrderStatus, PositionStatus
-)
-
-# Fee management
-from .fees import FixedFeeCalculator
-
-# Legacy imports for backward compatibility
-from .binance import BinanceExchange as binance_exchange
-from .kucoin import KucoinExchange as kucoin_exchange
-from .fees import FixedFeeCalculator as fee_calculator
-
-# Register exchanges with factory
-from .core.exchange_factory import register_exchange
-register_exchange("binance", BinanceExchange)
-register_exchange("kucoin", KucoinExchange)
+from .core import ExchangeBase, ExchangeFactory, ExchangeConfig, SymbolRegistry, get_symbol_registry
+
+# Exchange implementations pull in their SDKs (python-binance, the KuCoin
+# Universal SDK), so they are imported on first attribute access
+_LAZY_ATTRS: Dict[str, Tuple[str, str]] = {
+    # Binance exchange implementation
+    'BinanceExchange': ('.binance', 'BinanceExchange'),
+    'BinanceOrder': ('.binance', 'BinanceOrder'),
+    'BinancePosition': ('.binance', 'BinancePosition'),
+    'BinanceBalance': ('.binance', 'BinanceBalance'),
+    'BinanceTrade': ('.binance', 'BinanceTrade'),
+    'BinanceIncome': ('.binance', 'BinanceIncome'),
+
+    # KuCoin exchange implementation
+    'KucoinExchange': ('.kucoin', 'KucoinExchange'),
+    'KucoinOrder': ('.kucoin', 'KucoinOrder'),
+    'KucoinPosition': ('.kucoin', 'KucoinPosition'),
+    'KucoinBalance': ('.kucoin', 'KucoinBalance'),
+    'KucoinTrade': ('.kucoin', 'KucoinTrade'),
+    'KucoinIncome': ('.kucoin', 'KucoinIncome'),
+
+    # Transaction management
+    'Transaction': ('.transactions', 'Transaction'),
+    'Order': ('.transactions', 'Order'),
+    'Position': ('.transactions', 'Position'),
+    'TransactionType': ('.transactions', 'TransactionType'),
+    'OrderStatus': ('.transactions', 'OrderStatus'),
+    'PositionStatus': ('.transactions', 'PositionStatus'),
+
+    # Fee management
+    'FixedFeeCalculator': ('.fees', 'FixedFeeCalculator'),
+
+    # Local exchange history warehouse
+    'ExchangeHistoryWarehouse': ('.history', 'ExchangeHistoryWarehouse'),
+    'ExchangeHistoryStore': ('.history', 'ExchangeHistoryStore'),
+    'HistoryDataset': ('.history', 'HistoryDataset'),
+    'get_history_warehouse': ('.history', 'get_history_warehouse'),
+
+    # Legacy imports for backward compatibility
+    'binance_exchange': ('.binance', 'BinanceExchange'),
+    'kucoin_exchange': ('.kucoin', 'KucoinExchange'),
+    'fee_calculator': ('.fees', 'FixedFeeCalculator'),
+}
+
+
+def __getattr__(name: str) -> Any:
+    target = _LAZY_ATTRS.get(name)
+    if target is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(target[0], __name__), target[1])
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRS))
+
+
+# Register exchanges with factory (classes are imported when first created)
+from .core.exchange_factory import register_lazy_exchange
+register_lazy_exchange("binance", "src.exchange.binance", "BinanceExchange")
+register_lazy_exchange("kucoin", "src.exchange.kucoin", "KucoinExchange")
 
 __all__ = [
     # Core
     'ExchangeBase',
     'ExchangeFactory',
     'ExchangeConfig',
+    'SymbolRegistry',
+    'get_symbol_registry',
 
     # Binance
     'BinanceExchange',
@@ -71,6 +106,12 @@ __all__ = [
     # Fees
     'FixedFeeCalculator',
 
+    # History
+    'ExchangeHistoryWarehouse',
+    'ExchangeHistoryStore',
+    'HistoryDataset',
+    'get_history_warehouse',
+
     # Legacy
     'binance_exchange',
     'kucoin_exchange',
@@ -0,0 +1,317 @@
+"""
+Binance Account State Mirror
+
+In-memory copy of the futures account (position amounts, wallet balances and
+open orders). It is loaded once from REST and then kept current from the user
+data stream (ACCOUNT_UPDATE, ORDER_TRADE_UPDATE, ACCOUNT_CONFIG_UPDATE), so
+BinanceExchange can answer order/balance reads and know which positions are
+open without weighted account calls.
+
+The stream does not carry mark-dependent values, so mirrored positions hold
+only the fields in MIRRORED_POSITION_FIELDS; mark price, unrealized PnL,
+liquidation price and notional are read from positionRisk when a caller
+asks for them.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Full REST reconciliation interval while the user data stream is connected
+RESYNC_INTERVAL = 300.0
+# Max age of the REST snapshot while the stream is down
+POLL_TTL = 5.0
+
+OPEN_ORDER_STATUSES = ('NEW', 'PARTIALLY_FILLED')
+
+# Position fields the user data stream keeps current
+MIRRORED_POSITION_FIELDS = ('symbol', 'positionAmt', 'entryPrice', 'leverage', 'marginType',
+                            'positionSide', 'isolatedWallet', 'updateTime')
+
+
+def format_position(position: Dict[str, Any]) -> Dict[str, Any]:
+    """Format a futures_account position the way get_futures_position_information returns it."""
+    return {
+        'symbol': position.get('symbol', ''),
+        'positionAmt': float(position.get('positionAmt', 0)),
+        'entryPrice': float(position.get('entryPrice', 0)),
+        'markPrice': float(position.get('markPrice', 0)),
+        'unRealizedProfit': float(position.get('unRealizedProfit', 0)),
+        'liquidationPrice': float(position.get('liquidationPrice', 0)),
+        'leverage': int(position.get('leverage', 1)),
+        'marginType': position.get('marginType', 'isolated'),
+        'isolatedMargin': float(position.get('isolatedMargin', 0)),
+        'isAutoAddMargin': position.get('isAutoAddMargin', False),
+        'positionSide': position.get('positionSide', 'BOTH'),
+        'notional': float(position.get('notional', 0)),
+        'isolatedWallet': float(position.get('isolatedWallet', 0)),
+        'updateTime': position.get('updateTime', 0)
+    }
+
+
+def mirror_position(position: Dict[str, Any]) -> Dict[str, Any]:
+    """Keep the stream-maintained fields of a formatted position."""
+    return {field: position[field] for field in MIRRORED_POSITION_FIELDS}
+
+
+def order_from_event(o: Dict[str, Any], event_time: int) -> Dict[str, Any]:
+    """Convert an ORDER_TRADE_UPDATE order payload to the REST open-order shape."""
+    return {
+        'orderId': o.get('i'),
+        'symbol': o.get('s'),
+        'status': o.get('X'),
+        'clientOrderId': o.get('c'),
+        'price': o.get('p'),
+        'avgPrice': o.get('ap'),
+        'origQty': o.get('q'),
+        'executedQty': o.get('z'),
+        'timeInForce': o.get('f'),
+        'type': o.get('o'),
+        'origType': o.get('ot', o.get('o')),
+        'reduceOnly': o.get('R', False),
+        'closePosition': o.get('cp', False),
+        'side': o.get('S'),
+        'positionSide': o.get('ps', 'BOTH'),
+        'stopPrice': o.get('sp'),
+        'workingType': o.get('wt'),
+        'updateTime': o.get('T', event_time)
+    }
+
+
+class BinanceAccountState:
+    """
+    Stream-fed mirror of the Binance futures account.
+
+    The mirror is fresh when it has been loaded, nothing invalidated it since
+    (a local order action while the stream is down, a listenKey expiry, a
+    reconnect), and the last REST snapshot is younger than RESYNC_INTERVAL
+    (stream connected) or POLL_TTL (stream down). Readers call ``is_fresh()`` and reload from REST otherwise.
+    """
+
+    def __init__(self, resync_interval: float = RESYNC_INTERVAL, poll_ttl: float = POLL_TTL):
+        self.resync_interval = resync_interval
+        self.poll_ttl = poll_ttl
+
+        self.positions: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self.open_orders: Dict[Any, Dict[str, Any]] = {}
+        self.balances: Dict[str, float] = {}
+        self.leverage: Dict[str, int] = {}
+
+        self.stream_connected = False
+        self.synced_at: Optional[float] = None
+        self.events_applied = 0
+        self._valid = False
+        self._syncing = False
+        self._buffered: List[Tuple[str, Dict[str, Any]]] = []
+        self.sync_lock = asyncio.Lock()
+        # Called with every streamed order update (REST open-order shape), even while syncing
+        self.order_listeners: List[Callable[[Dict[str, Any]], None]] = []
+
+    # Freshness
+
+    def is_fresh(self) -> bool:
+        """Whether reads can be served from memory."""
+        if not self._valid or self.synced_at is None:
+            return False
+        max_age = self.resync_interval if self.stream_connected else self.poll_ttl
+        return time.monotonic() - self.synced_at < max_age
+
+    def invalidate(self) -> None:
+        """Force the next read to reload from REST."""
+        self._valid = False
+
+    def note_local_write(self) -> None:
+        """
+        Record a local order, cancel or account change.
+
+        While the user data stream is connected it reports the change itself
+        (ORDER_TRADE_UPDATE, ACCOUNT_UPDATE, ACCOUNT_CONFIG_UPDATE), so only a
+        mirror without a stream is reloaded.
+        """
+        if not self.stream_connected:
+            self.invalidate()
+
+    def begin_sync(self) -> None:
+        """Start buffering stream events while a REST snapshot is being fetched."""
+        self._syncing = True
+        self._buffered = []
+
+    def abort_sync(self) -> None:
+        """Drop the buffered events after a failed snapshot fetch."""
+        self._syncing = False
+        self._buffered = []
+
+    def load_snapshot(self, account_info: Dict[str, Any], open_orders: List[Dict[str, Any]]) -> None:
+        """
+        Replace the mirror with a REST snapshot and replay events received meanwhile.
+
+        Args:
+            account_info: futures_account response
+            open_orders: futures_get_open_orders response
+        """
+        positions = {}
+        leverage = {}
+        for position in account_info.get('positions', []):
+            symbol = position.get('symbol', '')
+            if position.get('leverage') is not None:
+                leverage[symbol] = int(position.get('leverage', 1))
+            if float(position.get('positionAmt', 0)) != 0:
+                formatted = mirror_position(format_position(position))
+                positions[(symbol, formatted['positionSide'])] = formatted
+
+        self.positions = positions
+        self.leverage = leverage
+        self.balances = {
+            asset_info.get('asset', ''): float(asset_info.get('walletBalance', 0))
+            for asset_info in account_info.get('assets', [])
+        }
+        self.open_orders = {order.get('orderId'): dict(order) for order in open_orders}
+        self.synced_at = time.monotonic()
+        self._valid = True
+
+        buffered, self._buffered = self._buffered, []
+        self._syncing = False
+        for event_type, data in buffered:
+            self.apply_event(event_type, data)
+
+        logger.info(f"Binance account state loaded: {len(self.positions)} positions, {len(self.open_orders)} open orders")
+
+    # Reads
+
+    def get_positions(self) -> List[Dict[str, Any]]:
+        """Open positions with the MIRRORED_POSITION_FIELDS only."""
+        return [dict(position) for position in self.positions.values()]
+
+    def position_details(self, symbol: str, position_side: str) -> Dict[str, Any]:
+        """Leverage and margin type of a position, which positionRisk v3 no longer reports."""
+        position = self.positions.get((symbol, position_side)) or {}
+        return {'leverage': self.leverage.get(symbol, position.get('leverage', 1)),
+                'marginType': position.get('marginType', 'isolated')}
+
+    def get_open_orders(self) -> List[Dict[str, Any]]:
+        return [dict(order) for order in self.open_orders.values()]
+
+    def get_balances(self) -> Dict[str, float]:
+        return {asset: balance for asset, balance in self.balances.items() if balance > 0}
+
+    # Stream events
+
+    def apply_event(self, event_type: str, data: Dict[str, Any]) -> None:
+        """
+        Apply one user data stream event.
+
+        Args:
+            event_type: Binance event type ('e')
+            data: Event payload
+        """
+        if event_type == 'listenKeyExpired':
+            logger.warning("Binance listenKey expired, account state will resync")
+            self.stream_connected = False
+            self.invalidate()
+            return
+
+        if event_type == 'ORDER_TRADE_UPDATE':
+            self._notify_order_listeners(data)
+
+        if self._syncing:
+            self._buffered.append((event_type, data))
+            return
+
+        try:
+            if event_type == 'ACCOUNT_UPDATE':
+                self._apply_account_update(data)
+            elif event_type == 'ORDER_TRADE_UPDATE':
+                self._apply_order_update(data)
+            elif event_type == 'ACCOUNT_CONFIG_UPDATE':
+                self._apply_config_update(data)
+            else:
+                return
+            self.events_applied += 1
+        except Exception as e:
+            logger.error(f"Error applying {event_type} to account state: {e}")
+            self.invalidate()
+
+    def _notify_order_listeners(self, data: Dict[str, Any]) -> None:
+        o = data.get('o') or {}
+        if not self.order_listeners or o.get('i') is None:
+            return
+        order = order_from_event(o, data.get('E', 0))
+        for listener in self.order_listeners:
+            try:
+                listener(order)
+            except Exception as e:
+                logger.error(f"Order listener failed for order {order.get('orderId')}: {e}")
+
+    def set_stream_connected(self, connected: bool) -> None:
+        """Record a user data stream (re)connect or disconnect; either way events may have been missed."""
+        self.stream_connected = connected
+        self.invalidate()
+
+    def _apply_account_update(self, data: Dict[str, Any]) -> None:
+        update = data.get('a', {})
+        event_time = data.get('E', 0)
+
+        for balance in update.get('B', []):
+            self.balances[balance.get('a', '')] = float(balance.get('wb', 0))
+
+        for p in update.get('P', []):
+            symbol = p.get('s', '')
+            position_side = p.get('ps', 'BOTH')
+            key = (symbol, position_side)
+            amount = float(p.get('pa', 0))
+            if amount == 0:
+                self.positions.pop(key, None)
+                continue
+
+            position = self.positions.get(key) or mirror_position(format_position({
+                'symbol': symbol,
+                'positionSide': position_side,
+                'leverage': self.leverage.get(symbol, 1),
+            }))
+            position.update({
+                'positionAmt': amount,
+                'entryPrice': float(p.get('ep', 0)),
+                'marginType': p.get('mt', position['marginType']),
+                'isolatedWallet': float(p.get('iw', 0)),
+                'updateTime': event_time
+            })
+            self.positions[key] = position
+
+    def _apply_order_update(self, data: Dict[str, Any]) -> None:
+        o = data.get('o', {})
+        order_id = o.get('i')
+        if order_id is None:
+            return
+        if o.get('X') in OPEN_ORDER_STATUSES:
+            self.open_orders[order_id] = order_from_event(o, data.get('E', 0))
+        else:
+            self.open_orders.pop(order_id, None)
+
+    def _apply_config_update(self, data: Dict[str, Any]) -> None:
+        config = data.get('ac')
+        if not config:
+            return
+        symbol = config.get('s', '')
+        self.leverage[symbol] = int(config.get('l', 1))
+        for (position_symbol, _), position in self.positions.items():
+            if position_symbol == symbol:
+                position['leverage'] = self.leverage[symbol]
+
+    async def handle_event(self, event: Any) -> None:
+        """EventDispatcher handler: accepts a WebSocketEvent or raw payload."""
+        data = event.data if hasattr(event, 'data') else event
+        event_type = getattr(event, 'event_type', None) or data.get('e', '')
+        if event_type in ('connection', 'disconnection'):
+            if data.get('type', 'user_data') == 'user_data':
+                self.set_stream_connected(event_type == 'connection')
+        else:
+            self.apply_event(event_type, data)
+
+    def register_with(self, ws_manager: Any) -> None:
+        """Subscribe to the user data stream events of a WebSocketManager."""
+        for event_type in ('ACCOUNT_UPDATE', 'ORDER_TRADE_UPDATE', 'ACCOUNT_CONFIG_UPDATE',
+                           'listenKeyExpired', 'connection', 'disconnection'):
+            ws_manager.register_handler(event_type, self.handle_event)
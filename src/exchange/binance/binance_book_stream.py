@@ -0,0 +1,107 @@
+"""
+Binance Book Stream
+
+Feeds the local order book from Binance futures ``<symbol>@bookTicker`` and
+``<symbol>@depth5@100ms`` streams. The streams run on the market data
+connection of the bot's WebSocketManager and follow the symbols the order
+book service watches: when that set changes the open connection is sent
+SUBSCRIBE/UNSUBSCRIBE requests for the difference instead of reconnecting.
+"""
+
+import asyncio
+import logging
+from typing import Any, List, Optional, Set
+
+from ..core.order_book import OrderBookService, get_order_book_service
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SYNC_INTERVAL = 5.0
+
+
+def book_streams(symbols: Set[str]) -> List[str]:
+    """Stream names of the given futures symbols, sorted for a stable subscription."""
+    streams = []
+    for symbol in sorted(symbols):
+        streams.append(f"{symbol.lower()}@bookTicker")
+        streams.append(f"{symbol.lower()}@depth5@100ms")
+    return streams
+
+
+class BinanceBookStream:
+    """Keeps the market data streams of a WebSocketManager on the watched symbols."""
+
+    def __init__(self, service: Optional[OrderBookService] = None,
+                 sync_interval: float = DEFAULT_SYNC_INTERVAL):
+        """
+        Initialize the stream.
+
+        Args:
+            service: Order book service to feed (the process-wide one if None)
+            sync_interval: Seconds between checks of the watched symbols
+        """
+        self.service = service or get_order_book_service()
+        self.sync_interval = sync_interval
+        self.ws_manager: Any = None
+        self._subscribed: Set[str] = set()
+        self._task: Optional[asyncio.Task] = None
+
+    def register_with(self, ws_manager: Any) -> None:
+        """Subscribe to the bookTicker/depth events of a WebSocketManager."""
+        self.ws_manager = ws_manager
+        for event_type in ('bookTicker', 'depth'):
+            ws_manager.register_handler(event_type, self.handle_event)
+
+    def handle_event(self, event: Any) -> None:
+        self.service.apply_binance_event(event.data)
+
+    async def sync(self) -> bool:
+        """
+        Resubscribe if the watched symbols changed.
+
+        Returns:
+            bool: True if the subscription was changed
+        """
+        if self.ws_manager is None:
+            return False
+        symbols = self.service.watched('binance')
+        if symbols == self._subscribed:
+            return False
+        if not symbols:
+            await self.ws_manager.connection_manager.close_connection("market_data")
+        elif not await self.ws_manager.subscribe_market_streams(book_streams(symbols)):
+            logger.warning(f"Binance book stream subscription failed for {len(symbols)} symbols")
+            return False
+        self._subscribed = symbols
+        logger.info(f"Binance book stream following {len(symbols)} symbols")
+        return True
+
+    def start(self) -> asyncio.Task:
+        """Start following the watched symbols in the background."""
+        if self._task is not None and not self._task.done():
+            return self._task
+
+        async def _sync_loop():
+            while True:
+                try:
+                    await self.sync()
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.error(f"Binance book stream sync failed: {e}")
+                await asyncio.sleep(self.sync_interval)
+
+        self._task = asyncio.create_task(_sync_loop())
+        return self._task
+
+    async def stop(self) -> None:
+        """Stop following the watched symbols (the connection closes with its manager)."""
+        task, self._task = self._task, None
+        self._subscribed = set()
+        if task is None or task.done():
+            return
+        task.cancel()
+        try:
+            await task
+        except (asyncio.CancelledError, Exception):
+            pass
@@ -18,13 +18,36 @@ from binance.enums import SIDE_BUY, SIDE_SELL, ORDER_TYPE_MARKET, ORDER_TYPE_LIM
 from config import settings as cfg
 import aiohttp
 
+from src.core.metrics import time_exchange_request
+
 from ..core.exchange_base import ExchangeBase
 from ..core.exchange_config import ExchangeConfig, format_value
+from ..core.order_tracker import OrderTracker
+from ..core.symbol_registry import get_symbol_registry
+from ..core.order_book import get_order_book_service, maker_price
 from .binance_models import BinanceOrder, BinancePosition, BinanceBalance, BinanceTrade, BinanceIncome
+from .binance_account_state import BinanceAccountState, format_position
+from .binance_book_stream import BinanceBookStream
 
 
 logger = logging.getLogger(__name__)
 
+# Binance accepts at most 5 orders per batchOrders request
+MAX_BATCH_ORDERS = 5
+# Symbol filters change rarely; exchangeInfo is refetched after this many seconds
+FUTURES_FILTERS_TTL = 3600
+TRIGGER_ORDER_TYPES = ('STOP_MARKET', 'TAKE_PROFIT_MARKET', 'STOP', 'TAKE_PROFIT')
+# Conditional orders Binance only accepts through the Algo Order API (batchOrders rejects them with -4120)
+ALGO_ORDER_TYPES = ('STOP_MARKET', 'TAKE_PROFIT_MARKET')
+
+
+class TimedAsyncClient(AsyncClient):
+    """AsyncClient that records the latency of every REST call by endpoint."""
+
+    async def _request(self, method, uri: str, signed: bool, force_params: bool = False, **kwargs):
+        with time_exchange_request('binance', method, uri):
+            return await super()._request(method, uri, signed, force_params, **kwargs)
+
 
 class BinanceExchange(ExchangeBase):
     """
@@ -34,7 +57,8 @@ class BinanceExchange(ExchangeBase):
     Follows Clean Code principles with clear method names and single responsibilities.
     """
 
-    def __init__(self, api_key: str, api_secret: str, is_testnet: bool = False):
+    def __init__(self, api_key: str, api_secret: str, is_testnet: bool = False,
+                 futures_endpoint: Optional[str] = None):
         """
         Initialize Binance exchange.
 
@@ -42,13 +66,25 @@ class BinanceExchange(ExchangeBase):
             api_key: Binance API key
             api_secret: Binance API secret
             is_testnet: Whether to use testnet
+            futures_endpoint: Override for the futures REST endpoint (defaults to settings.BINANCE_FUTURES_ENDPOINT)
         """
         self.api_key = api_key
         self.api_secret = api_secret
         self.is_testnet = is_testnet
+        self.futures_endpoint = futures_endpoint or cfg.BINANCE_FUTURES_ENDPOINT
         self.client: Optional[AsyncClient] = None
         self._spot_symbols: List[str] = []
         self._futures_symbols: List[str] = []
+        self._futures_filters: Dict[str, Dict[str, Any]] = {}
+        self._futures_filters_loaded_at = 0.0
+        # Positions, balances and open orders, kept current by the user data stream
+        self.account_state = BinanceAccountState()
+        # wait_for_order resolves from the same stream's ORDER_TRADE_UPDATE events
+        self._order_tracker = OrderTracker(self.get_order_status,
+                                           stream_connected=lambda: self.account_state.stream_connected)
+        self.account_state.order_listeners.append(self._order_tracker.publish)
+        # Streams the local order book on the market data connection of the bot's WebSocketManager
+        self.book_stream = BinanceBookStream()
 
         logger.info(f"BinanceExchange initialized for testnet: {self.is_testnet}")
 
@@ -67,8 +103,13 @@ class BinanceExchange(ExchangeBase):
 
     async def _init_client(self):
         """Initialize the Binance client."""
-        if self.client is None:
-            self.client = await AsyncClient.create(
+        if self.client is None and self.futures_endpoint:
+            client = TimedAsyncClient(self.api_key, self.api_secret)
+            client.API_URL = f"{self.futures_endpoint}/api"
+            client.FUTURES_URL = f"{self.futures_endpoint}/fapi"
+            self.client = client
+        elif self.client is None:
+            self.client = await TimedAsyncClient.create(
                 self.api_key,
                 self.api_secret,
                 tld='com',
@@ -84,28 +125,45 @@ class BinanceExchange(ExchangeBase):
     # Account Operations
     async def get_account_balances(self) -> Dict[str, float]:
         """Get account balances for all assets."""
-        await self._init_client()
-        assert self.client is not None
+        if await self.sync_account_state():
+            return self.account_state.get_balances()
+        return {}
 
-        try:
-            # Get futures account information
-            account_info = await self.client.futures_account()
-            balances = {}
+    async def sync_account_state(self, force: bool = False) -> bool:
+        """
+        Make sure the account state mirror is fresh, reloading it from REST if needed.
 
-            # Extract balance information from account
-            for asset_info in account_info.get('assets', []):
-                asset = asset_info.get('asset', '')
-                wallet_balance = float(asset_info.get('walletBalance', 0))
+        Concurrent callers share one reload.
 
-                if wallet_balance > 0:
-                    balances[asset] = wallet_balance
+        Args:
+            force: Reload even if the mirror is fresh
 
-            logger.info(f"Retrieved Binance futures balances: {balances}")
-            return balances
+        Returns:
+            True if the mirror can be read, False if the reload failed
+        """
+        state = self.account_state
+        if not force and state.is_fresh():
+            return True
 
-        except Exception as e:
-            logger.error(f"Error getting futures account balances: {e}")
-            return {}
+        async with state.sync_lock:
+            if not force and state.is_fresh():
+                return True
+
+            await self._init_client()
+            assert self.client is not None
+
+            state.begin_sync()
+            try:
+                account_info, open_orders = await asyncio.gather(
+                    self.client.futures_account(),
+                    self.client.futures_get_open_orders()
+                )
+                state.load_snapshot(account_info, list(open_orders))
+                return True
+            except Exception as e:
+                state.abort_sync()
+                logger.error(f"Error syncing Binance account state: {e}")
+                return False
 
     async def get_futures_account_info(self) -> Dict[str, Any]:
         """Get comprehensive futures account information including leverage settings."""
@@ -155,6 +213,7 @@ class BinanceExchange(ExchangeBase):
             # Clamp leverage to Binance limits 1..125
             lev = max(1, min(int(leverage), 125))
             result = await self.client.futures_change_leverage(symbol=symbol, leverage=lev)
+            self.account_state.note_local_write()
             try:
                 logger.info(f"Set leverage result for {symbol}: {json.dumps(result)}")
             except Exception:
@@ -252,7 +311,7 @@ class BinanceExchange(ExchangeBase):
                 safe_price = price
                 try:
                     if order_type.upper() == 'LIMIT' and not reduce_only:
-                        depth = await self.client.futures_order_book(symbol=pair, limit=5)
+                        depth = await self.get_order_book(pair, limit=5)
                         bids = depth.get('bids') or [] if isinstance(depth, dict) else []
                         asks = depth.get('asks') or [] if isinstance(depth, dict) else []
                         best_bid = float(bids[0][0]) if bids else 0.0
@@ -276,20 +335,11 @@ class BinanceExchange(ExchangeBase):
                         tick_offset = int(getattr(cfg, 'BINANCE_MAKER_TICK_OFFSET', 3))
                         offset = tick_size * max(1, tick_offset)
 
-                        if side.upper() == 'BUY':
-                            # For maker: price MUST be below best_bid (not best_ask)
-                            # If price >= best_bid, it would take liquidity
-                            if best_bid > 0 and price >= best_bid:
-                                candidate = best_bid - offset
-                                safe_price = max(candidate, 0) if candidate > 0 else price - offset
-                                logger.info(f"BUY order adjusted: {price} -> {safe_price} (best_bid: {best_bid})")
-                        elif side.upper() == 'SELL':
-                            # For maker: price MUST be above best_ask (not best_bid)
-                            # If price <= best_ask, it would take liquidity
-                            if best_ask > 0 and price <= best_ask:
-                                candidate = best_ask + offset
-                                safe_price = candidate if candidate > 0 else price + offset
-                                logger.info(f"SELL order adjusted: {price} -> {safe_price} (best_ask: {best_ask})")
+                        # For maker: a BUY must rest below best_bid and a SELL above best_ask
+                        safe_price = maker_price(side, price, best_bid, best_ask, offset)
+                        if safe_price != price:
+                            logger.info(f"{side.upper()} order adjusted: {price} -> {safe_price} "
+                                        f"(best_bid: {best_bid}, best_ask: {best_ask})")
 
                         # Respect tick formatting when known
                         if filters and filters.get('PRICE_FILTER', {}).get('tickSize'):
@@ -332,6 +382,8 @@ class BinanceExchange(ExchangeBase):
 
             # Create the order
             result = await self.client.futures_create_order(**order_params)
+            # Positions/open orders changed; reloaded on the next read unless the stream reports it
+            self.account_state.note_local_write()
             try:
                 logger.info(f"Raw Binance order response: {json.dumps(result)}")
             except Exception:
@@ -346,10 +398,149 @@ class BinanceExchange(ExchangeBase):
             logger.error(error_msg)
             return {'error': error_msg, 'code': e.code}
         except Exception as e:
+            self.account_state.note_local_write()
             error_msg = f"Error creating futures order: {e}"
             logger.error(error_msg)
             return {'error': error_msg, 'code': -1}
 
+    async def create_futures_batch_orders(self, orders: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Create several futures orders in as few requests as possible.
+
+        STOP_MARKET and TAKE_PROFIT_MARKET legs go straight to the Algo Order
+        API, which is the only endpoint that accepts them. The other legs are
+        sent through batchOrders in groups of MAX_BATCH_ORDERS, one request per
+        group, with quantities and prices rounded from the cached symbol filters.
+
+        Args:
+            orders: Order dicts using the create_futures_order argument names
+                (pair, side, order_type, amount, price, stop_price,
+                client_order_id, reduce_only, close_position)
+
+        Returns:
+            One entry per input order, in order: the order response, or a dict
+            with 'error' and 'code' if that leg failed
+        """
+        await self._init_client()
+        assert self.client is not None
+
+        results: List[Dict[str, Any]] = [{} for _ in orders]
+        algo_indexes: List[int] = []
+        pending: List[Tuple[int, Dict[str, Any]]] = []
+
+        for index, order in enumerate(orders):
+            if str(order.get('order_type', '')).upper() in ALGO_ORDER_TYPES and not order.get('close_position'):
+                algo_indexes.append(index)
+                continue
+            params, error = await self._build_batch_order_params(order)
+            if error:
+                results[index] = error
+            else:
+                pending.append((index, params))
+
+        chunks = [pending[i:i + MAX_BATCH_ORDERS] for i in range(0, len(pending), MAX_BATCH_ORDERS)]
+        batch_responses, algo_results = await asyncio.gather(
+            asyncio.gather(*(self._place_batch_chunk([p for _, p in chunk]) for chunk in chunks)),
+            asyncio.gather(*(
+                self.create_algo_order(
+                    pair=orders[i]['pair'],
+                    side=str(orders[i]['side']).upper(),
+                    order_type=str(orders[i]['order_type']).upper(),
+                    quantity=float(orders[i]['amount']),
+                    stop_price=float(orders[i]['stop_price']),
+                    reduce_only=orders[i].get('reduce_only', False),
+                    client_order_id=orders[i].get('client_order_id')
+                )
+                for i in algo_indexes
+            ))
+        )
+        for chunk, chunk_results in zip(chunks, batch_responses):
+            for (index, _), result in zip(chunk, chunk_results):
+                results[index] = result
+        for index, result in zip(algo_indexes, algo_results):
+            results[index] = result
+
+        return results
+
+    async def _build_batch_order_params(self, order: Dict[str, Any]) -> Tuple[Optional[Dict[str, str]], Optional[Dict[str, Any]]]:
+        """Round and validate one batch leg; returns (params, None) or (None, error)."""
+        pair = order['pair']
+        order_type = str(order['order_type']).upper()
+        amount = float(order['amount'])
+        price = order.get('price')
+        stop_price = order.get('stop_price')
+
+        filters = await self.get_futures_symbol_filters(pair)
+        step_size = tick_size = None
+        if filters:
+            lot_size_filter = filters.get('LOT_SIZE', {})
+            step_size = lot_size_filter.get('stepSize')
+            tick_size = filters.get('PRICE_FILTER', {}).get('tickSize')
+            min_qty = float(lot_size_filter.get('minQty', 0))
+            max_qty = float(lot_size_filter.get('maxQty', float('inf')))
+            if amount < min_qty:
+                return None, {'error': f'Quantity {amount} below minimum {min_qty} for {pair}', 'code': -4005}
+            if amount > max_qty:
+                return None, {'error': f'Quantity {amount} above maximum {max_qty} for {pair}', 'code': -4006}
+
+        # batchOrders is sent as a JSON list, so every value is passed as a string
+        params = {
+            'symbol': pair,
+            'side': str(order['side']).upper(),
+            'type': order_type,
+            'quantity': format_value(amount, step_size) if step_size else str(amount),
+            'reduceOnly': 'true' if order.get('reduce_only') else 'false',
+        }
+        if order.get('close_position'):
+            params['closePosition'] = 'true'
+        if order_type == 'LIMIT' or order_type in TRIGGER_ORDER_TYPES:
+            params['timeInForce'] = 'GTC'
+        if price:
+            params['price'] = format_value(float(price), tick_size) if tick_size else str(price)
+        if stop_price:
+            params['stopPrice'] = format_value(float(stop_price), tick_size) if tick_size else str(stop_price)
+            if order_type in TRIGGER_ORDER_TYPES:
+                params['workingType'] = 'MARK_PRICE'
+        if order.get('client_order_id'):
+            params['newClientOrderId'] = str(order['client_order_id'])
+        return params, None
+
+    async def _place_batch_chunk(self, batch: List[Dict[str, str]]) -> List[Dict[str, Any]]:
+        """Send one batchOrders request and map each leg to its response or error."""
+        assert self.client is not None
+
+        try:
+            response = await self.client.futures_place_batch_order(batchOrders=batch)
+            self.account_state.note_local_write()
+            try:
+                logger.info(f"Raw Binance batch order response: {json.dumps(response)}")
+            except Exception:
+                logger.info(f"Raw Binance batch order response (non-JSON-serializable): {response}")
+        except BinanceAPIException as e:
+            error_msg = f"Binance API error creating batch orders: {e.message}"
+            logger.error(error_msg)
+            return [{'error': error_msg, 'code': e.code} for _ in batch]
+        except Exception as e:
+            self.account_state.note_local_write()
+            error_msg = f"Error creating batch orders: {e}"
+            logger.error(error_msg)
+            return [{'error': error_msg, 'code': -1} for _ in batch]
+
+        if not isinstance(response, list) or len(response) != len(batch):
+            return [{'error': f"Unexpected batch order response: {response}", 'code': -1} for _ in batch]
+
+        results = []
+        for params, result in zip(batch, response):
+            if isinstance(result, dict) and 'orderId' in result:
+                logger.info(f"Futures order created successfully: {result.get('orderId')}")
+                results.append(result)
+            else:
+                msg = result.get('msg', result) if isinstance(result, dict) else result
+                code = result.get('code', -1) if isinstance(result, dict) else -1
+                logger.error(f"Batch leg {params['symbol']} {params['type']} rejected: {msg}")
+                results.append({'error': f"Binance API error creating futures order: {msg}", 'code': code})
+        return results
+
     async def create_algo_order(
         self,
         pair: str,
@@ -417,7 +608,7 @@ class BinanceExchange(ExchangeBase):
             if client_order_id:
                 algo_params['newClientOrderId'] = client_order_id
 
-            base_url = 'https://testnet.binancefuture.com' if self.is_testnet else 'https://fapi.binance.com'
+            base_url = self.futures_endpoint or ('https://testnet.binancefuture.com' if self.is_testnet else 'https://fapi.binance.com')
             endpoint = '/fapi/v1/algoOrder'
             url = f"{base_url}{endpoint}"
 
@@ -438,27 +629,30 @@ class BinanceExchange(ExchangeBase):
 
             payload = f"{query_string}&signature={signature}"
 
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    url,
-                    headers=headers,
-                    data=payload,
-                    timeout=aiohttp.ClientTimeout(total=30),
-                ) as resp:
-                    if resp.status != 200:
-                        error_text = await resp.text()
-                        try:
-                            error_data = await resp.json()
-                            error_msg = error_data.get('msg', error_text)
-                            error_code = error_data.get('code', -1)
-                        except Exception:
-                            error_msg = error_text
-                            error_code = -1
-
-                        logger.error(f"Binance algo order HTTP {resp.status}: {error_msg}")
-                        return {'error': f'HTTP {resp.status}: {error_msg}', 'code': error_code}
-
-                    result = await resp.json()
+            with time_exchange_request('binance', 'POST', endpoint):
+                async with aiohttp.ClientSession() as session:
+                    async with session.post(
+                        url,
+                        headers=headers,
+                        data=payload,
+                        timeout=aiohttp.ClientTimeout(total=30),
+                    ) as resp:
+                        if resp.status != 200:
+                            error_text = await resp.text()
+                            try:
+                                error_data = await resp.json()
+                                error_msg = error_data.get('msg', error_text)
+                                error_code = error_data.get('code', -1)
+                            except Exception:
+                                error_msg = error_text
+                                error_code = -1
+
+                            logger.error(f"Binance algo order HTTP {resp.status}: {error_msg}")
+                            return {'error': f'HTTP {resp.status}: {error_msg}', 'code': error_code}
+
+                        result = await resp.json()
+            # Open orders changed; reloaded on the next read unless the stream reports it
+            self.account_state.note_local_write()
 
             try:
                 logger.info(f"Raw Binance algo order response: {json.dumps(result)}")
@@ -487,6 +681,7 @@ class BinanceExchange(ExchangeBase):
 
         try:
             result = await self.client.futures_cancel_order(symbol=pair, orderId=order_id)
+            self.account_state.note_local_write()
             try:
                 logger.info(f"Raw Binance cancel response: {json.dumps(result)}")
             except Exception:
@@ -520,47 +715,50 @@ class BinanceExchange(ExchangeBase):
             return None
 
     # Position Operations
-    async def get_futures_position_information(self) -> List[Dict[str, Any]]:
-        """Get all futures positions with comprehensive information."""
-        await self._init_client()
-        assert self.client is not None
+    async def get_futures_position_information(self, include_risk: bool = False,
+                                               symbol: str = "") -> List[Dict[str, Any]]:
+        """Get open futures positions.
 
-        try:
-            # Get comprehensive account information which includes positions with leverage
-            account_info = await self.client.futures_account()
-            positions = account_info.get('positions', [])
-
-            # Filter out positions with zero size and format the data
-            active_positions = []
-            for position in positions:
-                position_amt = float(position.get('positionAmt', 0))
-                if position_amt != 0:  # Only include active positions
-                    # Ensure all required fields are present with proper types
-                    formatted_position = {
-                        'symbol': position.get('symbol', ''),
-                        'positionAmt': position_amt,
-                        'entryPrice': float(position.get('entryPrice', 0)),
-                        'markPrice': float(position.get('markPrice', 0)),
-                        'unRealizedProfit': float(position.get('unRealizedProfit', 0)),
-                        'liquidationPrice': float(position.get('liquidationPrice', 0)),
-                        'leverage': int(position.get('leverage', 1)),
-                        'marginType': position.get('marginType', 'isolated'),
-                        'isolatedMargin': float(position.get('isolatedMargin', 0)),
-                        'isAutoAddMargin': position.get('isAutoAddMargin', False),
-                        'positionSide': position.get('positionSide', 'BOTH'),
-                        'notional': float(position.get('notional', 0)),
-                        'isolatedWallet': float(position.get('isolatedWallet', 0)),
-                        'updateTime': position.get('updateTime', 0)
-                    }
-                    active_positions.append(formatted_position)
+        Amount, entry price, side, leverage and margin type come from the
+        account state mirror without a request. Mark price, unrealized PnL,
+        liquidation price and notional are not kept current by the user data
+        stream; pass ``include_risk`` to read them from positionRisk.
+
+        Args:
+            include_risk: Also fetch the mark-dependent fields from positionRisk
+            symbol: Only return positions for this symbol
 
-            logger.info(f"Retrieved {len(active_positions)} active positions from Binance")
-            return active_positions
+        Returns:
+            Formatted positions with a non-zero amount
+        """
+        if not await self.sync_account_state():
+            return []
+        mirrored = [position for position in self.account_state.get_positions()
+                    if not symbol or position['symbol'] == symbol]
+        if not mirrored or not include_risk:
+            logger.info(f"Retrieved {len(mirrored)} active positions from Binance")
+            return [format_position(position) for position in mirrored]
 
+        assert self.client is not None
+        try:
+            if symbol:
+                position_risk = await self.client.futures_position_information(symbol=symbol)
+            else:
+                position_risk = await self.client.futures_position_information()
         except Exception as e:
             logger.error(f"Error getting futures positions: {e}")
             return []
 
+        active_positions = []
+        for position in position_risk:
+            if float(position.get('positionAmt', 0)) == 0:
+                continue
+            details = self.account_state.position_details(position.get('symbol', ''),
+                                                          position.get('positionSide', 'BOTH'))
+            active_positions.append(format_position({**details, **position}))
+        logger.info(f"Retrieved {len(active_positions)} active positions from Binance")
+        return active_positions
+
     async def close_position(self, pair: str, amount: float,
                            position_type: str) -> Tuple[bool, Dict[str, Any]]:
         """Close a futures position."""
@@ -599,7 +797,11 @@ class BinanceExchange(ExchangeBase):
             return {}
 
     async def get_order_book(self, symbol: str, limit: int = 5) -> Optional[Dict[str, Any]]:
-        """Get order book for a symbol."""
+        """Get order book for a symbol (the streamed local book while it is fresh)."""
+        depth = get_order_book_service().depth('binance', symbol, limit)
+        if depth is not None:
+            return depth
+
         await self._init_client()
         assert self.client is not None
 
@@ -612,21 +814,23 @@ class BinanceExchange(ExchangeBase):
 
     # Symbol Information
     async def get_futures_symbol_filters(self, symbol: str) -> Optional[Dict[str, Any]]:
-        """Get symbol filters for futures trading."""
+        """Get symbol filters for futures trading (cached from exchangeInfo)."""
         await self._init_client()
         assert self.client is not None
 
         try:
-            exchange_info = await self.client.futures_exchange_info()
-
-            for symbol_info in exchange_info['symbols']:
-                if symbol_info['symbol'] == symbol:
-                    filters = {}
-                    for filter_info in symbol_info['filters']:
-                        filters[filter_info['filterType']] = filter_info
-                    return filters
+            if not self._futures_filters or time.time() - self._futures_filters_loaded_at > FUTURES_FILTERS_TTL:
+                exchange_info = await self.client.futures_exchange_info()
+                self._futures_filters = {
+                    symbol_info['symbol']: {
+                        filter_info['filterType']: filter_info for filter_info in symbol_info['filters']
+                    }
+                    for symbol_info in exchange_info['symbols']
+                }
+                self._futures_filters_loaded_at = time.time()
+                get_symbol_registry().load_binance(exchange_info['symbols'])
 
-            return None
+            return self._futures_filters.get(symbol)
         except Exception as e:
             logger.error(f"Error getting futures symbol filters: {e}")
             return None
@@ -661,8 +865,8 @@ class BinanceExchange(ExchangeBase):
     # Trade History
     async def get_user_trades(self, symbol: str = "", limit: int = 1000,
                             from_id: int = 0, start_time: int = 0,
-                            end_time: int = 0) -> List[Dict[str, Any]]:
-        """Get user trade history."""
+                            end_time: int = 0, raise_errors: bool = False) -> List[Dict[str, Any]]:
+        """Get user trade history (raising on errors if ``raise_errors``, else returning [])."""
         await self._init_client()
         assert self.client is not None
 
@@ -681,12 +885,14 @@ class BinanceExchange(ExchangeBase):
             return list(result)
         except Exception as e:
             logger.error(f"Error getting user trades: {e}")
+            if raise_errors:
+                raise
             return []
 
     async def get_income_history(self, symbol: str = "", income_type: str = "",
                                start_time: int = 0, end_time: int = 0,
-                               limit: int = 1000) -> List[Dict[str, Any]]:
-        """Get income history (fees, funding, etc.)."""
+                               limit: int = 1000, raise_errors: bool = False) -> List[Dict[str, Any]]:
+        """Get income history (fees, funding, etc.), raising on errors if ``raise_errors``."""
         await self._init_client()
         assert self.client is not None
 
@@ -705,19 +911,18 @@ class BinanceExchange(ExchangeBase):
             return list(result)
         except Exception as e:
             logger.error(f"Error getting income history: {e}")
+            if raise_errors:
+                raise
             return []
 
     # Additional methods for backward compatibility
     async def get_position_risk(self, symbol: str = "") -> List[Dict[str, Any]]:
-        """Get position risk information (alias for get_futures_position_information)."""
-        return await self.get_futures_position_information()
+        """Get positions with mark price and unrealized PnL from positionRisk."""
+        return await self.get_futures_position_information(include_risk=True, symbol=symbol)
 
-    async def get_positions(self, symbol: str = "") -> List[Dict[str, Any]]:
+    async def get_positions(self, symbol: str = "", include_risk: bool = False) -> List[Dict[str, Any]]:
         """Get positions for a specific symbol or all positions."""
-        positions = await self.get_futures_position_information()
-        if symbol:
-            return [pos for pos in positions if pos.get('symbol') == symbol]
-        return positions
+        return await self.get_futures_position_information(include_risk=include_risk, symbol=symbol)
 
     async def get_futures_mark_price(self, symbol: str) -> Optional[float]:
         """Get futures mark price for a symbol."""
@@ -733,15 +938,10 @@ class BinanceExchange(ExchangeBase):
 
     async def get_all_open_futures_orders(self) -> List[Dict[str, Any]]:
         """Get all open futures orders."""
-        await self._init_client()
-        assert self.client is not None
-
-        try:
-            result = await self.client.futures_get_open_orders()
-            return list(result)
-        except Exception as e:
-            logger.error(f"Error getting open futures orders: {e}")
+        if not await self.sync_account_state():
             return []
+        return self.account_state.get_open_orders()
+
     async def get_exchange_info(self) -> Optional[Dict[str, Any]]:
         """Get exchange information including symbol details."""
         await self._init_client()
@@ -749,6 +949,8 @@ class BinanceExchange(ExchangeBase):
 
         try:
             result = await self.client.futures_exchange_info()
+            if result:
+                get_symbol_registry().load_binance(result.get('symbols', []))
             return result
         except Exception as e:
             logger.error(f"Error getting exchange info: {e}")
@@ -7,9 +7,18 @@ This module contains the base exchange interface and factory.
 from .exchange_base import ExchangeBase
 from .exchange_factory import ExchangeFactory
 from .exchange_config import ExchangeConfig
+from .symbol_registry import SymbolInfo, SymbolRegistry, get_symbol_registry
+from .order_book import OrderBookService, TopOfBook, get_order_book_service, maker_price
 
 __all__ = [
     'ExchangeBase',
     'ExchangeFactory',
-    'ExchangeConfig'
+    'ExchangeConfig',
+    'SymbolInfo',
+    'SymbolRegistry',
+    'get_symbol_registry',
+    'OrderBookService',
+    'TopOfBook',
+    'get_order_book_service',
+    'maker_price'
 ]
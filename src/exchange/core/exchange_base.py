@@ -6,9 +6,11 @@ Following Clean Code principles with clear, single-purpose methods.
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Dict, Iterable, List, Optional, Tuple, Any
 from decimal import Decimal
 
+from .order_tracker import FINAL_ORDER_STATES, OrderTracker
+
 
 class ExchangeBase(ABC):
     """
@@ -111,6 +113,35 @@ class ExchangeBase(ABC):
         """
         pass
 
+    @property
+    def order_tracker(self) -> OrderTracker:
+        """Tracker behind wait_for_order; exchanges with an order stream publish into it."""
+        tracker = getattr(self, '_order_tracker', None)
+        if tracker is None:
+            tracker = OrderTracker(self.get_order_status)
+            self._order_tracker = tracker
+        return tracker
+
+    async def wait_for_order(self, pair: str, order_id: str,
+                             states: Iterable[str] = FINAL_ORDER_STATES,
+                             timeout: float = 5.0) -> Optional[Dict[str, Any]]:
+        """
+        Wait until an order reaches one of the given states.
+
+        Resolves from streamed order events when the exchange has them and
+        otherwise polls get_order_status with an adaptive back-off.
+
+        Args:
+            pair: Trading pair symbol
+            order_id: Order ID
+            states: Order statuses to wait for (case-insensitive)
+            timeout: Maximum seconds to wait
+
+        Returns:
+            The order once it is in one of the states, else the last known order or None
+        """
+        return await self.order_tracker.wait_for_order(pair, order_id, states, timeout)
+
     @abstractmethod
     async def get_all_open_futures_orders(self) -> List[Dict[str, Any]]:
         """
@@ -123,10 +154,14 @@ class ExchangeBase(ABC):
 
     # Position Operations
     @abstractmethod
-    async def get_futures_position_information(self) -> List[Dict[str, Any]]:
+    async def get_futures_position_information(self, include_risk: bool = False) -> List[Dict[str, Any]]:
         """
         Get all futures positions.
 
+        Args:
+            include_risk: Include mark price and unrealized PnL where the
+                exchange reports them separately from the position
+
         Returns:
             List of position information dictionaries
         """
@@ -207,7 +242,7 @@ class ExchangeBase(ABC):
     @abstractmethod
     async def get_user_trades(self, symbol: str = "", limit: int = 1000,
                             from_id: int = 0, start_time: int = 0,
-                            end_time: int = 0) -> List[Dict[str, Any]]:
+                            end_time: int = 0, raise_errors: bool = False) -> List[Dict[str, Any]]:
         """
         Get user trade history.
 
@@ -217,6 +252,7 @@ class ExchangeBase(ABC):
             from_id: Start from trade ID
             start_time: Start time in milliseconds
             end_time: End time in milliseconds
+            raise_errors: Raise on a failed read instead of returning []
 
         Returns:
             List of trade history records
@@ -226,7 +262,7 @@ class ExchangeBase(ABC):
     @abstractmethod
     async def get_income_history(self, symbol: str = "", income_type: str = "",
                                start_time: int = 0, end_time: int = 0,
-                               limit: int = 1000) -> List[Dict[str, Any]]:
+                               limit: int = 1000, raise_errors: bool = False) -> List[Dict[str, Any]]:
         """
         Get income history (fees, funding, etc.).
 
@@ -236,6 +272,7 @@ class ExchangeBase(ABC):
             start_time: Start time in milliseconds
             end_time: End time in milliseconds
             limit: Maximum number of records
+            raise_errors: Raise on a failed read instead of returning []
 
         Returns:
             List of income history records
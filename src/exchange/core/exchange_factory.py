@@ -5,7 +5,8 @@ Factory for creating exchange instances.
 Following Clean Code principles with clear factory pattern.
 """
 
-from typing import Dict, Type
+from typing import Dict, Optional, Tuple, Type
+import importlib
 import logging
 from .exchange_base import ExchangeBase
 from .exchange_config import ExchangeConfig
@@ -24,6 +25,7 @@ class ExchangeFactory:
     def __init__(self):
         """Initialize the exchange factory."""
         self._exchanges: Dict[str, Type[ExchangeBase]] = {}
+        self._lazy_exchanges: Dict[str, Tuple[str, str]] = {}
 
     def register_exchange(self, name: str, exchange_class: Type[ExchangeBase]) -> None:
         """
@@ -39,6 +41,27 @@ class ExchangeFactory:
         self._exchanges[name.lower()] = exchange_class
         logger.info(f"Registered exchange: {name}")
 
+    def register_lazy_exchange(self, name: str, module_path: str, class_name: str) -> None:
+        """
+        Register an exchange class by import path.
+
+        The module is only imported when the exchange is first created, so
+        registering does not load the exchange SDK.
+
+        Args:
+            name: Exchange name identifier
+            module_path: Absolute module path containing the class
+            class_name: Exchange class name
+        """
+        self._lazy_exchanges[name.lower()] = (module_path, class_name)
+
+    def _resolve_exchange(self, exchange_name: str) -> Optional[Type[ExchangeBase]]:
+        target = self._lazy_exchanges.pop(exchange_name, None)
+        if target is not None:
+            module_path, class_name = target
+            self.register_exchange(exchange_name, getattr(importlib.import_module(module_path), class_name))
+        return self._exchanges.get(exchange_name)
+
     def create_exchange(self, name: str, config: ExchangeConfig) -> ExchangeBase:
         """
         Create an exchange instance.
@@ -55,11 +78,11 @@ class ExchangeFactory:
         """
         exchange_name = name.lower()
 
-        if exchange_name not in self._exchanges:
-            available = list(self._exchanges.keys())
+        exchange_class = self._resolve_exchange(exchange_name)
+        if exchange_class is None:
+            available = self.get_available_exchanges()
             raise ValueError(f"Exchange '{name}' not found. Available: {available}")
 
-        exchange_class = self._exchanges[exchange_name]
         exchange = exchange_class(config.api_key, config.api_secret, config.is_testnet)
 
         logger.info(f"Created exchange instance: {name}")
@@ -72,7 +95,7 @@ class ExchangeFactory:
         Returns:
             List of registered exchange names
         """
-        return list(self._exchanges.keys())
+        return list(self._exchanges.keys()) + list(self._lazy_exchanges.keys())
 
     def is_exchange_available(self, name: str) -> bool:
         """
@@ -84,7 +107,7 @@ class ExchangeFactory:
         Returns:
             True if exchange is available, False otherwise
         """
-        return name.lower() in self._exchanges
+        return name.lower() in self._exchanges or name.lower() in self._lazy_exchanges
 
 
 # Global factory instance
@@ -112,6 +135,18 @@ def register_exchange(name: str, exchange_class: Type[ExchangeBase]) -> None:
     _exchange_factory.register_exchange(name, exchange_class)
 
 
+def register_lazy_exchange(name: str, module_path: str, class_name: str) -> None:
+    """
+    Register an exchange by import path with the global factory.
+
+    Args:
+        name: Exchange name identifier
+        module_path: Absolute module path containing the class
+        class_name: Exchange class name
+    """
+    _exchange_factory.register_lazy_exchange(name, module_path, class_name)
+
+
 def create_exchange(name: str, config: ExchangeConfig) -> ExchangeBase:
     """
     Create an exchange using the global factory.
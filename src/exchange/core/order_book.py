@@ -0,0 +1,273 @@
+"""
+Local Order Book
+
+Top-of-book (and the first few levels) of the symbols the bot is trading,
+kept current from the exchanges' websocket depth streams (Binance
+``@bookTicker`` / ``@depth5@100ms``, KuCoin ``/contractMarket/level2Depth5``).
+Maker-price adjustment, order book liquidity checks and price range
+decisions read the local book instead of downloading the depth over REST
+for every order; callers fall back to REST when the book is missing or
+older than ``max_age`` (e.g. while a stream reconnects).
+
+Which symbols are streamed is decided by watches: trades that are pending
+or open pin their symbol for as long as they are active, and every lookup
+keeps its symbol watched for ``watch_ttl`` seconds so that a symbol that was
+just traded is streamed for its follow-up orders.
+"""
+
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_AGE = 2.0
+DEFAULT_WATCH_TTL = 600.0
+BOOK_LEVELS = 5
+
+Level = Tuple[float, float]
+
+
+def _levels(raw: Iterable[Any], limit: int = BOOK_LEVELS) -> Tuple[Level, ...]:
+    levels = []
+    for entry in raw or ():
+        try:
+            price, qty = float(entry[0]), float(entry[1])
+        except (TypeError, ValueError, IndexError):
+            continue
+        if price > 0 and qty > 0:
+            levels.append((price, qty))
+        if len(levels) >= limit:
+            break
+    return tuple(levels)
+
+
+def maker_price(side: str, price: float, best_bid: float, best_ask: float, offset: float) -> float:
+    """
+    Move a limit price behind the touch so the order rests as a maker.
+
+    A BUY at or above the best bid is moved `offset` below it and a SELL at
+    or below the best ask `offset` above it; prices that already rest are
+    returned unchanged.
+
+    Args:
+        side: BUY or SELL
+        price: Requested limit price
+        best_bid: Best bid (0 if unknown)
+        best_ask: Best ask (0 if unknown)
+        offset: Distance from the touch (tick size times tick offset)
+
+    Returns:
+        float: Price to submit
+    """
+    side = side.upper()
+    if side == 'BUY' and best_bid > 0 and price >= best_bid:
+        candidate = best_bid - offset
+        return candidate if candidate > 0 else price - offset
+    if side == 'SELL' and best_ask > 0 and price <= best_ask:
+        return best_ask + offset
+    return price
+
+
+@dataclass(slots=True)
+class TopOfBook:
+    """Best levels of one symbol as last streamed."""
+    bids: Tuple[Level, ...]
+    asks: Tuple[Level, ...]
+    updated_at: float
+
+    @property
+    def best_bid(self) -> float:
+        return self.bids[0][0] if self.bids else 0.0
+
+    @property
+    def best_ask(self) -> float:
+        return self.asks[0][0] if self.asks else 0.0
+
+    @property
+    def mid(self) -> float:
+        if self.best_bid and self.best_ask:
+            return (self.best_bid + self.best_ask) / 2
+        return self.best_bid or self.best_ask
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.updated_at
+
+    def as_depth(self, limit: int = BOOK_LEVELS) -> Dict[str, List[List[float]]]:
+        """The book in the bids/asks shape of the REST depth endpoints."""
+        return {'bids': [list(level) for level in self.bids[:limit]],
+                'asks': [list(level) for level in self.asks[:limit]]}
+
+
+class OrderBookService:
+    """Streamed top-of-book per (exchange, symbol)."""
+
+    def __init__(self, max_age: float = DEFAULT_MAX_AGE, watch_ttl: float = DEFAULT_WATCH_TTL):
+        """
+        Initialize the service.
+
+        Args:
+            max_age: Seconds a book is served after its last update
+            watch_ttl: Seconds a looked-up symbol stays watched
+        """
+        self.max_age = max_age
+        self.watch_ttl = watch_ttl
+        self._books: Dict[Tuple[str, str], TopOfBook] = {}
+        # (exchange, symbol) -> last lookup
+        self._recent: Dict[Tuple[str, str], float] = {}
+        # owner (e.g. a trade id) -> (exchange, symbol)
+        self._pinned: Dict[str, Tuple[str, str]] = {}
+        self.stats = {'updates': 0, 'hits': 0, 'misses': 0, 'stale': 0}
+
+    @staticmethod
+    def _key(exchange: str, symbol: str) -> Tuple[str, str]:
+        return exchange.lower(), symbol.upper()
+
+    # Updates
+
+    def update(self, exchange: str, symbol: str, bids: Iterable[Any], asks: Iterable[Any]) -> None:
+        """Replace the book of a symbol with a depth snapshot (price, qty pairs, best first)."""
+        self._books[self._key(exchange, symbol)] = TopOfBook(_levels(bids), _levels(asks), time.monotonic())
+        self.stats['updates'] += 1
+
+    def update_top(self, exchange: str, symbol: str, bid: Any, bid_qty: Any, ask: Any, ask_qty: Any) -> None:
+        """Apply a best bid/ask update, keeping the deeper levels it does not cross."""
+        top_bid, top_ask = _levels([(bid, bid_qty)]), _levels([(ask, ask_qty)])
+        key = self._key(exchange, symbol)
+        book = self._books.get(key)
+        bids, asks = top_bid, top_ask
+        if book is not None and top_bid and top_ask:
+            bids = top_bid + tuple(level for level in book.bids if level[0] < top_bid[0][0])
+            asks = top_ask + tuple(level for level in book.asks if level[0] > top_ask[0][0])
+        self._books[key] = TopOfBook(bids[:BOOK_LEVELS], asks[:BOOK_LEVELS], time.monotonic())
+        self.stats['updates'] += 1
+
+    def apply_binance_event(self, data: Dict[str, Any]) -> bool:
+        """
+        Apply a Binance futures bookTicker or partial depth frame.
+
+        Args:
+            data: Decoded frame, raw or wrapped in a combined stream envelope
+
+        Returns:
+            bool: True if the frame updated a book
+        """
+        if 'stream' in data and isinstance(data.get('data'), dict):
+            data = data['data']
+        symbol = data.get('s')
+        if not symbol:
+            return False
+        event = data.get('e')
+        if event == 'bookTicker':
+            self.update_top('binance', symbol, data.get('b'), data.get('B'), data.get('a'), data.get('A'))
+            return True
+        if event == 'depthUpdate':
+            self.update('binance', symbol, data.get('b') or [], data.get('a') or [])
+            return True
+        return False
+
+    def apply_kucoin_message(self, message: Dict[str, Any]) -> bool:
+        """
+        Apply a KuCoin futures level2Depth5/level2Depth50 message.
+
+        Args:
+            message: Decoded websocket message
+
+        Returns:
+            bool: True if the message updated a book
+        """
+        topic = str(message.get('topic') or '')
+        if message.get('type') != 'message' or not topic.startswith('/contractMarket/level2Depth'):
+            return False
+        data = message.get('data') or {}
+        symbol = topic.partition(':')[2]
+        if not symbol:
+            return False
+        self.update('kucoin', symbol, data.get('bids') or [], data.get('asks') or [])
+        return True
+
+    def clear(self, exchange: Optional[str] = None) -> None:
+        """Drop the books of one exchange (or all), e.g. after its stream disconnected."""
+        if exchange is None:
+            self._books.clear()
+            return
+        for key in [k for k in self._books if k[0] == exchange.lower()]:
+            del self._books[key]
+
+    # Lookups
+
+    def get(self, exchange: str, symbol: str, max_age: Optional[float] = None) -> Optional[TopOfBook]:
+        """
+        Fresh book of a symbol, or None (the symbol is watched from now on).
+
+        Args:
+            exchange: binance or kucoin
+            symbol: Exchange symbol (BTCUSDT, XBTUSDTM)
+            max_age: Override of the service's max_age
+
+        Returns:
+            Optional[TopOfBook]: The book if both sides are known and it is fresh
+        """
+        key = self._key(exchange, symbol)
+        self._recent[key] = time.monotonic()
+        book = self._books.get(key)
+        if book is None or not book.bids or not book.asks:
+            self.stats['misses'] += 1
+            return None
+        if book.age > (self.max_age if max_age is None else max_age):
+            self.stats['stale'] += 1
+            return None
+        self.stats['hits'] += 1
+        return book
+
+    def depth(self, exchange: str, symbol: str, limit: int = BOOK_LEVELS,
+              max_age: Optional[float] = None) -> Optional[Dict[str, List[List[float]]]]:
+        """Fresh book in the shape of a REST depth response, or None."""
+        book = self.get(exchange, symbol, max_age)
+        return book.as_depth(limit) if book is not None else None
+
+    # Watches
+
+    def watch(self, exchange: str, symbol: str, owner: Optional[str] = None) -> None:
+        """
+        Stream a symbol.
+
+        Args:
+            exchange: binance or kucoin
+            symbol: Exchange symbol
+            owner: Keeps the symbol watched until unwatch(owner); without an
+                owner it is watched for watch_ttl seconds
+        """
+        key = self._key(exchange, symbol)
+        if owner is None:
+            self._recent[key] = time.monotonic()
+        else:
+            self._pinned[str(owner)] = key
+
+    def unwatch(self, owner: str) -> None:
+        """Release the watch of an owner."""
+        self._pinned.pop(str(owner), None)
+
+    def watched(self, exchange: str) -> Set[str]:
+        """Symbols of an exchange that should be streamed."""
+        exchange = exchange.lower()
+        cutoff = time.monotonic() - self.watch_ttl
+        for key in [k for k, t in self._recent.items() if t < cutoff]:
+            del self._recent[key]
+        symbols = {s for e, s in self._recent if e == exchange}
+        symbols.update(s for e, s in self._pinned.values() if e == exchange)
+        return symbols
+
+
+_service: Optional[OrderBookService] = None
+
+
+def get_order_book_service() -> OrderBookService:
+    """Return the process-wide order book service."""
+    global _service
+    if _service is None:
+        from config import settings as cfg
+        _service = OrderBookService(max_age=cfg.ORDER_BOOK_MAX_AGE)
+    return _service
@@ -0,0 +1,168 @@
+"""
+Order Tracker
+
+Lets callers await an order reaching a given status instead of sleeping a
+fixed time after placement. Order updates pushed by a websocket stream
+resolve waiters immediately; without a stream (or as a safety net when an
+event is missed) the tracker polls the exchange with an adaptive back-off
+that starts at 50ms and doubles up to 800ms.
+"""
+
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+MIN_POLL_DELAY = 0.05
+MAX_POLL_DELAY = 0.8
+# While the stream is connected, the first poll only happens after this long
+STREAM_POLL_GRACE = 1.0
+# Last known state is kept for this many orders
+MAX_TRACKED_ORDERS = 500
+
+# Statuses after which an order no longer changes (Binance and KuCoin spellings)
+FINAL_ORDER_STATES = ('FILLED', 'CANCELED', 'CANCELLED', 'EXPIRED', 'REJECTED', 'EXPIRED_IN_MATCH', 'DONE')
+
+OrderFetcher = Callable[[str, str], Awaitable[Optional[Dict[str, Any]]]]
+
+
+def order_status(order: Optional[Dict[str, Any]]) -> str:
+    """Upper-cased status of an order dict ('' if unknown)."""
+    if not order:
+        return ''
+    return str(order.get('status') or order.get('X') or '').upper()
+
+
+def backoff_delays(min_delay: float = MIN_POLL_DELAY, max_delay: float = MAX_POLL_DELAY) -> Iterator[float]:
+    """Endless doubling delays from min_delay, capped at max_delay."""
+    delay = min_delay
+    while True:
+        yield delay
+        delay = min(delay * 2, max_delay)
+
+
+class OrderTracker:
+    """Awaitable order states fed by stream events and adaptive polling."""
+
+    def __init__(self, fetch_order: OrderFetcher,
+                 stream_connected: Optional[Callable[[], bool]] = None,
+                 min_delay: float = MIN_POLL_DELAY,
+                 max_delay: float = MAX_POLL_DELAY,
+                 stream_grace: float = STREAM_POLL_GRACE):
+        """
+        Initialize the tracker.
+
+        Args:
+            fetch_order: Coroutine (pair, order_id) -> order dict, e.g. exchange.get_order_status
+            stream_connected: Whether order events are currently being pushed
+            min_delay: First poll delay in seconds
+            max_delay: Maximum poll delay in seconds
+            stream_grace: Delay before the first poll while the stream is connected
+        """
+        self.fetch_order = fetch_order
+        self.stream_connected = stream_connected or (lambda: False)
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.stream_grace = stream_grace
+        self._orders: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._waiters: Dict[str, List[Tuple[frozenset, asyncio.Future]]] = {}
+        self.stats = {'stream_resolved': 0, 'poll_resolved': 0, 'polls': 0, 'timeouts': 0}
+
+    def publish(self, order: Dict[str, Any], order_id: Optional[Any] = None) -> None:
+        """
+        Record an order update and wake waiters whose state it satisfies.
+
+        Args:
+            order: Order dict with at least a status ('status' or 'X')
+            order_id: Order ID (read from 'orderId' / 'i' when omitted)
+        """
+        key = str(order_id if order_id is not None else order.get('orderId', order.get('i', '')))
+        if not key:
+            return
+        self._orders[key] = order
+        self._orders.move_to_end(key)
+        while len(self._orders) > MAX_TRACKED_ORDERS:
+            self._orders.popitem(last=False)
+
+        status = order_status(order)
+        for wanted, future in self._waiters.get(key, []):
+            if status in wanted and not future.done():
+                future.set_result(order)
+
+    def last_known(self, order_id: Any) -> Optional[Dict[str, Any]]:
+        return self._orders.get(str(order_id))
+
+    async def _poll(self, pair: str, key: str) -> None:
+        self.stats['polls'] += 1
+        try:
+            order = await self.fetch_order(pair, key)
+        except Exception as e:
+            logger.warning(f"Order status poll failed for {key}: {e}")
+            return
+        if order:
+            self.publish(order, key)
+
+    async def wait_for_order(self, pair: str, order_id: Any,
+                             states: Iterable[str] = FINAL_ORDER_STATES,
+                             timeout: float = 5.0) -> Optional[Dict[str, Any]]:
+        """
+        Wait until an order reaches one of the given states.
+
+        Args:
+            pair: Trading pair (needed by the exchange's order lookup)
+            order_id: Exchange order ID
+            states: Statuses to wait for (case-insensitive)
+            timeout: Maximum seconds to wait
+
+        Returns:
+            Optional[Dict[str, Any]]: The order in a wanted state, or the last known
+            order (possibly None) if the timeout expired first
+        """
+        key = str(order_id)
+        wanted = frozenset(s.upper() for s in states)
+        known = self._orders.get(key)
+        if order_status(known) in wanted:
+            return known
+
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future = loop.create_future()
+        waiter = (wanted, future)
+        self._waiters.setdefault(key, []).append(waiter)
+        deadline = loop.time() + timeout
+        delays = backoff_delays(self.min_delay, self.max_delay)
+        first_wait = self.stream_grace if self.stream_connected() else next(delays)
+
+        try:
+            wait = first_wait
+            while True:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    order = await asyncio.wait_for(asyncio.shield(future), min(wait, remaining))
+                    self.stats['stream_resolved'] += 1
+                    return order
+                except asyncio.TimeoutError:
+                    pass
+                if deadline - loop.time() <= 0:
+                    break
+                await self._poll(pair, key)
+                if future.done():
+                    self.stats['poll_resolved'] += 1
+                    return future.result()
+                wait = self.max_delay if self.stream_connected() else next(delays)
+        finally:
+            waiters = self._waiters.get(key, [])
+            if waiter in waiters:
+                waiters.remove(waiter)
+            if not waiters:
+                self._waiters.pop(key, None)
+            if not future.done():
+                future.cancel()
+
+        self.stats['timeouts'] += 1
+        if key not in self._orders:
+            await self._poll(pair, key)
+        return self._orders.get(key)
@@ -0,0 +1,287 @@
+"""
+Symbol Registry
+
+One cross-exchange symbol table built from the Binance futures exchange
+info and the KuCoin active contracts list. Every spelling the bot meets
+(coin "PEPE", bot pair "PEPEUSDT", Binance "1000PEPEUSDT", KuCoin
+"PEPEUSDTM" / "PEPE-USDT", "XBTUSDTM" for BTC) is resolved once when the
+lists are loaded, so lookups are a single dict access instead of string
+heuristics repeated by every caller.
+
+The tables are filled from responses the exchanges already download
+(Binance symbol filters, KuCoin contract lists); `refresh` loads both
+explicitly. Until a list has been loaded, lookups for that exchange
+return None and callers keep their previous heuristics.
+"""
+
+import logging
+import re
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+QUOTE_ASSET = 'USDT'
+# Quantity prefixes used for low-priced coins (1000PEPE, 1MBABYDOGE)
+_PREFIX_RE = re.compile(r'^(1000000|100000|10000|1000|100|1M)(?=[A-Z])')
+_PREFIX_MULTIPLIERS = {'1000000': 1000000, '100000': 100000, '10000': 10000, '1000': 1000, '100': 100, '1M': 1000000}
+# Exchange codes that differ from the coin the bot trades
+_BASE_ALIASES = {'XBT': 'BTC'}
+_WORD_RE = re.compile(r'[A-Za-z0-9]{2,15}')
+# Signal vocabulary that can collide with coin tickers
+NON_COIN_WORDS = frozenset({
+    'BE', 'TP', 'SL', 'PNL', 'ENTRY', 'STOPS', 'MOVED', 'CLOSED', 'LONG', 'SHORT',
+    'IN', 'TO', 'AT', 'ON', 'OF', 'FOR', 'WITH',
+})
+# Listed tickers that are also everyday words ("Move SL to BE", "NOT yet", "the one")
+AMBIGUOUS_COIN_WORDS = frozenset({'ACT', 'ME', 'MOVE', 'NOT', 'ONE', 'THE'})
+
+
+def split_prefix(base: str) -> Tuple[str, int]:
+    """Split a quantity prefix off a base asset: '1000PEPE' -> ('PEPE', 1000)."""
+    base = base.upper()
+    match = _PREFIX_RE.match(base)
+    if not match:
+        return _BASE_ALIASES.get(base, base), 1
+    coin = base[match.end():]
+    return _BASE_ALIASES.get(coin, coin), _PREFIX_MULTIPLIERS[match.group(1)]
+
+
+@dataclass(frozen=True)
+class SymbolInfo:
+    """Resolved names of one coin on every exchange."""
+    coin: str
+    binance_symbol: Optional[str] = None
+    binance_base: Optional[str] = None
+    binance_multiplier: int = 1
+    kucoin_symbol: Optional[str] = None
+    kucoin_base: Optional[str] = None
+    kucoin_multiplier: int = 1
+    kucoin_contract_size: float = 0.0
+
+    @property
+    def bot_symbol(self) -> str:
+        """Pair in the bot's own format (COINUSDT)."""
+        return f"{self.coin}{QUOTE_ASSET}"
+
+
+class SymbolRegistry:
+    """Precomputed bot symbol <-> Binance pair <-> KuCoin contract tables."""
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._binance: Dict[str, Dict[str, Any]] = {}
+        self._kucoin: Dict[str, Dict[str, Any]] = {}
+        self._entries: Dict[str, SymbolInfo] = {}
+        self._aliases: Dict[str, SymbolInfo] = {}
+        self.loaded_at: Dict[str, float] = {}
+
+    # Loading
+
+    def load_binance(self, symbols: Iterable[Dict[str, Any]]) -> int:
+        """
+        Load the `symbols` list of the Binance futures exchange info.
+
+        Returns:
+            int: Number of USDT perpetuals loaded
+        """
+        table: Dict[str, Dict[str, Any]] = {}
+        for info in symbols or []:
+            if info.get('quoteAsset') != QUOTE_ASSET or info.get('status', 'TRADING') != 'TRADING':
+                continue
+            if info.get('contractType', 'PERPETUAL') != 'PERPETUAL':
+                continue
+            base = str(info.get('baseAsset') or info['symbol'][:-len(QUOTE_ASSET)]).upper()
+            coin, multiplier = split_prefix(base)
+            table[coin] = {'symbol': info['symbol'], 'base': base, 'multiplier': multiplier}
+        if table:
+            self._binance = table
+            self.loaded_at['binance'] = time.time()
+            self._rebuild()
+        return len(table)
+
+    def load_kucoin(self, contracts: Iterable[Dict[str, Any]]) -> int:
+        """
+        Load the KuCoin /api/v1/contracts/active list.
+
+        Returns:
+            int: Number of open USDT-margined contracts loaded
+        """
+        table: Dict[str, Dict[str, Any]] = {}
+        for contract in contracts or []:
+            symbol = contract.get('symbol')
+            if not symbol or contract.get('status', 'Open') != 'Open' or contract.get('quoteCurrency', QUOTE_ASSET) != QUOTE_ASSET:
+                continue
+            if not symbol.endswith(f"{QUOTE_ASSET}M"):
+                continue
+            base = str(contract.get('baseCurrency') or symbol[:-len(QUOTE_ASSET) - 1]).upper()
+            coin, multiplier = split_prefix(base)
+            try:
+                contract_size = float(contract.get('multiplier') or 0.0)
+            except (TypeError, ValueError):
+                contract_size = 0.0
+            table[coin] = {'symbol': symbol, 'base': base, 'multiplier': multiplier, 'contract_size': contract_size}
+        if table:
+            self._kucoin = table
+            self.loaded_at['kucoin'] = time.time()
+            self._rebuild()
+        return len(table)
+
+    def _rebuild(self) -> None:
+        entries: Dict[str, SymbolInfo] = {}
+        for coin in set(self._binance) | set(self._kucoin):
+            binance = self._binance.get(coin, {})
+            kucoin = self._kucoin.get(coin, {})
+            entries[coin] = SymbolInfo(
+                coin=coin,
+                binance_symbol=binance.get('symbol'),
+                binance_base=binance.get('base'),
+                binance_multiplier=binance.get('multiplier', 1),
+                kucoin_symbol=kucoin.get('symbol'),
+                kucoin_base=kucoin.get('base'),
+                kucoin_multiplier=kucoin.get('multiplier', 1),
+                kucoin_contract_size=kucoin.get('contract_size', 0.0),
+            )
+
+        # Exact exchange symbols are added last so they win over derived spellings
+        aliases: Dict[str, SymbolInfo] = {}
+        for info in entries.values():
+            for base in {info.coin, info.binance_base, info.kucoin_base} - {None}:
+                for spelling in (base, f"{base}{QUOTE_ASSET}", f"{base}-{QUOTE_ASSET}",
+                                 f"{base}/{QUOTE_ASSET}", f"{base}{QUOTE_ASSET}M"):
+                    aliases.setdefault(spelling, info)
+        for info in entries.values():
+            aliases[info.coin] = info
+            aliases[info.bot_symbol] = info
+            for symbol in (info.binance_symbol, info.kucoin_symbol):
+                if symbol:
+                    aliases[symbol] = info
+
+        self._entries = entries
+        self._aliases = aliases
+
+    async def refresh(self, binance_exchange: Any = None, kucoin_exchange: Any = None,
+                      max_age: float = 0.0) -> None:
+        """
+        Reload the symbol lists from the given exchanges.
+
+        Args:
+            binance_exchange: BinanceExchange instance (optional)
+            kucoin_exchange: KucoinExchange instance (optional)
+            max_age: Skip exchanges loaded less than this many seconds ago
+        """
+        now = time.time()
+        if binance_exchange is not None and now - self.loaded_at.get('binance', 0.0) >= max_age:
+            try:
+                exchange_info = await binance_exchange.get_exchange_info()
+                self.load_binance((exchange_info or {}).get('symbols', []))
+            except Exception as e:
+                logger.error(f"Failed to load Binance symbols into the registry: {e}")
+        if kucoin_exchange is not None and now - self.loaded_at.get('kucoin', 0.0) >= max_age:
+            try:
+                await kucoin_exchange.mark_prices.futures_symbols()
+            except Exception as e:
+                logger.error(f"Failed to load KuCoin contracts into the registry: {e}")
+        logger.info(f"Symbol registry: {len(self._binance)} Binance, {len(self._kucoin)} KuCoin contracts")
+
+    # Lookups
+
+    def is_loaded(self, exchange: Optional[str] = None) -> bool:
+        """True once the given exchange's list (or any list) has been loaded."""
+        if exchange is None:
+            return bool(self.loaded_at)
+        return exchange.lower() in self.loaded_at
+
+    def resolve(self, symbol: str) -> Optional[SymbolInfo]:
+        """Resolve any coin or pair spelling to its SymbolInfo."""
+        if not symbol:
+            return None
+        return self._aliases.get(symbol.strip().upper())
+
+    def coin(self, symbol: str) -> Optional[str]:
+        """Canonical coin of a symbol ('1000PEPEUSDT' -> 'PEPE', 'XBTUSDTM' -> 'BTC')."""
+        info = self.resolve(symbol)
+        return info.coin if info else None
+
+    def binance_symbol(self, symbol: str) -> Optional[str]:
+        """Binance futures pair for a symbol, or None if Binance does not list it."""
+        info = self.resolve(symbol)
+        return info.binance_symbol if info else None
+
+    def kucoin_symbol(self, symbol: str) -> Optional[str]:
+        """KuCoin futures contract for a symbol, or None if KuCoin does not list it."""
+        info = self.resolve(symbol)
+        return info.kucoin_symbol if info else None
+
+    def is_listed(self, symbol: str, exchange: str) -> bool:
+        """True if the exchange lists a futures contract for the symbol."""
+        if exchange.lower() == 'binance':
+            return self.binance_symbol(symbol) is not None
+        if exchange.lower() == 'kucoin':
+            return self.kucoin_symbol(symbol) is not None
+        return False
+
+    def coins(self) -> List[str]:
+        """All coins listed on at least one exchange."""
+        return sorted(self._entries)
+
+    def find_coin(self, text: str, patterns: Iterable[str] = (),
+                  ignore: Optional[Set[str]] = None) -> Optional[str]:
+        """
+        Coin named by a text.
+
+        Words captured by the caller's positional patterns are tried first,
+        then words written in upper case, then the remaining words; the first
+        listed base asset wins. Tickers that are also everyday words
+        (AMBIGUOUS_COIN_WORDS) only count when a pattern captured them in
+        upper case and the text names no other coin.
+
+        Args:
+            text: Free text such as a signal or alert
+            patterns: Regexes whose first group captures the coin (matched case-insensitively)
+            ignore: Upper-case words never treated as coins (e.g. 'TP', 'SL')
+
+        Returns:
+            The canonical coin ('1000PEPE' -> 'PEPE'), or None
+        """
+        if not text:
+            return None
+        candidates: List[Tuple[str, bool]] = []
+        for pattern in patterns:
+            match = re.search(pattern, text, re.IGNORECASE)
+            if match:
+                candidates.append((match.group(1), True))
+        words = _WORD_RE.findall(text)
+        candidates.extend((word, False) for word in words if word.isupper())
+        candidates.extend((word, False) for word in words if not word.isupper())
+
+        fallback = None
+        for word, positional in candidates:
+            token = word.upper()
+            if ignore and token in ignore:
+                continue
+            info = self._aliases.get(token)
+            if not info or token not in (info.coin, info.binance_base, info.kucoin_base):
+                continue
+            if token not in AMBIGUOUS_COIN_WORDS:
+                return info.coin
+            if fallback is None and positional and word.isupper():
+                fallback = info.coin
+        return fallback
+
+    def stats(self) -> Dict[str, int]:
+        """Registry sizes."""
+        return {'coins': len(self._entries), 'aliases': len(self._aliases),
+                'binance': len(self._binance), 'kucoin': len(self._kucoin)}
+
+
+_registry: Optional[SymbolRegistry] = None
+
+
+def get_symbol_registry() -> SymbolRegistry:
+    """Return the process-wide symbol registry."""
+    global _registry
+    if _registry is None:
+        _registry = SymbolRegistry()
+    return _registry
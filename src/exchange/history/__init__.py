@@ -0,0 +1,26 @@
+"""
+Exchange History Module
+
+Local, append-only warehouse of exchange history shared by the backfill
+and reconciliation jobs.
+"""
+
+from .history_models import HistoryDataset, HistoryRecord
+from .history_store import ExchangeHistoryStore
+from .history_fetcher import ExchangeHistoryFetcher
+from .history_warehouse import ExchangeHistoryWarehouse, get_history_warehouse
+from .sync_checkpoints import SyncCheckpointStore, get_sync_checkpoints
+from .transaction_ingestion import RequestWeightLimiter, TransactionIngestionService
+
+__all__ = [
+    'HistoryDataset',
+    'HistoryRecord',
+    'ExchangeHistoryStore',
+    'ExchangeHistoryFetcher',
+    'ExchangeHistoryWarehouse',
+    'get_history_warehouse',
+    'SyncCheckpointStore',
+    'get_sync_checkpoints',
+    'RequestWeightLimiter',
+    'TransactionIngestionService'
+]
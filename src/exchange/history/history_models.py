@@ -0,0 +1,162 @@
+"""
+Exchange History Models
+
+Dataset identifiers and record helpers shared by the history store,
+fetcher and warehouse.
+"""
+
+import hashlib
+import json
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class HistoryDataset(str, Enum):
+    """Kinds of exchange history kept in the local warehouse."""
+    USER_TRADES = "user_trades"
+    INCOME = "income"
+    POSITION_HISTORY = "position_history"
+    LEDGER = "ledger"
+
+
+# Field names carrying the event time, in order of preference, per dataset
+_TIME_FIELDS: Dict[HistoryDataset, Tuple[str, ...]] = {
+    HistoryDataset.USER_TRADES: ('time', 'createdAt', 'tradeTime'),
+    HistoryDataset.INCOME: ('time', 'createdAt', 'timePoint'),
+    HistoryDataset.POSITION_HISTORY: ('closeTime', 'updatedAt', 'openTime', 'time'),
+    HistoryDataset.LEDGER: ('createdAt', 'time'),
+}
+
+# Field names carrying a stable exchange-side identifier, per dataset
+_ID_FIELDS: Dict[HistoryDataset, Tuple[str, ...]] = {
+    HistoryDataset.USER_TRADES: ('id', 'tradeId'),
+    HistoryDataset.INCOME: ('tranId', 'id'),
+    HistoryDataset.POSITION_HISTORY: ('closeId', 'id'),
+    HistoryDataset.LEDGER: ('id',),
+}
+
+# Field names carrying the record sub-type (income type, ledger bizType, side)
+_TYPE_FIELDS: Dict[HistoryDataset, Tuple[str, ...]] = {
+    HistoryDataset.USER_TRADES: ('side',),
+    HistoryDataset.INCOME: ('incomeType', 'type'),
+    HistoryDataset.POSITION_HISTORY: ('type', 'side'),
+    HistoryDataset.LEDGER: ('bizType',),
+}
+
+
+@dataclass
+class HistoryRecord:
+    """A single exchange history record as persisted in the warehouse."""
+    exchange: str
+    dataset: HistoryDataset
+    symbol: str
+    record_id: str
+    time_ms: int
+    record_type: str
+    payload: Dict[str, Any]
+
+    @property
+    def day(self) -> str:
+        """UTC day partition (YYYY-MM-DD) of the record."""
+        return datetime.fromtimestamp(self.time_ms / 1000, tz=timezone.utc).strftime('%Y-%m-%d')
+
+
+def _first(record: Dict[str, Any], fields: Tuple[str, ...]) -> Any:
+    for field in fields:
+        value = record.get(field)
+        if value not in (None, ''):
+            return value
+    return None
+
+
+def record_time_ms(dataset: HistoryDataset, record: Dict[str, Any]) -> int:
+    """Extract the event time of a raw exchange record in milliseconds (0 if unknown)."""
+    value = _first(record, _TIME_FIELDS[dataset])
+    try:
+        ts = int(float(value or 0))
+    except (TypeError, ValueError):
+        return 0
+    # Normalize second- and nanosecond-resolution timestamps
+    if 0 < ts < 1_000_000_000_000:
+        ts *= 1000
+    elif ts > 1_000_000_000_000_000:
+        ts //= 1_000_000
+    return ts
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    return str(value)
+
+
+def to_json_safe(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Return a JSON-serializable copy of a raw record (SDK enums become values, objects strings)."""
+    return json.loads(json.dumps(record, default=_json_default))
+
+
+def build_history_record(exchange: str, dataset: HistoryDataset, record: Dict[str, Any],
+                         symbol: str = "") -> Optional[HistoryRecord]:
+    """
+    Build a HistoryRecord from a raw exchange record.
+
+    Records without a usable timestamp are rejected because they cannot be
+    placed in a time partition or matched to a trade lifecycle.
+    """
+    if not isinstance(record, dict):
+        return None
+
+    time_ms = record_time_ms(dataset, record)
+    if not time_ms:
+        return None
+
+    payload = to_json_safe(record)
+    payload.pop('raw_response', None)
+
+    record_id = _first(record, _ID_FIELDS[dataset])
+    if record_id is None:
+        # No exchange id: fall back to a content hash so re-fetches stay idempotent
+        encoded = json.dumps(payload, sort_keys=True).encode('utf-8')
+        record_id = hashlib.sha256(encoded).hexdigest()[:32]
+
+    return HistoryRecord(
+        exchange=exchange.lower(),
+        dataset=dataset,
+        symbol=str(record.get('symbol') or symbol or '').upper(),
+        record_id=str(record_id),
+        time_ms=time_ms,
+        record_type=str(_first(record, _TYPE_FIELDS[dataset]) or '').upper(),
+        payload=payload,
+    )
+
+
+def subtract_ranges(start_ms: int, end_ms: int, covered: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """Return the parts of [start_ms, end_ms] not covered by the given sorted ranges."""
+    gaps: List[Tuple[int, int]] = []
+    cursor = start_ms
+    for cov_start, cov_end in sorted(covered):
+        if cov_end < cursor:
+            continue
+        if cov_start > end_ms:
+            break
+        if cov_start > cursor:
+            gaps.append((cursor, min(cov_start, end_ms)))
+        cursor = max(cursor, cov_end)
+        if cursor >= end_ms:
+            break
+    if cursor < end_ms:
+        gaps.append((cursor, end_ms))
+    return gaps
+
+
+def merge_ranges(ranges: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """Merge overlapping or touching ranges."""
+    merged: List[Tuple[int, int]] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
@@ -0,0 +1,214 @@
+"""
+Exchange History Store
+
+Append-only SQLite store for exchange history (user trades, income,
+position history and ledgers), partitioned by exchange, symbol and UTC day.
+It also records which time ranges have already been fetched so that
+backfill jobs only call the exchange for gaps.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .history_models import HistoryDataset, HistoryRecord, merge_ranges, subtract_ranges
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS history_records (
+    exchange TEXT NOT NULL,
+    dataset TEXT NOT NULL,
+    record_id TEXT NOT NULL,
+    symbol TEXT NOT NULL,
+    day TEXT NOT NULL,
+    time_ms INTEGER NOT NULL,
+    record_type TEXT NOT NULL DEFAULT '',
+    payload TEXT NOT NULL,
+    PRIMARY KEY (exchange, dataset, symbol, record_id)
+);
+CREATE INDEX IF NOT EXISTS idx_history_partition
+    ON history_records (exchange, dataset, symbol, day, time_ms);
+CREATE TABLE IF NOT EXISTS history_coverage (
+    exchange TEXT NOT NULL,
+    dataset TEXT NOT NULL,
+    symbol TEXT NOT NULL,
+    start_ms INTEGER NOT NULL,
+    end_ms INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_history_coverage
+    ON history_coverage (exchange, dataset, symbol);
+"""
+
+
+class ExchangeHistoryStore:
+    """
+    Local append-only store for exchange history records.
+
+    Records are never updated once written; re-inserting a record with the
+    same (exchange, dataset, symbol, record_id) is a no-op. The symbol is part
+    of the key because some ids (Binance userTrades) are only unique per symbol.
+    """
+
+    def __init__(self, db_path: str):
+        """
+        Initialize the history store.
+
+        Args:
+            db_path: SQLite file path (":memory:" for an ephemeral store)
+        """
+        self.db_path = db_path
+        if db_path != ":memory:":
+            directory = os.path.dirname(os.path.abspath(db_path))
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._migrate_record_key()
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+        logger.info(f"ExchangeHistoryStore opened at {db_path}")
+
+    def _migrate_record_key(self) -> None:
+        """Rebuild a history_records table created before symbol was part of its primary key."""
+        columns = self._conn.execute("PRAGMA table_info(history_records)").fetchall()
+        key = [row[1] for row in sorted((c for c in columns if c[5]), key=lambda c: c[5])]
+        if not columns or 'symbol' in key:
+            return
+        logger.info("Migrating history_records to the (exchange, dataset, symbol, record_id) key")
+        self._conn.execute("DROP INDEX IF EXISTS idx_history_partition")
+        self._conn.execute("ALTER TABLE history_records RENAME TO history_records_old")
+        self._conn.executescript(_SCHEMA)
+        self._conn.execute(
+            "INSERT OR IGNORE INTO history_records "
+            "(exchange, dataset, record_id, symbol, day, time_ms, record_type, payload) "
+            "SELECT exchange, dataset, record_id, symbol, day, time_ms, record_type, payload "
+            "FROM history_records_old"
+        )
+        self._conn.execute("DROP TABLE history_records_old")
+        self._conn.commit()
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def append(self, records: Iterable[HistoryRecord]) -> int:
+        """
+        Append records, ignoring ones already stored.
+
+        Returns:
+            Number of newly inserted records
+        """
+        rows = [
+            (r.exchange, r.dataset.value, r.record_id, r.symbol, r.day, r.time_ms,
+             r.record_type, json.dumps(r.payload, default=str))
+            for r in records
+        ]
+        if not rows:
+            return 0
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO history_records "
+                "(exchange, dataset, record_id, symbol, day, time_ms, record_type, payload) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._conn.commit()
+            return self._conn.total_changes - before
+
+    def query(self, exchange: str, dataset: HistoryDataset, symbol: str = "",
+              start_ms: int = 0, end_ms: int = 0,
+              record_type: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Return stored raw records ordered by time.
+
+        Args:
+            exchange: Exchange name
+            dataset: History dataset
+            symbol: Exchange-native symbol (empty for all symbols)
+            start_ms: Inclusive lower time bound (0 for unbounded)
+            end_ms: Inclusive upper time bound (0 for unbounded)
+            record_type: Optional record sub-type filter (e.g. REALIZED_PNL)
+        """
+        sql = "SELECT payload FROM history_records WHERE exchange = ? AND dataset = ?"
+        params: List[Any] = [exchange.lower(), dataset.value]
+        if symbol:
+            sql += " AND symbol = ?"
+            params.append(symbol.upper())
+        if start_ms:
+            sql += " AND time_ms >= ?"
+            params.append(int(start_ms))
+        if end_ms:
+            sql += " AND time_ms <= ?"
+            params.append(int(end_ms))
+        if record_type:
+            sql += " AND record_type = ?"
+            params.append(record_type.upper())
+        sql += " ORDER BY time_ms, record_id"
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def covered_ranges(self, exchange: str, dataset: HistoryDataset, symbol: str = "") -> List[Tuple[int, int]]:
+        """Return merged time ranges already fetched for (exchange, dataset, symbol)."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT start_ms, end_ms FROM history_coverage "
+                "WHERE exchange = ? AND dataset = ? AND symbol = ?",
+                (exchange.lower(), dataset.value, symbol.upper()),
+            ).fetchall()
+        return merge_ranges([(int(s), int(e)) for s, e in rows])
+
+    def missing_ranges(self, exchange: str, dataset: HistoryDataset, symbol: str,
+                       start_ms: int, end_ms: int) -> List[Tuple[int, int]]:
+        """
+        Return the sub-ranges of [start_ms, end_ms] that have not been fetched yet.
+
+        A symbol-wide fetch (symbol "") also covers every individual symbol.
+        """
+        covered = self.covered_ranges(exchange, dataset, symbol)
+        if symbol:
+            covered = merge_ranges(covered + self.covered_ranges(exchange, dataset, ""))
+        return subtract_ranges(int(start_ms), int(end_ms), covered)
+
+    def mark_covered(self, exchange: str, dataset: HistoryDataset, symbol: str,
+                     start_ms: int, end_ms: int) -> None:
+        """Record that [start_ms, end_ms] has been fully fetched, compacting adjacent ranges."""
+        if end_ms <= start_ms:
+            return
+        key = (exchange.lower(), dataset.value, symbol.upper())
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT start_ms, end_ms FROM history_coverage "
+                "WHERE exchange = ? AND dataset = ? AND symbol = ?",
+                key,
+            ).fetchall()
+            merged = merge_ranges([(int(s), int(e)) for s, e in rows] + [(int(start_ms), int(end_ms))])
+            self._conn.execute(
+                "DELETE FROM history_coverage WHERE exchange = ? AND dataset = ? AND symbol = ?",
+                key,
+            )
+            self._conn.executemany(
+                "INSERT INTO history_coverage (exchange, dataset, symbol, start_ms, end_ms) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [key + (s, e) for s, e in merged],
+            )
+            self._conn.commit()
+
+    def count(self, exchange: str = "", dataset: Optional[HistoryDataset] = None) -> int:
+        """Return the number of stored records, optionally filtered."""
+        sql = "SELECT COUNT(*) FROM history_records WHERE 1 = 1"
+        params: List[Any] = []
+        if exchange:
+            sql += " AND exchange = ?"
+            params.append(exchange.lower())
+        if dataset:
+            sql += " AND dataset = ?"
+            params.append(dataset.value)
+        with self._lock:
+            return int(self._conn.execute(sql, params).fetchone()[0])
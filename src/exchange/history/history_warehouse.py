@@ -0,0 +1,150 @@
+"""
+Exchange History Warehouse
+
+Common query API over the local history store. Every read first fills any
+time range that has not been downloaded yet, so backfill and reconciliation
+jobs become local range queries instead of repeated API sweeps.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from .history_fetcher import ExchangeHistoryFetcher
+from .history_models import HistoryDataset, build_history_record
+from .history_store import ExchangeHistoryStore
+
+logger = logging.getLogger(__name__)
+
+
+class ExchangeHistoryWarehouse:
+    """
+    Incrementally filled, locally queried exchange history.
+
+    Ranges newer than ``settle_ms`` are never marked as covered, so the most
+    recent minutes are re-fetched until the exchange has published them.
+    """
+
+    def __init__(self, store: ExchangeHistoryStore, fetcher: ExchangeHistoryFetcher,
+                 settle_ms: int = 5 * 60 * 1000):
+        """
+        Initialize the warehouse.
+
+        Args:
+            store: Local history store
+            fetcher: Exchange history fetcher used to fill gaps
+            settle_ms: Age below which fetched ranges are not considered final
+        """
+        self.store = store
+        self.fetcher = fetcher
+        self.settle_ms = settle_ms
+        self._fill_locks: Dict[Tuple[str, str, str], asyncio.Lock] = {}
+
+    def attach_exchanges(self, binance_exchange: Any = None, kucoin_exchange: Any = None) -> None:
+        """Provide exchange clients to the fetcher if it does not have them yet."""
+        if binance_exchange and not self.fetcher.binance_exchange:
+            self.fetcher.binance_exchange = binance_exchange
+        if kucoin_exchange and not self.fetcher.kucoin_exchange:
+            self.fetcher.kucoin_exchange = kucoin_exchange
+
+    async def ensure_range(self, exchange: str, dataset: HistoryDataset, symbol: str,
+                           start_ms: int, end_ms: int) -> int:
+        """
+        Download any part of [start_ms, end_ms] not yet present locally.
+
+        A gap is marked as covered only once the fetcher has read all of it;
+        a failed or truncated fetch raises and leaves the gap to be fetched
+        again on the next read.
+
+        Returns:
+            Number of new records appended to the store
+        """
+        exchange = exchange.lower()
+        symbol = (symbol or "").upper()
+        if end_ms <= start_ms or not self.fetcher.supports(exchange, dataset):
+            return 0
+
+        lock = self._fill_locks.setdefault((exchange, dataset.value, symbol), asyncio.Lock())
+        async with lock:
+            gaps = self.store.missing_ranges(exchange, dataset, symbol, start_ms, end_ms)
+            if not gaps:
+                return 0
+
+            settled_before = int(time.time() * 1000) - self.settle_ms
+            appended = 0
+            for gap_start, gap_end in gaps:
+                raw = await self.fetcher.fetch(exchange, dataset, symbol, gap_start, gap_end)
+                records = [r for r in (build_history_record(exchange, dataset, item, symbol) for item in raw) if r]
+                appended += self.store.append(records)
+                covered_end = min(gap_end, settled_before)
+                if covered_end > gap_start:
+                    self.store.mark_covered(exchange, dataset, symbol, gap_start, covered_end)
+
+            if appended:
+                logger.info(f"History warehouse: +{appended} {exchange}/{dataset.value} records for {symbol or 'ALL'}")
+            return appended
+
+    async def _query(self, exchange: str, dataset: HistoryDataset, symbol: str,
+                     start_ms: int, end_ms: int, record_type: Optional[str] = None,
+                     refresh: bool = True) -> List[Dict[str, Any]]:
+        """
+        Fill the range if needed, then read it from the store.
+
+        Raises:
+            Exception: If the range could not be filled; a partial result is
+                never returned as if it were complete
+        """
+        if refresh:
+            try:
+                await self.ensure_range(exchange, dataset, symbol, start_ms, end_ms)
+            except Exception as e:
+                logger.error(f"History warehouse fill failed for {exchange}/{dataset.value} {symbol}: {e}")
+                raise
+        return self.store.query(exchange, dataset, symbol, start_ms, end_ms, record_type)
+
+    async def get_user_trades(self, exchange: str, symbol: str, start_ms: int, end_ms: int,
+                              refresh: bool = True) -> List[Dict[str, Any]]:
+        """Return account fills for a symbol in [start_ms, end_ms], oldest first."""
+        return await self._query(exchange, HistoryDataset.USER_TRADES, symbol, start_ms, end_ms, refresh=refresh)
+
+    async def get_income(self, exchange: str, symbol: str, start_ms: int, end_ms: int,
+                         income_type: Optional[str] = None, refresh: bool = True) -> List[Dict[str, Any]]:
+        """Return income records (realized PnL, commission, funding) in [start_ms, end_ms]."""
+        return await self._query(exchange, HistoryDataset.INCOME, symbol, start_ms, end_ms,
+                                 record_type=income_type, refresh=refresh)
+
+    async def get_position_history(self, exchange: str, symbol: str, start_ms: int, end_ms: int,
+                                   refresh: bool = True) -> List[Dict[str, Any]]:
+        """Return closed-position records whose close time lies in [start_ms, end_ms]."""
+        return await self._query(exchange, HistoryDataset.POSITION_HISTORY, symbol, start_ms, end_ms, refresh=refresh)
+
+    async def get_ledgers(self, exchange: str, start_ms: int, end_ms: int,
+                          biz_type: Optional[str] = None, refresh: bool = True) -> List[Dict[str, Any]]:
+        """Return account ledger entries in [start_ms, end_ms]."""
+        return await self._query(exchange, HistoryDataset.LEDGER, "", start_ms, end_ms,
+                                 record_type=biz_type, refresh=refresh)
+
+
+_warehouse: Optional[ExchangeHistoryWarehouse] = None
+
+
+def get_history_warehouse(binance_exchange: Any = None, kucoin_exchange: Any = None,
+                          db_path: Optional[str] = None) -> ExchangeHistoryWarehouse:
+    """
+    Return the process-wide history warehouse, creating it on first use.
+
+    Exchange clients passed on later calls are attached if the warehouse
+    does not have one for that exchange yet.
+    """
+    global _warehouse
+    if _warehouse is None:
+        from config import settings
+        path = db_path or settings.EXCHANGE_HISTORY_DB_PATH
+        _warehouse = ExchangeHistoryWarehouse(
+            ExchangeHistoryStore(path),
+            ExchangeHistoryFetcher(binance_exchange, kucoin_exchange),
+        )
+    else:
+        _warehouse.attach_exchanges(binance_exchange, kucoin_exchange)
+    return _warehouse
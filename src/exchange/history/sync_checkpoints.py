@@ -0,0 +1,120 @@
+"""
+Sync Checkpoints
+
+Small persistent key -> position map for long-running history syncs. A
+backfill records how far it got after every completed window, so an
+interrupted run resumes there instead of starting over, and scheduled
+runs only fetch what is new since the previous one.
+"""
+
+import json
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+class SyncCheckpointStore:
+    """
+    JSON file of sync positions (milliseconds or exchange cursors), keyed by scope.
+
+    Several processes may share the file (e.g. a scheduled sync next to a
+    manual backfill). Every write takes an exclusive lock on ``<path>.lock``,
+    re-reads the file and changes only its own scope, so checkpoints written
+    by other processes are kept.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Initialize the store.
+
+        Args:
+            path: JSON file path (None keeps checkpoints in memory only)
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._checkpoints: Dict[str, Any] = {}
+        if path:
+            self._checkpoints = self._read()
+
+    def get(self, scope: str, default: Any = None) -> Any:
+        """Get the checkpoint for a scope."""
+        with self._lock:
+            return self._checkpoints.get(scope, default)
+
+    def set(self, scope: str, value: Any) -> None:
+        """Set the checkpoint for a scope and persist it."""
+        def change(checkpoints: Dict[str, Any]) -> bool:
+            checkpoints[scope] = value
+            return True
+
+        self._update(change)
+
+    def clear(self, scope: str) -> None:
+        """Remove the checkpoint for a scope."""
+        self._update(lambda checkpoints: checkpoints.pop(scope, None) is not None)
+
+    def _update(self, change: Callable[[Dict[str, Any]], bool]) -> None:
+        """Apply a change to the latest checkpoints and persist them if it changed anything."""
+        with self._lock:
+            if not self.path:
+                change(self._checkpoints)
+                return
+            try:
+                with self._file_lock():
+                    checkpoints = self._read()
+                    if change(checkpoints):
+                        self._write(checkpoints)
+                    self._checkpoints = checkpoints
+            except OSError as e:
+                logger.error(f"Could not write sync checkpoints to {self.path}: {e}")
+                change(self._checkpoints)
+
+    @contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        with open(f"{self.path}.lock", 'a') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _read(self) -> Dict[str, Any]:
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.error(f"Could not read sync checkpoints from {self.path}: {e}")
+            return dict(self._checkpoints)
+
+    def _write(self, checkpoints: Dict[str, Any]) -> None:
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(checkpoints, f, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+
+_checkpoints: Optional[SyncCheckpointStore] = None
+
+
+def get_sync_checkpoints() -> SyncCheckpointStore:
+    """Return the process-wide checkpoint store."""
+    global _checkpoints
+    if _checkpoints is None:
+        from config import settings
+        _checkpoints = SyncCheckpointStore(settings.TRANSACTION_SYNC_CHECKPOINT_PATH)
+    return _checkpoints
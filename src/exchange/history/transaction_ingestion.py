@@ -0,0 +1,307 @@
+"""
+Transaction History Ingestion
+
+Fills the transaction_history table from Binance income history. Every
+(exchange, symbol, income type) scope keeps its own cursor, so a symbol
+that is behind does not force every other symbol to be re-read from a
+global "last synced" time. Scopes are processed by a bounded pool of
+workers that share a request-weight budget, and each page is compared
+with the rows already stored for its time range before inserting, so
+re-running a range never duplicates transactions.
+"""
+
+import asyncio
+import logging
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .history_fetcher import WINDOW_MS
+from .sync_checkpoints import SyncCheckpointStore
+
+logger = logging.getLogger(__name__)
+
+# Binance /fapi/v1/income costs 30 request weight
+INCOME_REQUEST_WEIGHT = 30
+# Resumed scopes re-read this much before their cursor to pick up late records
+CURSOR_OVERLAP_MS = 60 * 60 * 1000
+# Income types booked without a symbol; a symbol-scoped query never returns them
+ACCOUNT_INCOME_TYPES = ('TRANSFER', 'WELCOME_BONUS', 'COIN_SWAP_DEPOSIT', 'COIN_SWAP_WITHDRAW')
+
+TransactionKey = Tuple[int, str, float, str, str]
+
+
+def _time_ms(value: Any) -> int:
+    if isinstance(value, (int, float)):
+        return int(value)
+    try:
+        return int(datetime.fromisoformat(str(value).replace('Z', '+00:00')).timestamp() * 1000)
+    except ValueError:
+        return 0
+
+
+def _iso(time_ms: int) -> str:
+    return datetime.fromtimestamp(time_ms / 1000, tz=timezone.utc).isoformat()
+
+
+def transaction_key(transaction: Dict[str, Any]) -> TransactionKey:
+    """
+    Identity of a transaction: time, type, amount, symbol and asset.
+
+    Times are compared as epoch milliseconds so rows read back from the
+    database match freshly transformed ones regardless of ISO formatting.
+    """
+    try:
+        amount = round(float(transaction.get('amount') or 0), 10)
+    except (TypeError, ValueError):
+        amount = 0.0
+    return (
+        _time_ms(transaction.get('time', '')),
+        str(transaction.get('type') or ''),
+        amount,
+        str(transaction.get('symbol') or ''),
+        str(transaction.get('asset') or ''),
+    )
+
+
+def income_to_transaction(income_record: Dict[str, Any], exchange: str = 'binance') -> Optional[Dict[str, Any]]:
+    """
+    Transform a Binance income record to the transaction_history format.
+
+    Args:
+        income_record: Raw income record from the /income endpoint
+        exchange: Exchange name stored with the row
+
+    Returns:
+        Transaction row, or None if the record cannot be read
+    """
+    try:
+        time_ms = int(income_record.get('time', 0))
+        return {
+            'time': _iso(time_ms),
+            'type': income_record.get('incomeType', income_record.get('type', '')),
+            'amount': float(income_record.get('income', 0.0)),
+            'asset': income_record.get('asset', ''),
+            'symbol': income_record.get('symbol', ''),
+            'exchange': exchange
+        }
+    except (TypeError, ValueError) as e:
+        logger.error(f"Error transforming income record: {e}")
+        return None
+
+
+def cursor_scope(exchange: str, symbol: str, income_type: str) -> str:
+    """Checkpoint key of one (exchange, symbol, income type) cursor; empty parts mean 'all'."""
+    return f"{exchange}:income:{symbol or '*'}:{income_type or '*'}"
+
+
+class RequestWeightLimiter:
+    """
+    Token bucket over an exchange's per-minute request weight.
+
+    Callers acquire the weight of a request before sending it and wait when
+    the budget is spent, so concurrent workers together stay under the limit.
+    """
+
+    def __init__(self, weight_per_minute: int):
+        """
+        Initialize the limiter.
+
+        Args:
+            weight_per_minute: Request weight that may be spent per minute
+        """
+        self.capacity = float(weight_per_minute)
+        self.rate = weight_per_minute / 60.0
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+        self.waited = 0.0
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, weight: int) -> None:
+        """Wait until `weight` can be spent, then spend it."""
+        weight = min(float(weight), self.capacity)
+        async with self._lock:
+            self._refill()
+            while self._tokens < weight:
+                delay = (weight - self._tokens) / self.rate
+                self.waited += delay
+                await asyncio.sleep(delay)
+                self._refill()
+            self._tokens -= weight
+
+
+class TransactionIngestionService:
+    """Concurrent, cursor-based Binance income ingestion into transaction_history."""
+
+    def __init__(self, binance_exchange: Any, db_manager: Any,
+                 checkpoints: Optional[SyncCheckpointStore] = None,
+                 limiter: Optional[RequestWeightLimiter] = None,
+                 max_workers: int = 4, page_limit: int = 1000, batch_size: int = 100):
+        """
+        Initialize the service.
+
+        Args:
+            binance_exchange: BinanceExchange instance
+            db_manager: Database manager with get_transactions_in_range and insert_transaction_history_batch
+            checkpoints: Cursor store (in-memory if None)
+            limiter: Shared request-weight limiter (1200 weight/minute if None)
+            max_workers: Scopes fetched concurrently
+            page_limit: Income records requested per page
+            batch_size: Rows per insert
+        """
+        self.binance_exchange = binance_exchange
+        self.db_manager = db_manager
+        self.checkpoints = checkpoints or SyncCheckpointStore()
+        self.limiter = limiter or RequestWeightLimiter(1200)
+        self.max_workers = max(1, max_workers)
+        self.page_limit = page_limit
+        self.batch_size = batch_size
+        self.exchange = 'binance'
+
+    async def account_scopes(self, start_time: int, income_type: str = "") -> Optional[List[Tuple[str, str]]]:
+        """
+        Scopes covering the whole account: one per symbol traded since start_time.
+
+        A symbol counts as traded if it has an open position or its position
+        changed since start_time (futures account ``updateTime``). Symbol-less
+        income (transfers, bonuses) gets its own all-symbols scopes.
+
+        Args:
+            start_time: Earliest time to ingest in milliseconds
+            income_type: Income type filter (empty for all types)
+
+        Returns:
+            (symbol, income type) scopes, or None if the account could not be read
+        """
+        account = await self.binance_exchange.get_futures_account_info()
+        if not account:
+            return None
+        symbols = sorted({
+            position['symbol'] for position in account.get('positions', [])
+            if position.get('symbol') and (float(position.get('positionAmt') or 0) != 0
+                                           or int(position.get('updateTime') or 0) >= start_time)
+        })
+        account_types = [t for t in ACCOUNT_INCOME_TYPES if not income_type or t == income_type]
+        return [(symbol, income_type) for symbol in symbols] + [("", t) for t in account_types]
+
+    async def sync(self, start_time: int, end_time: int, symbols: Optional[Sequence[str]] = None,
+                   income_types: Optional[Sequence[str]] = None,
+                   scopes: Optional[Sequence[Tuple[str, str]]] = None) -> Dict[str, Any]:
+        """
+        Ingest income for every (symbol, income type) scope in [start_time, end_time].
+
+        Args:
+            start_time: Earliest time to ingest in milliseconds
+            end_time: Latest time to ingest in milliseconds
+            symbols: Symbols to ingest (None or empty for one all-symbols scope)
+            income_types: Income types to ingest (None or empty for all types)
+            scopes: Explicit (symbol, income type) scopes, e.g. from account_scopes();
+                overrides symbols and income_types
+
+        Returns:
+            Totals plus one result dict per scope
+        """
+        if scopes is None:
+            scopes = [(symbol, income_type)
+                      for symbol in (list(symbols or []) or [""])
+                      for income_type in (list(income_types or []) or [""])]
+        queue: asyncio.Queue = asyncio.Queue()
+        for scope in scopes:
+            queue.put_nowait(scope)
+        results: List[Dict[str, Any]] = []
+
+        async def worker():
+            while True:
+                try:
+                    symbol, income_type = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                results.append(await self.sync_scope(symbol, income_type, start_time, end_time))
+
+        await asyncio.gather(*(worker() for _ in range(min(self.max_workers, len(scopes)))))
+
+        return {
+            'success': all(r['success'] for r in results),
+            'total_processed': sum(r['processed'] for r in results),
+            'total_inserted': sum(r['inserted'] for r in results),
+            'total_skipped': sum(r['skipped'] for r in results),
+            'symbol_results': results
+        }
+
+    async def sync_scope(self, symbol: str, income_type: str, start_time: int, end_time: int) -> Dict[str, Any]:
+        """
+        Ingest one scope from its cursor (or start_time) up to end_time.
+
+        The cursor advances after every stored page, so a failed run resumes
+        at the last page it completed. A failed request stops the scope; it is
+        never read as an empty window that the cursor may skip.
+        """
+        scope = cursor_scope(self.exchange, symbol, income_type)
+        cursor = self.checkpoints.get(scope)
+        begin = max(start_time, cursor - CURSOR_OVERLAP_MS) if cursor else start_time
+        result = {'symbol': symbol, 'income_type': income_type, 'processed': 0, 'inserted': 0,
+                  'skipped': 0, 'success': True, 'resumed_from': begin if cursor else None}
+
+        try:
+            window_start = begin
+            while window_start < end_time:
+                window_end = min(window_start + WINDOW_MS, end_time)
+                page_start = window_start
+                while page_start <= window_end:
+                    page = await self._fetch_page(symbol, income_type, page_start, window_end)
+                    if not page:
+                        break
+                    last_ms = max(int(r.get('time', 0)) for r in page)
+                    await self._store_page(page, result)
+                    self.checkpoints.set(scope, max(last_ms, self.checkpoints.get(scope, 0)))
+                    if len(page) < self.page_limit:
+                        break
+                    # Re-read from the last timestamp: records sharing it may straddle pages
+                    page_start = last_ms if last_ms > page_start else page_start + 1
+                window_start = window_end
+        except Exception as e:
+            logger.error(f"Income ingestion failed for {scope}: {e}")
+            result['success'] = False
+            result['error'] = str(e)
+
+        result['cursor'] = self.checkpoints.get(scope)
+        return result
+
+    async def _fetch_page(self, symbol: str, income_type: str, start_ms: int, end_ms: int) -> List[Dict[str, Any]]:
+        await self.limiter.acquire(INCOME_REQUEST_WEIGHT)
+        page = await self.binance_exchange.get_income_history(
+            symbol=symbol, income_type=income_type, start_time=start_ms, end_time=end_ms, limit=self.page_limit,
+            raise_errors=True)
+        return [r for r in (page or []) if isinstance(r, dict)]
+
+    async def _store_page(self, page: List[Dict[str, Any]], result: Dict[str, Any]) -> None:
+        """Insert the rows of a page that are not stored yet."""
+        transactions = [t for t in (income_to_transaction(r, self.exchange) for r in page) if t]
+        result['processed'] += len(transactions)
+        if not transactions:
+            return
+
+        times = [_time_ms(t['time']) for t in transactions]
+        existing = Counter(transaction_key(row) for row in await self.db_manager.get_transactions_in_range(
+            self.exchange, _iso(min(times)), _iso(max(times))))
+
+        new_rows = []
+        for transaction in transactions:
+            key = transaction_key(transaction)
+            if existing[key] > 0:
+                existing[key] -= 1
+                result['skipped'] += 1
+            else:
+                new_rows.append(transaction)
+
+        for i in range(0, len(new_rows), self.batch_size):
+            batch = new_rows[i:i + self.batch_size]
+            if not await self.db_manager.insert_transaction_history_batch(batch):
+                raise RuntimeError(f"Insert of {len(batch)} transactions failed")
+            result['inserted'] += len(batch)
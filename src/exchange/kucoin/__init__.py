@@ -5,6 +5,7 @@ This module contains KuCoin-specific exchange implementations.
 """
 
 from .kucoin_exchange import KucoinExchange
+from .kucoin_mark_price import KucoinMarkPriceFetcher
 from .kucoin_models import (
     KucoinOrder, KucoinPosition, KucoinBalance,
     KucoinTrade, KucoinIncome
@@ -12,6 +13,7 @@ from .kucoin_models import (
 
 __all__ = [
     'KucoinExchange',
+    'KucoinMarkPriceFetcher',
     'KucoinOrder',
     'KucoinPosition',
     'KucoinBalance',
@@ -0,0 +1,151 @@
+"""
+KuCoin Book Stream
+
+Feeds the local order book from the KuCoin futures
+``/contractMarket/level2Depth5`` topic of the public websocket. The
+connection is opened only while the order book service watches KuCoin
+symbols; the subscription follows the watched set, and the connection is
+re-established (with a fresh bullet token) with back-off when it drops.
+"""
+
+import asyncio
+import itertools
+import json
+import logging
+import time as _time
+from typing import Any, Callable, Dict, Optional, Set, Tuple
+
+import aiohttp
+
+from ..core.order_book import OrderBookService, get_order_book_service
+
+logger = logging.getLogger(__name__)
+
+DEPTH_TOPIC = "/contractMarket/level2Depth5"
+# Symbols per subscribe request
+TOPIC_BATCH = 50
+DEFAULT_SYNC_INTERVAL = 5.0
+MAX_RECONNECT_DELAY = 60.0
+
+
+class KucoinBookStream:
+    """Public level-2 depth stream of the watched KuCoin futures contracts."""
+
+    def __init__(self, base_url: Callable[[], str], session: Callable[[], aiohttp.ClientSession],
+                 service: Optional[OrderBookService] = None,
+                 sync_interval: float = DEFAULT_SYNC_INTERVAL):
+        """
+        Initialize the stream.
+
+        Args:
+            base_url: Returns the futures REST base URL (for the bullet token)
+            session: Returns the HTTP session to open the websocket on
+            service: Order book service to feed (the process-wide one if None)
+            sync_interval: Seconds between checks of the watched symbols
+        """
+        self.base_url = base_url
+        self.session = session
+        self.service = service or get_order_book_service()
+        self.sync_interval = sync_interval
+        self.connected = False
+        self._subscribed: Set[str] = set()
+        self._ids = itertools.count(1)
+        self._task: Optional[asyncio.Task] = None
+        self.stats = {'messages': 0, 'connects': 0}
+
+    async def _public_endpoint(self) -> Tuple[str, float]:
+        """Websocket URL (with token) and ping interval in seconds from bullet-public."""
+        async with self.session().post(f"{self.base_url()}/api/v1/bullet-public",
+                                       timeout=aiohttp.ClientTimeout(total=10)) as resp:
+            data = (await resp.json()).get('data') or {}
+        server = (data.get('instanceServers') or [{}])[0]
+        if not data.get('token') or not server.get('endpoint'):
+            raise RuntimeError("KuCoin bullet-public returned no token or endpoint")
+        url = f"{server['endpoint']}?token={data['token']}&connectId=book{next(self._ids)}"
+        return url, float(server.get('pingInterval', 18000)) / 1000.0
+
+    def handle_message(self, message: Dict[str, Any]) -> None:
+        if message.get('type') == 'message':
+            self.stats['messages'] += 1
+            self.service.apply_kucoin_message(message)
+        elif message.get('type') == 'error':
+            logger.warning(f"KuCoin book stream error: {message.get('data')}")
+
+    async def sync(self, ws: Any) -> bool:
+        """
+        Align the subscription with the watched symbols.
+
+        Returns:
+            bool: False if no symbol is watched (the connection can close)
+        """
+        symbols = self.service.watched('kucoin')
+        for action, changed in (('unsubscribe', self._subscribed - symbols), ('subscribe', symbols - self._subscribed)):
+            batch = sorted(changed)
+            for i in range(0, len(batch), TOPIC_BATCH):
+                await ws.send_json({'id': str(next(self._ids)), 'type': action,
+                                    'topic': f"{DEPTH_TOPIC}:{','.join(batch[i:i + TOPIC_BATCH])}",
+                                    'privateChannel': False, 'response': True})
+        if symbols != self._subscribed:
+            logger.info(f"KuCoin book stream following {len(symbols)} symbols")
+        self._subscribed = symbols
+        return bool(symbols)
+
+    async def _listen(self) -> None:
+        url, ping_interval = await self._public_endpoint()
+        async with self.session().ws_connect(url) as ws:
+            self.connected = True
+            self.stats['connects'] += 1
+            last_ping = next_sync = _time.monotonic()
+            while True:
+                now = _time.monotonic()
+                if now >= next_sync:
+                    if not await self.sync(ws):
+                        return
+                    next_sync = now + self.sync_interval
+                if now - last_ping >= ping_interval:
+                    await ws.send_json({'id': str(next(self._ids)), 'type': 'ping'})
+                    last_ping = now
+                try:
+                    msg = await ws.receive(timeout=min(ping_interval, self.sync_interval))
+                except asyncio.TimeoutError:
+                    continue
+                if msg.type == aiohttp.WSMsgType.TEXT:
+                    self.handle_message(json.loads(msg.data))
+                elif msg.type in (aiohttp.WSMsgType.CLOSE, aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.ERROR):
+                    raise ConnectionError(f"KuCoin book stream closed ({msg.type.name})")
+
+    async def _run(self) -> None:
+        delay = 1.0
+        while True:
+            if not self.service.watched('kucoin'):
+                await asyncio.sleep(self.sync_interval)
+                continue
+            try:
+                await self._listen()
+                delay = 1.0
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"KuCoin book stream failed: {e}")
+                delay = min(delay * 2, MAX_RECONNECT_DELAY)
+            finally:
+                self.connected = False
+                self._subscribed = set()
+            await asyncio.sleep(delay)
+
+    def start(self) -> asyncio.Task:
+        """Start streaming the watched symbols in the background."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        return self._task
+
+    async def stop(self) -> None:
+        """Stop the stream and close its connection."""
+        task, self._task = self._task, None
+        if task is None or task.done():
+            return
+        task.cancel()
+        try:
+            await task
+        except (asyncio.CancelledError, Exception):
+            pass
@@ -6,14 +6,13 @@ Following Clean Code principles with clear client abstraction.
 """
 
 import logging
-from typing import Optional
-from kucoin_universal_sdk.api.client import DefaultClient
-from kucoin_universal_sdk.model.client_option import ClientOptionBuilder
-from kucoin_universal_sdk.model.constants import GLOBAL_API_ENDPOINT, GLOBAL_FUTURES_API_ENDPOINT
-from kucoin_universal_sdk.model.transport_option import TransportOptionBuilder
+from typing import TYPE_CHECKING, Optional
 
 from .kucoin_auth import KucoinAuth
 
+if TYPE_CHECKING:
+    from kucoin_universal_sdk.api.client import DefaultClient
+
 logger = logging.getLogger(__name__)
 
 
@@ -25,7 +24,8 @@ class KucoinClient:
     with proper error handling and logging.
     """
 
-    def __init__(self, api_key: str, api_secret: str, api_passphrase: str, is_testnet: bool = False):
+    def __init__(self, api_key: str, api_secret: str, api_passphrase: str, is_testnet: bool = False,
+                 futures_endpoint: Optional[str] = None):
         """
         Initialize KuCoin client.
 
@@ -34,12 +34,14 @@ class KucoinClient:
             api_secret: KuCoin API secret
             api_passphrase: KuCoin API passphrase
             is_testnet: Whether to use testnet
+            futures_endpoint: Override for the futures REST endpoint (e.g. a local mock)
         """
         self.api_key = api_key
         self.api_secret = api_secret
         self.api_passphrase = api_passphrase
         self.is_testnet = is_testnet
-        self.client: Optional[DefaultClient] = None
+        self.futures_endpoint = futures_endpoint
+        self.client: Optional["DefaultClient"] = None
         self.auth = KucoinAuth(api_key, api_secret, api_passphrase)
 
         logger.info(f"KucoinClient initialized for testnet: {self.is_testnet}")
@@ -56,12 +58,19 @@ class KucoinClient:
                 logger.error("Invalid KuCoin credentials")
                 return False
 
+            # The SDK takes seconds to import, so it is loaded on first connect
+            from kucoin_universal_sdk.api.client import DefaultClient
+            from kucoin_universal_sdk.model.client_option import ClientOptionBuilder
+            from kucoin_universal_sdk.model.constants import GLOBAL_API_ENDPOINT, GLOBAL_FUTURES_API_ENDPOINT
+            from kucoin_universal_sdk.model.transport_option import TransportOptionBuilder
+            from .kucoin_metrics import TimingInterceptor
+
             # Choose endpoints based on testnet setting
             spot_endpoint = GLOBAL_API_ENDPOINT if self.is_testnet else GLOBAL_API_ENDPOINT
-            futures_endpoint = GLOBAL_FUTURES_API_ENDPOINT if self.is_testnet else GLOBAL_FUTURES_API_ENDPOINT
+            futures_endpoint = self.futures_endpoint or GLOBAL_FUTURES_API_ENDPOINT
 
             # Configure transport options
-            transport_option = TransportOptionBuilder().build()
+            transport_option = TransportOptionBuilder().add_interceptor(TimingInterceptor()).build()
 
             # Build client options
             client_option = (
@@ -14,6 +14,8 @@ import time as _time
 from typing import Dict, List, Optional, Tuple, Any, cast
 from decimal import Decimal
 
+from config import settings as cfg
+
 from ..core.exchange_base import ExchangeBase
 from ..core.exchange_config import ExchangeConfig, format_value
 from .kucoin_models import (
@@ -22,11 +24,21 @@ from .kucoin_models import (
     KucoinOrderType, KucoinOrderSide
 )
 from .kucoin_client import KucoinClient
-from .kucoin_symbol_mapper import symbol_mapper
 from .kucoin_symbol_converter import symbol_converter
+from .kucoin_mark_price import KucoinMarkPriceFetcher
+from .kucoin_book_stream import KucoinBookStream
+from ..core.order_book import get_order_book_service, maker_price
+from src.core.metrics import time_exchange_request
 
 logger = logging.getLogger(__name__)
 
+# Records per request of the paginated history reads (the endpoint maxima)
+TRADE_HISTORY_PAGE_SIZE = 1000
+FUNDING_HISTORY_PAGE_SIZE = 100
+LEDGER_PAGE_SIZE = 500
+# Pages read per history call before the result is reported as truncated
+MAX_HISTORY_PAGES = 100
+
 
 class KucoinExchange(ExchangeBase):
     """
@@ -36,7 +48,8 @@ class KucoinExchange(ExchangeBase):
     Follows Clean Code principles with clear method names and single responsibilities.
     """
 
-    def __init__(self, api_key: str, api_secret: str, api_passphrase: str, is_testnet: bool = False):
+    def __init__(self, api_key: str, api_secret: str, api_passphrase: str, is_testnet: bool = False,
+                 futures_endpoint: Optional[str] = None):
         """
         Initialize KuCoin exchange.
 
@@ -45,15 +58,20 @@ class KucoinExchange(ExchangeBase):
             api_secret: KuCoin API secret
             api_passphrase: KuCoin API passphrase
             is_testnet: Whether to use testnet
+            futures_endpoint: Override for the futures REST endpoint (defaults to settings.KUCOIN_FUTURES_ENDPOINT)
         """
         self.api_key = api_key
         self.api_secret = api_secret
         self.api_passphrase = api_passphrase
         self.is_testnet = is_testnet
+        self.futures_endpoint = futures_endpoint or cfg.KUCOIN_FUTURES_ENDPOINT
         self.client: Optional[KucoinClient] = None
         self._spot_symbols: List[str] = []
         self._futures_symbols: List[str] = []
         self._price_cache: Dict[str, Tuple[float, float, str]] = {}
+        self.mark_prices = KucoinMarkPriceFetcher(self._futures_base_url, self._price_cache,
+                                                  fallback=self._get_index_price_fallback)
+        self.book_stream = KucoinBookStream(self._futures_base_url, self.mark_prices.session)
 
         logger.info(f"KucoinExchange initialized for testnet: {self.is_testnet}")
 
@@ -61,6 +79,10 @@ class KucoinExchange(ExchangeBase):
         """Initialize the exchange connection."""
         try:
             await self._init_client()
+            if cfg.KUCOIN_MARK_PRICE_REFRESH_INTERVAL > 0:
+                self.mark_prices.start_refresh(cfg.KUCOIN_MARK_PRICE_REFRESH_INTERVAL)
+            if cfg.ORDER_BOOK_STREAM_ENABLED:
+                self.book_stream.start()
             return True
         except Exception as e:
             logger.error(f"Failed to initialize KuCoin exchange: {e}")
@@ -68,6 +90,8 @@ class KucoinExchange(ExchangeBase):
 
     async def close(self) -> None:
         """Close the exchange connection and cleanup resources."""
+        await self.book_stream.stop()
+        await self.mark_prices.close()
         if self.client:
             try:
                 await self.client.close()
@@ -84,7 +108,8 @@ class KucoinExchange(ExchangeBase):
                 self.api_key,
                 self.api_secret,
                 self.api_passphrase,
-                self.is_testnet
+                self.is_testnet,
+                futures_endpoint=self.futures_endpoint
             )
             await self.client.initialize()
             # Best-effort server time sync to avoid KC-API-TIMESTAMP errors
@@ -125,6 +150,8 @@ class KucoinExchange(ExchangeBase):
             logger.warning(f"Failed to synchronize KuCoin server time: {e}")
 
     def _futures_base_url(self) -> str:
+        if self.futures_endpoint:
+            return self.futures_endpoint
         # KuCoin futures sandbox is currently offline, so always use production
         if self.is_testnet:
             logger.warning("KuCoin futures sandbox is currently offline; using production API")
@@ -288,19 +315,14 @@ class KucoinExchange(ExchangeBase):
                     if validation_price_override and validation_price_override > 0:
                         validation_price = validation_price_override
                     else:
-                        max_retries = 3
-                        for attempt in range(max_retries):
-                            try:
-                                validation_price = await self.get_mark_price(pair)
-                                if validation_price and validation_price > 0:
-                                    break
-                            except Exception as e:
-                                logger.warning(f"Mark price fetch attempt {attempt + 1} failed: {e}")
-                                if attempt < max_retries - 1:
-                                    await asyncio.sleep(0.5)
+                        # get_mark_price already retries with back-off and falls back to the index price
+                        try:
+                            validation_price = await self.get_mark_price(pair)
+                        except Exception as e:
+                            logger.warning(f"Mark price fetch failed: {e}")
 
                         if not validation_price or validation_price <= 0:
-                            logger.error(f"Failed to fetch mark price for MARKET order validation on {pair} after {max_retries} attempts")
+                            logger.error(f"Failed to fetch mark price for MARKET order validation on {pair}")
                             return {'error': f'Cannot validate notional value: mark price unavailable for {pair}. Please retry.', 'code': -4008}
                 elif price:
                     # Use LIMIT price for LIMIT orders
@@ -459,7 +481,7 @@ class KucoinExchange(ExchangeBase):
             adjusted_price = price
             if kucoin_type == "limit" and price and not reduce_only:
                 try:
-                    # Get order book to check current market prices
+                    # Current market prices, from the streamed book when it is fresh
                     order_book = await self.get_order_book(kucoin_symbol, limit=5)
                     if order_book:
                         bids = order_book.get('bids', [])
@@ -481,13 +503,7 @@ class KucoinExchange(ExchangeBase):
                         offset = tick_size * tick_offset
 
                         # Adjust price to ensure maker status
-                        if kucoin_side == "buy" and best_bid > 0 and price and price >= best_bid:
-                            # BUY order must be below best_bid to add liquidity
-                            candidate = best_bid - offset
-                            adjusted_price = max(candidate, 0) if candidate > 0 else (price - offset) if price else price
-                        elif kucoin_side == "sell" and best_ask > 0 and price and price <= best_ask:
-                            # SELL order must be above best_ask to add liquidity
-                            adjusted_price = best_ask + offset
+                        adjusted_price = maker_price(kucoin_side, price, best_bid, best_ask, offset)
 
                         # Validate price difference - reject if >2%
                         if price and price > 0 and adjusted_price is not None:
@@ -822,7 +838,7 @@ class KucoinExchange(ExchangeBase):
 
             # Build get order request
             get_order_request = GetOrderByOrderIdReqBuilder().set_order_id(order_id).build()
-            response = futures_api.get_order_by_order_id(get_order_request)
+            response = await asyncio.to_thread(futures_api.get_order_by_order_id, get_order_request)
 
             if not response:
                 logger.warning(f"Order {order_id} not found")
@@ -891,10 +907,13 @@ class KucoinExchange(ExchangeBase):
             return None
 
     # Position Operations
-    async def get_futures_position_information(self) -> List[Dict[str, Any]]:
+    async def get_futures_position_information(self, include_risk: bool = False) -> List[Dict[str, Any]]:
         """
         Get all futures positions using direct API calls.
 
+        Args:
+            include_risk: Ignored; KuCoin positions always carry mark price and PnL
+
         Returns:
             List of position information dictionaries
         """
@@ -1221,56 +1240,41 @@ class KucoinExchange(ExchangeBase):
 
     async def get_order_book(self, symbol: str, limit: int = 5) -> Optional[Dict[str, Any]]:
         """
-        Get order book for a symbol.
+        Get the futures order book of a symbol.
+
+        The streamed local book is used while it is fresh; otherwise the
+        depth is read from the futures REST API (and the symbol is streamed
+        from then on).
 
         Args:
-            symbol: Trading pair symbol
+            symbol: Trading pair or futures contract symbol
             limit: Number of order book levels
 
         Returns:
             Order book data or None if error
         """
         try:
-            await self._init_client()
-
-            from kucoin_universal_sdk.generate.spot.market.model_get_all_symbols_req import GetAllSymbolsReqBuilder
-
-            if not self.client:
-                logger.error("KuCoin client not initialized")
+            contract = await self.mark_prices.map_symbol(symbol) or symbol.upper()
+            depth = get_order_book_service().depth('kucoin', contract, limit)
+            if depth is not None:
+                return {"symbol": contract, **depth}
+
+            url = f"{self._futures_base_url()}/api/v1/level2/depth20"
+            async with self.mark_prices.session().get(url, params={"symbol": contract},
+                                                      timeout=aiohttp.ClientTimeout(total=10)) as resp:
+                data = {}
+                if resp.status == 200:
+                    data = (await resp.json()).get("data") or {}
+            if not data.get("bids") and not data.get("asks"):
+                logger.warning(f"No KuCoin futures order book for {contract}")
                 return None
 
-            spot_service = self.client.get_spot_service()
-            market_api = spot_service.get_market_api()
-
-            # First get all symbols to find the correct format
-            symbols_request = GetAllSymbolsReqBuilder().build()
-            symbols_response = market_api.get_all_symbols(symbols_request)
-            symbols = []
-            if hasattr(symbols_response, 'data') and symbols_response.data:
-                symbols = symbols_response.data
-
-            # Find matching symbol
-            matching_symbol = None
-            for s in symbols:
-                if s.symbol == symbol:
-                    matching_symbol = s.symbol
-                    break
-
-            if not matching_symbol:
-                logger.warning(f"Symbol {symbol} not found in KuCoin symbols")
-                return None
-
-            # Try to get order book with the correct symbol
-            from kucoin_universal_sdk.generate.spot.market.model_get_part_order_book_req import GetPartOrderBookReqBuilder
-            request = GetPartOrderBookReqBuilder().set_symbol(matching_symbol).set_size(str(limit)).build()
-            response = market_api.get_part_order_book(request)
-
             return {
-                "symbol": matching_symbol,
-                "bids": response.bids,
-                "asks": response.asks,
-                "time": response.time,
-                "sequence": response.sequence
+                "symbol": contract,
+                "bids": (data.get("bids") or [])[:limit],
+                "asks": (data.get("asks") or [])[:limit],
+                "time": data.get("ts"),
+                "sequence": data.get("sequence")
             }
 
         except Exception as e:
@@ -1414,17 +1418,8 @@ class KucoinExchange(ExchangeBase):
         try:
             await self._init_client()
 
-            url = f"{self._futures_base_url()}/api/v1/contracts/active"
-            symbols: List[str] = []
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as resp:
-                    data = await resp.json()
-                    items = data.get("data") or []
-                    for it in items:
-                        if it.get('status') == 'Open':
-                            sym = it.get('symbol')
-                            if sym:
-                                symbols.append(sym)
+            # Shared with mark price lookups; loading it also fills the symbol registry
+            symbols = list(await self.mark_prices.futures_symbols())
 
             logger.info(f"Retrieved {len(symbols)} KuCoin futures symbols")
             return symbols
@@ -1544,79 +1539,18 @@ class KucoinExchange(ExchangeBase):
             return None
 
     async def get_mark_price(self, symbol: str) -> Optional[float]:
-        max_retries = 5
-        base_delay = 0.5
-        cache_ttl = 15.0
-
-        cache_key = symbol.upper()
-        now = _time.time()
-        cached = self._price_cache.get(cache_key)
-        if cached and now - cached[1] <= cache_ttl and cached[0] > 0:
-            return cached[0]
-
-        mapped_symbol = None
-        for attempt in range(max_retries):
-            try:
-                all_symbols = await self.get_futures_symbols()
-                symbol_mapper.available_symbols = all_symbols
-                normalized_symbol = symbol.upper()
-                if normalized_symbol.startswith('BTC') and normalized_symbol.endswith('USDTM'):
-                    normalized_symbol = normalized_symbol.replace('BTC', 'XBT', 1)
-                mapped_symbol = symbol_mapper.map_to_futures_symbol(normalized_symbol, all_symbols)
-
-                if not mapped_symbol:
-                    logger.warning(f"Could not map {symbol} to futures symbol for mark price")
-                    return None
-
-                url = f"{self._futures_base_url()}/api/v1/mark-price/{mapped_symbol}/current"
-                timeout = aiohttp.ClientTimeout(total=10 + (attempt * 2))
-
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(url, timeout=timeout) as resp:
-                        if resp.status == 200:
-                            data = await resp.json()
-                            td = data.get("data") or {}
-                            mark_price = td.get('value', 0.0)
-                            if mark_price and float(mark_price) > 0:
-                                price_val = float(mark_price)
-                                self._price_cache[cache_key] = (price_val, _time.time(), "mark")
-                                return price_val
-
-                        if attempt < max_retries - 1:
-                            jitter = 1 + random.uniform(0, 0.25)
-                            delay = base_delay * (2 ** attempt) * jitter
-                            logger.warning(f"Mark price fetch attempt {attempt + 1} failed (status {resp.status}), retrying in {delay:.2f}s...")
-                            await asyncio.sleep(delay)
-                            continue
-
-            except asyncio.TimeoutError:
-                if attempt < max_retries - 1:
-                    jitter = 1 + random.uniform(0, 0.25)
-                    delay = base_delay * (2 ** attempt) * jitter
-                    logger.warning(f"Mark price fetch timeout on attempt {attempt + 1}, retrying in {delay:.2f}s...")
-                    await asyncio.sleep(delay)
-                    continue
-            except Exception as e:
-                if attempt < max_retries - 1:
-                    jitter = 1 + random.uniform(0, 0.25)
-                    delay = base_delay * (2 ** attempt) * jitter
-                    logger.warning(f"Mark price fetch attempt {attempt + 1} failed: {e}, retrying in {delay:.2f}s...")
-                    await asyncio.sleep(delay)
-                    continue
-                else:
-                    logger.error(f"Failed to get KuCoin mark price for {symbol} after {max_retries} attempts: {e}")
+        """
+        Get the futures mark price.
 
-        logger.warning(f"All {max_retries} attempts to fetch mark price for {symbol} failed, trying index price fallback...")
-        fallback_price = await self._get_index_price_fallback(symbol, mapped_symbol)
-        if fallback_price and fallback_price > 0:
-            self._price_cache[cache_key] = (fallback_price, _time.time(), "index")
-            return fallback_price
+        Concurrent calls for the same symbol share one request; see KucoinMarkPriceFetcher.
 
-        if cached and cached[0] > 0:
-            logger.warning(f"Using stale cached price for {symbol}: {cached[0]}")
-            return cached[0]
+        Args:
+            symbol: Trading pair
 
-        return None
+        Returns:
+            Mark price (index or stale cached price as fallback), None if unavailable
+        """
+        return await self.mark_prices.get_mark_price(symbol)
 
     async def _get_index_price_fallback(self, symbol: str, mapped_symbol: Optional[str] = None) -> Optional[float]:
         """
@@ -1635,12 +1569,7 @@ class KucoinExchange(ExchangeBase):
         for attempt in range(max_retries):
             try:
                 if not mapped_symbol:
-                    all_symbols = await self.get_futures_symbols()
-                    symbol_mapper.available_symbols = all_symbols
-                    normalized_symbol = symbol.upper()
-                    if normalized_symbol.startswith('BTC') and normalized_symbol.endswith('USDTM'):
-                        normalized_symbol = normalized_symbol.replace('BTC', 'XBT', 1)
-                    mapped_symbol = symbol_mapper.map_to_futures_symbol(normalized_symbol, all_symbols)
+                    mapped_symbol = await self.mark_prices.map_symbol(symbol)
 
                 if not mapped_symbol:
                     logger.warning(f"Could not map {symbol} to futures symbol for index price fallback")
@@ -1650,27 +1579,26 @@ class KucoinExchange(ExchangeBase):
                 params = {'symbol': mapped_symbol}
                 timeout = aiohttp.ClientTimeout(total=10 + (attempt * 2))
 
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(url, params=params, timeout=timeout) as resp:
-                        if resp.status == 200:
-                            data = await resp.json()
-                            index_data = data.get("data") or {}
-                            index_price = index_data.get('indexPrice') or index_data.get('price', 0.0)
-                            if index_price and float(index_price) > 0:
-                                price_val = float(index_price)
-                                logger.info(f"Using index price {price_val} as fallback for {symbol}")
-                                return price_val
-                        else:
-                            # Non-200 status, will retry
-                            if attempt < max_retries - 1:
-                                jitter = 1 + random.uniform(0, 0.25)
-                                delay = base_delay * (2 ** attempt) * jitter
-                                logger.warning(
-                                    f"Index price fetch attempt {attempt + 1} failed (status {resp.status}) for {symbol}, "
-                                    f"retrying in {delay:.2f}s..."
-                                )
-                                await asyncio.sleep(delay)
-                                continue
+                async with self.mark_prices.session().get(url, params=params, timeout=timeout) as resp:
+                    if resp.status == 200:
+                        data = await resp.json()
+                        index_data = data.get("data") or {}
+                        index_price = index_data.get('indexPrice') or index_data.get('price', 0.0)
+                        if index_price and float(index_price) > 0:
+                            price_val = float(index_price)
+                            logger.info(f"Using index price {price_val} as fallback for {symbol}")
+                            return price_val
+                    else:
+                        # Non-200 status, will retry
+                        if attempt < max_retries - 1:
+                            jitter = 1 + random.uniform(0, 0.25)
+                            delay = base_delay * (2 ** attempt) * jitter
+                            logger.warning(
+                                f"Index price fetch attempt {attempt + 1} failed (status {resp.status}) for {symbol}, "
+                                f"retrying in {delay:.2f}s..."
+                            )
+                            await asyncio.sleep(delay)
+                            continue
 
             except asyncio.TimeoutError:
                 if attempt < max_retries - 1:
@@ -1709,12 +1637,7 @@ class KucoinExchange(ExchangeBase):
             Last traded price or None if failed
         """
         try:
-            all_symbols = await self.get_futures_symbols()
-            symbol_mapper.available_symbols = all_symbols
-            normalized_symbol = symbol.upper()
-            if normalized_symbol.startswith('BTC') and normalized_symbol.endswith('USDTM'):
-                normalized_symbol = normalized_symbol.replace('BTC', 'XBT', 1)
-            mapped_symbol = symbol_mapper.map_to_futures_symbol(normalized_symbol, all_symbols)
+            mapped_symbol = await self.mark_prices.map_symbol(symbol)
             if not mapped_symbol:
                 logger.warning(f"Could not map {symbol} to futures symbol for last traded price")
                 return None
@@ -1837,18 +1760,21 @@ class KucoinExchange(ExchangeBase):
             return None
 
     # Trade History
-    async def get_user_trades(self, symbol: str = "", limit: int = 1000,
+    async def get_user_trades(self, symbol: str = "", limit: Optional[int] = 1000,
                             from_id: int = 0, start_time: int = 0,
-                            end_time: int = 0) -> List[Dict[str, Any]]:
+                            end_time: int = 0, raise_errors: bool = False) -> List[Dict[str, Any]]:
         """
         Get user trade history.
 
+        Pages through the fills of the range until ``limit`` trades are read.
+
         Args:
             symbol: Trading pair symbol (empty for all)
-            limit: Maximum number of trades
+            limit: Maximum number of trades (None for every page)
             from_id: Start from trade ID
             start_time: Start time in milliseconds
             end_time: End time in milliseconds
+            raise_errors: Raise on a failed or truncated read instead of returning []
 
         Returns:
             List of trade history records
@@ -1857,37 +1783,36 @@ class KucoinExchange(ExchangeBase):
             await self._init_client()
 
             if not self.client:
-                logger.error("KuCoin client not initialized")
-                return []
+                raise RuntimeError("KuCoin client not initialized")
 
             futures_order_api = self.client.get_futures_service().get_order_api()
 
             from kucoin_universal_sdk.generate.futures.order.model_get_trade_history_req import GetTradeHistoryReqBuilder
 
-            # Build get trade history request
-            trade_request = GetTradeHistoryReqBuilder()
-
-            if symbol:
-                trade_request.set_symbol(symbol)
-            if start_time:
-                trade_request.set_start_at(start_time)
-            if end_time:
-                trade_request.set_end_at(end_time)
-
-            request = trade_request.build()
-            response = futures_order_api.get_trade_history(request)
-
-            if not response:
-                logger.info("No trade history found")
-                return []
-
-            # Try to get data attribute safely
-            trade_data_list = []
-            resp_any = cast(Any, response)
-            if hasattr(resp_any, 'data') and resp_any.data:
-                trade_data_list = resp_any.data
-            elif hasattr(resp_any, 'items') and resp_any.items:
-                trade_data_list = resp_any.items
+            page_size = min(limit, TRADE_HISTORY_PAGE_SIZE) if limit else TRADE_HISTORY_PAGE_SIZE
+            trade_data_list: List[Any] = []
+            for page in range(1, MAX_HISTORY_PAGES + 1):
+                # Build get trade history request
+                trade_request = GetTradeHistoryReqBuilder().set_current_page(page).set_page_size(page_size)
+
+                if symbol:
+                    trade_request.set_symbol(symbol)
+                if start_time:
+                    trade_request.set_start_at(start_time)
+                if end_time:
+                    trade_request.set_end_at(end_time)
+
+                resp_any = cast(Any, futures_order_api.get_trade_history(trade_request.build()))
+                items = list(getattr(resp_any, 'items', None) or getattr(resp_any, 'data', None) or [])
+                trade_data_list.extend(items)
+
+                if limit and len(trade_data_list) >= limit:
+                    trade_data_list = trade_data_list[:limit]
+                    break
+                if len(items) < page_size or page >= (getattr(resp_any, 'total_page', None) or page):
+                    break
+            else:
+                raise RuntimeError(f"KuCoin trade history truncated after {MAX_HISTORY_PAGES} pages")
 
             if not trade_data_list:
                 logger.info("No trade history found")
@@ -1906,16 +1831,17 @@ class KucoinExchange(ExchangeBase):
 
                 # Format trade data to match expected format
                 formatted_trade = {
-                    "id": getattr(trade_data, 'id', ''),
+                    "id": getattr(trade_data, 'trade_id', None) or getattr(trade_data, 'id', ''),
                     "symbol": getattr(trade_data, 'symbol', symbol),
                     "side": getattr(trade_data, 'side', 'UNKNOWN'),
                     "type": getattr(trade_data, 'type', 'UNKNOWN'),
-                    "size": float(getattr(trade_data, 'size', 0)),
-                    "price": float(getattr(trade_data, 'price', 0)),
-                    "value": float(getattr(trade_data, 'value', 0)),
-                    "fee": float(getattr(trade_data, 'fee', 0)),
-                    "feeCurrency": getattr(trade_data, 'feeCurrency', 'USDT'),
-                    "time": getattr(trade_data, 'createdAt', getattr(trade_data, 'time', 0)),
+                    "size": float(getattr(trade_data, 'size', 0) or 0),
+                    "price": float(getattr(trade_data, 'price', 0) or 0),
+                    "value": float(getattr(trade_data, 'value', 0) or 0),
+                    "fee": float(getattr(trade_data, 'fee', 0) or 0),
+                    "feeCurrency": getattr(trade_data, 'fee_currency', None) or getattr(trade_data, 'feeCurrency', 'USDT'),
+                    "time": (getattr(trade_data, 'created_at', None) or getattr(trade_data, 'createdAt', None)
+                             or getattr(trade_data, 'time', 0)),
                     "orderId": order_id,
                     "raw_response": trade_data
                 }
@@ -1926,20 +1852,26 @@ class KucoinExchange(ExchangeBase):
 
         except Exception as e:
             logger.error(f"Failed to get KuCoin user trades: {e}")
+            if raise_errors:
+                raise
             return []
 
     async def get_income_history(self, symbol: str = "", income_type: str = "",
                                start_time: int = 0, end_time: int = 0,
-                               limit: int = 1000) -> List[Dict[str, Any]]:
+                               limit: Optional[int] = 1000, raise_errors: bool = False) -> List[Dict[str, Any]]:
         """
         Get income history (fees, funding, etc.).
 
+        Pages through the funding settlements of the range until ``limit``
+        records are read.
+
         Args:
             symbol: Trading pair symbol (empty for all)
             income_type: Type of income (empty for all)
             start_time: Start time in milliseconds
             end_time: End time in milliseconds
-            limit: Maximum number of records
+            limit: Maximum number of records (None for every page)
+            raise_errors: Raise on a failed or truncated read instead of returning []
 
         Returns:
             List of income history records
@@ -1948,37 +1880,40 @@ class KucoinExchange(ExchangeBase):
             await self._init_client()
 
             if not self.client:
-                logger.error("KuCoin client not initialized")
-                return []
+                raise RuntimeError("KuCoin client not initialized")
 
             futures_funding_api = self.client.get_futures_service().get_funding_fees_api()
 
             from kucoin_universal_sdk.generate.futures.fundingfees.model_get_private_funding_history_req import GetPrivateFundingHistoryReqBuilder
 
-            # Build get private funding history request
-            funding_request = GetPrivateFundingHistoryReqBuilder()
-
-            if symbol:
-                funding_request.set_symbol(symbol)
-            if start_time:
-                funding_request.set_start_at(start_time)
-            if end_time:
-                funding_request.set_end_at(end_time)
-
-            request = funding_request.build()
-            response = futures_funding_api.get_private_funding_history(request)
-
-            if not response:
-                logger.info("No income history found")
-                return []
-
-            # Try to get data attribute safely
-            income_data_list = []
-            resp_any = cast(Any, response)
-            if hasattr(resp_any, 'data') and resp_any.data:
-                income_data_list = resp_any.data
-            elif hasattr(resp_any, 'items') and resp_any.items:
-                income_data_list = resp_any.items
+            page_size = min(limit, FUNDING_HISTORY_PAGE_SIZE) if limit else FUNDING_HISTORY_PAGE_SIZE
+            income_data_list: List[Any] = []
+            offset = None
+            for _ in range(MAX_HISTORY_PAGES):
+                # Build get private funding history request
+                funding_request = GetPrivateFundingHistoryReqBuilder().set_max_count(page_size)
+
+                if symbol:
+                    funding_request.set_symbol(symbol)
+                if start_time:
+                    funding_request.set_start_at(start_time)
+                if end_time:
+                    funding_request.set_end_at(end_time)
+                if offset is not None:
+                    funding_request.set_offset(offset)
+
+                resp_any = cast(Any, futures_funding_api.get_private_funding_history(funding_request.build()))
+                items = list(getattr(resp_any, 'data_list', None) or [])
+                income_data_list.extend(items)
+
+                if limit and len(income_data_list) >= limit:
+                    income_data_list = income_data_list[:limit]
+                    break
+                offset = getattr(items[-1], 'id', None) if items else None
+                if not getattr(resp_any, 'has_more', False) or offset is None:
+                    break
+            else:
+                raise RuntimeError(f"KuCoin funding history truncated after {MAX_HISTORY_PAGES} pages")
 
             if not income_data_list:
                 logger.info("No income history found")
@@ -1991,9 +1926,9 @@ class KucoinExchange(ExchangeBase):
                     "id": getattr(income_data, 'id', ''),
                     "symbol": getattr(income_data, 'symbol', symbol),
                     "type": "FUNDING_FEE",
-                    "amount": float(getattr(income_data, 'amount', 0)),
-                    "currency": getattr(income_data, 'currency', 'USDT'),
-                    "time": getattr(income_data, 'createdAt', 0),
+                    "amount": float(getattr(income_data, 'funding', 0) or 0),
+                    "currency": getattr(income_data, 'settle_currency', None) or 'USDT',
+                    "time": getattr(income_data, 'time_point', 0),
                     "raw_response": income_data
                 }
                 income_records.append(formatted_income)
@@ -2003,11 +1938,13 @@ class KucoinExchange(ExchangeBase):
 
         except Exception as e:
             logger.error(f"Failed to get KuCoin income history: {e}")
+            if raise_errors:
+                raise
             return []
 
     async def get_account_ledgers(self, currency: str = "", biz_type: str = "",
                                 start_time: int = 0, end_time: int = 0,
-                                limit: int = 1000) -> List[Dict[str, Any]]:
+                                limit: Optional[int] = 1000, raise_errors: bool = False) -> List[Dict[str, Any]]:
         """
         Get comprehensive account ledger from KuCoin.
 
@@ -2019,93 +1956,18 @@ class KucoinExchange(ExchangeBase):
             biz_type: Business type filter (empty for all)
             start_time: Start time in milliseconds
             end_time: End time in milliseconds
-            limit: Maximum number of records
+            limit: Maximum number of records (None for every page)
+            raise_errors: Raise on a failed or truncated read instead of returning []
 
         Returns:
             List of account ledger records
         """
-        try:
-            await self._init_client()
-
-            if not self.client:
-                logger.error("KuCoin client not initialized")
-                return []
-
-            # Build request parameters
-            params = {}
-            if currency:
-                params['currency'] = currency
-            if biz_type:
-                params['bizType'] = biz_type
-            if start_time:
-                params['startAt'] = start_time
-            if end_time:
-                params['endAt'] = end_time
-
-            # Use direct API call approach since SDK structure is unclear
-            response = await self._make_direct_api_call(
-                'GET', '/api/v1/accounts/ledgers', params
-            )
-
-            if not response:
-                logger.info("No account ledgers found")
-                return []
-
-            # Handle response data
-            ledger_data_list = []
-            if isinstance(response, list):
-                ledger_data_list = response
-            elif isinstance(response, dict):
-                ledger_data_list = response.get('data', [])
-                if not ledger_data_list:
-                    ledger_data_list = response.get('items', [])
-
-            if not ledger_data_list:
-                logger.info("No account ledgers found")
-                return []
-
-            ledger_records = []
-            for ledger_data in ledger_data_list:
-                # Format ledger data to match expected format
-                if isinstance(ledger_data, dict):
-                    formatted_ledger = {
-                        "id": ledger_data.get('id', ''),
-                        "currency": ledger_data.get('currency', ''),
-                        "amount": float(ledger_data.get('amount', 0)),
-                        "fee": float(ledger_data.get('fee', 0)),
-                        "balance": float(ledger_data.get('balance', 0)),
-                        "bizType": ledger_data.get('bizType', ''),
-                        "direction": ledger_data.get('direction', ''),
-                        "createdAt": ledger_data.get('createdAt', 0),
-                        "context": ledger_data.get('context', ''),
-                        "raw_response": ledger_data
-                    }
-                else:
-                    # Handle object attributes if it's not a dict
-                    formatted_ledger = {
-                        "id": getattr(ledger_data, 'id', ''),
-                        "currency": getattr(ledger_data, 'currency', ''),
-                        "amount": float(getattr(ledger_data, 'amount', 0)),
-                        "fee": float(getattr(ledger_data, 'fee', 0)),
-                        "balance": float(getattr(ledger_data, 'balance', 0)),
-                        "bizType": getattr(ledger_data, 'bizType', ''),
-                        "direction": getattr(ledger_data, 'direction', ''),
-                        "createdAt": getattr(ledger_data, 'createdAt', 0),
-                        "context": getattr(ledger_data, 'context', ''),
-                        "raw_response": ledger_data
-                    }
-                ledger_records.append(formatted_ledger)
-
-            logger.info(f"Retrieved {len(ledger_records)} KuCoin account ledger records")
-            return ledger_records
-
-        except Exception as e:
-            logger.error(f"Failed to get KuCoin account ledgers: {e}")
-            return []
+        return await self._get_ledgers('/api/v1/accounts/ledgers', 'account ledger', currency, biz_type,
+                                       start_time, end_time, limit, raise_errors)
 
     async def get_futures_account_ledgers(self, currency: str = "", biz_type: str = "",
                                         start_time: int = 0, end_time: int = 0,
-                                        limit: int = 1000) -> List[Dict[str, Any]]:
+                                        limit: Optional[int] = 1000, raise_errors: bool = False) -> List[Dict[str, Any]]:
         """
         Get futures account ledger from KuCoin.
 
@@ -2116,20 +1978,27 @@ class KucoinExchange(ExchangeBase):
             biz_type: Business type filter (empty for all)
             start_time: Start time in milliseconds
             end_time: End time in milliseconds
-            limit: Maximum number of records
+            limit: Maximum number of records (None for every page)
+            raise_errors: Raise on a failed or truncated read instead of returning []
 
         Returns:
             List of futures account ledger records
         """
+        return await self._get_ledgers('/api/v1/futures/account/ledgers', 'futures account ledger', currency,
+                                       biz_type, start_time, end_time, limit, raise_errors)
+
+    async def _get_ledgers(self, endpoint: str, label: str, currency: str, biz_type: str,
+                           start_time: int, end_time: int, limit: Optional[int],
+                           raise_errors: bool) -> List[Dict[str, Any]]:
+        """Read and format the ledger records of a ledger endpoint."""
         try:
             await self._init_client()
 
             if not self.client:
-                logger.error("KuCoin client not initialized")
-                return []
+                raise RuntimeError("KuCoin client not initialized")
 
             # Build request parameters
-            params = {}
+            params: Dict[str, Any] = {}
             if currency:
                 params['currency'] = currency
             if biz_type:
@@ -2139,67 +2008,38 @@ class KucoinExchange(ExchangeBase):
             if end_time:
                 params['endAt'] = end_time
 
-            # Use direct API call approach since SDK structure is unclear
-            response = await self._make_direct_api_call(
-                'GET', '/api/v1/futures/account/ledgers', params
-            )
-
-            if not response:
-                logger.info("No futures account ledgers found")
-                return []
-
-            # Handle response data
-            ledger_data_list = []
-            if isinstance(response, list):
-                ledger_data_list = response
-            elif isinstance(response, dict):
-                ledger_data_list = response.get('data', [])
-                if not ledger_data_list:
-                    ledger_data_list = response.get('items', [])
-
+            ledger_data_list = await self._direct_api_pages(endpoint, params, limit)
             if not ledger_data_list:
-                logger.info("No futures account ledgers found")
+                logger.info(f"No {label}s found")
                 return []
 
-            ledger_records = []
-            for ledger_data in ledger_data_list:
-                # Format ledger data to match expected format
-                if isinstance(ledger_data, dict):
-                    formatted_ledger = {
-                        "id": ledger_data.get('id', ''),
-                        "currency": ledger_data.get('currency', ''),
-                        "amount": float(ledger_data.get('amount', 0)),
-                        "fee": float(ledger_data.get('fee', 0)),
-                        "balance": float(ledger_data.get('balance', 0)),
-                        "bizType": ledger_data.get('bizType', ''),
-                        "direction": ledger_data.get('direction', ''),
-                        "createdAt": ledger_data.get('createdAt', 0),
-                        "context": ledger_data.get('context', ''),
-                        "raw_response": ledger_data
-                    }
-                else:
-                    # Handle object attributes if it's not a dict
-                    formatted_ledger = {
-                        "id": getattr(ledger_data, 'id', ''),
-                        "currency": getattr(ledger_data, 'currency', ''),
-                        "amount": float(getattr(ledger_data, 'amount', 0)),
-                        "fee": float(getattr(ledger_data, 'fee', 0)),
-                        "balance": float(getattr(ledger_data, 'balance', 0)),
-                        "bizType": getattr(ledger_data, 'bizType', ''),
-                        "direction": getattr(ledger_data, 'direction', ''),
-                        "createdAt": getattr(ledger_data, 'createdAt', 0),
-                        "context": getattr(ledger_data, 'context', ''),
-                        "raw_response": ledger_data
-                    }
-                ledger_records.append(formatted_ledger)
-
-            logger.info(f"Retrieved {len(ledger_records)} KuCoin futures account ledger records")
+            ledger_records = [self._format_ledger(ledger_data) for ledger_data in ledger_data_list]
+            logger.info(f"Retrieved {len(ledger_records)} KuCoin {label} records")
             return ledger_records
 
         except Exception as e:
-            logger.error(f"Failed to get KuCoin futures account ledgers: {e}")
+            logger.error(f"Failed to get KuCoin {label}s: {e}")
+            if raise_errors:
+                raise
             return []
 
+    @staticmethod
+    def _format_ledger(ledger_data: Any) -> Dict[str, Any]:
+        """Format a ledger record (dict or SDK object) to match the expected format."""
+        get = ledger_data.get if isinstance(ledger_data, dict) else (lambda key, default: getattr(ledger_data, key, default))
+        return {
+            "id": get('id', ''),
+            "currency": get('currency', ''),
+            "amount": float(get('amount', 0) or 0),
+            "fee": float(get('fee', 0) or 0),
+            "balance": float(get('balance', 0) or 0),
+            "bizType": get('bizType', ''),
+            "direction": get('direction', ''),
+            "createdAt": get('createdAt', 0),
+            "context": get('context', ''),
+            "raw_response": ledger_data
+        }
+
     # Helper Methods
     def _convert_order_type(self, order_type: str) -> str:
         """Convert standard order type to KuCoin format.
@@ -2216,7 +2056,57 @@ class KucoinExchange(ExchangeBase):
         }
         return type_mapping.get(order_type.upper(), "limit")
 
-    async def _make_direct_api_call(self, method: str, endpoint: str, params: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    async def _direct_api_request(self, method: str, endpoint: str,
+                                  params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Make a signed request to the KuCoin futures REST API.
+
+        Args:
+            method: HTTP method (GET or POST)
+            endpoint: API endpoint path
+            params: Query parameters (GET) or JSON body (POST)
+
+        Returns:
+            Dict: The response body of a successful (code 200000) request
+
+        Raises:
+            RuntimeError: If the client is not ready or the API returned an error
+        """
+        if not self.client:
+            raise RuntimeError("KuCoin client not initialized")
+        if not hasattr(self.client, 'auth') or not self.client.auth:
+            raise RuntimeError("KuCoin client auth not initialized")
+        if method.upper() not in ('GET', 'POST'):
+            raise RuntimeError(f"Unsupported HTTP method: {method}")
+
+        # Prepare parameters
+        if params is None:
+            params = {}
+
+        # Build URL and auth headers
+        url = f"{self._futures_base_url()}{endpoint}"
+        headers = self.client.auth.get_futures_headers(method, endpoint, params)
+
+        timeout = aiohttp.ClientTimeout(total=15)
+        with time_exchange_request('kucoin', method, endpoint):
+            async with aiohttp.ClientSession() as session:
+                if method.upper() == 'GET':
+                    async with session.get(url, headers=headers, params=params, timeout=timeout) as resp:
+                        data = await resp.json()
+                else:
+                    async with session.post(url, headers=headers, json=params, timeout=timeout) as resp:
+                        data = await resp.json()
+
+        if not isinstance(data, dict):
+            raise RuntimeError(f"Unexpected KuCoin response type for {endpoint}: {type(data)}")
+        # KuCoin responses typically wrap with code/data
+        if data.get('code') != '200000':
+            raise RuntimeError(f"KuCoin API error for {endpoint}: code={data.get('code')}, "
+                               f"msg={data.get('msg') or data}")
+        return data
+
+    async def _make_direct_api_call(self, method: str, endpoint: str, params: Optional[Dict[str, Any]] = None,
+                                    raise_errors: bool = False) -> List[Dict[str, Any]]:
         """
         Make a direct API call to KuCoin using the existing client.
 
@@ -2224,98 +2114,95 @@ class KucoinExchange(ExchangeBase):
             method: HTTP method (GET, POST, etc.)
             endpoint: API endpoint path
             params: Query parameters
+            raise_errors: Raise on a failed request instead of returning []
 
         Returns:
             API response data
         """
         try:
-            if not self.client:
-                logger.error("KuCoin client not initialized")
-                return []
-
-            # Prepare parameters
-            if params is None:
-                params = {}
-
-            # Build URL and auth headers
-            futures_base_url = self._futures_base_url()
-            url = f"{futures_base_url}{endpoint}"
-
-            if not hasattr(self.client, 'auth') or not self.client.auth:
-                logger.error("KuCoin client auth not initialized")
-                return []
+            data = await self._direct_api_request(method, endpoint, params)
+        except Exception as e:
+            logger.error(f"Direct API call failed for {endpoint}: {e}")
+            if raise_errors:
+                raise
+            return []
 
-            try:
-                headers = self.client.auth.get_futures_headers(method, endpoint, params)
-            except Exception as e:
-                logger.error(f"Failed to build KuCoin auth headers for {endpoint}: {e}")
-                return []
+        payload = data.get('data')
+
+        # Handle paginated responses with items array
+        if isinstance(payload, dict):
+            # Check for paginated structure: {items: [...], currentPage: N, pageSize: N, totalNum: N}
+            if 'items' in payload:
+                items = payload.get('items', [])
+                if isinstance(items, list):
+                    logger.debug(
+                        f"KuCoin paginated response for {endpoint}: "
+                        f"page {payload.get('currentPage', '?')}/{payload.get('totalPage', '?')}, "
+                        f"{len(items)} items"
+                    )
+                    return items
+            # Check for nested data.items structure
+            nested_data = payload.get('data')
+            if isinstance(nested_data, dict):
+                items = nested_data.get('items')
+                if isinstance(items, list):
+                    return items
+            # Single dict response - normalize to list
+            return [payload]
+
+        # Some endpoints use list at root of data
+        if isinstance(payload, list):
+            return payload
+
+        # Check root level for items (some endpoints return differently)
+        items = data.get('items', [])
+        return items if isinstance(items, list) else []
+
+    async def _direct_api_pages(self, endpoint: str, params: Dict[str, Any],
+                                limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Read every page of a paginated GET endpoint.
 
-            timeout = aiohttp.ClientTimeout(total=15)
-            try:
-                async with aiohttp.ClientSession() as session:
-                    if method.upper() == 'GET':
-                        async with session.get(url, headers=headers, params=params, timeout=timeout) as resp:
-                            data = await resp.json()
-                    elif method.upper() == 'POST':
-                        async with session.post(url, headers=headers, json=params, timeout=timeout) as resp:
-                            data = await resp.json()
-                    else:
-                        logger.error(f"Unsupported HTTP method: {method}")
-                        return []
+        Follows ``currentPage``/``totalPage`` paging ({items: [...]}) and
+        ``offset``/``hasMore`` paging ({dataList: [...]}).
 
-                if not isinstance(data, dict):
-                    logger.error(f"Unexpected KuCoin response type for {endpoint}: {type(data)}")
-                    return []
-
-                # KuCoin responses typically wrap with code/data
-                if isinstance(data, dict) and data.get('code') == '200000':
-                    payload = data.get('data')
-
-                    # Handle paginated responses with items array
-                    if isinstance(payload, dict):
-                        # Check for paginated structure: {items: [...], currentPage: N, pageSize: N, totalNum: N}
-                        if 'items' in payload:
-                            items = payload.get('items', [])
-                            if isinstance(items, list):
-                                logger.debug(
-                                    f"KuCoin paginated response for {endpoint}: "
-                                    f"page {payload.get('currentPage', '?')}/{payload.get('totalPage', '?')}, "
-                                    f"{len(items)} items"
-                                )
-                                return items
-                        # Check for nested data.items structure
-                        nested_data = payload.get('data') if isinstance(payload, dict) else None
-                        if isinstance(nested_data, dict):
-                            items = nested_data.get('items')
-                            if isinstance(items, list):
-                                return items
-                        # Single dict response - normalize to list
-                        return [payload]
-
-                    # Some endpoints use list at root of data
-                    if isinstance(payload, list):
-                        return payload
-
-                    # Check root level for items (some endpoints return differently)
-                    if isinstance(data, dict) and 'items' in data:
-                        items = data.get('items', [])
-                        if isinstance(items, list):
-                            return items
-
-                    return []
-                else:
-                    error_msg = data.get('msg') or str(data)
-                    logger.error(f"KuCoin API error for {endpoint}: code={data.get('code')}, msg={error_msg}")
-                    return []
+        Args:
+            endpoint: API endpoint path
+            params: Query parameters of the first page
+            limit: Stop after this many records (None for every page)
 
-            except Exception as e:
-                logger.error(f"Direct API call failed for {endpoint}: {e}")
-                return []
+        Returns:
+            List of records
 
-        except Exception as e:
-            logger.error(f"Direct API call failed: {e}")
-            return []
+        Raises:
+            RuntimeError: If a page fails or the pages exceed MAX_HISTORY_PAGES
+        """
+        page_size = min(limit, LEDGER_PAGE_SIZE) if limit else LEDGER_PAGE_SIZE
+        page_params = {**params, 'currentPage': 1, 'pageSize': page_size}
+        records: List[Dict[str, Any]] = []
+        for page in range(1, MAX_HISTORY_PAGES + 1):
+            payload = (await self._direct_api_request('GET', endpoint, page_params)).get('data')
+            if isinstance(payload, list):
+                return payload[:limit] if limit else payload
+            if not isinstance(payload, dict):
+                return records
+            items = payload.get('items')
+            if items is None:
+                items = payload.get('dataList') or []
+            records.extend(items)
+            if limit and len(records) >= limit:
+                return records[:limit]
+
+            if 'hasMore' in payload:
+                if not payload.get('hasMore') or not items:
+                    return records
+                last = items[-1]
+                page_params = {**params, 'offset': last.get('offset', last.get('id')), 'maxCount': page_size}
+            else:
+                if not items or page >= int(payload.get('totalPage') or page):
+                    return records
+                page_params = {**params, 'currentPage': page + 1, 'pageSize': page_size}
+        raise RuntimeError(f"KuCoin {endpoint} truncated after {MAX_HISTORY_PAGES} pages")
 
     async def get_all_open_futures_orders(self) -> List[Dict[str, Any]]:
         """
@@ -0,0 +1,311 @@
+"""
+KuCoin Mark Price Fetcher
+
+Shared mark-price lookups for KucoinExchange. Concurrent requests for the
+same symbol share one in-flight fetch (and one retry loop), the futures
+symbol table is cached instead of being re-downloaded on every attempt,
+and all HTTP calls go through one aiohttp session. A background refresh
+reads the active contracts list, which carries the mark price of every
+contract, and updates the prices of recently requested symbols in a
+single request.
+"""
+
+import asyncio
+import logging
+import random
+import time as _time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+import aiohttp
+
+from ..core.symbol_registry import get_symbol_registry
+from .kucoin_symbol_mapper import symbol_mapper
+
+logger = logging.getLogger(__name__)
+
+PriceCache = Dict[str, Tuple[float, float, str]]
+PriceFallback = Callable[[str, Optional[str]], Awaitable[Optional[float]]]
+
+
+def normalize_futures_symbol(symbol: str) -> str:
+    """Upper-case a symbol and use KuCoin's XBT code for BTC contracts."""
+    normalized = symbol.upper()
+    if normalized.startswith('BTC') and normalized.endswith('USDTM'):
+        normalized = normalized.replace('BTC', 'XBT', 1)
+    return normalized
+
+
+class KucoinMarkPriceFetcher:
+    """Single-flight, cached mark-price lookups for KuCoin futures."""
+
+    def __init__(self, base_url: Callable[[], str], price_cache: PriceCache,
+                 fallback: Optional[PriceFallback] = None,
+                 cache_ttl: float = 15.0, symbols_ttl: float = 300.0,
+                 max_retries: int = 5, base_delay: float = 0.5,
+                 watch_ttl: float = 600.0):
+        """
+        Initialize the fetcher.
+
+        Args:
+            base_url: Returns the futures REST base URL
+            price_cache: Shared cache of symbol -> (price, fetched_at, source)
+            fallback: Coroutine (symbol, mapped_symbol) -> price used when the mark price is unavailable
+            cache_ttl: Seconds a cached price is served without refetching
+            symbols_ttl: Seconds the futures symbol table is reused
+            max_retries: Mark price request attempts per fetch
+            base_delay: First retry delay in seconds (doubles per attempt)
+            watch_ttl: Seconds a symbol stays in the scheduled refresh after its last request
+        """
+        self.base_url = base_url
+        self.price_cache = price_cache
+        self.fallback = fallback
+        self.cache_ttl = cache_ttl
+        self.symbols_ttl = symbols_ttl
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.watch_ttl = watch_ttl
+
+        self._symbols: List[str] = []
+        self._symbols_at = 0.0
+        self._symbols_task: Optional[asyncio.Task] = None
+        self._mapped: Dict[str, Optional[str]] = {}
+        self._inflight: Dict[str, asyncio.Task] = {}
+        # mapped contract -> {cache key: last requested}
+        self._watched: Dict[str, Dict[str, float]] = {}
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+        self.stats = {'hits': 0, 'fetches': 0, 'shared': 0, 'requests': 0, 'batch_refreshes': 0}
+
+    def session(self) -> aiohttp.ClientSession:
+        """HTTP session shared by all price requests of this exchange."""
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            self._session = aiohttp.ClientSession()
+            self._session_loop = loop
+        return self._session
+
+    async def _get_json(self, path: str, params: Optional[Dict[str, Any]] = None,
+                        timeout: float = 10.0) -> Tuple[int, Dict[str, Any]]:
+        self.stats['requests'] += 1
+        async with self.session().get(f"{self.base_url()}{path}", params=params,
+                                      timeout=aiohttp.ClientTimeout(total=timeout)) as resp:
+            if resp.status != 200:
+                return resp.status, {}
+            return resp.status, await resp.json()
+
+    async def close(self) -> None:
+        """Stop the scheduled refresh and close the HTTP session."""
+        await self.stop_refresh()
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._session_loop = None
+
+    # Symbol table
+
+    async def _fetch_contracts(self) -> List[Dict[str, Any]]:
+        _, data = await self._get_json("/api/v1/contracts/active")
+        return [c for c in (data.get("data") or []) if c.get('status') == 'Open' and c.get('symbol')]
+
+    def _apply_contracts(self, contracts: List[Dict[str, Any]]) -> None:
+        """Rebuild the symbol table, mapping cache and symbol registry from a contracts list."""
+        self._symbols = [c['symbol'] for c in contracts]
+        self._symbols_at = _time.monotonic()
+        self._mapped.clear()
+        symbol_mapper.available_symbols = self._symbols
+        get_symbol_registry().load_kucoin(contracts)
+
+    def _symbols_stale(self) -> bool:
+        return not self._symbols or _time.monotonic() - self._symbols_at >= self.symbols_ttl
+
+    async def _load_contracts(self) -> List[Dict[str, Any]]:
+        contracts = await self._fetch_contracts()
+        if contracts:
+            self._apply_contracts(contracts)
+        return contracts
+
+    async def futures_symbols(self) -> List[str]:
+        """Open futures symbols, reloaded at most once per symbols_ttl."""
+        if not self._symbols_stale():
+            return self._symbols
+        if self._symbols_task is None or self._symbols_task.done():
+            self._symbols_task = asyncio.ensure_future(self._load_contracts())
+        try:
+            await asyncio.shield(self._symbols_task)
+        except Exception as e:
+            logger.error(f"Failed to load KuCoin futures symbols: {e}")
+        return self._symbols
+
+    async def map_symbol(self, symbol: str) -> Optional[str]:
+        """Map a trading pair to its KuCoin futures contract (e.g. BTCUSDTM -> XBTUSDTM)."""
+        normalized = normalize_futures_symbol(symbol)
+        if normalized in self._mapped:
+            return self._mapped[normalized]
+        symbols = await self.futures_symbols()
+        if not symbols:
+            return None
+        mapped = symbol_mapper.map_to_futures_symbol(normalized, symbols)
+        self._mapped[normalized] = mapped
+        return mapped
+
+    # Mark prices
+
+    def cached_price(self, symbol: str) -> Optional[float]:
+        """Fresh cached price for a symbol, or None."""
+        cached = self.price_cache.get(symbol.upper())
+        if cached and cached[0] > 0 and _time.time() - cached[1] <= self.cache_ttl:
+            return cached[0]
+        return None
+
+    async def get_mark_price(self, symbol: str) -> Optional[float]:
+        """
+        Get the mark price, sharing one fetch between concurrent callers.
+
+        Args:
+            symbol: Trading pair
+
+        Returns:
+            Optional[float]: Mark price (or fallback / stale cached price), None if unavailable
+        """
+        cache_key = symbol.upper()
+        price = self.cached_price(cache_key)
+        if price is not None:
+            self.stats['hits'] += 1
+            self._touch_watch(symbol, cache_key)
+            return price
+
+        task = self._inflight.get(cache_key)
+        if task is None:
+            task = asyncio.ensure_future(self._resolve(symbol, cache_key))
+            self._inflight[cache_key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(cache_key, None))
+        else:
+            self.stats['shared'] += 1
+        return await asyncio.shield(task)
+
+    async def _resolve(self, symbol: str, cache_key: str) -> Optional[float]:
+        self.stats['fetches'] += 1
+        mapped_symbol = await self.map_symbol(symbol)
+        if not mapped_symbol:
+            logger.warning(f"Could not map {symbol} to futures symbol for mark price")
+            return None
+        self._watched.setdefault(mapped_symbol, {})[cache_key] = _time.monotonic()
+
+        for attempt in range(self.max_retries):
+            try:
+                status, data = await self._get_json(f"/api/v1/mark-price/{mapped_symbol}/current",
+                                                    timeout=10 + attempt * 2)
+                mark_price = (data.get("data") or {}).get('value', 0.0)
+                if mark_price and float(mark_price) > 0:
+                    price_val = float(mark_price)
+                    self.price_cache[cache_key] = (price_val, _time.time(), "mark")
+                    return price_val
+                reason = f"status {status}"
+            except asyncio.TimeoutError:
+                reason = "timeout"
+            except Exception as e:
+                reason = str(e)
+
+            if attempt < self.max_retries - 1:
+                delay = self.base_delay * (2 ** attempt) * (1 + random.uniform(0, 0.25))
+                logger.warning(f"Mark price fetch attempt {attempt + 1} for {symbol} failed ({reason}), retrying in {delay:.2f}s...")
+                await asyncio.sleep(delay)
+
+        logger.warning(f"All {self.max_retries} attempts to fetch mark price for {symbol} failed, trying index price fallback...")
+        if self.fallback is not None:
+            fallback_price = await self.fallback(symbol, mapped_symbol)
+            if fallback_price and fallback_price > 0:
+                self.price_cache[cache_key] = (fallback_price, _time.time(), "index")
+                return fallback_price
+
+        cached = self.price_cache.get(cache_key)
+        if cached and cached[0] > 0:
+            logger.warning(f"Using stale cached price for {symbol}: {cached[0]}")
+            return cached[0]
+        return None
+
+    # Scheduled batch refresh
+
+    def _touch_watch(self, symbol: str, cache_key: str) -> None:
+        """Keep a symbol served from the cache in the scheduled refresh."""
+        mapped = self._mapped.get(normalize_futures_symbol(symbol))
+        if mapped is None:
+            mapped = next((m for m, keys in self._watched.items() if cache_key in keys), None)
+        if mapped:
+            self._watched.setdefault(mapped, {})[cache_key] = _time.monotonic()
+
+    def watched_symbols(self) -> Set[str]:
+        """Contracts requested within watch_ttl (older entries are dropped)."""
+        cutoff = _time.monotonic() - self.watch_ttl
+        for mapped in list(self._watched):
+            keys = {k: t for k, t in self._watched[mapped].items() if t >= cutoff}
+            if keys:
+                self._watched[mapped] = keys
+            else:
+                del self._watched[mapped]
+        return set(self._watched)
+
+    async def refresh_watched(self) -> int:
+        """
+        Refresh the prices of all watched symbols with one contracts request.
+
+        The symbol table is only rebuilt from the response once it is older
+        than ``symbols_ttl``; other ticks just update prices.
+
+        Returns:
+            int: Number of cache entries updated
+        """
+        watched = self.watched_symbols()
+        if not watched:
+            return 0
+        self.stats['batch_refreshes'] += 1
+        now = _time.time()
+        updated = 0
+        contracts = await self._fetch_contracts()
+        if contracts and self._symbols_stale():
+            self._apply_contracts(contracts)
+        for contract in contracts:
+            mapped = contract['symbol']
+            if mapped not in watched:
+                continue
+            try:
+                price = float(contract.get('markPrice') or 0)
+            except (TypeError, ValueError):
+                continue
+            if price <= 0:
+                continue
+            for cache_key in self._watched.get(mapped, {}):
+                self.price_cache[cache_key] = (price, now, "mark")
+                updated += 1
+        return updated
+
+    def start_refresh(self, interval_seconds: float = 5.0) -> asyncio.Task:
+        """Start refreshing watched symbols in the background."""
+        if self._refresh_task is not None and not self._refresh_task.done():
+            return self._refresh_task
+
+        async def _refresh_loop():
+            while True:
+                await asyncio.sleep(interval_seconds)
+                try:
+                    await self.refresh_watched()
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.error(f"KuCoin mark price refresh failed: {e}")
+
+        self._refresh_task = asyncio.create_task(_refresh_loop())
+        logger.info(f"KuCoin mark price refresh started (every {interval_seconds:.0f}s)")
+        return self._refresh_task
+
+    async def stop_refresh(self) -> None:
+        """Stop the scheduled refresh."""
+        task, self._refresh_task = self._refresh_task, None
+        if task is None or task.done():
+            return
+        task.cancel()
+        try:
+            await task
+        except (asyncio.CancelledError, Exception):
+            pass
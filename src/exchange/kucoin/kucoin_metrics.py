@@ -0,0 +1,25 @@
+"""
+KuCoin SDK request timing.
+
+Imported by KucoinClient.initialize() together with the SDK itself.
+"""
+
+import time
+
+from kucoin_universal_sdk.model.transport_option import Interceptor
+
+from src.core.metrics import observe_exchange_request
+
+
+class TimingInterceptor(Interceptor):
+    """SDK transport interceptor recording the latency of every REST call by endpoint."""
+
+    def before(self, req):
+        req._metrics_start = time.perf_counter()
+        return req
+
+    def after(self, req, resp, err):
+        start = getattr(req, '_metrics_start', None)
+        if start is not None:
+            observe_exchange_request('kucoin', req.method or '', req.url or '', time.perf_counter() - start)
+        return resp
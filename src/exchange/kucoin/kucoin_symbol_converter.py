@@ -9,6 +9,8 @@ and KuCoin symbol format (COIN-USDT) for both spot and futures trading.
 import logging
 from typing import Any, Dict, List, Optional
 
+from ..core.symbol_registry import get_symbol_registry
+
 logger = logging.getLogger(__name__)
 
 class KucoinSymbolConverter:
@@ -82,6 +84,11 @@ class KucoinSymbolConverter:
         if not bot_symbol:
             return bot_symbol
 
+        # Listed contracts resolve through the registry (XBT, 1000x prefixes)
+        listed = get_symbol_registry().kucoin_symbol(bot_symbol)
+        if listed:
+            return listed
+
         # Handle BTC -> XBT mapping for futures (special case for KuCoin)
         # Must check BTCUSDTM before checking BTCUSDT
         if bot_symbol == "BTCUSDTM":
@@ -209,6 +216,8 @@ class KucoinSymbolConverter:
             logger.warning("No available symbols provided for matching")
             return None
 
+        available = set(available_symbols)
+
         # Get variants based on trading type
         if trading_type.lower() == "futures":
             target_symbol = self.convert_bot_to_kucoin_futures(bot_symbol)
@@ -216,26 +225,23 @@ class KucoinSymbolConverter:
             target_symbol = self.convert_bot_to_kucoin_spot(bot_symbol)
 
         # Check if target symbol is available
-        if target_symbol in available_symbols:
-            logger.info(f"Found exact match for {bot_symbol}: {target_symbol}")
+        if target_symbol in available:
+            logger.debug(f"Found exact match for {bot_symbol}: {target_symbol}")
             return target_symbol
 
         # Try all variants
         variants = self.get_symbol_variants(bot_symbol)
         for variant in variants:
-            if variant in available_symbols:
+            if variant in available:
                 logger.info(f"Found variant match for {bot_symbol}: {variant}")
                 return variant
 
         # Try case-insensitive matching
-        available_upper = [s.upper() for s in available_symbols]
         target_upper = target_symbol.upper()
-        if target_upper in available_upper:
-            # Find the original case version
-            for symbol in available_symbols:
-                if symbol.upper() == target_upper:
-                    logger.info(f"Found case-insensitive match for {bot_symbol}: {symbol}")
-                    return symbol
+        for symbol in available_symbols:
+            if symbol.upper() == target_upper:
+                logger.info(f"Found case-insensitive match for {bot_symbol}: {symbol}")
+                return symbol
 
         logger.warning(f"No matching symbol found for {bot_symbol} in {len(available_symbols)} available symbols")
         return None
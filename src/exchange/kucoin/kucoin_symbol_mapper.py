@@ -8,6 +8,8 @@ This addresses the issue where symbols like DAM-USDT are not directly supported.
 import logging
 from typing import Dict, List, Optional, Tuple
 
+from ..core.symbol_registry import get_symbol_registry
+
 logger = logging.getLogger(__name__)
 
 
@@ -84,15 +86,22 @@ class KucoinSymbolMapper:
             logger.warning("No available symbols provided for mapping")
             return None
 
+        available = set(available_symbols)
+
         # Check cache first
         if symbol in self.symbol_cache:
             cached_symbol = self.symbol_cache[symbol]
-            if cached_symbol in available_symbols:
+            if cached_symbol in available:
                 return cached_symbol
             else:
                 # Remove from cache if no longer available
                 del self.symbol_cache[symbol]
 
+        listed = get_symbol_registry().kucoin_symbol(symbol)
+        if listed in available:
+            self.symbol_cache[symbol] = listed
+            return listed
+
         variants = self.get_symbol_variants(symbol)
 
         # Add alias variants (e.g., BTC -> XBT)
@@ -102,7 +111,7 @@ class KucoinSymbolMapper:
             variants.extend([f"{alias}-USDT", f"{alias}USDT", f"{alias}USDTM"])
 
         for variant in variants:
-            if variant in available_symbols:
+            if variant in available:
                 # Cache the successful mapping
                 self.symbol_cache[symbol] = variant
                 logger.info(f"Mapped {symbol} to KuCoin futures symbol: {variant}")
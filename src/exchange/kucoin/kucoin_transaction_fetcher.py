@@ -8,13 +8,20 @@ and transforming it to match the database schema.
 
 import asyncio
 import logging
+import time
 from datetime import datetime, timezone, timedelta
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Set, Tuple
 from src.exchange.kucoin.kucoin_exchange import KucoinExchange
 from src.exchange.kucoin.kucoin_symbol_converter import symbol_converter
+from src.exchange.history.transaction_ingestion import TransactionKey, transaction_key
 
 logger = logging.getLogger(__name__)
 
+# KuCoin caps history queries to 7-day windows
+WINDOW_MS = 7 * 24 * 60 * 60 * 1000
+# Resumed syncs re-read this much before the checkpoint to pick up late ledger entries
+CHECKPOINT_OVERLAP_MS = 60 * 60 * 1000
+
 # Comprehensive mapping of KuCoin business types to transaction history types
 KUCOIN_TYPE_MAPPING = {
     # Realized PnL
@@ -86,20 +93,48 @@ INCOMING_BIZ_TYPES = {
 }
 
 
+def split_windows(start_time: int, end_time: int, window_ms: int = WINDOW_MS) -> List[Tuple[int, int]]:
+    """Split [start_time, end_time] into consecutive windows of at most window_ms."""
+    windows: List[Tuple[int, int]] = []
+    cursor = start_time
+    while cursor < end_time:
+        window_end = min(cursor + window_ms, end_time)
+        windows.append((cursor, window_end))
+        cursor = window_end
+    return windows
+
+
 class KucoinTransactionFetcher:
     """
     Fetches and transforms transaction history from KuCoin exchange.
     """
 
-    def __init__(self, kucoin_exchange: KucoinExchange):
+    def __init__(self, kucoin_exchange: KucoinExchange, max_concurrent_requests: int = 4,
+                 min_request_interval: float = 0.1):
         """
         Initialize the KuCoin transaction fetcher.
 
         Args:
             kucoin_exchange: Initialized KuCoin exchange instance
+            max_concurrent_requests: Maximum KuCoin requests in flight at once
+            min_request_interval: Minimum seconds between request starts
         """
         self.kucoin_exchange = kucoin_exchange
         self.symbol_converter = symbol_converter
+        self.min_request_interval = min_request_interval
+        self._request_slots = asyncio.Semaphore(max(1, max_concurrent_requests))
+        self._pace_lock = asyncio.Lock()
+        self._last_request_start = 0.0
+
+    async def _paced(self, call: Callable[[], Awaitable[Any]]) -> Any:
+        """Run a KuCoin call within the concurrency limit, spacing request starts."""
+        async with self._request_slots:
+            async with self._pace_lock:
+                wait = self.min_request_interval - (time.monotonic() - self._last_request_start)
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                self._last_request_start = time.monotonic()
+            return await call()
 
     async def fetch_transaction_history(self,
                                       symbol: str = "",
@@ -121,120 +156,222 @@ class KucoinTransactionFetcher:
         try:
             logger.info(f"Fetching comprehensive KuCoin transaction history for {symbol or 'ALL SYMBOLS'}")
 
-            # Convert symbol to KuCoin format if needed
-            kucoin_symbol = ""
-            if symbol:
-                kucoin_symbol = self.symbol_converter.convert_bot_to_kucoin_futures(symbol)
-                logger.info(f"Converted {symbol} to KuCoin format: {kucoin_symbol}")
-
-            # Respect KuCoin 7-day window: chunk requests if needed
-            window_ms = 7 * 24 * 60 * 60 * 1000
-            chunks: List[Tuple[int, int]] = []
-            if start_time and end_time and end_time > start_time:
-                cursor = start_time
-                while cursor < end_time:
-                    chunk_end = min(cursor + window_ms, end_time)
-                    chunks.append((cursor, chunk_end))
-                    cursor = chunk_end
-            else:
-                # Default to last 24h if no times provided
-                now_ms = int(datetime.now(timezone.utc).timestamp() * 1000)
-                chunks.append((now_ms - 24 * 60 * 60 * 1000, now_ms))
-
-            # Fetch from all data sources across chunks
-            all_transactions = []
-
-            for chunk_start, chunk_end in chunks:
-                logger.info(f"Processing chunk: {datetime.fromtimestamp(chunk_start/1000, tz=timezone.utc)} to {datetime.fromtimestamp(chunk_end/1000, tz=timezone.utc)}")
-
-                # 1. Fetch account ledgers (primary source for comprehensive data)
-                account_ledgers = await self._fetch_account_ledgers(kucoin_symbol, chunk_start, chunk_end, limit)
-
-                # 2. Fetch futures account ledgers (for futures-specific activities)
-                futures_ledgers = await self._fetch_futures_account_ledgers(kucoin_symbol, chunk_start, chunk_end, limit)
+            all_transactions: List[Dict[str, Any]] = []
+            async for _, _, chunk_transactions in self.iter_transaction_chunks(symbol, start_time, end_time, limit):
+                all_transactions.extend(chunk_transactions)
 
-                # 3. Fetch trade history (for detailed trade information)
-                trades = await self._fetch_trade_history(kucoin_symbol, chunk_start, chunk_end, limit)
+            # Chunks arrive in time order; this only fixes up window boundaries
+            all_transactions.sort(key=lambda x: x.get('time', ''))
 
-                # 4. Fetch income/funding history
-                income_records = await self._fetch_income_history(kucoin_symbol, chunk_start, chunk_end, limit)
+            logger.info(f"Fetched {len(all_transactions)} comprehensive KuCoin transactions")
+            return all_transactions
 
-                # Transform all data sources
-                chunk_transactions = []
+        except Exception as e:
+            logger.error(f"Error fetching comprehensive KuCoin transaction history: {e}")
+            return []
 
-                # Transform account ledgers
-                for ledger in account_ledgers:
-                    transaction = self._transform_ledger_to_transaction(ledger, symbol)
-                    if transaction:
-                        chunk_transactions.append(transaction)
+    async def iter_transaction_chunks(self, symbol: str = "", start_time: int = 0, end_time: int = 0,
+                                      limit: Optional[int] = 1000, strict: bool = False
+                                      ) -> AsyncIterator[Tuple[int, int, List[Dict[str, Any]]]]:
+        """
+        Stream transactions window by window.
 
-                # Transform futures account ledgers
-                for ledger in futures_ledgers:
-                    transaction = self._transform_ledger_to_transaction(ledger, symbol)
-                    if transaction:
-                        chunk_transactions.append(transaction)
+        The four sources of a window are fetched concurrently, and the next
+        window is already being fetched while the caller processes the current
+        one. Duplicates are dropped against the keys of the current and the
+        previous window only, so memory stays bounded on long ranges.
 
-                # Transform trades (for commission data)
-                for trade in trades:
-                    transaction = self._transform_trade_to_transaction(trade, symbol)
-                    if transaction:
-                        chunk_transactions.append(transaction)
+        Args:
+            symbol: Trading pair symbol (empty for all)
+            start_time: Start time in milliseconds
+            end_time: End time in milliseconds
+            limit: Maximum number of records per source and window (None for every page)
+            strict: Raise when a source fails instead of yielding the window without it
 
-                # Transform income records
-                for income in income_records:
-                    transaction = self._transform_income_to_transaction(income, symbol)
-                    if transaction:
-                        chunk_transactions.append(transaction)
+        Yields:
+            (window_start, window_end, transactions sorted by time)
+        """
+        # Convert symbol to KuCoin format if needed
+        kucoin_symbol = ""
+        if symbol:
+            kucoin_symbol = self.symbol_converter.convert_bot_to_kucoin_futures(symbol)
+            logger.info(f"Converted {symbol} to KuCoin format: {kucoin_symbol}")
+
+        if start_time and end_time and end_time > start_time:
+            windows = split_windows(start_time, end_time)
+        else:
+            # Default to last 24h if no times provided
+            now_ms = int(datetime.now(timezone.utc).timestamp() * 1000)
+            windows = [(now_ms - 24 * 60 * 60 * 1000, now_ms)]
+
+        previous_keys: Set[TransactionKey] = set()
+        next_chunk: Optional[asyncio.Task] = None
+        try:
+            for i, (chunk_start, chunk_end) in enumerate(windows):
+                chunk = next_chunk or asyncio.ensure_future(
+                    self._fetch_chunk(kucoin_symbol, symbol, chunk_start, chunk_end, limit, strict))
+                transactions = await chunk
+                next_chunk = None
+                if i + 1 < len(windows):
+                    following_start, following_end = windows[i + 1]
+                    next_chunk = asyncio.ensure_future(
+                        self._fetch_chunk(kucoin_symbol, symbol, following_start, following_end, limit, strict))
+
+                current_keys: Set[TransactionKey] = set()
+                unique: List[Dict[str, Any]] = []
+                for transaction in transactions:
+                    key = transaction_key(transaction)
+                    if key in current_keys or key in previous_keys:
+                        continue
+                    current_keys.add(key)
+                    unique.append(transaction)
+                previous_keys = current_keys
+
+                unique.sort(key=lambda x: x.get('time', ''))
+                yield chunk_start, chunk_end, unique
+        finally:
+            if next_chunk is not None and not next_chunk.done():
+                next_chunk.cancel()
+
+    async def _fetch_chunk(self, kucoin_symbol: str, symbol: str, chunk_start: int, chunk_end: int,
+                           limit: Optional[int], strict: bool = False) -> List[Dict[str, Any]]:
+        """Fetch one window from all four sources concurrently and transform the records."""
+        logger.info(f"Processing chunk: {datetime.fromtimestamp(chunk_start/1000, tz=timezone.utc)} to {datetime.fromtimestamp(chunk_end/1000, tz=timezone.utc)}")
+
+        account_ledgers, futures_ledgers, trades, income_records = await asyncio.gather(
+            # Account ledgers (primary source for comprehensive data)
+            self._fetch_account_ledgers(kucoin_symbol, chunk_start, chunk_end, limit, strict),
+            # Futures account ledgers (for futures-specific activities)
+            self._fetch_futures_account_ledgers(kucoin_symbol, chunk_start, chunk_end, limit, strict),
+            # Trade history (for commission data)
+            self._fetch_trade_history(kucoin_symbol, chunk_start, chunk_end, limit, strict),
+            # Income/funding history
+            self._fetch_income_history(kucoin_symbol, chunk_start, chunk_end, limit, strict),
+        )
+
+        chunk_transactions: List[Optional[Dict[str, Any]]] = []
+        chunk_transactions.extend(self._transform_ledger_to_transaction(ledger, symbol) for ledger in account_ledgers)
+        chunk_transactions.extend(self._transform_ledger_to_transaction(ledger, symbol) for ledger in futures_ledgers)
+        chunk_transactions.extend(self._transform_trade_to_transaction(trade, symbol) for trade in trades)
+        chunk_transactions.extend(self._transform_income_to_transaction(income, symbol) for income in income_records)
+        return [t for t in chunk_transactions if t]
+
+    async def sync_to_database(self, db_manager: Any, symbol: str = "", start_time: int = 0, end_time: int = 0,
+                               limit: Optional[int] = None, batch_size: int = 100,
+                               checkpoints: Any = None) -> Dict[str, Any]:
+        """
+        Stream transactions into the transaction_history table.
 
-                all_transactions.extend(chunk_transactions)
+        Each window is checked against the rows already stored for it (one
+        query per window) and inserted in batches as soon as it is fetched.
+        After a window is written its end is saved as the checkpoint, so an
+        interrupted backfill resumes at the last completed window. Every
+        source is read in strict mode, so a window with a failed or truncated
+        source stops the sync before it is checkpointed.
 
-                # Rate limiting between chunks
-                await asyncio.sleep(0.5)
+        Args:
+            db_manager: discord_bot DatabaseManager
+            symbol: Trading pair symbol (empty for all)
+            start_time: Start time in milliseconds
+            end_time: End time in milliseconds
+            limit: Maximum number of records per source and window (None reads
+                every page, which a checkpointed sync needs to be complete)
+            batch_size: Rows per insert
+            checkpoints: SyncCheckpointStore (None disables resuming)
 
-            # Deduplicate transactions
-            all_transactions = self._deduplicate_transactions(all_transactions)
+        Returns:
+            Dict[str, Any]: Counts of fetched, inserted and skipped rows, windows
+            written and the resume point used
+        """
+        scope = f"kucoin:transactions:{symbol or '*'}"
+        result: Dict[str, Any] = {'fetched': 0, 'inserted': 0, 'skipped': 0, 'chunks': 0,
+                                  'resumed_from': None, 'success': True}
 
-            # Sort by time
-            all_transactions.sort(key=lambda x: x.get('time', ''))
+        checkpoint = checkpoints.get(scope) if checkpoints is not None else None
+        if checkpoint and start_time < checkpoint < end_time:
+            start_time = max(start_time, int(checkpoint) - CHECKPOINT_OVERLAP_MS)
+            result['resumed_from'] = start_time
+            logger.info(f"Resuming KuCoin transaction sync for {symbol or 'ALL SYMBOLS'} from {datetime.fromtimestamp(start_time/1000, tz=timezone.utc)}")
 
-            logger.info(f"Fetched {len(all_transactions)} comprehensive KuCoin transactions")
-            return all_transactions
+        try:
+            # Strict: a window with a failed source must not be checkpointed as done
+            async for chunk_start, chunk_end, transactions in self.iter_transaction_chunks(
+                    symbol, start_time, end_time, limit, strict=True):
+                result['fetched'] += len(transactions)
+                stored = await db_manager.get_transactions_in_range(
+                    'kucoin',
+                    datetime.fromtimestamp(chunk_start / 1000, tz=timezone.utc).isoformat(),
+                    datetime.fromtimestamp(chunk_end / 1000, tz=timezone.utc).isoformat())
+                stored_keys = {transaction_key(row) for row in stored}
+
+                new_transactions = []
+                for transaction in transactions:
+                    if transaction_key(transaction) in stored_keys:
+                        result['skipped'] += 1
+                        continue
+                    transaction['exchange'] = 'kucoin'
+                    new_transactions.append(transaction)
+
+                for i in range(0, len(new_transactions), batch_size):
+                    batch = new_transactions[i:i + batch_size]
+                    if not await db_manager.insert_transaction_history_batch(batch):
+                        logger.error(f"KuCoin transaction sync: failed to insert batch for window ending {chunk_end}")
+                        result['success'] = False
+                        return result
+                    result['inserted'] += len(batch)
+
+                result['chunks'] += 1
+                if checkpoints is not None:
+                    checkpoints.set(scope, chunk_end)
+
+            logger.info(f"KuCoin transaction sync: {result['inserted']} inserted, {result['skipped']} skipped in {result['chunks']} windows")
+            return result
 
         except Exception as e:
-            logger.error(f"Error fetching comprehensive KuCoin transaction history: {e}")
-            return []
+            logger.error(f"Error syncing KuCoin transaction history: {e}")
+            result['success'] = False
+            return result
 
-    async def _fetch_trade_history(self, symbol: str, start_time: int, end_time: int, limit: int) -> List[Dict[str, Any]]:
+    async def _fetch_trade_history(self, symbol: str, start_time: int, end_time: int, limit: Optional[int],
+                                   strict: bool = False) -> List[Dict[str, Any]]:
         """Fetch trade history from KuCoin."""
         try:
-            trades = await self.kucoin_exchange.get_user_trades(
+            trades = await self._paced(lambda: self.kucoin_exchange.get_user_trades(
                 symbol=symbol,
                 start_time=start_time,
                 end_time=end_time,
-                limit=limit
-            )
+                limit=limit,
+                raise_errors=strict
+            ))
             logger.info(f"Fetched {len(trades)} KuCoin trades")
             return trades
         except Exception as e:
             logger.error(f"Error fetching KuCoin trade history: {e}")
+            if strict:
+                raise
             return []
 
-    async def _fetch_income_history(self, symbol: str, start_time: int, end_time: int, limit: int) -> List[Dict[str, Any]]:
+    async def _fetch_income_history(self, symbol: str, start_time: int, end_time: int, limit: Optional[int],
+                                    strict: bool = False) -> List[Dict[str, Any]]:
         """Fetch income history from KuCoin."""
         try:
-            income_records = await self.kucoin_exchange.get_income_history(
+            income_records = await self._paced(lambda: self.kucoin_exchange.get_income_history(
                 symbol=symbol,
                 start_time=start_time,
                 end_time=end_time,
-                limit=limit
-            )
+                limit=limit,
+                raise_errors=strict
+            ))
             logger.info(f"Fetched {len(income_records)} KuCoin income records")
             return income_records
         except Exception as e:
             logger.error(f"Error fetching KuCoin income history: {e}")
+            if strict:
+                raise
             return []
 
-    async def _fetch_account_ledgers(self, symbol: str, start_time: int, end_time: int, limit: int) -> List[Dict[str, Any]]:
+    async def _fetch_account_ledgers(self, symbol: str, start_time: int, end_time: int, limit: Optional[int],
+                                     strict: bool = False) -> List[Dict[str, Any]]:
         """Fetch account ledgers from KuCoin."""
         try:
             # Extract currency from symbol if provided
@@ -245,19 +382,23 @@ class KucoinTransactionFetcher:
                 if not currency:
                     currency = "USDT"  # Default to USDT if can't extract
 
-            ledger_records = await self.kucoin_exchange.get_account_ledgers(
+            ledger_records = await self._paced(lambda: self.kucoin_exchange.get_account_ledgers(
                 currency=currency,
                 start_time=start_time,
                 end_time=end_time,
-                limit=limit
-            )
+                limit=limit,
+                raise_errors=strict
+            ))
             logger.info(f"Fetched {len(ledger_records)} KuCoin account ledger records")
             return ledger_records
         except Exception as e:
             logger.error(f"Error fetching KuCoin account ledgers: {e}")
+            if strict:
+                raise
             return []
 
-    async def _fetch_futures_account_ledgers(self, symbol: str, start_time: int, end_time: int, limit: int) -> List[Dict[str, Any]]:
+    async def _fetch_futures_account_ledgers(self, symbol: str, start_time: int, end_time: int, limit: Optional[int],
+                                             strict: bool = False) -> List[Dict[str, Any]]:
         """Fetch futures account ledgers from KuCoin."""
         try:
             # Extract currency from symbol if provided
@@ -268,16 +409,19 @@ class KucoinTransactionFetcher:
                 if not currency:
                     currency = "USDT"  # Default to USDT if can't extract
 
-            ledger_records = await self.kucoin_exchange.get_futures_account_ledgers(
+            ledger_records = await self._paced(lambda: self.kucoin_exchange.get_futures_account_ledgers(
                 currency=currency,
                 start_time=start_time,
                 end_time=end_time,
-                limit=limit
-            )
+                limit=limit,
+                raise_errors=strict
+            ))
             logger.info(f"Fetched {len(ledger_records)} KuCoin futures account ledger records")
             return ledger_records
         except Exception as e:
             logger.error(f"Error fetching KuCoin futures account ledgers: {e}")
+            if strict:
+                raise
             return []
 
     def _transform_trade_to_transaction(self, trade: Dict[str, Any], original_symbol: str = "") -> Optional[Dict[str, Any]]:
@@ -2,25 +2,46 @@
 Rubicon Trading Bot - External service integrations
 """
 
-# Import from modularized services
-from .notifications import (
-    NotificationManager, TelegramService, MessageFormatter,
-    TradeNotification, OrderFillNotification, PnLNotification,
-    StopLossNotification, TakeProfitNotification, ErrorNotification,
-    SystemStatusNotification, NotificationConfig
-)
-
-from .pricing import (
-    PriceService, PriceCache, PriceValidator,
-    PriceServiceConfig, PriceData, MarketData, PriceCacheEntry,
-    PriceValidationResult, CoinData
-)
-
-from .analytics import (
-    PnLCalculator, PerformanceAnalyzer,
-    PnLData, PerformanceMetrics, TradeAnalysis, RiskMetrics,
-    PortfolioSnapshot, MarketAnalysis, AnalyticsConfig
-)
+import importlib
+from typing import Any
+
+# Modularized services are imported on first attribute access so that
+# importing a single service (e.g. src.services.trader_config_service)
+# does not load Telegram, numpy and the pricing clients.
+_LAZY_MODULES = {
+    '.notifications': (
+        'NotificationManager', 'TelegramService', 'MessageFormatter',
+        'TradeNotification', 'OrderFillNotification', 'PnLNotification',
+        'StopLossNotification', 'TakeProfitNotification', 'ErrorNotification',
+        'SystemStatusNotification', 'NotificationConfig'
+    ),
+    '.pricing': (
+        'PriceService', 'PriceCache', 'PriceValidator',
+        'PriceServiceConfig', 'PriceData', 'MarketData', 'PriceCacheEntry',
+        'PriceValidationResult', 'CoinData'
+    ),
+    '.analytics': (
+        'PnLCalculator', 'PerformanceAnalyzer',
+        'PnLData', 'PerformanceMetrics', 'TradeAnalysis', 'RiskMetrics',
+        'PortfolioSnapshot', 'MarketAnalysis', 'AnalyticsConfig'
+    ),
+}
+
+_LAZY_ATTRS = {name: module for module, names in _LAZY_MODULES.items() for name in names}
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY_ATTRS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRS))
+
 
 __all__ = [
     # New modular services
@@ -28,11 +49,11 @@ __all__ = [
     'TradeNotification', 'OrderFillNotification', 'PnLNotification',
     'StopLossNotification', 'TakeProfitNotification', 'ErrorNotification',
     'SystemStatusNotification', 'NotificationConfig',
-    
+
     'PriceService', 'PriceCache', 'PriceValidator',
     'PriceServiceConfig', 'PriceData', 'MarketData', 'PriceCacheEntry',
     'PriceValidationResult', 'CoinData',
-    
+
     'PnLCalculator', 'PerformanceAnalyzer',
     'PnLData', 'PerformanceMetrics', 'TradeAnalysis', 'RiskMetrics',
     'PortfolioSnapshot', 'MarketAnalysis', 'AnalyticsConfig'
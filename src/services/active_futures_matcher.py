@@ -0,0 +1,265 @@
+"""
+Active Futures Batch Matcher
+
+Matches closed active_futures rows to OPEN trades in one pass. The OPEN
+trades of all target traders are loaded once and indexed by trader and
+(trader, coin_symbol), their content is tokenised once, and every closed
+futures entry is scored against its candidates with the same rules as
+ActiveFuturesSyncService.find_trade_matches. Each trader's futures and
+trades are then paired by a maximum-confidence one-to-one assignment, so
+two closed futures never close the same trade.
+"""
+
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+from src.database import ActiveFutures, Trade
+
+logger = logging.getLogger(__name__)
+
+# Scoring rules shared with find_trade_matches
+TRADER_WEIGHT = 0.4
+COIN_WEIGHT = 0.4
+COIN_MISMATCH_PENALTY = 0.2
+CONTENT_WEIGHT = 0.2
+CONTENT_MIN_SIMILARITY = 0.2
+TIMESTAMP_WEIGHT = 0.1
+TIMESTAMP_MAX_HOURS = 24
+MIN_CONFIDENCE = 0.6
+
+
+def _parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00')) if value else None
+    except (AttributeError, ValueError):
+        return None
+
+
+@dataclass(frozen=True)
+class MatchText:
+    """Content normalised once for repeated similarity checks."""
+    upper: str
+    tokens: FrozenSet[str]
+
+    @classmethod
+    def of(cls, content: Optional[str]) -> 'MatchText':
+        upper = (content or '').upper()
+        return cls(upper, frozenset(upper.split()))
+
+    def similarity(self, other: 'MatchText') -> float:
+        """Same result as ActiveFuturesSyncService.calculate_content_similarity."""
+        if not self.upper and not other.upper:
+            return 1.0
+        if not self.upper or not other.upper:
+            return 0.0
+        if self.upper == other.upper:
+            return 1.0
+        if not self.tokens or not other.tokens:
+            return 0.0
+        union = len(self.tokens | other.tokens)
+        return len(self.tokens & other.tokens) / union if union else 0.0
+
+
+@dataclass
+class _Candidate:
+    trade: Trade
+    coin: str
+    text: MatchText
+    opened_at: Optional[datetime]
+
+
+@dataclass
+class ScoredPair:
+    """Confidence of one futures/trade pairing."""
+    futures_index: int
+    candidate_index: int
+    confidence: float
+    reasons: List[str]
+
+
+def _score_pair(futures_coin: str, futures_text: MatchText, futures_time: Optional[datetime],
+               candidate: _Candidate) -> Tuple[float, List[str]]:
+    """
+    Score a candidate trade for a closed futures entry of the same trader.
+
+    Returns:
+        Tuple[float, List[str]]: Confidence and the reasons that contributed to it
+    """
+    confidence = TRADER_WEIGHT
+    reasons = ["trader_match"]
+
+    if candidate.coin == futures_coin:
+        confidence += COIN_WEIGHT
+        reasons.append("coin_symbol_match")
+    elif candidate.coin:
+        confidence -= COIN_MISMATCH_PENALTY
+
+    similarity = futures_text.similarity(candidate.text)
+    if similarity > CONTENT_MIN_SIMILARITY:
+        confidence += similarity * CONTENT_WEIGHT
+        reasons.append(f"content_similarity_{similarity:.2f}")
+
+    if futures_time is not None and candidate.opened_at is not None:
+        try:
+            proximate = abs((futures_time - candidate.opened_at).total_seconds()) <= TIMESTAMP_MAX_HOURS * 3600
+        except TypeError:
+            # Naive vs aware timestamps are not comparable
+            proximate = False
+        if proximate:
+            confidence += TIMESTAMP_WEIGHT
+            reasons.append("timestamp_proximate")
+
+    return confidence, reasons
+
+
+def max_weight_assignment(weights: Sequence[Sequence[float]]) -> List[Tuple[int, int]]:
+    """
+    One-to-one assignment of rows to columns maximising the total weight.
+
+    Pairs with weight <= 0 mean "not allowed" and are never returned, so rows
+    or columns may stay unassigned.
+
+    Args:
+        weights: Row-major weight matrix
+
+    Returns:
+        List[Tuple[int, int]]: (row, column) pairs
+    """
+    rows = len(weights)
+    cols = len(weights[0]) if rows else 0
+    if not rows or not cols:
+        return []
+
+    transposed = rows > cols
+    if transposed:
+        weights = [[weights[r][c] for r in range(rows)] for c in range(cols)]
+        rows, cols = cols, rows
+
+    # Hungarian algorithm (potentials form) minimising -weight; 1-based with a dummy column 0
+    cost = [[-max(w, 0.0) for w in row] for row in weights]
+    inf = float('inf')
+    u = [0.0] * (rows + 1)
+    v = [0.0] * (cols + 1)
+    owner = [0] * (cols + 1)
+    way = [0] * (cols + 1)
+    for row in range(1, rows + 1):
+        owner[0] = row
+        col0 = 0
+        minv = [inf] * (cols + 1)
+        used = [False] * (cols + 1)
+        while True:
+            used[col0] = True
+            row0, delta, col1 = owner[col0], inf, 0
+            for col in range(1, cols + 1):
+                if not used[col]:
+                    reduced = cost[row0 - 1][col - 1] - u[row0] - v[col]
+                    if reduced < minv[col]:
+                        minv[col], way[col] = reduced, col0
+                    if minv[col] < delta:
+                        delta, col1 = minv[col], col
+            for col in range(cols + 1):
+                if used[col]:
+                    u[owner[col]] += delta
+                    v[col] -= delta
+                else:
+                    minv[col] -= delta
+            col0 = col1
+            if owner[col0] == 0:
+                break
+        while col0:
+            col1 = way[col0]
+            owner[col0] = owner[col1]
+            col0 = col1
+
+    pairs = []
+    for col in range(1, cols + 1):
+        row = owner[col]
+        if row and weights[row - 1][col - 1] > 0:
+            pairs.append((col - 1, row - 1) if transposed else (row - 1, col - 1))
+    return sorted(pairs)
+
+
+class ActiveFuturesBatchMatcher:
+    """Index of OPEN trades for matching a batch of closed futures."""
+
+    def __init__(self, trades: Sequence[Trade], extract_coin_symbol):
+        """
+        Build the candidate index.
+
+        Args:
+            trades: OPEN trades of the target traders
+            extract_coin_symbol: Callable extracting a coin symbol from futures content
+        """
+        self.extract_coin_symbol = extract_coin_symbol
+        self._candidates: List[_Candidate] = []
+        self._by_trader: Dict[str, List[int]] = {}
+        self._by_trader_coin: Dict[Tuple[str, str], List[int]] = {}
+        for trade in trades:
+            index = len(self._candidates)
+            coin = (trade.coin_symbol or '').upper()
+            self._candidates.append(_Candidate(trade, coin, MatchText.of(trade.content),
+                                               _parse_timestamp(trade.timestamp)))
+            self._by_trader.setdefault(trade.trader, []).append(index)
+            self._by_trader_coin.setdefault((trade.trader, coin), []).append(index)
+
+    def candidate_indexes(self, trader: str, coin_symbol: str) -> List[int]:
+        """Trades with the trader and coin, or all the trader's trades when there are none."""
+        return self._by_trader_coin.get((trader, coin_symbol.upper())) or self._by_trader.get(trader, [])
+
+    def score(self, closed_futures: Sequence[ActiveFutures]) -> List[ScoredPair]:
+        """All futures/trade pairs at or above MIN_CONFIDENCE."""
+        pairs = []
+        for futures_index, active_futures in enumerate(closed_futures):
+            coin_symbol = self.extract_coin_symbol(active_futures.content)
+            if not coin_symbol:
+                logger.warning(f"No coin symbol extracted from content: {active_futures.content}")
+                continue
+            text = MatchText.of(active_futures.content)
+            created_at = _parse_timestamp(active_futures.created_at)
+            for candidate_index in self.candidate_indexes(active_futures.trader, coin_symbol):
+                confidence, reasons = _score_pair(coin_symbol.upper(), text, created_at,
+                                                 self._candidates[candidate_index])
+                if confidence >= MIN_CONFIDENCE:
+                    pairs.append(ScoredPair(futures_index, candidate_index, confidence, reasons))
+        return pairs
+
+    def ranked_trades(self, closed_futures: Sequence[ActiveFutures]) -> List[List[Tuple[Trade, float, str]]]:
+        """Per futures entry, every qualifying trade as (trade, confidence, reason), best first."""
+        ranked: List[List[Tuple[Trade, float, str]]] = [[] for _ in closed_futures]
+        for pair in self.score(closed_futures):
+            ranked[pair.futures_index].append((self._candidates[pair.candidate_index].trade,
+                                               pair.confidence, ", ".join(pair.reasons)))
+        for matches in ranked:
+            matches.sort(key=lambda match: match[1], reverse=True)
+        return ranked
+
+    def assign(self, closed_futures: Sequence[ActiveFutures]) -> Dict[int, Tuple[Trade, float, str]]:
+        """
+        Pair closed futures with distinct trades, maximising total confidence per trader.
+
+        Returns:
+            Dict[int, Tuple[Trade, float, str]]: Position in closed_futures -> (trade, confidence, reason)
+        """
+        # Futures only compete with futures of the same trader, so each trader is solved separately
+        by_trader: Dict[str, List[ScoredPair]] = {}
+        for pair in self.score(closed_futures):
+            by_trader.setdefault(closed_futures[pair.futures_index].trader, []).append(pair)
+
+        assigned: Dict[int, Tuple[Trade, float, str]] = {}
+        for pairs in by_trader.values():
+            futures_ids = sorted({p.futures_index for p in pairs})
+            candidate_ids = sorted({p.candidate_index for p in pairs})
+            row_of = {f: r for r, f in enumerate(futures_ids)}
+            col_of = {c: k for k, c in enumerate(candidate_ids)}
+            weights = [[0.0] * len(candidate_ids) for _ in futures_ids]
+            lookup = {}
+            for pair in pairs:
+                weights[row_of[pair.futures_index]][col_of[pair.candidate_index]] = pair.confidence
+                lookup[(pair.futures_index, pair.candidate_index)] = pair
+            for row, col in max_weight_assignment(weights):
+                pair = lookup[(futures_ids[row], candidate_ids[col])]
+                assigned[pair.futures_index] = (self._candidates[pair.candidate_index].trade,
+                                                pair.confidence, ", ".join(pair.reasons))
+        return assigned
@@ -15,12 +15,30 @@ from src.database import (
     DatabaseManager, ActiveFuturesRepository, TradeRepository,
     AlertRepository, ActiveFutures, Trade, Alert
 )
+from src.database.models.trade_models import TradeFilter
 from src.database.core.connection_manager import connection_manager
 from src.core.response_models import ServiceResponse, ErrorCode
+from src.exchange.core.symbol_registry import NON_COIN_WORDS, get_symbol_registry
+from src.services.active_futures_matcher import ActiveFuturesBatchMatcher
+
+# Trade columns needed to match and close positions
+MATCH_COLUMNS = [
+    "id", "discord_id", "trader", "timestamp", "content", "status", "coin_symbol",
+    "position_size", "entry_price", "exchange_order_id"
+]
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+# Patterns to match the coin of an active futures entry ("ETH Entry: 3000")
+ENTRY_COIN_PATTERNS = [
+    r'\b([A-Z0-9]{2,10})\s+ENTRY:',
+    r'\b([A-Z]{2,10})\s+ENTRY\s*:',
+    r'ENTRY:\s*([A-Z]{2,10})',
+    r'([A-Z]{2,10})\s+ENTRY\s*:\s*\d',
+]
+
+
+@dataclass(slots=True)
 class TradeMatch:
     """Represents a match between active futures and local trade."""
     active_futures: ActiveFutures
@@ -74,15 +92,12 @@ class ActiveFuturesSyncService:
         if not content:
             return None
 
-        patterns = [
-            r'\b(BTC|ETH|SOL|ADA|DOT|LINK|UNI|AAVE|MATIC|AVAX|NEAR|FTM|ALGO|ATOM|XRP|DOGE|SHIB|PEPE|BONK|WIF|FLOKI|TOSHI|TURBO|HYPE|FARTCOIN|VELVET|NAORIS|PUMP|SUI|1000SATS|DAM|SOMI|PENGU|ENA|ZEC|TAO|USELESS)\b',
-            r'\b([A-Z]{2,10})\s+Entry:',
-            r'\b([A-Z]{2,10})\s+Entry\s*:',
-            r'Entry:\s*([A-Z]{2,10})',
-            r'([A-Z]{2,10})\s+Entry\s*:\s*\d',
-        ]
+        # Listed coins only, once the symbol registry has been loaded
+        registry = get_symbol_registry()
+        if registry.is_loaded():
+            return registry.find_coin(content, patterns=ENTRY_COIN_PATTERNS, ignore=NON_COIN_WORDS)
 
-        for pattern in patterns:
+        for pattern in ENTRY_COIN_PATTERNS:
             match = re.search(pattern, content.upper())
             if match:
                 symbol = match.group(1)
@@ -140,71 +155,59 @@ class ActiveFuturesSyncService:
                 return matches
 
             # First try to find trades with exact coin symbol match
-            trades = await self.trade_repo.get_trades_by_filter({
-                "trader": active_futures.trader,
-                "coin_symbol": coin_symbol,
-                "status": "OPEN"
-            })
+            trades = await self.trade_repo.get_trades_by_filter(TradeFilter(
+                trader=active_futures.trader,
+                coin_symbol=coin_symbol,
+                status="OPEN"
+            ))
 
             # If no exact matches, try broader search
             if not trades:
-                trades = await self.trade_repo.get_trades_by_filter({
-                    "trader": active_futures.trader,
-                    "status": "OPEN"
-                })
-
-            for trade in trades:
-                confidence = 0.0
-                match_reasons = []
-
-                # Trader match (required)
-                if trade.trader == active_futures.trader:
-                    confidence += 0.4
-                    match_reasons.append("trader_match")
-                else:
-                    continue  # Skip if trader doesn't match
-
-                # Coin symbol match (high weight)
-                if trade.coin_symbol == coin_symbol:
-                    confidence += 0.4
-                    match_reasons.append("coin_symbol_match")
-                elif trade.coin_symbol:
-                    # Check if coin symbol is similar (case insensitive)
-                    if trade.coin_symbol.upper() == coin_symbol.upper():
-                        confidence += 0.4
-                        match_reasons.append("coin_symbol_match")
-                    else:
-                        confidence -= 0.2  # Penalty for different coin
-
-                # Content similarity
-                content_similarity = self.calculate_content_similarity(
-                    active_futures.content, trade.content
-                )
-                if content_similarity > 0.2:
-                    confidence += content_similarity * 0.2
-                    match_reasons.append(f"content_similarity_{content_similarity:.2f}")
-
-                # Timestamp proximity
-                if self.is_timestamp_proximate(active_futures.created_at, trade.timestamp):
-                    confidence += 0.1
-                    match_reasons.append("timestamp_proximate")
-
-                # Only include matches with reasonable confidence
-                if confidence >= 0.6:
-                    matches.append(TradeMatch(
-                        active_futures=active_futures,
-                        trade=trade,
-                        confidence=confidence,
-                        match_reason=", ".join(match_reasons)
-                    ))
-
-            matches.sort(key=lambda x: x.confidence, reverse=True)
+                trades = await self.trade_repo.get_trades_by_filter(TradeFilter(
+                    trader=active_futures.trader,
+                    status="OPEN"
+                ))
+
+            matcher = ActiveFuturesBatchMatcher(trades, self.extract_coin_symbol_from_content)
+            for trade, confidence, reason in matcher.ranked_trades([active_futures])[0]:
+                matches.append(TradeMatch(
+                    active_futures=active_futures,
+                    trade=trade,
+                    confidence=confidence,
+                    match_reason=reason
+                ))
 
         except Exception as e:
             logger.error(f"Error finding trade matches for active futures {active_futures.id}: {e}")
 
         return matches
 
+    async def match_closed_futures(self, closed_futures: List[ActiveFutures]) -> Dict[int, TradeMatch]:
+        """
+        Match a batch of closed futures to distinct OPEN trades.
+
+        Loads the OPEN trades of all the futures' traders in one query and
+        solves a one-to-one assignment per trader, so the number of queries
+        does not depend on how many positions closed.
+
+        Args:
+            closed_futures: Closed active futures entries
+
+        Returns:
+            Dict[int, TradeMatch]: Position in closed_futures -> best distinct match
+        """
+        traders = sorted({af.trader for af in closed_futures if af.trader})
+        if not traders:
+            return {}
+
+        trades = await self.trade_repo.get_trades_by_traders_and_status(traders, "OPEN", columns=MATCH_COLUMNS)
+        matcher = ActiveFuturesBatchMatcher(trades, self.extract_coin_symbol_from_content)
+        return {
+            index: TradeMatch(active_futures=closed_futures[index], trade=trade,
+                              confidence=confidence, match_reason=reason)
+            for index, (trade, confidence, reason) in matcher.assign(closed_futures).items()
+        }
+
     async def get_closed_futures_to_process(self) -> List[ActiveFutures]:
         """Get recently closed futures that need processing."""
         # Use lock to prevent race conditions with concurrent access
@@ -247,21 +250,27 @@ class ActiveFuturesSyncService:
             "errors": []
         }
 
+        try:
+            matched = await self.match_closed_futures(closed_futures)
+        except Exception as e:
+            logger.error(f"Error matching closed futures to trades: {e}")
+            results["errors"].append(f"Error matching closed futures: {str(e)}")
+            matched = {}
+
         # Process each futures entry with proper error isolation
-        for active_futures in closed_futures:
+        for index, active_futures in enumerate(closed_futures):
             # Use lock to ensure atomic processing of each futures entry
             async with self._sync_lock:
                 try:
                     results["processed"] += 1
 
-                    matches = await self.find_trade_matches(active_futures)
+                    best_match = matched.get(index)
 
-                    if not matches:
+                    if best_match is None:
                         results["no_matches"] += 1
                         logger.warning(f"No matching trades found for closed futures {active_futures.id}")
                         continue
 
-                    best_match = matches[0]
                     logger.info(f"Found best match for futures {active_futures.id}: trade {best_match.trade.discord_id} (confidence: {best_match.confidence:.2f})")
 
                     # Process position closure with error handling
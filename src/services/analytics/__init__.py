@@ -4,6 +4,11 @@ from .analytics_models import (
     PnLData, PerformanceMetrics, TradeAnalysis, RiskMetrics,
     PortfolioSnapshot, MarketAnalysis, AnalyticsConfig
 )
+from .fill_aggregator import (
+    FillAggregate, FillFrame, PositionRecordMatch, TradeWindow,
+    aggregate_fills, select_position_record
+)
+from .rollups import AnalyticsRollupService, RollupSummary, get_analytics_rollups, record_trade_writes
 
 __all__ = [
     'PnLCalculator',
@@ -14,5 +19,15 @@ __all__ = [
     'RiskMetrics',
     'PortfolioSnapshot',
     'MarketAnalysis',
-    'AnalyticsConfig'
+    'AnalyticsConfig',
+    'FillAggregate',
+    'FillFrame',
+    'PositionRecordMatch',
+    'TradeWindow',
+    'aggregate_fills',
+    'select_position_record',
+    'AnalyticsRollupService',
+    'RollupSummary',
+    'get_analytics_rollups',
+    'record_trade_writes'
 ]
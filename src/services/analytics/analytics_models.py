@@ -2,7 +2,7 @@ from dataclasses import dataclass
 from typing import Optional, List, Dict, Any
 from datetime import datetime, timezone
 
-@dataclass
+@dataclass(slots=True)
 class PnLData:
     """Data model for profit and loss calculations"""
     symbol: str
@@ -38,7 +38,7 @@ class PerformanceMetrics:
     period_end: datetime = datetime.now(timezone.utc)
 
 
-@dataclass
+@dataclass(slots=True)
 class TradeAnalysis:
     """Data model for individual trade analysis"""
     trade_id: str
@@ -0,0 +1,366 @@
+"""
+Fill Aggregator
+
+Vectorized fills-to-PnL engine shared by the exchange reconcilers and the
+price/PnL backfill jobs. Fills are loaded once into columnar arrays sorted
+by time; trade lifecycles are matched to fills with an interval join
+(binary search on the time column), and VWAP entry/exit prices, fees,
+funding and realized PnL for all trades are computed with grouped sums.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from src.exchange.history.history_models import HistoryDataset, record_time_ms
+
+logger = logging.getLogger(__name__)
+
+_QTY_FIELDS = ('qty', 'size', 'quantity')
+_FEE_FIELDS = ('commission', 'fee')
+_REALIZED_FIELDS = ('realizedPnl', 'realisedPnl', 'pnl')
+_FUNDING_FIELDS = ('income', 'funding', 'amount')
+_ID_FIELDS = ('tradeId', 'id', 'orderId')
+
+_SIDE_SIGN = {'BUY': 1, 'SELL': -1}
+_POSITION_SIGN = {'LONG': 1, 'SHORT': -1}
+
+# Score used for a missing timestamp when ranking position records
+_MISSING_TIME_SCORE = 1_000_000_000
+
+
+def _float(value: Any, default: float = 0.0) -> float:
+    try:
+        return float(value) if value not in (None, '') else default
+    except (TypeError, ValueError):
+        return default
+
+
+def _first(record: Dict[str, Any], fields: Tuple[str, ...]) -> Any:
+    for name in fields:
+        value = record.get(name)
+        if value is not None:
+            return value
+    return None
+
+
+@dataclass(frozen=True)
+class TradeWindow:
+    """Lifecycle of a trade to be matched against fills."""
+    trade_id: Any
+    position_type: str
+    start_ms: int
+    end_ms: int
+
+
+@dataclass
+class FillAggregate:
+    """Aggregated fills for one trade."""
+    trade_id: Any
+    entry_qty: float = 0.0
+    exit_qty: float = 0.0
+    entry_price: Optional[float] = None
+    exit_price: Optional[float] = None
+    realized_pnl: float = 0.0
+    fees: float = 0.0
+    funding: float = 0.0
+    net_pnl: float = 0.0
+    entry_fills: int = 0
+    exit_fills: int = 0
+    realized_reported: bool = False
+    exit_fill_ids: List[str] = field(default_factory=list)
+
+    @property
+    def has_fills(self) -> bool:
+        return bool(self.entry_fills or self.exit_fills)
+
+
+class FillFrame:
+    """
+    Columnar, time-sorted view of exchange fills.
+
+    Accepts Binance (qty/commission/realizedPnl) and KuCoin (size/fee/pnl)
+    fill records. Fills without a usable timestamp are dropped.
+    """
+
+    def __init__(self, records: Iterable[Dict[str, Any]], exclude_ids: Optional[Set[str]] = None):
+        """
+        Build the frame.
+
+        Args:
+            records: Raw fill records
+            exclude_ids: Fill ids already consumed elsewhere
+        """
+        rows = []
+        for record in records or []:
+            if not isinstance(record, dict):
+                continue
+            fill_id = str(_first(record, _ID_FIELDS) or '')
+            if exclude_ids and fill_id and fill_id in exclude_ids:
+                continue
+            time_ms = record_time_ms(HistoryDataset.USER_TRADES, record)
+            if not time_ms:
+                continue
+            rows.append((
+                time_ms,
+                _SIDE_SIGN.get(str(record.get('side') or '').upper(), 0),
+                _float(_first(record, _QTY_FIELDS)),
+                _float(record.get('price')),
+                _float(_first(record, _FEE_FIELDS)),
+                _float(_first(record, _REALIZED_FIELDS), np.nan),
+                bool(record.get('reduceOnly') or record.get('reduce_only')),
+                fill_id,
+            ))
+
+        rows.sort(key=lambda r: r[0])
+        self.time_ms = np.array([r[0] for r in rows], dtype=np.int64)
+        self.side = np.array([r[1] for r in rows], dtype=np.int8)
+        self.qty = np.array([r[2] for r in rows], dtype=np.float64)
+        self.price = np.array([r[3] for r in rows], dtype=np.float64)
+        self.fee = np.array([r[4] for r in rows], dtype=np.float64)
+        self.realized = np.array([r[5] for r in rows], dtype=np.float64)
+        self.reduce_only = np.array([r[6] for r in rows], dtype=bool)
+        self.fill_id = np.array([r[7] for r in rows], dtype=object)
+
+    def __len__(self) -> int:
+        return len(self.time_ms)
+
+
+def _interval_join(times: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Match sorted event times to [start, end] windows.
+
+    Returns:
+        (window_idx, event_idx) pairs, ordered by window
+    """
+    lo = np.searchsorted(times, starts, side='left')
+    hi = np.searchsorted(times, ends, side='right')
+    counts = np.maximum(hi - lo, 0)
+    window_idx = np.repeat(np.arange(len(starts)), counts)
+    offsets = np.repeat(np.cumsum(counts) - counts, counts)
+    event_idx = np.arange(int(counts.sum())) - offsets + np.repeat(lo, counts)
+    return window_idx, event_idx
+
+
+def aggregate_fills(
+    windows: List[TradeWindow],
+    fills: FillFrame,
+    funding: Optional[Iterable[Dict[str, Any]]] = None,
+    exclusive: bool = False
+) -> Dict[Any, FillAggregate]:
+    """
+    Aggregate fills (and optional funding payments) for many trades in one pass.
+
+    Entry fills are on the position side (BUY for LONG, SELL for SHORT), exit
+    fills on the opposite side; reduce-only fills with an unknown side count
+    as exits. Realized PnL is taken from the exchange-reported value on the
+    exit fills when present, otherwise computed from the VWAPs over the
+    closed quantity.
+
+    Args:
+        windows: Trade lifecycles to match
+        fills: Fill frame covering all windows
+        funding: Funding income records (e.g. Binance FUNDING_FEE income)
+        exclusive: Count each fill for the first matching window only
+
+    Returns:
+        Dict mapping trade_id to its FillAggregate
+    """
+    n = len(windows)
+    if n == 0:
+        return {}
+
+    starts = np.array([w.start_ms for w in windows], dtype=np.int64)
+    ends = np.array([w.end_ms for w in windows], dtype=np.int64)
+    signs = np.array([_POSITION_SIGN.get(str(w.position_type or '').upper(), 0) for w in windows], dtype=np.int8)
+
+    w_idx, f_idx = _interval_join(fills.time_ms, starts, ends)
+    if exclusive and len(f_idx):
+        _, first = np.unique(f_idx, return_index=True)
+        keep = np.sort(first)
+        w_idx, f_idx = w_idx[keep], f_idx[keep]
+
+    w_sign = signs[w_idx]
+    f_side = fills.side[f_idx]
+    is_entry = (w_sign != 0) & (f_side == w_sign)
+    is_exit = ((w_sign != 0) & (f_side == -w_sign)) | ((f_side == 0) & fills.reduce_only[f_idx])
+
+    qty = fills.qty[f_idx]
+    price = fills.price[f_idx]
+    priced_qty = np.where((qty > 0) & (price > 0), qty, 0.0)
+    notional = priced_qty * price
+
+    def group_sum(mask: np.ndarray, weights: Optional[np.ndarray] = None) -> np.ndarray:
+        return np.bincount(w_idx[mask], weights=None if weights is None else weights[mask], minlength=n)
+
+    entry_qty = group_sum(is_entry, priced_qty)
+    exit_qty = group_sum(is_exit, priced_qty)
+    entry_notional = group_sum(is_entry, notional)
+    exit_notional = group_sum(is_exit, notional)
+    entry_count = group_sum(is_entry)
+    exit_count = group_sum(is_exit)
+    used = is_entry | is_exit
+    fees = group_sum(used, fills.fee[f_idx])
+
+    realized = fills.realized[f_idx]
+    reported_mask = is_exit & ~np.isnan(realized)
+    reported = group_sum(reported_mask, np.nan_to_num(realized))
+    reported_count = group_sum(reported_mask)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        entry_vwap = np.where(entry_qty > 0, entry_notional / entry_qty, np.nan)
+        exit_vwap = np.where(exit_qty > 0, exit_notional / exit_qty, np.nan)
+    closed_qty = np.minimum(entry_qty, exit_qty)
+    computed = np.nan_to_num((exit_vwap - entry_vwap) * closed_qty * signs)
+    realized_pnl = np.where(reported_count > 0, reported, computed)
+
+    funding_total = np.zeros(n)
+    if funding:
+        funding_rows = sorted(
+            (record_time_ms(HistoryDataset.INCOME, r), _float(_first(r, _FUNDING_FIELDS)))
+            for r in funding if isinstance(r, dict)
+        )
+        funding_times = np.array([t for t, _ in funding_rows], dtype=np.int64)
+        funding_amounts = np.array([a for _, a in funding_rows], dtype=np.float64)
+        fw_idx, fe_idx = _interval_join(funding_times, starts, ends)
+        funding_total = np.bincount(fw_idx, weights=funding_amounts[fe_idx], minlength=n)
+
+    net_pnl = realized_pnl - fees + funding_total
+
+    # Pairs are ordered by window, so exit fill ids split cleanly per window
+    exit_ids = np.split(fills.fill_id[f_idx[is_exit]], np.cumsum(exit_count)[:-1].astype(np.int64))
+
+    results: Dict[Any, FillAggregate] = {}
+    for i, window in enumerate(windows):
+        results[window.trade_id] = FillAggregate(
+            trade_id=window.trade_id,
+            entry_qty=float(entry_qty[i]),
+            exit_qty=float(exit_qty[i]),
+            entry_price=None if np.isnan(entry_vwap[i]) else float(entry_vwap[i]),
+            exit_price=None if np.isnan(exit_vwap[i]) else float(exit_vwap[i]),
+            realized_pnl=float(realized_pnl[i]),
+            fees=float(fees[i]),
+            funding=float(funding_total[i]),
+            net_pnl=float(net_pnl[i]),
+            entry_fills=int(entry_count[i]),
+            exit_fills=int(exit_count[i]),
+            realized_reported=bool(reported_count[i]),
+            exit_fill_ids=[fid for fid in exit_ids[i] if fid],
+        )
+    return results
+
+
+@dataclass
+class PositionRecordMatch:
+    """Result of matching a trade against closed-position records."""
+    record: Optional[Dict[str, Any]]
+    candidates: int
+    used_fallback: bool
+    filtered_reasons: Dict[str, int]
+
+
+def select_position_record(
+    records: List[Dict[str, Any]],
+    created_ms: int,
+    closed_ms: int,
+    position_type: str,
+    position_size: Optional[float],
+    used_close_ids: Set[str],
+    created_pad_ms: int = 10 * 60 * 1000,
+    close_pad_ms: int = 30 * 60 * 1000
+) -> PositionRecordMatch:
+    """
+    Pick the closed-position record that best matches a trade.
+
+    Candidates must be unused and within the open/close time pads, and match
+    the position size (within 20%), close type and side when those are
+    known. If none qualify, records within twice the time pads are
+    considered instead. Candidates are ranked by close-time distance, then
+    open-time distance, then a size mismatch penalty.
+
+    Args:
+        records: Position history records (KuCoin shape: openTime, closeTime, size, type, side, closeId)
+        created_ms: Trade creation time in milliseconds
+        closed_ms: Trade close time in milliseconds
+        position_type: 'LONG' or 'SHORT'
+        position_size: Trade position size, if known
+        used_close_ids: closeIds already matched to other trades
+        created_pad_ms: Allowed open-time distance
+        close_pad_ms: Allowed close-time distance
+
+    Returns:
+        PositionRecordMatch (record is None when nothing matches)
+    """
+    reasons = {
+        'used_closeId': 0,
+        'openTime_too_far': 0,
+        'closeTime_too_far': 0,
+        'type_mismatch': 0,
+        'side_mismatch': 0,
+        'size_mismatch': 0
+    }
+    if not records:
+        return PositionRecordMatch(None, 0, False, reasons)
+
+    open_ms = np.array([int(_float(r.get('openTime'))) for r in records], dtype=np.int64)
+    close_ms = np.array([int(_float(r.get('closeTime'))) for r in records], dtype=np.int64)
+    size = np.array([_float(r.get('size')) for r in records], dtype=np.float64)
+    close_ids = [str(r.get('closeId') or '') for r in records]
+
+    used = np.array([bool(cid) and cid in used_close_ids for cid in close_ids], dtype=bool)
+    open_diff = np.abs(open_ms - created_ms)
+    close_diff = np.abs(close_ms - closed_ms)
+
+    position_type = str(position_type or '').upper()
+    expected_close_type = {'LONG': 'CLOSE_LONG', 'SHORT': 'CLOSE_SHORT'}.get(position_type)
+    expected_side = position_type if position_type in _POSITION_SIGN else None
+
+    # Filters are applied in order; each rejected record is counted once
+    filters = [
+        ('used_closeId', used),
+        ('openTime_too_far', (open_ms > 0) & (open_diff > created_pad_ms)),
+        ('closeTime_too_far', (close_ms > 0) & (close_diff > close_pad_ms)),
+    ]
+    if position_size is not None:
+        with np.errstate(divide='ignore', invalid='ignore'):
+            size_pct = np.abs(position_size - size) / position_size if position_size > 0 else np.ones_like(size)
+        filters.append(('size_mismatch', (size > 0) & (size_pct > 0.20)))
+    if expected_close_type:
+        types = [str(r.get('type') or '').upper() for r in records]
+        filters.append(('type_mismatch', np.array([bool(t) and expected_close_type not in t for t in types], dtype=bool)))
+    if expected_side:
+        sides = [str(r.get('side') or '').upper() for r in records]
+        filters.append(('side_mismatch', np.array([s not in (expected_side, '') for s in sides], dtype=bool)))
+
+    remaining = np.ones(len(records), dtype=bool)
+    for reason, rejected in filters:
+        reasons[reason] += int(np.count_nonzero(remaining & rejected))
+        remaining &= ~rejected
+
+    used_fallback = False
+    if not remaining.any():
+        used_fallback = True
+        remaining = (
+            ~used
+            & ~((open_ms > 0) & (open_diff > created_pad_ms * 2))
+            & ~((close_ms > 0) & (close_diff > close_pad_ms * 2))
+        )
+
+    candidates = np.flatnonzero(remaining)
+    if not len(candidates):
+        return PositionRecordMatch(None, 0, used_fallback, reasons)
+
+    close_score = np.where(close_ms > 0, close_diff, _MISSING_TIME_SCORE)
+    open_score = np.where(open_ms > 0, open_diff, _MISSING_TIME_SCORE)
+    size_penalty = np.zeros(len(records), dtype=np.int64)
+    if position_size is not None:
+        size_penalty = np.where(
+            (size > 0) & (np.abs(position_size - size) > max(0.01, position_size * 0.01)), 1_000_000, 0
+        )
+
+    # lexsort uses the last key as the primary one and is stable
+    order = np.lexsort((size_penalty[candidates], open_score[candidates], close_score[candidates]))
+    best = records[int(candidates[order[0]])]
+    return PositionRecordMatch(best, int(len(candidates)), used_fallback, reasons)
@@ -0,0 +1,554 @@
+"""
+Incremental analytics rollups.
+
+Closed trades are folded into per-day buckets stored in ``analytics_records``
+(analytics_type DAILY, metric_type ROLLUP) for four scopes: trader+symbol,
+trader (all symbols), symbol (all traders) and everything. Each bucket keeps
+the day's per-trade contributions in close order plus a summary that can be
+merged with the next day's: counts, PnL, fees and the prefix-sum extremes
+needed to combine max drawdown exactly. The /analytics routes merge the
+buckets of the requested scope and date range instead of scanning trades,
+so their cost depends on the number of days, not the number of trades.
+
+Several processes (the bot and the maintenance scripts) write the same
+buckets, so each change re-reads the stored bucket and saves it only if
+nobody else saved it in between, retrying otherwise.
+"""
+
+import asyncio
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from src.database.models.analytics_models import AnalyticsType, MetricType
+
+logger = logging.getLogger(__name__)
+
+# Trader / symbol value of buckets that aggregate over every trader or symbol
+ALL = '__all__'
+# Queries only need the stored summaries, not the per-trade contributions
+SUMMARY_COLUMNS = ['id', 'trader', 'period_start', 'summary:metadata->summary']
+# Number of trades whose bucket day is remembered, to move a trade whose closed_at changed
+MAX_TRACKED_TRADES = 50000
+# Reload-and-reapply attempts when another process saves the same bucket first
+MAX_SAVE_ATTEMPTS = 5
+
+
+def _float(value: Any) -> Optional[float]:
+    try:
+        return float(value) if value is not None and value != '' else None
+    except (TypeError, ValueError):
+        return None
+
+
+def day_of(timestamp: Optional[str]) -> str:
+    """UTC day (YYYY-MM-DD) of an ISO timestamp, or today when missing."""
+    if timestamp:
+        try:
+            parsed = datetime.fromisoformat(str(timestamp).replace('Z', '+00:00'))
+            if parsed.tzinfo is not None:
+                parsed = parsed.astimezone(timezone.utc)
+            return parsed.date().isoformat()
+        except ValueError:
+            pass
+    return datetime.now(timezone.utc).date().isoformat()
+
+
+@dataclass
+class TradeContribution:
+    """One closed trade's share of a bucket."""
+    trade_id: str
+    gross_pnl: float
+    net_pnl: float
+    closed_at: str
+
+    @property
+    def fees(self) -> float:
+        return self.gross_pnl - self.net_pnl
+
+    def to_row(self) -> List[Any]:
+        return [self.trade_id, self.gross_pnl, self.net_pnl, self.closed_at]
+
+    @classmethod
+    def from_row(cls, row: List[Any]) -> 'TradeContribution':
+        return cls(str(row[0]), float(row[1]), float(row[2]), str(row[3]))
+
+
+def trade_contribution(trade: Dict[str, Any]) -> Optional[TradeContribution]:
+    """
+    Build a trade's contribution, or None if it is not a closed trade with PnL.
+
+    The bucket day comes from closed_at alone, so every write of the same
+    trade lands in the same day; a trade without closed_at is counted once a
+    later write sets it.
+
+    Args:
+        trade: Trade row (merged with the update that closed it)
+
+    Returns:
+        Optional[TradeContribution]: Gross PnL is pnl_usd; net PnL is net_pnl when known
+    """
+    if str(trade.get('status') or '').upper() != 'CLOSED' or trade.get('id') is None:
+        return None
+    if not trade.get('closed_at'):
+        return None
+    gross = _float(trade.get('pnl_usd'))
+    net = _float(trade.get('net_pnl'))
+    if gross is None:
+        gross = net
+    if gross is None:
+        return None
+    return TradeContribution(str(trade['id']), gross, net if net is not None else gross, str(trade['closed_at']))
+
+
+@dataclass
+class RollupSummary:
+    """
+    Mergeable performance summary of a sequence of closed trades.
+
+    Equity starts at 0 and moves by each trade's net PnL; max_prefix/min_prefix
+    are the highest/lowest equity reached (including the start) so that two
+    consecutive summaries can be combined without the trades themselves.
+    """
+    count: int = 0
+    wins: int = 0
+    losses: int = 0
+    gross_pnl: float = 0.0
+    gross_profit: float = 0.0
+    gross_loss: float = 0.0
+    fees: float = 0.0
+    net_pnl: float = 0.0
+    max_prefix: float = 0.0
+    min_prefix: float = 0.0
+    max_drawdown: float = 0.0
+
+    @classmethod
+    def from_contributions(cls, contributions: Iterable[TradeContribution]) -> 'RollupSummary':
+        summary = cls()
+        for contribution in contributions:
+            summary = summary.merge(cls._single(contribution))
+        return summary
+
+    @classmethod
+    def _single(cls, contribution: TradeContribution) -> 'RollupSummary':
+        gross, net = contribution.gross_pnl, contribution.net_pnl
+        return cls(
+            count=1,
+            wins=1 if gross > 0 else 0,
+            losses=1 if gross < 0 else 0,
+            gross_pnl=gross,
+            gross_profit=max(gross, 0.0),
+            gross_loss=min(gross, 0.0),
+            fees=contribution.fees,
+            net_pnl=net,
+            max_prefix=max(net, 0.0),
+            min_prefix=min(net, 0.0),
+            max_drawdown=max(-net, 0.0),
+        )
+
+    def merge(self, later: 'RollupSummary') -> 'RollupSummary':
+        """Combine with the summary of the trades that closed after these."""
+        return RollupSummary(
+            count=self.count + later.count,
+            wins=self.wins + later.wins,
+            losses=self.losses + later.losses,
+            gross_pnl=self.gross_pnl + later.gross_pnl,
+            gross_profit=self.gross_profit + later.gross_profit,
+            gross_loss=self.gross_loss + later.gross_loss,
+            fees=self.fees + later.fees,
+            net_pnl=self.net_pnl + later.net_pnl,
+            max_prefix=max(self.max_prefix, self.net_pnl + later.max_prefix),
+            min_prefix=min(self.min_prefix, self.net_pnl + later.min_prefix),
+            max_drawdown=max(self.max_drawdown, later.max_drawdown,
+                             self.max_prefix - (self.net_pnl + later.min_prefix)),
+        )
+
+    @property
+    def current_drawdown(self) -> float:
+        return self.max_prefix - self.net_pnl
+
+    @property
+    def win_rate(self) -> float:
+        return (self.wins / self.count) * 100 if self.count else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: round(value, 8) if isinstance(value, float) else value
+                for name, value in self.__dict__.items()}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'RollupSummary':
+        return cls(**{name: data[name] for name in cls.__dataclass_fields__ if name in data})
+
+
+@dataclass
+class RollupBucket:
+    """One day of closed trades for a trader/symbol scope."""
+    trader: str
+    symbol: str
+    day: str
+    contributions: List[TradeContribution] = field(default_factory=list)
+    record_id: Optional[int] = None
+    # updated_at of the stored record this bucket was loaded from
+    version: Optional[str] = None
+
+    @property
+    def key(self) -> Tuple[str, str, str]:
+        return self.trader, self.symbol, self.day
+
+    def apply(self, contribution: TradeContribution) -> bool:
+        """
+        Add a trade, or replace its earlier contribution.
+
+        Returns:
+            bool: True if the bucket changed
+        """
+        for index, existing in enumerate(self.contributions):
+            if existing.trade_id == contribution.trade_id:
+                if existing == contribution:
+                    return False
+                del self.contributions[index]
+                break
+        self.contributions.append(contribution)
+        self.contributions.sort(key=lambda c: c.closed_at)
+        return True
+
+    def remove(self, trade_id: str) -> bool:
+        """Drop a trade's contribution (it moved to another day). Returns True if it was here."""
+        before = len(self.contributions)
+        self.contributions = [c for c in self.contributions if c.trade_id != trade_id]
+        return len(self.contributions) != before
+
+    def summary(self) -> RollupSummary:
+        return RollupSummary.from_contributions(self.contributions)
+
+    def to_record(self) -> Dict[str, Any]:
+        summary = self.summary()
+        return {
+            'trader': self.trader,
+            'analytics_type': AnalyticsType.DAILY.value,
+            'metric_type': MetricType.ROLLUP.value,
+            'period_start': self.day,
+            'period_end': self.day,
+            'value': summary.gross_pnl,
+            'metadata': {
+                'symbol': self.symbol,
+                'summary': summary.to_dict(),
+                'trades': [c.to_row() for c in self.contributions],
+            },
+        }
+
+    @classmethod
+    def from_record(cls, record: Dict[str, Any]) -> 'RollupBucket':
+        metadata = record.get('metadata') or {}
+        return cls(
+            trader=record.get('trader') or ALL,
+            symbol=metadata.get('symbol') or ALL,
+            day=str(record.get('period_start') or '')[:10],
+            contributions=[TradeContribution.from_row(row) for row in metadata.get('trades') or []],
+            record_id=record.get('id'),
+            version=record.get('updated_at'),
+        )
+
+
+def bucket_scopes(trade: Dict[str, Any]) -> List[Tuple[str, str]]:
+    """(trader, symbol) scopes a trade is counted in."""
+    trader = str(trade.get('trader') or '').strip() or ALL
+    symbol = str(trade.get('coin_symbol') or '').strip().upper() or ALL
+    scopes = [(trader, symbol), (trader, ALL), (ALL, symbol), (ALL, ALL)]
+    return list(dict.fromkeys(scopes))
+
+
+def record_summary(record: Dict[str, Any]) -> RollupSummary:
+    """Stored summary of a rollup record (selected as ``summary`` or inside metadata)."""
+    summary = record.get('summary')
+    if summary is None:
+        summary = (record.get('metadata') or {}).get('summary') or {}
+    return RollupSummary.from_dict(summary)
+
+
+def merge_summaries(summaries_by_day: Iterable[Tuple[str, RollupSummary]]) -> RollupSummary:
+    """Merge daily summaries in day order."""
+    total = RollupSummary()
+    for _, summary in sorted(summaries_by_day, key=lambda item: item[0]):
+        total = total.merge(summary)
+    return total
+
+
+class AnalyticsRollupService:
+    """
+    Maintains the rollup buckets and answers analytics queries from them.
+
+    Buckets are not cached: every change reloads the stored bucket, applies
+    the trade and saves it conditionally on the record's updated_at, so
+    processes writing the same day do not overwrite each other's trades.
+    """
+
+    def __init__(self, repository: Any, max_trades: int = MAX_TRACKED_TRADES):
+        """
+        Initialize the service.
+
+        Args:
+            repository: AnalyticsRepository used to load and save rollup records
+            max_trades: Maximum number of trades whose bucket day is remembered
+        """
+        self.repository = repository
+        self.max_trades = max(1, max_trades)
+        # trade id -> day it is currently counted in (recently closed trades only)
+        self._trade_days: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = asyncio.Lock()
+
+    async def _load(self, trader: str, symbol: str, day: str) -> RollupBucket:
+        records = await self.repository.get_rollup_records(trader=trader, symbol=symbol,
+                                                           start_day=day, end_day=day)
+        return RollupBucket.from_record(records[0]) if records else RollupBucket(trader, symbol, day)
+
+    def _remember_day(self, trade_id: str, day: str) -> None:
+        self._trade_days[trade_id] = day
+        self._trade_days.move_to_end(trade_id)
+        while len(self._trade_days) > self.max_trades:
+            self._trade_days.popitem(last=False)
+
+    async def _save(self, bucket: RollupBucket) -> bool:
+        """Save the bucket unless its record changed since it was loaded. Returns True if saved."""
+        record = await self.repository.save_rollup_record(bucket.to_record(), bucket.record_id,
+                                                          expected_updated_at=bucket.version)
+        if not record:
+            return False
+        bucket.record_id = record.get('id', bucket.record_id)
+        bucket.version = record.get('updated_at')
+        return True
+
+    async def _change(self, trader: str, symbol: str, day: str,
+                      change: Callable[[RollupBucket], bool]) -> bool:
+        """
+        Apply ``change`` to the stored bucket and save it, reloading if another writer got there first.
+
+        Returns:
+            bool: True if the bucket changed
+        """
+        for _ in range(MAX_SAVE_ATTEMPTS):
+            bucket = await self._load(trader, symbol, day)
+            if not change(bucket):
+                return False
+            if await self._save(bucket):
+                return True
+        raise RuntimeError(f"rollup bucket {trader}/{symbol}/{day} kept changing while saving")
+
+    async def record_closed_trade(self, trade: Dict[str, Any]) -> bool:
+        """
+        Fold a closed trade into its buckets (idempotent; a changed PnL replaces the old one).
+
+        Args:
+            trade: Trade row including the update that closed it
+
+        Returns:
+            bool: True if any bucket changed
+        """
+        contribution = trade_contribution(trade)
+        if contribution is None:
+            return False
+        day = day_of(contribution.closed_at)
+
+        try:
+            async with self._lock:
+                changed = False
+                previous_day = self._trade_days.get(contribution.trade_id)
+                for trader, symbol in bucket_scopes(trade):
+                    if previous_day and previous_day != day:
+                        await self._change(trader, symbol, previous_day,
+                                           lambda bucket: bucket.remove(contribution.trade_id))
+                    if await self._change(trader, symbol, day, lambda bucket: bucket.apply(contribution)):
+                        changed = True
+                self._remember_day(contribution.trade_id, day)
+                return changed
+        except Exception as e:
+            logger.error(f"Failed to update analytics rollups for trade {trade.get('id')}: {e}")
+            return False
+
+    async def rebuild(self, trades: Iterable[Dict[str, Any]]) -> int:
+        """
+        Rebuild rollups from closed trades, replacing the stored buckets they fall in.
+
+        Args:
+            trades: Closed trade rows
+
+        Returns:
+            int: Number of trades counted
+        """
+        buckets: Dict[Tuple[str, str, str], RollupBucket] = {}
+        counted = 0
+        for trade in trades:
+            contribution = trade_contribution(trade)
+            if contribution is None:
+                continue
+            day = day_of(contribution.closed_at)
+            for trader, symbol in bucket_scopes(trade):
+                key = (trader, symbol, day)
+                buckets.setdefault(key, RollupBucket(trader, symbol, day)).apply(contribution)
+            self._remember_day(contribution.trade_id, day)
+            counted += 1
+
+        async with self._lock:
+            for key, bucket in buckets.items():
+                existing = await self._load(*key)
+                bucket.record_id = existing.record_id
+                await self._save(bucket)
+        logger.info(f"Rebuilt {len(buckets)} analytics rollup buckets from {counted} trades")
+        return counted
+
+    async def _daily(self, filters: Dict[str, Any]) -> List[Tuple[str, RollupSummary]]:
+        """Daily summaries for the trader/coin_symbol scope and date range in filters, oldest first."""
+        start_day = str(filters['start_date'])[:10] if filters.get('start_date') else None
+        end_day = str(filters['end_date'])[:10] if filters.get('end_date') else None
+        symbol = filters.get('coin_symbol')
+        records = await self.repository.get_rollup_records(
+            trader=filters.get('trader') or ALL,
+            symbol=str(symbol).upper() if symbol else ALL,
+            start_day=start_day,
+            end_day=end_day,
+            columns=SUMMARY_COLUMNS,
+        )
+        daily = [(str(record.get('period_start'))[:10], record_summary(record)) for record in records]
+        return sorted(daily, key=lambda item: item[0])
+
+    async def get_performance_analytics(self, filters: Dict[str, Any]) -> Dict[str, Any]:
+        """Totals for the AnalyticsResponse model."""
+        summary = merge_summaries(await self._daily(filters))
+        return {
+            'total_trades': summary.count,
+            'winning_trades': summary.wins,
+            'losing_trades': summary.losses,
+            'win_rate': round(summary.win_rate, 2),
+            'total_pnl': round(summary.gross_pnl, 8),
+            'avg_trade_pnl': round(summary.gross_pnl / summary.count, 8) if summary.count else 0.0,
+            'max_drawdown': round(summary.max_drawdown, 8),
+        }
+
+    async def get_pnl_analytics(self, filters: Dict[str, Any]) -> Dict[str, Any]:
+        """PnL totals and the daily PnL / running equity series."""
+        daily = await self._daily(filters)
+        series, equity = [], 0.0
+        for day, summary in daily:
+            equity += summary.net_pnl
+            series.append({'date': day, 'gross_pnl': round(summary.gross_pnl, 8),
+                           'net_pnl': round(summary.net_pnl, 8), 'equity': round(equity, 8)})
+        total = merge_summaries(daily)
+        return {
+            'total_pnl': round(total.gross_pnl, 8),
+            'gross_profit': round(total.gross_profit, 8),
+            'gross_loss': round(total.gross_loss, 8),
+            'fees': round(total.fees, 8),
+            'net_pnl': round(total.net_pnl, 8),
+            'daily': series,
+        }
+
+    async def get_win_rate_analytics(self, filters: Dict[str, Any]) -> Dict[str, Any]:
+        """Win/loss counts and win rate."""
+        summary = merge_summaries(await self._daily(filters))
+        return {
+            'total_trades': summary.count,
+            'winning_trades': summary.wins,
+            'losing_trades': summary.losses,
+            'breakeven_trades': summary.count - summary.wins - summary.losses,
+            'win_rate': round(summary.win_rate, 2),
+        }
+
+    async def get_drawdown_analytics(self, filters: Dict[str, Any]) -> Dict[str, Any]:
+        """Max/current drawdown over the net equity curve, with the daily curve."""
+        daily = await self._daily(filters)
+        curve, running = [], RollupSummary()
+        for day, summary in daily:
+            running = running.merge(summary)
+            curve.append({'date': day, 'equity': round(running.net_pnl, 8),
+                          'peak_equity': round(running.max_prefix, 8),
+                          'drawdown': round(running.current_drawdown, 8)})
+        return {
+            'max_drawdown': round(running.max_drawdown, 8),
+            'current_drawdown': round(running.current_drawdown, 8),
+            'peak_equity': round(running.max_prefix, 8),
+            'equity': round(running.net_pnl, 8),
+            'curve': curve,
+        }
+
+    async def get_trader_performance(self, filters: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Per-trader totals, best total PnL first."""
+        start_day = str(filters['start_date'])[:10] if filters.get('start_date') else None
+        end_day = str(filters['end_date'])[:10] if filters.get('end_date') else None
+        records = await self.repository.get_rollup_records(symbol=ALL, start_day=start_day, end_day=end_day,
+                                                           exclude_trader=ALL, columns=SUMMARY_COLUMNS)
+        by_trader: Dict[str, List[Tuple[str, RollupSummary]]] = {}
+        for record in records:
+            by_trader.setdefault(record.get('trader') or ALL, []).append(
+                (str(record.get('period_start'))[:10], record_summary(record)))
+
+        results = []
+        for trader, daily in by_trader.items():
+            summary = merge_summaries(daily)
+            results.append({
+                'trader': trader,
+                'total_trades': summary.count,
+                'winning_trades': summary.wins,
+                'losing_trades': summary.losses,
+                'win_rate': round(summary.win_rate, 2),
+                'total_pnl': round(summary.gross_pnl, 8),
+                'net_pnl': round(summary.net_pnl, 8),
+                'max_drawdown': round(summary.max_drawdown, 8),
+            })
+        return sorted(results, key=lambda r: r['total_pnl'], reverse=True)
+
+
+_rollup_service: Optional[AnalyticsRollupService] = None
+
+
+def get_analytics_rollups(client: Any = None) -> AnalyticsRollupService:
+    """
+    Get the process-wide rollup service, creating it on first use.
+
+    Args:
+        client: Supabase client (defaults to the shared DiscordBot's client)
+
+    Returns:
+        AnalyticsRollupService
+    """
+    global _rollup_service
+    if _rollup_service is None:
+        from src.database.core.database_manager import DatabaseManager
+        from src.database.repositories.analytics_repository import AnalyticsRepository
+        if client is None:
+            from discord_bot.discord_bot import get_discord_bot
+            client = get_discord_bot().supabase
+        _rollup_service = AnalyticsRollupService(AnalyticsRepository(DatabaseManager(client)))
+    return _rollup_service
+
+
+async def record_trade_writes(client: Any, rows: Optional[Iterable[Dict[str, Any]]]) -> int:
+    """
+    Fold trade rows returned by a write to the trades table into the rollups.
+
+    This is the hook every writer that changes a trade's status or PnL calls
+    with the rows its UPDATE returned. Rows that are not closed trades with
+    PnL are skipped, and failures are logged rather than raised so a rollup
+    problem never fails the trade write.
+
+    Args:
+        client: Supabase client the rows were written with
+        rows: Updated trade rows (``response.data``)
+
+    Returns:
+        int: Number of trades that changed a bucket
+    """
+    trades = [row for row in rows or [] if isinstance(row, dict) and trade_contribution(row) is not None]
+    if not trades:
+        return 0
+    try:
+        service = get_analytics_rollups(client)
+    except Exception as e:
+        logger.warning(f"Analytics rollups unavailable, skipping {len(trades)} trades: {e}")
+        return 0
+    changed = 0
+    for trade in trades:
+        if await service.record_closed_trade(trade):
+            changed += 1
+    return changed
@@ -0,0 +1,380 @@
+"""
+Database Change Feed
+
+Subscribes to Supabase realtime (Postgres logical replication) changes of
+selected tables and hands every INSERT/UPDATE/DELETE to in-process
+handlers, so work is picked up as soon as it is written instead of being
+discovered by polling queries.
+
+Realtime delivery is at-most-once: events written while the socket is down
+are never replayed. Every table can therefore register a catch-up query
+that is run each time the subscription (re)joins and then at a low
+frequency, and whose rows are dispatched like UPDATE events. Handlers must
+be idempotent; the work queues below coalesce repeated events for the same
+row.
+"""
+
+import asyncio
+import inspect
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CATCHUP_INTERVAL = 600.0
+DEFAULT_HEALTH_INTERVAL = 5.0
+MAX_RECONNECT_DELAY = 60.0
+# Catch-up queries re-read this much before their previous run
+CATCHUP_OVERLAP = timedelta(minutes=2)
+
+ChangeHandler = Callable[['ChangeEvent'], Any]
+CatchupQuery = Callable[[Optional[str]], Awaitable[List[Dict[str, Any]]]]
+
+
+def realtime_url(supabase_url: str) -> str:
+    """Websocket endpoint of a Supabase project's realtime server."""
+    url = supabase_url.rstrip('/')
+    if url.startswith('https://'):
+        url = 'wss://' + url[len('https://'):]
+    elif url.startswith('http://'):
+        url = 'ws://' + url[len('http://'):]
+    return f"{url}/realtime/v1"
+
+
+@dataclass
+class ChangeEvent:
+    """One row change of a subscribed table."""
+    table: str
+    type: str
+    record: Dict[str, Any] = field(default_factory=dict)
+    old_record: Dict[str, Any] = field(default_factory=dict)
+    commit_timestamp: Optional[str] = None
+    catchup: bool = False
+
+    @classmethod
+    def from_payload(cls, payload: Dict[str, Any], table: Optional[str] = None) -> 'ChangeEvent':
+        """
+        Build an event from a realtime postgres_changes payload.
+
+        Args:
+            payload: Payload as delivered by the realtime client (the change is
+                under 'data') or an already unwrapped change
+            table: Table name to use if the payload does not carry one
+        """
+        data = payload.get('data', payload)
+        return cls(
+            table=data.get('table') or table or '',
+            type=str(data.get('eventType') or data.get('type') or '').upper(),
+            record=data.get('new') or data.get('record') or {},
+            old_record=data.get('old') or data.get('old_record') or {},
+            commit_timestamp=data.get('commit_timestamp'),
+        )
+
+    @property
+    def row(self) -> Dict[str, Any]:
+        """The row after the change, or the deleted row for DELETE events."""
+        return self.record or self.old_record
+
+    def as_payload(self) -> Dict[str, Any]:
+        """Unwrapped payload accepted by the caches' apply_change_event methods."""
+        return {'type': self.type, 'record': self.record, 'old_record': self.old_record}
+
+
+class WorkQueue:
+    """
+    Keyed in-process work queue drained by a few worker tasks.
+
+    A key that is already waiting is not queued twice; its item is replaced
+    by the newer one. Items can be delayed, e.g. to give a just-written row
+    a grace period or to re-check an order later.
+    """
+
+    def __init__(self, name: str, handler: Callable[[str, Any], Awaitable[None]], workers: int = 1):
+        """
+        Initialize the queue.
+
+        Args:
+            name: Name used in logs and stats
+            handler: Coroutine called with (key, item) for every item
+            workers: Items handled concurrently
+        """
+        self.name = name
+        self.handler = handler
+        self.workers = max(1, workers)
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._pending: Dict[str, Any] = {}
+        self._timers: Dict[str, asyncio.TimerHandle] = {}
+        self._tasks: List[asyncio.Task] = []
+        self.stats = {'queued': 0, 'coalesced': 0, 'handled': 0, 'failed': 0}
+
+    def put(self, key: Any, item: Any, delay: float = 0.0) -> bool:
+        """
+        Queue an item.
+
+        Args:
+            key: Identity of the work (e.g. a trade id)
+            item: Data passed to the handler
+            delay: Seconds to wait before the item becomes available
+
+        Returns:
+            bool: False if the key was already waiting (its item is replaced)
+        """
+        key = str(key)
+        if key in self._pending:
+            self._pending[key] = item
+            self.stats['coalesced'] += 1
+            return False
+        self._pending[key] = item
+        self.stats['queued'] += 1
+        if delay > 0:
+            self._timers[key] = asyncio.get_running_loop().call_later(delay, self._release, key)
+        else:
+            self._queue.put_nowait(key)
+        return True
+
+    def _release(self, key: str) -> None:
+        self._timers.pop(key, None)
+        self._queue.put_nowait(key)
+
+    def __contains__(self, key: Any) -> bool:
+        return str(key) in self._pending
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def start(self) -> None:
+        """Start the worker tasks."""
+        if not self._tasks:
+            self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        """Stop the workers and drop delayed items."""
+        for timer in self._timers.values():
+            timer.cancel()
+        self._timers.clear()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _worker(self) -> None:
+        while True:
+            key = await self._queue.get()
+            item = self._pending.pop(key, None)
+            try:
+                await self.handler(key, item)
+                self.stats['handled'] += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.stats['failed'] += 1
+                logger.error(f"{self.name} queue: handling {key} failed: {e}")
+
+
+class ChangeFeed:
+    """
+    Realtime subscription to a set of tables with catch-up after disconnects.
+
+    One channel carries postgres_changes for every registered table. A
+    supervisor task reconnects with back-off when the socket drops and runs
+    the catch-up queries whenever the channel (re)subscribes and every
+    ``catchup_interval`` seconds, so nothing written during an outage is
+    missed.
+    """
+
+    def __init__(self, url: str, key: str, schema: str = 'public',
+                 catchup_interval: float = DEFAULT_CATCHUP_INTERVAL,
+                 health_interval: float = DEFAULT_HEALTH_INTERVAL,
+                 client_factory: Optional[Callable[[], Any]] = None):
+        """
+        Initialize the feed.
+
+        Args:
+            url: Supabase project URL (http/https)
+            key: Supabase API key
+            schema: Database schema of the tables
+            catchup_interval: Seconds between catch-up runs while connected
+            health_interval: Seconds between connection checks
+            client_factory: Builds the realtime client (AsyncRealtimeClient if None)
+        """
+        self.url = url
+        self.key = key
+        self.schema = schema
+        self.catchup_interval = catchup_interval
+        self.health_interval = health_interval
+        self._client_factory = client_factory or self._default_client
+        self._handlers: Dict[str, List[ChangeHandler]] = {}
+        self._catchups: Dict[str, CatchupQuery] = {}
+        self._client: Any = None
+        self._channel: Any = None
+        self._subscribed = False
+        self._task: Optional[asyncio.Task] = None
+        self._catchup_task: Optional[asyncio.Task] = None
+        self._last_catchup = 0.0
+        self.stats = {'events': 0, 'catchup_rows': 0, 'catchups': 0, 'connects': 0, 'handler_errors': 0}
+
+    def _default_client(self) -> Any:
+        from realtime import AsyncRealtimeClient
+        # Reconnects are handled by the supervisor so that every reconnect
+        # also runs the catch-up queries
+        return AsyncRealtimeClient(realtime_url(self.url), token=self.key,
+                                   auto_reconnect=False, max_retries=1)
+
+    # Registration
+
+    def on(self, table: str, handler: ChangeHandler) -> None:
+        """Call `handler(event)` for every change of `table`; coroutine handlers are scheduled."""
+        self._handlers.setdefault(table, []).append(handler)
+
+    def add_catchup(self, table: str, query: CatchupQuery) -> None:
+        """
+        Register the catch-up query of a table.
+
+        The query is called with the ISO time to read changes from (None on
+        the first run) and returns the rows changed since then.
+        """
+        self._catchups[table] = query
+
+    @property
+    def tables(self) -> List[str]:
+        return sorted(set(self._handlers) | set(self._catchups))
+
+    # Dispatch
+
+    def dispatch(self, payload: Dict[str, Any], table: Optional[str] = None) -> None:
+        """Route a realtime payload to the handlers of its table."""
+        event = payload if isinstance(payload, ChangeEvent) else ChangeEvent.from_payload(payload, table)
+        if not event.catchup:
+            self.stats['events'] += 1
+        for handler in self._handlers.get(event.table, []):
+            try:
+                result = handler(event)
+                if inspect.isawaitable(result):
+                    asyncio.ensure_future(result)
+            except Exception as e:
+                self.stats['handler_errors'] += 1
+                logger.error(f"Change feed handler for {event.table} failed: {e}")
+
+    async def catch_up(self) -> int:
+        """
+        Run every catch-up query and dispatch the rows it returns.
+
+        Returns:
+            int: Number of rows dispatched
+        """
+        # Everything before the previous run was read then or delivered live
+        since = None
+        if self._last_catchup:
+            since = (datetime.fromtimestamp(self._last_catchup, tz=timezone.utc) - CATCHUP_OVERLAP).isoformat()
+        self._last_catchup = time.time()
+        self.stats['catchups'] += 1
+
+        dispatched = 0
+        for table, query in self._catchups.items():
+            try:
+                rows = await query(since)
+            except Exception as e:
+                logger.error(f"Change feed catch-up for {table} failed: {e}")
+                continue
+            for row in rows or []:
+                self.dispatch(ChangeEvent(table=table, type='UPDATE', record=row, catchup=True))
+            dispatched += len(rows or [])
+        self.stats['catchup_rows'] += dispatched
+        if dispatched:
+            logger.info(f"Change feed catch-up dispatched {dispatched} rows (since {since})")
+        return dispatched
+
+    def _schedule_catch_up(self) -> None:
+        if self._catchup_task is None or self._catchup_task.done():
+            self._catchup_task = asyncio.ensure_future(self.catch_up())
+
+    # Connection
+
+    def _client_alive(self) -> bool:
+        """
+        True while the realtime client still reads from its socket.
+
+        Without auto_reconnect the client only logs a dropped socket and keeps
+        reporting is_connected, so the end of its listen task is what marks
+        the connection as lost.
+        """
+        client = self._client
+        if client is None or not client.is_connected:
+            return False
+        listen_task = getattr(client, '_listen_task', None)
+        return listen_task is None or not listen_task.done()
+
+    @property
+    def is_live(self) -> bool:
+        """True while the socket is connected and the channel is subscribed."""
+        return self._subscribed and self._client_alive()
+
+    def _on_subscribe(self, state: Any, error: Optional[Exception] = None) -> None:
+        state_name = getattr(state, 'value', state)
+        if str(state_name).upper() == 'SUBSCRIBED':
+            self._subscribed = True
+            logger.info(f"Change feed subscribed to {', '.join(self.tables)}")
+            # Pick up whatever was written while we were not listening
+            self._schedule_catch_up()
+        else:
+            self._subscribed = False
+            logger.warning(f"Change feed subscription {state_name}: {error or ''}")
+
+    async def _connect(self) -> None:
+        await self._disconnect()
+        client = self._client_factory()
+        await client.connect()
+        channel = client.channel('db-changes')
+        for table in self._handlers:
+            channel.on_postgres_changes('*', table=table, schema=self.schema,
+                                        callback=lambda payload, table=table: self.dispatch(payload, table))
+        self._client, self._channel = client, channel
+        self.stats['connects'] += 1
+        await channel.subscribe(self._on_subscribe)
+
+    async def _disconnect(self) -> None:
+        client, self._client, self._channel, self._subscribed = self._client, None, None, False
+        if client is not None:
+            try:
+                await client.close()
+            except Exception as e:
+                logger.debug(f"Closing realtime client failed: {e}")
+
+    async def _supervise(self) -> None:
+        delay = self.health_interval
+        while True:
+            if not self._client_alive():
+                if self._client is not None:
+                    logger.warning("Change feed connection lost, reconnecting")
+                    await self._disconnect()
+                try:
+                    await self._connect()
+                    delay = self.health_interval
+                except Exception as e:
+                    logger.error(f"Change feed connection failed: {e}")
+                    # Keep the catch-up running at low frequency while offline
+                    delay = min(delay * 2, MAX_RECONNECT_DELAY)
+            if time.time() - self._last_catchup >= self.catchup_interval:
+                self._schedule_catch_up()
+            await asyncio.sleep(delay)
+
+    def start(self) -> asyncio.Task:
+        """Start the supervisor task (connects, subscribes and catches up)."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._supervise())
+        return self._task
+
+    async def stop(self) -> None:
+        """Stop the supervisor and close the socket."""
+        for task in (self._task, self._catchup_task):
+            if task is not None and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except (asyncio.CancelledError, Exception):
+                    pass
+        self._task = self._catchup_task = None
+        await self._disconnect()
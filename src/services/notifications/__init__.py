@@ -1,5 +1,6 @@
 from .notification_manager import NotificationManager
 from .telegram_service import TelegramService
+from .notification_outbox import NotificationOutbox, get_notification_outbox
 from .message_formatter import MessageFormatter
 from .notification_models import (
     TradeNotification, OrderFillNotification, PnLNotification,
@@ -10,6 +11,8 @@ from .notification_models import (
 __all__ = [
     'NotificationManager',
     'TelegramService',
+    'NotificationOutbox',
+    'get_notification_outbox',
     'MessageFormatter',
     'TradeNotification',
     'OrderFillNotification',
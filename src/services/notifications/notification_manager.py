@@ -2,6 +2,7 @@ import logging
 from datetime import datetime, timezone
 from typing import Optional, Dict, Any
 from .telegram_service import TelegramService
+from .notification_outbox import NotificationOutbox, get_notification_outbox
 from .message_formatter import MessageFormatter
 from .alert_deduplicator import alert_deduplicator
 from .notification_models import (
@@ -20,6 +21,9 @@ class NotificationManager:
     def __init__(self, telegram_config: Optional[NotificationConfig] = None):
         """Initialize the notification manager"""
         self.telegram_service = TelegramService(telegram_config)
+        # Messages are queued and sent in the background; a custom config gets its own outbox
+        self.outbox = (NotificationOutbox(self.telegram_service) if telegram_config
+                       else get_notification_outbox())
         self.message_formatter = MessageFormatter()
         self.enabled = self.telegram_service.is_enabled()
 
@@ -38,7 +42,7 @@ class NotificationManager:
         error_message: Optional[str] = None,
         trade_id: Optional[str] = None
     ) -> bool:
-        """Send trade execution notification with deduplication"""
+        """Queue trade execution notification with deduplication"""
         if not self.enabled:
             return False
 
@@ -63,7 +67,7 @@ class NotificationManager:
             )
 
             message = self.message_formatter.format_trade_execution_notification(notification)
-            success = await self.telegram_service.send_message(message)
+            success = self.outbox.enqueue(message)
 
             # Mark as sent for deduplication if it was a failure notification
             if status.upper() == "FAILURE" and trade_id and success:
@@ -101,7 +105,7 @@ class NotificationManager:
             )
 
             message = self.message_formatter.format_order_fill_notification(notification)
-            return await self.telegram_service.send_message(message)
+            return self.outbox.enqueue(message)
         except Exception as e:
             logger.error(f"Failed to send order fill notification: {e}")
             return False
@@ -135,7 +139,8 @@ class NotificationManager:
             )
 
             message = self.message_formatter.format_pnl_update_notification(notification)
-            return await self.telegram_service.send_message(message)
+            # Only the latest PnL of a position is worth sending when updates pile up
+            return self.outbox.enqueue(message, coalesce_key=f"pnl:{exchange}:{coin_symbol}:{position_type}")
         except Exception as e:
             logger.error(f"Failed to send PnL update notification: {e}")
             return False
@@ -167,7 +172,7 @@ class NotificationManager:
             )
 
             message = self.message_formatter.format_stop_loss_notification(notification)
-            return await self.telegram_service.send_message(message)
+            return self.outbox.enqueue(message)
         except Exception as e:
             logger.error(f"Failed to send stop-loss notification: {e}")
             return False
@@ -199,7 +204,7 @@ class NotificationManager:
             )
 
             message = self.message_formatter.format_take_profit_notification(notification)
-            return await self.telegram_service.send_message(message)
+            return self.outbox.enqueue(message)
         except Exception as e:
             logger.error(f"Failed to send take-profit notification: {e}")
             return False
@@ -223,7 +228,7 @@ class NotificationManager:
             )
 
             message = self.message_formatter.format_error_notification(notification)
-            return await self.telegram_service.send_message(message)
+            return self.outbox.enqueue(message)
         except Exception as e:
             logger.error(f"Failed to send error notification: {e}")
             return False
@@ -247,7 +252,7 @@ class NotificationManager:
             )
 
             message = self.message_formatter.format_system_status_notification(notification)
-            return await self.telegram_service.send_message(message)
+            return self.outbox.enqueue(message)
         except Exception as e:
             logger.error(f"Failed to send system status notification: {e}")
             return False
@@ -284,8 +289,7 @@ class NotificationManager:
                 return
 
             text = format_entry_signal_payload(payload or {})
-            svc = TelegramService()
-            await svc.send_message(text, parse_mode="HTML")
+            get_notification_outbox().enqueue(text, parse_mode="HTML")
         except Exception as e:
             logger.error(f"Failed to send the notification: {e}")
 
@@ -300,7 +304,6 @@ class NotificationManager:
                 return
 
             text = format_update_signal_payload(payload or {})
-            svc = TelegramService()
-            await svc.send_message(text, parse_mode="HTML")
+            get_notification_outbox().enqueue(text, parse_mode="HTML")
         except Exception as e:
             logger.error(f"Failed to send the notification: {e}")
\ No newline at end of file
@@ -0,0 +1,372 @@
+"""
+Notification Outbox
+
+Telegram messages are queued in memory and delivered by one background
+sender, so callers on the trading path only pay for an enqueue. The sender
+keeps a single TelegramService (one long-lived Bot), spaces messages to the
+chat to stay under Telegram's per-chat rate limit, honours RetryAfter
+back-offs, and retries failed sends with exponential back-off. Messages
+that are waiting for a retry, or still queued at shutdown, are written to a
+small SQLite file and re-queued when the sender next starts.
+
+Bursts of messages that supersede each other (e.g. PnL updates for one
+position) share a coalesce key: while such a message is still queued, a
+newer one with the same key replaces its text instead of adding a message.
+"""
+
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Any, Dict, List, Optional
+
+from .telegram_service import TelegramService
+
+logger = logging.getLogger(__name__)
+
+# Telegram allows about one message per second to the same chat
+DEFAULT_MIN_INTERVAL = 1.0
+DEFAULT_MAX_ATTEMPTS = 6
+DEFAULT_RETRY_DELAY = 2.0
+MAX_RETRY_DELAY = 300.0
+DEFAULT_MAX_PENDING = 1000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox_messages (
+    message_id TEXT PRIMARY KEY,
+    text TEXT NOT NULL,
+    parse_mode TEXT,
+    coalesce_key TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    not_before REAL NOT NULL DEFAULT 0
+);
+"""
+
+
+@dataclass
+class OutboxMessage:
+    """A queued Telegram message."""
+    text: str
+    parse_mode: Optional[str] = None
+    coalesce_key: Optional[str] = None
+    message_id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    attempts: int = 0
+    created_at: float = field(default_factory=time.time)
+    # Wall-clock time before which the message must not be retried
+    not_before: float = 0.0
+
+
+class OutboxStore:
+    """SQLite persistence for messages that have not been delivered yet."""
+
+    def __init__(self, db_path: str):
+        """
+        Open (or create) the outbox store.
+
+        Args:
+            db_path: SQLite file path (":memory:" for an ephemeral store)
+        """
+        self.db_path = db_path
+        if db_path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    def save(self, messages: List[OutboxMessage]) -> None:
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO outbox_messages VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(m.message_id, m.text, m.parse_mode, m.coalesce_key, m.attempts, m.created_at, m.not_before)
+                 for m in messages])
+            self._conn.commit()
+
+    def delete(self, message_id: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM outbox_messages WHERE message_id = ?", (message_id,))
+            self._conn.commit()
+
+    def load(self) -> List[OutboxMessage]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT message_id, text, parse_mode, coalesce_key, attempts, created_at, not_before "
+                "FROM outbox_messages ORDER BY created_at").fetchall()
+        return [OutboxMessage(message_id=r[0], text=r[1], parse_mode=r[2], coalesce_key=r[3],
+                              attempts=r[4], created_at=r[5], not_before=r[6]) for r in rows]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class NotificationOutbox:
+    """In-memory Telegram outbox drained by a background sender task."""
+
+    def __init__(self, telegram_service: Optional[TelegramService] = None,
+                 store_path: Optional[str] = None,
+                 min_interval: float = DEFAULT_MIN_INTERVAL,
+                 max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+                 retry_delay: float = DEFAULT_RETRY_DELAY,
+                 max_pending: int = DEFAULT_MAX_PENDING):
+        """
+        Initialize the outbox.
+
+        Args:
+            telegram_service: Service used to deliver messages (a default one is created if omitted)
+            store_path: SQLite file for undelivered messages (None disables persistence)
+            min_interval: Minimum seconds between two messages to the chat
+            max_attempts: Sends attempted before a message is dropped
+            retry_delay: Delay before the first retry; doubles on each further attempt
+            max_pending: Queue bound; the oldest message is dropped when it is exceeded
+        """
+        self.telegram_service = telegram_service or TelegramService()
+        self.store_path = store_path
+        self.min_interval = min_interval
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.max_pending = max_pending
+
+        self._pending: "OrderedDict[str, OutboxMessage]" = OrderedDict()
+        self._by_key: Dict[str, str] = {}
+        self._in_flight: Optional[str] = None
+        self._store: Optional[OutboxStore] = None
+        self._persisted: set = set()
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._stopping = False
+        self._next_send_at = 0.0
+        self.stats = {'enqueued': 0, 'coalesced': 0, 'sent': 0, 'retried': 0, 'failed': 0, 'dropped': 0}
+
+    def is_enabled(self) -> bool:
+        return self.telegram_service.is_enabled()
+
+    def enqueue(self, text: str, parse_mode: Optional[str] = None, coalesce_key: Optional[str] = None) -> bool:
+        """
+        Queue a message for delivery without waiting for Telegram.
+
+        Args:
+            text: Message text
+            parse_mode: Telegram parse mode (HTML, Markdown, ...)
+            coalesce_key: Messages with the same key replace each other while queued
+
+        Returns:
+            bool: True if the message was queued, False if notifications are disabled
+        """
+        if not self.is_enabled():
+            logger.info(f"Telegram notification (disabled): {text[:100]}...")
+            return False
+
+        self.stats['enqueued'] += 1
+        queued_id = self._by_key.get(coalesce_key) if coalesce_key else None
+        queued = self._pending.get(queued_id) if queued_id else None
+        if queued is not None and queued_id != self._in_flight:
+            queued.text = text
+            queued.parse_mode = parse_mode
+            self.stats['coalesced'] += 1
+        else:
+            message = OutboxMessage(text=text, parse_mode=parse_mode, coalesce_key=coalesce_key)
+            self._pending[message.message_id] = message
+            if coalesce_key:
+                self._by_key[coalesce_key] = message.message_id
+            while len(self._pending) > self.max_pending:
+                dropped = next(iter(self._pending.values()))
+                logger.warning(f"Notification outbox full, dropping oldest message: {dropped.text[:80]}")
+                self._forget(dropped)
+                self.stats['dropped'] += 1
+
+        self._ensure_sender()
+        return True
+
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    def _forget(self, message: OutboxMessage) -> None:
+        self._pending.pop(message.message_id, None)
+        if message.coalesce_key and self._by_key.get(message.coalesce_key) == message.message_id:
+            del self._by_key[message.coalesce_key]
+
+    def _ensure_sender(self) -> None:
+        """Start the sender on the running loop if it is not running, and wake it."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No loop yet: the message is delivered once the sender starts
+            return
+        if self._task is None or self._task.done() or self._task.get_loop() is not loop:
+            self._stopping = False
+            self._wakeup = asyncio.Event()
+            self._task = loop.create_task(self._run(), name="notification-outbox")
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def start(self) -> None:
+        """Start the sender task on the running loop."""
+        self._ensure_sender()
+
+    def _open_store(self) -> None:
+        if self.store_path is None or self._store is not None:
+            return
+        try:
+            self._store = OutboxStore(self.store_path)
+            restored = [m for m in self._store.load() if m.message_id not in self._pending]
+            for message in restored:
+                self._persisted.add(message.message_id)
+                self._pending[message.message_id] = message
+                if message.coalesce_key:
+                    self._by_key.setdefault(message.coalesce_key, message.message_id)
+            if restored:
+                logger.info(f"Restored {len(restored)} undelivered notifications from {self.store_path}")
+        except Exception as e:
+            logger.error(f"Failed to open notification outbox store {self.store_path}: {e}")
+            self._store = None
+
+    def _persist(self, message: OutboxMessage) -> None:
+        if self._store is not None:
+            try:
+                self._store.save([message])
+                self._persisted.add(message.message_id)
+            except Exception as e:
+                logger.warning(f"Failed to persist notification {message.message_id}: {e}")
+
+    def _unpersist(self, message: OutboxMessage) -> None:
+        if self._store is not None and message.message_id in self._persisted:
+            try:
+                self._store.delete(message.message_id)
+                self._persisted.discard(message.message_id)
+            except Exception as e:
+                logger.warning(f"Failed to remove notification {message.message_id} from store: {e}")
+
+    def _next_ready(self) -> Optional[OutboxMessage]:
+        now = time.time()
+        for message in self._pending.values():
+            if message.not_before <= now:
+                return message
+        return None
+
+    def _retry_after(self) -> Optional[float]:
+        """Back-off requested by Telegram on the last send, if any."""
+        retry_after = getattr(self.telegram_service, 'retry_after', None)
+        if retry_after is None:
+            return None
+        self.telegram_service.retry_after = None
+        if isinstance(retry_after, timedelta):
+            return retry_after.total_seconds()
+        return float(retry_after)
+
+    async def _wait(self, timeout: Optional[float]) -> None:
+        self._wakeup.clear()
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _run(self) -> None:
+        self._open_store()
+        while True:
+            message = self._next_ready()
+            if message is None:
+                if self._stopping:
+                    return
+                waiting = [m.not_before for m in self._pending.values()]
+                await self._wait(max(min(waiting) - time.time(), 0.0) if waiting else None)
+                continue
+
+            delay = self._next_send_at - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+                continue  # a newer or coalesced message may be ready now
+
+            self._in_flight = message.message_id
+            try:
+                sent = await self.telegram_service.send_message(message.text, parse_mode=message.parse_mode)
+            except Exception as e:
+                logger.error(f"Unexpected error sending queued notification: {e}")
+                sent = False
+            finally:
+                self._in_flight = None
+            retry_after = self._retry_after()
+            self._next_send_at = time.monotonic() + max(self.min_interval, retry_after or 0.0)
+
+            if sent:
+                self._forget(message)
+                self._unpersist(message)
+                self.stats['sent'] += 1
+                continue
+
+            message.attempts += 1
+            if message.attempts >= self.max_attempts:
+                logger.error(f"Dropping notification after {message.attempts} failed attempts: {message.text[:100]}")
+                self._forget(message)
+                self._unpersist(message)
+                self.stats['failed'] += 1
+                continue
+
+            backoff = retry_after or min(self.retry_delay * 2 ** (message.attempts - 1), MAX_RETRY_DELAY)
+            message.not_before = time.time() + backoff
+            # Move behind newer messages so one failing message does not hold up the rest
+            self._pending.move_to_end(message.message_id)
+            self._persist(message)
+            self.stats['retried'] += 1
+            logger.warning(f"Notification send failed (attempt {message.attempts}), retrying in {backoff:.1f}s")
+
+    async def stop(self, timeout: float = 5.0) -> None:
+        """
+        Deliver what is ready within timeout, then persist anything left and stop the sender.
+
+        Args:
+            timeout: Seconds to keep sending before giving up
+        """
+        self._stopping = True
+        if self._task is not None and not self._task.done():
+            self._wakeup.set()
+            try:
+                await asyncio.wait_for(asyncio.shield(self._task), timeout)
+            except asyncio.TimeoutError:
+                self._task.cancel()
+                try:
+                    await self._task
+                except asyncio.CancelledError:
+                    pass
+        self._task = None
+
+        if self._pending:
+            self._open_store()
+            if self._store is not None:
+                self._store.save(list(self._pending.values()))
+                self._persisted.update(self._pending)
+                logger.info(f"Persisted {len(self._pending)} undelivered notifications")
+        if self._store is not None:
+            self._store.close()
+            self._store = None
+            self._persisted.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, 'pending': len(self._pending)}
+
+
+_notification_outbox: Optional[NotificationOutbox] = None
+
+
+def get_notification_outbox() -> NotificationOutbox:
+    """
+    Get the process-wide outbox, creating it on first use.
+
+    Returns:
+        NotificationOutbox: Outbox delivering to the configured notification chat
+    """
+    global _notification_outbox
+    if _notification_outbox is None:
+        from config import settings
+        _notification_outbox = NotificationOutbox(
+            store_path=getattr(settings, 'NOTIFICATION_OUTBOX_DB_PATH', None),
+            min_interval=getattr(settings, 'TELEGRAM_MIN_SEND_INTERVAL', DEFAULT_MIN_INTERVAL),
+        )
+    return _notification_outbox
@@ -1,7 +1,7 @@
 import logging
 from typing import Optional
 from telegram import Bot
-from telegram.error import TelegramError
+from telegram.error import RetryAfter, TelegramError
 from config import settings
 from .notification_models import NotificationConfig
 
@@ -26,6 +26,8 @@ class TelegramService:
 
         self._validate_config()
         self.bot = self._initialize_bot()
+        # Back-off requested by Telegram's last flood-control error, read by the notification outbox
+        self.retry_after = None
 
     def _validate_config(self) -> None:
         """Validate the notification configuration"""
@@ -74,6 +76,10 @@ class TelegramService:
             )
             logger.info("✅ Telegram notification sent successfully")
             return True
+        except RetryAfter as e:
+            self.retry_after = e.retry_after
+            logger.warning(f"❌ Telegram rate limit hit, retry after {e.retry_after}s")
+            return False
         except TelegramError as e:
             logger.error(f"❌ Failed to send Telegram notification: {e}")
             return False
@@ -6,12 +6,11 @@ Designed to never become a failure point in the trading system.
 """
 
 import logging
-import asyncio
 from datetime import datetime, timezone
 from typing import Optional, Dict, Any, Union
 from dataclasses import dataclass
 
-from src.services.notifications.telegram_service import TelegramService
+from src.services.notifications.notification_outbox import get_notification_outbox
 
 logger = logging.getLogger(__name__)
 
@@ -82,29 +81,19 @@ class TradeNotificationService:
     """
 
     def __init__(self):
-        self.telegram_service = TelegramService()
-        self._notification_queue = asyncio.Queue(maxsize=1000)
-        self._is_running = False
+        self.outbox = get_notification_outbox()
+        self.telegram_service = self.outbox.telegram_service
 
-    async def _safe_send_message(self, message: str, retry_count: int = 3) -> bool:
+    async def _safe_send_message(self, message: str, coalesce_key: Optional[str] = None) -> bool:
         """
-        Safely send a message with retry logic.
-        Never raises exceptions - always returns success/failure status.
+        Queue a message on the notification outbox, which retries failed sends.
+        Never raises exceptions - always returns whether the message was queued.
         """
-        for attempt in range(retry_count):
-            try:
-                success = await self.telegram_service.send_message(message)
-                if success:
-                    return True
-                logger.warning(f"Telegram send attempt {attempt + 1} failed, retrying...")
-            except Exception as e:
-                logger.error(f"Telegram send attempt {attempt + 1} error: {e}")
-
-            if attempt < retry_count - 1:
-                await asyncio.sleep(0.5 * (attempt + 1))  # Exponential backoff
-
-        logger.error("All Telegram send attempts failed")
-        return False
+        try:
+            return self.outbox.enqueue(message, coalesce_key=coalesce_key)
+        except Exception as e:
+            logger.error(f"Failed to queue Telegram notification: {e}")
+            return False
 
     def _format_timestamp(self, timestamp: Optional[datetime] = None) -> str:
         """Format timestamp for display."""
@@ -192,7 +181,9 @@ class TradeNotificationService:
 
 ⏰ Time: {self._format_timestamp(data.timestamp)}"""
 
-            return await self._safe_send_message(message)
+            # A burst of updates for one position collapses into the latest one
+            coalesce_key = f"pnl:{data.exchange}:{data.symbol}:{data.position_type}"
+            return await self._safe_send_message(message, coalesce_key=coalesce_key)
 
         except Exception as e:
             logger.error(f"Error creating PnL update notification: {e}")
@@ -172,8 +172,8 @@ class PositionCloseService:
                             "trade": alert.trade
                         }
 
-                        from discord_bot.discord_bot import DiscordBot
-                        bot = DiscordBot()
+                        from discord_bot.core.service_container import get_service_container
+                        bot = get_service_container().bot
 
                         result = await bot.process_update_signal(alert_data)
 
@@ -280,7 +280,7 @@ class PositionCloseService:
             from src.exchange.binance.binance_exchange import BinanceExchange
 
             exchange = BinanceExchange()
-            positions = await exchange.get_futures_position_information()
+            positions = await exchange.get_futures_position_information(include_risk=True)
 
             target_symbol = f"{trade.coin_symbol}USDT"
 
@@ -308,7 +308,7 @@ class PositionCloseService:
             from src.exchange.kucoin.kucoin_exchange import KucoinExchange
 
             exchange = KucoinExchange()
-            positions = await exchange.get_futures_position_information()
+            positions = await exchange.get_futures_position_information(include_risk=True)
 
             target_symbol = f"{trade.coin_symbol}USDTM"
 
@@ -68,7 +68,7 @@ class PositionReconciliationService:
                     return True, cached['data'], ""
 
             # Fetch fresh position data from exchange
-            positions = await self.exchange.get_futures_position_information()
+            positions = await self.exchange.get_futures_position_information(include_risk=True)
 
             position_data = {
                 'position_size': 0.0,
@@ -2,6 +2,7 @@ import logging
 from typing import Optional, Dict
 from datetime import datetime, timedelta
 from .price_models import PriceCacheEntry, PriceServiceConfig
+from src.exchange.core.symbol_registry import get_symbol_registry
 
 logger = logging.getLogger(__name__)
 
@@ -93,12 +94,17 @@ class PriceCache:
         logger.info(f"Cached price for {symbol}: ${price} (TTL: {cache_ttl}s)")
 
     def get_cached_coin_id(self, symbol: str) -> Optional[str]:
-        """Get cached coin ID for a symbol"""
+        """Get cached coin ID for a symbol (pairs and prefixed tickers resolve to their coin)"""
         if not symbol:
             return None
 
         symbol = symbol.upper().strip()
-        return self._coin_cache.get(symbol)
+        coin_id = self._coin_cache.get(symbol)
+        if coin_id is None:
+            coin = get_symbol_registry().coin(symbol)
+            if coin and coin != symbol:
+                coin_id = self._coin_cache.get(coin)
+        return coin_id
 
     def set_cached_coin_id(self, symbol: str, coin_id: str) -> None:
         """Cache coin ID mapping for a symbol"""
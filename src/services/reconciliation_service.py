@@ -13,6 +13,9 @@ from supabase import Client
 from src.core.unified_status_updater import update_trade_status_safely
 from src.core.data_enrichment import enrich_trade_data_before_close
 from src.core.status_manager import StatusManager
+from src.database.core.trade_batch_writer import TradeBatchWriter
+from src.database.core.trade_cache import get_trade_cache
+from src.services.analytics.rollups import record_trade_writes
 
 logger = logging.getLogger(__name__)
 
@@ -31,6 +34,25 @@ class ReconciliationService:
         self.supabase = supabase
         self.bot = bot
 
+    def _batch_writer(self) -> TradeBatchWriter:
+        """Create a batch writer for one reconciliation pass."""
+        return TradeBatchWriter(self.supabase)
+
+    async def _write_trade(self, trade: Dict[str, Any], update_data: Dict[str, Any],
+                           writer: Optional[TradeBatchWriter] = None) -> bool:
+        """Stage an update on the pass's batch writer, or write it directly when there is none."""
+        if writer is not None:
+            # The writer stamps updated_at at flush time so identical fixes share one request;
+            # reconciliation updates are derived from the loaded row and bypass status validation
+            changes = {k: v for k, v in update_data.items() if k != 'updated_at'}
+            staged = await writer.stage(trade, changes, validate=False)
+        else:
+            response = self.supabase.table("trades").update(update_data).eq("id", trade.get('id')).execute()
+            get_trade_cache().invalidate(trade.get('id'))
+            await record_trade_writes(self.supabase, response.data)
+            staged = True
+        return staged
+
     async def reconcile_closed_trades(
         self,
         days_back: int = 7,
@@ -65,23 +87,24 @@ class ReconciliationService:
                 'errors': 0
             }
 
-            for trade in trades:
-                try:
-                    # Fix status inconsistencies
-                    if fix_status_inconsistencies:
-                        fixed = await self._fix_status_inconsistency(trade)
-                        if fixed:
-                            results['status_fixed'] += 1
-
-                    # Backfill missing data
-                    if backfill_missing_data:
-                        backfilled = await self._backfill_missing_data(trade)
-                        if backfilled:
-                            results['data_backfilled'] += 1
-
-                except Exception as e:
-                    logger.error(f"Error reconciling trade {trade.get('id')}: {e}")
-                    results['errors'] += 1
+            async with self._batch_writer() as writer:
+                for trade in trades:
+                    try:
+                        # Fix status inconsistencies
+                        if fix_status_inconsistencies:
+                            fixed = await self._fix_status_inconsistency(trade, writer)
+                            if fixed:
+                                results['status_fixed'] += 1
+
+                        # Backfill missing data
+                        if backfill_missing_data:
+                            backfilled = await self._backfill_missing_data(trade, writer)
+                            if backfilled:
+                                results['data_backfilled'] += 1
+
+                    except Exception as e:
+                        logger.error(f"Error reconciling trade {trade.get('id')}: {e}")
+                        results['errors'] += 1
 
             logger.info(f"Reconciliation completed: {results}")
             return results
@@ -90,10 +113,15 @@ class ReconciliationService:
             logger.error(f"Error in reconcile_closed_trades: {e}")
             return {'error': str(e)}
 
-    async def _fix_status_inconsistency(self, trade: Dict[str, Any]) -> bool:
+    async def _fix_status_inconsistency(self, trade: Dict[str, Any],
+                                        writer: Optional[TradeBatchWriter] = None) -> bool:
         """
         Fix status inconsistency for a trade.
 
+        Args:
+            trade: Trade row
+            writer: Batch writer to stage the update on (writes directly if None)
+
         Returns:
             True if status was fixed, False otherwise
         """
@@ -135,7 +163,7 @@ class ReconciliationService:
                 )
 
                 if success:
-                    self.supabase.table("trades").update(status_update).eq("id", trade_id).execute()
+                    await self._write_trade(trade, status_update, writer)
                     logger.info(f"Fixed status inconsistency for trade {trade_id}: {status_update}")
                     return True
                 # Unable to update safely
@@ -148,7 +176,7 @@ class ReconciliationService:
                     'updated_at': datetime.now(timezone.utc).isoformat()
                 }
 
-                self.supabase.table("trades").update(update_data).eq("id", trade_id).execute()
+                await self._write_trade(trade, update_data, writer)
                 logger.info(f"Fixed status inconsistency for trade {trade_id}: {update_data}")
                 return True
 
@@ -156,10 +184,15 @@ class ReconciliationService:
             logger.error(f"Error fixing status inconsistency for trade {trade.get('id')}: {e}")
             return False
 
-    async def _backfill_missing_data(self, trade: Dict[str, Any]) -> bool:
+    async def _backfill_missing_data(self, trade: Dict[str, Any],
+                                     writer: Optional[TradeBatchWriter] = None) -> bool:
         """
         Backfill missing data (exit price, PNL) for a CLOSED trade.
 
+        Args:
+            trade: Trade row
+            writer: Batch writer to stage the update on (writes directly if None)
+
         Returns:
             True if data was backfilled, False otherwise
         """
@@ -207,7 +240,7 @@ class ReconciliationService:
 
                 if update_data:
                     update_data['updated_at'] = datetime.now(timezone.utc).isoformat()
-                    self.supabase.table("trades").update(update_data).eq("id", trade_id).execute()
+                    await self._write_trade(trade, update_data, writer)
                     logger.info(f"Backfilled missing data for trade {trade_id}: {list(update_data.keys())}")
                     return True
             # Nothing to backfill or enrich
@@ -237,40 +270,41 @@ class ReconciliationService:
                 'errors': 0
             }
 
-            for trade in trades:
-                try:
-                    pnl_usd = trade.get('pnl_usd') or trade.get('net_pnl')
-                    exit_price = trade.get('exit_price')
-                    entry_price = trade.get('entry_price')
-
-                    # Check if PNL exists but exit_price is missing
-                    if (pnl_usd and float(pnl_usd) != 0 and
-                        (not exit_price or float(exit_price) == 0) and
-                        entry_price):
-
-                        exit_price_calculated = await self._calculate_exit_price_from_pnl(
-                            trade, float(pnl_usd)
-                        )
-
-                        if exit_price_calculated and exit_price_calculated > 0:
-                            update_data = {
-                                'exit_price': str(exit_price_calculated),
-                                'updated_at': datetime.now(timezone.utc).isoformat()
-                            }
-
-                            exchange_name = str(trade.get('exchange', '')).lower()
-                            if exchange_name == 'binance':
-                                update_data['exit_price'] = str(exit_price_calculated)
-                            elif exchange_name == 'kucoin':
-                                update_data['exit_price'] = str(exit_price_calculated)
-
-                            self.supabase.table("trades").update(update_data).eq("id", trade['id']).execute()
-                            results['fixed'] += 1
-                            logger.info(f"Calculated exit_price {exit_price_calculated} from PNL for trade {trade['id']}")
-
-                except Exception as e:
-                    logger.error(f"Error reconciling trade {trade.get('id')}: {e}")
-                    results['errors'] += 1
+            async with self._batch_writer() as writer:
+                for trade in trades:
+                    try:
+                        pnl_usd = trade.get('pnl_usd') or trade.get('net_pnl')
+                        exit_price = trade.get('exit_price')
+                        entry_price = trade.get('entry_price')
+
+                        # Check if PNL exists but exit_price is missing
+                        if (pnl_usd and float(pnl_usd) != 0 and
+                            (not exit_price or float(exit_price) == 0) and
+                            entry_price):
+
+                            exit_price_calculated = await self._calculate_exit_price_from_pnl(
+                                trade, float(pnl_usd)
+                            )
+
+                            if exit_price_calculated and exit_price_calculated > 0:
+                                update_data = {
+                                    'exit_price': str(exit_price_calculated),
+                                    'updated_at': datetime.now(timezone.utc).isoformat()
+                                }
+
+                                exchange_name = str(trade.get('exchange', '')).lower()
+                                if exchange_name == 'binance':
+                                    update_data['exit_price'] = str(exit_price_calculated)
+                                elif exchange_name == 'kucoin':
+                                    update_data['exit_price'] = str(exit_price_calculated)
+
+                                await self._write_trade(trade, update_data, writer)
+                                results['fixed'] += 1
+                                logger.info(f"Calculated exit_price {exit_price_calculated} from PNL for trade {trade['id']}")
+
+                    except Exception as e:
+                        logger.error(f"Error reconciling trade {trade.get('id')}: {e}")
+                        results['errors'] += 1
 
             logger.info(f"Reconciliation completed: {results}")
             return results
@@ -333,28 +367,29 @@ class ReconciliationService:
             trades = response.data or []
             fixed = 0
             errors = 0
-            for trade in trades:
-                try:
-                    exit_price = trade.get('exit_price')
-                    pnl_usd = trade.get('pnl_usd') or trade.get('net_pnl')
-                    has_exit = (exit_price is not None) and (float(exit_price) != 0.0)
-                    has_pnl = (pnl_usd is not None) and (float(pnl_usd) != 0.0)
-                    if has_exit or has_pnl:
-                        update_data = {
-                            'status': 'CLOSED',
-                            'is_active': False,
-                            'closed_at': trade.get('closed_at') or datetime.now(timezone.utc).isoformat(),
-                            'updated_at': datetime.now(timezone.utc).isoformat()
-                        }
-                        # If order_status is terminal cancel, preserve; otherwise set to FILLED
-                        os_val = str(trade.get('order_status') or '').upper()
-                        if os_val not in ['CANCELLED', 'CANCELED', 'EXPIRED', 'FAILED', 'REJECTED']:
-                            update_data['order_status'] = 'FILLED'
-                        self.supabase.table("trades").update(update_data).eq("id", trade.get('id')).execute()
-                        fixed += 1
-                except Exception as e:
-                    logger.warning(f"Error reconciling trade {trade.get('id')}: {e}")
-                    errors += 1
+            async with self._batch_writer() as writer:
+                for trade in trades:
+                    try:
+                        exit_price = trade.get('exit_price')
+                        pnl_usd = trade.get('pnl_usd') or trade.get('net_pnl')
+                        has_exit = (exit_price is not None) and (float(exit_price) != 0.0)
+                        has_pnl = (pnl_usd is not None) and (float(pnl_usd) != 0.0)
+                        if has_exit or has_pnl:
+                            update_data = {
+                                'status': 'CLOSED',
+                                'is_active': False,
+                                'closed_at': trade.get('closed_at') or datetime.now(timezone.utc).isoformat(),
+                                'updated_at': datetime.now(timezone.utc).isoformat()
+                            }
+                            # If order_status is terminal cancel, preserve; otherwise set to FILLED
+                            os_val = str(trade.get('order_status') or '').upper()
+                            if os_val not in ['CANCELLED', 'CANCELED', 'EXPIRED', 'FAILED', 'REJECTED']:
+                                update_data['order_status'] = 'FILLED'
+                            await self._write_trade(trade, update_data, writer)
+                            fixed += 1
+                    except Exception as e:
+                        logger.warning(f"Error reconciling trade {trade.get('id')}: {e}")
+                        errors += 1
             return {'checked': len(trades), 'fixed': fixed, 'errors': errors}
         except Exception as e:
             logger.error(f"Error in reconcile_open_with_exit_or_pnl: {e}")
@@ -372,46 +407,47 @@ class ReconciliationService:
             trades = response.data or []
             fixed = 0
             errors = 0
-            for trade in trades:
-                try:
-                    closed_at = trade.get('closed_at')
-                    if not closed_at:
-                        continue
-
-                    # Check if this is a failed trade
-                    exchange_response = trade.get('exchange_response')
-                    is_failed = False
-                    if exchange_response:
-                        if isinstance(exchange_response, list):
-                            response_str = ' '.join(str(x) for x in exchange_response)
+            async with self._batch_writer() as writer:
+                for trade in trades:
+                    try:
+                        closed_at = trade.get('closed_at')
+                        if not closed_at:
+                            continue
+
+                        # Check if this is a failed trade
+                        exchange_response = trade.get('exchange_response')
+                        is_failed = False
+                        if exchange_response:
+                            if isinstance(exchange_response, list):
+                                response_str = ' '.join(str(x) for x in exchange_response)
+                            else:
+                                response_str = str(exchange_response)
+                            if 'Trade execution failed' in response_str or 'execution failed' in response_str.lower():
+                                is_failed = True
+
+                        if is_failed:
+                            update_data = {
+                                'status': 'FAILED',
+                                'order_status': 'FAILED',
+                                'is_active': False,
+                                'updated_at': datetime.now(timezone.utc).isoformat()
+                            }
                         else:
-                            response_str = str(exchange_response)
-                        if 'Trade execution failed' in response_str or 'execution failed' in response_str.lower():
-                            is_failed = True
-
-                    if is_failed:
-                        update_data = {
-                            'status': 'FAILED',
-                            'order_status': 'FAILED',
-                            'is_active': False,
-                            'updated_at': datetime.now(timezone.utc).isoformat()
-                        }
-                    else:
-                        update_data = {
-                            'status': 'CLOSED',
-                            'is_active': False,
-                            'updated_at': datetime.now(timezone.utc).isoformat()
-                        }
-                        os_val = str(trade.get('order_status') or '').upper()
-                        if os_val not in ['CANCELLED', 'CANCELED', 'EXPIRED', 'FAILED', 'REJECTED']:
-                            update_data['order_status'] = 'FILLED'
-
-                    self.supabase.table("trades").update(update_data).eq("id", trade.get('id')).execute()
-                    fixed += 1
-                    logger.info(f"Fixed trade {trade.get('id')}: closed_at={closed_at}, status={trade.get('status')} -> {update_data['status']}")
-                except Exception as e:
-                    logger.warning(f"Error fixing trade {trade.get('id')}: {e}")
-                    errors += 1
+                            update_data = {
+                                'status': 'CLOSED',
+                                'is_active': False,
+                                'updated_at': datetime.now(timezone.utc).isoformat()
+                            }
+                            os_val = str(trade.get('order_status') or '').upper()
+                            if os_val not in ['CANCELLED', 'CANCELED', 'EXPIRED', 'FAILED', 'REJECTED']:
+                                update_data['order_status'] = 'FILLED'
+
+                        await self._write_trade(trade, update_data, writer)
+                        fixed += 1
+                        logger.info(f"Fixed trade {trade.get('id')}: closed_at={closed_at}, status={trade.get('status')} -> {update_data['status']}")
+                    except Exception as e:
+                        logger.warning(f"Error fixing trade {trade.get('id')}: {e}")
+                        errors += 1
             return {'checked': len(trades), 'fixed': fixed, 'errors': errors}
         except Exception as e:
             logger.error(f"Error in reconcile_closed_at_mismatch: {e}")
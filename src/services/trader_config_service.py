@@ -5,11 +5,14 @@ This service manages trader-to-exchange configurations from the database,
 providing a centralized way to handle trader configurations dynamically.
 """
 
+import asyncio
+import hashlib
 import logging
 import time
 import unicodedata
-from typing import Dict, List, Optional, Set
-from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+from dataclasses import dataclass, field
 from enum import Enum
 
 from src.config.runtime_config import init_runtime_config, runtime_config as _runtime_config
@@ -17,6 +20,8 @@ runtime_config = _runtime_config
 
 logger = logging.getLogger(__name__)
 
+TRADER_CONFIG_COLUMNS = "trader_id, exchange, leverage, position_size, created_at, updated_at, updated_by"
+
 
 class ExchangeType(Enum):
     """Supported exchange types"""
@@ -24,7 +29,7 @@ class ExchangeType(Enum):
     KUCOIN = "kucoin"
 
 
-@dataclass
+@dataclass(frozen=True)
 class TraderConfig:
     """Represents a trader's exchange configuration"""
     trader_id: str
@@ -36,10 +41,115 @@ class TraderConfig:
     updated_by: Optional[str] = None
 
 
+def canonical_trader_id(trader_id: str) -> str:
+    """Return a canonical, case-insensitive trader id without leading @ or -.
+
+    Unicode is aggressively normalized to avoid subtle mismatches caused by
+    zero-width or formatting characters occasionally present in Discord names.
+    """
+    try:
+        s = trader_id or ""
+        s = unicodedata.normalize("NFKC", s)
+        s = "".join(
+            ch
+            for ch in s
+            if unicodedata.category(ch) not in ("Cf", "Cc", "Cs")
+        )
+        return s.strip().lstrip("@-").lower()
+    except Exception:
+        return ""
+
+
+def _config_from_row(row: Dict[str, Any]) -> TraderConfig:
+    return TraderConfig(
+        trader_id=row["trader_id"],
+        exchange=ExchangeType(row["exchange"]),
+        leverage=row["leverage"],
+        position_size=float(row.get("position_size") or 100.0),
+        created_at=row.get("created_at"),
+        updated_at=row.get("updated_at"),
+        updated_by=row.get("updated_by")
+    )
+
+
+@dataclass(frozen=True)
+class TraderConfigSnapshot:
+    """
+    Immutable view of the whole trader_exchange_config table.
+
+    Lookups are pure in-memory reads; a refresh builds a new snapshot and
+    swaps it in, so readers never observe a partially updated table.
+    ``configs`` holds the routing config per trader (its first row), and
+    ``sizing`` every row keyed by (trader, exchange), since a trader can be
+    configured on both exchanges.
+    """
+    configs: Mapping[str, TraderConfig] = field(default_factory=lambda: MappingProxyType({}))
+    version: str = ""
+    loaded_at: float = 0.0
+    sizing: Mapping[Tuple[str, str], TraderConfig] = field(default_factory=lambda: MappingProxyType({}))
+
+    @classmethod
+    def from_rows(cls, rows: List[Dict[str, Any]]) -> "TraderConfigSnapshot":
+        """Build a snapshot from trader_exchange_config rows (first row per trader routes)."""
+        configs: Dict[str, TraderConfig] = {}
+        sizing: Dict[Tuple[str, str], TraderConfig] = {}
+        for row in rows:
+            key = canonical_trader_id(row.get("trader_id", ""))
+            if not key:
+                continue
+            try:
+                config = _config_from_row(row)
+            except (KeyError, TypeError, ValueError) as e:
+                logger.warning(f"Skipping invalid trader config row {row.get('trader_id')}: {e}")
+                continue
+            configs.setdefault(key, config)
+            sizing.setdefault((key, config.exchange.value), config)
+
+        fingerprint = "|".join(
+            f"{c.trader_id}:{c.exchange.value}:{c.leverage}:{c.position_size}:{c.updated_at}"
+            for _, c in sorted(sizing.items())
+        )
+        version = hashlib.sha1(fingerprint.encode("utf-8")).hexdigest()
+        return cls(MappingProxyType(configs), version, time.time(), MappingProxyType(sizing))
+
+    def get(self, trader_id: str) -> Optional[TraderConfig]:
+        """Return the configuration for a trader, or None if the trader is not configured."""
+        return self.configs.get(canonical_trader_id(trader_id))
+
+    def is_supported(self, trader_id: str) -> bool:
+        """Return True if the trader has a configuration."""
+        return self.get(trader_id) is not None
+
+    def exchange_for(self, trader_id: str) -> Optional[ExchangeType]:
+        """Return the configured exchange for a trader."""
+        config = self.get(trader_id)
+        return config.exchange if config else None
+
+    def sizing_for(self, trader_id: str, exchange: str) -> Optional[Tuple[float, float]]:
+        """Return (leverage, position_size) when the trader is configured for the exchange."""
+        config = self.sizing.get((canonical_trader_id(trader_id), str(exchange).lower()))
+        if config:
+            return float(config.leverage), float(config.position_size)
+        return None
+
+    @property
+    def trader_ids(self) -> List[str]:
+        """Trader identifiers as stored in the database."""
+        return [config.trader_id for config in self.configs.values()]
+
+    def traders_for_exchange(self, exchange: ExchangeType) -> List[str]:
+        """Trader identifiers routed to an exchange."""
+        return [config.trader_id for config in self.configs.values() if config.exchange == exchange]
+
+
 class TraderConfigService:
     """
     Service for managing trader-to-exchange configurations from the database.
-    Provides caching and fallback mechanisms for robust operation.
+
+    All lookups are served from one in-memory TraderConfigSnapshot loaded in a
+    single query. The snapshot is replaced when local writes go through this
+    service, when a change event is applied, or when the background version
+    poll sees a different table state.
     """
 
     def __init__(self, cache_ttl_seconds: int = 300):
@@ -47,13 +157,13 @@ class TraderConfigService:
         Initialize the trader config service.
 
         Args:
-            cache_ttl_seconds: Cache TTL in seconds (default: 5 minutes)
+            cache_ttl_seconds: Maximum snapshot age before a lazy reload when no
+                background refresh is running (default: 5 minutes)
         """
         self.cache_ttl = cache_ttl_seconds
-        self._config_cache: Dict[str, TraderConfig] = {}
-        self._cache_timestamps: Dict[str, float] = {}
-        self._supported_traders_cache: Optional[Set[str]] = None
-        self._supported_traders_timestamp: Optional[float] = None
+        self._snapshot: Optional[TraderConfigSnapshot] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._reload_task: Optional[asyncio.Task] = None
         # Ensure runtime_config is initialized if possible
         try:
             from config.settings import SUPABASE_URL, SUPABASE_KEY
@@ -65,33 +175,9 @@ class TraderConfigService:
             # Defer to callers; logs will show if still missing
             pass
 
-    def _is_cache_valid(self, cache_key: str) -> bool:
-        """Check if cache entry is still valid."""
-        if cache_key not in self._cache_timestamps:
-            return False
-        return time.time() - self._cache_timestamps[cache_key] < self.cache_ttl
-
-    def _get_cache_key(self, trader_id: str) -> str:
-        """Generate cache key for trader."""
-        return f"trader_config:{trader_id}"
-
     def _canonical(self, trader_id: str) -> str:
-        """Return a canonical, case-insensitive trader id without leading @ or -.
-
-        This method aggressively normalizes Unicode to avoid subtle mismatches caused
-        by zero-width or formatting characters occasionally present in Discord names.
-        """
-        try:
-            s = trader_id or ""
-            s = unicodedata.normalize("NFKC", s)
-            s = "".join(
-                ch
-                for ch in s
-                if unicodedata.category(ch) not in ("Cf", "Cc", "Cs")
-            )
-            return s.strip().lstrip("@-").lower()
-        except Exception:
-            return ""
+        """Return a canonical, case-insensitive trader id without leading @ or -."""
+        return canonical_trader_id(trader_id)
 
     def _variants(self, trader_id: str) -> List[str]:
         """Generate common variants of a trader id for robust lookups."""
@@ -111,76 +197,169 @@ class TraderConfigService:
 
         return [c for c in candidates if c]
 
-    async def get_trader_config(self, trader_id: str) -> Optional[TraderConfig]:
-        """
-        Get trader configuration from database with caching.
+    # Snapshot management
 
-        Args:
-            trader_id: The trader identifier
+    def load_snapshot(self) -> Optional[TraderConfigSnapshot]:
+        """
+        Load the whole trader_exchange_config table into a new snapshot.
 
         Returns:
-            TraderConfig or None if not found
+            The current snapshot (the previous one is kept if loading fails)
         """
-        if not trader_id:
-            logger.warning("Empty trader_id provided")
-            return None
+        if not runtime_config:
+            logger.error("Runtime config not initialized")
+            return self._snapshot
 
-        cache_key = self._get_cache_key(trader_id)
+        try:
+            response = runtime_config.supabase.table("trader_exchange_config").select(
+                TRADER_CONFIG_COLUMNS
+            ).execute()
+            snapshot = TraderConfigSnapshot.from_rows(getattr(response, 'data', None) or [])
+        except Exception as e:
+            logger.error(f"Error loading trader config snapshot: {e}")
+            return self._snapshot
 
-        # Check cache first
-        if cache_key in self._config_cache and self._is_cache_valid(cache_key):
-            logger.debug(f"Using cached config for trader {trader_id}")
-            return self._config_cache[cache_key]
+        self._swap_snapshot(snapshot)
+        return self._snapshot
 
-        # Fetch from database
-        try:
-            if not runtime_config:
-                logger.error("Runtime config not initialized")
-                return None
+    def _swap_snapshot(self, snapshot: TraderConfigSnapshot) -> None:
+        previous = self._snapshot
+        self._snapshot = snapshot
+        if previous is None or previous.version != snapshot.version:
+            logger.info(f"Loaded trader config snapshot: {len(snapshot.configs)} traders (version {snapshot.version[:8]})")
 
-            # First, try exact/variant matching using IN
-            variants = self._variants(trader_id)
-            response = runtime_config.supabase.table("trader_exchange_config").select(
-                "trader_id, exchange, leverage, position_size, created_at, updated_at, updated_by"
-            ).in_("trader_id", variants).execute()
+    def _is_stale(self, snapshot: TraderConfigSnapshot) -> bool:
+        """Whether the snapshot outlived ``cache_ttl`` with no background refresh running."""
+        refresher_running = self._refresh_task is not None and not self._refresh_task.done()
+        return not refresher_running and time.time() - snapshot.loaded_at >= self.cache_ttl
 
-            data = getattr(response, 'data', None)
+    @property
+    def snapshot(self) -> TraderConfigSnapshot:
+        """
+        Current trader config snapshot.
 
-            # Fallback: case-insensitive match on normalized value if no direct hit
-            if not data:
-                canon = self._canonical(trader_id)
-                if canon:
-                    response = runtime_config.supabase.table("trader_exchange_config").select(
-                        "trader_id, exchange, leverage, position_size, created_at, updated_at, updated_by"
-                    ).ilike("trader_id", canon).execute()
-                    data = getattr(response, 'data', None)
-
-            if data:
-                config_data = response.data[0]
-                config = TraderConfig(
-                    trader_id=config_data["trader_id"],
-                    exchange=ExchangeType(config_data["exchange"]),
-                    leverage=config_data["leverage"],
-                    position_size=float(config_data.get("position_size", 100.0)),
-                    created_at=config_data.get("created_at"),
-                    updated_at=config_data.get("updated_at"),
-                    updated_by=config_data.get("updated_by")
-                )
-
-                # Cache the result
-                self._config_cache[cache_key] = config
-                self._cache_timestamps[cache_key] = time.time()
-
-                logger.info(f"Loaded config for trader {trader_id}: {config.exchange.value} @ {config.leverage}x, position_size=${config.position_size}")
-                return config
+        Loads the table on first use. Once the snapshot is older than
+        ``cache_ttl`` (and no background refresh keeps it current) it is
+        reloaded in a worker thread while the current one is still served, so
+        readers on the event loop never wait on the query.
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            snapshot = self.load_snapshot()
+        elif self._is_stale(snapshot):
+            self._reload_in_background()
+        return snapshot or TraderConfigSnapshot()
+
+    def _reload_in_background(self) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No event loop to block: reload inline
+            self.load_snapshot()
+            return
+        if self._reload_task is None or self._reload_task.done():
+            self._reload_task = loop.create_task(asyncio.to_thread(self.load_snapshot))
+
+    async def get_snapshot(self) -> TraderConfigSnapshot:
+        """Async accessor for the current snapshot; loads and TTL reloads run off the event loop."""
+        snapshot = self._snapshot
+        if snapshot is None or self._is_stale(snapshot):
+            snapshot = await asyncio.to_thread(self.load_snapshot)
+        return snapshot or TraderConfigSnapshot()
+
+    def apply_change_event(self, payload: Dict[str, Any]) -> None:
+        """
+        Apply a Supabase realtime change event for trader_exchange_config.
+
+        Realtime only sends the primary key in ``old`` unless the table uses
+        ``REPLICA IDENTITY FULL``; when ``old`` does not name the trader the
+        removed row cannot be found in the snapshot, so the table is reloaded
+        instead.
+
+        Args:
+            payload: Realtime payload with the event type ('INSERT', 'UPDATE',
+                'DELETE') and the new and/or old record
+        """
+        event_type = str(payload.get('eventType') or payload.get('type') or '').upper()
+        new_row = payload.get('new') or payload.get('record') or {}
+        old_row = payload.get('old') or payload.get('old_record') or {}
+
+        rows = {key: {
+            "trader_id": c.trader_id, "exchange": c.exchange.value, "leverage": c.leverage,
+            "position_size": c.position_size, "created_at": c.created_at,
+            "updated_at": c.updated_at, "updated_by": c.updated_by,
+        } for key, c in self.snapshot.sizing.items()}
+
+        reload = False
+        if event_type in ('UPDATE', 'DELETE'):
+            if old_row.get('trader_id'):
+                trader = canonical_trader_id(old_row['trader_id'])
+                exchange = str(old_row.get('exchange') or '').lower()
+                for key in [k for k in rows if k[0] == trader and (not exchange or k[1] == exchange)]:
+                    rows.pop(key)
             else:
-                logger.warning(f"No configuration found for trader {trader_id}")
-                return None
+                reload = True
+        if new_row.get('trader_id') and event_type in ('INSERT', 'UPDATE'):
+            rows[(canonical_trader_id(new_row['trader_id']), str(new_row.get('exchange') or '').lower())] = new_row
 
-        except Exception as e:
-            logger.error(f"Error fetching trader config for {trader_id}: {e}")
+        self._swap_snapshot(TraderConfigSnapshot.from_rows(list(rows.values())))
+        if reload:
+            self._reload_in_background()
+
+    def start_snapshot_refresh(self, interval_seconds: float = 60.0) -> Optional[asyncio.Task]:
+        """
+        Start polling the table for changes in the background.
+
+        The snapshot is only replaced when the table contents changed. The
+        first load and every poll run the query in a worker thread.
+        """
+        if self._refresh_task is not None and not self._refresh_task.done():
+            return self._refresh_task
+
+        async def _refresh_loop():
+            await asyncio.to_thread(self.load_snapshot)
+            while True:
+                await asyncio.sleep(interval_seconds)
+                try:
+                    await asyncio.to_thread(self.load_snapshot)
+                except Exception as e:
+                    logger.error(f"Trader config snapshot refresh failed: {e}")
+
+        self._refresh_task = asyncio.create_task(_refresh_loop())
+        logger.info(f"Trader config snapshot refresh started (every {interval_seconds:.0f}s)")
+        return self._refresh_task
+
+    async def stop_snapshot_refresh(self) -> None:
+        """Stop the background snapshot refresh."""
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except asyncio.CancelledError:
+                pass
+            self._refresh_task = None
+
+    # Lookups
+
+    async def get_trader_config(self, trader_id: str) -> Optional[TraderConfig]:
+        """
+        Get trader configuration from the snapshot.
+
+        Args:
+            trader_id: The trader identifier
+
+        Returns:
+            TraderConfig or None if not found
+        """
+        if not trader_id:
+            logger.warning("Empty trader_id provided")
             return None
 
+        config = (await self.get_snapshot()).get(trader_id)
+        if config is None:
+            logger.warning(f"No configuration found for trader {trader_id}")
+        return config
+
     async def get_exchange_for_trader(self, trader_id: str) -> ExchangeType:
         """
         Get the exchange type for a given trader.
@@ -225,9 +404,9 @@ class TraderConfigService:
         Returns:
             int: Leverage value (default: 1)
         """
-        config = await self.get_trader_config(trader_id)
-        if config and config.exchange.value == exchange:
-            return config.leverage
+        sizing = (await self.get_snapshot()).sizing_for(trader_id, exchange)
+        if sizing:
+            return int(sizing[0])
 
         # Fallback to default leverage
         logger.warning(f"No leverage config found for {trader_id} on {exchange}, using 1x")
@@ -246,8 +425,7 @@ class TraderConfigService:
         if not trader_id:
             return False
 
-        config = await self.get_trader_config(trader_id)
-        return config is not None
+        return (await self.get_snapshot()).is_supported(trader_id)
 
     async def get_supported_traders(self) -> List[str]:
         """
@@ -256,37 +434,10 @@ class TraderConfigService:
         Returns:
             List[str]: List of supported trader identifiers
         """
-        # Check cache first
-        if (self._supported_traders_cache is not None and
-            self._supported_traders_timestamp is not None and
-            time.time() - self._supported_traders_timestamp < self.cache_ttl):
-            return list(self._supported_traders_cache)
-
-        try:
-            if not runtime_config:
-                logger.error("Runtime config not initialized")
-                return []
-
-            response = runtime_config.supabase.table("trader_exchange_config").select(
-                "trader_id"
-            ).execute()
-
-            if response.data:
-                traders = [config["trader_id"] for config in response.data]
-
-                # Cache the result
-                self._supported_traders_cache = set(traders)
-                self._supported_traders_timestamp = time.time()
-
-                logger.info(f"Loaded {len(traders)} supported traders from database")
-                return traders
-            else:
-                logger.warning("No supported traders found in database")
-                return []
-
-        except Exception as e:
-            logger.error(f"Error fetching supported traders: {e}")
-            return []
+        traders = (await self.get_snapshot()).trader_ids
+        if not traders:
+            logger.warning("No supported traders found in database")
+        return traders
 
     async def get_traders_for_exchange(self, exchange: ExchangeType) -> List[str]:
         """
@@ -298,26 +449,12 @@ class TraderConfigService:
         Returns:
             List[str]: List of trader identifiers using this exchange
         """
-        try:
-            if not runtime_config:
-                logger.error("Runtime config not initialized")
-                return []
-
-            response = runtime_config.supabase.table("trader_exchange_config").select(
-                "trader_id"
-            ).eq("exchange", exchange.value).execute()
-
-            if response.data:
-                traders = [config["trader_id"] for config in response.data]
-                logger.info(f"Found {len(traders)} traders for {exchange.value} exchange")
-                return traders
-            else:
-                logger.warning(f"No traders found for {exchange.value} exchange")
-                return []
-
-        except Exception as e:
-            logger.error(f"Error fetching traders for {exchange.value}: {e}")
-            return []
+        traders = (await self.get_snapshot()).traders_for_exchange(exchange)
+        if traders:
+            logger.info(f"Found {len(traders)} traders for {exchange.value} exchange")
+        else:
+            logger.warning(f"No traders found for {exchange.value} exchange")
+        return traders
 
     async def add_trader_config(self, trader_id: str, exchange: ExchangeType,
                               leverage: int, updated_by: Optional[str] = None) -> bool:
@@ -350,14 +487,8 @@ class TraderConfigService:
             ).execute()
 
             if response.data:
-                # Clear cache for this trader
-                cache_key = self._get_cache_key(trader_id)
-                self._config_cache.pop(cache_key, None)
-                self._cache_timestamps.pop(cache_key, None)
-
-                # Clear supported traders cache
-                self._supported_traders_cache = None
-                self._supported_traders_timestamp = None
+                # Publish the change to every reader
+                await asyncio.to_thread(self.load_snapshot)
 
                 logger.info(f"Added/updated config for trader {trader_id}: {exchange.value} @ {leverage}x")
                 return True
@@ -397,14 +528,8 @@ class TraderConfigService:
                         "trader_id", canon
                     ).execute()
 
-            # Clear cache for this trader
-            cache_key = self._get_cache_key(trader_id)
-            self._config_cache.pop(cache_key, None)
-            self._cache_timestamps.pop(cache_key, None)
-
-            # Clear supported traders cache
-            self._supported_traders_cache = None
-            self._supported_traders_timestamp = None
+            # Publish the change to every reader
+            await asyncio.to_thread(self.load_snapshot)
 
             logger.info(f"Removed config for trader {trader_id}")
             return True
@@ -415,22 +540,13 @@ class TraderConfigService:
 
     def clear_cache(self, trader_id: Optional[str] = None):
         """
-        Clear configuration cache.
+        Drop the snapshot so the next lookup reloads the table.
 
         Args:
-            trader_id: Specific trader to clear cache for, or None to clear all
+            trader_id: Kept for compatibility; the whole snapshot is reloaded either way
         """
-        if trader_id:
-            cache_key = self._get_cache_key(trader_id)
-            self._config_cache.pop(cache_key, None)
-            self._cache_timestamps.pop(cache_key, None)
-            logger.debug(f"Cleared cache for trader {trader_id}")
-        else:
-            self._config_cache.clear()
-            self._cache_timestamps.clear()
-            self._supported_traders_cache = None
-            self._supported_traders_timestamp = None
-            logger.debug("Cleared all trader config cache")
+        self._snapshot = None
+        logger.debug(f"Cleared trader config snapshot{f' (requested for {trader_id})' if trader_id else ''}")
 
 
 # Global instance
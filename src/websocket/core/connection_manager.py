@@ -33,6 +33,8 @@ class ConnectionManager:
         self.connection_states: Dict[str, Dict[str, Any]] = {}
         self.reconnect_tasks: Dict[str, asyncio.Task] = {}
         self.running = False
+        # Optional async callback(connection_id, connected) for (re)connects and drops
+        self.on_state_change: Optional[Callable] = None
 
     async def create_connection(self, connection_id: str, url: str,
                               message_handler: Callable,
@@ -73,6 +75,7 @@ class ConnectionManager:
 
             # Only log successful connections
             logger.warning(f"[WS] {connection_type} connection established: {connection_id}")
+            await self._notify_state_change(connection_id, True)
             return True
 
         except Exception as e:
@@ -154,6 +157,7 @@ class ConnectionManager:
         """
         if connection_id in self.connection_states:
             self.connection_states[connection_id]['connected'] = False
+            await self._notify_state_change(connection_id, False)
 
             # Start reconnection if not already running
             if connection_id not in self.reconnect_tasks or self.reconnect_tasks[connection_id].done():
@@ -193,6 +197,7 @@ class ConnectionManager:
                 asyncio.create_task(self._handle_messages(connection_id, websocket, state['message_handler']))
 
                 logger.info(f"Successfully reconnected {connection_id}")
+                await self._notify_state_change(connection_id, True)
                 return
 
             except Exception as e:
@@ -200,6 +205,15 @@ class ConnectionManager:
 
         logger.error(f"Failed to reconnect {connection_id} after {max_attempts} attempts")
 
+    async def _notify_state_change(self, connection_id: str, connected: bool):
+        """Call the state change callback, if any."""
+        if self.on_state_change is None:
+            return
+        try:
+            await self.on_state_change(connection_id, connected)
+        except Exception as e:
+            logger.error(f"Error in connection state callback for {connection_id}: {e}")
+
     def is_connected(self, connection_id: str) -> bool:
         """
         Check if a connection is currently active.
@@ -6,12 +6,72 @@ Manages event registration, routing, and error handling.
 import asyncio
 import json
 import logging
+import time
 from typing import Dict, List, Callable, Any, Optional
 from dataclasses import dataclass
-from datetime import datetime
+
+from src.core.metrics import observe_event_lag
+
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:  # orjson is optional; fall back to the stdlib decoder
+    orjson = None
+    json_loads = json.loads
 
 logger = logging.getLogger(__name__)
 
+# Binance puts the event type first in user data / raw stream frames and the
+# stream name first in combined stream frames
+_EVENT_PREFIXES = ('{"e":"', '{"e": "')
+_STREAM_PREFIXES = ('{"stream":"', '{"stream": "')
+
+
+def stream_event_type(stream: str) -> str:
+    """
+    Map a combined stream name (e.g. "btcusdt@depth5@100ms") to an event type.
+
+    Args:
+        stream: Stream name
+
+    Returns:
+        str: trade, bookTicker, ticker, depth or stream
+    """
+    if 'trade' in stream:
+        return 'trade'
+    elif 'bookTicker' in stream:
+        # Same type as the raw frame's "e", so both are routed to one handler
+        return 'bookTicker'
+    elif 'ticker' in stream:
+        return 'ticker'
+    elif 'depth' in stream:
+        return 'depth'
+    return 'stream'
+
+
+def sniff_event_type(message: Any) -> Optional[str]:
+    """
+    Read the event type from the start of a raw frame without decoding it.
+
+    Args:
+        message: Raw message
+
+    Returns:
+        Optional[str]: The type _determine_event_type would return, or None
+        if the frame does not start with a recognised key
+    """
+    if not isinstance(message, str):
+        return None
+    for prefixes, from_stream in ((_EVENT_PREFIXES, False), (_STREAM_PREFIXES, True)):
+        for prefix in prefixes:
+            if message.startswith(prefix):
+                end = message.find('"', len(prefix))
+                value = message[len(prefix):end] if end > 0 else ''
+                if not value or '\\' in value:
+                    return None
+                return stream_event_type(value) if from_stream else value
+    return None
+
 @dataclass
 class WebSocketEvent:
     """Represents a WebSocket event with metadata."""
@@ -43,6 +103,8 @@ class EventDispatcher:
         }
         self.middleware: List[Callable] = []
         self.running = False
+        # Frames dropped before decoding because nothing handles their type
+        self.skipped_messages = 0
 
     def register_handler(self, event_type: str, handler: Callable):
         """
@@ -111,7 +173,12 @@ class EventDispatcher:
             handlers = self.event_handlers.get(processed_event.event_type, [])
 
             if not handlers:
-                logger.info(f"No handlers registered for event type: {processed_event.event_type}")
+                logger.debug(f"No handlers registered for event type: {processed_event.event_type}")
+                return
+
+            # A single handler runs inline; spawning a task for it only adds overhead
+            if len(handlers) == 1:
+                await self._execute_handler(handlers[0], processed_event)
                 return
 
             # Dispatch to all handlers
@@ -176,17 +243,26 @@ class EventDispatcher:
             connection_id: Connection identifier
         """
         try:
+            # Skip frames nobody listens for (e.g. unused market streams) before decoding them
+            event_type = sniff_event_type(message)
+            if event_type is not None and not self.middleware and not self.event_handlers.get(event_type):
+                self.skipped_messages += 1
+                return
+
             # Parse JSON message
-            data = json.loads(message)
+            data = json_loads(message)
 
             # Determine event type
-            event_type = self._determine_event_type(data)
+            if event_type is None:
+                event_type = self._determine_event_type(data)
+            if 'E' in data:
+                observe_event_lag(event_type, data['E'])
 
             # Create event object
             event = WebSocketEvent(
                 event_type=event_type,
                 data=data,
-                timestamp=datetime.now().timestamp(),
+                timestamp=time.time(),
                 connection_id=connection_id
             )
 
@@ -200,7 +276,7 @@ class EventDispatcher:
                 event = WebSocketEvent(
                     event_type="ping",
                     data={"message": "ping"},
-                    timestamp=datetime.now().timestamp(),
+                    timestamp=time.time(),
                     connection_id=connection_id
                 )
                 await self.dispatch_event(event)
@@ -208,7 +284,7 @@ class EventDispatcher:
                 event = WebSocketEvent(
                     event_type="pong",
                     data={"message": "pong"},
-                    timestamp=datetime.now().timestamp(),
+                    timestamp=time.time(),
                     connection_id=connection_id
                 )
                 await self.dispatch_event(event)
@@ -234,15 +310,7 @@ class EventDispatcher:
             return data['type']  # Alternative event type
         elif 'stream' in data:
             # Handle stream data
-            stream = data['stream']
-            if 'trade' in stream:
-                return 'trade'
-            elif 'ticker' in stream:
-                return 'ticker'
-            elif 'depth' in stream:
-                return 'depth'
-            else:
-                return 'stream'
+            return stream_event_type(data['stream'])
         else:
             return 'unknown'
 
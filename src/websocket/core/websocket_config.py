@@ -4,7 +4,7 @@ Based on official Binance documentation with safety measures.
 """
 
 import os
-from typing import Optional
+from typing import List, Optional
 from dataclasses import dataclass
 
 @dataclass
@@ -68,6 +68,10 @@ class WebSocketConfig:
         """Get market data stream URL."""
         return f"{self.ws_base_url}/ws"
 
+    def combined_stream_url(self, streams: List[str]) -> str:
+        """Get combined market stream URL for a list of stream names."""
+        return f"{self.ws_base_url}/stream?streams={'/'.join(streams)}"
+
     def get_listen_key_url(self) -> str:
         """Get REST API URL for obtaining listen key."""
         return f"{self.rest_base_url}/fapi/v1/listenKey"
@@ -50,6 +50,7 @@ class WebSocketManager:
         # Initialize core components
         self.connection_manager = ConnectionManager(self.config)
         self.event_dispatcher = EventDispatcher()
+        self.connection_manager.on_state_change = self._on_connection_state_change
 
         # Connection state
         self.listen_key: Optional[str] = None
@@ -64,6 +65,10 @@ class WebSocketManager:
         self.rate_limit_counter = {'messages': 0, 'ping_pong': 0}
         self.rate_limit_reset_time = time.time()
 
+        # Streams of the combined market data connection
+        self.market_streams: List[str] = []
+        self._market_request_id = 0
+
         # Tasks
         self.tasks: List[asyncio.Task] = []
         self.running = False
@@ -154,6 +159,16 @@ class WebSocketManager:
             logger.error(f"Failed to establish connections: {e}")
             raise
 
+    async def _on_connection_state_change(self, connection_id: str, connected: bool):
+        """Dispatch 'connection'/'disconnection' events so handlers can resync state."""
+        state = self.connection_manager.get_connection_state(connection_id) or {}
+        await self.event_dispatcher.dispatch_event(WebSocketEvent(
+            event_type='connection' if connected else 'disconnection',
+            data={'type': state.get('type', connection_id), 'connection_id': connection_id},
+            timestamp=time.time(),
+            connection_id=connection_id
+        ))
+
     async def _handle_user_data_message(self, message: str, connection_id: str):
         """
         Handle messages from user data stream.
@@ -173,6 +188,90 @@ class WebSocketManager:
             logger.error(f"Error handling user data message: {e}")
             self.consecutive_errors += 1
 
+    async def subscribe_market_streams(self, streams: List[str]) -> bool:
+        """
+        Follow the given streams on the combined market data connection.
+
+        Market frames arrive on their own connection and receive task, so a
+        busy stream does not queue behind (or in front of) user data events.
+        Frames whose type has no registered handler are dropped undecoded.
+        An open connection is moved to the new streams with SUBSCRIBE and
+        UNSUBSCRIBE requests; it is only (re)opened when none is connected
+        or a request cannot be sent.
+
+        Args:
+            streams: Stream names, e.g. ["btcusdt@depth5@100ms", "ethusdt@bookTicker"]
+
+        Returns:
+            bool: True if the streams are subscribed
+        """
+        if not streams:
+            return False
+        if len(streams) > self.config.MAX_STREAMS_PER_CONNECTION:
+            logger.error(f"Too many market streams for one connection: {len(streams)}")
+            return False
+
+        if self.connection_manager.is_connected("market_data") and await self._update_market_subscription(streams):
+            return True
+
+        await self.connection_manager.close_connection("market_data")
+        connected = await self.connection_manager.create_connection(
+            "market_data",
+            self.config.combined_stream_url(streams),
+            self._handle_market_data_message,
+            "market_data"
+        )
+        if connected:
+            self.market_streams = list(streams)
+        return connected
+
+    async def _update_market_subscription(self, streams: List[str]) -> bool:
+        """
+        Move the open market data connection to the given streams.
+
+        Args:
+            streams: Stream names the connection should follow
+
+        Returns:
+            bool: True if every SUBSCRIBE/UNSUBSCRIBE request was sent
+        """
+        wanted = set(streams)
+        current = set(self.market_streams)
+        removed = [s for s in self.market_streams if s not in wanted]
+        added = [s for s in streams if s not in current]
+
+        for method, params in (("UNSUBSCRIBE", removed), ("SUBSCRIBE", added)):
+            if not params:
+                continue
+            self._market_request_id += 1
+            request = json.dumps({"method": method, "params": params, "id": self._market_request_id})
+            if not await self.send_message("market_data", request):
+                return False
+
+        self.market_streams = list(streams)
+        # Reconnects open the URL of the connection state, so keep it on the current streams
+        state = self.connection_manager.get_connection_state("market_data")
+        if state is not None:
+            state['url'] = self.config.combined_stream_url(streams)
+        return True
+
+    async def _handle_market_data_message(self, message: str, connection_id: str):
+        """
+        Handle messages from the combined market data stream.
+
+        Args:
+            message: Raw message from WebSocket
+            connection_id: Connection identifier
+        """
+        try:
+            # Replies to SUBSCRIBE/UNSUBSCRIBE requests, e.g. {"result":null,"id":1}
+            if message.startswith('{"result"'):
+                logger.debug(f"Market stream subscription reply: {message}")
+                return
+            await self.event_dispatcher.dispatch_raw_message(message, connection_id)
+        except Exception as e:
+            logger.error(f"Error handling market data message: {e}")
+
     async def _get_listen_key(self):
         """Get a new listen key from Binance."""
         try:
@@ -4,10 +4,11 @@ Handles connection errors, rate limit errors, and other WebSocket-related errors
 """
 
 import logging
-from typing import Dict, Any, Optional, List
+from collections import deque
+from typing import Deque, Dict, Any, Optional, List
 from datetime import datetime
 
-from .handler_models import ErrorEvent
+from .handler_models import HISTORY_LIMIT, ErrorEvent
 
 logger = logging.getLogger(__name__)
 
@@ -18,9 +19,9 @@ class ErrorHandler:
 
     def __init__(self):
         """Initialize error handler."""
-        self.error_history: List[ErrorEvent] = []
+        self.max_error_history = HISTORY_LIMIT
+        self.error_history: Deque[ErrorEvent] = deque(maxlen=self.max_error_history)
         self.error_counts: Dict[str, int] = {}
-        self.max_error_history = 1000
 
     async def handle_error_event(self, event_data: Dict[str, Any]) -> Optional[ErrorEvent]:
         """
@@ -63,10 +64,6 @@ class ErrorHandler:
             error_key = f"{code}:{message}"
             self.error_counts[error_key] = self.error_counts.get(error_key, 0) + 1
 
-            # Keep only recent errors
-            if len(self.error_history) > self.max_error_history:
-                self.error_history = self.error_history[-self.max_error_history:]
-
             # Log error based on severity
             if self._is_critical_error(code if code is not None else -1):
                 logger.critical(f"Critical WebSocket Error {code}: {message}")
@@ -220,7 +217,7 @@ class ErrorHandler:
         Returns:
             List[ErrorEvent]: Error history
         """
-        return self.error_history[-limit:]
+        return list(self.error_history)[-limit:]
 
     def get_error_counts(self) -> Dict[str, int]:
         """
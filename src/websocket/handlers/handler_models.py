@@ -1,6 +1,9 @@
 """
 Data models for WebSocket handlers.
 Defines structures for different types of WebSocket events and data.
+
+Events are kept in per-handler histories, so the models are slotted to keep
+each instance small.
 """
 
 from dataclasses import dataclass
@@ -8,7 +11,10 @@ from typing import Dict, Any, Optional, List
 from datetime import datetime
 from decimal import Decimal
 
-@dataclass
+# Events kept in each handler history
+HISTORY_LIMIT = 1000
+
+@dataclass(slots=True)
 class ExecutionReport:
     """Model for execution report events."""
     order_id: str
@@ -22,7 +28,7 @@ class ExecutionReport:
     time: datetime
     update_time: datetime
 
-@dataclass
+@dataclass(slots=True)
 class BalanceUpdate:
     """Model for balance update events."""
     asset: str
@@ -30,13 +36,13 @@ class BalanceUpdate:
     event_time: datetime
     clear_time: datetime
 
-@dataclass
+@dataclass(slots=True)
 class AccountPosition:
     """Model for account position events."""
     positions: List[Dict[str, Any]]
     event_time: datetime
 
-@dataclass
+@dataclass(slots=True)
 class MarketData:
     """Model for market data events."""
     symbol: str
@@ -45,7 +51,7 @@ class MarketData:
     trade_time: datetime
     event_type: str
 
-@dataclass
+@dataclass(slots=True)
 class ErrorEvent:
     """Model for error events."""
     code: int
@@ -4,10 +4,11 @@ Handles execution reports, balance updates, and account position changes.
 """
 
 import logging
-from typing import Dict, Any, Optional, List
+from collections import deque
+from typing import Deque, Dict, Any, Optional, List
 from datetime import datetime
 
-from .handler_models import ExecutionReport, BalanceUpdate, AccountPosition
+from .handler_models import HISTORY_LIMIT, ExecutionReport, BalanceUpdate, AccountPosition
 
 logger = logging.getLogger(__name__)
 
@@ -18,9 +19,10 @@ class UserDataHandler:
 
     def __init__(self):
         """Initialize user data handler."""
-        self.execution_history: List[ExecutionReport] = []
-        self.balance_updates: List[BalanceUpdate] = []
-        self.account_positions: List[AccountPosition] = []
+        # Ring buffers: the oldest event is dropped when a new one arrives at the limit
+        self.execution_history: Deque[ExecutionReport] = deque(maxlen=HISTORY_LIMIT)
+        self.balance_updates: Deque[BalanceUpdate] = deque(maxlen=HISTORY_LIMIT)
+        self.account_positions: Deque[AccountPosition] = deque(maxlen=HISTORY_LIMIT)
 
     async def handle_execution_report(self, event_data: Dict[str, Any]) -> Optional[ExecutionReport]:
         """
@@ -68,10 +70,6 @@ class UserDataHandler:
             # Store in history
             self.execution_history.append(execution_report)
 
-            # Keep only last 1000 execution reports
-            if len(self.execution_history) > 1000:
-                self.execution_history = self.execution_history[-1000:]
-
             logger.info(f"Execution Report: {symbol} {order_id} - {status} - Qty: {executed_qty} - Price: {avg_price}")
 
             # Note: Notifications are handled by the initial signal processor and database sync
@@ -109,10 +107,6 @@ class UserDataHandler:
             # Store in history
             self.balance_updates.append(balance_update)
 
-            # Keep only last 1000 balance updates
-            if len(self.balance_updates) > 1000:
-                self.balance_updates = self.balance_updates[-1000:]
-
             logger.info(f"Balance Update: {asset} - Delta: {balance_delta}")
             return balance_update
 
@@ -142,10 +136,6 @@ class UserDataHandler:
             # Store in history
             self.account_positions.append(account_position)
 
-            # Keep only last 1000 position updates
-            if len(self.account_positions) > 1000:
-                self.account_positions = self.account_positions[-1000:]
-
             logger.info(f"Account Position Update: {len(positions)} positions")
             return account_position
 
@@ -164,7 +154,7 @@ class UserDataHandler:
         Returns:
             List[ExecutionReport]: Execution history
         """
-        history = self.execution_history
+        history = list(self.execution_history)
 
         if symbol:
             history = [report for report in history if report.symbol == symbol]
@@ -182,7 +172,7 @@ class UserDataHandler:
         Returns:
             List[BalanceUpdate]: Balance update history
         """
-        updates = self.balance_updates
+        updates = list(self.balance_updates)
 
         if asset:
             updates = [update for update in updates if update.asset == asset]
@@ -199,7 +189,7 @@ class UserDataHandler:
         Returns:
             List[AccountPosition]: Account position history
         """
-        return self.account_positions[-limit:]
+        return list(self.account_positions)[-limit:]
 
     def get_latest_execution_report(self, order_id: str) -> Optional[ExecutionReport]:
         """
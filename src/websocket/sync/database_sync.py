@@ -11,6 +11,8 @@ from decimal import Decimal
 
 from .sync_models import SyncEvent, DatabaseSyncState, TradeSyncData, PositionSyncData, BalanceSyncData
 from src.core.response_normalizer import normalize_exchange_response
+from src.database.core.trade_cache import get_trade_cache
+from src.services.analytics.rollups import record_trade_writes
 
 logger = logging.getLogger(__name__)
 
@@ -393,9 +395,12 @@ class DatabaseSync:
 
             # Update database
             response = self.db_manager.supabase.from_("trades").update(updates).eq("id", trade_id).execute()
+            get_trade_cache().invalidate(trade_id)
 
             if response.data:
                 logger.info(f"Updated trade {trade_id} status to {updates.get('status')} order_status {updates.get('order_status')}")
+                # Fold the closed trade into the analytics rollups
+                await record_trade_writes(self.db_manager.supabase, response.data)
                 # Notify via Telegram for error states only (success notifications handled by initial signal processor)
                 try:
                     if status in ['CANCELED', 'REJECTED', 'EXPIRED']:
@@ -677,6 +682,7 @@ class DatabaseSync:
                         'updated_at': datetime.now(timezone.utc).isoformat()
                     }
                     self.db_manager.supabase.from_("trades").update(update_data).eq("id", trade_id).execute()
+                    get_trade_cache().invalidate(trade_id)
                     logger.info(f"Updated trade {trade_id} with new stop loss order ID {new_sl_order_id}")
                 except Exception as e:
                     logger.error(f"Failed to update trade {trade_id} with new stop loss order ID: {e}")
@@ -701,6 +707,7 @@ class DatabaseSync:
             }
 
             response = self.db_manager.supabase.from_("trades").update(updates).eq("id", trade_id).execute()
+            get_trade_cache().invalidate(trade_id)
 
             if response.data:
                 logger.info(f"Updated trade {trade_id} with order ID {order_id}")
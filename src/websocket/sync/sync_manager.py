@@ -5,7 +5,8 @@ Coordinates multiple sync operations and manages sync state.
 
 import asyncio
 import logging
-from typing import Dict, Any, Optional, List
+from collections import deque
+from typing import Deque, Dict, Any, Optional, List
 from datetime import datetime, timezone
 
 from .database_sync import DatabaseSync
@@ -13,6 +14,9 @@ from .sync_models import SyncEvent, DatabaseSyncState
 
 logger = logging.getLogger(__name__)
 
+# Sync events kept in the queue; the oldest are dropped first
+SYNC_QUEUE_LIMIT = 1000
+
 class SyncManager:
     """
     Manages database synchronization operations.
@@ -27,7 +31,7 @@ class SyncManager:
         """
         self.db_manager = db_manager
         self.database_sync = DatabaseSync(db_manager)
-        self.sync_queue: List[SyncEvent] = []
+        self.sync_queue: Deque[SyncEvent] = deque(maxlen=SYNC_QUEUE_LIMIT)
         self.running = False
         self.sync_tasks: List[asyncio.Task] = []
 
@@ -184,14 +188,11 @@ class SyncManager:
             try:
                 # Process events in batches
                 batch_size = min(10, len(self.sync_queue))
-                batch = self.sync_queue[:batch_size]
+                batch = [self.sync_queue.popleft() for _ in range(batch_size)]
 
                 for sync_event in batch:
                     await self._process_sync_event(sync_event)
 
-                # Remove processed events
-                self.sync_queue = self.sync_queue[batch_size:]
-
                 # Small delay to prevent overwhelming the database
                 await asyncio.sleep(0.1)
 
@@ -246,7 +247,7 @@ class SyncManager:
                     'status': event.status,
                     'timestamp': event.timestamp.isoformat()
                 }
-                for event in self.sync_queue[-10:]  # Last 10 events
+                for event in list(self.sync_queue)[-10:]  # Last 10 events
             ]
         }
 
@@ -8,7 +8,7 @@ from typing import Dict, Any, Optional, List
 from datetime import datetime
 from decimal import Decimal
 
-@dataclass
+@dataclass(slots=True)
 class SyncEvent:
     """Model for synchronization events."""
     event_type: str
@@ -18,7 +18,7 @@ class SyncEvent:
     target: str
     status: str
 
-@dataclass
+@dataclass(slots=True)
 class DatabaseSyncState:
     """Model for database synchronization state."""
     last_sync_time: datetime
@@ -27,7 +27,7 @@ class DatabaseSyncState:
     failed_events: int
     successful_events: int
 
-@dataclass
+@dataclass(slots=True)
 class TradeSyncData:
     """Model for trade synchronization data."""
     trade_id: str
@@ -39,7 +39,7 @@ class TradeSyncData:
     realized_pnl: float
     sync_timestamp: datetime
 
-@dataclass
+@dataclass(slots=True)
 class PositionSyncData:
     """Model for position synchronization data."""
     symbol: str
@@ -49,7 +49,7 @@ class PositionSyncData:
     un_realized_pnl: float
     sync_timestamp: datetime
 
-@dataclass
+@dataclass(slots=True)
 class BalanceSyncData:
     """Model for balance synchronization data."""
     asset: str
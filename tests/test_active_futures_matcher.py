@@ -0,0 +1,99 @@
+import itertools
+import random
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from src.database import ActiveFutures, DatabaseManager, Trade
+from src.services.active_futures_matcher import ActiveFuturesBatchMatcher, MatchText, max_weight_assignment
+from src.services.active_futures_sync_service import ActiveFuturesSyncService
+
+
+@pytest.fixture
+def sync_service():
+    db_manager = Mock(spec=DatabaseManager)
+    db_manager.client = Mock()
+    return ActiveFuturesSyncService(db_manager)
+
+
+def futures(id, trader, content, created_at="2025-01-15T10:00:00Z"):
+    return ActiveFutures(id=id, trader=trader, content=content, status="CLOSED", created_at=created_at)
+
+
+def trade(id, trader, coin, content, timestamp="2025-01-15T10:05:00Z"):
+    return Trade(id=id, discord_id=f"trade{id}", trader=trader, coin_symbol=coin, content=content,
+                 status="OPEN", timestamp=timestamp)
+
+
+def test_match_text_similarity_matches_service(sync_service):
+    rng = random.Random(3)
+    words = ["BTC", "eth", "Entry:", "SL:", "100", "200", "TP"]
+    for _ in range(300):
+        a = " ".join(rng.choice(words) for _ in range(rng.randint(0, 5)))
+        b = " ".join(rng.choice(words) for _ in range(rng.randint(0, 5)))
+        assert MatchText.of(a).similarity(MatchText.of(b)) == sync_service.calculate_content_similarity(a, b)
+
+
+def test_max_weight_assignment_matches_brute_force():
+    rng = random.Random(11)
+    for _ in range(200):
+        rows, cols = rng.randint(1, 5), rng.randint(1, 5)
+        weights = [[rng.choice([0.0, rng.uniform(0.6, 1.1)]) for _ in range(cols)] for _ in range(rows)]
+
+        best = 0.0
+        for perm in itertools.permutations(range(max(rows, cols)), rows):
+            best = max(best, sum(weights[r][c] for r, c in enumerate(perm) if c < cols and weights[r][c] > 0))
+
+        pairs = max_weight_assignment(weights)
+        assert sum(weights[r][c] for r, c in pairs) == pytest.approx(best)
+        assert len({r for r, _ in pairs}) == len({c for _, c in pairs}) == len(pairs)
+        assert all(weights[r][c] > 0 for r, c in pairs)
+
+
+def test_assignment_never_closes_a_trade_twice(sync_service):
+    closed = [
+        futures(1, "@Johnny", "BTC Entry: 110547-110328 SL: 108310"),
+        futures(2, "@Johnny", "BTC Entry: 98000-97500 SL: 96000"),
+        futures(3, "@Tareeq", "ETH Entry: 4437-4421 SL: 4348"),
+    ]
+    trades = [
+        trade(10, "@Johnny", "BTC", "BTC Entry: 110547-110328 SL: 108310"),
+        trade(11, "@Johnny", "BTC", "BTC Entry: 98000-97500 SL: 96000"),
+        trade(12, "@Tareeq", "ETH", "ETH Entry: 4437-4421 SL: 4348"),
+        trade(13, "@Tareeq", "BTC", "BTC Entry: 110547-110328 SL: 108310"),
+    ]
+    matcher = ActiveFuturesBatchMatcher(trades, sync_service.extract_coin_symbol_from_content)
+
+    assigned = matcher.assign(closed)
+
+    assert {index: match[0].id for index, match in assigned.items()} == {0: 10, 1: 11, 2: 12}
+    # Greedy on best score alone would hand trade 10 to both BTC futures
+    assert [t.id for t, _, _ in matcher.ranked_trades(closed)[1]] == [11, 10]
+
+
+def test_falls_back_to_trades_without_coin_symbol(sync_service):
+    closed = [futures(1, "@Johnny", "SOL Entry: 177-172.9 SL: 169")]
+    trades = [trade(10, "@Johnny", None, "SOL Entry: 177-172.9 SL: 169"),
+              trade(11, "@Johnny", "ETH", "SOL Entry: 177-172.9 SL: 169")]
+    matcher = ActiveFuturesBatchMatcher(trades, sync_service.extract_coin_symbol_from_content)
+
+    assert {i: m[0].id for i, m in matcher.assign(closed).items()} == {0: 10}
+
+
+@pytest.mark.asyncio
+async def test_batch_sync_loads_open_trades_once(sync_service):
+    closed = [futures(i, "@Johnny" if i % 2 else "@Tareeq", f"BTC Entry: {100 + i} SL: {90 + i}")
+              for i in range(1, 21)]
+    trades = [trade(100 + i, af.trader, "BTC", af.content) for i, af in enumerate(closed)]
+    sync_service.trade_repo.get_trades_by_traders_and_status = AsyncMock(return_value=trades)
+    sync_service.trade_repo.get_trades_by_filter = AsyncMock(return_value=[])
+    sync_service.close_trade_position = AsyncMock(return_value=True)
+
+    results = await sync_service.process_closed_futures(closed)
+
+    assert results["successful_closes"] == 20 and results["no_matches"] == 0
+    sync_service.trade_repo.get_trades_by_traders_and_status.assert_awaited_once()
+    assert sync_service.trade_repo.get_trades_by_traders_and_status.await_args.args[:2] == (["@Johnny", "@Tareeq"], "OPEN")
+    sync_service.trade_repo.get_trades_by_filter.assert_not_awaited()
+    closed_pairs = {(c.args[1].id, c.args[0].id) for c in sync_service.close_trade_position.await_args_list}
+    assert closed_pairs == {(af.id, 100 + i) for i, af in enumerate(closed)}
@@ -0,0 +1,242 @@
+import itertools
+import random
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.database.core.trade_batch_writer import TradeBatchWriter
+from src.services.analytics import rollups as rollups_module
+from src.services.analytics.rollups import (
+    ALL,
+    AnalyticsRollupService,
+    RollupSummary,
+    TradeContribution,
+    merge_summaries,
+    record_trade_writes,
+)
+
+
+class InMemoryRollupRepository:
+    """Stands in for AnalyticsRepository's rollup queries."""
+
+    def __init__(self):
+        self.records = {}
+        self.ids = itertools.count(1)
+        self.saves = 0
+
+    async def get_rollup_records(self, trader=None, symbol=None, start_day=None, end_day=None,
+                                 exclude_trader=None, columns=None):
+        rows = []
+        for record in self.records.values():
+            if trader is not None and record['trader'] != trader:
+                continue
+            if exclude_trader is not None and record['trader'] == exclude_trader:
+                continue
+            if symbol is not None and record['metadata']['symbol'] != symbol:
+                continue
+            if start_day and record['period_start'] < start_day:
+                continue
+            if end_day and record['period_start'] > end_day:
+                continue
+            rows.append(dict(record))
+        return sorted(rows, key=lambda r: r['period_start'])
+
+    async def save_rollup_record(self, record_data, record_id=None, expected_updated_at=None):
+        if expected_updated_at is not None and self.records[record_id]['updated_at'] != expected_updated_at:
+            return None
+        self.saves += 1
+        record_id = record_id or next(self.ids)
+        self.records[record_id] = {**record_data, 'id': record_id, 'updated_at': str(self.saves)}
+        return self.records[record_id]
+
+
+def closed(trade_id, pnl, day, trader='@alice', symbol='BTC', net=None, hour=12):
+    return {'id': trade_id, 'trader': trader, 'coin_symbol': symbol, 'status': 'CLOSED',
+            'pnl_usd': pnl, 'net_pnl': pnl if net is None else net,
+            'closed_at': f'{day}T{hour:02d}:00:00+00:00'}
+
+
+def brute_force_drawdown(pnls):
+    equity = peak = drawdown = 0.0
+    for pnl in pnls:
+        equity += pnl
+        peak = max(peak, equity)
+        drawdown = max(drawdown, peak - equity)
+    return drawdown
+
+
+def test_merged_summaries_match_a_single_pass():
+    rng = random.Random(7)
+    for _ in range(200):
+        pnls = [rng.uniform(-50, 50) for _ in range(rng.randint(0, 12))]
+        contributions = [TradeContribution(str(i), p, p, f'{i:04d}') for i, p in enumerate(pnls)]
+        cut = rng.randint(0, len(pnls))
+
+        merged = RollupSummary.from_contributions(contributions[:cut]).merge(
+            RollupSummary.from_contributions(contributions[cut:]))
+
+        assert merged.max_drawdown == pytest.approx(brute_force_drawdown(pnls))
+        assert merged.net_pnl == pytest.approx(sum(pnls))
+        assert merged.count == len(pnls)
+
+
+@pytest.mark.asyncio
+async def test_recording_is_idempotent_and_replaces_changed_pnl():
+    repository = InMemoryRollupRepository()
+    service = AnalyticsRollupService(repository)
+
+    assert await service.record_closed_trade(closed(1, 10.0, '2026-10-01'))
+    saves = repository.saves
+    assert not await service.record_closed_trade(closed(1, 10.0, '2026-10-01'))
+    assert repository.saves == saves
+
+    assert await service.record_closed_trade(closed(1, -4.0, '2026-10-01'))
+    performance = await service.get_performance_analytics({})
+
+    assert performance['total_trades'] == 1
+    assert performance['total_pnl'] == -4.0
+    assert performance['losing_trades'] == 1
+
+
+@pytest.mark.asyncio
+async def test_open_trades_and_trades_without_pnl_are_ignored():
+    service = AnalyticsRollupService(InMemoryRollupRepository())
+
+    assert not await service.record_closed_trade({**closed(1, 5.0, '2026-10-01'), 'status': 'ACTIVE'})
+    assert not await service.record_closed_trade({**closed(2, None, '2026-10-01'), 'net_pnl': None})
+    assert (await service.get_performance_analytics({}))['total_trades'] == 0
+
+
+@pytest.mark.asyncio
+async def test_moving_a_trade_to_another_day_removes_it_from_the_old_bucket():
+    service = AnalyticsRollupService(InMemoryRollupRepository())
+
+    await service.record_closed_trade(closed(1, 10.0, '2026-10-01'))
+    await service.record_closed_trade(closed(1, 10.0, '2026-10-03'))
+
+    pnl = await service.get_pnl_analytics({})
+    assert [(d['date'], d['gross_pnl']) for d in pnl['daily']] == [('2026-10-01', 0.0), ('2026-10-03', 10.0)]
+    assert pnl['total_pnl'] == 10.0
+
+
+@pytest.mark.asyncio
+async def test_queries_respect_trader_symbol_and_date_filters():
+    repository = InMemoryRollupRepository()
+    service = AnalyticsRollupService(repository)
+    trades = [
+        closed(1, 20.0, '2026-10-01', '@alice', 'BTC'),
+        closed(2, -30.0, '2026-10-02', '@alice', 'ETH', net=-31.0),
+        closed(3, 15.0, '2026-10-02', '@bob', 'BTC'),
+        closed(4, 5.0, '2026-10-03', '@bob', 'ETH'),
+    ]
+    for trade in trades:
+        await service.record_closed_trade(trade)
+
+    everything = await service.get_performance_analytics({})
+    alice = await service.get_performance_analytics({'trader': '@alice'})
+    btc = await service.get_win_rate_analytics({'coin_symbol': 'btc'})
+    alice_eth = await service.get_pnl_analytics({'trader': '@alice', 'coin_symbol': 'ETH'})
+    late = await service.get_performance_analytics({'start_date': '2026-10-02T00:00:00'})
+
+    assert everything['total_trades'] == 4 and everything['total_pnl'] == 10.0
+    assert alice == {'total_trades': 2, 'winning_trades': 1, 'losing_trades': 1, 'win_rate': 50.0,
+                     'total_pnl': -10.0, 'avg_trade_pnl': -5.0, 'max_drawdown': 31.0}
+    assert btc['total_trades'] == 2 and btc['win_rate'] == 100.0
+    assert alice_eth['fees'] == 1.0 and alice_eth['net_pnl'] == -31.0
+    assert late['total_trades'] == 3
+
+    traders = await service.get_trader_performance({})
+    assert [t['trader'] for t in traders] == ['@bob', '@alice']
+    assert ALL not in {t['trader'] for t in traders}
+
+
+@pytest.mark.asyncio
+async def test_drawdown_curve_and_rebuild_agree_with_incremental_updates():
+    pnls = [12.0, -5.0, -9.0, 4.0, 20.0, -15.0]
+    trades = [closed(i, p, f'2026-10-0{1 + i // 2}', hour=10 + i) for i, p in enumerate(pnls)]
+
+    incremental = AnalyticsRollupService(InMemoryRollupRepository())
+    for trade in trades:
+        await incremental.record_closed_trade(trade)
+    rebuilt = AnalyticsRollupService(InMemoryRollupRepository())
+    assert await rebuilt.rebuild(trades) == len(trades)
+
+    drawdown = await incremental.get_drawdown_analytics({})
+    assert drawdown['max_drawdown'] == pytest.approx(brute_force_drawdown(pnls))
+    assert drawdown['current_drawdown'] == pytest.approx(15.0)
+    assert [point['date'] for point in drawdown['curve']] == ['2026-10-01', '2026-10-02', '2026-10-03']
+    assert await rebuilt.get_drawdown_analytics({}) == drawdown
+
+
+@pytest.mark.asyncio
+async def test_processes_sharing_buckets_keep_each_others_trades():
+    repository = InMemoryRollupRepository()
+    bot, script = AnalyticsRollupService(repository), AnalyticsRollupService(repository)
+
+    await bot.record_closed_trade(closed(1, 1.0, '2026-10-01'))
+    await script.record_closed_trade(closed(2, 2.0, '2026-10-01'))
+    await bot.record_closed_trade(closed(3, 4.0, '2026-10-01'))
+
+    assert (await bot.get_pnl_analytics({}))['total_pnl'] == 7.0
+
+
+@pytest.mark.asyncio
+async def test_conflicting_save_reloads_and_reapplies():
+    repository = InMemoryRollupRepository()
+    service = AnalyticsRollupService(repository)
+    other = AnalyticsRollupService(repository)
+    await service.record_closed_trade(closed(1, 1.0, '2026-10-01'))
+    load = service._load
+
+    async def load_then_race(*key):
+        bucket = await load(*key)
+        if key == (ALL, ALL, '2026-10-01') and not getattr(load_then_race, 'raced', False):
+            load_then_race.raced = True
+            await other.record_closed_trade(closed(2, 2.0, '2026-10-01'))
+        return bucket
+
+    service._load = load_then_race
+    assert await service.record_closed_trade(closed(3, 4.0, '2026-10-01'))
+
+    assert (await service.get_pnl_analytics({}))['total_pnl'] == 7.0
+
+
+@pytest.mark.asyncio
+async def test_trades_are_bucketed_by_closed_at_only():
+    service = AnalyticsRollupService(InMemoryRollupRepository(), max_trades=1)
+    trade = closed(1, 5.0, '2026-10-01')
+
+    assert not await service.record_closed_trade({**trade, 'closed_at': None, 'updated_at': '2026-10-01T12:00:00+00:00'})
+    assert await service.record_closed_trade(trade)
+    await service.record_closed_trade(closed(2, 1.0, '2026-10-02'))
+    # A later write (e.g. after a restart) with a new updated_at stays in the same day
+    assert not await service.record_closed_trade({**trade, 'updated_at': '2026-10-03T09:00:00+00:00'})
+
+    pnl = await service.get_pnl_analytics({})
+    assert pnl['total_pnl'] == 6.0 and [d['date'] for d in pnl['daily']] == ['2026-10-01', '2026-10-02']
+
+
+@pytest.mark.asyncio
+async def test_trade_writes_feed_the_rollups(monkeypatch):
+    service = AnalyticsRollupService(InMemoryRollupRepository())
+    monkeypatch.setattr(rollups_module, '_rollup_service', service)
+    supabase = MagicMock()
+    supabase.rpc.side_effect = lambda name, params: MagicMock(execute=MagicMock(return_value=MagicMock(
+        data=[{**closed(p['id'], 0.0, '2026-10-01'), **p} for p in params['updates']])))
+
+    async with TradeBatchWriter(supabase) as writer:
+        await writer.stage({'id': 1}, {'pnl_usd': 7.5, 'net_pnl': 7.0}, validate=False)
+        await writer.stage({'id': 2}, {'pnl_usd': -2.5, 'net_pnl': -3.0}, validate=False)
+    assert await record_trade_writes(supabase, [{**closed(3, 1.0, '2026-10-01'), 'status': 'ACTIVE'}, 'x']) == 0
+
+    pnl = await service.get_pnl_analytics({})
+    assert pnl['total_pnl'] == 5.0 and pnl['net_pnl'] == 4.0
+
+
+def test_merge_summaries_orders_days():
+    up = RollupSummary.from_contributions([TradeContribution('1', 10.0, 10.0, 'a')])
+    down = RollupSummary.from_contributions([TradeContribution('2', -10.0, -10.0, 'b')])
+
+    assert merge_summaries([('2026-10-02', down), ('2026-10-01', up)]).max_drawdown == 10.0
+    assert merge_summaries([('2026-10-01', down), ('2026-10-02', up)]).max_drawdown == 10.0
+    assert merge_summaries([('2026-10-02', up), ('2026-10-01', down)]).current_drawdown == 0.0
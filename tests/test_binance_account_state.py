@@ -0,0 +1,148 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.exchange.binance.binance_account_state import BinanceAccountState
+from src.exchange.binance.binance_exchange import BinanceExchange
+
+ACCOUNT = {
+    'assets': [{'asset': 'USDT', 'walletBalance': '1000'}, {'asset': 'BNB', 'walletBalance': '0'}],
+    'positions': [
+        {'symbol': 'BTCUSDT', 'positionAmt': '0.5', 'entryPrice': '60000', 'leverage': '10', 'positionSide': 'BOTH'},
+        {'symbol': 'ETHUSDT', 'positionAmt': '0', 'entryPrice': '0', 'leverage': '20', 'positionSide': 'BOTH'},
+    ],
+}
+POSITION_RISK = [
+    {'symbol': 'BTCUSDT', 'positionAmt': '0.5', 'entryPrice': '60000', 'markPrice': '61000',
+     'unRealizedProfit': '500', 'liquidationPrice': '54000', 'notional': '30500', 'positionSide': 'BOTH'},
+]
+OPEN_ORDERS = [{'orderId': 1, 'symbol': 'BTCUSDT', 'type': 'STOP_MARKET', 'status': 'NEW'}]
+
+
+def _order_event(order_id, status, symbol='ETHUSDT'):
+    return {'e': 'ORDER_TRADE_UPDATE', 'E': 1, 'o': {'i': order_id, 's': symbol, 'X': status, 'o': 'LIMIT', 'S': 'BUY'}}
+
+
+def test_stream_events_update_positions_orders_and_balances():
+    state = BinanceAccountState()
+    state.load_snapshot(ACCOUNT, OPEN_ORDERS)
+
+    state.apply_event('ACCOUNT_UPDATE', {'E': 2, 'a': {
+        'B': [{'a': 'USDT', 'wb': '990'}],
+        'P': [{'s': 'ETHUSDT', 'pa': '-2', 'ep': '3000', 'up': '5', 'mt': 'cross', 'iw': '0', 'ps': 'BOTH'},
+              {'s': 'BTCUSDT', 'pa': '0', 'ep': '0', 'up': '0', 'ps': 'BOTH'}],
+    }})
+    state.apply_event('ORDER_TRADE_UPDATE', _order_event(2, 'NEW'))
+    state.apply_event('ORDER_TRADE_UPDATE', _order_event(1, 'CANCELED', 'BTCUSDT'))
+
+    positions = state.get_positions()
+    assert [(p['symbol'], p['positionAmt'], p['leverage']) for p in positions] == [('ETHUSDT', -2.0, 20)]
+    assert [o['orderId'] for o in state.get_open_orders()] == [2]
+    assert state.get_balances() == {'USDT': 990.0}
+
+
+def test_events_received_during_resync_are_replayed_after_snapshot():
+    state = BinanceAccountState()
+    state.begin_sync()
+    state.apply_event('ORDER_TRADE_UPDATE', _order_event(1, 'FILLED', 'BTCUSDT'))
+
+    state.load_snapshot(ACCOUNT, OPEN_ORDERS)
+
+    assert state.get_open_orders() == []
+
+
+def test_listen_key_expiry_and_reconnect_force_resync():
+    state = BinanceAccountState()
+    state.load_snapshot(ACCOUNT, OPEN_ORDERS)
+    state.set_stream_connected(True)
+    state.load_snapshot(ACCOUNT, OPEN_ORDERS)
+    assert state.is_fresh()
+
+    state.apply_event('listenKeyExpired', {'e': 'listenKeyExpired'})
+    assert not state.is_fresh() and not state.stream_connected
+
+    state.load_snapshot(ACCOUNT, OPEN_ORDERS)
+    state.poll_ttl = 0
+    assert not state.is_fresh()
+
+
+@pytest.mark.asyncio
+async def test_exchange_reads_are_served_from_the_mirror_while_streaming():
+    exchange = BinanceExchange('key', 'secret')
+    exchange._init_client = AsyncMock()
+    exchange.client = MagicMock()
+    exchange.client.futures_account = AsyncMock(return_value=ACCOUNT)
+    exchange.client.futures_get_open_orders = AsyncMock(return_value=OPEN_ORDERS)
+    exchange.client.futures_position_information = AsyncMock(return_value=POSITION_RISK)
+    exchange.client.futures_cancel_order = AsyncMock(return_value={'orderId': 1, 'status': 'CANCELED'})
+    exchange.account_state.set_stream_connected(True)
+
+    for _ in range(3):
+        positions = await exchange.get_futures_position_information()
+        orders = await exchange.get_all_open_futures_orders()
+        balances = await exchange.get_account_balances()
+
+    assert exchange.client.futures_account.await_count == 1
+    assert positions[0]['symbol'] == 'BTCUSDT' and positions[0]['positionAmt'] == 0.5
+    assert positions[0]['leverage'] == 10
+    exchange.client.futures_position_information.assert_not_awaited()
+    assert orders[0]['orderId'] == 1 and balances == {'USDT': 1000.0}
+
+    # The stream reports the cancel itself, so the mirror is not reloaded
+    await exchange.cancel_futures_order('BTCUSDT', '1')
+    await exchange.get_futures_position_information()
+    assert exchange.client.futures_account.await_count == 1
+
+    # Without a stream a local write forces a reload
+    exchange.account_state.set_stream_connected(False)
+    await exchange.get_futures_position_information()
+    await exchange.cancel_futures_order('BTCUSDT', '1')
+    await exchange.get_futures_position_information()
+    assert exchange.client.futures_account.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_position_risk_is_read_only_when_requested():
+    exchange = BinanceExchange('key', 'secret')
+    exchange._init_client = AsyncMock()
+    exchange.client = MagicMock()
+    exchange.client.futures_account = AsyncMock(return_value=ACCOUNT)
+    exchange.client.futures_get_open_orders = AsyncMock(return_value=[])
+    exchange.client.futures_position_information = AsyncMock(return_value=POSITION_RISK)
+    exchange.account_state.set_stream_connected(True)
+
+    positions = await exchange.get_position_risk(symbol='BTCUSDT')
+
+    exchange.client.futures_position_information.assert_awaited_once_with(symbol='BTCUSDT')
+    # Mark-dependent fields come from positionRisk; leverage from the mirror
+    assert (positions[0]['markPrice'], positions[0]['liquidationPrice'], positions[0]['leverage']) == (61000.0, 54000.0, 10)
+    assert await exchange.get_positions(symbol='ETHUSDT', include_risk=True) == []
+    assert exchange.client.futures_position_information.await_count == 1
+
+
+def test_streamed_positions_carry_no_mark_dependent_fields():
+    state = BinanceAccountState()
+    state.load_snapshot(ACCOUNT, [])
+    state.apply_event('ACCOUNT_UPDATE', {'E': 2, 'a': {
+        'P': [{'s': 'ETHUSDT', 'pa': '1', 'ep': '3000', 'up': '0', 'mt': 'cross', 'iw': '0', 'ps': 'BOTH'}]}})
+
+    eth = next(p for p in state.get_positions() if p['symbol'] == 'ETHUSDT')
+    assert eth['entryPrice'] == 3000.0
+    assert not {'markPrice', 'unRealizedProfit', 'liquidationPrice', 'notional'} & eth.keys()
+
+
+@pytest.mark.asyncio
+async def test_flat_account_skips_position_risk_and_leverage_changes_resync_without_stream():
+    exchange = BinanceExchange('key', 'secret')
+    exchange._init_client = AsyncMock()
+    exchange.client = MagicMock()
+    exchange.client.futures_account = AsyncMock(return_value={**ACCOUNT, 'positions': []})
+    exchange.client.futures_get_open_orders = AsyncMock(return_value=[])
+    exchange.client.futures_position_information = AsyncMock(return_value=[])
+    exchange.client.futures_change_leverage = AsyncMock(return_value={'leverage': 5})
+
+    assert await exchange.get_futures_position_information(include_risk=True) == []
+    exchange.client.futures_position_information.assert_not_awaited()
+
+    assert await exchange.set_futures_leverage('BTCUSDT', 5)
+    assert not exchange.account_state.is_fresh()
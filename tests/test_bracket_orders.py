@@ -0,0 +1,108 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.bot.order_management.bracket_order import BracketOrderBuilder
+from src.bot.order_management.order_creator import OrderCreator
+from src.bot.risk_management.take_profit_manager import TakeProfitManager
+from src.exchange.binance.binance_exchange import BinanceExchange
+
+EXCHANGE_INFO = {'symbols': [{'symbol': 'BTCUSDT', 'filters': [
+    {'filterType': 'LOT_SIZE', 'stepSize': '0.001', 'minQty': '0.001', 'maxQty': '1000'},
+    {'filterType': 'PRICE_FILTER', 'tickSize': '0.10'},
+]}]}
+
+
+def _binance(batch_response):
+    exchange = BinanceExchange('key', 'secret')
+    exchange._init_client = AsyncMock()
+    exchange.client = MagicMock()
+    exchange.client.futures_exchange_info = AsyncMock(return_value=EXCHANGE_INFO)
+    exchange.client.futures_place_batch_order = AsyncMock(side_effect=batch_response)
+    return exchange
+
+
+@pytest.mark.asyncio
+async def test_tp_and_sl_go_out_in_one_batch_request():
+    exchange = MagicMock()
+    exchange.create_futures_batch_orders = AsyncMock(return_value=[{'orderId': 1}, {'orderId': 2}])
+
+    orders, sl_id = await OrderCreator(exchange).create_tp_sl_orders('BTCUSDT', 'LONG', 2.0, [110.0], 90.0)
+
+    exchange.create_futures_batch_orders.assert_awaited_once()
+    exchange.get_futures_position_information.assert_not_called()
+    legs = exchange.create_futures_batch_orders.await_args.args[0]
+    assert [(l['order_type'], l['side'], l['amount']) for l in legs] == [
+        ('TAKE_PROFIT_MARKET', 'SELL', 1.0), ('STOP_MARKET', 'SELL', 2.0)]
+    assert sl_id == 2 and orders[0]['tp_level'] == 1 and orders[0]['tp_amount'] == 1.0
+
+
+@pytest.mark.asyncio
+async def test_exchange_without_batch_endpoint_places_legs_concurrently():
+    exchange = MagicMock(spec=['create_futures_order'])
+    exchange.create_futures_order = AsyncMock(side_effect=[{'orderId': 'a'}, {'error': 'rejected', 'code': -1}, RuntimeError('boom')])
+    bracket = BracketOrderBuilder(exchange, 'ETHUSDTM', 'SHORT')
+    bracket.add_take_profit(90, 1).add_take_profit(80, 1).add_stop_loss(110, 2)
+
+    orders, sl_id = await bracket.submit()
+
+    assert exchange.create_futures_order.await_count == 3
+    assert [o['orderId'] for o in orders] == ['a'] and sl_id is None
+    assert exchange.create_futures_order.await_args_list[0].kwargs['side'] == 'BUY'
+
+
+@pytest.mark.asyncio
+async def test_binance_batch_rounds_from_cached_filters_and_reports_per_leg_errors():
+    responses = [
+        [{'orderId': i} for i in range(5)],
+        [{'code': -2021, 'msg': 'Order would immediately trigger.'}],
+    ]
+    exchange = _binance(responses)
+    orders = [{'pair': 'BTCUSDT', 'side': 'SELL', 'order_type': 'LIMIT', 'amount': 0.12345,
+               'price': 100.123, 'reduce_only': True} for _ in range(6)]
+    orders.append({'pair': 'BTCUSDT', 'side': 'SELL', 'order_type': 'LIMIT', 'amount': 0.0001, 'price': 90})
+
+    results = await exchange.create_futures_batch_orders(orders)
+
+    assert exchange.client.futures_exchange_info.await_count == 1
+    assert exchange.client.futures_place_batch_order.await_count == 2
+    first_leg = exchange.client.futures_place_batch_order.await_args_list[0].kwargs['batchOrders'][0]
+    assert first_leg['quantity'] == '0.123' and first_leg['price'] == '100.1'
+    assert first_leg['reduceOnly'] == 'true' and first_leg['timeInForce'] == 'GTC'
+    assert [r.get('orderId') for r in results[:5]] == [0, 1, 2, 3, 4]
+    assert results[5]['code'] == -2021 and results[6]['code'] == -4005
+
+
+@pytest.mark.asyncio
+async def test_binance_trigger_legs_go_straight_to_the_algo_endpoint():
+    exchange = _binance([[{'orderId': 7}]])
+    exchange.create_algo_order = AsyncMock(side_effect=[{'algoId': 8, 'orderId': 8}, {'algoId': 9, 'orderId': 9}])
+    orders = [
+        {'pair': 'BTCUSDT', 'side': 'BUY', 'order_type': 'TAKE_PROFIT_MARKET', 'amount': 1, 'stop_price': 100, 'reduce_only': True},
+        {'pair': 'BTCUSDT', 'side': 'BUY', 'order_type': 'LIMIT', 'amount': 1, 'price': 95, 'reduce_only': True},
+        {'pair': 'BTCUSDT', 'side': 'BUY', 'order_type': 'STOP_MARKET', 'amount': 1, 'stop_price': 120, 'reduce_only': True},
+    ]
+
+    results = await exchange.create_futures_batch_orders(orders)
+
+    assert [r['orderId'] for r in results] == [8, 7, 9]
+    batch = exchange.client.futures_place_batch_order.await_args.kwargs['batchOrders']
+    assert [leg['type'] for leg in batch] == ['LIMIT']
+    assert [c.kwargs['order_type'] for c in exchange.create_algo_order.await_args_list] == [
+        'TAKE_PROFIT_MARKET', 'STOP_MARKET']
+
+
+@pytest.mark.asyncio
+async def test_take_profit_manager_places_its_order_through_the_bracket_path():
+    exchange = MagicMock()
+    exchange.get_futures_trading_pair.return_value = 'BTCUSDT'
+    exchange.get_all_open_futures_orders = AsyncMock(return_value=[])
+    exchange.create_futures_batch_orders = AsyncMock(return_value=[{'orderId': 5}])
+
+    ok, order_id = await TakeProfitManager(exchange).ensure_take_profit_for_position(
+        'BTC', 'SHORT', 2.0, 100.0, external_tp=90.0)
+
+    assert ok and order_id == '5'
+    exchange.create_futures_order.assert_not_called()
+    [leg] = exchange.create_futures_batch_orders.await_args.args[0]
+    assert (leg['order_type'], leg['side'], leg['amount'], leg['stop_price']) == ('TAKE_PROFIT_MARKET', 'BUY', 1.0, 90.0)
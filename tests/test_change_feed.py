@@ -0,0 +1,177 @@
+import asyncio
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from discord_bot.core.trade_change_router import TradeChangeRouter, retry_reason
+from src.services.change_feed import ChangeEvent, ChangeFeed, WorkQueue, realtime_url
+
+
+class FakeChannel:
+    def __init__(self):
+        self.callbacks = {}
+
+    def on_postgres_changes(self, event, callback, table='*', schema='public', filter=None):
+        self.callbacks[table] = callback
+        return self
+
+    async def subscribe(self, callback=None):
+        callback('SUBSCRIBED', None)
+        return self
+
+
+class FakeRealtimeClient:
+    """
+    Connects instantly; `drop()` simulates a lost socket.
+
+    Like realtime's AsyncRealtimeClient without auto_reconnect, a dropped
+    socket only ends the listen task: is_connected stays True.
+    """
+
+    def __init__(self):
+        self.is_connected = False
+        self.channels = []
+        self._listen_task = None
+        self._socket_closed = asyncio.Event()
+
+    async def connect(self):
+        self.is_connected = True
+        self._listen_task = asyncio.create_task(self._socket_closed.wait())
+
+    def channel(self, topic):
+        self.channels.append(FakeChannel())
+        return self.channels[-1]
+
+    async def close(self):
+        self.is_connected = False
+        if self._listen_task is not None:
+            self._listen_task.cancel()
+
+    def drop(self):
+        self._socket_closed.set()
+
+    def emit(self, table, change_type, record, old_record=None):
+        self.channels[-1].callbacks[table]({'data': {
+            'table': table, 'type': change_type, 'record': record, 'old_record': old_record or {},
+            'commit_timestamp': datetime.now(timezone.utc).isoformat()}, 'ids': [1]})
+
+
+def now_iso():
+    return datetime.now(timezone.utc).isoformat()
+
+
+def test_realtime_url_is_derived_from_the_project_url():
+    assert realtime_url('https://abc.supabase.co/') == 'wss://abc.supabase.co/realtime/v1'
+    assert realtime_url('http://localhost:54321') == 'ws://localhost:54321/realtime/v1'
+
+
+@pytest.mark.asyncio
+async def test_changes_are_dispatched_and_reconnects_catch_up():
+    clients = []
+
+    def factory():
+        clients.append(FakeRealtimeClient())
+        return clients[-1]
+
+    feed = ChangeFeed('https://x.supabase.co', 'key', health_interval=0.01, client_factory=factory)
+    events, catchup_calls = [], []
+    feed.on('trades', events.append)
+
+    async def catch_up_trades(since):
+        catchup_calls.append(since)
+        return [{'id': 7, 'status': 'OPEN'}]
+
+    feed.add_catchup('trades', catch_up_trades)
+
+    feed.start()
+    await asyncio.sleep(0.05)
+    assert feed.is_live and catchup_calls == [None]
+
+    clients[-1].emit('trades', 'INSERT', {'id': 8, 'status': 'PENDING'})
+    assert [(e.type, e.record['id'], e.catchup) for e in events] == [('UPDATE', 7, True), ('INSERT', 8, False)]
+
+    # A dropped socket is replaced and the gap is read back from the last catch-up
+    clients[-1].drop()
+    await asyncio.sleep(0)
+    assert clients[0].is_connected and not feed.is_live
+    await asyncio.sleep(0.05)
+    assert feed.is_live
+    await feed.stop()
+
+    assert len(clients) == 2
+    assert len(catchup_calls) == 2 and catchup_calls[1] is not None
+    assert not feed.is_live
+
+
+@pytest.mark.asyncio
+async def test_work_queue_coalesces_keys_and_delays_items():
+    handled = []
+
+    async def handler(key, item):
+        handled.append((key, item))
+
+    queue = WorkQueue('test', handler)
+    queue.start()
+    assert queue.put(1, 'a', delay=0.05)
+    assert not queue.put(1, 'b')
+    queue.put(2, 'c')
+    await asyncio.sleep(0.02)
+    assert handled == [('2', 'c')]
+    await asyncio.sleep(0.05)
+    await queue.stop()
+
+    assert handled == [('2', 'c'), ('1', 'b')]
+    assert queue.stats['coalesced'] == 1
+
+
+def test_retry_reason_matches_the_retry_jobs():
+    assert retry_reason({'status': 'pending'}) == 'pending'
+    assert retry_reason({'status': 'FAILED', 'binance_response': ''}) == 'empty_response'
+    assert retry_reason({'binance_response': 'Trade cooldown active for BTC'}) == 'cooldown'
+    assert retry_reason({'binance_response': "APIError(code=-2019): Margin is insufficient."}) == 'margin_insufficient'
+    assert retry_reason({'status': 'OPEN', 'binance_response': '{"orderId": 1}'}) is None
+    assert retry_reason({'status': 'OPEN'}) is None
+
+
+def _router(**kwargs):
+    bot = SimpleNamespace(binance_exchange=object(), kucoin_exchange=object(), db_manager=object())
+    return TradeChangeRouter(bot, supabase=None, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_router_checks_new_orders_once_and_tracks_active_kucoin_trades():
+    router = _router()
+    check = AsyncMock(return_value='filled')
+    trade = {'id': 1, 'discord_id': 'd1', 'status': 'PENDING', 'exchange': 'kucoin',
+             'exchange_order_id': 'o1', 'coin_symbol': 'ETH', 'created_at': now_iso()}
+
+    with patch('src.bot.order_management.order_monitor.OrderMonitor.check_trade_order', check):
+        router.start()
+        router.on_trade(ChangeEvent('trades', 'INSERT', record=trade))
+        await asyncio.sleep(0.01)
+        # The fill written by the monitor comes back as an event and is not checked again
+        router.on_trade(ChangeEvent('trades', 'UPDATE', record={**trade, 'status': 'OPEN', 'order_status': 'FILLED'}))
+        await asyncio.sleep(0.01)
+        await router.stop()
+
+    check.assert_awaited_once()
+    assert router.has_active_kucoin_trades()
+    router.on_trade(ChangeEvent('trades', 'UPDATE', record={**trade, 'status': 'CLOSED'}))
+    assert not router.has_active_kucoin_trades()
+
+
+@pytest.mark.asyncio
+async def test_retries_are_opt_in_and_delayed():
+    failed = {'id': 2, 'discord_id': 'd2', 'status': 'FAILED', 'binance_response': 'Trade cooldown active for BTC'}
+
+    router = _router()
+    router.on_trade(ChangeEvent('trades', 'UPDATE', record=failed))
+    assert 'd2' not in router.retry_queue
+
+    router = _router(retry_trades=True, retry_delay=60)
+    router.on_trade(ChangeEvent('trades', 'UPDATE', record=failed))
+    router.on_trade(ChangeEvent('trades', 'UPDATE', record=failed))
+    assert 'd2' in router.retry_queue and len(router.retry_queue) == 1
+    await router.stop()
@@ -0,0 +1,73 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.bot.position_management.position_manager import PositionInfo, PositionLeg, PositionManager
+from src.services.analytics.analytics_models import TradeAnalysis
+from src.websocket.handlers.error_handler import ErrorHandler
+from src.websocket.handlers.handler_models import HISTORY_LIMIT, ExecutionReport
+from src.websocket.handlers.user_data_handler import UserDataHandler
+from src.websocket.sync import sync_manager as sync_manager_module
+from src.websocket.sync.sync_manager import SyncManager
+
+
+def test_working_set_models_have_no_instance_dict():
+    analysis = TradeAnalysis(trade_id='1', symbol='BTC', position_type='LONG', entry_price=1.0,
+                             exit_price=2.0, quantity=1.0, pnl=1.0, pnl_percentage=100.0)
+    for model in (ExecutionReport, PositionInfo, TradeAnalysis):
+        assert '__slots__' in model.__dict__
+    assert not hasattr(analysis, '__dict__')
+
+
+@pytest.mark.asyncio
+async def test_handler_histories_are_ring_buffers():
+    handler = UserDataHandler()
+    for i in range(HISTORY_LIMIT + 5):
+        await handler.handle_execution_report({'o': {'i': i, 's': 'BTCUSDT', 'X': 'FILLED', 'T': 1700000000000}})
+
+    assert len(handler.execution_history) == HISTORY_LIMIT
+    assert handler.execution_history[0].order_id == '5'
+    assert [r.order_id for r in handler.get_execution_history(limit=2)] == [str(HISTORY_LIMIT + 3), str(HISTORY_LIMIT + 4)]
+
+    errors = ErrorHandler()
+    for i in range(HISTORY_LIMIT + 1):
+        await errors.handle_error_event({'code': -1, 'msg': f'error {i}'})
+    assert len(errors.error_history) == HISTORY_LIMIT
+    assert errors.get_error_history(limit=1)[0].message == f'error {HISTORY_LIMIT}'
+
+
+@pytest.mark.asyncio
+async def test_sync_queue_is_bounded_and_drains_in_order(monkeypatch):
+    monkeypatch.setattr(sync_manager_module, 'SYNC_QUEUE_LIMIT', 3)
+    manager = SyncManager(MagicMock())
+    manager.database_sync.handle_balance_update = AsyncMock(return_value=None)
+    for _ in range(5):
+        await manager.handle_balance_update({'a': 'USDT'})
+
+    assert len(manager.sync_queue) == 3
+    manager.running = True
+    await manager.process_sync_queue()
+    assert len(manager.sync_queue) == 0
+    assert manager.database_sync.handle_balance_update.await_count == 8
+
+
+@pytest.mark.asyncio
+async def test_positions_are_built_from_the_needed_trade_fields():
+    assert PositionLeg.from_row({'id': 1, 'position_size': None, 'entry_price': '10'}) is None
+
+    db_manager = MagicMock()
+    db_manager.get_active_trades = AsyncMock(return_value=[
+        {'id': 1, 'coin_symbol': 'ETH', 'signal_type': 'LONG', 'position_size': '2', 'entry_price': '100',
+         'created_at': '2026-01-02T00:00:00+00:00', 'exchange_response': '{"big": "blob"}'},
+        {'id': 2, 'coin_symbol': 'ETH', 'signal_type': 'LONG', 'position_size': '2', 'entry_price': '200',
+         'created_at': '2026-01-01T00:00:00+00:00'},
+    ])
+    exchange = MagicMock(spec=['get_mark_price'])
+    exchange.get_mark_price = AsyncMock(return_value=150.0)
+
+    positions = await PositionManager(db_manager, exchange).get_active_positions()
+
+    position = positions['ETH_LONG']
+    assert position.size == 4.0 and position.entry_price == 150.0
+    assert position.trade_ids == [1, 2] and position.primary_trade_id == 2
+    assert position.created_at == '2026-01-01T00:00:00+00:00'
@@ -0,0 +1,89 @@
+import asyncio
+import json
+
+import pytest
+
+from src.websocket.core.event_dispatcher import EventDispatcher, sniff_event_type
+from src.websocket.core.websocket_config import WebSocketConfig
+
+
+@pytest.mark.parametrize('message', [
+    '{"e":"ORDER_TRADE_UPDATE","E":1,"o":{}}',
+    '{"e": "ACCOUNT_UPDATE", "E": 1}',
+    '{"stream":"btcusdt@depth5@100ms","data":{"e":"depthUpdate"}}',
+    '{"stream": "ethusdt@ticker", "data": {}}',
+    '{"stream":"ethusdt@bookTicker","data":{"e":"bookTicker"}}',
+    '{"stream":"ethusdt@markPrice","data":{}}',
+])
+def test_sniffed_type_matches_full_decode(message):
+    assert sniff_event_type(message) == EventDispatcher()._determine_event_type(json.loads(message))
+
+
+@pytest.mark.parametrize('message', ['{"E":1,"e":"x"}', '{"e":"a\\"b"}', 'ping', b'{"e":"x"}', '[]'])
+def test_sniff_gives_up_on_unrecognised_frames(message):
+    assert sniff_event_type(message) is None
+
+
+@pytest.mark.asyncio
+async def test_frames_without_handlers_are_skipped_undecoded():
+    dispatcher = EventDispatcher()
+    received = []
+
+    async def handle(event):
+        received.append(event.data)
+
+    dispatcher.register_handler('ORDER_TRADE_UPDATE', handle)
+
+    await dispatcher.dispatch_raw_message('{"e":"depthUpdate","b":[["1","2"]', 'market')  # truncated, never parsed
+    await dispatcher.dispatch_raw_message('{"e":"ORDER_TRADE_UPDATE","o":{"i":1}}', 'user')
+
+    assert dispatcher.skipped_messages == 1
+    assert received == [{'e': 'ORDER_TRADE_UPDATE', 'o': {'i': 1}}]
+
+
+@pytest.mark.asyncio
+async def test_middleware_still_sees_unhandled_frames():
+    dispatcher = EventDispatcher()
+    seen = []
+
+    async def middleware(event):
+        seen.append(event.event_type)
+        return event
+
+    dispatcher.register_middleware(middleware)
+    await dispatcher.dispatch_raw_message('{"e":"depthUpdate","b":[]}', 'market')
+
+    assert seen == ['depthUpdate']
+    assert dispatcher.skipped_messages == 0
+
+
+@pytest.mark.asyncio
+async def test_single_handler_runs_inline_and_several_run_concurrently():
+    dispatcher = EventDispatcher()
+    caller = asyncio.current_task()
+    tasks = {}
+
+    async def only(event):
+        tasks['only'] = asyncio.current_task()
+
+    async def first(event):
+        tasks['first'] = asyncio.current_task()
+
+    def second(event):
+        tasks['second'] = asyncio.current_task()
+
+    dispatcher.register_handler('ACCOUNT_UPDATE', only)
+    dispatcher.register_handler('ORDER_TRADE_UPDATE', first)
+    dispatcher.register_handler('ORDER_TRADE_UPDATE', second)
+
+    await dispatcher.dispatch_raw_message('{"e":"ACCOUNT_UPDATE","E":1}', 'user')
+    await dispatcher.dispatch_raw_message('{"e":"ORDER_TRADE_UPDATE","E":1}', 'user')
+
+    assert tasks['only'] is caller
+    assert tasks['first'] is not caller and tasks['second'] is not caller
+
+
+def test_combined_stream_url():
+    config = WebSocketConfig()
+    assert config.combined_stream_url(['btcusdt@depth5', 'ethusdt@bookTicker']) == \
+        'wss://fstream.binance.com/stream?streams=btcusdt@depth5/ethusdt@bookTicker'
@@ -0,0 +1,181 @@
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.exchange.history import (
+    ExchangeHistoryFetcher,
+    ExchangeHistoryStore,
+    ExchangeHistoryWarehouse,
+    HistoryDataset,
+)
+from src.exchange.kucoin.kucoin_exchange import KucoinExchange
+
+HOUR_MS = 60 * 60 * 1000
+DAY_MS = 24 * HOUR_MS
+T0 = 1_700_000_000_000
+
+
+def _income(start_time=0, end_time=0, **_):
+    return [
+        {"symbol": "BTCUSDT", "incomeType": "REALIZED_PNL", "income": "1.0", "time": t, "tranId": t}
+        for t in range(start_time, end_time, HOUR_MS)
+    ]
+
+
+def _warehouse(binance=None, kucoin=None):
+    fetcher = ExchangeHistoryFetcher(binance, kucoin, min_request_interval=0)
+    return ExchangeHistoryWarehouse(ExchangeHistoryStore(":memory:"), fetcher, settle_ms=0)
+
+
+@pytest.mark.asyncio
+async def test_repeated_range_is_served_locally():
+    binance = AsyncMock()
+    binance.get_income_history = AsyncMock(side_effect=lambda **kw: _income(**kw))
+    warehouse = _warehouse(binance=binance)
+
+    first = await warehouse.get_income("binance", "BTCUSDT", T0, T0 + DAY_MS)
+    second = await warehouse.get_income("binance", "BTCUSDT", T0 + HOUR_MS, T0 + DAY_MS,
+                                         income_type="REALIZED_PNL")
+
+    assert len(first) == 24
+    assert len(second) == 23
+    assert binance.get_income_history.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_only_uncovered_gap_is_fetched():
+    binance = AsyncMock()
+    binance.get_income_history = AsyncMock(side_effect=lambda **kw: _income(**kw))
+    warehouse = _warehouse(binance=binance)
+
+    await warehouse.get_income("binance", "BTCUSDT", T0, T0 + DAY_MS)
+    await warehouse.get_income("binance", "BTCUSDT", T0, T0 + 2 * DAY_MS)
+
+    second_call = binance.get_income_history.call_args_list[1].kwargs
+    assert second_call["start_time"] == T0 + DAY_MS
+    assert warehouse.store.covered_ranges("binance", HistoryDataset.INCOME, "BTCUSDT") == [(T0, T0 + 2 * DAY_MS)]
+
+
+@pytest.mark.asyncio
+async def test_refetch_is_idempotent():
+    binance = AsyncMock()
+    binance.get_income_history = AsyncMock(side_effect=lambda **kw: _income(**kw))
+    warehouse = _warehouse(binance=binance)
+    warehouse.settle_ms = 10 * 365 * DAY_MS  # nothing is considered settled
+
+    await warehouse.get_income("binance", "BTCUSDT", T0, T0 + DAY_MS)
+    await warehouse.get_income("binance", "BTCUSDT", T0, T0 + DAY_MS)
+
+    assert binance.get_income_history.call_count == 2
+    assert warehouse.store.count("binance", HistoryDataset.INCOME) == 24
+
+
+@pytest.mark.asyncio
+async def test_kucoin_position_history_falls_back_to_account_wide_sweep():
+    kucoin = AsyncMock()
+    record = {"symbol": "XBTUSDTM", "closeId": "c1", "closeTime": T0 + HOUR_MS, "pnl": "2.5"}
+    other = {"symbol": "ETHUSDTM", "closeId": "c2", "closeTime": T0 + HOUR_MS, "pnl": "1.0"}
+    kucoin._make_direct_api_call = AsyncMock(side_effect=[[], [record, other]])
+    warehouse = _warehouse(kucoin=kucoin)
+
+    records = await warehouse.get_position_history("kucoin", "XBTUSDTM", T0, T0 + DAY_MS)
+
+    assert [r["closeId"] for r in records] == ["c1"]
+
+
+@pytest.mark.asyncio
+async def test_unsupported_dataset_returns_empty():
+    warehouse = _warehouse(binance=AsyncMock())
+
+    assert await warehouse.get_position_history("binance", "BTCUSDT", T0, T0 + DAY_MS) == []
+
+
+@pytest.mark.asyncio
+async def test_failed_fetch_is_not_marked_covered():
+    binance = AsyncMock()
+    binance.get_income_history = AsyncMock(side_effect=[RuntimeError("429"), _income(start_time=T0, end_time=T0 + DAY_MS)])
+    warehouse = _warehouse(binance=binance)
+
+    with pytest.raises(RuntimeError):
+        await warehouse.get_income("binance", "BTCUSDT", T0, T0 + DAY_MS)
+    assert warehouse.store.covered_ranges("binance", HistoryDataset.INCOME, "BTCUSDT") == []
+    assert binance.get_income_history.call_args.kwargs["raise_errors"] is True
+
+    assert len(await warehouse.get_income("binance", "BTCUSDT", T0, T0 + DAY_MS)) == 24
+    assert warehouse.store.covered_ranges("binance", HistoryDataset.INCOME, "BTCUSDT") == [(T0, T0 + DAY_MS)]
+
+
+@pytest.mark.asyncio
+async def test_per_symbol_ids_are_kept_for_every_symbol():
+    binance = AsyncMock()
+    binance.get_user_trades = AsyncMock(side_effect=lambda symbol, **kw: [
+        {"symbol": symbol, "id": 1, "time": T0 + HOUR_MS, "qty": "1"}])
+    warehouse = _warehouse(binance=binance)
+
+    await warehouse.get_user_trades("binance", "BTCUSDT", T0, T0 + DAY_MS)
+    eth = await warehouse.get_user_trades("binance", "ETHUSDT", T0, T0 + DAY_MS)
+
+    assert [t["symbol"] for t in eth] == ["ETHUSDT"]
+    assert warehouse.store.count("binance", HistoryDataset.USER_TRADES) == 2
+
+
+@pytest.mark.asyncio
+async def test_records_sharing_the_page_boundary_time_are_not_skipped():
+    fills = [{"symbol": "BTCUSDT", "id": i, "time": T0 + (i if i < 3 else 2)} for i in range(5)]
+    binance = AsyncMock()
+    binance.get_user_trades = AsyncMock(side_effect=lambda start_time=0, limit=0, **kw: [
+        f for f in fills if f["time"] >= start_time][:limit])
+    fetcher = ExchangeHistoryFetcher(binance, None, min_request_interval=0, page_limit=3)
+    warehouse = ExchangeHistoryWarehouse(ExchangeHistoryStore(":memory:"), fetcher, settle_ms=0)
+
+    trades = await warehouse.get_user_trades("binance", "BTCUSDT", T0, T0 + DAY_MS)
+
+    assert sorted(t["id"] for t in trades) == [0, 1, 2, 3, 4]
+
+
+def test_store_created_with_the_old_key_is_migrated(tmp_path):
+    import sqlite3
+    path = str(tmp_path / "history.db")
+    conn = sqlite3.connect(path)
+    conn.executescript(
+        "CREATE TABLE history_records (exchange TEXT NOT NULL, dataset TEXT NOT NULL, record_id TEXT NOT NULL, "
+        "symbol TEXT NOT NULL, day TEXT NOT NULL, time_ms INTEGER NOT NULL, record_type TEXT NOT NULL DEFAULT '', "
+        "payload TEXT NOT NULL, PRIMARY KEY (exchange, dataset, record_id));"
+        "INSERT INTO history_records VALUES ('binance', 'user_trades', '1', 'BTCUSDT', '2023-11-14', 1, '', '{}');")
+    conn.commit()
+    conn.close()
+
+    store = ExchangeHistoryStore(path)
+    store._conn.execute("INSERT INTO history_records VALUES "
+                        "('binance', 'user_trades', '1', 'ETHUSDT', '2023-11-14', 1, '', '{}')")
+
+    assert store.count("binance") == 2
+
+
+@pytest.mark.asyncio
+async def test_kucoin_history_reads_every_page():
+    exchange = KucoinExchange("key", "secret", "pass")
+    exchange._init_client = AsyncMock()
+    exchange.client = MagicMock()
+    pages = {1: [SimpleNamespace(trade_id=f"t{i}", created_at=T0 + i) for i in range(1000)],
+             2: [SimpleNamespace(trade_id="t1000", created_at=T0 + 1000)]}
+    order_api = exchange.client.get_futures_service.return_value.get_order_api.return_value
+    order_api.get_trade_history.side_effect = lambda req: SimpleNamespace(
+        items=pages[req.current_page], total_page=2)
+
+    trades = await exchange.get_user_trades("XBTUSDTM", start_time=T0, end_time=T0 + DAY_MS, limit=None)
+    assert len(trades) == 1001 and trades[-1]["id"] == "t1000"
+
+    exchange._direct_api_request = AsyncMock(side_effect=[
+        {"data": {"dataList": [{"id": 1, "offset": 11}], "hasMore": True}},
+        {"data": {"dataList": [{"id": 2, "offset": 12}], "hasMore": False}},
+    ])
+    ledgers = await exchange.get_futures_account_ledgers("USDT", limit=None, raise_errors=True)
+    assert [r["id"] for r in ledgers] == [1, 2]
+    assert exchange._direct_api_request.call_args.args[2]["offset"] == 11
+
+    exchange._direct_api_request = AsyncMock(side_effect=RuntimeError("timeout"))
+    assert await exchange.get_futures_account_ledgers("USDT") == []
+    with pytest.raises(RuntimeError):
+        await exchange.get_futures_account_ledgers("USDT", raise_errors=True)
@@ -0,0 +1,81 @@
+from src.services.analytics.fill_aggregator import (
+    FillFrame,
+    TradeWindow,
+    aggregate_fills,
+    select_position_record,
+)
+
+T0 = 1_700_000_000_000
+MIN_MS = 60 * 1000
+
+
+def _binance_fill(fill_id, side, qty, price, offset_ms, realized='0', commission='0.1'):
+    return {'id': fill_id, 'side': side, 'qty': str(qty), 'price': str(price), 'commission': commission,
+            'realizedPnl': realized, 'time': T0 + offset_ms}
+
+
+def test_vwap_fees_and_reported_pnl_per_trade():
+    fills = FillFrame([
+        _binance_fill(1, 'BUY', 1, 100, 1000),
+        _binance_fill(2, 'BUY', 1, 110, 2000),
+        _binance_fill(3, 'SELL', 2, 120, 5000, realized='30'),
+        _binance_fill(4, 'SELL', 1, 50, 60_000),
+        _binance_fill(5, 'BUY', 1, 40, 70_000, realized='10'),
+    ])
+    windows = [TradeWindow(1, 'LONG', T0, T0 + 10_000), TradeWindow(2, 'SHORT', T0 + 50_000, T0 + 80_000)]
+
+    result = aggregate_fills(windows, fills, funding=[{'income': '-0.5', 'time': T0 + 3000}])
+
+    long_trade, short_trade = result[1], result[2]
+    assert long_trade.entry_price == 105.0 and long_trade.exit_price == 120.0
+    assert long_trade.realized_pnl == 30.0 and long_trade.funding == -0.5
+    assert round(long_trade.net_pnl, 8) == round(30.0 - 0.3 - 0.5, 8)
+    assert long_trade.exit_fill_ids == ['3']
+    assert (short_trade.entry_price, short_trade.exit_price, short_trade.realized_pnl) == (50.0, 40.0, 10.0)
+
+
+def test_realized_pnl_is_computed_when_not_reported():
+    fills = FillFrame([
+        {'tradeId': 'a', 'side': 'sell', 'size': 2, 'price': 50, 'fee': 0, 'createdAt': T0 + 1000},
+        {'tradeId': 'b', 'side': 'buy', 'size': 2, 'price': 45, 'fee': 0, 'createdAt': T0 + 2000},
+    ])
+
+    result = aggregate_fills([TradeWindow('t', 'SHORT', T0, T0 + 5000)], fills)['t']
+
+    assert result.realized_pnl == 10.0 and not result.realized_reported
+
+
+def test_exclusive_windows_do_not_share_fills_and_excluded_ids_are_skipped():
+    records = [_binance_fill(1, 'BUY', 1, 100, 1000), _binance_fill(2, 'SELL', 1, 101, 2000)]
+    windows = [TradeWindow('a', 'LONG', T0, T0 + 5000), TradeWindow('b', 'LONG', T0, T0 + 5000)]
+
+    shared = aggregate_fills(windows, FillFrame(records))
+    exclusive = aggregate_fills(windows, FillFrame(records), exclusive=True)
+    skipped = aggregate_fills(windows[:1], FillFrame(records, exclude_ids={'2'}))
+
+    assert shared['b'].has_fills and not exclusive['b'].has_fills
+    assert skipped['a'].exit_fills == 0
+
+
+def test_position_record_ranked_by_close_time_then_size():
+    records = [
+        {'closeId': 'far', 'openTime': T0, 'closeTime': T0 + 20 * MIN_MS, 'size': 1, 'type': 'CLOSE_LONG'},
+        {'closeId': 'near', 'openTime': T0, 'closeTime': T0 + MIN_MS, 'size': 1, 'type': 'CLOSE_LONG'},
+        {'closeId': 'wrong_side', 'openTime': T0, 'closeTime': T0, 'size': 1, 'side': 'SHORT'},
+        {'closeId': 'used', 'openTime': T0, 'closeTime': T0, 'size': 1},
+    ]
+
+    match = select_position_record(records, T0, T0, 'LONG', 1.0, used_close_ids={'used'})
+
+    assert match.record['closeId'] == 'near'
+    assert match.candidates == 2 and not match.used_fallback
+    assert match.filtered_reasons['side_mismatch'] == 1 and match.filtered_reasons['used_closeId'] == 1
+
+
+def test_position_record_falls_back_to_wider_window():
+    records = [{'closeId': 'late', 'openTime': T0, 'closeTime': T0 + 45 * MIN_MS, 'size': 1}]
+
+    match = select_position_record(records, T0, T0, 'LONG', None, set())
+
+    assert match.used_fallback and match.record['closeId'] == 'late'
+    assert match.filtered_reasons['closeTime_too_far'] == 1
@@ -0,0 +1,128 @@
+import asyncio
+import time
+
+import pytest
+
+from src.exchange.kucoin.kucoin_mark_price import KucoinMarkPriceFetcher
+
+
+class FakeKucoin(KucoinMarkPriceFetcher):
+    """Fetcher answering from in-memory contracts instead of HTTP."""
+
+    def __init__(self, prices, mark_failures=0, latency=0.01, **kwargs):
+        self.cache = {}
+        super().__init__(lambda: "http://kucoin", self.cache, base_delay=0.01, **kwargs)
+        self.prices = prices
+        self.mark_failures = mark_failures
+        self.latency = latency
+        self.calls = []
+
+    async def _get_json(self, path, params=None, timeout=10.0):
+        self.calls.append(path)
+        await asyncio.sleep(self.latency)
+        if path == "/api/v1/contracts/active":
+            return 200, {"data": [{"symbol": s, "status": "Open", "markPrice": p} for s, p in self.prices.items()]}
+        if self.mark_failures > 0:
+            self.mark_failures -= 1
+            return 503, {}
+        symbol = path.split("/")[4]
+        return 200, {"data": {"symbol": symbol, "value": self.prices[symbol]}}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_share_one_fetch():
+    fetcher = FakeKucoin({"XBTUSDTM": 65000.0, "ETHUSDTM": 3000.0})
+
+    prices = await asyncio.gather(*(fetcher.get_mark_price("BTCUSDTM") for _ in range(20)))
+
+    assert prices == [65000.0] * 20
+    assert fetcher.calls == ["/api/v1/contracts/active", "/api/v1/mark-price/XBTUSDTM/current"]
+    assert fetcher.stats["shared"] == 19
+    assert await fetcher.get_mark_price("btcusdtm") == 65000.0
+    assert len(fetcher.calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_symbol_table_is_loaded_once_for_many_symbols():
+    fetcher = FakeKucoin({"XBTUSDTM": 65000.0, "ETHUSDTM": 3000.0, "SOLUSDTM": 150.0})
+
+    await asyncio.gather(*(fetcher.get_mark_price(s) for s in ("BTCUSDTM", "ETHUSDTM", "SOLUSDTM")))
+
+    assert fetcher.calls.count("/api/v1/contracts/active") == 1
+
+
+@pytest.mark.asyncio
+async def test_retries_and_fallback_run_once_for_all_callers():
+    fallback_calls = []
+
+    async def index_price(symbol, mapped):
+        fallback_calls.append(mapped)
+        return 2990.0
+
+    fetcher = FakeKucoin({"ETHUSDTM": 3000.0}, mark_failures=100, fallback=index_price, max_retries=3)
+
+    prices = await asyncio.gather(*(fetcher.get_mark_price("ETHUSDTM") for _ in range(10)))
+
+    assert prices == [2990.0] * 10
+    assert fetcher.calls.count("/api/v1/mark-price/ETHUSDTM/current") == 3
+    assert fallback_calls == ["ETHUSDTM"]
+    assert fetcher.cache["ETHUSDTM"][2] == "index"
+
+
+@pytest.mark.asyncio
+async def test_stale_price_is_used_when_everything_fails():
+    fetcher = FakeKucoin({"ETHUSDTM": 3000.0}, mark_failures=100, max_retries=2)
+    fetcher.cache["ETHUSDTM"] = (2950.0, time.time() - 60, "mark")
+
+    assert await fetcher.get_mark_price("ETHUSDTM") == 2950.0
+
+
+@pytest.mark.asyncio
+async def test_batch_refresh_updates_watched_symbols_in_one_request():
+    fetcher = FakeKucoin({"XBTUSDTM": 65000.0, "ETHUSDTM": 3000.0, "SOLUSDTM": 150.0})
+    await fetcher.get_mark_price("BTCUSDTM")
+    await fetcher.get_mark_price("ETHUSDTM")
+    fetcher.calls.clear()
+    fetcher.prices.update({"XBTUSDTM": 66000.0, "ETHUSDTM": 3100.0})
+
+    assert await fetcher.refresh_watched() == 2
+
+    assert fetcher.calls == ["/api/v1/contracts/active"]
+    assert fetcher.cache["BTCUSDTM"][0] == 66000.0 and fetcher.cache["ETHUSDTM"][0] == 3100.0
+    assert "SOLUSDTM" not in fetcher.cache
+
+
+@pytest.mark.asyncio
+async def test_symbols_drop_out_of_the_refresh_after_watch_ttl():
+    fetcher = FakeKucoin({"ETHUSDTM": 3000.0}, watch_ttl=0.0)
+    await fetcher.get_mark_price("ETHUSDTM")
+    fetcher.calls.clear()
+
+    assert await fetcher.refresh_watched() == 0
+    assert fetcher.calls == []
+
+
+@pytest.mark.asyncio
+async def test_batch_refresh_keeps_the_symbol_table_until_symbols_ttl():
+    fetcher = FakeKucoin({"XBTUSDTM": 65000.0})
+    await fetcher.get_mark_price("BTCUSDTM")
+    loaded_at = fetcher._symbols_at
+
+    await fetcher.refresh_watched()
+    assert fetcher._symbols_at == loaded_at and fetcher._mapped == {"XBTUSDTM": "XBTUSDTM"}
+
+    fetcher.symbols_ttl = 0.0
+    await fetcher.refresh_watched()
+    assert fetcher._symbols_at > loaded_at
+
+
+@pytest.mark.asyncio
+async def test_cache_hits_keep_the_symbol_watched():
+    fetcher = FakeKucoin({"ETHUSDTM": 3000.0})
+    await fetcher.get_mark_price("ETHUSDTM")
+    fetcher._watched["ETHUSDTM"]["ETHUSDTM"] = time.monotonic() - fetcher.watch_ttl - 1
+
+    await fetcher.get_mark_price("ETHUSDTM")
+
+    assert fetcher.stats["hits"] == 1
+    assert fetcher.watched_symbols() == {"ETHUSDTM"}
@@ -0,0 +1,145 @@
+import asyncio
+
+import pytest
+
+from src.exchange.history.sync_checkpoints import SyncCheckpointStore
+from src.exchange.kucoin.kucoin_transaction_fetcher import (
+    WINDOW_MS, KucoinTransactionFetcher, transaction_key
+)
+
+DAY_MS = 24 * 60 * 60 * 1000
+START = 1_700_000_000_000
+
+
+def ledger(time_ms, amount=-1.0, biz_type='Funding'):
+    return {'id': f"l{time_ms}", 'currency': 'USDT', 'amount': amount, 'bizType': biz_type,
+            'direction': 'out', 'createdAt': time_ms}
+
+
+class FakeKucoin:
+    """
+    Serves futures ledgers from a list; counts requests in flight.
+
+    Like KucoinExchange, a failed window reads as [] unless raise_errors is set.
+    """
+
+    def __init__(self, ledgers, latency=0.02, fail_windows=()):
+        self.ledgers = ledgers
+        self.latency = latency
+        self.fail_windows = set(fail_windows)
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.windows = []
+        self.limits = []
+
+    async def _serve(self, start_time, end_time, records):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency)
+            return records
+        finally:
+            self.in_flight -= 1
+
+    async def get_futures_account_ledgers(self, currency, start_time, end_time, limit, raise_errors=False):
+        self.windows.append((start_time, end_time))
+        self.limits.append(limit)
+        if start_time in self.fail_windows:
+            if raise_errors:
+                raise RuntimeError("KuCoin 429")
+            return []
+        return await self._serve(start_time, end_time,
+                                 [r for r in self.ledgers if start_time <= r['createdAt'] <= end_time])
+
+    async def get_account_ledgers(self, currency, start_time, end_time, limit, raise_errors=False):
+        return await self._serve(start_time, end_time, [])
+
+    async def get_user_trades(self, symbol, start_time, end_time, limit, raise_errors=False):
+        return await self._serve(start_time, end_time, [])
+
+    async def get_income_history(self, symbol, start_time, end_time, limit, raise_errors=False):
+        return await self._serve(start_time, end_time, [])
+
+
+class FakeTransactionTable:
+    def __init__(self):
+        self.rows = []
+        self.batches = []
+
+    async def get_transactions_in_range(self, exchange, start_time, end_time):
+        return [r for r in self.rows if start_time <= r['time'] <= end_time]
+
+    async def insert_transaction_history_batch(self, transactions):
+        self.batches.append(len(transactions))
+        self.rows.extend(transactions)
+        return True
+
+
+@pytest.mark.asyncio
+async def test_sources_are_fetched_concurrently_and_window_boundaries_deduplicated():
+    boundary = START + WINDOW_MS
+    exchange = FakeKucoin([ledger(START + DAY_MS), ledger(boundary), ledger(boundary + DAY_MS)])
+    fetcher = KucoinTransactionFetcher(exchange, min_request_interval=0.0)
+
+    transactions = await fetcher.fetch_transaction_history(start_time=START, end_time=START + 3 * WINDOW_MS)
+
+    # The boundary ledger is returned by both windows but kept once
+    assert len(transactions) == 3
+    assert len({transaction_key(t) for t in transactions}) == 3
+    assert [t['time'] for t in transactions] == sorted(t['time'] for t in transactions)
+    assert exchange.max_in_flight >= 4
+    assert len(exchange.windows) == 3
+
+
+@pytest.mark.asyncio
+async def test_requests_respect_the_concurrency_limit():
+    exchange = FakeKucoin([])
+    fetcher = KucoinTransactionFetcher(exchange, max_concurrent_requests=2, min_request_interval=0.0)
+
+    await fetcher.fetch_transaction_history(start_time=START, end_time=START + 4 * WINDOW_MS)
+
+    assert exchange.max_in_flight == 2
+
+
+@pytest.mark.asyncio
+async def test_sync_skips_stored_rows_and_checkpoints_each_window(tmp_path):
+    exchange = FakeKucoin([ledger(START + i * DAY_MS) for i in range(14)])
+    fetcher = KucoinTransactionFetcher(exchange, min_request_interval=0.0)
+    table = FakeTransactionTable()
+    first = fetcher._transform_ledger_to_transaction(exchange.ledgers[0])
+    table.rows.append({**first, 'time': first['time'].replace('.000000', '')})
+    checkpoints = SyncCheckpointStore(str(tmp_path / "checkpoints.json"))
+
+    result = await fetcher.sync_to_database(table, start_time=START, end_time=START + 2 * WINDOW_MS,
+                                            batch_size=4, checkpoints=checkpoints)
+
+    assert result['success'] and result['chunks'] == 2
+    assert result['inserted'] == 13 and result['skipped'] == 1
+    assert table.batches == [4, 3, 4, 2]
+    assert SyncCheckpointStore(str(tmp_path / "checkpoints.json")).get("kucoin:transactions:*") == START + 2 * WINDOW_MS
+
+
+@pytest.mark.asyncio
+async def test_interrupted_sync_resumes_from_last_completed_window(tmp_path):
+    ledgers = [ledger(START + i * DAY_MS) for i in range(21)]
+    end = START + 3 * WINDOW_MS
+    checkpoints = SyncCheckpointStore(str(tmp_path / "checkpoints.json"))
+    table = FakeTransactionTable()
+
+    failing = FakeKucoin(ledgers, fail_windows={START + WINDOW_MS})
+    result = await KucoinTransactionFetcher(failing, min_request_interval=0.0).sync_to_database(
+        table, start_time=START, end_time=end, checkpoints=checkpoints)
+
+    assert not result['success']
+    assert checkpoints.get("kucoin:transactions:*") == START + WINDOW_MS
+    assert set(failing.limits) == {None}  # every page of a window is read
+    assert len(table.rows) == 8  # window ends are inclusive
+
+    healthy = FakeKucoin(ledgers)
+    result = await KucoinTransactionFetcher(healthy, min_request_interval=0.0).sync_to_database(
+        table, start_time=START, end_time=end, checkpoints=checkpoints)
+
+    assert result['success'] and result['resumed_from'] < START + WINDOW_MS
+    assert healthy.windows[0][0] > START
+    assert len(table.rows) == 21
+    assert len({transaction_key(r) for r in table.rows}) == 21
@@ -0,0 +1,49 @@
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+
+def _run(code):
+    result = subprocess.run([sys.executable, '-c', code], cwd=PROJECT_ROOT, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    return result.stdout.strip()
+
+
+def test_exchange_package_does_not_import_sdks_until_used():
+    out = _run(
+        "import sys, src.exchange as e\n"
+        "print('binance' in sys.modules, 'kucoin_universal_sdk' in sys.modules)\n"
+        "e.KucoinExchange\n"
+        "print('src.exchange.kucoin.kucoin_exchange' in sys.modules)\n"
+    )
+    assert out.splitlines() == ['False False', 'True']
+
+
+def test_exchange_factory_resolves_lazily_registered_exchanges():
+    out = _run(
+        "import sys, src.exchange\n"
+        "from src.exchange.core.exchange_factory import get_exchange_factory\n"
+        "factory = get_exchange_factory()\n"
+        "print(sorted(factory.get_available_exchanges()), factory.is_exchange_available('KuCoin'))\n"
+        "print(factory._resolve_exchange('kucoin').__name__)\n"
+    )
+    assert out.splitlines() == ["['binance', 'kucoin'] True", 'KucoinExchange']
+
+
+def test_services_package_is_lazy():
+    out = _run(
+        "import sys, src.services as s\n"
+        "print('telegram' in sys.modules)\n"
+        "print(s.PnLCalculator.__name__)\n"
+    )
+    assert out.splitlines() == ['False', 'PnLCalculator']
+
+
+def test_importing_discord_bot_module_does_not_construct_the_bot():
+    out = _run(
+        "import discord_bot.discord_bot as m\n"
+        "print(m._discord_bot is None)\n"
+    )
+    assert out == 'True'
@@ -0,0 +1,127 @@
+import logging
+import time
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from src.core import metrics
+from src.core.metrics import (
+    Histogram,
+    MetricsRegistry,
+    correlation_context,
+    instrument_supabase,
+    observe_event_lag,
+    time_exchange_request,
+    time_stage,
+    timed_stage,
+)
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram('test_seconds', 'Test histogram', ('stage',), buckets=(0.1, 1.0))
+    histogram.observe(0.05, stage='parse')
+    histogram.observe(0.5, stage='parse')
+    histogram.observe(5.0, stage='parse')
+
+    lines = histogram.render()
+
+    assert '# TYPE test_seconds histogram' in lines
+    assert 'test_seconds_bucket{stage="parse",le="0.1"} 1' in lines
+    assert 'test_seconds_bucket{stage="parse",le="1.0"} 2' in lines
+    assert 'test_seconds_bucket{stage="parse",le="+Inf"} 3' in lines
+    assert 'test_seconds_count{stage="parse"} 3' in lines
+    assert histogram.count(stage='parse') == 3
+
+
+def test_registry_reuses_histograms_and_renders_text():
+    registry = MetricsRegistry()
+    first = registry.histogram('a_seconds', 'A')
+    assert registry.histogram('a_seconds', 'A') is first
+
+    first.observe(0.2)
+    text = registry.render()
+
+    assert text.endswith('\n')
+    assert 'a_seconds_count 1' in text
+
+
+def test_time_stage_records_and_logs_correlation_id(caplog):
+    before = metrics.SIGNAL_STAGE_SECONDS.count(stage='unit_test_stage')
+
+    with caplog.at_level(logging.DEBUG, logger='src.core.metrics'):
+        with correlation_context('discord-123'):
+            with time_stage('unit_test_stage'):
+                pass
+
+    assert metrics.SIGNAL_STAGE_SECONDS.count(stage='unit_test_stage') == before + 1
+    assert '[trace discord-123] stage unit_test_stage' in caplog.text
+    assert metrics.correlation_id.get() is None
+
+
+@pytest.mark.asyncio
+async def test_timed_stage_decorator_times_coroutines():
+    @timed_stage('unit_test_decorated')
+    async def place_order():
+        return {'orderId': 1}
+
+    before = metrics.SIGNAL_STAGE_SECONDS.count(stage='unit_test_decorated')
+    assert await place_order() == {'orderId': 1}
+    assert metrics.SIGNAL_STAGE_SECONDS.count(stage='unit_test_decorated') == before + 1
+
+
+def test_time_exchange_request_labels_by_path():
+    labels = {'exchange': 'binance', 'method': 'POST', 'endpoint': '/fapi/v1/order'}
+    before = metrics.EXCHANGE_REQUEST_SECONDS.count(**labels)
+
+    with time_exchange_request('binance', 'post', 'https://fapi.binance.com/fapi/v1/order'):
+        pass
+
+    assert metrics.EXCHANGE_REQUEST_SECONDS.count(**labels) == before + 1
+
+
+@pytest.mark.parametrize('url, endpoint', [
+    ('https://api-futures.kucoin.com/api/v1/orders/5cdfc138b21023a909e5ad55', '/api/v1/orders/{id}'),
+    ('https://api-futures.kucoin.com/api/v1/orders/client-order/bot-1700000000-ab', '/api/v1/orders/client-order/{id}'),
+    ('https://api-futures.kucoin.com/api/v1/mark-price/1000PEPEUSDTM/current', '/api/v1/mark-price/{symbol}/current'),
+    ('https://api-futures.kucoin.com/api/v1/level2/depth20?symbol=XBTUSDTM', '/api/v1/level2/depth20'),
+    ('https://fapi.binance.com/fapi/v2/positionRisk', '/fapi/v2/positionRisk'),
+])
+def test_exchange_endpoint_label_collapses_ids(url, endpoint):
+    assert metrics.endpoint_label(url) == endpoint
+
+
+def test_instrument_supabase_times_table_calls():
+    def handler(request):
+        return httpx.Response(200, json=[])
+
+    session = httpx.Client(base_url='https://example.supabase.co/rest/v1', transport=httpx.MockTransport(handler))
+    client = SimpleNamespace(postgrest=SimpleNamespace(session=session))
+    before = metrics.SUPABASE_REQUEST_SECONDS.count(table='trades', op='update')
+
+    assert instrument_supabase(client) is True
+    assert instrument_supabase(client) is True  # hooks are installed once
+    session.patch('/trades', json={'status': 'CLOSED'})
+
+    assert metrics.SUPABASE_REQUEST_SECONDS.count(table='trades', op='update') == before + 1
+    assert len(session.event_hooks['response']) == 1
+
+
+def test_observe_event_lag_ignores_bad_timestamps():
+    before = metrics.WEBSOCKET_EVENT_LAG_SECONDS.count(event='ORDER_TRADE_UPDATE')
+
+    observe_event_lag('ORDER_TRADE_UPDATE', time.time() * 1000)
+    observe_event_lag('ORDER_TRADE_UPDATE', 'not-a-number')
+
+    assert metrics.WEBSOCKET_EVENT_LAG_SECONDS.count(event='ORDER_TRADE_UPDATE') == before + 1
+
+
+def test_api_server_exposes_metrics_endpoint():
+    from fastapi.testclient import TestClient
+    from src.api.core.api_server import create_app
+
+    response = TestClient(create_app()).get('/metrics')
+
+    assert response.status_code == 200
+    assert response.headers['content-type'].startswith('text/plain')
+    assert 'rubicon_signal_stage_seconds' in response.text
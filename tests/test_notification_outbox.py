@@ -0,0 +1,143 @@
+import asyncio
+import time
+
+import pytest
+
+from src.services.notifications.notification_outbox import NotificationOutbox, OutboxStore
+
+
+class FakeTelegram:
+    """Records sends; fails the first `failures` attempts."""
+
+    def __init__(self, failures=0, delay=0.0, enabled=True, retry_after=None):
+        self.sent = []
+        self.attempts = 0
+        self.failures = failures
+        self.delay = delay
+        self.enabled = enabled
+        self.retry_after = None
+        self._flood_retry_after = retry_after
+
+    def is_enabled(self):
+        return self.enabled
+
+    async def send_message(self, message, parse_mode=None):
+        self.attempts += 1
+        await asyncio.sleep(self.delay)
+        if self.attempts <= self.failures:
+            self.retry_after = self._flood_retry_after
+            return False
+        self.sent.append((message, parse_mode))
+        return True
+
+
+async def wait_until(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not reached"
+        await asyncio.sleep(0.005)
+
+
+@pytest.mark.asyncio
+async def test_enqueue_returns_before_telegram_answers():
+    telegram = FakeTelegram(delay=0.2)
+    outbox = NotificationOutbox(telegram, min_interval=0.0)
+
+    started = time.monotonic()
+    assert outbox.enqueue("entry", parse_mode="HTML")
+    assert time.monotonic() - started < 0.05
+
+    await wait_until(lambda: telegram.sent)
+    assert telegram.sent == [("entry", "HTML")]
+    await outbox.stop()
+
+
+@pytest.mark.asyncio
+async def test_messages_are_spaced_per_chat():
+    telegram = FakeTelegram()
+    outbox = NotificationOutbox(telegram, min_interval=0.05)
+
+    started = time.monotonic()
+    for i in range(4):
+        outbox.enqueue(f"m{i}")
+    await wait_until(lambda: len(telegram.sent) == 4)
+
+    assert [m for m, _ in telegram.sent] == ["m0", "m1", "m2", "m3"]
+    assert time.monotonic() - started >= 0.15
+    await outbox.stop()
+
+
+@pytest.mark.asyncio
+async def test_bursts_with_the_same_key_are_coalesced():
+    telegram = FakeTelegram()
+    outbox = NotificationOutbox(telegram, min_interval=0.05)
+
+    outbox.enqueue("first")
+    for pnl in range(10):
+        outbox.enqueue(f"BTC pnl {pnl}", coalesce_key="pnl:BTC")
+    outbox.enqueue("ETH pnl 1", coalesce_key="pnl:ETH")
+    await wait_until(lambda: len(telegram.sent) == 3)
+
+    assert [m for m, _ in telegram.sent] == ["first", "BTC pnl 9", "ETH pnl 1"]
+    assert outbox.get_stats()["coalesced"] == 9
+    await outbox.stop()
+
+
+@pytest.mark.asyncio
+async def test_failed_sends_are_retried_with_backoff_and_persisted(tmp_path):
+    telegram = FakeTelegram(failures=2)
+    store_path = str(tmp_path / "outbox.db")
+    outbox = NotificationOutbox(telegram, store_path=store_path, min_interval=0.0, retry_delay=0.02)
+
+    outbox.enqueue("stop-loss hit")
+    await wait_until(lambda: telegram.attempts == 1)
+    await asyncio.sleep(0.005)
+    assert [m.text for m in OutboxStore(store_path).load()] == ["stop-loss hit"]
+
+    await wait_until(lambda: telegram.sent)
+    assert telegram.attempts == 3
+    assert outbox.get_stats()["retried"] == 2
+    await outbox.stop()
+    assert OutboxStore(store_path).load() == []
+
+
+@pytest.mark.asyncio
+async def test_retry_after_from_telegram_is_honoured():
+    telegram = FakeTelegram(failures=1, retry_after=0.1)
+    outbox = NotificationOutbox(telegram, min_interval=0.0, retry_delay=0.0)
+
+    started = time.monotonic()
+    outbox.enqueue("flooded")
+    await wait_until(lambda: telegram.sent)
+
+    assert time.monotonic() - started >= 0.1
+    await outbox.stop()
+
+
+@pytest.mark.asyncio
+async def test_messages_left_at_shutdown_survive_a_restart(tmp_path):
+    store_path = str(tmp_path / "outbox.db")
+    down = FakeTelegram(failures=100)
+    outbox = NotificationOutbox(down, store_path=store_path, min_interval=0.0, retry_delay=0.2)
+    outbox.enqueue("a")
+    outbox.enqueue("b")
+    await wait_until(lambda: down.attempts == 2)
+    await outbox.stop(timeout=0.05)
+    assert down.sent == []
+
+    up = FakeTelegram()
+    restarted = NotificationOutbox(up, store_path=store_path, min_interval=0.0)
+    restarted.enqueue("c")
+    # Restored messages keep their back-off and are sent once it has passed
+    await wait_until(lambda: len(up.sent) == 3)
+
+    assert sorted(m for m, _ in up.sent) == ["a", "b", "c"]
+    await restarted.stop()
+    assert OutboxStore(store_path).load() == []
+
+
+def test_disabled_outbox_does_not_queue():
+    outbox = NotificationOutbox(FakeTelegram(enabled=False))
+
+    assert outbox.enqueue("ignored") is False
+    assert outbox.pending_count() == 0
@@ -0,0 +1,146 @@
+import asyncio
+import json
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from discord_bot.core.trade_change_router import TradeChangeRouter
+from src.bot.utils.price_range_handler import PriceRangeHandler
+from src.exchange.binance.binance_book_stream import BinanceBookStream
+from src.exchange.binance.binance_exchange import BinanceExchange
+from src.exchange.core import order_book as order_book_module
+from src.exchange.core.order_book import OrderBookService, maker_price
+from src.exchange.kucoin.kucoin_book_stream import KucoinBookStream
+from src.services.change_feed import ChangeEvent
+from src.websocket.core.event_dispatcher import EventDispatcher
+from src.websocket.core.websocket_manager import WebSocketManager
+
+
+@pytest.fixture
+def service(monkeypatch):
+    service = OrderBookService(max_age=5.0)
+    monkeypatch.setattr(order_book_module, '_service', service)
+    return service
+
+
+def test_maker_price_rests_behind_the_touch():
+    assert maker_price('BUY', 101.0, 100.0, 100.5, 0.3) == pytest.approx(99.7)
+    assert maker_price('SELL', 100.0, 100.0, 100.5, 0.3) == pytest.approx(100.8)
+    assert maker_price('buy', 99.0, 100.0, 100.5, 0.3) == 99.0
+    assert maker_price('SELL', 100.0, 0.0, 0.0, 0.3) == 100.0
+
+
+def test_streamed_frames_update_the_book(service):
+    service.apply_binance_event({'stream': 'btcusdt@depth5@100ms', 'data': {
+        'e': 'depthUpdate', 's': 'BTCUSDT', 'b': [['100.0', '2'], ['99.5', '1']], 'a': [['100.5', '3'], ['101', '1']]}})
+    # A bookTicker moves the touch and keeps the deeper levels it does not cross
+    service.apply_binance_event({'e': 'bookTicker', 's': 'BTCUSDT', 'b': '100.2', 'B': '1', 'a': '100.4', 'A': '4'})
+    book = service.get('binance', 'btcusdt')
+    assert (book.best_bid, book.best_ask) == (100.2, 100.4)
+    assert [p for p, _ in book.bids] == [100.2, 100.0, 99.5]
+
+    assert service.apply_kucoin_message({'type': 'message', 'topic': '/contractMarket/level2Depth5:XBTUSDTM',
+                                         'data': {'bids': [[60000, 5]], 'asks': [[60001, 7]]}})
+    assert service.depth('kucoin', 'XBTUSDTM') == {'bids': [[60000.0, 5.0]], 'asks': [[60001.0, 7.0]]}
+
+
+def test_stale_or_one_sided_books_are_not_served(service):
+    service.update('binance', 'ETHUSDT', [['10', '1']], [])
+    assert service.get('binance', 'ETHUSDT') is None
+    service.update('binance', 'ETHUSDT', [['10', '1']], [['11', '1']])
+    assert service.get('binance', 'ETHUSDT', max_age=0.0) is None
+    assert service.stats['stale'] == 1 and service.stats['misses'] == 1
+
+
+def test_watches_follow_lookups_and_active_trades(service):
+    service.get('binance', 'SOLUSDT')
+    router = TradeChangeRouter(SimpleNamespace(binance_exchange=object()), supabase=None)
+    trade = {'id': 5, 'status': 'OPEN', 'exchange': 'kucoin', 'coin_symbol': 'BTC'}
+    router.on_trade(ChangeEvent('trades', 'UPDATE', record=trade))
+    assert service.watched('binance') == {'SOLUSDT'}
+    assert service.watched('kucoin') == {'XBTUSDTM'}
+
+    router.on_trade(ChangeEvent('trades', 'UPDATE', record={**trade, 'status': 'CLOSED'}))
+    assert service.watched('kucoin') == set()
+
+
+@pytest.mark.asyncio
+async def test_binance_book_stream_subscribes_on_changes_and_feeds_the_dispatcher(service):
+    dispatcher = EventDispatcher()
+    ws_manager = SimpleNamespace(register_handler=dispatcher.register_handler,
+                                 subscribe_market_streams=AsyncMock(return_value=True))
+    stream = BinanceBookStream(service)
+    stream.register_with(ws_manager)
+
+    service.watch('binance', 'BTCUSDT')
+    assert await stream.sync() and not await stream.sync()
+    ws_manager.subscribe_market_streams.assert_awaited_once_with(['btcusdt@bookTicker', 'btcusdt@depth5@100ms'])
+
+    await dispatcher.dispatch_raw_message(json.dumps({'stream': 'btcusdt@bookTicker', 'data': {
+        'e': 'bookTicker', 's': 'BTCUSDT', 'b': '100', 'B': '1', 'a': '101', 'A': '1'}}), 'market_data')
+    assert service.get('binance', 'BTCUSDT').best_ask == 101.0
+
+
+@pytest.mark.asyncio
+async def test_market_stream_changes_are_sent_on_the_open_connection():
+    manager = WebSocketManager('key', 'secret')
+    connections = manager.connection_manager
+    sent = []
+
+    async def connect(connection_id, url, handler, connection_type):
+        connections.connection_states[connection_id] = {'url': url, 'connected': True}
+        connections.connections[connection_id] = MagicMock()
+        return True
+
+    async def send(connection_id, message):
+        sent.append(json.loads(message))
+        return True
+
+    connections.create_connection = AsyncMock(side_effect=connect)
+    connections.close_connection = AsyncMock()
+    manager.send_message = AsyncMock(side_effect=send)
+
+    assert await manager.subscribe_market_streams(['btcusdt@bookTicker'])
+    assert await manager.subscribe_market_streams(['ethusdt@bookTicker'])
+
+    connections.create_connection.assert_awaited_once()
+    assert [(m['method'], m['params']) for m in sent] == [
+        ('UNSUBSCRIBE', ['btcusdt@bookTicker']), ('SUBSCRIBE', ['ethusdt@bookTicker'])]
+    assert connections.connection_states['market_data']['url'].endswith('streams=ethusdt@bookTicker')
+
+
+@pytest.mark.asyncio
+async def test_kucoin_book_stream_follows_watched_symbols(service):
+    ws = SimpleNamespace(send_json=AsyncMock())
+    stream = KucoinBookStream(lambda: 'https://futures', session=MagicMock(), service=service)
+
+    service.watch('kucoin', 'XBTUSDTM', owner='trade:1')
+    assert await stream.sync(ws)
+    service.unwatch('trade:1')
+    service.watch('kucoin', 'ETHUSDTM', owner='trade:2')
+    await stream.sync(ws)
+    service.unwatch('trade:2')
+    assert not await stream.sync(ws)
+
+    sent = [(c.args[0]['type'], c.args[0]['topic']) for c in ws.send_json.await_args_list]
+    assert sent == [('subscribe', '/contractMarket/level2Depth5:XBTUSDTM'),
+                    ('unsubscribe', '/contractMarket/level2Depth5:XBTUSDTM'),
+                    ('subscribe', '/contractMarket/level2Depth5:ETHUSDTM'),
+                    ('unsubscribe', '/contractMarket/level2Depth5:ETHUSDTM')]
+
+
+@pytest.mark.asyncio
+async def test_binance_orders_are_priced_from_the_local_book(service):
+    exchange = BinanceExchange('key', 'secret')
+    exchange.client = MagicMock()
+    exchange.client.futures_order_book = AsyncMock()
+    service.update('binance', 'BTCUSDT', [['100.0', '1']], [['100.5', '1']])
+
+    assert await exchange.get_order_book('BTCUSDT') == {'bids': [[100.0, 1.0]], 'asks': [[100.5, 1.0]]}
+    exchange.client.futures_order_book.assert_not_awaited()
+
+    book = await exchange.get_order_book('BTCUSDT')
+    assert PriceRangeHandler.touch_price('LONG', 99.0, book) == 100.5
+    assert PriceRangeHandler.touch_price('SHORT', 99.0, book) == 100.0
+    assert PriceRangeHandler.touch_price('LONG', 99.0, None) == 99.0
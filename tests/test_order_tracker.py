@@ -0,0 +1,91 @@
+import asyncio
+import time
+
+import pytest
+
+from src.exchange.binance.binance_account_state import BinanceAccountState
+from src.exchange.core.order_tracker import OrderTracker, backoff_delays
+
+
+class ScriptedOrder:
+    """get_order_status stand-in returning a status sequence, one per poll."""
+
+    def __init__(self, statuses):
+        self.statuses = list(statuses)
+        self.polls = []
+
+    async def __call__(self, pair, order_id):
+        self.polls.append(time.monotonic())
+        status = self.statuses.pop(0) if len(self.statuses) > 1 else self.statuses[0]
+        return {'orderId': order_id, 'symbol': pair, 'status': status}
+
+
+def test_backoff_doubles_up_to_the_cap():
+    delays = backoff_delays(0.05, 0.8)
+    assert [next(delays) for _ in range(7)] == [0.05, 0.1, 0.2, 0.4, 0.8, 0.8, 0.8]
+
+
+@pytest.mark.asyncio
+async def test_polling_returns_as_soon_as_the_order_fills():
+    fetch = ScriptedOrder(['open', 'open', 'done'])
+    tracker = OrderTracker(fetch, min_delay=0.01, max_delay=0.04)
+
+    started = time.monotonic()
+    order = await tracker.wait_for_order('XBTUSDTM', 'abc', states=('done',), timeout=2.0)
+
+    assert order['status'] == 'done'
+    assert len(fetch.polls) == 3
+    assert time.monotonic() - started < 0.5
+    assert tracker.stats['poll_resolved'] == 1
+
+
+@pytest.mark.asyncio
+async def test_timeout_returns_last_known_state():
+    fetch = ScriptedOrder(['NEW'])
+    tracker = OrderTracker(fetch, min_delay=0.01, max_delay=0.02)
+
+    order = await tracker.wait_for_order('BTCUSDT', 1, states=('FILLED',), timeout=0.1)
+
+    assert order['status'] == 'NEW'
+    assert tracker.stats['timeouts'] == 1
+    assert tracker._waiters == {}
+
+
+@pytest.mark.asyncio
+async def test_stream_event_resolves_waiter_without_polling():
+    fetch = ScriptedOrder(['NEW'])
+    tracker = OrderTracker(fetch, stream_connected=lambda: True, stream_grace=1.0)
+
+    waiter = asyncio.ensure_future(tracker.wait_for_order('BTCUSDT', 42, timeout=2.0))
+    await asyncio.sleep(0.01)
+    tracker.publish({'orderId': 42, 'status': 'PARTIALLY_FILLED'})
+    await asyncio.sleep(0.01)
+    assert not waiter.done()
+    tracker.publish({'orderId': 42, 'status': 'FILLED'})
+
+    order = await asyncio.wait_for(waiter, 0.5)
+    assert order['status'] == 'FILLED'
+    assert fetch.polls == []
+
+
+@pytest.mark.asyncio
+async def test_already_known_state_returns_immediately():
+    tracker = OrderTracker(ScriptedOrder(['NEW']))
+    tracker.publish({'orderId': 7, 'status': 'FILLED'})
+
+    assert (await tracker.wait_for_order('BTCUSDT', '7', timeout=0))['status'] == 'FILLED'
+
+
+@pytest.mark.asyncio
+async def test_binance_order_events_reach_the_tracker_while_syncing():
+    state = BinanceAccountState()
+    tracker = OrderTracker(ScriptedOrder(['NEW']), stream_connected=lambda: True)
+    state.order_listeners.append(tracker.publish)
+    state.begin_sync()
+
+    waiter = asyncio.ensure_future(tracker.wait_for_order('BTCUSDT', 99, timeout=1.0))
+    await asyncio.sleep(0)
+    state.apply_event('ORDER_TRADE_UPDATE', {'E': 1, 'o': {'i': 99, 's': 'BTCUSDT', 'X': 'FILLED', 'ap': '100.5'}})
+
+    order = await asyncio.wait_for(waiter, 0.5)
+    assert order['status'] == 'FILLED' and order['avgPrice'] == '100.5'
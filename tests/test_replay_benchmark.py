@@ -0,0 +1,117 @@
+import json
+
+import pytest
+import requests
+from supabase import create_client
+
+from scripts.testing.performance_tests.mock_servers import (
+    FaultProfile,
+    MockBinanceFutures,
+    MockPostgrest,
+    MockServerThread,
+)
+from scripts.testing.performance_tests.replay_benchmark import (
+    MOCK_SUPABASE_KEY,
+    SignalResult,
+    compare_with_baseline,
+    match_signal_orders,
+    percentile,
+)
+
+
+@pytest.fixture
+def postgrest():
+    service = MockPostgrest()
+    service.seed({'trades': [
+        {'id': 1, 'discord_id': '130000000000000001', 'status': 'OPEN', 'coin_symbol': 'BTC'},
+        {'id': 2, 'discord_id': '130000000000000002', 'status': 'CLOSED', 'coin_symbol': 'ETH'},
+    ]})
+    servers = MockServerThread([service])
+    servers.start()
+    yield service
+    servers.stop()
+
+
+def test_postgrest_mock_serves_the_supabase_client(postgrest):
+    client = create_client(postgrest.url, MOCK_SUPABASE_KEY)
+
+    # Snowflake ids differ only past float precision
+    found = client.table('trades').select('id, status').eq('discord_id', '130000000000000002').execute()
+    assert found.data == [{'id': 2, 'status': 'CLOSED'}]
+
+    inserted = client.table('trades').insert({'discord_id': '3', 'status': 'PENDING'}).execute()
+    assert inserted.data[0]['id'] == 3
+
+    client.table('trades').update({'status': 'OPEN'}).eq('id', 3).execute()
+    open_trades = client.table('trades').select('id', count='exact').in_('status', ['OPEN']).order('id', desc=True).execute()
+    assert [row['id'] for row in open_trades.data] == [3, 1]
+    assert open_trades.count == 2
+
+    assert postgrest.counts_by_table()['trades'] == {'select': 2, 'insert': 1, 'update': 1}
+
+
+def test_binance_mock_fills_market_orders_and_injects_errors():
+    binance = MockBinanceFutures(FaultProfile(error_rate=1.0, seed=1))
+    binance.set_prices({'BTCUSDT': 65000.0})
+    servers = MockServerThread([binance])
+    servers.start()
+    try:
+        failed = requests.post(f"{binance.url}/fapi/v1/order", data={'symbol': 'BTCUSDT'})
+        assert failed.status_code == 503
+        assert binance.errors_injected == 1
+
+        binance.fault = FaultProfile()
+        placed = requests.post(f"{binance.url}/fapi/v1/order",
+                               data={'symbol': 'BTCUSDT', 'side': 'SELL', 'type': 'MARKET', 'quantity': '0.01'}).json()
+        assert placed['status'] == 'FILLED'
+        assert float(placed['avgPrice']) == 65000.0
+
+        positions = requests.get(f"{binance.url}/fapi/v2/positionRisk").json()
+        assert float(positions[0]['positionAmt']) == -0.01
+        assert binance.calls[('POST', 'order')] == 2
+    finally:
+        servers.stop()
+
+
+def test_fault_profile_parse():
+    profile = FaultProfile.parse('20:5:0.01', seed=7)
+    assert (profile.latency_ms, profile.jitter_ms, profile.error_rate) == (20.0, 5.0, 0.01)
+    assert 0.020 <= profile.delay() <= 0.025
+    assert FaultProfile.parse('').delay() == 0
+
+
+def test_percentile_interpolates():
+    assert percentile([], 50) is None
+    assert percentile([1.0, 2.0, 3.0, 4.0], 50) == 2.5
+    assert percentile([1.0, 2.0, 3.0, 4.0], 100) == 4.0
+
+
+def test_signals_are_matched_to_their_first_entry_order():
+    results = [
+        SignalResult('initial', 'a', 'BTC', dispatched_at=10.0),
+        SignalResult('initial', 'b', 'BTC', dispatched_at=11.0),
+        SignalResult('initial', 'c', 'SOL', dispatched_at=12.0),
+    ]
+    arrivals = [
+        {'time': 10.5, 'exchange': 'binance', 'symbol': 'BTCUSDT', 'type': 'MARKET', 'reduce_only': False, 'order_id': 1},
+        {'time': 10.6, 'exchange': 'binance', 'symbol': 'BTCUSDT', 'type': 'STOP_MARKET', 'reduce_only': True, 'order_id': 2},
+        {'time': 11.2, 'exchange': 'binance', 'symbol': 'BTCUSDT', 'type': 'MARKET', 'reduce_only': False, 'order_id': 3},
+        {'time': 12.4, 'exchange': 'kucoin', 'symbol': 'SOLUSDTM', 'type': 'MARKET', 'reduce_only': False, 'order_id': 'x'},
+    ]
+
+    latencies = match_signal_orders(results, arrivals)
+
+    assert [round(x, 3) for x in latencies] == [0.5, 0.2, 0.4]
+
+
+def test_baseline_comparison_flags_regressions():
+    baseline = {'signals': {'throughput_per_second': 10.0}, 'signal_to_order_latency': {'p99_ms': 100.0},
+                'db': {'calls_per_signal': 10.0}}
+    report = json.loads(json.dumps(baseline))
+    report['signal_to_order_latency']['p99_ms'] = 150.0
+
+    regressions = compare_with_baseline(report, baseline, tolerance=0.2)
+
+    assert len(regressions) == 1
+    assert regressions[0].startswith('signal_to_order p99_ms')
+    assert compare_with_baseline(baseline, baseline, tolerance=0.2) == []
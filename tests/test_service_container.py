@@ -0,0 +1,55 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from discord_bot.core import service_container
+from discord_bot.core.service_container import ServiceContainer, get_service_container, set_service_container
+
+
+def _bot():
+    bot = MagicMock()
+    bot.start_websocket_sync = AsyncMock(return_value=True)
+    bot.close = AsyncMock()
+    return bot
+
+
+def _trader_config():
+    trader_config = MagicMock()
+    trader_config.stop_snapshot_refresh = AsyncMock()
+    return trader_config
+
+
+def test_container_exposes_the_bot_clients():
+    bot = _bot()
+    container = ServiceContainer(bot)
+
+    assert container.supabase is bot.supabase
+    assert container.binance_exchange is bot.binance_exchange
+    assert container.price_service is bot.price_service
+    assert container.db_manager is bot.db_manager
+
+
+def test_get_service_container_returns_one_instance():
+    set_service_container(ServiceContainer(_bot()))
+    try:
+        assert get_service_container() is get_service_container()
+    finally:
+        set_service_container(None)
+
+
+@pytest.mark.asyncio
+async def test_startup_work_runs_once_and_close_stops_everything():
+    bot = _bot()
+    trader_config = _trader_config()
+    container = ServiceContainer(bot)
+
+    with patch.object(ServiceContainer, 'trader_config', trader_config):
+        await container.start()
+        await container.start()
+        await container.close()
+
+    bot.start_websocket_sync.assert_awaited_once()
+    trader_config.start_snapshot_refresh.assert_called_once()
+    trader_config.stop_snapshot_refresh.assert_awaited_once()
+    bot.close.assert_awaited_once()
+    assert service_container._container is None
@@ -0,0 +1,83 @@
+import pytest
+
+from src.exchange.core import symbol_registry
+from src.exchange.core.symbol_registry import NON_COIN_WORDS, SymbolRegistry
+from src.exchange.kucoin.kucoin_symbol_converter import KucoinSymbolConverter
+from src.exchange.kucoin.kucoin_symbol_mapper import KucoinSymbolMapper
+
+BINANCE_SYMBOLS = [
+    {'symbol': 'BTCUSDT', 'baseAsset': 'BTC', 'quoteAsset': 'USDT', 'status': 'TRADING', 'contractType': 'PERPETUAL'},
+    {'symbol': 'BTCUSDT_251226', 'baseAsset': 'BTC', 'quoteAsset': 'USDT', 'status': 'TRADING', 'contractType': 'CURRENT_QUARTER'},
+    {'symbol': '1000PEPEUSDT', 'baseAsset': '1000PEPE', 'quoteAsset': 'USDT', 'status': 'TRADING', 'contractType': 'PERPETUAL'},
+    {'symbol': '1000SATSUSDT', 'baseAsset': '1000SATS', 'quoteAsset': 'USDT', 'status': 'TRADING', 'contractType': 'PERPETUAL'},
+    {'symbol': 'ETHUSDT', 'baseAsset': 'ETH', 'quoteAsset': 'USDT', 'status': 'TRADING', 'contractType': 'PERPETUAL'},
+    {'symbol': 'OLDUSDT', 'baseAsset': 'OLD', 'quoteAsset': 'USDT', 'status': 'SETTLING', 'contractType': 'PERPETUAL'},
+]
+KUCOIN_CONTRACTS = [
+    {'symbol': 'XBTUSDTM', 'baseCurrency': 'XBT', 'quoteCurrency': 'USDT', 'status': 'Open', 'multiplier': 0.001},
+    {'symbol': 'PEPEUSDTM', 'baseCurrency': 'PEPE', 'quoteCurrency': 'USDT', 'status': 'Open', 'multiplier': 1000000},
+    {'symbol': 'DAMUSDTM', 'baseCurrency': 'DAM', 'quoteCurrency': 'USDT', 'status': 'Open', 'multiplier': 1},
+    {'symbol': 'XBTUSDCM', 'baseCurrency': 'XBT', 'quoteCurrency': 'USDC', 'status': 'Open', 'multiplier': 0.001},
+]
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    registry = SymbolRegistry()
+    registry.load_binance(BINANCE_SYMBOLS)
+    registry.load_kucoin(KUCOIN_CONTRACTS)
+    monkeypatch.setattr(symbol_registry, '_registry', registry)
+    return registry
+
+
+def test_every_spelling_resolves_to_one_entry(registry):
+    for spelling in ('BTC', 'BTCUSDT', 'BTC-USDT', 'btcusdtm', 'XBTUSDTM', 'XBT'):
+        assert registry.coin(spelling) == 'BTC'
+    for spelling in ('PEPE', 'PEPEUSDT', '1000PEPE', '1000PEPEUSDT', 'PEPEUSDTM', 'PEPE-USDT'):
+        info = registry.resolve(spelling)
+        assert (info.binance_symbol, info.kucoin_symbol) == ('1000PEPEUSDT', 'PEPEUSDTM')
+    info = registry.resolve('PEPE')
+    assert info.binance_multiplier == 1000 and info.kucoin_contract_size == 1000000
+
+
+def test_listings_are_per_exchange(registry):
+    assert registry.binance_symbol('DAM') is None and registry.kucoin_symbol('DAM') == 'DAMUSDTM'
+    assert registry.kucoin_symbol('ETHUSDT') is None and registry.is_listed('ETH', 'binance')
+    assert registry.resolve('OLDUSDT') is None
+    assert registry.binance_symbol('BTC') == 'BTCUSDT'
+    assert registry.stats()['coins'] == 5
+
+
+def test_find_coin_returns_the_canonical_coin(registry):
+    assert registry.find_coin("1000SATS Entry: 0.0000356 SL: 30m", ignore=NON_COIN_WORDS) == 'SATS'
+    assert registry.find_coin("1000PEPE closed", ignore=NON_COIN_WORDS) == 'PEPE'
+    assert registry.find_coin("Closed half, moved SL to BE on pepe", ignore=NON_COIN_WORDS) == 'PEPE'
+    assert registry.find_coin("Entry 110547 SL 108310", ignore=NON_COIN_WORDS) is None
+
+
+def test_find_coin_prefers_patterns_and_skips_everyday_words(registry):
+    registry.load_binance(BINANCE_SYMBOLS + [
+        {'symbol': f'{word}USDT', 'baseAsset': word, 'quoteAsset': 'USDT', 'status': 'TRADING',
+         'contractType': 'PERPETUAL'} for word in ('MOVE', 'NOT', 'THE', 'ME', 'ONE', 'ACT')])
+    patterns = [r'\b([A-Z]{2,10})\s*[🚀|]', r'^([A-Z]{2,10})\s+']
+
+    assert registry.find_coin("Move SL to BE on ETH", patterns, NON_COIN_WORDS) == 'ETH'
+    assert registry.find_coin("MOVE SL TO BE ON ETH", patterns, NON_COIN_WORDS) == 'ETH'
+    assert registry.find_coin("Not the one, me act on btc", patterns, NON_COIN_WORDS) == 'BTC'
+    assert registry.find_coin("ACT 🚀| Entry 0.05 SL 0.04", patterns, NON_COIN_WORDS) == 'ACT'
+    assert registry.find_coin("ETH 🚀| BTC dominance rising", patterns, NON_COIN_WORDS) == 'ETH'
+    assert registry.find_coin("Move stops to entry", patterns, NON_COIN_WORDS) is None
+
+
+def test_kucoin_converters_use_listed_contracts(registry):
+    assert KucoinSymbolConverter().convert_bot_to_kucoin_futures('PEPEUSDT') == 'PEPEUSDTM'
+    assert KucoinSymbolConverter().convert_bot_to_kucoin_futures('1000PEPEUSDT') == 'PEPEUSDTM'
+    assert KucoinSymbolConverter().find_matching_symbol('BTC-USDT', ['ETHUSDTM', 'XBTUSDTM']) == 'XBTUSDTM'
+    assert KucoinSymbolMapper().map_to_futures_symbol('1000PEPE-USDT', ['PEPEUSDTM']) == 'PEPEUSDTM'
+
+
+def test_unloaded_registry_keeps_heuristics(monkeypatch):
+    monkeypatch.setattr(symbol_registry, '_registry', SymbolRegistry())
+
+    assert KucoinSymbolConverter().convert_bot_to_kucoin_futures('ETHUSDT') == 'ETHUSDTM'
+    assert symbol_registry.get_symbol_registry().resolve('ETH') is None
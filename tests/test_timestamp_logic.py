@@ -1,7 +1,7 @@
 import asyncio
 import json
 import logging
-from discord_bot.discord_bot import discord_bot
+from discord_bot.discord_bot import get_discord_bot
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
@@ -20,7 +20,7 @@ async def test_timestamp_processing():
     }
 
     try:
-        result = await discord_bot.process_signal(initial_signal)
+        result = await get_discord_bot().process_signal(initial_signal)
         print(f"Initial Signal Result: {json.dumps(result, indent=2)}")
     except Exception as e:
         print(f"Initial Signal Error: {e}")
@@ -37,7 +37,7 @@ async def test_timestamp_processing():
     }
 
     try:
-        result = await discord_bot.process_signal(followup_signal)
+        result = await get_discord_bot().process_signal(followup_signal)
         print(f"Follow-up Signal Result: {json.dumps(result, indent=2)}")
     except Exception as e:
         print(f"Follow-up Signal Error: {e}")
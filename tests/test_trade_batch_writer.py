@@ -0,0 +1,121 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.database.core.trade_batch_writer import TradeBatchWriter
+
+
+def _supabase():
+    supabase = MagicMock()
+    supabase.rpc.side_effect = lambda name, params: MagicMock(
+        execute=MagicMock(return_value=MagicMock(data=[dict(p) for p in params['updates']])))
+    table = supabase.table.return_value
+    table.update.return_value.in_.return_value.execute.side_effect = \
+        lambda: MagicMock(data=[{}] * len(table.update.return_value.in_.call_args.args[1]))
+    table.update.return_value.eq.return_value.execute.side_effect = \
+        lambda: MagicMock(data=[{'id': table.update.return_value.eq.call_args.args[1], **table.update.call_args.args[0]}])
+    return supabase, table
+
+
+def _patches(supabase):
+    return [patch for call in supabase.rpc.call_args_list for patch in call.args[1]['updates']]
+
+
+def _trade(trade_id, **fields):
+    return {'id': trade_id, 'status': 'CLOSED', 'order_status': 'FILLED', 'exit_price': None, **fields}
+
+
+@pytest.mark.asyncio
+async def test_identical_changes_are_written_in_one_request_per_chunk():
+    supabase, table = _supabase()
+
+    async with TradeBatchWriter(supabase) as writer:
+        for trade_id in range(1, 501):
+            await writer.stage(_trade(trade_id), {'is_active': False}, validate=False)
+
+    assert supabase.rpc.call_count == 3  # 500 trades in chunks of 200
+    table.update.assert_not_called()
+    assert writer.stats['written'] == 500
+
+
+@pytest.mark.asyncio
+async def test_distinct_changes_are_batched_by_column_set():
+    supabase, table = _supabase()
+    writer = TradeBatchWriter(supabase, chunk_size=100)
+
+    for trade_id in range(1, 251):
+        await writer.stage(_trade(trade_id), {'exit_price': str(trade_id)}, validate=False)
+    for trade_id in range(251, 261):
+        await writer.stage(_trade(trade_id), {'pnl_usd': str(trade_id)}, validate=False)
+    await writer.flush()
+
+    assert supabase.rpc.call_count == 4  # 250 exit prices in 3 chunks, 10 PnLs in 1
+    assert writer.stats['requests'] == 4
+    table.update.assert_not_called()
+    table.upsert.assert_not_called()
+    first = _patches(supabase)[0]
+    assert first['id'] == 1 and first['exit_price'] == '1'
+    assert set(first) == {'id', 'exit_price', 'updated_at'}
+    assert writer.stats['written'] == 260
+
+
+@pytest.mark.asyncio
+async def test_changes_for_one_trade_are_merged():
+    supabase, table = _supabase()
+    writer = TradeBatchWriter(supabase)
+    trade = _trade(7)
+
+    await writer.stage(trade, {'exit_price': '1.5'}, validate=False)
+    await writer.stage(trade, {'pnl_usd': '3.0'}, validate=False)
+    await writer.flush()
+
+    [patch] = _patches(supabase)
+    assert patch['exit_price'] == '1.5' and patch['pnl_usd'] == '3.0'
+    assert 'updated_at' in patch
+    assert supabase.rpc.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_status_is_validated_against_loaded_row_without_a_read():
+    supabase, table = _supabase()
+    writer = TradeBatchWriter(supabase)
+
+    staged = await writer.stage(_trade(1, order_status='NEW'), {'status': 'CLOSED'})
+    await writer.flush()
+
+    assert staged is True
+    assert _patches(supabase)[0]['status'] == 'PENDING'
+    table.select.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_projected_rows_send_only_their_changes():
+    from src.database.models.trade_projections import TradeProjection, TradeRow
+
+    supabase, table = _supabase()
+    writer = TradeBatchWriter(supabase)
+
+    await writer.stage(TradeRow(_trade(3), TradeProjection.STATUS_CHECK), {'exit_price': '2.0'}, validate=False)
+    await writer.flush()
+
+    assert set(_patches(supabase)[0]) == {'id', 'exit_price', 'updated_at'}
+    assert writer.stats['written'] == 1
+
+
+@pytest.mark.asyncio
+async def test_falls_back_to_updates_without_the_rpc():
+    supabase, table = _supabase()
+    supabase.rpc.side_effect = Exception('function batch_update_trades does not exist')
+    writer = TradeBatchWriter(supabase)
+
+    for trade_id in range(1, 4):
+        await writer.stage(_trade(trade_id), {'is_active': False}, validate=False)
+    await writer.stage(_trade(4), {'is_active': True}, validate=False)
+    await writer.flush()
+    await writer.stage(_trade(5), {'is_active': True}, validate=False)
+    await writer.flush()
+
+    assert supabase.rpc.call_count == 1 and not writer.use_rpc
+    assert table.update.return_value.in_.call_args_list[0].args == ("id", [1, 2, 3])
+    assert table.update.return_value.eq.call_count == 2
+    assert writer.stats['written'] == 5 and writer.stats['errors'] == 0
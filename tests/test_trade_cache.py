@@ -0,0 +1,136 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from discord_bot.database.operations.trade_operations import TradeOperations
+from src.database.core.database_manager import DatabaseManager
+from src.database.core.trade_cache import TradeCache
+from src.database.models.trade_projections import TradeProjection
+
+
+def _trade(trade_id, **fields):
+    return {'id': trade_id, 'discord_id': f"d{trade_id}", 'exchange_order_id': f"o{trade_id}",
+            'status': 'OPEN', 'order_status': 'NEW', 'exchange': 'binance', **fields}
+
+
+def _supabase(rows):
+    """Supabase mock serving select/update on a dict of rows by id."""
+    supabase = MagicMock()
+    table = supabase.table.return_value
+
+    def select_by_id(column, value):
+        query = MagicMock()
+        query.limit.return_value.execute.side_effect = lambda: MagicMock(
+            data=[dict(r) for r in rows.values() if str(r.get(column)) == str(value)])
+        return query
+
+    table.select.return_value.eq.side_effect = select_by_id
+
+    def update(updates):
+        query = MagicMock()
+
+        def by_id(column, value):
+            rows[value] = {**rows[value], **updates}
+            return MagicMock(execute=MagicMock(return_value=MagicMock(data=[dict(rows[value])])))
+        query.eq.side_effect = by_id
+        return query
+
+    table.update.side_effect = update
+    return supabase, table
+
+
+def test_lru_evicts_least_recently_used():
+    cache = TradeCache(max_size=2)
+    cache.put(_trade(1))
+    cache.put(_trade(2))
+    cache.get(1)
+    cache.put(_trade(3))
+
+    assert cache.get(2) is None
+    assert cache.get(1)['id'] == 1 and cache.get(3)['id'] == 3
+    assert cache.get_by('discord_id', 'd2') is None
+    assert cache.stats['evictions'] == 1
+
+
+def test_secondary_indexes_follow_row_changes():
+    cache = TradeCache()
+    cache.put(_trade(1))
+    cache.apply_update(1, {'exchange_order_id': 'new-order'})
+
+    assert cache.get_by('exchange_order_id', 'o1') is None
+    assert cache.get_by('exchange_order_id', 'new-order')['id'] == 1
+    assert cache.get_by('discord_id', 'd1')['exchange_order_id'] == 'new-order'
+
+
+def test_expired_and_disabled_entries_are_not_served():
+    expired = TradeCache(ttl=0)
+    expired.put(_trade(1))
+    disabled = TradeCache(enabled=False)
+    disabled.put(_trade(1))
+
+    assert expired.get(1) is None and len(expired) == 0
+    assert disabled.get(1) is None
+
+
+def test_change_events_evict_rows():
+    cache = TradeCache()
+    cache.put(_trade(1))
+    cache.put(_trade(2))
+
+    cache.apply_change_event({'eventType': 'UPDATE', 'new': {'id': 1, 'status': 'CLOSED'}, 'old': {'id': 1}})
+    cache.apply_change_event({'type': 'DELETE', 'old_record': {'id': 2}})
+
+    assert cache.get(1) is None and cache.get(2) is None
+    assert cache.get_by('discord_id', 'd1') is None
+
+
+def test_cached_rows_are_copies():
+    cache = TradeCache()
+    cache.put(_trade(1))
+    cache.get(1)['status'] = 'CLOSED'
+
+    assert cache.get(1)['status'] == 'OPEN'
+
+
+@pytest.mark.asyncio
+async def test_signal_lifecycle_reads_the_trade_once():
+    rows = {1: _trade(1)}
+    supabase, table = _supabase(rows)
+    ops = TradeOperations(supabase, trade_cache=TradeCache())
+
+    assert (await ops.find_trade_by_discord_id('d1'))['id'] == 1
+    assert await ops.update_trade_with_original_response(1, {'orderId': 'o1', 'status': 'NEW'})
+    assert await ops.update_existing_trade(1, {'status': 'CLOSED', 'order_status': 'FILLED'})
+    trade = await ops.get_trade_by_id(1, TradeProjection.STATUS_CHECK)
+    assert await ops.find_trade_by_order_id('o1') is not None
+
+    assert table.select.call_count == 2  # stop_loss_order_id lookup + the first discord_id read
+    assert trade['status'] == 'CLOSED' and trade.projection == TradeProjection.STATUS_CHECK
+
+
+@pytest.mark.asyncio
+async def test_projected_reads_are_not_cached():
+    rows = {1: _trade(1)}
+    supabase, table = _supabase(rows)
+    cache = TradeCache()
+    ops = TradeOperations(supabase, trade_cache=cache)
+
+    await ops.get_trade_by_id(1, TradeProjection.STATUS_CHECK)
+
+    assert len(cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_database_manager_query_cache_is_lru_and_invalidated_on_write():
+    db = DatabaseManager(client=MagicMock())
+    db.config = MagicMock(enable_cache=True, cache_ttl=60, max_cache_size=2,
+                          enable_query_logging=False, log_slow_queries=False)
+
+    await db.select("trades", cache_key="a")
+    await db.select("trades", cache_key="b")
+    await db.select("alerts", cache_key="c")
+    assert list(db._query_cache) == ["b", "c"]
+
+    await db.update("trades", {"status": "CLOSED"}, {"id": 1})
+    assert list(db._query_cache) == ["c"]
+    assert db._cache_tables == {"alerts": {"c"}}
@@ -0,0 +1,77 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from discord_bot.database.operations.trade_operations import TradeOperations
+from src.database.models.trade_projections import (
+    TradeProjection,
+    TradeRow,
+    trade_columns,
+    to_trade_rows,
+)
+
+
+def test_full_projection_selects_everything():
+    assert trade_columns(TradeProjection.FULL) == "*"
+
+
+def test_status_check_projection_excludes_json_blobs():
+    columns = trade_columns(TradeProjection.STATUS_CHECK).split(",")
+
+    assert "id" in columns and "status" in columns and "exchange_order_id" in columns
+    assert "exchange_response" not in columns
+    assert "content" not in columns
+
+
+def test_extra_columns_are_appended_once():
+    columns = trade_columns(TradeProjection.PNL, "pnl_usd", "sync_issues").split(",")
+
+    assert columns.count("pnl_usd") == 1
+    assert columns[-1] == "sync_issues"
+
+
+def test_json_blob_is_parsed_on_access_and_cached():
+    row = TradeRow({"id": 1, "exchange_response": '{"orderId": 42}'})
+
+    assert row["exchange_response"] == '{"orderId": 42}'
+    parsed = row.json("exchange_response")
+    assert parsed == {"orderId": 42}
+    assert row.json("exchange_response") is parsed
+
+
+def test_json_cache_is_invalidated_on_write():
+    row = TradeRow({"id": 1, "exchange_response": '{"orderId": 42}'})
+    row.json("exchange_response")
+
+    row["exchange_response"] = '{"orderId": 43}'
+
+    assert row.json("exchange_response") == {"orderId": 43}
+
+
+def test_invalid_or_missing_json_returns_default():
+    row = TradeRow({"id": 1, "exchange_response": "not json", "parsed_signal": None})
+
+    assert row.json("exchange_response", {}) == {}
+    assert row.json("parsed_signal") is None
+
+
+def test_rows_keep_their_projection():
+    rows = to_trade_rows([{"id": 1}, {"id": 2}], TradeProjection.SYNC)
+
+    assert [r["id"] for r in rows] == [1, 2]
+    assert all(isinstance(r, dict) and r.projection == TradeProjection.SYNC for r in rows)
+
+
+@pytest.mark.asyncio
+async def test_open_trades_are_read_through_the_sync_projection():
+    supabase = MagicMock()
+    query = supabase.table.return_value.select.return_value.in_.return_value
+    query.execute.return_value = MagicMock(data=[{"id": 1, "parsed_signal": '{"coin_symbol": "BTC"}'}])
+
+    trades = await TradeOperations(supabase, trade_cache=MagicMock()).get_open_trades()
+
+    supabase.table.return_value.select.assert_called_once_with(trade_columns(TradeProjection.SYNC))
+    supabase.table.return_value.select.return_value.in_.assert_called_once_with(
+        "status", ["OPEN", "PARTIALLY_CLOSED"])
+    assert trades[0].projection == TradeProjection.SYNC
+    assert trades[0].json("parsed_signal") == {"coin_symbol": "BTC"}
@@ -0,0 +1,124 @@
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.services.trader_config_service import ExchangeType, TraderConfigService
+
+ROWS = [
+    {"trader_id": "@Johnny", "exchange": "binance", "leverage": 10, "position_size": 250.0, "updated_at": "t1"},
+    {"trader_id": "-Tareeq", "exchange": "kucoin", "leverage": 5, "position_size": 100.0, "updated_at": "t1"},
+]
+
+
+def _runtime_config(rows):
+    config = MagicMock()
+    config.supabase.table.return_value.select.return_value.execute.side_effect = \
+        lambda: MagicMock(data=[dict(r) for r in rows])
+    return config
+
+
+@pytest.mark.asyncio
+async def test_lookups_after_load_do_not_query():
+    config = _runtime_config(ROWS)
+    with patch("src.services.trader_config_service.runtime_config", config):
+        service = TraderConfigService()
+        for _ in range(50):
+            assert await service.is_trader_supported("johnny")
+            assert await service.get_exchange_for_trader("@-tareeq") == ExchangeType.KUCOIN
+            assert service.snapshot.sizing_for("@Johnny", "binance") == (10.0, 250.0)
+
+    assert config.supabase.table.return_value.select.return_value.execute.call_count == 1
+    assert service.snapshot.sizing_for("@Johnny", "kucoin") is None
+
+
+@pytest.mark.asyncio
+async def test_reload_swaps_snapshot_only_when_table_changes():
+    rows = [dict(r) for r in ROWS]
+    with patch("src.services.trader_config_service.runtime_config", _runtime_config(rows)):
+        service = TraderConfigService()
+        first = service.snapshot
+        assert service.load_snapshot().version == first.version
+
+        rows[0] = {**rows[0], "leverage": 20, "updated_at": "t2"}
+        second = service.load_snapshot()
+
+    assert second.version != first.version
+    assert (await service.get_trader_config("johnny")).leverage == 20
+    assert first.get("johnny").leverage == 10  # old snapshot is untouched
+
+
+@pytest.mark.asyncio
+async def test_change_events_update_the_snapshot():
+    with patch("src.services.trader_config_service.runtime_config", _runtime_config(ROWS)):
+        service = TraderConfigService()
+        service.apply_change_event({
+            "eventType": "INSERT",
+            "new": {"trader_id": "@Woods", "exchange": "binance", "leverage": 3, "position_size": 50.0},
+        })
+        service.apply_change_event({"eventType": "DELETE", "old": {"trader_id": "-Tareeq"}})
+
+    assert await service.get_traders_for_exchange(ExchangeType.BINANCE) == ["@Johnny", "@Woods"]
+    assert not await service.is_trader_supported("tareeq")
+
+
+@pytest.mark.asyncio
+async def test_sizing_is_kept_per_exchange():
+    rows = ROWS + [{"trader_id": "@Johnny", "exchange": "kucoin", "leverage": 4, "position_size": 75.0}]
+    with patch("src.services.trader_config_service.runtime_config", _runtime_config(rows)):
+        service = TraderConfigService()
+        snapshot = await service.get_snapshot()
+        service.apply_change_event({"eventType": "DELETE", "old": {"trader_id": "@Johnny", "exchange": "binance"}})
+
+    assert snapshot.exchange_for("johnny") == ExchangeType.BINANCE
+    assert snapshot.sizing_for("@Johnny", "binance") == (10.0, 250.0)
+    assert snapshot.sizing_for("@Johnny", "kucoin") == (4.0, 75.0)
+    assert service.snapshot.sizing_for("johnny", "binance") is None
+    assert service.snapshot.sizing_for("johnny", "kucoin") == (4.0, 75.0)
+
+
+@pytest.mark.asyncio
+async def test_ttl_reload_runs_off_the_event_loop():
+    config = _runtime_config(ROWS)
+    loop_thread = threading.get_ident()
+    threads = []
+    config.supabase.table.return_value.select.return_value.execute.side_effect = \
+        lambda: threads.append(threading.get_ident()) or MagicMock(data=[dict(r) for r in ROWS])
+    with patch("src.services.trader_config_service.runtime_config", config):
+        service = TraderConfigService(cache_ttl_seconds=0)
+        await service.get_snapshot()
+        stale = service.snapshot  # served while the reload runs in a thread
+        await service._reload_task
+
+    assert stale.get("johnny") is not None
+    assert len(threads) == 2 and loop_thread not in threads
+
+
+@pytest.mark.asyncio
+async def test_config_writes_reload_off_the_event_loop():
+    config = _runtime_config(ROWS)
+    loop_thread = threading.get_ident()
+    threads = []
+    config.supabase.table.return_value.select.return_value.execute.side_effect = \
+        lambda: threads.append(threading.get_ident()) or MagicMock(data=[dict(r) for r in ROWS])
+    config.supabase.table.return_value.upsert.return_value.execute.return_value = MagicMock(data=[{}])
+    with patch("src.services.trader_config_service.runtime_config", config):
+        service = TraderConfigService()
+        assert await service.add_trader_config("@Woods", ExchangeType.BINANCE, 3)
+        assert await service.remove_trader_config("@Woods")
+
+    assert len(threads) == 2 and loop_thread not in threads
+
+
+def test_primary_key_only_delete_reloads_the_table():
+    rows = [dict(r) for r in ROWS]
+    config = _runtime_config(rows)
+    with patch("src.services.trader_config_service.runtime_config", config):
+        service = TraderConfigService()
+        assert service.snapshot.is_supported("tareeq")
+
+        rows.pop(1)
+        service.apply_change_event({"eventType": "DELETE", "old": {"id": 7}})
+
+    assert not service.snapshot.is_supported("tareeq")
+    assert config.supabase.table.return_value.select.return_value.execute.call_count == 2
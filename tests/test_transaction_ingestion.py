@@ -0,0 +1,188 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from scripts.maintenance.cleanup_scripts import autofill_transaction_history
+from src.exchange.history.sync_checkpoints import SyncCheckpointStore
+from src.exchange.history.transaction_ingestion import (
+    CURSOR_OVERLAP_MS, RequestWeightLimiter, TransactionIngestionService, cursor_scope, transaction_key
+)
+
+HOUR_MS = 60 * 60 * 1000
+START = 1_700_000_000_000
+
+
+def income(symbol, time_ms, income_type='COMMISSION', amount=-0.01):
+    return {'symbol': symbol, 'incomeType': income_type, 'income': str(amount),
+            'asset': 'USDT', 'time': time_ms, 'tranId': f"{symbol}{time_ms}"}
+
+
+class FakeBinance:
+    """
+    Serves income pages from a list; counts requests in flight.
+
+    Like BinanceExchange, a failed request reads as [] unless raise_errors is set.
+    """
+
+    def __init__(self, records, latency=0.02, fail_symbols=(), positions=()):
+        self.records = records
+        self.latency = latency
+        self.fail_symbols = set(fail_symbols)
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.requests = []
+        self.positions = list(positions)
+
+    async def get_futures_account_info(self):
+        return {'positions': self.positions}
+
+    async def get_income_history(self, symbol="", income_type="", start_time=0, end_time=0, limit=1000,
+                                 raise_errors=False):
+        self.requests.append((symbol, start_time))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency)
+            if symbol in self.fail_symbols:
+                if raise_errors:
+                    raise RuntimeError("Binance -1003")
+                return []
+            matching = [r for r in self.records
+                        if (not symbol or r['symbol'] == symbol)
+                        and (not income_type or r['incomeType'] == income_type)
+                        and start_time <= r['time'] <= end_time]
+            return sorted(matching, key=lambda r: r['time'])[:limit]
+        finally:
+            self.in_flight -= 1
+
+
+class FakeTransactionTable:
+    def __init__(self):
+        self.rows = []
+
+    async def get_transactions_in_range(self, exchange, start_time, end_time):
+        return [r for r in self.rows if start_time <= r['time'] <= end_time]
+
+    async def insert_transaction_history_batch(self, transactions):
+        self.rows.extend(transactions)
+        return True
+
+
+def service(exchange, table, checkpoints=None, **kwargs):
+    return TransactionIngestionService(exchange, table, checkpoints=checkpoints,
+                                       limiter=RequestWeightLimiter(100000), **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_symbols_are_ingested_concurrently_with_their_own_cursors():
+    symbols = ['BTCUSDT', 'ETHUSDT', 'SOLUSDT', 'XRPUSDT']
+    exchange = FakeBinance([income(s, START + i * HOUR_MS) for s in symbols for i in range(3)])
+    table = FakeTransactionTable()
+    checkpoints = SyncCheckpointStore()
+
+    result = await service(exchange, table, checkpoints, max_workers=2).sync(START, START + 10 * HOUR_MS, symbols)
+
+    assert result['success'] and result['total_inserted'] == 12
+    assert exchange.max_in_flight == 2
+    for symbol in symbols:
+        assert checkpoints.get(cursor_scope('binance', symbol, '')) == START + 2 * HOUR_MS
+
+
+@pytest.mark.asyncio
+async def test_rerun_is_idempotent_and_only_reads_from_each_cursor():
+    exchange = FakeBinance([income('BTCUSDT', START + i * HOUR_MS) for i in range(5)])
+    table = FakeTransactionTable()
+    checkpoints = SyncCheckpointStore()
+    ingestion = service(exchange, table, checkpoints)
+
+    await ingestion.sync(START, START + 10 * HOUR_MS, ['BTCUSDT'])
+    exchange.records.append(income('BTCUSDT', START + 6 * HOUR_MS))
+    exchange.requests.clear()
+    result = await ingestion.sync(START, START + 10 * HOUR_MS, ['BTCUSDT'])
+
+    assert exchange.requests == [('BTCUSDT', START + 4 * HOUR_MS - CURSOR_OVERLAP_MS)]
+    assert result['total_inserted'] == 1 and result['total_skipped'] == 2
+    assert len(table.rows) == 6
+
+
+@pytest.mark.asyncio
+async def test_pages_sharing_a_timestamp_are_not_lost_or_duplicated():
+    # Three identical commissions at one millisecond span a page boundary
+    records = [income('BTCUSDT', START), income('BTCUSDT', START + 1),
+               income('BTCUSDT', START + 1), income('BTCUSDT', START + 1), income('BTCUSDT', START + 2)]
+    exchange = FakeBinance(records)
+    table = FakeTransactionTable()
+
+    result = await service(exchange, table, page_limit=3).sync(START, START + HOUR_MS, ['BTCUSDT'])
+
+    assert result['total_inserted'] == 5
+    assert sorted(transaction_key(r)[0] for r in table.rows) == [START, START + 1, START + 1, START + 1, START + 2]
+
+
+@pytest.mark.asyncio
+async def test_failed_symbol_keeps_its_cursor_while_others_advance():
+    exchange = FakeBinance([income(s, START + HOUR_MS) for s in ('BTCUSDT', 'ETHUSDT')], fail_symbols={'ETHUSDT'})
+    checkpoints = SyncCheckpointStore()
+
+    result = await service(exchange, FakeTransactionTable(), checkpoints).sync(
+        START, START + 2 * HOUR_MS, ['BTCUSDT', 'ETHUSDT'])
+
+    assert not result['success'] and result['total_inserted'] == 1
+    assert checkpoints.get(cursor_scope('binance', 'BTCUSDT', '')) == START + HOUR_MS
+    assert checkpoints.get(cursor_scope('binance', 'ETHUSDT', '')) is None
+    assert 'Binance -1003' in result['symbol_results'][1]['error']
+
+
+@pytest.mark.asyncio
+async def test_account_scopes_fan_traded_symbols_out_across_workers():
+    positions = [{'symbol': 'BTCUSDT', 'positionAmt': '0.1', 'updateTime': 0},
+                 {'symbol': 'ETHUSDT', 'positionAmt': '0', 'updateTime': START + HOUR_MS},
+                 {'symbol': 'DOGEUSDT', 'positionAmt': '0', 'updateTime': START - HOUR_MS}]
+    records = [income(s, START + HOUR_MS) for s in ('BTCUSDT', 'ETHUSDT')] + [
+        {**income('', START + HOUR_MS, 'TRANSFER', 100), 'symbol': ''}]
+    exchange = FakeBinance(records, positions=positions)
+    ingestion = service(exchange, FakeTransactionTable(), max_workers=4)
+
+    scopes = await ingestion.account_scopes(START)
+    assert scopes[:2] == [('BTCUSDT', ''), ('ETHUSDT', '')] and ('', 'TRANSFER') in scopes
+    result = await ingestion.sync(START, START + 2 * HOUR_MS, scopes=scopes)
+
+    assert result['success'] and result['total_inserted'] == 3
+    assert exchange.max_in_flight > 1
+
+
+@pytest.mark.asyncio
+async def test_weight_limiter_waits_when_budget_is_spent():
+    limiter = RequestWeightLimiter(60 * 30 * 20)  # 20 income requests per second
+    for _ in range(60 * 20):
+        await limiter.acquire(30)
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    await limiter.acquire(30)
+
+    assert loop.time() - started >= 0.03
+    assert limiter.waited > 0
+
+
+def test_autofiller_reuses_the_running_bot(monkeypatch):
+    monkeypatch.setattr(autofill_transaction_history, 'DiscordBot', pytest.fail)
+    table = FakeTransactionTable()
+    filler = autofill_transaction_history.AutoTransactionHistoryFiller(
+        bot=SimpleNamespace(binance_exchange=FakeBinance([])), db_manager=table)
+
+    assert filler.db_manager is table and isinstance(filler.binance_exchange, FakeBinance)
+
+
+def test_checkpoint_stores_sharing_a_file_keep_each_others_scopes(tmp_path):
+    path = str(tmp_path / "checkpoints.json")
+    scheduled, backfill = SyncCheckpointStore(path), SyncCheckpointStore(path)
+
+    scheduled.set('binance:BTCUSDT', START)
+    backfill.set('binance:ETHUSDT', START + HOUR_MS)
+    scheduled.clear('binance:SOLUSDT')
+
+    assert SyncCheckpointStore(path).get('binance:BTCUSDT') == START
+    assert SyncCheckpointStore(path).get('binance:ETHUSDT') == START + HOUR_MS
+    assert scheduled.get('binance:ETHUSDT') == START + HOUR_MS
@@ -0,0 +1,63 @@
+import json
+
+import pytest
+
+from scripts.testing.performance_tests.ws_flood_benchmark import (
+    EventGenerator,
+    FloodBenchmark,
+    FloodConfig,
+    StubTradeStore,
+    build_trades,
+    compare_with_baseline,
+)
+
+
+@pytest.mark.asyncio
+async def test_stub_store_serves_database_sync_calls():
+    store = StubTradeStore(build_trades(2))
+
+    trade = await store.find_trade_by_order_id('10000001')
+    updated = store.supabase.from_('trades').update({'status': 'ACTIVE'}).eq('id', trade['id']).execute()
+
+    assert trade['id'] == 2
+    assert updated.data[0]['status'] == 'ACTIVE'
+    assert await store.find_trade_by_order_id('missing') is None
+    assert store.calls == {'trades.find_by_order_id': 2, 'trades.update': 1}
+
+
+def test_generator_templates_fill_in_event_time():
+    generator = EventGenerator(build_trades(3), FloodConfig(error_rate=0.2, seed=3))
+
+    for template, timestamps in generator.templates(50):
+        message = json.loads(template % ((1700000000000,) * timestamps))
+        assert message['e'] in ('ORDER_TRADE_UPDATE', 'ACCOUNT_UPDATE', 'error')
+        if message['e'] != 'error':
+            assert message['E'] == 1700000000000
+
+
+@pytest.mark.asyncio
+async def test_flood_runs_events_through_the_sync_pipeline():
+    config = FloodConfig(rate=400, duration=0.25, orders=5, unknown_order_ratio=0.0, error_rate=0.1, seed=2)
+
+    report = await FloodBenchmark(config).run()
+
+    assert report['events']['sent'] == 100
+    assert report['events']['processed'] == 100
+    assert report['queue_delay']['count'] == 100
+    assert report['db_calls']['trades.find_by_order_id'] > 0
+    assert report['containers']['SyncManager.sync_queue'] > 0
+    assert any(name.startswith('ORDER_TRADE_UPDATE:') for name in report['cpu']['handlers_us_per_call'])
+    assert report['memory']['top_allocations']
+
+
+def test_flood_baseline_flags_throughput_and_memory_regressions():
+    baseline = {'events': {'events_per_second': 1000.0}, 'queue_delay': {'p99_ms': 10.0},
+                'cpu': {'us_per_event': 500.0}, 'memory': {'growth_bytes_per_event': 100.0}}
+    report = json.loads(json.dumps(baseline))
+    report['events']['events_per_second'] = 700.0
+    report['memory']['growth_bytes_per_event'] = 300.0
+
+    regressions = compare_with_baseline(report, baseline, tolerance=0.2)
+
+    assert [r.split(':')[0] for r in regressions] == ['events_per_second', 'memory growth_bytes_per_event']
+    assert compare_with_baseline(baseline, baseline, tolerance=0.2) == []